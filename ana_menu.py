@@ -9,15 +9,23 @@ import logging
 import os
 import sys
 import importlib
+import time
 from datetime import datetime
 
 from kullanici_yonetimi import get_kullanici_yonetimi, KullaniciYonetimi
 
+# Açılış ölçümü: ana menü hazır olduğunda bu andan itibaren geçen süre loglanır
+_ACILIS_T0 = time.perf_counter()
+
 # Geliştirme modu: True iken modüller her açılışta sys.modules cache'inden
 # yeniden yüklenir; bu sayede kodda yapılan değişiklikler ana_menu kapatılmadan etki eder.
 # Üretim için False yap (küçük ek yükü önler).
 DEV_MODE = True
 
+# Ön ısıtma: menü çizildikten bu kadar sonra en sık açılan modüllerin
+# import'u arka planda başlar (bkz. on_isitma.py). 0 → kapalı.
+ON_ISITMA_GECIKME_MS = 300
+
 # Tema yönetimi merkezi modül
 try:
     from tema_yonetimi import get_tema, TEMALAR
@@ -278,6 +286,9 @@ class AnaMenu:
         # var olan pencereyi öne getir, yeni kopya açma.
         self.acik_moduller = {}
 
+        # Arka plan import ısıtıcısı (calistir'da başlatılır)
+        self._on_isitici = None
+
         # Pencere kapatılırsa
         self.root.protocol("WM_DELETE_WINDOW", self.cikis_yap)
 
@@ -721,6 +732,18 @@ class AnaMenu:
     def modul_ac(self, modul_key):
         """Seçilen modülü aç"""
         logger.info(f"Modül açılıyor: {modul_key}")
+        t0 = time.perf_counter()
+        try:
+            from on_isitma import modul_kullanim_kaydet
+            modul_kullanim_kaydet(modul_key)
+        except Exception:
+            pass
+        try:
+            self._modul_ac(modul_key)
+        finally:
+            logger.info(f"Modül açıldı: {modul_key} ({(time.perf_counter() - t0) * 1000:.0f} ms)")
+
+    def _modul_ac(self, modul_key):
 
         if modul_key == "ilac_takip":
             self.ilac_takip_ac()
@@ -1411,6 +1434,7 @@ class AnaMenu:
         DEV_MODE = False iken hiçbir şey yapmaz.
         Modül daha önce import edilmemişse atlanır (ilk açılışta normal import çalışır).
         Reload başarısızsa uyarı loglanır ama akış kesilmez (eski cache ile devam edilir).
+        Ön ısıtıcının yeni yüklediği modül ilk açılışta reload edilmez (zaten taze).
         """
         if not DEV_MODE:
             return
@@ -1418,6 +1442,8 @@ class AnaMenu:
             modul = sys.modules.get(ad)
             if modul is None:
                 continue
+            if self._on_isitici is not None and self._on_isitici.ilk_kullanim(ad):
+                continue
             try:
                 importlib.reload(modul)
             except Exception as e:
@@ -1612,14 +1638,31 @@ class AnaMenu:
             get_servis().dur()
         except Exception:
             pass
+        if self._on_isitici is not None:
+            self._on_isitici.durdur()
         self.root.destroy()
 
     def calistir(self):
         """Pencereyi çalıştır"""
         # Yedek temizlik: program açılışında günde 1 kez sessiz tetik (3 sn gecikme)
         self.root.after(3000, self._yedek_temizlik_gunluk_tetik)
+        self.root.after_idle(self._acilis_hazir)
         self.root.mainloop()
 
+    def _acilis_hazir(self):
+        """Menü ilk kez çizildi: açılış süresini logla, ön ısıtmayı planla."""
+        logger.info(f"Ana menü hazır: {(time.perf_counter() - _ACILIS_T0) * 1000:.0f} ms")
+        if ON_ISITMA_GECIKME_MS > 0:
+            self.root.after(ON_ISITMA_GECIKME_MS, self._on_isitma_baslat)
+
+    def _on_isitma_baslat(self):
+        """En sık açılan modülleri arka planda import et (Tk thread'ini bloklamaz)."""
+        try:
+            from on_isitma import isitma_baslat
+            self._on_isitici = isitma_baslat(gecikme_sn=0)
+        except Exception as exc:
+            logger.debug(f"Ön ısıtma atlandı: {exc}")
+
     def _yedek_temizlik_gunluk_tetik(self):
         """Yedek Klasörü Boşaltma — günlük otomatik tetik (no-op aynı günde)."""
         try:
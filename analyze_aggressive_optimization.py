@@ -3,15 +3,15 @@ Agresif Optimizasyon Analizi
 Başlangıç: 0.1s, Çarpan: 1.1 (yani %10 fazla)
 """
 
-import json
 import sys
 import io
 
+from timing_settings import istatistikleri_oku
+
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-# İstatistikleri oku
-with open('timing_stats.json', 'r', encoding='utf-8') as f:
-    stats = json.load(f)
+# İstatistikleri oku (timing_stats.jsonl günlüğü; yoksa eski timing_stats.json)
+stats = istatistikleri_oku()
 
 # Farklı senaryoları karşılaştır
 print("=" * 100)
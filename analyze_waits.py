@@ -3,11 +3,11 @@ Kod içindeki beklemeleri analiz eder ve gereksiz beklemeleri tespit eder
 """
 
 import re
-import json
 
-# İstatistikleri oku
-with open('timing_stats.json', 'r', encoding='utf-8') as f:
-    stats = json.load(f)
+from timing_settings import istatistikleri_oku
+
+# İstatistikleri oku (timing_stats.jsonl günlüğü; yoksa eski timing_stats.json)
+stats = istatistikleri_oku()
 
 # botanik_bot.py'yi oku
 with open('botanik_bot.py', 'r', encoding='utf-8') as f:
@@ -29,8 +29,18 @@ from tkinter import filedialog, messagebox, ttk
 from typing import Any, Dict, List, Optional, Tuple
 
 from botanik_db import BotanikDB
+from sql_tarih_araligi import donem_kosulu
 from recete_kontrol.sut_kontrolleri import _tr_lower
+from recete_kontrol.toplu_kontrol import (TopluIstatistik, havuzu_kapat,
+                                          toplu_kontrol, varsayilan_isci_sayisi)
 import recete_teyit_db
+from inceleme_durum_deposu import IncelemeDurumDeposu
+from degisiklik_akisi import KONU_RECETE, paylasilan_akis
+from sanal_tablo import SanalTablo
+from filtre_indeksi import (FiltreDurumu, FiltreIndeksi, filtre_maskesi,
+                            metin_filtre_normalize, metin_kosulu_anlamli,
+                            metin_kosulu_test, satir_gecer_mi, teyit_sayimi,
+                            verdict_sayimi)
 import kontrol_disi_ilaclar as kdi
 import kontrol_disi_ilaclar_2 as kdi2
 
@@ -54,6 +64,11 @@ RENK_GRI = "gri"          # Kontrol gerekmez — bu ilacı dışlama listesine e
 # kullanıcı uyarılır ve daha dar dönem / filtre seçmeye yönlendirilir.
 MAKS_SATIR_LIMITI = 50000
 
+# Dönem sorgusu akış partisi — BotanikDB.sorgu_akis bu kadar satırı bir
+# seferde çeker; her parti işlenip tabloya eklenir (ilk satırlar hızlı gelir,
+# ham sonuç belleği parti boyutuyla sınırlı kalır).
+AKIS_PARTI_BOYUTU = 2000
+
 RENK_BG = {
     RENK_BEYAZ:   "#FFFFFF",
     RENK_YESIL:   "#C8E6C9",
@@ -1635,7 +1650,8 @@ class _EkGorselYonetDialog(tk.Toplevel):
 class AylikReceteSorguGUI:
     """Aylık reçete-ilaç inceleme & filtreleme tablosu."""
 
-    STATE_DOSYASI = "aylik_inceleme_state.json"
+    STATE_DOSYASI = "aylik_inceleme_state.json"   # eski format — ilk açılışta DB'ye taşınır
+    STATE_DB_DOSYASI = "aylik_inceleme_state.db"
     SUTUN_AYAR_DOSYASI = "aylik_inceleme_sutun_ayarlari.json"
     SUTUN_SABLON_DOSYASI = "aylik_inceleme_sutun_sablonlari.json"
 
@@ -1683,7 +1699,10 @@ class AylikReceteSorguGUI:
 
         # Veri
         self.tum_satirlar = []        # tüm sorgu sonucu (filtresiz)
+        self._akis_durumu = None      # akışlı sorgu parti render durumu
         self.gosterilen_iids = set()  # şu anda görünen iid'ler
+        self._filtre_indeksi = None   # FiltreIndeksi (tum_satirlar üzerinde)
+        self._durum_deposu = None     # IncelemeDurumDeposu (renk state'i, lazy)
         self.satir_indeks = {}        # {iid: satir_dict}
         self.satir_renkleri = {}      # {iid: renk}
         self.secili_iidler = set()    # checkbox ile seçilmiş satırlar
@@ -1749,7 +1768,7 @@ class AylikReceteSorguGUI:
         # Verdict (kontrol sonucu) filtre — kullanıcı tabloyu sonuç etiketine
         # göre filtreleyebilsin: UYGUN / UYGUN DEĞİL / ŞÜPHELİ / ŞARTLI UYGUN /
         # MANUEL KONTROL / boş (henüz kontrol edilmemiş). Default hepsi açık.
-        # _satir_filtreden_geciyor_mu erken kontrol yapar; etiket görünmez ise
+        # _filtre_durumu → filtre_indeksi; etiket görünmez ise
         # satır dışlanır. UI: row3 üstünde panel olarak.
         self.var_verdict_filtre = {
             "UYGUN":              tk.BooleanVar(value=True),
@@ -2003,7 +2022,7 @@ class AylikReceteSorguGUI:
                   "yükle (sadece okuma).")
 
         # 🔴 ANLIK REÇETE KONTROLÜ — aç/kapa toggle. Botanik EOS'a yeni reçete
-        # kaydedilince (60 sn polling, sadece SELECT) otomatik SUT kontrolü +
+        # kaydedilince (paylaşılan değişiklik akışı, sadece SELECT) otomatik SUT kontrolü +
         # uygunsuzlukta öne gelen sesli uyarı penceresi. Kontrol-dışı ilaçlar
         # atlanır. NOT: popup'ın taradığı kontrol frame'lerine KOYULMAZ.
         self.btn_canli_kontrol = tk.Button(
@@ -2014,7 +2033,7 @@ class AylikReceteSorguGUI:
         self.btn_canli_kontrol.pack(side="left", padx=(8, 0))
         _Tooltip(self.btn_canli_kontrol,
                   "Anlık Reçete Kontrolü — aç/kapa.\n"
-                  "Açıkken Botanik'e yeni kaydedilen reçeteler ~60 sn içinde "
+                  "Açıkken Botanik'e yeni kaydedilen reçeteler birkaç sn içinde "
                   "otomatik SUT kontrolünden geçer; uygunsuz/şüpheli reçetede "
                   "anında uyarı penceresi çıkar.\n(Sadece SELECT — EOS'a yazma yok.)")
 
@@ -2487,7 +2506,7 @@ class AylikReceteSorguGUI:
                 selectcolor="#FFFFFF",
                 font=("Segoe UI", 8, "bold"),
                 bd=0, padx=2, anchor="w",
-                command=self._tabloyu_yenile)
+                command=self._filtre_degisti)
             cb.grid(row=0, column=1 + i, padx=2, pady=2, sticky="ew")
             self._verdict_filtre_cbs[etiket] = cb
             self._verdict_filtre_temel[etiket] = gosterim
@@ -2495,7 +2514,7 @@ class AylikReceteSorguGUI:
         def _verdict_filtre_topluset(deger: bool):
             for v in self.var_verdict_filtre.values():
                 v.set(deger)
-            self._tabloyu_yenile()
+            self._filtre_degisti()
         b_hep = tk.Button(p_etiket, text="Tümü",
                            bg="#E8EAF6", bd=1, width=7,
                            command=lambda: _verdict_filtre_topluset(True),
@@ -2522,7 +2541,7 @@ class AylikReceteSorguGUI:
                 selectcolor="#FFFFFF",
                 font=("Segoe UI", 8, "bold"),
                 bd=0, padx=2, anchor="w",
-                command=self._tabloyu_yenile)
+                command=self._filtre_degisti)
             cb.grid(row=1, column=1 + i, padx=2, pady=2, sticky="ew")
             self._teyit_filtre_cbs[sonuc] = cb
             self._teyit_filtre_temel[sonuc] = gosterim
@@ -3646,11 +3665,12 @@ class AylikReceteSorguGUI:
                             command=lambda k=kod: self._sutuna_gore_sirala(k))
             self.tv.column(kod, width=gen, minwidth=30, stretch=False)
 
-        ysb = ttk.Scrollbar(tree_frame, orient="vertical",
-                             command=self.tv.yview)
+        ysb = ttk.Scrollbar(tree_frame, orient="vertical")
         ysb.pack(side="right", fill="y")
         self.tv.pack(side="left", fill="both", expand=True)
-        self.tv.configure(yscrollcommand=ysb.set)
+        # Sanal ızgara: Treeview'de sadece ekrandaki pencere + tampon bulunur;
+        # satır değerleri görüntülendikçe _satir_render ile üretilir.
+        self._grid = SanalTablo(self.tv, self._satir_render, ysb=ysb)
 
         # Renk tag'leri
         for renk, bg in RENK_BG.items():
@@ -4326,6 +4346,17 @@ class AylikReceteSorguGUI:
                    command=lambda: self._kontrol_tumunu_calistir(pop)
                    ).pack(side="top", fill="x", padx=8, pady=(8, 4))
 
+        # Tek geçiş: her kalem birleşik dispatcher'dan (kontrol_et_tekil),
+        # kalemler çekirdeklere dağıtılır — sonuçlar geldikçe ızgaraya yazılır.
+        tk.Button(pop, text=(f"⚡  TOPLU SUT KONTROLÜ (tek geçiş, "
+                             f"{varsayilan_isci_sayisi()} çekirdek)"),
+                   bg="#00695C", fg="white",
+                   font=("Segoe UI", 10, "bold"),
+                   activebackground="#004D40",
+                   relief="flat", bd=0, padx=20, pady=8, cursor="hand2",
+                   command=lambda: self._toplu_sut_kontrol_baslat(pop)
+                   ).pack(side="top", fill="x", padx=8, pady=(0, 4))
+
         # Excel rapor isteği onay kutusu — varsayılan KAPALI.
         # İşaretsizken kontrol sonunda Excel üretilmez, özet penceresi açılmaz.
         tk.Checkbutton(
@@ -4411,6 +4442,80 @@ class AylikReceteSorguGUI:
             except Exception:
                 pass
 
+    # Toplu SUT kontrolünde ızgara en fazla bu aralıkla yenilenir (sn)
+    TOPLU_KONTROL_YENILEME_SN = 1.0
+
+    def _toplu_sut_kontrol_baslat(self, popup: tk.Toplevel) -> None:
+        """Dönemin tüm kalemlerini birleşik dispatcher'dan tek geçişte geçir.
+
+        Kalemler recete_kontrol.toplu_kontrol ile işçi süreçlere dağıtılır;
+        sonuçlar sırayla gelip partiler halinde satırlara yazılır, ızgara
+        ilerledikçe yenilenir. Kategori süre özeti log'a yazılır."""
+        try:
+            popup.destroy()
+        except Exception:
+            pass
+        if not self.tum_satirlar:
+            messagebox.showinfo(
+                "Toplu SUT Kontrolü",
+                "Önce DÖNEM seçip 🔍 SORGULA ile reçeteleri yükleyin.",
+                parent=self.root)
+            return
+        if getattr(self, "_toplu_kontrol_calisiyor", False):
+            self._durum_yaz("⚡ Toplu SUT kontrolü zaten çalışıyor…")
+            return
+        self._toplu_kontrol_calisiyor = True
+        satirlar = self.tum_satirlar
+        self._durum_yaz(f"⚡ Toplu SUT kontrolü — {len(satirlar)} satır hazırlanıyor…")
+        threading.Thread(target=self._toplu_sut_kontrol_isci, args=(satirlar,),
+                         daemon=True).start()
+
+    def _toplu_sut_kontrol_isci(self, satirlar: list) -> None:
+        """Background thread: girdileri kur, havuzdan gelen sonuçları ana
+        thread'e partiler halinde aktar."""
+        import time as _time
+        ist = TopluIstatistik()
+        try:
+            ciftler = self._birlesik_ilac_sonuclari(satirlar)
+            parca, son = [], _time.monotonic()
+            for sira, kategori, rapor in toplu_kontrol(
+                    [ilac_sonuc for _, ilac_sonuc in ciftler], istatistik=ist):
+                if rapor is not None:
+                    parca.append((ciftler[sira][0], kategori, rapor))
+                if _time.monotonic() - son >= self.TOPLU_KONTROL_YENILEME_SN:
+                    self.root.after(0, self._toplu_sut_sonuc_uygula, satirlar,
+                                    parca, sira + 1, len(ciftler))
+                    parca, son = [], _time.monotonic()
+            self.root.after(0, self._toplu_sut_sonuc_uygula, satirlar,
+                            parca, len(ciftler), len(ciftler))
+        except Exception as e:
+            logger.error("Toplu SUT kontrolü hatası: %s", e, exc_info=True)
+            self.root.after(0, self._durum_yaz, f"⚡ Toplu SUT kontrolü hatası: {e}")
+        finally:
+            self.root.after(0, self._toplu_sut_kontrol_bitti, ist)
+
+    def _toplu_sut_sonuc_uygula(self, satirlar: list, parca: list,
+                                 islenen: int, toplam: int) -> None:
+        # Bu arada yeni sorgu yapıldıysa eski dönemin sonuçları atılır
+        if satirlar is not self.tum_satirlar:
+            return
+        for s, kategori, rapor in parca:
+            self._kontrol_raporunu_satira_yaz(s, rapor, kategori=kategori or "")
+        if parca:
+            self._tabloyu_yenile()
+        self._durum_yaz(f"⚡ Toplu SUT kontrolü: {islenen}/{toplam} kalem")
+
+    def _toplu_sut_kontrol_bitti(self, ist) -> None:
+        self._toplu_kontrol_calisiyor = False
+        logger.info("Toplu SUT kontrolü:\n%s", ist.rapor())
+        en_uzun = sorted(ist.kategoriler.items(), key=lambda kv: -kv[1].toplam_sn)[:3]
+        ozet = ", ".join(f"{ad} {k.toplam_sn:.1f} sn" for ad, k in en_uzun)
+        self._durum_yaz(
+            f"⚡ Toplu SUT kontrolü bitti — {ist.kalem} kalem, "
+            f"{ist.duvar_sn:.1f} sn ({ist.isci or 1} süreç)"
+            + (f", {ist.hata} hata" if ist.hata else "")
+            + (f" · en uzun: {ozet}" if ozet else ""))
+
     def _pasif_detay_toggle(self) -> None:
         """Pasif yolak gösterimini aç/kapat: özet ↔ detaylı."""
         self._sema_pasif_detayli = not getattr(self, "_sema_pasif_detayli",
@@ -4893,22 +4998,15 @@ class AylikReceteSorguGUI:
         """Tam ekran şemada filtrelenmiş satırlar arasında gezin.
 
         yon: -1 önceki, +1 sonraki
-        Filtrelenmiş+görünen satırlar tv.get_children() ile alınır;
+        Filtrelenmiş+görünen satırlar sanal ızgaranın sırasından alınır;
         uçlara gelince clamp (wrap-around yapmaz).
         """
-        try:
-            cocuklar = list(self.tv.get_children())
-        except Exception:
-            cocuklar = []
+        cocuklar = self._grid.gorunen_iidler()
         if not cocuklar:
             return
-        sec = self.tv.selection()
-        if sec:
-            try:
-                idx = cocuklar.index(sec[0])
-            except ValueError:
-                idx = -1 if yon > 0 else len(cocuklar)
-        else:
+        sec = self._grid.vurgulananlar()
+        idx = self._grid.konum(sec[0]) if sec else -1
+        if idx < 0:
             idx = -1 if yon > 0 else len(cocuklar)
         yeni = idx + yon
         if yeni < 0:
@@ -4918,12 +5016,7 @@ class AylikReceteSorguGUI:
         if yeni == idx:
             return  # uçtayız, hareket yok
         yeni_iid = cocuklar[yeni]
-        try:
-            self.tv.selection_set(yeni_iid)
-            self.tv.focus(yeni_iid)
-            self.tv.see(yeni_iid)
-        except Exception:
-            pass
+        self._grid.sec(yeni_iid)
         # <<TreeviewSelect>> otomatik _sema_secim_guncelle tetikler;
         # yine de güvenli yan: after ile gecikmeli çağrı
         self.root.after(40, self._sema_secim_guncelle)
@@ -4931,14 +5024,10 @@ class AylikReceteSorguGUI:
     def _sema_nav_lbl_guncelle(self) -> None:
         """'Reçete X / Y' sayaç label'larını güncelle (panel + tam ekran)."""
         try:
-            cocuklar = list(self.tv.get_children())
-            toplam = len(cocuklar)
-            sec = self.tv.selection()
+            toplam = len(self._grid)
+            sec = self._grid.vurgulananlar()
             if sec:
-                try:
-                    idx = cocuklar.index(sec[0]) + 1
-                except ValueError:
-                    idx = 0
+                idx = self._grid.konum(sec[0]) + 1
             else:
                 idx = 0
             metin_kisa = f"{idx}/{toplam}"
@@ -5059,13 +5148,7 @@ class AylikReceteSorguGUI:
             self._teyit_map[g_iid] = teyit_sonucu
             g_satir["teyit"] = recete_teyit_db.rozet(teyit_sonucu)
             self.satir_renkleri[g_iid] = yeni_renk
-            try:
-                values = tuple(verdict_daire_goster(k, str(g_satir.get(k, "")))
-                               for k in SUTUN_KOD)
-                self.tv.item(g_iid, values=values,
-                             tags=(yeni_renk, "teyit_bold"))
-            except Exception:
-                pass
+            self._grid.yenile(g_iid)
             basarili += 1
         if not basarili:
             try:
@@ -5104,7 +5187,7 @@ class AylikReceteSorguGUI:
         """
         # 1) Hedef ri_idleri belirle
         try:
-            sec = list(self.tv.selection())
+            sec = self._grid.vurgulananlar()
         except Exception:
             sec = []
         hedef_iidler = sec or list(getattr(self, "secili_iidler", set()) or [])
@@ -5166,13 +5249,7 @@ class AylikReceteSorguGUI:
             self._teyit_map[iid] = teyit_sonucu
             satir["teyit"] = recete_teyit_db.rozet(teyit_sonucu)
             self.satir_renkleri[iid] = yeni_renk
-            try:
-                values = tuple(verdict_daire_goster(k, str(satir.get(k, "")))
-                               for k in SUTUN_KOD)
-                self.tv.item(iid, values=values,
-                             tags=(yeni_renk, "teyit_bold"))
-            except Exception:
-                pass
+            self._grid.yenile(iid)
             basarili += 1
 
         # 4) Renk state'ini kalıcı kaydet
@@ -5205,7 +5282,7 @@ class AylikReceteSorguGUI:
         2026-06-03: her ilaç müstakil teyit/kaldırma).
         """
         try:
-            sec = list(self.tv.selection())
+            sec = self._grid.vurgulananlar()
         except Exception:
             sec = []
         hedef_iidler = sec or list(getattr(self, "secili_iidler", set()) or [])
@@ -5237,12 +5314,7 @@ class AylikReceteSorguGUI:
             satir["teyit"] = ""
             # Manuel teyit ile boyanan rengi sıfırla (yeşil/sarı/kırmızı → beyaz)
             self.satir_renkleri[iid] = RENK_BEYAZ
-            try:
-                values = tuple(verdict_daire_goster(k, str(satir.get(k, "")))
-                               for k in SUTUN_KOD)
-                self.tv.item(iid, values=values, tags=(RENK_BEYAZ,))
-            except Exception:
-                pass
+            self._grid.yenile(iid)
             silinen += 1
 
         # Renk state'ini kalıcı kaydet
@@ -5268,10 +5340,7 @@ class AylikReceteSorguGUI:
         dokunulmaz). Aktif teyiti olmayan satırlar atlanır.
         """
         # Görünen satırlar (filtreden geçenler)
-        try:
-            gorunen_iidler = list(self.tv.get_children())
-        except Exception:
-            gorunen_iidler = []
+        gorunen_iidler = self._grid.gorunen_iidler()
         if not gorunen_iidler:
             try:
                 messagebox.showinfo(
@@ -5327,12 +5396,7 @@ class AylikReceteSorguGUI:
             self._teyit_map.pop(iid, None)
             satir["teyit"] = ""
             self.satir_renkleri[iid] = RENK_BEYAZ
-            try:
-                values = tuple(verdict_daire_goster(k, str(satir.get(k, "")))
-                               for k in SUTUN_KOD)
-                self.tv.item(iid, values=values, tags=(RENK_BEYAZ,))
-            except Exception:
-                pass
+            self._grid.yenile(iid)
             silinen += 1
 
         self._state_kaydet()
@@ -5364,7 +5428,7 @@ class AylikReceteSorguGUI:
         için temizleme sonrası hücreler boş görünür.
         """
         try:
-            sec = list(self.tv.selection())
+            sec = self._grid.vurgulananlar()
         except Exception:
             sec = []
         hedef_iidler = sec or list(getattr(self, "secili_iidler", set()) or [])
@@ -5522,7 +5586,7 @@ class AylikReceteSorguGUI:
     def _sema_secim_guncelle(self, _event=None) -> None:
         """Treeview'de seçilen reçete için şema panelini günceller."""
         try:
-            secimler = self.tv.selection()
+            secimler = self._grid.vurgulananlar()
             if not secimler:
                 self._sema_temizle("Bir reçete satırı seçin")
                 # Tam ekran nav/teyit etiketlerini de temizle
@@ -10606,7 +10670,7 @@ class AylikReceteSorguGUI:
         self.tum_satirlar = []
         self.satir_indeks = {}
         self.satir_renkleri = {}
-        self.tv.delete(*self.tv.get_children())
+        self._grid.temizle()
 
         # Dönem etiketi (renk state'i bu anahtara kaydedilir)
         def _yil_etiketi(yl):
@@ -10636,13 +10700,15 @@ class AylikReceteSorguGUI:
         self._durum_yaz(f"{self.aktif_donem} dönemi sorgulanıyor (ilaç bazlı)…")
         # 🔒 Kilitle — bu noktadan sonra ikinci sorgu başlatılamaz.
         self._sorgu_kilidini_kapat()
+        self._akis_durumu = None  # akışlı parti render durumu (ilk parti kurar)
         threading.Thread(target=self._sorgu_threadi, args=(yillar, aylar, gunler),
                           daemon=True).start()
 
     def _sorgu_threadi(self, yillar, aylar, gunler=None):
         """yillar/aylar/gunler: None → 'Tümü' (filtre yok); aksi halde int listesi.
-        Çoklu yıl/ay seçimi `YEAR(...) IN (?, ?, ...)` ve
-        `MONTH(...) IN (?, ?, ...)` olarak SQL'e yansır (kartezyen filtre).
+        Çoklu yıl/ay/gün seçimi (kartezyen filtre) sql_tarih_araligi ile
+        birleştirilmiş `RxKayitTarihi >= ? AND RxKayitTarihi < ?`
+        aralıklarına derlenir (sargable — YEAR()/MONTH() IN yerine).
         gizle_bos_satirlar AÇIKsa: SQL düzeyinde uyarı kodu / mesaj / rapor
         kodu hiçbiri olmayan satırlar baştan elenir → daha az veri, daha
         hızlı yükleme."""
@@ -10652,18 +10718,13 @@ class AylikReceteSorguGUI:
             # OUTER APPLY ile her ilaç için en uygun (en yeni) aktif raporu seç
             where_parts = ["ra.RxSilme = 0"]
             params = []
-            if yillar is not None and len(yillar) > 0:
-                placeholders = ",".join(["?"] * len(yillar))
-                where_parts.append(f"YEAR(ra.RxKayitTarihi) IN ({placeholders})")
-                params.extend(int(y) for y in yillar)
-            if aylar is not None and len(aylar) > 0:
-                placeholders = ",".join(["?"] * len(aylar))
-                where_parts.append(f"MONTH(ra.RxKayitTarihi) IN ({placeholders})")
-                params.extend(int(a) for a in aylar)
-            if gunler is not None and len(gunler) > 0:
-                placeholders = ",".join(["?"] * len(gunler))
-                where_parts.append(f"DAY(ra.RxKayitTarihi) IN ({placeholders})")
-                params.extend(int(g) for g in gunler)
+            # 📅 Dönem filtresi: seçim yarı-açık RxKayitTarihi aralıklarına
+            # derlenir (bitişik aylar/günler birleşir) → indeks seek.
+            donem_kos, donem_params = donem_kosulu(
+                "ra.RxKayitTarihi", yillar, aylar, gunler)
+            if donem_kos:
+                where_parts.append(donem_kos)
+                params.extend(donem_params)
 
             # 🚫 Kurum dışlama (özel sigorta vb. — toggle'dan bağımsız her zaman)
             # Eski "Dışlamalar" butonu yerine: Filtre Ayarları > Kurum sekmesi.
@@ -10760,36 +10821,46 @@ class AylikReceteSorguGUI:
             where_sql = " AND ".join(where_parts)
 
             sql = self._recete_sorgu_sql(where_sql)
-            try:
-                rows = self.db.sorgu_calistir(sql, tuple(params))
-                logger.info(f"Sorgu OK: {len(rows)} ilaç satırı")
-                # Güvenlik satır limiti dolduysa kullanıcıyı uyar — sonuç eksik
-                # olabilir; daha dar dönem / filtre önerilir.
-                if len(rows) >= MAKS_SATIR_LIMITI:
-                    logger.warning(
-                        "Satır limiti doldu (%d) — sonuç sınırlandı",
-                        MAKS_SATIR_LIMITI)
-                    self.root.after(0, lambda: messagebox.showwarning(
-                        "Sonuç Sınırlandı",
-                        f"Sonuç güvenlik üst sınırına ({MAKS_SATIR_LIMITI:,} "
-                        "satır) ulaştı ve kesildi. Tüm satırlar gösterilmiyor "
-                        "olabilir.\n\nDaha dar bir dönem seçin veya filtreyi "
-                        "(Kullan) açın.".replace(",", "."),
-                        parent=self.root))
-            except Exception as e_sql:
-                logger.error("Tam sorgu fail: %s", e_sql)
+            # 🌊 Akışlı çekim: sonuç AKIS_PARTI_BOYUTU'luk partiler halinde
+            # gelir; her parti ayrı işlenip tabloya eklenir. Tüm sonuç hiçbir
+            # an ham dict listesi olarak bellekte tutulmaz, ilk satırlar
+            # sorgunun tamamı beklenmeden ekrana düşer.
+            toplam = 0
+            for parti in self.db.sorgu_akis(sql, tuple(params),
+                                            batch=AKIS_PARTI_BOYUTU):
+                # Sonuçları yapıya çevir (ortak post-processing — canlı kontrol de kullanır)
+                satirlar_parti = self._rows_to_satirlar(parti)
+                toplam += len(satirlar_parti)
+                self.root.after(0, self._sorgu_parti_geldi, satirlar_parti)
+
+            sql_hata = self.db.son_sorgu_hatasi
+            if sql_hata:
+                logger.error("Tam sorgu fail: %s", sql_hata)
                 # Hata kullanıcıya göster
-                hata_msg = str(e_sql)
                 self.root.after(0, lambda: messagebox.showerror(
-                    "SQL Hatası", f"Sorgu fail:\n{hata_msg[:300]}"), parent=self.root)
-                self.root.after(0, lambda: self.lbl_sayim.config(text=f"SQL Hata"))
-                self.root.after(0, self._durum_yaz, f"SQL Hata: {hata_msg[:120]}")
-                return
+                    "SQL Hatası", f"Sorgu fail:\n{sql_hata[:300]}",
+                    parent=self.root))
+                if toplam == 0:
+                    self.root.after(0, lambda: self.lbl_sayim.config(text=f"SQL Hata"))
+                    self.root.after(0, self._durum_yaz, f"SQL Hata: {sql_hata[:120]}")
+                    return
 
-            # Sonuçları yapıya çevir (ortak post-processing — canlı kontrol de kullanır)
-            satirlar = self._rows_to_satirlar(rows)
+            logger.info(f"Sorgu OK: {toplam} ilaç satırı")
+            # Güvenlik satır limiti dolduysa kullanıcıyı uyar — sonuç eksik
+            # olabilir; daha dar dönem / filtre önerilir.
+            if toplam >= MAKS_SATIR_LIMITI:
+                logger.warning(
+                    "Satır limiti doldu (%d) — sonuç sınırlandı",
+                    MAKS_SATIR_LIMITI)
+                self.root.after(0, lambda: messagebox.showwarning(
+                    "Sonuç Sınırlandı",
+                    f"Sonuç güvenlik üst sınırına ({MAKS_SATIR_LIMITI:,} "
+                    "satır) ulaştı ve kesildi. Tüm satırlar gösterilmiyor "
+                    "olabilir.\n\nDaha dar bir dönem seçin veya filtreyi "
+                    "(Kullan) açın.".replace(",", "."),
+                    parent=self.root))
 
-            self.root.after(0, self._sorgu_bitti, satirlar)
+            self.root.after(0, self._sorgu_akis_bitti)
         except Exception as e:
             logger.exception("Sorgu hatası: %s", e)
             self.root.after(0, self._durum_yaz, f"Sorgu hatası: {e}")
@@ -10920,6 +10991,9 @@ class AylikReceteSorguGUI:
     def _rows_to_satirlar(self, rows: list) -> list:
         """Ham DB row listesini (ana SQL çıktısı) satır dict listesine çevir.
 
+        rows: sorgu_calistir dict'leri ya da sorgu_akis partisi (AkisSatiri —
+        r["Kolon"] / r.get("Kolon") ikisinde de çalışır).
+
         Toplu lookup sorgularını yapar + her row için _satir_olustur çağırır.
         Hem dönem sorgusu hem Anlık Reçete Kontrolü kullanır.
         """
@@ -11722,6 +11796,63 @@ class AylikReceteSorguGUI:
         self._sayaclari_guncelle()
         self._durum_yaz(f"{len(satirlar)} satır geldi (ilaç bazlı)")
 
+    def _sorgu_parti_geldi(self, parti: list):
+        """Akışlı dönem sorgusunun bir partisi geldi — satırları tabloya EKLER.
+
+        İlk partide tablo/state bir kez hazırlanır; sonraki partilerde tam
+        yeniden çizim yapılmaz, sadece yeni satırlar filtreden geçirilip
+        eklenir. Kullanıcı ilk satırları sorgu bitmeden görür.
+        """
+        if self._akis_durumu is None:
+            self.tum_satirlar = []
+            self.satir_indeks = {}
+            self._grid.temizle()
+            self.gosterilen_iids = set()
+            self._sutun_gorunumunu_uygula()
+            self._akis_durumu = {
+                "renkler": self._state_yukle_donem(self.aktif_donem),
+                "baglam": self._tablo_render_baglami(),
+            }
+        kayitli_renkler = self._akis_durumu["renkler"]
+        baglam = self._akis_durumu["baglam"]
+        # Bağlam ilk partide (boş tabloyla) kuruldu — teyit/AI kayıtlarını
+        # partinin satırları için ekle
+        parti_iidler = [str(s["ri_id"]) for s in parti]
+        try:
+            self._teyit_map.update(recete_teyit_db.teyit_haritasi(parti_iidler))
+            baglam["ai_map"].update(recete_teyit_db.ai_sonuc_haritasi(parti_iidler))
+        except Exception:
+            pass
+        baglam["durum"].teyit_harita = self._teyit_map
+
+        eklenen = []
+        for s in parti:
+            iid = str(s["ri_id"])
+            self.satir_indeks[iid] = s
+            self.satir_renkleri[iid] = kayitli_renkler.get(iid, RENK_BEYAZ)
+            self.tum_satirlar.append(s)
+            if self._satir_gorunur_mu(s, baglam):
+                eklenen.append(iid)
+        self._grid.ekle(eklenen)
+
+        self._sayaclari_guncelle()
+        self._durum_yaz(f"{len(self.tum_satirlar)} satır yüklendi, "
+                        "sorgu sürüyor…")
+
+    def _sorgu_akis_bitti(self):
+        """Akışlı dönem sorgusu tamamlandı — _sorgu_bitti ile aynı son durum
+        (seçim kırpma, filtre sayımları), tam yeniden çizim olmadan."""
+        if self._akis_durumu is None:
+            # Hiç satır gelmedi
+            self._sorgu_bitti([])
+            return
+        self._akis_durumu = None
+        if self.secili_iidler:
+            self.secili_iidler &= self.gosterilen_iids
+        self._filtre_sayimlarini_guncelle()
+        self._sayaclari_guncelle()
+        self._durum_yaz(f"{len(self.tum_satirlar)} satır geldi (ilaç bazlı)")
+
     # ----------------------------------------------------------- TABLO RENDER
     @staticmethod
     def _sart_raporu_metni(s: dict) -> str:
@@ -11843,336 +11974,298 @@ class AylikReceteSorguGUI:
         except Exception:
             s["verdict_sartlar"] = ""
 
-    def _tabloyu_yenile(self):
-        """tum_satirlar + filtreler + renk filtresi → tv'ye doldur.
+    def _tabloyu_yenile(self, veri_degisti: bool = True):
+        """tum_satirlar + filtreler + renk filtresi → sanal ızgaraya ver.
+        Filtreler filtre_indeksi üzerinde satır maskesi olarak hesaplanır;
+        hücre metinleri satır ekranda göründükçe _satir_render ile üretilir.
+
+        veri_degisti=False (_filtre_degisti): yalnız filtre durumu değişti —
+        sütun indeksleri, teyit/AI haritaları ve render önbelleği korunur,
+        ızgaraya sadece eklenen/çıkan satırlar uygulanır. Satır verisi veya
+        sırası değiştiyse (boyama, kontrol, sıralama, yeni sorgu) varsayılan
+        True ile indeks yeniden kurulur.
         Filtreyle gizlenen satırlar seçim setinden de düşer; bu sayede sonraki
         boyama işlemlerinde sadece ekrandaki seçimler işleme alınır."""
-        self.tv.delete(*self.tv.get_children())
-        self.gosterilen_iids = set()
+        yeniden = veri_degisti or self._filtre_indeksi is None
+        if yeniden:
+            baglam = self._tablo_render_baglami()
+            for iid, ai_kayit in baglam["ai_map"].items():
+                s = self.satir_indeks.get(str(iid))
+                if s is not None:
+                    self._ai_sonucunu_isle(s, ai_kayit)
+            self._filtre_indeksi = None
+        indeks = self._filtre_indeksi_al()
+        if yeniden:
+            # Sık filtrelenen SQL sütunlarını boşta önceden kodla
+            try:
+                self.root.after_idle(indeks.hazirla)
+            except Exception:
+                pass
+        self._turetilmis_sutunlari_doldur()
+        maske = filtre_maskesi(indeks, self._filtre_durumu())
+        eklenen, cikan = indeks.fark(maske)
+        if yeniden:
+            gorunen = indeks.iidler(maske)
+            self.gosterilen_iids = set(gorunen)
+            self._grid.veri_ayarla(gorunen)
+        elif eklenen or cikan:
+            gorunen = indeks.iidler(maske)
+            if len(eklenen) + len(cikan) < len(gorunen):
+                self.gosterilen_iids.difference_update(cikan)
+                self.gosterilen_iids.update(eklenen)
+            else:
+                self.gosterilen_iids = set(gorunen)
+            self._grid.veri_ayarla(gorunen, onbellegi_koru=True)
 
-        # Reçete türü filtresi — SADECE kapatılan tipler dışlanır.
-        # Default (hepsi açık) ya da bilinmeyen tip → satır geçer.
-        gizli_recete_turleri = {
-            ad for ad, v in (self.var_recete_turu or {}).items()
-            if not v.get()
-        } if hasattr(self, "var_recete_turu") and self.var_recete_turu else set()
+        # Filtre ile gizlenen satırların seçimini de düşür — kullanıcının
+        # "sadece görünenleri boyuyorum" beklentisini garanti eder.
+        if self.secili_iidler:
+            self.secili_iidler &= self.gosterilen_iids
 
-        # Teyit haritasını yükle (DB'den toplu, tek sorgu)
-        try:
-            teyit_map = recete_teyit_db.teyit_haritasi()
+        # Verdict ve teyit checkbox label'larına sayım yansıt
+        self._filtre_sayimlarini_guncelle()
+
+    def _filtre_degisti(self):
+        """Yalnız filtre durumu değişti (checkbox, arama kutusu, değer/metin
+        filtresi) — satır verisi aynı, artımlı yenileme yeterli."""
+        self._tabloyu_yenile(veri_degisti=False)
+
+    def _filtre_indeksi_al(self) -> FiltreIndeksi:
+        """tum_satirlar için filtre indeksi; liste değiştiyse (yeni sorgu,
+        akışlı partiler) yeniden kurulur."""
+        indeks = self._filtre_indeksi
+        if (indeks is None or indeks.satirlar is not self.tum_satirlar
+                or len(indeks) != len(self.tum_satirlar)):
+            indeks = self._filtre_indeksi = FiltreIndeksi(self.tum_satirlar)
+        return indeks
+
+    def _tablo_render_baglami(self) -> dict:
+        """Tablo yenilemesi için bir kez hesaplanan bağlam (filtre durumu,
+        teyit ve AI haritaları). _tabloyu_yenile ve akışlı parti ekleme
+        (_sorgu_parti_geldi) ortak kullanır."""
+        # Teyit haritası — sadece tablodaki satırlar (noktasal, önbellekli)
+        ri_idler = list(self.satir_indeks)
+        try:
+            teyit_map = recete_teyit_db.teyit_haritasi(ri_idler)
         except Exception:
             teyit_map = {}
         self._teyit_map = teyit_map
 
         # AI Kontrol sonuç haritası (DB'den kaydedilmiş AI değerlendirmeleri)
         try:
-            ai_map = recete_teyit_db.ai_sonuc_haritasi()
+            ai_map = recete_teyit_db.ai_sonuc_haritasi(ri_idler)
         except Exception:
             ai_map = {}
         self._ai_map = ai_map
 
-        for s in self.tum_satirlar:
-            iid = str(s["ri_id"])
-            if not self._satir_filtreden_geciyor_mu(s):
-                continue
-            renk = self.satir_renkleri.get(iid, RENK_BEYAZ)
-            if renk not in self.aktif_renk_filtre:
-                continue
-            # AI sonucu — daha önce kaydedilmiş varsa satıra enjekte et
-            ai_kayit = ai_map.get(iid)
-            if ai_kayit:
-                if not s.get("ai_kars"):
-                    from recete_kontrol.ai_kontrol.sonuc_parser import ETIKET_KISA
-                    s["ai_kars"] = ETIKET_KISA.get(
-                        ai_kayit["ai_sonuc"], ai_kayit["ai_sonuc"])
-                if not s.get("ai_aciklama"):
-                    s["ai_aciklama"] = ai_kayit["ai_aciklama"]
-            # Reçete türü filtresi: sadece kullanıcının kapattığı tipleri ele
-            if gizli_recete_turleri:
-                rec_tip = (s.get("rec_tip") or "").strip()
-                if rec_tip in gizli_recete_turleri:
-                    continue
-            # Seçim göstergesi (☐/☑)
-            s["secim"] = "☑" if iid in self.secili_iidler else "☐"
-            # Teyit rozeti (✓ / ✗ / ? / boş)
-            teyit_sonucu = teyit_map.get(iid, "")
-            s["teyit"] = recete_teyit_db.rozet(teyit_sonucu)
-            # Şart raporu sütunu: verdict_* alanlarından kompakt özet
-            s["verdict_sart_raporu"] = self._sart_raporu_metni(s)
-            # Kod+tarih fallback ise rapor kod/teşhis hücrelerini ⚠ ile işaretle
-            fallback_kod_tarih = (
-                s.get("rapor_secim_kaynagi") == "tier0_kod_tarih_fallback")
-            # SR var ama RaporAna yok — rapor Botanik EOS'a indirilmemiş.
-            # rap_kod RIRaporKodId üzerinden dolar ama rap_tesh / rap_ack
-            # boş kalır. Satırı görsel olarak işaretle.
-            rapor_eos_eksik = (
-                s.get("rapor_secim_kaynagi") == "tier0_sr_no_rapana")
-            if fallback_kod_tarih:
-                values_list = []
-                for k in SUTUN_KOD:
-                    v = str(s.get(k, ""))
-                    if k in ("rap_kod", "rap_tesh_tak") and v:
-                        v = f"⚠ {v}"
-                    else:
-                        v = verdict_daire_goster(k, v)
-                    values_list.append(v)
-                values = tuple(values_list)
-            else:
-                values = tuple(verdict_daire_goster(k, str(s.get(k, "")))
-                               for k in SUTUN_KOD)
-            tags = [renk]
-            if teyit_sonucu:
-                tags.append("teyit_bold")
-            if fallback_kod_tarih:
-                tags.append("fallback_kirmizi")
-            if rapor_eos_eksik:
-                tags.append("rapor_eos_eksik")
-            self.tv.insert("", "end", iid=iid, values=values, tags=tuple(tags))
-            self.gosterilen_iids.add(iid)
-
-        # Filtre ile gizlenen satırların seçimini de düşür — kullanıcının
-        # "sadece görünenleri boyuyorum" beklentisini garanti eder.
-        if self.secili_iidler:
-            self.secili_iidler &= self.gosterilen_iids
-
-        # Verdict ve teyit checkbox label'larına sayım yansıt
-        self._filtre_sayimlarini_guncelle()
-
-    def _filtre_sayimlarini_guncelle(self):
-        """Verdict ve teyit filtre checkbox'larının yanındaki '(N)' sayım
-        rozetini günceller. Sayımlar tum_satirlar üzerinden (filtresiz) yapılır
-        — kullanıcı 'bu etikette toplam kaç satır var' bilgisini görür."""
-        # ── Verdict sayımları ──
-        cbs = getattr(self, "_verdict_filtre_cbs", None)
-        temel = getattr(self, "_verdict_filtre_temel", None)
-        if cbs and temel:
-            sayim = {etk: 0 for etk in cbs.keys()}
-            for s in (self.tum_satirlar or []):
-                etk = (s.get("verdict") or "").strip()
-                if etk in sayim:
-                    sayim[etk] += 1
-                else:
-                    sayim[""] = sayim.get("", 0) + 1  # bilinmeyen → "boş" bucket
-            for etk, cb in cbs.items():
-                try:
-                    cb.config(text=f"{temel[etk]} ({sayim.get(etk, 0)})")
-                except Exception:
-                    pass
-
-        # ── Teyit sayımları ──
-        cbs_t = getattr(self, "_teyit_filtre_cbs", None)
-        temel_t = getattr(self, "_teyit_filtre_temel", None)
-        if cbs_t and temel_t:
-            tmap = getattr(self, "_teyit_map", {}) or {}
-            sayim_t = {k: 0 for k in cbs_t.keys()}
-            for s in (self.tum_satirlar or []):
-                iid = str(s.get("ri_id") or "")
-                tyt = str(tmap.get(iid) or "")
-                if tyt in sayim_t:
-                    sayim_t[tyt] += 1
-                else:
-                    sayim_t[""] = sayim_t.get("", 0) + 1
-            for k, cb in cbs_t.items():
-                try:
-                    cb.config(text=f"{temel_t[k]} ({sayim_t.get(k, 0)})")
-                except Exception:
-                    pass
+        return {
+            "durum": self._filtre_durumu(),
+            "teyit_map": teyit_map,
+            "ai_map": ai_map,
+            "sart_raporu_gerekli": self._sutun_filtreli_mi("verdict_sart_raporu"),
+        }
 
-    def _satir_filtreden_geciyor_mu(self, s: dict, haric_kod: str = None) -> bool:
-        """Sütun arama kutuları + Excel-benzeri değer filtreleri ile filtre.
+    def _turetilmis_sutunlari_doldur(self):
+        """Ekranda üretilen sütunlarda (şart raporu, seçim, teyit rozeti) filtre
+        varsa değerler filtreden önce tüm satırlar için üretilmeli (normalde
+        satır ekranda göründüğünde _satir_render üretir)."""
+        if self._sutun_filtreli_mi("verdict_sart_raporu"):
+            for s in self.tum_satirlar:
+                s["verdict_sart_raporu"] = self._sart_raporu_metni(s)
+        if self._sutun_filtreli_mi("secim"):
+            for iid, s in self.satir_indeks.items():
+                s["secim"] = "☑" if iid in self.secili_iidler else "☐"
+        if self._sutun_filtreli_mi("teyit"):
+            tmap = getattr(self, "_teyit_map", None) or {}
+            for iid, s in self.satir_indeks.items():
+                s["teyit"] = recete_teyit_db.rozet(tmap.get(iid, ""))
+
+    def _sutun_filtreli_mi(self, kod: str) -> bool:
+        """Sütunda arama kutusu, değer veya metin filtresi aktif mi?"""
+        arama = getattr(self, "arama_varlari", {}).get(kod)
+        return bool(
+            (arama is not None and (arama.get() or "").strip()
+             and not getattr(self, "_placeholder_aktif", {}).get(kod))
+            or getattr(self, "aktif_deger_filtre", {}).get(kod)
+            or getattr(self, "aktif_metin_filtre", {}).get(kod))
+
+    def _filtre_durumu(self, haric_kod: str = None) -> FiltreDurumu:
+        """Tk filtre değişkenlerinin anlık görüntüsü (filtre_indeksi için):
+        kontrolü gereksiz ilaçlar, msj/rapor switch'leri, verdict ve teyit
+        etiketleri, sütun arama kutuları, Excel-benzeri değer ve metin
+        operatör filtreleri, renk ve reçete türü.
 
         haric_kod: Verildiğinde o sütunun kendi filtresi yoksayılır.
                    (Kaskad filtre popup'ı için — bir sütunun filtre popup'ı
                    açıldığında o sütunun filtresi diğer sütunlardaki seçenekleri
                    kısıtlamamalı, ama diğer sütunların filtreleri uygulanmalı.)
         """
-        # -1) Kontrolü gereksiz ilaç filtresi — kutu açıksa listedeki ilaçları
-        # (ad/ATC önek/etken) gizle. En hızlı kısa devre için en başta.
+        durum = FiltreDurumu(
+            teyit_harita=getattr(self, "_teyit_map", None) or {},
+            renkler=self.satir_renkleri,
+            renk_acik=set(self.aktif_renk_filtre),
+            varsayilan_renk=RENK_BEYAZ)
+        # Kontrolü gereksiz ilaçlar (1. ve 2. kademe) — kutu açıksa
+        # listedeki ilaçlar (ad/ATC önek/etken) gizlenir.
         try:
             if self.kontrol_disi_filtre_aktif.get():
-                setler = getattr(self, "_kontrol_disi_setler", None)
-                if setler and any(setler) and kdi.eslesir_mi(
-                        s.get("ilac"), s.get("atc"), s.get("etkin"), setler):
-                    return False
+                durum.kontrol_disi.append(
+                    (kdi.eslesir_mi, getattr(self, "_kontrol_disi_setler", None)))
         except Exception:
             pass
-        # -0.8) 🚫² Kontrolü gereksiz 2. KADEME — 1. kademe ile aynı mantık:
-        # ilaç 2. kademe listesindeyse gizle, başka koşul yok. Hangi ilacın
-        # 2. kademe olduğu tamamen kullanıcının kararıdır (2026-07-07).
         try:
             if self.kontrol_disi2_filtre_aktif.get():
-                setler2 = getattr(self, "_kontrol_disi2_setler", None)
-                if setler2 and any(setler2) and kdi2.eslesir_mi(
-                        s.get("ilac"), s.get("atc"), s.get("etkin"), setler2):
-                    return False
+                durum.kontrol_disi.append(
+                    (kdi2.eslesir_mi, getattr(self, "_kontrol_disi2_setler", None)))
         except Exception:
             pass
-        # -0.5) 💬 İlaç mesajı 3-konum switch — "var"/"yok" seçiliyse sadece
-        # o Msj değerine sahip satırlar görünür ("hepsi" = filtre yok).
+        # 💬 Msj (hepsi/var/yok) ve 📄 Rapor (hepsi/raporlu/raporsuz) switch'leri
         try:
-            mod_msj = self.msj_filtre_mod.get()
-            if mod_msj in ("var", "yok"):
-                if (s.get("msj") or "").strip().lower() != mod_msj:
-                    return False
+            durum.msj_mod = self.msj_filtre_mod.get()
         except Exception:
             pass
-        # -0.4) 📄 Raporlu/Raporsuz 3-konum switch — Rapor Kod (rap_kod)
-        # dolu = raporlu, boş = raporsuz ("hepsi" = filtre yok).
         try:
-            mod_rap = self.rapor_filtre_mod.get()
-            if mod_rap in ("raporlu", "raporsuz"):
-                raporlu = bool((s.get("rap_kod") or "").strip())
-                if mod_rap == "raporlu" and not raporlu:
-                    return False
-                if mod_rap == "raporsuz" and raporlu:
-                    return False
+            durum.rapor_mod = self.rapor_filtre_mod.get()
         except Exception:
             pass
-        # 0) Verdict (kontrol sonucu) filtresi — row_verdict checkbox'ları.
-        # Etiketi işaretsiz olan satırları en başta ele (en hızlı kısa devre).
-        # Bilinmeyen etiketler "ŞÜPHELİ" altında değerlendirilir (varsayılan
-        # mapping VERDICT_ETIKET ile uyumlu).
-        try:
-            v_filtre = getattr(self, "var_verdict_filtre", None)
-            if v_filtre:
-                etk = (s.get("verdict") or "").strip()
-                bvar = v_filtre.get(etk)
-                # Bilinmeyen etiket (ATLANDI vb.) → "" (boş) bucket'ına eşitle
-                if bvar is None:
-                    bvar = v_filtre.get("")
-                if bvar is not None and not bvar.get():
-                    return False
+        # Verdict ve manuel teyit etiketleri — işaretsiz etiket gizlenir
+        try:
+            durum.verdict_filtre = {
+                etk: bool(v.get())
+                for etk, v in (getattr(self, "var_verdict_filtre", None) or {}).items()}
         except Exception:
             pass
-        # 0b) Manuel teyit filtresi — recete_teyit_db sonucu (UYGUN/SUPHELI/UYGUN_DEGIL).
-        # Teyit edilmemiş satırlar "" bucket'ında.
-        try:
-            t_filtre = getattr(self, "var_teyit_filtre", None)
-            if t_filtre:
-                iid = str(s.get("ri_id") or "")
-                tyt = ""
-                tmap = getattr(self, "_teyit_map", None)
-                if tmap:
-                    tyt = str(tmap.get(iid) or "")
-                bvar = t_filtre.get(tyt)
-                if bvar is None:
-                    bvar = t_filtre.get("")
-                if bvar is not None and not bvar.get():
-                    return False
+        try:
+            durum.teyit_filtre = {
+                tyt: bool(v.get())
+                for tyt, v in (getattr(self, "var_teyit_filtre", None) or {}).items()}
         except Exception:
             pass
-        # 1) Alt sütun arama kutuları (içerir) — placeholder metni filtreye
-        # etki etmesin diye atla.
-        # Boşlukla ayrılmış kelimeler AND ile birleşir; aralarındaki diğer
-        # karakterler/sözcükler önemsiz. Her kelime hücre içinde substring
-        # olarak geçmeli. Örn: "metfor sülf maks" araması, hücredeki
-        # "...metformin ve sülfonil ürelerin maksimum tolere..." metniyle
-        # eşleşir.
+        # Alt sütun arama kutuları — placeholder metni filtreye etki etmesin
+        placeholder = getattr(self, "_placeholder_aktif", {})
         for kod, var in self.arama_varlari.items():
-            if kod == haric_kod:
-                continue
-            if (getattr(self, "_placeholder_aktif", {})
-                    .get(kod)):
-                continue
-            ara = _tr_lower((var.get() or "").strip())
-            if not ara:
-                continue
-            deger = _tr_lower(str(s.get(kod, "")))
-            parcalar = ara.split()
-            if not all(p in deger for p in parcalar):
-                return False
-        # 2) Excel-benzeri değer filtreleri (set içinde mi?)
-        for kod, secili in self.aktif_deger_filtre.items():
-            if kod == haric_kod:
-                continue
-            if not secili:
-                continue
-            if str(s.get(kod, "")) not in secili:
-                return False
-        # 3) Excel-tarzı metin operatör filtreleri (başlar/biter/içerir...)
-        #    Çoklu koşul: VEYA grup ayırıcı, VE grup içi. Eşleşme = bir grubun
-        #    tüm koşulları sağlanır (gruplar OR ile birleşir).
-        for kod, kosullar in self.aktif_metin_filtre.items():
-            if kod == haric_kod:
-                continue
-            kosul_listesi = self._metin_filtre_normalize(kosullar)
-            if not kosul_listesi:
-                continue
-            s_str = _tr_lower(str(s.get(kod, "") or ""))
-            # VEYA'lara göre gruplara böl
-            gruplar = []
-            mevcut = []
-            for i, k in enumerate(kosul_listesi):
-                if i > 0 and k.get("baglac") == "veya":
-                    if mevcut:
-                        gruplar.append(mevcut)
-                    mevcut = []
-                mevcut.append(k)
-            if mevcut:
-                gruplar.append(mevcut)
-            # Anlamlı koşulu olmayan grupları (ör. değer boş & op=içerir) at
-            anlamli_gruplar = [
-                g for g in gruplar
-                if any(self._metin_kosulu_anlamli(k) for k in g)
-            ]
-            if not anlamli_gruplar:
+            if kod == haric_kod or placeholder.get(kod):
                 continue
-            # En az bir grup tamamen eşleşmeli
-            if not any(
-                all(self._metin_kosulu_test(s_str, k) for k in g
-                    if self._metin_kosulu_anlamli(k))
-                for g in anlamli_gruplar
-            ):
-                return False
+            durum.arama[kod] = var.get() or ""
+        durum.deger = {kod: secili for kod, secili in self.aktif_deger_filtre.items()
+                       if kod != haric_kod and secili}
+        durum.metin = {kod: k for kod, k in self.aktif_metin_filtre.items()
+                       if kod != haric_kod}
+        # Reçete türü filtresi — SADECE kapatılan tipler dışlanır.
+        # Default (hepsi açık) ya da bilinmeyen tip → satır geçer.
+        if getattr(self, "var_recete_turu", None):
+            durum.gizli_recete_turleri = {
+                ad for ad, v in self.var_recete_turu.items() if not v.get()}
+        return durum
+
+    @staticmethod
+    def _ai_sonucunu_isle(s: dict, ai_kayit: dict):
+        """Daha önce kaydedilmiş AI sonucunu satırın boş AI alanlarına yaz."""
+        if not ai_kayit:
+            return
+        if not s.get("ai_kars"):
+            from recete_kontrol.ai_kontrol.sonuc_parser import ETIKET_KISA
+            s["ai_kars"] = ETIKET_KISA.get(
+                ai_kayit["ai_sonuc"], ai_kayit["ai_sonuc"])
+        if not s.get("ai_aciklama"):
+            s["ai_aciklama"] = ai_kayit["ai_aciklama"]
+
+    def _satir_gorunur_mu(self, s: dict, baglam: dict) -> bool:
+        """Tek satırı filtrelerden geçirir (akışlı parti ekleme); geçerse AI
+        sonucunu enjekte edip gosterilen_iids'e ekler. Hücre metni üretmez —
+        o iş _satir_render'ın."""
+        iid = str(s["ri_id"])
+        if baglam.get("sart_raporu_gerekli"):
+            s["verdict_sart_raporu"] = self._sart_raporu_metni(s)
+        if not satir_gecer_mi(s, iid, baglam["durum"]):
+            return False
+        self._ai_sonucunu_isle(s, baglam["ai_map"].get(iid))
+        self.gosterilen_iids.add(iid)
         return True
 
+    def _satir_render(self, iid: str):
+        """Sanal ızgara satır üreticisi → (values, tags). Satır ekrana
+        girdiğinde çağrılır; sonuç ızgarada önbelleğe alınır."""
+        s = self.satir_indeks.get(iid) or {}
+        renk = self.satir_renkleri.get(iid, RENK_BEYAZ)
+        teyit_sonucu = (getattr(self, "_teyit_map", None) or {}).get(iid, "")
+        s["secim"] = "☑" if iid in self.secili_iidler else "☐"
+        s["teyit"] = recete_teyit_db.rozet(teyit_sonucu)
+        # Şart raporu sütunu: verdict_* alanlarından kompakt özet
+        s["verdict_sart_raporu"] = self._sart_raporu_metni(s)
+        # Kod+tarih fallback ise rapor kod/teşhis hücrelerini ⚠ ile işaretle
+        fallback_kod_tarih = (
+            s.get("rapor_secim_kaynagi") == "tier0_kod_tarih_fallback")
+        # SR var ama RaporAna yok — rapor Botanik EOS'a indirilmemiş.
+        # rap_kod RIRaporKodId üzerinden dolar ama rap_tesh / rap_ack
+        # boş kalır. Satırı görsel olarak işaretle.
+        rapor_eos_eksik = (
+            s.get("rapor_secim_kaynagi") == "tier0_sr_no_rapana")
+        if fallback_kod_tarih:
+            values_list = []
+            for k in SUTUN_KOD:
+                v = str(s.get(k, ""))
+                if k in ("rap_kod", "rap_tesh_tak") and v:
+                    v = f"⚠ {v}"
+                else:
+                    v = verdict_daire_goster(k, v)
+                values_list.append(v)
+            values = tuple(values_list)
+        else:
+            values = tuple(verdict_daire_goster(k, str(s.get(k, "")))
+                           for k in SUTUN_KOD)
+        tags = [renk]
+        if teyit_sonucu:
+            tags.append("teyit_bold")
+        if fallback_kod_tarih:
+            tags.append("fallback_kirmizi")
+        if rapor_eos_eksik:
+            tags.append("rapor_eos_eksik")
+        return values, tuple(tags)
+
+    def _filtre_sayimlarini_guncelle(self):
+        """Verdict ve teyit filtre checkbox'larının yanındaki '(N)' sayım
+        rozetini günceller. Sayımlar tum_satirlar üzerinden (filtresiz) yapılır
+        — kullanıcı 'bu etikette toplam kaç satır var' bilgisini görür."""
+        indeks = self._filtre_indeksi_al()
+        # ── Verdict sayımları ──
+        cbs = getattr(self, "_verdict_filtre_cbs", None)
+        temel = getattr(self, "_verdict_filtre_temel", None)
+        if cbs and temel:
+            sayim = verdict_sayimi(indeks, cbs.keys())
+            for etk, cb in cbs.items():
+                try:
+                    cb.config(text=f"{temel[etk]} ({sayim.get(etk, 0)})")
+                except Exception:
+                    pass
+
+        # ── Teyit sayımları ──
+        cbs_t = getattr(self, "_teyit_filtre_cbs", None)
+        temel_t = getattr(self, "_teyit_filtre_temel", None)
+        if cbs_t and temel_t:
+            tmap = getattr(self, "_teyit_map", {}) or {}
+            sayim_t = teyit_sayimi(indeks, tmap, cbs_t.keys())
+            for k, cb in cbs_t.items():
+                try:
+                    cb.config(text=f"{temel_t[k]} ({sayim_t.get(k, 0)})")
+                except Exception:
+                    pass
+
     @staticmethod
     def _metin_filtre_normalize(kosullar):
         """Geriye dönük uyum: eski (op, deger) tuple → tek-koşul liste.
         Yeni format zaten liste; aynen döner."""
-        if isinstance(kosullar, tuple) and len(kosullar) == 2:
-            op, deger = kosullar
-            return [{"baglac": None, "op": op, "deger": deger}]
-        if isinstance(kosullar, list):
-            return kosullar
-        return []
+        return metin_filtre_normalize(kosullar)
 
     @staticmethod
     def _metin_kosulu_anlamli(k):
         """Boş değer + boş-olmayan op = anlamsız (filtre kapalı sayılır)."""
-        op = k.get("op", "icerir")
-        if op in ("bos", "bos_degil"):
-            return True
-        return bool((k.get("deger") or "").strip())
+        return metin_kosulu_anlamli(k)
 
     @staticmethod
     def _metin_kosulu_test(s_str, k):
         """Tek koşul s_str'e uyuyor mu? s_str ZATEN lowercase olmalı."""
-        op = k.get("op", "icerir")
-        d_str = _tr_lower(k.get("deger") or "")
-        if op == "icerir":
-            return d_str in s_str
-        if op == "icermez":
-            return d_str not in s_str
-        if op == "baslar":
-            return s_str.startswith(d_str)
-        if op == "biter":
-            return s_str.endswith(d_str)
-        if op == "esit":
-            return s_str == d_str
-        if op == "esit_degil":
-            return s_str != d_str
-        if op == "bos":
-            return not s_str
-        if op == "bos_degil":
-            return bool(s_str)
-        if op == "regex":
-            try:
-                import re as _re
-                return bool(_re.search(d_str, s_str, _re.IGNORECASE))
-            except _re.error:
-                return True  # geçersiz regex → koşulu yutkun
-        return True
+        return metin_kosulu_test(s_str, k)
 
     def _sutun_filtre_degisti(self, kod: str):
         # Placeholder yazımları filtre tetiklemesin
@@ -12180,13 +12273,13 @@ class AylikReceteSorguGUI:
                 .get(kod)):
             return
         # Kısa debounce ile çağırılabilir; şimdilik direkt
-        self._tabloyu_yenile()
+        self._filtre_degisti()
         self._sayaclari_guncelle()
 
     def _renk_filtre_degisti(self):
         self.aktif_renk_filtre = {r for r, v in self.var_renk.items()
                                     if v.get()}
-        self._tabloyu_yenile()
+        self._filtre_degisti()
         self._sayaclari_guncelle()
 
     def _bos_satir_filtre_degisti(self):
@@ -12211,7 +12304,7 @@ class AylikReceteSorguGUI:
     def _msj_rapor_filtre_degisti(self):
         """💬 Msj (hepsi/var/yok) veya 📄 Rapor (hepsi/raporlu/raporsuz)
         switch'i değişti → SQL'e gitmeden tabloyu yenile."""
-        self._tabloyu_yenile()
+        self._filtre_degisti()
         self._sayaclari_guncelle()
 
     # ───────────────────────────────────────────── KONTROLÜ GEREKSİZ İLAÇLAR
@@ -12223,17 +12316,17 @@ class AylikReceteSorguGUI:
             self._kontrol_disi_setler = kdi.setler()
         except Exception:
             pass
-        self._tabloyu_yenile()
+        self._filtre_degisti()
         self._sayaclari_guncelle()
 
     def _kontrol_disi2_filtre_degisti(self):
         """🚫² 2. kademe gizle kutusu değişti → SQL'e gitmeden tabloyu yenile.
-        Koşullu filtre _satir_filtreden_geciyor_mu içinde uygulanır."""
+        Koşullu filtre filtre_indeksi içinde uygulanır."""
         try:
             self._kontrol_disi2_setler = kdi2.setler()
         except Exception:
             pass
-        self._tabloyu_yenile()
+        self._filtre_degisti()
         self._sayaclari_guncelle()
 
     def _kontrol_disi_ilac_ekle_secili(self, iidler, kademe: int = 1):
@@ -12439,7 +12532,7 @@ class AylikReceteSorguGUI:
     def _recete_turu_filtre_degisti(self):
         """📋 Reçete türü checkbox'ı (Beyaz/Kırmızı/Yeşil/Mor) değişti.
         Yüklü veri arasında filtreleme — SQL'e gitmeden tablo yenilenir."""
-        self._tabloyu_yenile()
+        self._filtre_degisti()
         self._sayaclari_guncelle()
 
     def _tum_filtreleri_temizle(self):
@@ -12620,7 +12713,7 @@ class AylikReceteSorguGUI:
                             command=lambda f=fn: self._hizli_filtre_uygula(f))
         m.add_separator()
         m.add_command(label="(Filtreyi temizle)",
-                        command=self._tabloyu_yenile)
+                        command=self._filtre_degisti)
         try:
             x = self.root.winfo_pointerx()
             y = self.root.winfo_pointery()
@@ -12660,7 +12753,7 @@ class AylikReceteSorguGUI:
         self._durum_yaz(f"{n} satır → {RENK_ETIKET[renk]}{ek}")
 
     def _secilenleri_boya(self):
-        secimler = list(self.tv.selection())
+        secimler = self._grid.vurgulananlar()
         if not secimler:
             self._durum_yaz("Seçili satır yok")
             return
@@ -12704,43 +12797,24 @@ class AylikReceteSorguGUI:
 
     # ----------------------------------------------------------- HIZLI FİLTRE
     def _hizli_filtre_uygula(self, fn):
-        """Hızlı filtreyi uygula (sadece görünenleri filtrele)."""
-        # Sütun filtrelerini koruyarak ek bir filtre uygulamak için:
-        # Kullanıcı arama kutularını temizleyip sadece bu filtreyi uygulasın
-        # Daha kullanıcı dostu: tablodaki iid'lerden filtrelenmiş kümeyi göster
-        secilenler = set()
-        for s in self.tum_satirlar:
-            try:
-                if fn(s):
-                    secilenler.add(str(s["ri_id"]))
-            except Exception:
-                pass
-        # Renk filtreden de geç
-        gor = []
-        self.tv.delete(*self.tv.get_children())
-        self.gosterilen_iids = set()
+        """Hızlı filtreyi uygula (sütun filtrelerinden bağımsız; renk
+        filtresi geçerli). Yüklem maskesi indekste saklanır — aynı hızlı
+        filtre ikinci kez tıklandığında satırlar yeniden taranmaz."""
+        indeks = self._filtre_indeksi_al()
         # Teyit haritasını yenile (rozet için)
         try:
-            teyit_map = recete_teyit_db.teyit_haritasi()
+            teyit_map = recete_teyit_db.teyit_haritasi(list(self.satir_indeks))
         except Exception:
             teyit_map = {}
         self._teyit_map = teyit_map
-        for iid in secilenler:
-            s = self.satir_indeks.get(iid)
-            if not s:
-                continue
-            renk = self.satir_renkleri.get(iid, RENK_BEYAZ)
-            if renk not in self.aktif_renk_filtre:
-                continue
-            teyit_sonucu = teyit_map.get(iid, "")
-            s["teyit"] = recete_teyit_db.rozet(teyit_sonucu)
-            values = tuple(verdict_daire_goster(k, str(s.get(k, "")))
-                           for k in SUTUN_KOD)
-            tags = [renk]
-            if teyit_sonucu:
-                tags.append("teyit_bold")
-            self.tv.insert("", "end", iid=iid, values=values, tags=tuple(tags))
-            self.gosterilen_iids.add(iid)
+        renk_durumu = FiltreDurumu(renkler=self.satir_renkleri,
+                                   renk_acik=set(self.aktif_renk_filtre),
+                                   varsayilan_renk=RENK_BEYAZ)
+        maske = indeks.yuklem_maskesi(fn, fn) & filtre_maskesi(indeks, renk_durumu)
+        indeks.fark(maske)
+        gorunen = indeks.iidler(maske)
+        self.gosterilen_iids = set(gorunen)
+        self._grid.veri_ayarla(gorunen, konumu_koru=False)
         self._sayaclari_guncelle()
         self._durum_yaz(f"Hızlı filtre: {len(self.gosterilen_iids)} satır")
 
@@ -12773,13 +12847,12 @@ class AylikReceteSorguGUI:
         if kod == "secim":
             if iid in self.secili_iidler:
                 self.secili_iidler.discard(iid)
-                self.tv.set(iid, "secim", "☐")
             else:
                 self.secili_iidler.add(iid)
-                self.tv.set(iid, "secim", "☑")
             s = self.satir_indeks.get(iid)
             if s:
                 s["secim"] = "☑" if iid in self.secili_iidler else "☐"
+            self._grid.yenile(iid)
             self._sayaclari_guncelle()
             return
 
@@ -12829,7 +12902,7 @@ class AylikReceteSorguGUI:
 
     def _vurgulanmislari_isaretle(self):
         """Treeview'da Shift/Ctrl ile vurgulanmış satırların checkbox'ını işaretle."""
-        vurgulu = list(self.tv.selection())
+        vurgulu = self._grid.vurgulananlar()
         if not vurgulu:
             self._durum_yaz("Vurgulanmış satır yok "
                             "(Shift/Ctrl ile satır seçin)")
@@ -12949,16 +13022,10 @@ class AylikReceteSorguGUI:
         # (yoksa popup tek seçili değerle gelir).
         from collections import Counter
         sayim = Counter()
-        for s in self.tum_satirlar:
-            # Diğer sütun filtrelerini uygula (bu sütun hariç)
-            if not self._satir_filtreden_geciyor_mu(s, haric_kod=kod):
-                continue
-            # Renk filtresini de uygula
-            iid = str(s.get("ri_id"))
-            renk = self.satir_renkleri.get(iid, RENK_BEYAZ)
-            if renk not in self.aktif_renk_filtre:
-                continue
-            sayim[str(s.get(kod, "") or "")] += 1
+        indeks = self._filtre_indeksi_al()
+        maske = filtre_maskesi(indeks, self._filtre_durumu(haric_kod=kod))
+        for deger, adet in indeks.kolon(kod).sayim(maske).items():
+            sayim[str(deger or "")] += adet
         # Sıralı liste — boşları sona, geri kalanı alfabetik
         degerler = sorted(sayim.keys(),
                             key=lambda d: (d == "", d.lower()))
@@ -13051,7 +13118,7 @@ class AylikReceteSorguGUI:
                 self.aktif_deger_filtre[kod] = set()
             else:
                 self.aktif_deger_filtre[kod] = secimler
-            self._tabloyu_yenile()
+            self._filtre_degisti()
             self._sayaclari_guncelle()
             self._siralama_gostergesini_guncelle()
             win.destroy()
@@ -13230,14 +13297,14 @@ class AylikReceteSorguGUI:
                 self.aktif_metin_filtre.pop(kod, None)
             else:
                 self.aktif_metin_filtre[kod] = yeni
-            self._tabloyu_yenile()
+            self._filtre_degisti()
             self._sayaclari_guncelle()
             self._siralama_gostergesini_guncelle()
             win.destroy()
 
         def _temizle():
             self.aktif_metin_filtre.pop(kod, None)
-            self._tabloyu_yenile()
+            self._filtre_degisti()
             self._sayaclari_guncelle()
             self._siralama_gostergesini_guncelle()
             win.destroy()
@@ -13285,7 +13352,7 @@ class AylikReceteSorguGUI:
     def _sutun_filtresini_temizle(self, kod):
         self.aktif_deger_filtre.pop(kod, None)
         self.aktif_metin_filtre.pop(kod, None)
-        self._tabloyu_yenile()
+        self._filtre_degisti()
         self._sayaclari_guncelle()
         self._siralama_gostergesini_guncelle()
 
@@ -13296,12 +13363,12 @@ class AylikReceteSorguGUI:
 
     def _sag_tik_menu_tam_ekran(self, event):
         """Tam ekran şema penceresinde sağ tık → ana tablo context menüsünü
-        aç. Tam ekran açıkken aktif satır zaten self.tv.selection() içinde;
+        aç. Tam ekran açıkken aktif satır zaten vurgulananlar içinde;
         identify_row(event.y) tam ekrandaki Canvas/widget koordinatını
         kullanır ve YANLIŞ satırı seçer (hasta değişir bug'ı 2026-05-17).
         Bu yüzden _sag_tik_menu'yu _from_tam_ekran=True ile çağırıp
         identify_row adımını tamamen atlatıyoruz."""
-        if not self.tv.selection():
+        if not self._grid.vurgulananlar():
             return
         self._sag_tik_menu(event, _from_tam_ekran=True)
 
@@ -13311,13 +13378,13 @@ class AylikReceteSorguGUI:
         # mevcut selection korunur (hasta değişme bug'ı 2026-05-17).
         if not _from_tam_ekran:
             iid = self.tv.identify_row(event.y)
-            if iid and iid not in self.tv.selection():
-                self.tv.selection_set(iid)
-        if not self.tv.selection():
+            if iid and iid not in self._grid.vurgulananlar():
+                self._grid.sec(iid)
+        if not self._grid.vurgulananlar():
             return
         m = tk.Menu(self.root, tearoff=0)
         # En üst: Reçete / Rapor detay pencereleri (Botanik EOS'tan canlı çek)
-        s_aktif = self.satir_indeks.get(self.tv.selection()[0]) or {}
+        s_aktif = self.satir_indeks.get(self._grid.vurgulananlar()[0]) or {}
         sistem_no_aktif = (s_aktif.get("sistem_recete_no") or "").strip()
         rec_no_aktif = (s_aktif.get("rec_no") or "").strip()
         rapor_ana_id_aktif = s_aktif.get("rapor_ana_id") or 0
@@ -13404,7 +13471,7 @@ class AylikReceteSorguGUI:
         m.add_command(label="🪪 Tüm Künyeyi Kopyala",
                       command=self._kopyala_tum_kunye)
         # Çoklu seçim: tüm seçili satırların künyelerini uc uca kopyala
-        sec_sayisi = len(self.tv.selection())
+        sec_sayisi = len(self._grid.vurgulananlar())
         m.add_command(
             label=f"🪪 Seçilenlerin Künyelerini Kopyala ({sec_sayisi} satır)",
             command=self._kopyala_secilen_kunyeler,
@@ -13415,16 +13482,16 @@ class AylikReceteSorguGUI:
         for renk in [RENK_YESIL, RENK_SARI, RENK_TURUNCU, RENK_KIRMIZI, RENK_BEYAZ]:
             m.add_command(label=f"→ {RENK_ETIKET[renk]}",
                             command=lambda r=renk: self._secilenleri_boya_uygula(
-                                list(self.tv.selection()), r))
+                                self._grid.vurgulananlar(), r))
 
         # 🚫 Kontrolü gereksiz ilaç olarak kaydet — İKİ seçim kaynağı:
         #   • Vurgulanan: sağ tıklanan tekil satır ya da Ctrl/Shift ile
-        #     vurgulanmış çoklu satırlar (tv.selection()).
+        #     vurgulanmış çoklu satırlar (_grid.vurgulananlar()).
         #   • ☑ İşaretli: checkbox ile işaretlenmiş satırlar (secili_iidler) —
         #     doluysa AYRI menü maddesi çıkar (topluca etiketleme,
         #     kullanıcı isteği 2026-07-07).
         m.add_separator()
-        _sec_kdi = list(self.tv.selection())
+        _sec_kdi = self._grid.vurgulananlar()
         _isaretli_kdi = list(getattr(self, "secili_iidler", set()) or [])
         m.add_command(
             label=f"🚫 Kontrolü Gereksiz İlaç olarak kaydet ({len(_sec_kdi)})",
@@ -13524,7 +13591,7 @@ class AylikReceteSorguGUI:
     # ----------------------------------------------------- Sağ tık: kopyala / Medula
     def _aktif_satir(self):
         """Sağ tık menüsünden çağrılan komutlar için aktif (ilk seçili) satır."""
-        sec = self.tv.selection()
+        sec = self._grid.vurgulananlar()
         if not sec:
             return None
         return self.satir_indeks.get(sec[0])
@@ -13640,7 +13707,7 @@ class AylikReceteSorguGUI:
     def _kopyala_secilen_kunyeler(self):
         """Sağ tık → tabloda seçili TÜM satırların künyelerini panoya kopyala.
         Künyeler arasında bir boş satır (\\n\\n) ile uc uca eklenir."""
-        secimler = list(self.tv.selection())
+        secimler = self._grid.vurgulananlar()
         if not secimler:
             messagebox.showinfo(
                 "Bilgi",
@@ -13818,7 +13885,7 @@ class AylikReceteSorguGUI:
             )
 
     def _satir_detay(self, event=None):
-        sec = self.tv.selection()
+        sec = self._grid.vurgulananlar()
         if not sec:
             return
         iid = sec[0]
@@ -16033,34 +16100,27 @@ class AylikReceteSorguGUI:
             logger.debug("filtre slot hizalama: %s", e)
 
     # ----------------------------------------------------------- STATE
+    def _durum_deposu_al(self) -> IncelemeDurumDeposu:
+        """Renk state deposu (ilk çağrıda açılır; eski JSON varsa taşınır)."""
+        if self._durum_deposu is None:
+            self._durum_deposu = IncelemeDurumDeposu(
+                self.STATE_DB_DOSYASI, json_yolu=self.STATE_DOSYASI)
+        return self._durum_deposu
+
     def _state_kaydet(self):
-        """Tüm renk durumlarını dönem bazında JSON'a yaz."""
+        """Aktif dönemin renk durumunu depoya ver — sadece değişen satırlar
+        kısa bir gecikmeyle toplu yazılır."""
         if not self.aktif_donem:
             return
         try:
-            tum = {}
-            if os.path.exists(self.STATE_DOSYASI):
-                with open(self.STATE_DOSYASI, "r", encoding="utf-8") as f:
-                    tum = json.load(f)
-            # Sadece beyaz olmayanları kaydet (yer tasarrufu)
-            donem_state = {iid: r for iid, r in self.satir_renkleri.items()
-                            if r != RENK_BEYAZ}
-            if donem_state:
-                tum[self.aktif_donem] = donem_state
-            elif self.aktif_donem in tum:
-                del tum[self.aktif_donem]
-            with open(self.STATE_DOSYASI, "w", encoding="utf-8") as f:
-                json.dump(tum, f, ensure_ascii=False, indent=2)
+            self._durum_deposu_al().donem_kaydet(self.aktif_donem,
+                                                 self.satir_renkleri)
         except Exception as e:
             logger.warning("State kaydet: %s", e)
 
     def _state_yukle_donem(self, donem: str) -> dict:
         try:
-            if not os.path.exists(self.STATE_DOSYASI):
-                return {}
-            with open(self.STATE_DOSYASI, "r", encoding="utf-8") as f:
-                tum = json.load(f)
-            return tum.get(donem, {}) or {}
+            return self._durum_deposu_al().donem_renkleri(donem)
         except Exception:
             return {}
 
@@ -20720,7 +20780,7 @@ class AylikReceteSorguGUI:
 
     def _ai_paket_onizle(self) -> None:
         """🔍 Önizle — seçili (ilk) satır için AI paketini modal'da göster."""
-        sec_iidler = list(self.tv.selection())
+        sec_iidler = self._grid.vurgulananlar()
         if not sec_iidler:
             messagebox.showinfo(
                 "AI Paket Önizle",
@@ -20782,7 +20842,7 @@ class AylikReceteSorguGUI:
         # Modal'dan AI'a göndermek isterse callback ver
         def _gonder(paket_arg):
             # Mevcut AI kontrol akışını tetikle (sadece bu satır için)
-            self.tv.selection_set(sec_iidler[0])
+            self._grid.sec(sec_iidler[0])
             self._ai_kontrol_baslat()
 
         paket_onizle_dialog.onizle(self.root, paket, ai_gonder_callback=_gonder)
@@ -21004,7 +21064,7 @@ class AylikReceteSorguGUI:
             return
 
         # 1. Seçili satırları al
-        sec_iidler = list(self.tv.selection())
+        sec_iidler = self._grid.vurgulananlar()
         if not sec_iidler:
             messagebox.showinfo(
                 "AI Kontrol",
@@ -30575,8 +30635,9 @@ class AylikReceteSorguGUI:
 
     # ═══════════════════════════════════════════════════════════════════
     # ANLIK REÇETE KONTROLÜ — Botanik EOS'a yeni reçete kaydedilince otomatik
-    # SUT kontrolü + öne gelen sesli uyarı. Tespit: 60 sn MAX(RxId) polling
-    # (SADECE SELECT). Background thread; UI işleri root.after ile.
+    # SUT kontrolü + öne gelen sesli uyarı. Tespit: paylaşılan değişiklik
+    # akışı (degisiklik_akisi — RxId filigranı, mesaide 3-10 sn, SADECE
+    # SELECT). Olay abone thread'inde işlenir; UI işleri root.after ile.
     # ═══════════════════════════════════════════════════════════════════
     def _canli_kontrol_toggle(self):
         if getattr(self, "_canli_aktif", False):
@@ -30590,18 +30651,22 @@ class AylikReceteSorguGUI:
                 "Canlı Kontrol",
                 "Önce Botanik veritabanına bağlanılmalı.", parent=self.root)
             return
-        son = self._canli_max_rxid()
+        try:
+            akis = paylasilan_akis()
+            abonelik = akis.abone_ol(KONU_RECETE, self._canli_yeni_kayitlar)
+        except Exception as e:
+            logger.warning("Canlı kontrol akışı başlatılamadı: %s", e)
+            abonelik = None
+        son = akis.filigran(KONU_RECETE) if abonelik else None
         if son is None:
+            if abonelik:
+                abonelik.iptal()
             messagebox.showerror(
                 "Canlı Kontrol",
                 "Başlangıç RxId alınamadı (DB bağlantısı?).", parent=self.root)
             return
-        self._canli_son_rxid = son
+        self._canli_abonelik = abonelik
         self._canli_aktif = True
-        self._canli_stop = threading.Event()
-        self._canli_thread = threading.Thread(
-            target=self._canli_poll_dongu, daemon=True)
-        self._canli_thread.start()
         try:
             self.btn_canli_kontrol.config(
                 text="🟢 CANLI KONTROL: AÇIK", bg="#2E7D32",
@@ -30609,13 +30674,14 @@ class AylikReceteSorguGUI:
         except Exception:
             pass
         self._durum_yaz(
-            f"🟢 Anlık reçete kontrolü AÇIK (60 sn yoklama, baz RxId={son}).")
+            f"🟢 Anlık reçete kontrolü AÇIK (değişiklik akışı, baz RxId={son}).")
 
     def _canli_durdur(self):
         self._canli_aktif = False
-        ev = getattr(self, "_canli_stop", None)
-        if ev:
-            ev.set()
+        abonelik = getattr(self, "_canli_abonelik", None)
+        self._canli_abonelik = None
+        if abonelik:
+            abonelik.iptal()
         try:
             self.btn_canli_kontrol.config(
                 text="🔴 CANLI KONTROL", bg="#B71C1C",
@@ -30624,59 +30690,34 @@ class AylikReceteSorguGUI:
             pass
         self._durum_yaz("🔴 Anlık reçete kontrolü kapatıldı.")
 
-    def _canli_max_rxid(self):
-        """ReceteAna'daki en büyük RxId (yeni reçete tespiti). SADECE SELECT."""
-        try:
-            rows = self.db.sorgu_calistir(
-                "SELECT MAX(RxId) AS m FROM ReceteAna WHERE RxSilme = 0")
-            if rows and rows[0].get("m") is not None:
-                return int(rows[0]["m"])
-        except Exception as e:
-            logger.warning("Canlı kontrol MAX(RxId) alınamadı: %s", e)
-        return None
-
-    def _canli_poll_dongu(self):
-        """Background polling döngüsü — her 60 sn yeni RxId kontrolü."""
-        ev = self._canli_stop
-        while not ev.is_set():
-            if ev.wait(60):       # 60 sn bekle; aç/kapa anında durur
-                break
-            if not getattr(self, "_canli_aktif", False):
-                break
+    def _canli_yeni_kayitlar(self, olay):
+        """Değişiklik akışı olayı (abone thread'i): yeni RxId aralığındaki
+        reçeteleri kontrol et, uyarıları ana thread'e aktar."""
+        if not getattr(self, "_canli_aktif", False):
+            return
+        uyarilar, yabancilar = self._canli_yeni_recete_kontrol(
+            olay.onceki_filigran, olay.filigran)
+        # Önce tam-ekran Topkapı SGK uyarısı (yabancı SGK'lı), ardından SUT
+        # uygunsuzluk uyarısı. Yabancı uyarısı ana sayfadaki "🌍 Yabancı Hasta
+        # Uyarısı" kutusuyla aç/kapanır; ayar kalıcı JSON'dan okunur (her
+        # olayda güncel).
+        if yabancilar:
             try:
-                yeni_max = self._canli_max_rxid()
-                son = getattr(self, "_canli_son_rxid", None)
-                if yeni_max is None:
-                    continue
-                if son is None:
-                    self._canli_son_rxid = yeni_max
-                    continue
-                if yeni_max > son:
-                    uyarilar, yabancilar = self._canli_yeni_recete_kontrol(son)
-                    self._canli_son_rxid = yeni_max
-                    # Önce tam-ekran Topkapı SGK uyarısı (yabancı SGK'lı),
-                    # ardından SUT uygunsuzluk uyarısı. Yabancı uyarısı ana
-                    # sayfadaki "🌍 Yabancı Hasta Uyarısı" kutusuyla aç/kapanır;
-                    # ayar kalıcı JSON'dan okunur (her yoklamada güncel).
-                    if yabancilar:
-                        try:
-                            import yabanci_hasta_tespit as _yht
-                            _goster = _yht.uyari_aktif_mi()
-                        except Exception:
-                            _goster = True
-                        if _goster:
-                            self.root.after(
-                                0, self._canli_yabanci_uyari_goster, yabancilar)
-                    if uyarilar:
-                        self.root.after(0, self._canli_uyari_goster, uyarilar)
-            except Exception as e:
-                logger.warning("Canlı kontrol döngü hatası: %s", e)
+                import yabanci_hasta_tespit as _yht
+                _goster = _yht.uyari_aktif_mi()
+            except Exception:
+                _goster = True
+            if _goster:
+                self.root.after(0, self._canli_yabanci_uyari_goster, yabancilar)
+        if uyarilar:
+            self.root.after(0, self._canli_uyari_goster, uyarilar)
 
-    def _canli_yeni_recete_kontrol(self, son_rxid: int):
-        """RxId > son_rxid olan yeni reçeteleri çek + her ilacı kontrol et.
+    def _canli_yeni_recete_kontrol(self, son_rxid: int, ust_rxid: int = None):
+        """son_rxid < RxId <= ust_rxid olan yeni reçeteleri çek + her ilacı
+        kontrol et (ust_rxid verilmezse üst sınır yok).
 
-        Background thread'den çağrılır (DB erişimi BotanikDB._sorgu_kilidi ile
-        serileştirilir). Kontrol-dışı ilaçlar atlanır.
+        Background thread'den çağrılır (her sorgu BotanikDB bağlantı havuzundan
+        kendi bağlantısını ödünç alır). Kontrol-dışı ilaçlar atlanır.
 
         Döner: (uyarilar, yabancilar) tuple'ı
           - uyarilar  : SUT uygunsuzluk/şüphe uyarıları (ilaç bazlı)
@@ -30686,12 +30727,10 @@ class AylikReceteSorguGUI:
         from recete_kontrol.anlik_kontrol import kontrol_et_tekil, uyari_gerekir_mi
         from recete_kontrol.base_kontrol import VERDICT_ETIKET
         import yabanci_hasta_tespit as yht
-        try:
-            import kontrol_disi_ilaclar as kdi
-        except Exception:
-            kdi = None
 
         where_sql = f"ra.RxSilme = 0 AND ra.RxId > {int(son_rxid)}"
+        if ust_rxid is not None:
+            where_sql += f" AND ra.RxId <= {int(ust_rxid)}"
         sql = self._recete_sorgu_sql(where_sql, limit=500)
         rows = self.db.sorgu_calistir(sql)
         if not rows:
@@ -30717,13 +30756,41 @@ class AylikReceteSorguGUI:
                     "kapsam": s.get("hasta_tip") or "",
                 })
 
-        # Enrich: heyet + rapor türü/süre (4.2.14.B / 4.2.9.A için)
+        uyarilar = []
+        for s, ilac_sonuc in self._birlesik_ilac_sonuclari(satirlar):
+            try:
+                kategori, rapor = kontrol_et_tekil(ilac_sonuc)
+            except Exception as e:
+                logger.warning("Anlık kontrol hata (rx %s): %s", s.get("rec_no"), e)
+                continue
+            if rapor is None:
+                continue
+            if uyari_gerekir_mi(rapor.sonuc, kategori):
+                uyarilar.append({
+                    "hasta": s.get("hasta", ""),
+                    "rec_no": s.get("rec_no", ""),
+                    "ilac": s.get("ilac", ""),
+                    "etken": s.get("etkin", ""),
+                    "kategori": kategori or "",
+                    "etiket": VERDICT_ETIKET.get(rapor.sonuc, "ŞÜPHELİ"),
+                    "mesaj": rapor.mesaj or "",
+                    "sartlar": [(p.ad, p.durum.value, p.neden)
+                                 for p in (getattr(rapor, "sartlar", None) or [])],
+                })
+        return uyarilar, yabancilar
+
+    def _birlesik_ilac_sonuclari(self, satirlar: list) -> list:
+        """Satırlar için kontrol_et_tekil girdisi: [(satır, ilac_sonuc)].
+
+        Heyet doktorları + rapor türü/süresi (4.2.14.B / 4.2.9.A) toplu
+        okunur, reçete bazlı diğer ilaç adları (kombi kontrolü) eklenir;
+        kontrol-dışı ilaçlar atlanır. Anlık kontrol ve toplu SUT kontrolü
+        aynı girdiyi kullanır. Background thread'den çağrılabilir."""
         rapor_ana_idler = list({s.get("rapor_ana_id") for s in satirlar
                                  if s.get("rapor_ana_id")})
         heyet_map = self._rapor_heyet_doktor_topla(rapor_ana_idler)
         rapor_bilgi_map = self._kanser_gcsf_rapor_bilgi_topla(rapor_ana_idler)
 
-        # Reçete bazlı diğer ilaç adları (kombi kontrolü)
         rec_grup: Dict[str, List[str]] = {}
         for s in satirlar:
             rno = str(s.get("rec_no") or "")
@@ -30731,10 +30798,10 @@ class AylikReceteSorguGUI:
                 rec_grup.setdefault(rno, []).append(s.get("ilac") or "")
 
         setler = getattr(self, "_kontrol_disi_setler", None)
-        uyarilar = []
+        ciftler = []
         for s in satirlar:
             # Kontrol-dışı (kontrolü gereksiz) ilaç → atla
-            if kdi and setler and any(setler) and kdi.eslesir_mi(
+            if setler and any(setler) and kdi.eslesir_mi(
                     s.get("ilac"), s.get("atc"), s.get("etkin"), setler):
                 continue
             rno = str(s.get("rec_no") or "")
@@ -30742,29 +30809,10 @@ class AylikReceteSorguGUI:
             diger = [x for x in rec_grup.get(rno, []) if x and x.upper() != kendi]
             rap_id = s.get("rapor_ana_id")
             rb = rapor_bilgi_map.get(rap_id, {}) if rap_id else {}
-            ilac_sonuc = self._anlik_ilac_sonuc_kur(
+            ciftler.append((s, self._anlik_ilac_sonuc_kur(
                 s, diger, heyet_map.get(rap_id, []) if rap_id else [],
-                rb.get("turu", ""), rb.get("sure_gun"))
-            try:
-                kategori, rapor = kontrol_et_tekil(ilac_sonuc)
-            except Exception as e:
-                logger.warning("Anlık kontrol hata (rx %s): %s", s.get("rec_no"), e)
-                continue
-            if rapor is None:
-                continue
-            if uyari_gerekir_mi(rapor.sonuc, kategori):
-                uyarilar.append({
-                    "hasta": s.get("hasta", ""),
-                    "rec_no": s.get("rec_no", ""),
-                    "ilac": s.get("ilac", ""),
-                    "etken": s.get("etkin", ""),
-                    "kategori": kategori or "",
-                    "etiket": VERDICT_ETIKET.get(rapor.sonuc, "ŞÜPHELİ"),
-                    "mesaj": rapor.mesaj or "",
-                    "sartlar": [(p.ad, p.durum.value, p.neden)
-                                 for p in (getattr(rapor, "sartlar", None) or [])],
-                })
-        return uyarilar, yabancilar
+                rb.get("turu", ""), rb.get("sure_gun"))))
+        return ciftler
 
     @staticmethod
     def _anlik_ilac_sonuc_kur(s: dict, diger_adlar: list, heyet: list,
@@ -33422,6 +33470,17 @@ class AylikReceteSorguGUI:
     def _kapat(self):
         try:
             self._state_kaydet()
+            if self._durum_deposu is not None:
+                self._durum_deposu.kapat()
+        except Exception:
+            pass
+        if getattr(self, "_canli_aktif", False):
+            try:
+                self._canli_durdur()
+            except Exception:
+                pass
+        try:
+            havuzu_kapat()
         except Exception:
             pass
         try:
@@ -0,0 +1,247 @@
+"""
+Botanik Bot - Yüzdelik Tabanlı Bekleme Motoru
+
+timing_settings'in sabit bekleme süreleri ortalamaya göre ayarlanıyordu; çoğu
+zaman hızlı biten adımlar da en kötü durum beklemesini ödüyordu. Bu modül:
+
+    GecikmeHistogrami  → adım başına akış halinde gecikme histogramı
+                         (sabit logaritmik kovalar, 1 ms .. ~20 dk, kova
+                         başına ≈%15 çözünürlük; diske {kova: adet} yazılır)
+    BeklemeMotoru      → histogramdan yapılandırılabilir yüzdelikle zaman
+                         aşımı türetir; sabit uyku yerine "koşul sağlanana ya
+                         da süre dolana kadar üstel geri çekilmeli yokla"
+                         beklemesi yapar ve sabit ayarlara göre kazanılan
+                         süreyi raporlar
+
+Saat ve uyku fonksiyonları dışarıdan verilebilir (testlerde sahte saat).
+
+Kullanım:
+    motor = BeklemeMotoru(yuzdelik=0.95)
+    bulundu = motor.kosul_bekle(lambda: bot.yeni_pencereyi_bul("İlaç Listesi"),
+                                "ilac_listesi_penceresi", varsayilan=1.0)
+    print(motor.tasarruf_raporu())
+"""
+
+import math
+import threading
+import time
+
+KOVA_TABAN = 0.001      # ilk kovanın üst sınırı (sn)
+KOVA_ORANI = 1.15       # ardışık kova sınırları oranı
+KOVA_SAYISI = 100       # 0.001 × 1.15^99 ≈ 1000 sn
+_LOG_ORAN = math.log(KOVA_ORANI)
+
+
+def kova_indeksi(sure):
+    """Süreyi (sn) kova indeksine çevir: kova i → (taban·r^(i-1), taban·r^i]."""
+    if sure <= KOVA_TABAN:
+        return 0
+    i = math.ceil(math.log(sure / KOVA_TABAN) / _LOG_ORAN - 1e-9)
+    return min(KOVA_SAYISI - 1, i)
+
+
+def kova_ust_siniri(indeks):
+    return KOVA_TABAN * KOVA_ORANI ** indeks
+
+
+def izgara_beklentisi(alt, ust, aralik):
+    """t ~ U(alt, ust] iken sabit `aralik`la yoklayan döngünün t'yi görme anı
+    (ceil(t/aralik)·aralik) beklentisi."""
+    if ust <= alt:
+        return math.ceil(ust / aralik - 1e-9) * aralik
+    toplam, t = 0.0, alt
+    while t < ust:
+        izgara = (math.floor(t / aralik + 1e-9) + 1) * aralik
+        parca = min(ust, izgara)
+        toplam += (parca - t) * izgara
+        t = parca
+    return toplam / (ust - alt)
+
+
+class GecikmeHistogrami:
+    """Sabit logaritmik kovalı gecikme histogramı (birleştirilebilir)."""
+
+    __slots__ = ("kovalar", "adet")
+
+    def __init__(self, kovalar=None):
+        self.kovalar = {}
+        self.adet = 0
+        for indeks, adet in (kovalar or {}).items():
+            self.kova_ekle(int(indeks), int(adet))
+
+    def ekle(self, sure, adet=1):
+        self.kova_ekle(kova_indeksi(sure), adet)
+
+    def kova_ekle(self, indeks, adet=1):
+        if adet <= 0:
+            return
+        indeks = max(0, min(KOVA_SAYISI - 1, indeks))
+        self.kovalar[indeks] = self.kovalar.get(indeks, 0) + adet
+        self.adet += adet
+
+    def birlestir(self, diger):
+        for indeks, adet in diger.kovalar.items():
+            self.kova_ekle(indeks, adet)
+
+    def yuzdelik(self, p):
+        """p (0-1) yüzdeliğinin üst sınırı (sn); boşsa None.
+
+        Kova üst sınırı döner — zaman aşımı için güvenli taraftadır.
+        """
+        if not self.adet:
+            return None
+        sira = max(1, math.ceil(p * self.adet))
+        toplam = 0
+        for indeks in sorted(self.kovalar):
+            toplam += self.kovalar[indeks]
+            if toplam >= sira:
+                return kova_ust_siniri(indeks)
+        return kova_ust_siniri(max(self.kovalar))
+
+    def sozluk(self):
+        """JSON için {"kova": adet} (anahtarlar metin)."""
+        return {str(i): a for i, a in sorted(self.kovalar.items())}
+
+
+class BeklemeMotoru:
+    """Yüzdelik zaman aşımları ve koşul yoklamalı bekleme.
+
+    Args:
+        yuzdelik: zaman aşımının türetileceği yüzdelik (0.95 = p95)
+        marj: yüzdeliğe uygulanan güvenlik çarpanı
+        min_ornek: bu kadar ölçüm birikmeden sabit (varsayılan) süre kullanılır
+        alt_sinir: türetilen zaman aşımının alt sınırı (sn)
+        ust_carpan: türetilen zaman aşımı en fazla varsayılan × ust_carpan
+        ilk_aralik, aralik_carpani, max_aralik: yoklama aralığı üstel artışı
+        saat, uyku: monotonik saat ve uyku fonksiyonları
+    """
+
+    def __init__(self, yuzdelik=0.95, marj=1.2, min_ornek=20, alt_sinir=0.02, ust_carpan=2.0,
+                 ilk_aralik=0.01, aralik_carpani=2.0, max_aralik=0.2,
+                 saat=time.monotonic, uyku=time.sleep):
+        self.yuzdelik = yuzdelik
+        self.marj = marj
+        self.min_ornek = min_ornek
+        self.alt_sinir = alt_sinir
+        self.ust_carpan = ust_carpan
+        self.ilk_aralik = ilk_aralik
+        self.aralik_carpani = aralik_carpani
+        self.max_aralik = max_aralik
+        self.saat = saat
+        self.uyku = uyku
+        self.histogramlar = {}
+        # {anahtar: {"adet", "statik", "gercek", "zaman_asimi"}}
+        self.tasarruf = {}
+        # kosul_bekle ölçümleri (süre dolanlar dahil) için dinleyici (anahtar, sure) — kalıcılık
+        self.olcum_dinleyicisi = None
+        self._lock = threading.Lock()
+
+    # ── Ölçüm ────────────────────────────────────────────────────────────
+
+    def histogram(self, anahtar):
+        h = self.histogramlar.get(anahtar)
+        if h is None:
+            h = self.histogramlar[anahtar] = GecikmeHistogrami()
+        return h
+
+    def kaydet(self, anahtar, sure):
+        with self._lock:
+            self.histogram(anahtar).ekle(sure)
+
+    def zaman_asimi(self, anahtar, varsayilan):
+        """Yüzdelik × marj; yeterli ölçüm yoksa sabit varsayılan."""
+        h = self.histogramlar.get(anahtar)
+        if h is None or h.adet < self.min_ornek:
+            return varsayilan
+        deger = h.yuzdelik(self.yuzdelik) * self.marj
+        return max(self.alt_sinir, min(varsayilan * self.ust_carpan, deger))
+
+    # ── Bekleme ──────────────────────────────────────────────────────────
+
+    def kosul_bekle(self, kosul, anahtar=None, varsayilan=1.0, zaman_asimi=None,
+                    uyku=None, statik_aralik=None):
+        """kosul() doğru dönene ya da süre dolana kadar üstel aralıkla yokla.
+
+        Args:
+            kosul: argümansız çağrılabilir; doğru değer dönünce bekleme biter
+            anahtar: zaman aşımı histogramı ve tasarruf raporu anahtarı
+            varsayilan: sabit modeldeki en uzun bekleme (sn)
+            zaman_asimi: verilirse yüzdelik yerine bu süre kullanılır
+            uyku: uyku fonksiyonu (ör. bot.bekle); yoksa motorunki
+            statik_aralik: eski kodun sabit yoklama aralığı; verilirse sabit
+                modelin süresi, koşulun son iki yoklama arasında düzgün
+                dağılımla sağlandığı varsayılarak bu ızgarada beklenen görme
+                anıdır; yoksa sabit model her zaman `varsayilan` kadar bekler
+
+        Geçen süre `anahtar` histogramına eklenir. Süre dolan bekleme de
+        ölçümdür (koşul en erken zaman aşımında sağlanırdı): dışarıda
+        bırakılırsa histogram zaman aşımında kesilir, yüzdelik yalnız
+        aşağı kayar ve geç açılan pencere her seferinde kaçırılır.
+
+        Returns:
+            kosul()'un son değeri (süre dolduysa yanlış değer)
+        """
+        uyku = uyku or self.uyku
+        if zaman_asimi is None:
+            zaman_asimi = self.zaman_asimi(anahtar, varsayilan) if anahtar else varsayilan
+        baslangic = self.saat()
+        son = baslangic + zaman_asimi
+        aralik = self.ilk_aralik
+        son_yanlis = None       # son başarısız yoklamanın anı (geçen sn)
+        while True:
+            sonuc = kosul()
+            if sonuc:
+                break
+            simdi = self.saat()
+            son_yanlis = simdi - baslangic
+            kalan = son - simdi
+            if kalan <= 0:
+                break
+            uyku(min(aralik, kalan))
+            aralik = min(aralik * self.aralik_carpani, self.max_aralik)
+        gecen = self.saat() - baslangic
+
+        if anahtar:
+            statik = varsayilan
+            self.kaydet(anahtar, gecen)
+            if self.olcum_dinleyicisi:
+                self.olcum_dinleyicisi(anahtar, gecen)
+            if sonuc and statik_aralik:
+                # Koşul (son_yanlis, gecen] arasında sağlandı; ilk yoklamada
+                # sağlandıysa eski kod da hemen görürdü
+                if son_yanlis is None:
+                    statik = gecen
+                else:
+                    statik = min(varsayilan, izgara_beklentisi(son_yanlis, gecen, statik_aralik))
+            with self._lock:
+                t = self.tasarruf.setdefault(
+                    anahtar, {"adet": 0, "statik": 0.0, "gercek": 0.0, "zaman_asimi": 0})
+                t["adet"] += 1
+                t["statik"] += statik
+                t["gercek"] += gecen
+                t["zaman_asimi"] += not sonuc
+        return sonuc
+
+    def tasarruf_raporu(self):
+        """Anahtar başına sabit ayarlara göre kazanılan süre.
+
+        Returns:
+            dict: {anahtar: {adet, statik_sn, gercek_sn, kazanc_sn, kazanc_yuzde,
+                             zaman_asimi, p<yuzdelik>_sn}}
+        """
+        rapor = {}
+        etiket = f"p{round(self.yuzdelik * 100)}_sn"
+        with self._lock:
+            for anahtar, t in sorted(self.tasarruf.items()):
+                h = self.histogramlar.get(anahtar)
+                yuzdelik = h.yuzdelik(self.yuzdelik) if h and h.adet else None
+                rapor[anahtar] = {
+                    "adet": t["adet"],
+                    "statik_sn": round(t["statik"], 3),
+                    "gercek_sn": round(t["gercek"], 3),
+                    "kazanc_sn": round(t["statik"] - t["gercek"], 3),
+                    "kazanc_yuzde": round(100 * (1 - t["gercek"] / t["statik"]), 1) if t["statik"] else 0.0,
+                    "zaman_asimi": t["zaman_asimi"],
+                    etiket: round(yuzdelik, 3) if yuzdelik is not None else None,
+                }
+        return rapor
@@ -0,0 +1,921 @@
+"""
+Botanik EOS Yerel Ayna (SQLite) — artımlı, salt-okuma senkron motoru
+
+Analiz ekranları çok yıllık reçete/elden JOIN'lerini doğrudan eczanenin
+canlı SQL Server'ına atıyordu: raporlar dakikalar sürüyor, POS veritabanı
+da bu sürede yükleniyordu. Bu modül reçete/elden tablolarını yerel bir
+SQLite dosyasına artımlı kopyalar; yalnız bu tablolara dokunan BotanikDB
+rapor metodları (mf_satis_analizi_getir; `ayna_raporlari` açıkken)
+sorgularını önce aynada dener. Fatura/takas/karekod/miad tablolarını
+okuyan stok, alış ve prim raporları aynalanmadığı için canlıda kalır.
+
+Senkron (EOS tarafı SADECE SELECT — BotanikDB.sorgu_calistir guard'ı):
+  - Artımlı tablolar: anahtar (RxId / RIId) filigranından sonraki satırlar
+    `SELECT TOP n * ... WHERE anahtar > ? ORDER BY anahtar` ile parti parti.
+  - Geri tarama: son `geri_gun` gündeki satırlar (ana tablolarda kayıt
+    tarihi, ilaç tablolarında ebeveyn RxId penceresi) yeniden çekilip
+    üzerine yazılır; kaynakta artık olmayanlar aynadan silinir. Geç gelen
+    düzeltmeler (RxSilme, iade, adet) böyle yakalanır.
+  - Tam tablolar (Urun, Musteri): her senkronda baştan yenilenir.
+  - Her parti filigranıyla aynı transaction'da yazılır — yarıda kesilen
+    senkron kaldığı yerden devam eder. Kaynak hata verirse (boş liste +
+    son_sorgu_hatasi) senkron durur, aynadan hiçbir şey silinmez.
+
+Sorgu (aynada):
+  - tsql_sqlite_cevir(): rapor SQL'inin yaygın T-SQL alt kümesini (TOP,
+    ISNULL, GETDATE, CAST AS date/int, DATEADD/DATEDIFF, YEAR/MONTH/DAY,
+    LEN/LEFT/RIGHT, DATEFROMPARTS, EOMONTH) SQLite'a çevirir.
+  - Çevrilemeyen yapı (OUTER/CROSS APPLY, PIVOT, CONVERT, metin `+`
+    birleştirme...) ya da aynada olmayan tablo → AynaDesteklenmiyor;
+    BotanikDB o sorguyu canlı veritabanında çalıştırır.
+  - Tarih/saatler 'YYYY-MM-DD HH:MM:SS' metni olarak tutulur (sözlük sırası
+    = zaman sırası); 'YYYYMMDD' parametre/literalleri bu biçime çevrilir,
+    sonuçtaki tarih-saat metinleri datetime'a, tarih metinleri date'e döner.
+  - Metin kolonları TR_CI harmanlamasıyla oluşturulur: SQL Server'ın
+    Turkish_CI_AS'i gibi büyük/küçük harf duyarsız (I/ı, İ/i), sondaki
+    boşlukları yok sayar ve Türk alfabesi sırasıyla sıralar — eşitlik,
+    GROUP BY ve ORDER BY canlı sonuçla aynı gruplanır/sıralanır.
+
+Ayna dosyası EczAsist'in kendi dosyasıdır; Botanik EOS'a yazma yoktur.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from calendar import monthrange
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+VARSAYILAN_YOL = os.path.join(_SCRIPT_DIR, "botanik_ayna.db")
+
+VARSAYILAN_PARTI = 20000
+VARSAYILAN_GERI_GUN = 35        # ay sonu teyit/iade düzeltmeleri dahil
+VARSAYILAN_MAKS_YAS_SN = 6 * 3600  # daha eski ayna rapora kullanılmaz
+VARSAYILAN_ARALIK_SN = 15 * 60   # arka plan senkron aralığı
+
+
+class AynaDesteklenmiyor(Exception):
+    """Sorgu aynada çalıştırılamaz (çevrilemeyen T-SQL / aynada olmayan tablo)."""
+
+
+class AynaSenkronHatasi(Exception):
+    """Kaynak (EOS) sorgusu hata verdi — senkron yarıda bırakıldı."""
+
+
+@dataclass(frozen=True)
+class AynaTablo:
+    """Aynalanan tablo tanımı."""
+    ad: str
+    anahtar: str                                # tekil, artan kimlik kolonu
+    tarih: Optional[str] = None                 # geri tarama kolonu (ana tablolar)
+    ebeveyn: Optional[Tuple[str, str]] = None   # (FK kolonu, ebeveyn tablo adı)
+    tam: bool = False                           # her senkronda baştan yenile
+    indeksler: Tuple[Tuple[str, ...], ...] = ()
+
+
+AYNA_TABLOLARI: Tuple[AynaTablo, ...] = (
+    AynaTablo("ReceteAna", "RxId", tarih="RxKayitTarihi",
+              indeksler=(("RxKayitTarihi",), ("RxReceteTarihi",), ("RxMusteriId",))),
+    AynaTablo("ReceteIlaclari", "RIId", ebeveyn=("RIRxId", "ReceteAna"),
+              indeksler=(("RIRxId",), ("RIUrunId",))),
+    AynaTablo("EldenAna", "RxId", tarih="RxKayitTarihi",
+              indeksler=(("RxKayitTarihi",), ("RxReceteTarihi",))),
+    AynaTablo("EldenIlaclari", "RIId", ebeveyn=("RIRxId", "EldenAna"),
+              indeksler=(("RIRxId",), ("RIUrunId",))),
+    AynaTablo("Urun", "UrunId", tam=True,
+              indeksler=(("UrunUrunTipId",), ("UrunAdi",))),
+    AynaTablo("Musteri", "MusteriId", tam=True),
+)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Değer dönüşümleri
+# ═══════════════════════════════════════════════════════════════════════
+
+_TARIH_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_TARIH_SAAT_RE = re.compile(r"^\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(\.\d{1,6})?$")
+_SIKISIK_TARIH_RE = re.compile(r"^(\d{4})(\d{2})(\d{2})(?: (\d{2}:\d{2}:\d{2}))?$")
+
+
+def _aynaya(deger: Any) -> Any:
+    """pyodbc değerini SQLite'ta saklanacak biçime çevir."""
+    if deger is None or isinstance(deger, (int, float, str, bytes)):
+        return int(deger) if isinstance(deger, bool) else deger
+    if isinstance(deger, datetime):
+        return deger.isoformat(sep=" ")
+    if isinstance(deger, date):
+        return deger.isoformat()
+    if isinstance(deger, Decimal):
+        return float(deger)
+    if isinstance(deger, (bytearray, memoryview)):
+        return bytes(deger)
+    return str(deger)
+
+
+def _tarih_metni(metin: str) -> str:
+    """'YYYYMMDD[ HH:MM:SS]' → 'YYYY-MM-DD[ HH:MM:SS]'; gece yarısı saati atılır
+    (tarih-only değerlerle sözlük karşılaştırması bozulmasın). Geçersizse aynen."""
+    m = _SIKISIK_TARIH_RE.match(metin)
+    if m:
+        try:
+            date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+        except ValueError:
+            return metin
+        gun = f"{m.group(1)}-{m.group(2)}-{m.group(3)}"
+        saat = m.group(4)
+        return gun if not saat or saat == "00:00:00" else f"{gun} {saat}"
+    if len(metin) == 19 and metin.endswith(" 00:00:00") and _TARIH_SAAT_RE.match(metin):
+        return metin[:10]
+    return metin
+
+
+def _parametre(deger: Any) -> Any:
+    if isinstance(deger, datetime):
+        return _tarih_metni(deger.strftime("%Y-%m-%d %H:%M:%S"))
+    if isinstance(deger, str):
+        return _tarih_metni(deger)
+    return _aynaya(deger)
+
+
+def _sonuca(deger: Any) -> Any:
+    """Aynadan okunan değeri canlı sorgunun döndüreceği tipe yaklaştır."""
+    if isinstance(deger, str):
+        if len(deger) >= 19 and _TARIH_SAAT_RE.match(deger):
+            return datetime.fromisoformat(deger)
+        if len(deger) == 10 and _TARIH_RE.match(deger):
+            try:
+                return date.fromisoformat(deger)
+            except ValueError:
+                return deger
+    return deger
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Türkçe harmanlama (SQL Server Turkish_CI_AS karşılığı)
+# ═══════════════════════════════════════════════════════════════════════
+
+HARMANLAMA = "TR_CI"
+_TR_KUCUK = str.maketrans({"I": "ı", "İ": "i"})
+_TR_ALFABE = "abcçdefgğhıijklmnoöprsştuüvyz"
+_TR_SIRA = {h: i for i, h in enumerate(_TR_ALFABE)}
+
+
+def _tr_anahtar(metin: str) -> Tuple[Tuple[int, int], ...]:
+    """Sondaki boşluklar atılmış, Türkçe küçük harfli, alfabe sıralı anahtar."""
+    kucuk = metin.rstrip(" ").translate(_TR_KUCUK).lower()
+    # Alfabe harfleri kendi sıralarında; rakam/işaretler harflerden önce
+    return tuple((1, _TR_SIRA[h]) if h in _TR_SIRA else (0, ord(h)) for h in kucuk)
+
+
+def _tr_karsilastir(a: str, b: str) -> int:
+    ka, kb = _tr_anahtar(a), _tr_anahtar(b)
+    return (ka > kb) - (ka < kb)
+
+
+def harmanlama_kaydet(conn: sqlite3.Connection) -> None:
+    """Ayna tablolarının metin kolonlarındaki TR_CI harmanlamasını bağlantıya ekle."""
+    conn.create_collation(HARMANLAMA, _tr_karsilastir)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# SQLite'ta T-SQL fonksiyonları
+# ═══════════════════════════════════════════════════════════════════════
+
+def _coz(deger: Any) -> Optional[datetime]:
+    if deger is None:
+        return None
+    if isinstance(deger, datetime):
+        return deger
+    metin = _tarih_metni(str(deger).strip())
+    try:
+        return datetime.fromisoformat(metin)
+    except ValueError:
+        return None
+
+
+def _bicimle(dt: datetime, kaynak: Any) -> str:
+    """Girdi tarih-only ise tarih-only, değilse tarih-saat metni döndür."""
+    tarih_only = isinstance(kaynak, str) and len(_tarih_metni(kaynak.strip())) == 10
+    if tarih_only and (dt.hour, dt.minute, dt.second, dt.microsecond) == (0, 0, 0, 0):
+        return dt.date().isoformat()
+    return dt.isoformat(sep=" ")
+
+
+def _ay_ekle(dt: datetime, ay: int) -> datetime:
+    toplam = dt.year * 12 + dt.month - 1 + ay
+    yil, ay0 = divmod(toplam, 12)
+    gun = min(dt.day, monthrange(yil, ay0 + 1)[1])
+    return dt.replace(year=yil, month=ay0 + 1, day=gun)
+
+
+_PARCA_ADLARI = {
+    "YEAR": "YEAR", "YY": "YEAR", "YYYY": "YEAR",
+    "MONTH": "MONTH", "MM": "MONTH", "M": "MONTH",
+    "DAY": "DAY", "DD": "DAY", "D": "DAY", "DAYOFYEAR": "DAY", "DY": "DAY",
+    "WEEK": "WEEK", "WK": "WEEK", "WW": "WEEK",
+    "HOUR": "HOUR", "HH": "HOUR",
+    "MINUTE": "MINUTE", "MI": "MINUTE", "N": "MINUTE",
+    "SECOND": "SECOND", "SS": "SECOND", "S": "SECOND",
+    "WEEKDAY": "WEEKDAY", "DW": "WEEKDAY",
+}
+
+
+def _t_dateadd(parca, n, deger):
+    dt = _coz(deger)
+    if dt is None or n is None:
+        return None
+    parca, n = _PARCA_ADLARI.get(str(parca).upper()), int(n)
+    if parca == "YEAR":
+        sonuc = _ay_ekle(dt, 12 * n)
+    elif parca == "MONTH":
+        sonuc = _ay_ekle(dt, n)
+    elif parca in ("DAY", "WEEKDAY"):
+        sonuc = dt + timedelta(days=n)
+    elif parca == "WEEK":
+        sonuc = dt + timedelta(weeks=n)
+    elif parca == "HOUR":
+        sonuc = dt + timedelta(hours=n)
+    elif parca == "MINUTE":
+        sonuc = dt + timedelta(minutes=n)
+    elif parca == "SECOND":
+        sonuc = dt + timedelta(seconds=n)
+    else:
+        return None
+    return _bicimle(sonuc, deger)
+
+
+def _t_datediff(parca, bas, bit):
+    # T-SQL: sınır (boundary) sayısı — ör. DAY için gece yarısı geçişleri
+    a, b = _coz(bas), _coz(bit)
+    if a is None or b is None:
+        return None
+    parca = _PARCA_ADLARI.get(str(parca).upper())
+    if parca == "YEAR":
+        return b.year - a.year
+    if parca == "MONTH":
+        return (b.year - a.year) * 12 + b.month - a.month
+    if parca == "DAY":
+        return (b.date() - a.date()).days
+    if parca == "WEEK":
+        # SQL Server varsayılanı: hafta Pazar başlar
+        def _pazar(d):
+            return d.date() - timedelta(days=(d.weekday() + 1) % 7)
+        return (_pazar(b) - _pazar(a)).days // 7
+    if parca == "HOUR":
+        kes = dict(minute=0, second=0, microsecond=0)
+        return int((b.replace(**kes) - a.replace(**kes)).total_seconds() // 3600)
+    if parca == "MINUTE":
+        kes = dict(second=0, microsecond=0)
+        return int((b.replace(**kes) - a.replace(**kes)).total_seconds() // 60)
+    if parca == "SECOND":
+        return int((b.replace(microsecond=0) - a.replace(microsecond=0)).total_seconds())
+    return None
+
+
+def _t_datepart(parca, deger):
+    dt = _coz(deger)
+    if dt is None:
+        return None
+    parca = _PARCA_ADLARI.get(str(parca).upper())
+    if parca == "WEEKDAY":
+        return (dt.weekday() + 1) % 7 + 1  # Pazar=1 (DATEFIRST 7)
+    return {"YEAR": dt.year, "MONTH": dt.month, "DAY": dt.day, "HOUR": dt.hour,
+            "MINUTE": dt.minute, "SECOND": dt.second}.get(parca)
+
+
+def _t_eomonth(deger, ay=0):
+    dt = _coz(deger)
+    if dt is None:
+        return None
+    dt = _ay_ekle(dt, int(ay or 0))
+    return date(dt.year, dt.month, monthrange(dt.year, dt.month)[1]).isoformat()
+
+
+def _t_datefromparts(y, a, g):
+    try:
+        return date(int(y), int(a), int(g)).isoformat()
+    except (TypeError, ValueError):
+        return None
+
+
+def _t_isnumeric(deger):
+    if deger is None:
+        return 0
+    if isinstance(deger, (int, float)):
+        return 1
+    try:
+        float(str(deger).strip())
+        return 1
+    except ValueError:
+        return 0
+
+
+def _t_len(deger):
+    # T-SQL LEN sondaki boşlukları saymaz
+    return None if deger is None else len(str(deger).rstrip(" "))
+
+
+def _t_left(deger, n):
+    return None if deger is None or n is None else str(deger)[:max(0, int(n))]
+
+
+def _t_right(deger, n):
+    if deger is None or n is None:
+        return None
+    n = max(0, int(n))
+    return str(deger)[-n:] if n else ""
+
+
+def _t_concat(*degerler):
+    return "".join("" if d is None else str(d) for d in degerler)
+
+
+def _t_bolum(parca):
+    return lambda deger: _t_datepart(parca, deger)
+
+
+def fonksiyonlari_kaydet(conn: sqlite3.Connection) -> None:
+    """Çevrilmiş sorguların kullandığı T-SQL fonksiyonlarını bağlantıya ekle."""
+    conn.create_function("YEAR", 1, _t_bolum("YEAR"), deterministic=True)
+    conn.create_function("MONTH", 1, _t_bolum("MONTH"), deterministic=True)
+    conn.create_function("DAY", 1, _t_bolum("DAY"), deterministic=True)
+    conn.create_function("DATEADD", 3, _t_dateadd, deterministic=True)
+    conn.create_function("DATEDIFF", 3, _t_datediff, deterministic=True)
+    conn.create_function("DATEPART", 2, _t_datepart, deterministic=True)
+    conn.create_function("EOMONTH", 1, _t_eomonth, deterministic=True)
+    conn.create_function("EOMONTH", 2, _t_eomonth, deterministic=True)
+    conn.create_function("DATEFROMPARTS", 3, _t_datefromparts, deterministic=True)
+    conn.create_function("ISNUMERIC", 1, _t_isnumeric, deterministic=True)
+    conn.create_function("LEN", 1, _t_len, deterministic=True)
+    conn.create_function("T_LEFT", 2, _t_left, deterministic=True)
+    conn.create_function("T_RIGHT", 2, _t_right, deterministic=True)
+    conn.create_function("CONCAT", -1, _t_concat, deterministic=True)
+    conn.create_function(
+        "T_GETDATE", 0, lambda: datetime.now().replace(microsecond=0).isoformat(sep=" "))
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# T-SQL → SQLite çevirici
+# ═══════════════════════════════════════════════════════════════════════
+
+_DESTEKSIZ = (
+    (re.compile(r"\b(OUTER|CROSS)\s+APPLY\b", re.I), "APPLY"),
+    (re.compile(r"\b(UN)?PIVOT\b", re.I), "PIVOT"),
+    (re.compile(r"\b(TRY_)?CONVERT\s*\(", re.I), "CONVERT"),
+    (re.compile(r"\bTRY_CAST\s*\(", re.I), "TRY_CAST"),
+    (re.compile(r"\bFOR\s+XML\b", re.I), "FOR XML"),
+    (re.compile(r"\bSTRING_AGG\s*\(", re.I), "STRING_AGG"),
+    (re.compile(r"\bFORMAT\s*\(", re.I), "FORMAT"),
+    (re.compile(r"\bCHARINDEX\s*\(", re.I), "CHARINDEX"),
+    (re.compile(r"\bINTO\s+#", re.I), "geçici tablo"),
+    (re.compile(r"#\w"), "geçici tablo"),
+    (re.compile(r"@\w"), "değişken"),
+)
+_CAST_TIPLERI = {
+    "DATE": None,  # date(expr)
+    "DATETIME": "", "DATETIME2": "", "SMALLDATETIME": "",  # değer aynen
+    "INT": "INTEGER", "INTEGER": "INTEGER", "BIGINT": "INTEGER", "SMALLINT": "INTEGER",
+    "TINYINT": "INTEGER", "BIT": "INTEGER",
+    "FLOAT": "REAL", "REAL": "REAL", "DECIMAL": "REAL", "NUMERIC": "REAL",
+    "MONEY": "REAL", "SMALLMONEY": "REAL",
+    "VARCHAR": "TEXT", "NVARCHAR": "TEXT", "CHAR": "TEXT", "NCHAR": "TEXT",
+}
+_TOP_RE = re.compile(
+    r"\bSELECT(\s+DISTINCT)?\s+TOP\s*(?:\(\s*(\d+|\?)\s*\)|(\d+|\?))(\s+PERCENT|\s+WITH\s+TIES)?",
+    re.I)
+_TABLO_RE = re.compile(r"\b(?:FROM|JOIN)\s+(\[?[A-Za-z_][\w.\[\]]*)", re.I)
+_CTE_RE = re.compile(r"(?:\bWITH|,)\s*([A-Za-z_]\w*)\s+AS\s*\(", re.I)
+
+
+def _literalleri_maskele(sql: str) -> Tuple[str, List[str]]:
+    """Metin literallerini \\x00N\\x00 yer tutucularıyla değiştir, yorumları at."""
+    literaller: List[str] = []
+    cikti: List[str] = []
+    i, n = 0, len(sql)
+    while i < n:
+        c = sql[i]
+        if c in "Nn" and i + 1 < n and sql[i + 1] == "'" and (
+                i == 0 or not (sql[i - 1].isalnum() or sql[i - 1] == "_")):
+            i += 1  # N'...' önekini at
+            continue
+        if c == "'":
+            j = i + 1
+            parca = []
+            while j < n:
+                if sql[j] == "'":
+                    if j + 1 < n and sql[j + 1] == "'":
+                        parca.append("'")
+                        j += 2
+                        continue
+                    break
+                parca.append(sql[j])
+                j += 1
+            if j >= n:
+                raise AynaDesteklenmiyor("Kapanmamış metin literali")
+            cikti.append(f"\x00{len(literaller)}\x00")
+            literaller.append("".join(parca))
+            i = j + 1
+            continue
+        if sql.startswith("--", i):
+            nl = sql.find("\n", i)
+            i = n if nl < 0 else nl
+            continue
+        if sql.startswith("/*", i):
+            son = sql.find("*/", i + 2)
+            if son < 0:
+                raise AynaDesteklenmiyor("Kapanmamış blok yorum")
+            cikti.append(" ")
+            i = son + 2
+            continue
+        cikti.append(c)
+        i += 1
+    return "".join(cikti), literaller
+
+
+def _literalleri_geri_koy(metin: str, literaller: List[str]) -> str:
+    def _yerine(m):
+        deger = _tarih_metni(literaller[int(m.group(1))])
+        return "'" + deger.replace("'", "''") + "'"
+    return re.sub(r"\x00(\d+)\x00", _yerine, metin)
+
+
+def _kapanis_bul(metin: str, acilis: int) -> int:
+    """metin[acilis] == '(' için eşleşen ')' indeksi."""
+    derinlik = 0
+    for i in range(acilis, len(metin)):
+        if metin[i] == "(":
+            derinlik += 1
+        elif metin[i] == ")":
+            derinlik -= 1
+            if derinlik == 0:
+                return i
+    raise AynaDesteklenmiyor("Parantezler dengesiz")
+
+
+def _ust_duzey_bol(metin: str, ayirici_re: "re.Pattern") -> Optional[Tuple[int, int]]:
+    """Parantez dışındaki SON ayırıcı eşleşmesinin (baş, son) aralığı."""
+    derinlik, son = 0, None
+    for i, c in enumerate(metin):
+        if c == "(":
+            derinlik += 1
+        elif c == ")":
+            derinlik -= 1
+        elif derinlik == 0:
+            m = ayirici_re.match(metin, i)
+            if m and (i == 0 or not (metin[i - 1].isalnum() or metin[i - 1] == "_")):
+                son = (m.start(), m.end())
+    return son
+
+
+_AS_RE = re.compile(r"AS\b", re.I)
+
+
+def _cast_cevir(metin: str) -> str:
+    """CAST(ifade AS tip) → SQLite karşılığı (içten dışa)."""
+    sinir = len(metin)  # üretilen CAST(... AS INTEGER) yeniden işlenmesin
+    while True:
+        eslesmeler = [e for e in re.finditer(r"\bCAST\s*\(", metin, re.I)
+                      if e.start() < sinir]
+        if not eslesmeler:
+            return metin
+        m = eslesmeler[-1]  # en içteki/sondaki önce
+        sinir = m.start()
+        acilis = m.end() - 1
+        kapanis = _kapanis_bul(metin, acilis)
+        ic = metin[acilis + 1:kapanis]
+        bol = _ust_duzey_bol(ic, _AS_RE)
+        if bol is None:
+            raise AynaDesteklenmiyor("CAST ... AS bulunamadı")
+        ifade, tip = ic[:bol[0]].strip(), ic[bol[1]:].strip()
+        tip_adi = re.match(r"\w+", tip)
+        tip_adi = tip_adi.group(0).upper() if tip_adi else ""
+        if tip_adi not in _CAST_TIPLERI:
+            raise AynaDesteklenmiyor(f"CAST tipi: {tip}")
+        hedef = _CAST_TIPLERI[tip_adi]
+        if hedef is None:
+            yeni = f"date({ifade})"
+        elif hedef == "":
+            yeni = f"({ifade})"
+        else:
+            yeni = f"CAST({ifade} AS {hedef})"
+        metin = metin[:m.start()] + yeni + metin[kapanis + 1:]
+
+
+def _top_cevir(metin: str) -> str:
+    """SELECT TOP n → kapsamın sonuna LIMIT n (sondan başa, iç içe güvenli)."""
+    while True:
+        eslesmeler = list(_TOP_RE.finditer(metin))
+        if not eslesmeler:
+            return metin
+        m = eslesmeler[-1]
+        adet = m.group(2) or m.group(3)
+        if adet == "?" or m.group(4):
+            raise AynaDesteklenmiyor("TOP (?) / PERCENT / WITH TIES")
+        # Kapsam: aynı parantez düzeyinde sorgu sonuna kadar
+        derinlik, son = 0, len(metin)
+        i = m.end()
+        while i < len(metin):
+            c = metin[i]
+            if c == "(":
+                derinlik += 1
+            elif c == ")":
+                if derinlik == 0:
+                    son = i
+                    break
+                derinlik -= 1
+            elif derinlik == 0 and re.match(r"(UNION|EXCEPT|INTERSECT)\b", metin[i:i + 9], re.I) \
+                    and not (metin[i - 1].isalnum() or metin[i - 1] == "_"):
+                raise AynaDesteklenmiyor("TOP içeren UNION üyesi")
+            i += 1
+        govde = metin[m.end():son].rstrip()
+        sonda_nv = govde.endswith(";")
+        if sonda_nv:
+            govde = govde[:-1].rstrip()
+        secim = "SELECT" + (" DISTINCT" if m.group(1) else "")
+        metin = (metin[:m.start()] + secim + govde + f" LIMIT {adet}"
+                 + (";" if sonda_nv else "") + metin[son:])
+
+
+def sorgu_tablolari(sql: str) -> List[str]:
+    """FROM/JOIN ile başvurulan tablo adları (CTE adları hariç, şema öneksiz)."""
+    metin, _ = _literalleri_maskele(sql)
+    cte = {m.group(1).lower() for m in _CTE_RE.finditer(metin)}
+    tablolar = []
+    for m in _TABLO_RE.finditer(metin):
+        ad = m.group(1).replace("[", "").replace("]", "").split(".")[-1]
+        if ad.lower() not in cte and ad not in tablolar:
+            tablolar.append(ad)
+    return tablolar
+
+
+def tsql_sqlite_cevir(sql: str) -> str:
+    """Rapor SQL'inin desteklenen T-SQL alt kümesini SQLite'a çevir.
+
+    Raises:
+        AynaDesteklenmiyor: Anlamı koruyarak çevrilemeyen yapı varsa.
+    """
+    metin, literaller = _literalleri_maskele(sql)
+    for desen, ad in _DESTEKSIZ:
+        if desen.search(metin):
+            raise AynaDesteklenmiyor(f"Desteklenmeyen T-SQL: {ad}")
+    # Metin birleştirme '+' SQLite'ta sayısal toplamadır — anlam değişir
+    if re.search(r"\x00\d+\x00\s*\+|\+\s*\x00\d+\x00", metin):
+        raise AynaDesteklenmiyor("Metin birleştirme (+)")
+
+    metin = re.sub(r"\bWITH\s*\(\s*NOLOCK\s*\)", "", metin, flags=re.I)
+    metin = re.sub(r"\bISNULL\s*\(", "IFNULL(", metin, flags=re.I)
+    metin = re.sub(r"\bGETDATE\s*\(\s*\)", "T_GETDATE()", metin, flags=re.I)
+    metin = re.sub(r"\bLEFT\s*\(", "T_LEFT(", metin, flags=re.I)
+    metin = re.sub(r"\bRIGHT\s*\(", "T_RIGHT(", metin, flags=re.I)
+    metin = re.sub(r"\b(DATEADD|DATEDIFF|DATEPART)\s*\(\s*([A-Za-z]+)\s*,",
+                   lambda m: f"{m.group(1).upper()}('{m.group(2).upper()}',",
+                   metin, flags=re.I)
+    metin = _cast_cevir(metin)
+    metin = _top_cevir(metin)
+    return _literalleri_geri_koy(metin, literaller)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Ayna
+# ═══════════════════════════════════════════════════════════════════════
+
+def _sqlite_tipi(deger: Any) -> str:
+    if deger is None:
+        return ""  # tip bilinmiyor: affinity yok, değer olduğu gibi saklanır
+    if isinstance(deger, (bool, int)):
+        return "INTEGER"
+    if isinstance(deger, (float, Decimal)):
+        return "REAL"
+    if isinstance(deger, (bytes, bytearray, memoryview)):
+        return "BLOB"
+    if isinstance(deger, (datetime, date)):
+        return "TEXT"  # ISO metni: ikili karşılaştırma = zaman sırası
+    return f"TEXT COLLATE {HARMANLAMA}"
+
+
+def _ad(ad: str) -> str:
+    return '"' + ad.replace('"', '""') + '"'
+
+
+class BotanikAyna:
+    """Botanik EOS tablolarının yerel SQLite aynası.
+
+    Args:
+        yol: SQLite dosyası
+        tablolar: Aynalanacak tablo tanımları
+        parti: Kaynaktan tek SELECT'te çekilecek satır sayısı
+        geri_gun: Geri tarama penceresi (gün)
+        maks_yas_sn: Bundan eski senkronlu ayna raporlarda kullanılmaz
+    """
+
+    def __init__(self, yol: str = VARSAYILAN_YOL,
+                 tablolar: Sequence[AynaTablo] = AYNA_TABLOLARI,
+                 parti: int = VARSAYILAN_PARTI,
+                 geri_gun: int = VARSAYILAN_GERI_GUN,
+                 maks_yas_sn: float = VARSAYILAN_MAKS_YAS_SN):
+        self.yol = yol
+        self.tablolar = {t.ad: t for t in tablolar}
+        self.parti = max(1, int(parti))
+        self.geri_gun = int(geri_gun)
+        self.maks_yas_sn = maks_yas_sn
+        self._senkron_kilidi = threading.Lock()
+        self._dur = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        with self._yazici() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS _ayna_durum ("
+                " tablo TEXT PRIMARY KEY, son_anahtar INTEGER,"
+                " son_senkron TEXT, satir INTEGER)")
+            self._harmanlamasizlari_sil(conn)
+
+    def _harmanlamasizlari_sil(self, conn) -> None:
+        """TR_CI öncesi (ikili karşılaştırmalı) metin kolonlu tabloları sil;
+        ilk senkron onları baştan kurar."""
+        for ad, sql in conn.execute(
+                "SELECT name, sql FROM sqlite_master WHERE type='table'").fetchall():
+            if ad not in self.tablolar or HARMANLAMA in sql:
+                continue
+            if re.search(r'"\s+TEXT\b', sql):
+                logger.info(f"Ayna tablosu {ad} Türkçe harmanlamayla yeniden kurulacak")
+                conn.execute(f"DROP TABLE {_ad(ad)}")
+                conn.execute("DELETE FROM _ayna_durum WHERE tablo = ?", (ad,))
+
+    # ── bağlantılar ─────────────────────────────────────────────────────
+
+    def _yazici(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.yol, timeout=60)
+        harmanlama_kaydet(conn)
+        conn.execute("PRAGMA journal_mode=WAL")  # okuyucular senkronu beklemez
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _okuyucu(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(f"file:{self.yol}?mode=ro", uri=True, timeout=60)
+        fonksiyonlari_kaydet(conn)
+        harmanlama_kaydet(conn)
+        return conn
+
+    # ── durum ───────────────────────────────────────────────────────────
+
+    def durum(self) -> Dict[str, Dict[str, Any]]:
+        """Tablo başına filigran, son senkron zamanı ve satır sayısı."""
+        conn = sqlite3.connect(self.yol, timeout=60)
+        try:
+            return {r[0]: {"son_anahtar": r[1], "son_senkron": r[2], "satir": r[3]}
+                    for r in conn.execute("SELECT * FROM _ayna_durum")}
+        finally:
+            conn.close()
+
+    def kullanilabilir_mi(self) -> bool:
+        """Tüm tablolar en az bir kez ve maks_yas_sn içinde senkronlandı mı?"""
+        durum = self.durum()
+        sinir = datetime.now() - timedelta(seconds=self.maks_yas_sn)
+        for ad in self.tablolar:
+            d = durum.get(ad)
+            if not d or not d["son_senkron"]:
+                return False
+            if datetime.fromisoformat(d["son_senkron"]) < sinir:
+                return False
+        return True
+
+    # ── senkron ─────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _kaynaktan(kaynak, sql: str, params: tuple = ()) -> List[Dict]:
+        satirlar = kaynak.sorgu_calistir(sql, params or None)
+        hata = getattr(kaynak, "son_sorgu_hatasi", None)
+        if hata:
+            raise AynaSenkronHatasi(hata)
+        return satirlar
+
+    def _tablo_hazirla(self, conn, tablo: AynaTablo, satirlar: List[Dict]) -> List[str]:
+        """Tabloyu ilk partiden oluştur; sonradan eklenen kolonları ekle."""
+        kolonlar = list(satirlar[0].keys())
+        mevcut = [r[1] for r in conn.execute(f"PRAGMA table_info({_ad(tablo.ad)})")]
+        ornek = {k: next((s[k] for s in satirlar if s[k] is not None), None) for k in kolonlar}
+        if not mevcut:
+            tanim = ", ".join(
+                f"{_ad(k)} {_sqlite_tipi(ornek[k])}"
+                + (" PRIMARY KEY" if k == tablo.anahtar else "") for k in kolonlar)
+            conn.execute(f"CREATE TABLE {_ad(tablo.ad)} ({tanim})")
+            for kolonlar_ix in tablo.indeksler:
+                if all(k in kolonlar for k in kolonlar_ix):
+                    ix = f"ix_{tablo.ad}_{'_'.join(kolonlar_ix)}"
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {_ad(ix)} ON {_ad(tablo.ad)} "
+                                 f"({', '.join(_ad(k) for k in kolonlar_ix)})")
+        else:
+            for k in kolonlar:
+                if k not in mevcut:
+                    conn.execute(f"ALTER TABLE {_ad(tablo.ad)} ADD COLUMN "
+                                 f"{_ad(k)} {_sqlite_tipi(ornek[k])}")
+        return kolonlar
+
+    def _yaz(self, conn, tablo: AynaTablo, satirlar: List[Dict]) -> None:
+        kolonlar = self._tablo_hazirla(conn, tablo, satirlar)
+        sql = (f"INSERT OR REPLACE INTO {_ad(tablo.ad)} "
+               f"({', '.join(_ad(k) for k in kolonlar)}) "
+               f"VALUES ({', '.join('?' * len(kolonlar))})")
+        conn.executemany(sql, ([_aynaya(s.get(k)) for k in kolonlar] for s in satirlar))
+
+    def _durum_yaz(self, conn, tablo: AynaTablo, son_anahtar) -> None:
+        var = conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+                           (tablo.ad,)).fetchone()
+        satir = conn.execute(f"SELECT COUNT(*) FROM {_ad(tablo.ad)}").fetchone()[0] if var else 0
+        conn.execute(
+            "INSERT OR REPLACE INTO _ayna_durum VALUES (?, ?, ?, ?)",
+            (tablo.ad, son_anahtar, datetime.now().replace(microsecond=0).isoformat(sep=" "),
+             satir))
+
+    def _filigran(self, conn, tablo: AynaTablo) -> int:
+        r = conn.execute("SELECT son_anahtar FROM _ayna_durum WHERE tablo=?",
+                         (tablo.ad,)).fetchone()
+        return int(r[0]) if r and r[0] is not None else 0
+
+    def _artimli(self, conn, kaynak, tablo: AynaTablo) -> int:
+        """Filigrandan sonraki satırları parti parti çek."""
+        son = self._filigran(conn, tablo)
+        toplam = 0
+        while True:
+            satirlar = self._kaynaktan(
+                kaynak,
+                f"SELECT TOP {self.parti} * FROM {tablo.ad} "
+                f"WHERE {tablo.anahtar} > ? ORDER BY {tablo.anahtar}", (son,))
+            if not satirlar:
+                break
+            son = max(int(s[tablo.anahtar]) for s in satirlar)
+            with conn:
+                self._yaz(conn, tablo, satirlar)
+                self._durum_yaz(conn, tablo, son)
+            toplam += len(satirlar)
+            if len(satirlar) < self.parti:
+                break
+        return toplam
+
+    def _geri_tara(self, conn, kaynak, tablo: AynaTablo) -> int:
+        """Son geri_gun penceresini kaynaktan yeniden çek; silinenleri at."""
+        son = self._filigran(conn, tablo)
+        if not son:
+            return 0
+        sinir = (date.today() - timedelta(days=self.geri_gun)).strftime("%Y%m%d")
+        if tablo.tarih:
+            pencere_kolon, pencere_deger = tablo.tarih, sinir
+            yerel_deger = _tarih_metni(sinir)
+        elif tablo.ebeveyn:
+            fk, ebeveyn_ad = tablo.ebeveyn
+            ebeveyn = self.tablolar.get(ebeveyn_ad)
+            if ebeveyn is None or not ebeveyn.tarih:
+                return 0
+            r = conn.execute(
+                f"SELECT MIN({_ad(ebeveyn.anahtar)}) FROM {_ad(ebeveyn.ad)} "
+                f"WHERE {_ad(ebeveyn.tarih)} >= ?", (_tarih_metni(sinir),)).fetchone()
+            if not r or r[0] is None:
+                return 0
+            pencere_kolon, pencere_deger = fk, r[0]
+            yerel_deger = r[0]
+        else:
+            return 0
+
+        satirlar: List[Dict] = []
+        alt = 0
+        while True:
+            parca = self._kaynaktan(
+                kaynak,
+                f"SELECT TOP {self.parti} * FROM {tablo.ad} "
+                f"WHERE {pencere_kolon} >= ? AND {tablo.anahtar} > ? "
+                f"AND {tablo.anahtar} <= ? ORDER BY {tablo.anahtar}",
+                (pencere_deger, alt, son))
+            satirlar.extend(parca)
+            if len(parca) < self.parti:
+                break
+            alt = int(parca[-1][tablo.anahtar])
+
+        with conn:
+            if satirlar:
+                self._yaz(conn, tablo, satirlar)
+            # Kaynakta artık olmayan (fiziksel silinmiş) pencere satırları
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS _gelen (k INTEGER PRIMARY KEY)")
+            conn.execute("DELETE FROM _gelen")
+            conn.executemany("INSERT OR IGNORE INTO _gelen VALUES (?)",
+                             ((int(s[tablo.anahtar]),) for s in satirlar))
+            conn.execute(
+                f"DELETE FROM {_ad(tablo.ad)} WHERE {_ad(pencere_kolon)} >= ? "
+                f"AND {_ad(tablo.anahtar)} <= ? "
+                f"AND {_ad(tablo.anahtar)} NOT IN (SELECT k FROM _gelen)",
+                (yerel_deger, son))
+            self._durum_yaz(conn, tablo, son)
+        return len(satirlar)
+
+    def _tam_yenile(self, conn, kaynak, tablo: AynaTablo) -> int:
+        """Küçük sözlük tablolarını baştan çek (tek transaction'da değiştir)."""
+        satirlar: List[Dict] = []
+        alt = None
+        while True:
+            if alt is None:
+                parca = self._kaynaktan(
+                    kaynak, f"SELECT TOP {self.parti} * FROM {tablo.ad} "
+                            f"ORDER BY {tablo.anahtar}")
+            else:
+                parca = self._kaynaktan(
+                    kaynak, f"SELECT TOP {self.parti} * FROM {tablo.ad} "
+                            f"WHERE {tablo.anahtar} > ? ORDER BY {tablo.anahtar}", (alt,))
+            satirlar.extend(parca)
+            if len(parca) < self.parti:
+                break
+            alt = parca[-1][tablo.anahtar]
+        with conn:
+            if conn.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+                            (tablo.ad,)).fetchone():
+                conn.execute(f"DELETE FROM {_ad(tablo.ad)}")
+            if satirlar:
+                self._yaz(conn, tablo, satirlar)
+            self._durum_yaz(conn, tablo, None)
+        return len(satirlar)
+
+    def senkronize_et(self, kaynak, tablolar: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """Kaynaktan (BotanikDB — SADECE SELECT) aynayı güncelle.
+
+        Ebeveyn tablolar, ilaç tablolarından önce senkronlanır (tanım sırası).
+
+        Returns:
+            {tablo: çekilen satır sayısı}
+        Raises:
+            AynaSenkronHatasi: Kaynak sorgusu hata verdiyse (o ana kadar
+                yazılan partiler filigranlarıyla birlikte kalıcıdır).
+        """
+        secili = list(tablolar) if tablolar else list(self.tablolar)
+        sonuc: Dict[str, int] = {}
+        with self._senkron_kilidi:
+            conn = self._yazici()
+            try:
+                for ad in self.tablolar:
+                    if ad not in secili:
+                        continue
+                    tablo = self.tablolar[ad]
+                    t0 = time.perf_counter()
+                    if tablo.tam:
+                        adet = self._tam_yenile(conn, kaynak, tablo)
+                    else:
+                        adet = self._artimli(conn, kaynak, tablo)
+                        adet += self._geri_tara(conn, kaynak, tablo)
+                        with conn:  # boş tablo da "senkronlandı" sayılsın
+                            self._durum_yaz(conn, tablo, self._filigran(conn, tablo))
+                    sonuc[ad] = adet
+                    logger.info("Ayna senkron %s: %d satır (%.1f sn)",
+                                ad, adet, time.perf_counter() - t0)
+                conn.execute("PRAGMA optimize")
+            finally:
+                conn.close()
+        return sonuc
+
+    def arka_plan_baslat(self, kaynak, aralik_sn: float = VARSAYILAN_ARALIK_SN) -> None:
+        """Daemon thread'de periyodik senkron (ilk senkron hemen)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._dur.clear()
+
+        def _dongu():
+            while not self._dur.is_set():
+                try:
+                    self.senkronize_et(kaynak)
+                except Exception as e:
+                    logger.warning("Ayna senkron hatası: %s", e)
+                self._dur.wait(aralik_sn)
+
+        self._thread = threading.Thread(target=_dongu, name="BotanikAynaSenkron", daemon=True)
+        self._thread.start()
+
+    def arka_plan_durdur(self) -> None:
+        self._dur.set()
+
+    # ── sorgu ───────────────────────────────────────────────────────────
+
+    def sorgu_calistir(self, sql: str, params: tuple = None) -> List[Dict]:
+        """T-SQL rapor sorgusunu aynada çalıştır (salt-okuma bağlantı).
+
+        Raises:
+            AynaDesteklenmiyor: Çevrilemeyen sorgu, aynada olmayan tablo
+                ya da ayna henüz/artık kullanılamaz durumda.
+        """
+        eksik = [t for t in sorgu_tablolari(sql) if t not in self.tablolar]
+        if eksik:
+            raise AynaDesteklenmiyor(f"Aynada olmayan tablo: {', '.join(eksik)}")
+        cevrilmis = tsql_sqlite_cevir(sql)
+        prm = [_parametre(p) for p in (params or ())]
+        conn = self._okuyucu()
+        try:
+            cursor = conn.execute(cevrilmis, prm)
+            kolonlar = [k[0] for k in cursor.description]
+            return [dict(zip(kolonlar, (_sonuca(d) for d in r))) for r in cursor.fetchall()]
+        except sqlite3.OperationalError as e:
+            # Çeviri kapsamı dışında kalan sözdizimi/fonksiyon — canlıya düş
+            raise AynaDesteklenmiyor(str(e)) from e
+        finally:
+            conn.close()
@@ -415,9 +415,14 @@ logger = logging.getLogger(__name__)
 
 
 # ==================== CUSTOM EXCEPTIONS ====================
-class SistemselHataException(Exception):
-    """MEDULA'da sistemsel hata oluştuğunda fırlatılan exception"""
-    pass
+# Reçete akışları sürücüden bağımsız modülde (recete_akisi); eski adlarıyla
+# buradan da dışa aktarılır.
+from recete_akisi import (  # noqa: E402
+    SistemselHataException,
+    medula_yeniden_baslat_ve_giris_yap,
+    tek_recete_isle,
+    tek_recete_rapor_kontrol,
+)
 
 
 class RaporTakip:
@@ -1602,6 +1607,58 @@ class BotanikBot:
             logger.debug(f"_get_html_document hatası: {type(e).__name__}: {e}")
             return None
 
+    def dom_anlik_al(self, timeout=1):
+        """
+        Medula sayfasının anlık DOM kopyasını al (tek outerHTML çağrısı).
+
+        Aynı sayfa durumunda birden çok alan okunacaksa her alan için
+        find_element_safe / getElementById yerine bu anlık kullanılır;
+        ayrıştırma süreç içinde yapılır (medula_dom_anlik).
+
+        Returns:
+            medula_dom_anlik.DomAnlik veya None
+        """
+        from medula_dom_anlik import DomAnlik
+        return DomAnlik.belgeden(self._get_html_document(timeout=timeout))
+
+    # ---- Sürücü adımları (recete_akisi akışlarının bot üzerinden çağırdığı) ----
+    # medula_surucu.TekrarSurucu aynı adları kayıttan oynatır.
+
+    def bekle(self, saniye):
+        """Akış içindeki sabit bekleme."""
+        time.sleep(saniye)
+
+    def tus_gonder(self, tuslar):
+        """Etkin pencereye tuş gönder (örn. "{ESC}", "{ENTER}")."""
+        send_keys(tuslar)
+
+    def recete_turu_oku(self, max_deneme=3):
+        return recete_turu_oku(self, max_deneme=max_deneme)
+
+    def sadece_doz_kontrolu(self, session_logger=None, stop_check=None):
+        return sadece_doz_kontrolu(self, session_logger, stop_check)
+
+    def medula_taskkill(self):
+        return medula_taskkill()
+
+    def medula_ac_ve_giris_yap(self, medula_settings):
+        return medula_ac_ve_giris_yap(medula_settings)
+
+    def recete_listesi_ac(self):
+        return recete_listesi_ac(self)
+
+    def donem_sec(self, index=2):
+        return donem_sec(self, index=index)
+
+    def grup_butonuna_tikla(self, grup):
+        return grup_butonuna_tikla(self, grup)
+
+    def bulunamadi_mesaji_kontrol(self):
+        return bulunamadi_mesaji_kontrol(self)
+
+    def ilk_recete_ac(self):
+        return ilk_recete_ac(self)
+
     def find_element_safe(self, element_id, timeout=1):
         """
         Medula web sayfasındaki HTML elementini ID ile bul.
@@ -1740,23 +1797,25 @@ class BotanikBot:
         """
         try:
             baslangic = time.time()
-            check_interval = 0.2  # Optimizasyon: Daha sık kontrol et
 
-            while time.time() - baslangic < max_bekleme:
+            def ekran_yuklendi():
                 # "Kullanılan İlaç Listesi" yazısını ara
                 texts = self.main_window.descendants(control_type="Text")
                 for text in texts:
                     try:
                         text_value = text.window_text()
                         if "Kullanılan İlaç Listesi" in text_value or "Kullanilan İlaç Listesi" in text_value:
-                            gecen_sure = time.time() - baslangic
-                            logger.info(f"✓ İlaç ekranı yüklendi ({gecen_sure:.2f}s)")
                             return True
                     except Exception as e:
                         logger.debug(f"İlaç ekranı kontrolü hatası: {type(e).__name__}")
+                return False
 
-                # Optimizasyon: Sabit kısa interval ile bekle
-                time.sleep(check_interval)
+            # Sabit 0.2s aralık yerine üstel yoklama (0.01s'den başlar); üst süre aynı
+            if self.timing.kosul_bekle(ekran_yuklendi, "ilac_ekrani_yuklenme", varsayilan=max_bekleme,
+                                       zaman_asimi=max_bekleme, uyku=self.bekle, statik_aralik=0.2):
+                gecen_sure = time.time() - baslangic
+                logger.info(f"✓ İlaç ekranı yüklendi ({gecen_sure:.2f}s)")
+                return True
 
             logger.warning("⚠️ İlaç ekranı yüklenemedi")
             return False
@@ -5495,8 +5554,16 @@ class BotanikBot:
             telefon = self.telefon_numarasi_oku()
             logger.info(f"📞 Telefon: {telefon}")
 
+            # Rapor sayfasının anlık DOM kopyası (ad ve rapor satırları tek okumadan)
+            anlik = self.dom_anlik_al()
+
             # Hasta adını "Hak Sahibi Bilgileri" bölümünden al
-            ad_soyad = self._hak_sahibi_adini_oku()
+            ad_soyad = "Bilinmeyen"
+            if anlik is not None:
+                from medula_dom_anlik import hak_sahibi_adi
+                ad_soyad = hak_sahibi_adi(anlik)
+            if ad_soyad == "Bilinmeyen":
+                ad_soyad = self._hak_sahibi_adini_oku()
             logger.info(f"👤 Hasta adı: {ad_soyad}")
 
             # Rapor tablosunu bul ve verileri topla
@@ -5506,53 +5573,59 @@ class BotanikBot:
                 # HTML'deki rapor tablosu ID pattern'i: form1:tableExRaporTeshisList:X:textYY
                 # Satır elementleri: text14 (RaporTakipNo), text99 (RaporNo), text98 (Başlangıç), text97 (Bitiş), text96 (Tanı)
 
-                all_texts = self.main_window.descendants(control_type="Text")
-                logger.info(f"🔍 Toplam {len(all_texts)} Text elementi bulundu")
+                rapor_satir_verileri = []
+                if anlik is not None:
+                    from medula_dom_anlik import rapor_listesi_satirlari
+                    rapor_satir_verileri = rapor_listesi_satirlari(anlik)
 
-                # Önce "Rapor Listesi" sayfasında mıyız kontrol et
-                rapor_listesi_sayfasi = False
-                for t in all_texts[:100]:
-                    try:
-                        text = t.window_text()
-                        if "Rapor Listesi" in text or "Hak Sahibi Bilgileri" in text:
-                            rapor_listesi_sayfasi = True
-                            logger.info(f"✓ Rapor Listesi sayfası tespit edildi")
-                            break
-                    except Exception as text_err:
-                        logger.debug(f"Rapor listesi text okuma hatası: {type(text_err).__name__}")
-                        continue
+                if not rapor_satir_verileri:
+                    all_texts = self.main_window.descendants(control_type="Text")
+                    logger.info(f"🔍 Toplam {len(all_texts)} Text elementi bulundu")
 
-                if not rapor_listesi_sayfasi:
-                    logger.warning("⚠️ Rapor Listesi sayfası bulunamadı")
+                    # Önce "Rapor Listesi" sayfasında mıyız kontrol et
+                    rapor_listesi_sayfasi = False
+                    for t in all_texts[:100]:
+                        try:
+                            text = t.window_text()
+                            if "Rapor Listesi" in text or "Hak Sahibi Bilgileri" in text:
+                                rapor_listesi_sayfasi = True
+                                logger.info(f"✓ Rapor Listesi sayfası tespit edildi")
+                                break
+                        except Exception as text_err:
+                            logger.debug(f"Rapor listesi text okuma hatası: {type(text_err).__name__}")
+                            continue
 
-                # Rapor satırlarını topla - Her satır için: RaporTakipNo, RaporNo, Başlangıç, Bitiş, KayıtŞekli, Tanı
-                # Pattern: Ardışık Text elementleri içinde rapor verisi ara
-                rapor_satir_verileri = []
-                current_row = []
+                    if not rapor_listesi_sayfasi:
+                        logger.warning("⚠️ Rapor Listesi sayfası bulunamadı")
 
-                for t in all_texts:
-                    try:
-                        text = t.window_text().strip()
-                        if not text:
-                            continue
+                    # Rapor satırlarını topla - Her satır için: RaporTakipNo, RaporNo, Başlangıç, Bitiş, KayıtŞekli, Tanı
+                    # Pattern: Ardışık Text elementleri içinde rapor verisi ara
+                    rapor_satir_verileri = []
+                    current_row = []
 
-                        # Rapor satırı pattern'i: 9 haneli sayı ile başlayan satırlar (Rapor Takip No)
-                        if text.isdigit() and len(text) == 9:
-                            # Yeni rapor satırı başlangıcı
-                            if current_row and len(current_row) >= 4:
-                                rapor_satir_verileri.append(current_row)
-                            current_row = [text]
-                        elif current_row:
-                            # Mevcut satıra ekle (6-7 hücrelik tablo)
-                            if len(current_row) < 8:
-                                current_row.append(text)
-                    except Exception as row_err:
-                        logger.debug(f"Rapor satır okuma hatası: {type(row_err).__name__}")
-                        continue
+                    for t in all_texts:
+                        try:
+                            text = t.window_text().strip()
+                            if not text:
+                                continue
+
+                            # Rapor satırı pattern'i: 9 haneli sayı ile başlayan satırlar (Rapor Takip No)
+                            if text.isdigit() and len(text) == 9:
+                                # Yeni rapor satırı başlangıcı
+                                if current_row and len(current_row) >= 4:
+                                    rapor_satir_verileri.append(current_row)
+                                current_row = [text]
+                            elif current_row:
+                                # Mevcut satıra ekle (6-7 hücrelik tablo)
+                                if len(current_row) < 8:
+                                    current_row.append(text)
+                        except Exception as row_err:
+                            logger.debug(f"Rapor satır okuma hatası: {type(row_err).__name__}")
+                            continue
 
-                # Son satırı ekle
-                if current_row and len(current_row) >= 4:
-                    rapor_satir_verileri.append(current_row)
+                    # Son satırı ekle
+                    if current_row and len(current_row) >= 4:
+                        rapor_satir_verileri.append(current_row)
 
                 logger.info(f"📊 {len(rapor_satir_verileri)} potansiyel rapor satırı bulundu")
 
@@ -6042,662 +6115,6 @@ class BotanikBot:
             logger.error(f"Bilgi gösterme hatası: {e}")
 
 
-def tek_recete_isle(bot, recete_sira_no, rapor_takip, grup="", session_logger=None, stop_check=None, onceden_okunan_recete_no=None, onceki_recete_no=None, fonksiyon_ayarlari=None):
-    """
-    Tek bir reçete için tüm işlemleri yap
-
-    Args:
-        bot: BotanikBot instance
-        recete_sira_no: Reçete sıra numarası (1, 2, 3...)
-        rapor_takip: RaporTakip instance (CSV kaydı için)
-        grup: Grup bilgisi (A, B, C, GK) (varsayılan: "")
-        session_logger: SessionLogger instance (oturum logları için, opsiyonel)
-        stop_check: Durdurma kontrolü için callback fonksiyonu (True dönerse işlem durur)
-        onceden_okunan_recete_no: GUI'de zaten okunan reçete numarası (tekrar okumayı önler)
-        onceki_recete_no: Bir önceki işlenen reçete numarası (ardışık aynı reçete kontrolü için)
-        fonksiyon_ayarlari: Dict - hangi fonksiyonların aktif olduğu
-            - ilac_takip_aktif: bool
-            - rapor_toplama_aktif: bool
-            - rapor_kontrol_aktif: bool
-
-    Returns:
-        tuple: (başarı durumu: bool, medula reçete no: str veya None, takip sayısı: int, hata nedeni: str veya None)
-    """
-    # Varsayılan fonksiyon ayarları
-    if fonksiyon_ayarlari is None:
-        fonksiyon_ayarlari = {
-            "ilac_takip_aktif": True,
-            "rapor_toplama_aktif": True,
-            "rapor_kontrol_aktif": True
-        }
-
-    ilac_takip_aktif = fonksiyon_ayarlari.get("ilac_takip_aktif", True)
-    rapor_toplama_aktif = fonksiyon_ayarlari.get("rapor_toplama_aktif", True)
-    rapor_kontrol_aktif = fonksiyon_ayarlari.get("rapor_kontrol_aktif", True)
-
-    # Durdurma kontrolü helper fonksiyonu
-    def should_stop():
-        """Stop_check callback varsa kontrol et, True dönerse durulmalı"""
-        if stop_check and callable(stop_check):
-            return stop_check()
-        return False
-    recete_baslangic = time.time()
-    adim_sureleri = []
-
-    def log_sure(ad, baslangic, timing_key=None):
-        """Bir adımın süresini kaydet ve yazdır."""
-        sure = time.time() - baslangic
-        adim_sureleri.append((ad, sure))
-        logger.info(f"⏱ {ad}: {sure:.2f}s")
-
-        # Timing istatistiğine kaydet
-        if timing_key:
-            from timing_settings import get_timing_settings
-            timing = get_timing_settings()
-            timing.kayit_ekle(timing_key, sure)
-
-        return sure
-
-    medula_recete_no = None
-    takip_sayisi = 0  # Takip edilen ilaç sayısı
-    baslik_loglandi = False
-
-    def log_recete_baslik(no_degeri=None):
-        """Üst başlıkta Reçete sıra ve numarasını göster."""
-        nonlocal baslik_loglandi
-        if baslik_loglandi:
-            return
-        no_text = no_degeri if no_degeri else (medula_recete_no if medula_recete_no else "-")
-        logger.info(f"📋 REÇETE {recete_sira_no} | No: {no_text}")
-        baslik_loglandi = True
-
-    # DURDURMA KONTROLÜ - başlangıçta
-    if should_stop():
-        logger.info("⏸ İşlem durduruldu (kullanıcı talebi)")
-        return (False, None, 0, "Kullanıcı tarafından durduruldu")
-
-    # OPTİMİZE: Ardışık aynı reçete kontrolü (SONRA basınca aynı reçete gelirse = "Reçete kaydı bulunamadı")
-    # Sadece aynı reçete numarası geldiğinde hızlı kontrol yap, farklıysa atla
-    if onceki_recete_no and onceden_okunan_recete_no and onceki_recete_no == onceden_okunan_recete_no:
-        # Aynı reçete numarası → "Reçete kaydı bulunamadı" uyarısı var mı kontrol et
-        adim_baslangic = time.time()
-        recete_kaydi_var = bot.recete_kaydi_var_mi_kontrol_hizli()
-        log_sure("Reçete kontrolü (aynı no)", adim_baslangic, "recete_kontrol")
-        if not recete_kaydi_var:
-            logger.error("❌ Reçete kaydı yok (ardışık aynı numara)")
-            log_recete_baslik()
-            return (False, medula_recete_no, takip_sayisi, "Reçete kaydı bulunamadı")
-
-    # Reçete notu ve uyarı kontrolü KALDIRILDI - retry mekanizması gerektiğinde yapacak
-
-    # ===== BİRLEŞİK KONTROL: TESİS + TELEFON + AYNI REÇETE (TEK DÖNGÜ) =====
-    # 1) Yasaklı tesis → atla
-    # 2) Telefon yok → atla
-    # 3) SONRA basıldıktan sonra aynı reçete geldi mi → son reçete kontrolü
-    from medula_settings import get_medula_settings
-    medula_settings = get_medula_settings()
-    telefonsuz_atla = medula_settings.get("telefonsuz_atla", False)
-    yasakli_tesisler = medula_settings.get("yasakli_tesis_numaralari", [])
-    tesis_kontrolu_aktif = (grup == "B" and len(yasakli_tesisler) > 0)
-
-    # Kontrol gerekiyor mu?
-    if tesis_kontrolu_aktif or telefonsuz_atla:
-        atlanan_sayisi = 0
-        max_atlama = 50  # Sonsuz döngü koruması
-        onceki_loop_recete = onceden_okunan_recete_no  # İlk reçete no (varsa)
-        loop_hizli_sonuc = None  # Önceki iterasyondan kalan hızlı tarama sonucu
-
-        while atlanan_sayisi < max_atlama:
-            if should_stop():
-                return (False, None, 0, "Kullanıcı tarafından durduruldu")
-
-            atlama_nedeni = None
-            current_recete = None
-
-            # 1) TESİS KONTROLÜ (hızlı - tek element MSHTML okuma)
-            if tesis_kontrolu_aktif:
-                adim_baslangic = time.time()
-                tesis_no = bot.tesis_numarasi_oku()
-                log_sure("Tesis no okuma", adim_baslangic, "tesis_kontrol")
-
-                if tesis_no and tesis_no in yasakli_tesisler:
-                    atlama_nedeni = f"yasaklı tesis: {tesis_no}"
-
-            # 2) TELEFON KONTROLÜ + REÇETE NO (tek hızlı taramada ikisi birden)
-            if not atlama_nedeni and telefonsuz_atla:
-                adim_baslangic = time.time()
-                hizli_sonuc = bot.recete_sayfasi_hizli_tarama(max_deneme=2, bekleme_suresi=0.15)
-                if hizli_sonuc:
-                    telefon_var = hizli_sonuc['telefon_var']
-                    current_recete = hizli_sonuc.get('recete_no')
-                    loop_hizli_sonuc = hizli_sonuc
-                    log_sure("Telefon+Reçete kontrolü (hızlı)", adim_baslangic, "telefon_kontrol")
-                else:
-                    birlesik_sonuc = bot.recete_telefon_kontrol_birlesik(max_deneme=2, bekleme_suresi=0.2)
-                    telefon_var = birlesik_sonuc['telefon_var']
-                    current_recete = birlesik_sonuc.get('recete_no')
-                    log_sure("Telefon+Reçete kontrolü (fallback)", adim_baslangic, "telefon_kontrol")
-
-                if not telefon_var:
-                    atlama_nedeni = "telefon yok"
-
-            # 3) AYNI REÇETE KONTROLÜ (son reçeteye gelindi mi?)
-            # Telefon kontrolünden gelen reçete no ile karşılaştır - ek okuma yok
-            if not atlama_nedeni and onceki_loop_recete and current_recete:
-                if onceki_loop_recete == current_recete:
-                    # Aynı reçete - doğrulama: 0.5s bekle + tekrar oku
-                    time.sleep(0.5)
-                    dogrulama = bot.recete_sayfasi_hizli_tarama(max_deneme=2, bekleme_suresi=0.2)
-                    dogrulama_recete = dogrulama.get('recete_no') if dogrulama else None
-
-                    if dogrulama_recete and onceki_loop_recete == dogrulama_recete:
-                        if not bot.recete_kaydi_var_mi_kontrol_hizli():
-                            logger.error("❌ Reçete kaydı bulunamadı (son reçete)")
-                            return (False, None, takip_sayisi, "Reçete kaydı bulunamadı")
-                    else:
-                        current_recete = dogrulama_recete
-
-            # Her şey OK - döngüden çık
-            if not atlama_nedeni:
-                if atlanan_sayisi > 0:
-                    logger.info(f"✓ {atlanan_sayisi} reçete atlandı, devam ediliyor")
-                break
-
-            # SONRA butonuna bas
-            atlanan_sayisi += 1
-            logger.info(f"⏭ Reçete atlanıyor ({atlama_nedeni}) [{atlanan_sayisi}]")
-
-            adim_baslangic = time.time()
-            sonra = bot.retry_with_popup_check(
-                lambda: bot.sonra_butonuna_tikla(),
-                "SONRA butonu",
-                max_retries=5
-            )
-            log_sure("Sonra butonu (atlama)", adim_baslangic, "sonra_butonu")
-            if not sonra:
-                return (False, None, takip_sayisi, f"SONRA butonu başarısız ({atlama_nedeni})")
-
-            # Sayfanın yüklenmesi için kısa bekleme
-            time.sleep(0.4)
-
-            onceki_loop_recete = current_recete or onceki_loop_recete
-            # onceden_okunan_recete_no artık geçersiz (yeni sayfadayız)
-            onceden_okunan_recete_no = None
-        else:
-            # max_atlama'ya ulaşıldı
-            logger.error(f"❌ {max_atlama} ardışık reçete atlandı, durduruluyor")
-            return (False, None, takip_sayisi, f"{max_atlama} ardışık reçete atlandı")
-
-    # İlaç butonu referansı (hızlı taramadan alınacak)
-    ilac_butonu_ref = None
-
-    # Reçete numarası zaten GUI'de okunmuşsa tekrar okuma (performans optimizasyonu)
-    if onceden_okunan_recete_no:
-        medula_recete_no = onceden_okunan_recete_no
-    else:
-        # ★ ULTRA OPTİMİZE: CONTAINER-BASED HIZLI TARAMA ★
-        # Reçete no + telefon + ilaç butonu referansı TEK TARAMADA
-        adim_baslangic = time.time()
-
-        # Önce hızlı tarama dene (container-based, ~0.5-1 saniye)
-        hizli_sonuc = bot.recete_sayfasi_hizli_tarama(max_deneme=2, bekleme_suresi=0.15)
-
-        if hizli_sonuc:
-            # Hızlı tarama başarılı
-            medula_recete_no = hizli_sonuc['recete_no']
-            kayit_var = hizli_sonuc['kayit_var']
-            telefon_var = hizli_sonuc['telefon_var']
-            ilac_butonu_ref = hizli_sonuc.get('ilac_butonu')
-            log_sure("Reçete+Telefon+Buton (hızlı)", adim_baslangic, "recete_kontrol")
-        else:
-            # Fallback: Eski yöntem (~1.5 saniye)
-            birlesik_sonuc = bot.recete_telefon_kontrol_birlesik()
-            medula_recete_no = birlesik_sonuc['recete_no']
-            kayit_var = birlesik_sonuc['kayit_var']
-            telefon_var = birlesik_sonuc['telefon_var']
-            log_sure("Reçete+Telefon kontrolü (fallback)", adim_baslangic, "recete_kontrol")
-
-        # Kayıt yok kontrolü
-        if not kayit_var:
-            logger.error("❌ Reçete kaydı bulunamadı")
-            log_recete_baslik()
-            return (False, medula_recete_no, takip_sayisi, "Reçete kaydı bulunamadı")
-
-    log_recete_baslik(medula_recete_no)
-
-    # DURDURMA KONTROLÜ - telefon kontrolünden sonra
-    if should_stop():
-        logger.info("⏸ İşlem durduruldu (kullanıcı talebi)")
-        return (False, medula_recete_no, 0, "Kullanıcı tarafından durduruldu")
-
-    # Genel muayene uyarısı kontrolü (reçete açıldıktan hemen sonra)
-    try:
-        if bot.uyari_penceresini_kapat(max_bekleme=0.5):
-            logger.info("✓ Genel muayene uyarısı kapatıldı")
-    except Exception as e:
-        logger.debug(f"Uyarı kontrol hatası: {e}")
-
-    # ===== İLAÇ TAKİP PASİFSE ATLA =====
-    # İlaç takip aktif değilse, direkt rapor toplama/kontrol kısmına geç
-    if not ilac_takip_aktif:
-        logger.info("⏭ İlaç takip pasif, atlanıyor...")
-
-        # Sadece rapor işlemleri yap
-        sonraki_zaten_basildi = False
-
-        # Rapor toplama (aktifse)
-        if rapor_toplama_aktif and rapor_takip:
-            try:
-                if session_logger:
-                    session_logger.info("🔵 Rapor toplama başlatılıyor...")
-                rapor_verileri = bot.rapor_listesini_topla()
-                if rapor_verileri:
-                    sonraki_zaten_basildi = rapor_verileri.get('sonraki_basildi', False)
-                    if rapor_verileri.get('raporlar'):
-                        ad_soyad = rapor_verileri.get('ad_soyad', 'Bilinmeyen')
-                        telefon = rapor_verileri.get('telefon', '')
-                        raporlar = rapor_verileri.get('raporlar', [])
-                        rapor_takip.toplu_rapor_ekle(ad_soyad, telefon, raporlar, grup)
-                        logger.info(f"✓ Hasta raporları kaydedildi: {ad_soyad}")
-            except Exception as e:
-                logger.warning(f"Rapor kaydetme hatası: {e}")
-
-        # Rapor kontrol (aktifse)
-        if rapor_kontrol_aktif:
-            try:
-                from recete_kontrol import get_kontrol_motoru
-                kontrol_motoru = get_kontrol_motoru()
-                recete_verisi = {'recete_no': medula_recete_no, 'grup': grup}
-                sonuclar = kontrol_motoru.recete_kontrol_et(recete_verisi)
-                for kontrol_adi, rapor in sonuclar.items():
-                    if kontrol_adi != '_genel':
-                        logger.info(f"[Kontrol] {kontrol_adi}: {rapor.mesaj}")
-            except ImportError:
-                pass
-            except Exception as e:
-                logger.warning(f"Rapor kontrol hatası: {e}")
-
-        # Sonraki reçeteye geç
-        if not sonraki_zaten_basildi:
-            sonra = bot.retry_with_popup_check(
-                lambda: bot.sonra_butonuna_tikla(),
-                "SONRA butonu",
-                max_retries=5
-            )
-            if not sonra:
-                return (False, medula_recete_no, 0, "SONRA butonu başarısız")
-
-        return (True, medula_recete_no, 0, None)
-
-    # ===== İLAÇ TAKİP (AKTİF) =====
-    # İlaç butonuna tıkla (5 deneme + popup kontrolü)
-    # ★ OPTİMİZASYON: Eğer hızlı taramadan referans varsa direkt kullan ★
-    adim_baslangic = time.time()
-    ilac_butonu = False
-
-    if ilac_butonu_ref:
-        # Referans var - direkt tıkla (arama atlanıyor = ~1-2 saniye kazanç)
-        try:
-            if ilac_butonu_ref.exists(timeout=0.2):
-                ilac_butonu_ref.click_input()
-                ilac_butonu = True
-                logger.info("✓ İlaç butonuna tıklandı (referans ile - hızlı)")
-                bot.timed_sleep("ilac_butonu")
-        except Exception as e:
-            logger.debug(f"Referans tıklama hatası: {type(e).__name__}, fallback yapılıyor...")
-
-    # Referans yoksa veya başarısız olduysa normal yöntemi dene
-    if not ilac_butonu:
-        ilac_butonu = bot.retry_with_popup_check(
-            lambda: bot.ilac_butonuna_tikla(),
-            "İlaç butonu",
-            max_retries=5
-        )
-
-    log_sure("İlaç butonu", adim_baslangic, "ilac_butonu")
-    if not ilac_butonu:
-        log_recete_baslik()
-        return (False, medula_recete_no, takip_sayisi, "İlaç butonu başarısız")
-
-    # "Kullanılan İlaç Listesi" ekranının yüklenmesini bekle (5 saniye - yavaş bağlantı için artırıldı)
-    adim_baslangic = time.time()
-    ilac_ekrani = bot.ilac_ekrani_yuklendi_mi(max_bekleme=5)
-    log_sure("İlaç ekranı yükleme", adim_baslangic, "ilac_ekran_bekleme")
-    if not ilac_ekrani:
-        logger.error("❌ İlaç ekranı yüklenemedi")
-        log_recete_baslik()
-        return (False, medula_recete_no, takip_sayisi, "İlaç ekranı yüklenemedi")
-
-    # DURDURMA KONTROLÜ - ilaç ekranı sonrası
-    if should_stop():
-        logger.info("⏸ İşlem durduruldu (kullanıcı talebi)")
-        return (False, medula_recete_no, 0, "Kullanıcı tarafından durduruldu")
-
-    # Y butonuna tıkla (retry_with_popup_check ile - REÇETE NOTU vb. popup kontrolü)
-    ana_pencere = bot.main_window
-    adim_baslangic = time.time()
-    y_butonu = bot.retry_with_popup_check(
-        lambda: bot.y_tusuna_tikla(),
-        "Y butonu",
-        max_retries=5,
-        critical=False  # Y butonu başarısız olursa devam et, aşağıda tekrar denenir
-    )
-    log_sure("Y butonu", adim_baslangic, "y_butonu")
-
-    # İlaç Listesi penceresini akıllı bekleme ile bul (max 1 saniye)
-    # ÖNEMLİ: Y'ye tıklama başarılı dönse bile, popup yüzünden İlaç Listesi çıkmayabilir!
-    adim_baslangic = time.time()
-    ilac_penceresi_bulundu = False
-    max_bekleme = 1.0  # Maksimum 1 saniye bekle
-    bekleme_baslangic = time.time()
-
-    while time.time() - bekleme_baslangic < max_bekleme:
-        ilac_penceresi_bulundu = bot.yeni_pencereyi_bul("İlaç Listesi")
-        if ilac_penceresi_bulundu:
-            break  # BULUNDU! Hemen devam et
-        time.sleep(bot.timing.get("pencere_bulma"))
-
-    log_sure("İlaç penceresi bulma", adim_baslangic, "pencere_bulma")
-
-    # İlaç Listesi bulunamadıysa kritik popup kontrolü yap (REÇETE NOTU dahil)
-    # ===== POPUP WATCHER VARKEN BU KISIM NADIREN ÇALIŞIR =====
-    # Windows Hook popup watcher otomatik olarak popup'ları kapatır
-    if not ilac_penceresi_bulundu:
-        # ★ ÖNCELİKLE KRİTİK POPUP KONTROLÜ (REÇETE NOTU + UYARIDIR) ★
-        logger.info("⚠ İlaç Listesi bulunamadı → Kritik popup kontrolü yapılıyor...")
-        try:
-            if bot.kritik_popup_kontrol_ve_kapat():
-                logger.info("✓ Kritik popup kapatıldı (REÇETE NOTU veya UYARIDIR)")
-                time.sleep(0.3)
-        except Exception as e:
-            logger.debug(f"Kritik popup kontrol hatası: {type(e).__name__}")
-
-        # Ardından ESC tuşları ile diğer popup'ları kapat
-        logger.info("⚠ 3x ESC tuşuna basılıyor (LABA/LAMA uyarısı kapatma)")
-        for i in range(3):
-            send_keys("{ESC}")
-            time.sleep(0.1)  # ESC'ler arası kısa bekleme (OPT: 0.15 → 0.1)
-        logger.info("✓ 3x ESC tuşuna basıldı")
-        time.sleep(bot.timing.get("esc_sonrasi_bekleme", 0.3))  # OPT: 0.5 → timing
-
-        # Y butonuna tekrar tıkla (popup kontrolü ile)
-        logger.info("🔄 Y tuşuna tekrar basılıyor...")
-        adim_baslangic = time.time()
-        y_butonu = bot.retry_with_popup_check(
-            lambda: bot.y_tusuna_tikla(),
-            "Y butonu (ESC sonrası)",
-            max_retries=3,
-            critical=False
-        )
-        log_sure("Y butonu (ESC sonrası)", adim_baslangic, "y_butonu")
-
-        # İlaç Listesi penceresini tekrar ara
-        bekleme_baslangic = time.time()
-        max_bekleme = 0.8  # OPT: 1.0 → 0.8
-
-        while time.time() - bekleme_baslangic < max_bekleme:
-            ilac_penceresi_bulundu = bot.yeni_pencereyi_bul("İlaç Listesi")
-            if ilac_penceresi_bulundu:
-                logger.info("✓ İlaç Listesi bulundu (ESC + Y sonrası)")
-                break
-            time.sleep(bot.timing.get("pencere_bulma"))
-
-        log_sure("İlaç penceresi bulma (ESC sonrası)", adim_baslangic, "pencere_bulma")
-
-    # İlaç Listesi hala bulunamadıysa ENTER tuşu ile popup kapat (2. deneme)
-    if not ilac_penceresi_bulundu:
-        # ★ TEKRAR KRİTİK POPUP KONTROLÜ ★
-        try:
-            if bot.kritik_popup_kontrol_ve_kapat():
-                logger.info("✓ Kritik popup kapatıldı (2. kontrol)")
-                time.sleep(0.3)
-        except Exception:
-            pass
-
-        logger.info("⚠ İlaç Listesi hala bulunamadı → ENTER basılıyor...")
-        time.sleep(bot.timing.get("enter_oncesi_bekleme", 0.5))  # OPT: 1.0 → timing
-        send_keys("{ENTER}")
-        logger.info("✓ ENTER tuşuna basıldı (1. deneme)")
-
-        # İlaç Listesi penceresini tekrar ara
-        adim_baslangic = time.time()
-        bekleme_baslangic = time.time()
-        max_bekleme = 0.8  # OPT: 1.0 → 0.8
-
-        while time.time() - bekleme_baslangic < max_bekleme:
-            ilac_penceresi_bulundu = bot.yeni_pencereyi_bul("İlaç Listesi")
-            if ilac_penceresi_bulundu:
-                logger.info("✓ İlaç Listesi bulundu (ENTER sonrası)")
-                break
-            time.sleep(bot.timing.get("pencere_bulma"))
-
-        log_sure("İlaç penceresi bulma (ENTER sonrası)", adim_baslangic, "pencere_bulma")
-
-    # Hala bulunamadıysa ENTER tuşu ile popup kapat (3. deneme)
-    if not ilac_penceresi_bulundu:
-        # ★ SON KRİTİK POPUP KONTROLÜ ★
-        try:
-            if bot.kritik_popup_kontrol_ve_kapat():
-                logger.info("✓ Kritik popup kapatıldı (3. kontrol)")
-                time.sleep(0.3)
-        except Exception:
-            pass
-
-        logger.info("⚠ İlaç Listesi hala bulunamadı → tekrar ENTER basılıyor...")
-        time.sleep(bot.timing.get("enter_oncesi_bekleme", 0.5))  # OPT: 1.0 → timing
-        send_keys("{ENTER}")
-        logger.info("✓ ENTER tuşuna basıldı (2. deneme)")
-
-        # Y butonuna tekrar tıkla (popup kontrolü ile)
-        time.sleep(bot.timing.get("laba_sonrasi_bekleme"))
-        adim_baslangic = time.time()
-        y_butonu = bot.retry_with_popup_check(
-            lambda: bot.y_tusuna_tikla(),
-            "Y butonu (2. ENTER sonrası)",
-            max_retries=3,
-            critical=False
-        )
-        log_sure("Y butonu (2. ENTER sonrası)", adim_baslangic, "y_ikinci_deneme")
-
-        # İlaç Listesi penceresini tekrar ara
-        adim_baslangic = time.time()
-        bekleme_baslangic = time.time()
-        max_bekleme = 1.0
-
-        while time.time() - bekleme_baslangic < max_bekleme:
-            ilac_penceresi_bulundu = bot.yeni_pencereyi_bul("İlaç Listesi")
-            if ilac_penceresi_bulundu:
-                logger.info("✓ İlaç Listesi bulundu (2. ENTER + Y sonrası)")
-                break
-            time.sleep(bot.timing.get("pencere_bulma"))
-
-        log_sure("İlaç penceresi bulma (2. deneme)", adim_baslangic, "pencere_bulma")
-
-    # Hala bulunamadıysa gerçek hata
-    if not ilac_penceresi_bulundu:
-        logger.error("❌ İlaç Listesi penceresi bulunamadı (2x ENTER + Y sonrası bile)")
-        log_recete_baslik()
-        return (False, medula_recete_no, takip_sayisi, "İlaç Listesi penceresi bulunamadı")
-
-    # ===== YENİ AKIŞ: Textbox'lara 122 yaz =====
-    adim_baslangic = time.time()
-    bot.textboxlara_122_yaz()
-    log_sure("Textbox 122 yazma", adim_baslangic, "textbox_yazma")
-
-    # "Bizden Alınmayanları Seç" butonunu ara
-    adim_baslangic = time.time()
-    alinmayan_secildi = bot.bizden_alinanlarin_sec_tusuna_tikla()
-    log_sure("Alınmayanları Seç", adim_baslangic, "alinmayanlari_sec")
-
-    # Eğer buton bulunamadıysa → LABA/LAMA veya İlaç Çakışması uyarısı var olabilir
-    if not alinmayan_secildi:
-        logger.info("⚠ Bizden Alınmayanları Seç bulunamadı → LABA/LAMA kontrolü yapılıyor...")
-
-        # 1. LABA/LAMA kontrol ve kapat
-        laba_baslangic = time.time()
-        laba_kapatildi = bot.laba_lama_uyarisini_kapat(max_bekleme=1.5)
-        log_sure("LABA/LAMA kontrol", laba_baslangic, "laba_uyari")
-
-        # 2. LABA/LAMA kapatıldıysa, İlaç Çakışması kontrol ve kapat
-        ilac_cakismasi_kapatildi = False
-        if laba_kapatildi:
-            logger.info("⚠ LABA/LAMA kapatıldı → İlaç Çakışması kontrolü yapılıyor...")
-            ilac_baslangic = time.time()
-            ilac_cakismasi_kapatildi = bot.ilac_cakismasi_uyarisini_kapat(max_bekleme=1.5)
-            log_sure("İlaç Çakışması kontrol (LABA sonrası)", ilac_baslangic, "ilac_cakismasi_uyari")
-
-        # 3. Herhangi bir popup kapatıldıysa İlaç Listesi penceresini tekrar bul
-        if laba_kapatildi or ilac_cakismasi_kapatildi:
-            time.sleep(bot.timing.get("laba_sonrasi_bekleme"))
-
-            # İlaç Listesi penceresini tekrar bul
-            adim_baslangic = time.time()
-            ilac_penceresi_bulundu = bot.yeni_pencereyi_bul("İlaç Listesi")
-            log_sure("İlaç penceresi 2. bulma", adim_baslangic, "pencere_bulma")
-
-            if ilac_penceresi_bulundu:
-                # Tekrar "Bizden Alınmayanları Seç" butonunu ara
-                adim_baslangic = time.time()
-                alinmayan_secildi = bot.bizden_alinanlarin_sec_tusuna_tikla()
-                log_sure("Alınmayanları Seç (2. deneme)", adim_baslangic, "alinmayanlari_sec")
-
-        # Hala bulanamadıysa hata
-        if not alinmayan_secildi:
-            logger.error("❌ Bizden Alınmayanları Seç butonu bulunamadı (2 deneme)")
-            log_recete_baslik()
-            return (False, medula_recete_no, takip_sayisi, "Bizden Alınmayanları Seç butonu bulunamadı")
-
-    # ===== YENİ AKIŞ: Checkbox kontrolü YOK - direkt sağ tıkla ve Takip Et =====
-    # DURDURMA KONTROLÜ
-    if should_stop():
-        logger.info("⏸ İşlem durduruldu (kullanıcı talebi)")
-        return (False, medula_recete_no, 0, "Kullanıcı tarafından durduruldu")
-
-    # Kısa bekleme - seçim işleminin tamamlanması için
-    adim_baslangic = time.time()
-    time.sleep(0.3)
-
-    # Direkt sağ tıkla ve "Takip Et" - checkbox kontrolü YOK
-    takip_basarili = bot.ilk_ilaca_sag_tik_ve_takip_et()
-
-    if takip_basarili:
-        # Takip edilen ilaç sayısını say
-        try:
-            cells = bot.main_window.descendants(control_type="DataItem")
-            takip_sayisi = sum(1 for cell in cells if "Seçim satır" in cell.window_text())
-            logger.info(f"✓ {takip_sayisi} ilaç takip edildi")
-        except Exception as e:
-            logger.debug(f"Takip sayısı alınamadı: {type(e).__name__}")
-            takip_sayisi = 1
-    else:
-        logger.warning("⚠ Takip Et başarısız - pencere kapatılıyor")
-        takip_sayisi = 0
-
-    log_sure("İlaç seçimi ve takip", adim_baslangic, "ilac_secim_bekleme")
-
-    # İlaç Listesi penceresini kapat
-    adim_baslangic = time.time()
-    bot.ilac_listesi_penceresini_kapat()
-    log_sure("İlaç penceresi kapatma", adim_baslangic, "kapat_butonu")
-
-    # Ana Medula penceresine geri dön (main_window'u geri yükle)
-    bot.main_window = ana_pencere
-
-    # MEDULA penceresine odaklan ve hazır olmasını bekle
-    try:
-        bot.main_window.set_focus()
-        time.sleep(0.5)  # Pencere odaklanması için bekle
-        logger.info(f"✓ MEDULA penceresine geri dönüldü: {bot.main_window.window_text()}")
-    except Exception as focus_err:
-        logger.warning(f"⚠ MEDULA odaklama hatası: {type(focus_err).__name__}, yeniden bağlanılıyor...")
-        # Yeniden bağlan
-        if not bot.baglanti_kur("MEDULA"):
-            logger.error("❌ MEDULA'ya yeniden bağlanılamadı")
-        else:
-            logger.info("✓ MEDULA'ya yeniden bağlanıldı")
-
-    # DURDURMA KONTROLÜ - geri dön'den önce
-    if should_stop():
-        logger.info("⏸ İşlem durduruldu (kullanıcı talebi)")
-        return (False, medula_recete_no, takip_sayisi, "Kullanıcı tarafından durduruldu")
-
-    # Geri Dön butonuna tıkla (İlaç Listesi → Reçete Ana Sayfasına geçiş)
-    adim_baslangic = time.time()
-    geri_don = bot.geri_don_butonuna_tikla()
-    log_sure("Geri Dön butonu", adim_baslangic, "geri_don_butonu")
-    if not geri_don:
-        log_recete_baslik()
-        return (False, medula_recete_no, takip_sayisi, "Geri Dön butonu başarısız")
-
-    # ÖNEMLİ: Rapor toplama işlemi Geri Dön'den SONRA yapılmalı!
-    # Çünkü Rapor butonu (f:buttonRaporListesi) Reçete Ana Sayfasında (ReceteListe.jsp) bulunur.
-    # Geri Dön'e tıklandıktan sonra bu sayfaya geçilir ve Rapor butonu görünür olur.
-    # Rapor toplama sonrası Sonraki butonuna basılıp basılmadığını takip et
-    sonraki_zaten_basildi = False
-
-    if rapor_toplama_aktif and rapor_takip:
-        try:
-            if session_logger:
-                session_logger.info("🔵 Rapor toplama başlatılıyor (Reçete Ana Sayfasında)...")
-
-            adim_baslangic = time.time()
-            rapor_verileri = bot.rapor_listesini_topla()
-            log_sure("Rapor toplama", adim_baslangic, "rapor_toplama")
-
-            if rapor_verileri:
-                # Sonraki butonu basılmış mı kontrol et
-                sonraki_zaten_basildi = rapor_verileri.get('sonraki_basildi', False)
-
-                if rapor_verileri.get('raporlar'):
-                    ad_soyad = rapor_verileri.get('ad_soyad', 'Bilinmeyen')
-                    telefon = rapor_verileri.get('telefon', '')
-                    raporlar = rapor_verileri.get('raporlar', [])
-
-                    # Raporları CSV'ye kaydet
-                    rapor_takip.toplu_rapor_ekle(ad_soyad, telefon, raporlar, grup)
-                    logger.info(f"✓ Hasta raporları kaydedildi: {ad_soyad}")
-                    if session_logger:
-                        session_logger.basari(f"✅ {len(raporlar)} rapor CSV'ye kaydedildi - {ad_soyad} ({telefon})")
-                else:
-                    logger.info("Bu hastada rapor bulunamadı")
-                    if session_logger:
-                        session_logger.warning(f"⚠️ Rapor bulunamadı - {rapor_verileri.get('ad_soyad', 'Bilinmeyen')}")
-            else:
-                logger.info("Rapor okuma başarısız")
-                if session_logger:
-                    session_logger.warning("⚠️ Rapor okuma başarısız (rapor butonu tıklanamadı)")
-        except Exception as e:
-            logger.warning(f"Rapor kaydetme hatası (devam ediliyor): {e}")
-            if session_logger:
-                session_logger.error(f"❌ Rapor kaydetme hatası: {e}")
-
-    # SONRA butonuna tıkla - SADECE rapor toplarken basılmadıysa (5 deneme)
-    if sonraki_zaten_basildi:
-        logger.info("✓ Sonraki butonu rapor sayfasından zaten basıldı, atlanıyor...")
-    else:
-        adim_baslangic = time.time()
-        sonra = bot.retry_with_popup_check(
-            lambda: bot.sonra_butonuna_tikla(),
-            "SONRA butonu",
-            max_retries=5
-        )
-        log_sure("Sonra butonu", adim_baslangic, "sonra_butonu")
-        if not sonra:
-            log_recete_baslik()
-            return (False, medula_recete_no, takip_sayisi, "SONRA butonu başarısız")
-
-    # Toplam reçete süresi
-    toplam_sure = time.time() - recete_baslangic
-    if toplam_sure >= 60:
-        dakika = int(toplam_sure // 60)
-        saniye = int(toplam_sure % 60)
-        logger.info(f"🕐 TOPLAM: {dakika}dk {saniye}s")
-    else:
-        logger.info(f"🕐 TOPLAM: {toplam_sure:.2f}s")
-
-    return (True, medula_recete_no, takip_sayisi, None)
-
-
 def console_pencereyi_ayarla():
     """
     Console penceresini yerleştir (ayara göre):
@@ -7123,207 +6540,6 @@ def medula_taskkill():
         return False
 
 
-def medula_yeniden_baslat_ve_giris_yap(bot, grup="A", son_recete=None):
-    """
-    Sistemsel hata durumunda MEDULA'yı yeniden başlatır ve giriş yapar
-
-    Args:
-        bot: BotanikBot instance
-        grup: Hangi gruba gidileceği ("A", "B" veya "C")
-        son_recete: Son işlenen reçete numarası (varsa bu reçeteden devam edilir)
-
-    Returns:
-        bool: Başarılıysa True
-
-    Raises:
-        Exception: Yeniden başlatma başarısız olursa
-    """
-    try:
-        from medula_settings import get_medula_settings
-        from timing_settings import get_timing_settings
-
-        timing = get_timing_settings()
-
-        logger.info("=" * 60)
-        logger.error("🔄 SİSTEMSEL HATA - MEDULA YENİDEN BAŞLATILIYOR...")
-        logger.info("=" * 60)
-
-        # 1. MEDULA'yı kapat
-        logger.info("1️⃣ MEDULA kapatılıyor...")
-        medula_taskkill()
-        time.sleep(3)  # Programın tamamen kapanması için ekstra bekleme
-
-        # 2. Ayarları yükle
-        medula_settings = get_medula_settings()
-
-        # 3. MEDULA'yı aç ve giriş yap
-        logger.info("2️⃣ MEDULA açılıyor ve giriş yapılıyor...")
-        if not medula_ac_ve_giris_yap(medula_settings):
-            logger.error("❌ MEDULA açma/giriş başarısız")
-            return False
-
-        # 4. Bot'un bağlantısını yenile
-        logger.info("3️⃣ Bot bağlantısı yenileniyor...")
-        # Cache'i temizle
-        bot.medula_hwnd = None
-        bot.medula_pid = None
-
-        # Yeni bağlantı kur
-        if not bot.baglanti_kur("MEDULA", ilk_baglanti=False):
-            logger.error("❌ Bot bağlantısı kurulamadı")
-            return False
-
-        # 5. Ana sayfaya git
-        logger.info("⏳ Ana sayfa yüklenmesi bekleniyor...")
-        time.sleep(timing.get("ana_sayfa"))
-
-        # 6. Reçete Listesi'ne git
-        logger.info("4️⃣ Reçete Listesi açılıyor...")
-        try:
-            if not recete_listesi_ac(bot):
-                logger.error("❌ Reçete Listesi açılamadı")
-                return False
-        except SistemselHataException as e:
-            logger.error(f"⚠️ Reçete Listesi açma sırasında sistemsel hata: {e}")
-            logger.warning("🔄 MEDULA bir kez daha yeniden başlatılacak...")
-            # Recursive call - kendini bir kez daha çağır (son_recete ile)
-            return medula_yeniden_baslat_ve_giris_yap(bot, grup, son_recete)
-
-        # 7. Dönem seç (index=2)
-        logger.info("5️⃣ Dönem seçiliyor...")
-        if not donem_sec(bot, index=2):
-            logger.warning("⚠ Dönem 2 seçilemedi, dönem 1 deneniyor...")
-            if not donem_sec(bot, index=1):
-                logger.error("❌ Dönem seçimi başarısız")
-                return False
-
-        # 8. Grup seç
-        logger.info(f"6️⃣ Grup {grup} seçiliyor...")
-        if not grup_butonuna_tikla(bot, grup):
-            logger.error(f"❌ Grup {grup} seçimi başarısız")
-            return False
-
-        # Pencereyi yenile
-        bot.baglanti_kur("MEDULA", ilk_baglanti=False)
-
-        # 8.5. Reçete bulunamadı kontrolü
-        logger.info("🔍 Reçete varlığı kontrol ediliyor...")
-        if bulunamadi_mesaji_kontrol(bot):
-            logger.warning(f"⚠ Grup {grup}'da bu dönem için reçete bulunamadı")
-
-            # Farklı dönemler dene
-            donem_bulundu = False
-            for donem_index in [1, 0]:  # Dönem 2 (index 1), Dönem 1 (index 0) dene
-                logger.info(f"🔄 Dönem {donem_index + 1} deneniyor...")
-
-                # Dönem seç
-                if not donem_sec(bot, index=donem_index):
-                    logger.warning(f"⚠ Dönem {donem_index + 1} seçilemedi")
-                    continue
-
-                # Grup seç
-                if not grup_butonuna_tikla(bot, grup):
-                    logger.error(f"❌ Grup {grup} seçimi başarısız")
-                    continue
-
-                # Pencereyi yenile
-                bot.baglanti_kur("MEDULA", ilk_baglanti=False)
-
-                # Tekrar kontrol et
-                if not bulunamadi_mesaji_kontrol(bot):
-                    logger.info(f"✅ Dönem {donem_index + 1}'de reçete bulundu!")
-                    donem_bulundu = True
-                    break
-                else:
-                    logger.warning(f"⚠ Dönem {donem_index + 1}'de de reçete bulunamadı")
-
-            if not donem_bulundu:
-                # Farklı grupları dene
-                logger.warning(f"⚠ Grup {grup}'da hiçbir dönemde reçete bulunamadı, diğer gruplar deneniyor...")
-                for alternatif_grup in ["A", "B", "C"]:
-                    if alternatif_grup == grup:
-                        continue
-
-                    logger.info(f"🔄 Grup {alternatif_grup} deneniyor...")
-
-                    # Dönem seç (index=2)
-                    if not donem_sec(bot, index=2):
-                        if not donem_sec(bot, index=1):
-                            continue
-
-                    # Grup seç
-                    if not grup_butonuna_tikla(bot, alternatif_grup):
-                        continue
-
-                    # Pencereyi yenile
-                    bot.baglanti_kur("MEDULA", ilk_baglanti=False)
-
-                    # Kontrol et
-                    if not bulunamadi_mesaji_kontrol(bot):
-                        logger.info(f"✅ Grup {alternatif_grup}'da reçete bulundu!")
-                        grup = alternatif_grup  # Grubu güncelle
-                        donem_bulundu = True
-                        break
-
-                if not donem_bulundu:
-                    logger.error("❌ Hiçbir grup ve dönemde reçete bulunamadı")
-                    return False
-
-        # 9. Son reçeteye git (varsa) veya ilk reçeteyi aç
-        if son_recete:
-            logger.info(f"7️⃣ Son reçeteye gidiliyor: {son_recete}")
-            # Reçete Sorgu sayfasını aç (KADEMELİ KURTARMA ile)
-            if not bot.recete_sorgu_ac_kademeli():
-                logger.warning("⚠ Reçete Sorgu açılamadı (kademeli kurtarma sonrası), ilk reçete açılıyor...")
-                if not ilk_recete_ac(bot):
-                    logger.error("❌ İlk reçete açılamadı")
-                    return False
-            else:
-                # Reçete numarasını yaz
-                time.sleep(0.5)
-                if not bot.recete_no_yaz(son_recete):
-                    logger.warning(f"⚠ Reçete numarası yazılamadı: {son_recete}")
-                    if not ilk_recete_ac(bot):
-                        logger.error("❌ İlk reçete açılamadı")
-                        return False
-                else:
-                    # Sorgula butonuna tıkla
-                    time.sleep(0.3)
-                    if not bot.sorgula_butonuna_tikla():
-                        logger.warning("⚠ Sorgula butonu tıklanamadı, ilk reçete açılıyor...")
-                        if not ilk_recete_ac(bot):
-                            logger.error("❌ İlk reçete açılamadı")
-                            return False
-                    else:
-                        # Sorgulama başarılı - şimdi listedeki ilk reçeteyi aç
-                        logger.info(f"✓ Reçete sorgulandı: {son_recete}")
-                        time.sleep(0.5)  # Sorgu sonucunun yüklenmesi için bekle
-                        if not ilk_recete_ac(bot):
-                            logger.error("❌ Sorgulanan reçete açılamadı")
-                            return False
-                        logger.info(f"✓ Kaldığı reçete açıldı: {son_recete}")
-        else:
-            logger.info("7️⃣ İlk reçete açılıyor...")
-            if not ilk_recete_ac(bot):
-                logger.error("❌ İlk reçete açılamadı")
-                return False
-
-        logger.info("=" * 60)
-        logger.info(f"✅ MEDULA BAŞARIYLA YENİDEN BAŞLATILDI - GRUP {grup}")
-        if son_recete:
-            logger.info(f"📍 Kaldığı yerden devam: {son_recete}")
-        logger.info("=" * 60)
-        time.sleep(2)  # Kullanıcının mesajı görmesi için
-
-        return True
-
-    except Exception as e:
-        logger.error(f"❌ MEDULA yeniden başlatma hatası: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-
 def masaustu_medula_ac(medula_settings):
     """
     MEDULA programını exe dosyasından direkt çalıştır
@@ -8557,142 +7773,20 @@ def recete_turu_oku(bot, max_deneme=3):
     return None
 
 
-def tek_recete_rapor_kontrol(bot, recete_sira_no, grup="", session_logger=None, stop_check=None,
-                              onceden_okunan_recete_no=None, renkli_kontrol=None):
-    """
-    Tek bir reçete için SADECE rapor kontrol işlemi yap.
-    (İlaç takip ve rapor toplama YOK - sadece renkli reçete kontrolü)
-
-    Args:
-        bot: BotanikBot instance
-        recete_sira_no: Reçete sıra numarası (1, 2, 3...)
-        grup: Grup bilgisi (A, B, C, GK)
-        session_logger: SessionLogger instance
-        stop_check: Durdurma kontrolü callback
-        onceden_okunan_recete_no: Önceden okunan reçete numarası
-        renkli_kontrol: RenkliReceteKontrol instance
-
-    Returns:
-        tuple: (başarı, medula_recete_no, sorun_var_mi, mesaj)
-    """
-    # Durdurma kontrolü
-    def should_stop():
-        if stop_check and callable(stop_check):
-            return stop_check()
-        return False
-
-    if should_stop():
-        logger.info("⏸ İşlem durduruldu (kullanıcı talebi)")
-        return (False, None, False, "Kullanıcı tarafından durduruldu")
-
-    medula_recete_no = None
-
-    try:
-        # 1. Reçete numarasını al
-        if onceden_okunan_recete_no:
-            medula_recete_no = onceden_okunan_recete_no
-        else:
-            # Hızlı tarama ile reçete no al
-            hizli_sonuc = bot.recete_sayfasi_hizli_tarama(max_deneme=2, bekleme_suresi=0.15)
-            if hizli_sonuc:
-                medula_recete_no = hizli_sonuc.get('recete_no')
-            else:
-                # Fallback
-                birlesik_sonuc = bot.recete_telefon_kontrol_birlesik(max_deneme=2, bekleme_suresi=0.2)
-                medula_recete_no = birlesik_sonuc.get('recete_no')
-
-        if not medula_recete_no:
-            logger.warning(f"⚠ Reçete {recete_sira_no}: Numara okunamadı")
-            return (False, None, False, "Reçete numarası okunamadı")
-
-        logger.info(f"📋 REÇETE {recete_sira_no} | No: {medula_recete_no}")
-
-        # 2. Reçete türünü oku
-        recete_turu = recete_turu_oku(bot)
-
-        if not recete_turu:
-            logger.warning(f"⚠ Reçete {medula_recete_no}: Tür okunamadı, Normal kabul ediliyor")
-            recete_turu = "Normal"
-
-        logger.info(f"📝 Reçete türü: {recete_turu}")
-
-        # 3. Renkli reçete kontrolü
-        sorun_var = False
-        mesaj = ""
-
-        if renkli_kontrol:
-            sorun_var, mesaj = renkli_kontrol.kontrol_et(medula_recete_no, recete_turu, grup)
-            if sorun_var:
-                logger.warning(f"⚠ {mesaj}")
-        else:
-            logger.debug("Renkli reçete kontrolü aktif değil")
-
-        # 4. Doz kontrolü (raporlu ilaçlar için rapor sayfasından doz oku ve karşılaştır)
-        if should_stop():
-            return (True, medula_recete_no, sorun_var, "Durduruldu")
-
-        try:
-            doz_rapor = sadece_doz_kontrolu(bot, session_logger, stop_check)
-
-            # İlaç tablosunda hiç satır bulunamadıysa sayfa düşmüş olabilir
-            if doz_rapor['toplam_ilac'] == 0:
-                logger.warning(f"⚠ İlaç tablosunda satır bulunamadı - sayfa düşmüş olabilir!")
-                # Çıkış butonu kontrolü ile sayfa durumunu doğrula
-                try:
-                    if not bot.cikis_butonu_var_mi():
-                        logger.error("❌ Çıkış butonu da bulunamadı - MEDULA oturumu düşmüş!")
-                        raise SistemselHataException("MEDULA oturumu düşmüş - ilaç tablosu ve çıkış butonu bulunamadı")
-                    else:
-                        logger.info("Çıkış butonu mevcut - sayfa açık ama ilaç tablosu boş")
-                except SistemselHataException:
-                    raise
-                except Exception as e:
-                    logger.error(f"Çıkış butonu kontrol hatası: {e}")
-                    raise SistemselHataException("MEDULA durumu belirsiz - ilaç tablosu boş ve çıkış butonu kontrol edilemedi")
-
-            if doz_rapor['doz_asimi'] > 0:
-                sorun_var = True
-                logger.warning(f"⚠ Reçetede {doz_rapor['doz_asimi']} adet doz aşımı var")
-
-            if doz_rapor['okunamayanlar'] > 0:
-                logger.info(f"⚠ {doz_rapor['okunamayanlar']} ilaç için doz okunamadı")
-
-        except SistemselHataException:
-            raise
-        except Exception as e:
-            logger.error(f"Doz kontrolü hatası: {e}")
-
-        # 5. Sonraki reçeteye geç
-        if should_stop():
-            return (True, medula_recete_no, sorun_var, "Durduruldu")
-
-        sonra = bot.retry_with_popup_check(
-            lambda: bot.sonra_butonuna_tikla(),
-            "SONRA butonu",
-            max_retries=5
-        )
-
-        if not sonra:
-            logger.error(f"❌ Reçete {medula_recete_no}: SONRA butonu başarısız")
-            return (False, medula_recete_no, sorun_var, "SONRA butonu başarısız")
-
-        return (True, medula_recete_no, sorun_var, mesaj if sorun_var else "OK")
-
-    except Exception as e:
-        logger.error(f"❌ Reçete kontrol hatası: {e}")
-        return (False, medula_recete_no, False, str(e))
-
-
 # =============================================================================
 # İLAÇ TABLOSU KONTROL FONKSİYONLARI
 # =============================================================================
 
-def ilac_tablosu_toplu_oku(bot, max_satir=20):
+def ilac_tablosu_toplu_oku(bot, max_satir=20, anlik=None):
     """
     İlaç tablosundaki tüm satırların temel bilgilerini TEK DOM çağrısı ile oku.
     Bu fonksiyon satır sayısı + her satırın barkod, ilaç adı, msj, rapor kodu bilgisini döndürür.
     Ayrıca BotanikEOS'un enjekte ettiği rapor dozu ve etken madde bilgilerini de okur.
 
+    Sayfa tek outerHTML çağrısıyla alınıp süreç içinde ayrıştırılır
+    (medula_dom_anlik); aynı sayfa durumu için alınmış anlık `anlik` ile
+    verilebilir. outerHTML alınamazsa eleman eleman COM okumasına düşer.
+
     Returns:
         list[dict]: Her satır için:
             {
@@ -8711,107 +7805,19 @@ def ilac_tablosu_toplu_oku(bot, max_satir=20):
         Boş liste: Tablo boş veya okunamadı
     """
     try:
-        doc = bot._get_html_document(timeout=1)
-        if not doc:
-            logger.warning("ilac_tablosu_toplu_oku: DOM alınamadı")
-            return []
-
-        satirlar = []
-
-        # Önce skyblue satırlarını topla (EOS enjeksiyonları) - satir_index bazlı
-        eos_bilgileri = {}
-        try:
-            rows = doc.getElementsByTagName("TR")
-            skyblue_idx = 0
-            for i in range(rows.length):
-                row = rows.item(i)
-                if not row:
-                    continue
-                style = row.getAttribute("style") or ""
-                if "skyblue" not in style.lower():
-                    continue
-
-                eos = {'rapor_dozu': None, 'arka_plan': None, 'doz_uygun': None,
-                       'sgk_etkin_madde': None, 'sgk_kodu': None, 'etkin_madde': None}
-                cells = row.getElementsByTagName("TD")
-                for j in range(cells.length):
-                    cell = cells.item(j)
-                    if not cell:
-                        continue
-                    cell_text = (cell.innerText or "").strip()
-                    cell_style = cell.getAttribute("style") or ""
-                    if not cell_text:
-                        continue
-
-                    if "background-color" in cell_style.lower() and "x" in cell_text.lower():
-                        eos['rapor_dozu'] = cell_text
-                        sl = cell_style.lower()
-                        if "lightgreen" in sl:
-                            eos['arka_plan'] = "lightgreen"
-                            eos['doz_uygun'] = True
-                        elif "lightcoral" in sl or "red" in sl:
-                            eos['arka_plan'] = "lightcoral"
-                            eos['doz_uygun'] = False
-                        elif "yellow" in sl or "goldenrod" in sl:
-                            eos['arka_plan'] = "yellow"
-                            eos['doz_uygun'] = None
-                    elif "SGK" in cell_text.upper() and "-" in cell_text:
-                        eos['sgk_etkin_madde'] = cell_text
-                        parts = cell_text.split("-", 1)
-                        eos['sgk_kodu'] = parts[0].strip()
-                        eos['etkin_madde'] = parts[1].strip() if len(parts) > 1 else None
-
-                eos_bilgileri[skyblue_idx] = eos
-                skyblue_idx += 1
-        except Exception as e:
-            logger.debug(f"EOS bilgileri okuma hatası: {e}")
-
-        # İlaç satırlarını oku
-        for i in range(max_satir):
-            barkod_elem = doc.getElementById(f"f:tbl1:{i}:t1")
-            if not barkod_elem:
-                break
-            barkod = barkod_elem.getAttribute("value") or ""
-            if not barkod.strip():
-                break
-
-            # İlaç adı
-            ilac_adi = None
-            ilac_elem = doc.getElementById(f"f:tbl1:{i}:t6")
-            if ilac_elem:
-                ilac_adi = (ilac_elem.innerText or ilac_elem.getAttribute("value") or "").strip()
-
-            # Msj sütunu
-            msj = None
-            msj_elem = doc.getElementById(f"f:tbl1:{i}:t11")
-            if msj_elem:
-                msj = (msj_elem.innerText or msj_elem.getAttribute("value") or "").strip()
-
-            # Rapor kodu
-            rapor_kodu = None
-            rapor_elem = doc.getElementById(f"f:tbl1:{i}:t9")
-            if rapor_elem:
-                rapor_kodu = (rapor_elem.innerText or rapor_elem.getAttribute("value") or "").strip()
-                if not rapor_kodu:
-                    rapor_kodu = None
-
-            # EOS bilgileri
-            eos = eos_bilgileri.get(i, {})
-
-            satir = {
-                'satir': i,
-                'barkod': barkod.strip(),
-                'ilac_adi': ilac_adi,
-                'msj': msj,
-                'rapor_kodu': rapor_kodu,
-                'eos_rapor_dozu': eos.get('rapor_dozu'),
-                'eos_arka_plan': eos.get('arka_plan'),
-                'eos_doz_uygun': eos.get('doz_uygun'),
-                'eos_sgk_etkin_madde': eos.get('sgk_etkin_madde'),
-                'eos_sgk_kodu': eos.get('sgk_kodu'),
-                'eos_etkin_madde': eos.get('etkin_madde'),
-            }
-            satirlar.append(satir)
+        import medula_dom_anlik
+
+        if anlik is None:
+            doc = bot._get_html_document(timeout=1)
+            if not doc:
+                logger.warning("ilac_tablosu_toplu_oku: DOM alınamadı")
+                return []
+            anlik = medula_dom_anlik.DomAnlik.belgeden(doc)
+            if anlik is None:
+                # outerHTML alınamadı — eleman eleman COM okumasına dön
+                satirlar = medula_dom_anlik.ilac_tablosu_com_oku(doc, max_satir)
+        if anlik is not None:
+            satirlar = medula_dom_anlik.ilac_tablosu(anlik, max_satir)
 
         logger.info(f"İlaç tablosu toplu okuma: {len(satirlar)} satır")
         for s in satirlar:
@@ -10092,6 +9098,7 @@ def sadece_doz_kontrolu(bot, session_logger=None, stop_check=None):
                 'rapor_kodu': ilac['rapor_kodu'],
                 'recete_doz': recete_doz,
                 'rapor_tedavi_semasi': None,
+                'rapor_aciklamalari': [],
                 'eslesen_etkin_madde': None,
                 'doz_uygun': None,
                 'doz_aciklama': None,
@@ -10127,9 +9134,11 @@ def sadece_doz_kontrolu(bot, session_logger=None, stop_check=None):
                     for ts in tedavi_semalari:
                         logger.info(f"    {ts['sgk_kodu']} | {ts['etkin_madde']} | {ts['tedavi_semasi']}")
 
-                # 3d. Açıklamaları da oku (doz bilgisi olabilir)
+                # 3d. Açıklamaları da oku (doz bilgisi olabilir; SUT kontrolü
+                #     rapor metni olarak kullanır — recete_akisi.rapor_kontrol_zenginlestirici)
                 aciklamalar = rapor_aciklamalari_oku(bot)
                 if aciklamalar:
+                    detay['rapor_aciklamalari'] = list(aciklamalar)
                     for ac in aciklamalar:
                         logger.debug(f"  Açıklama: {ac[:100]}...")
 
@@ -25,9 +25,23 @@ import logging
 import json
 import os
 import threading
-from typing import List, Dict, Any, Optional
+import functools
+from contextlib import contextmanager
+from typing import List, Dict, Any, Optional, Callable, Iterator
 from datetime import datetime, date
 
+from botanik_db_havuz import (
+    BaglantiHavuzu,
+    baglanti_hatasi_mi,
+    VARSAYILAN_MAKS_BOYUT,
+    VARSAYILAN_BOSTA_KALMA_SN,
+    VARSAYILAN_SAGLIK_KONTROL_SN,
+    VARSAYILAN_BEKLEME_SN,
+)
+from botanik_db_akis import AkisSatiri, cursor_akisi, VARSAYILAN_PARTI
+from sql_tarih_araligi import aralik_kosulu
+from botanik_ayna import AynaDesteklenmiyor
+
 logger = logging.getLogger(__name__)
 
 # db_config.json yolu
@@ -48,6 +62,23 @@ def _db_config_yukle():
     return None
 
 
+def _ayna_destekli(metod):
+    """Rapor metodu: `ayna_raporlari` açıksa sorgularını önce yerel aynada dene.
+
+    Aynada çalışamayan sorgu (çevrilemeyen T-SQL, aynada olmayan tablo,
+    bayat ayna) otomatik olarak canlı veritabanına düşer. Yalnız tabloları
+    botanik_ayna.AYNA_TABLOLARI içinde olan raporlara uygulanır — diğerleri
+    her seferinde boşuna çeviri deneyip canlıya düşer.
+    """
+    @functools.wraps(metod)
+    def sarmal(self, *args, **kwargs):
+        if not self.ayna_raporlari or self._ayna is None:
+            return metod(self, *args, **kwargs)
+        with self.aynadan():
+            return metod(self, *args, **kwargs)
+    return sarmal
+
+
 class BotanikDB:
     """Botanik EOS SQL Server veritabanı bağlantı sınıfı"""
 
@@ -88,38 +119,126 @@ class BotanikDB:
         'BACKUP', 'RESTORE', 'SHUTDOWN', 'KILL', 'MERGE',
     ]
 
-    def __init__(self, config: Optional[Dict] = None, production: bool = True):
+    def __init__(self, config: Optional[Dict] = None, production: bool = True,
+                 baglanti_fabrikasi: Optional[Callable[[], Any]] = None):
         """
         Args:
             config: Özel bağlantı ayarları (opsiyonel)
             production: True=gerçek sunucu, False=test sunucusu
+            baglanti_fabrikasi: Yeni DB-API bağlantısı döndüren fonksiyon
+                (opsiyonel; verilmezse pyodbc.connect kullanılır — testlerde
+                sqlite/sahte bağlantı verilebilir)
         """
         if config:
             self.config = config
         else:
             self.config = self.PRODUCTION_CONFIG if production else self.TEST_CONFIG
-        self.conn = None
+        # Geriye uyumluluk: bazı modüller "bağlı mı?" için db.conn'a bakıyor.
+        # Sorgular havuzdan ödünç alınan bağlantılarla çalışır; conn artık
+        # bağlantı değil, baglan() başarılı ve havuz açık mı bayrağıdır.
+        self._bagli = False
         self.cursor = None
+        self._yerel = threading.local()  # thread başına son_sorgu_hatasi
         self.son_sorgu_hatasi = None  # son SQL hata metni (tanilama icin)
         # 🔒 Thread güvenliği: pyodbc bağlantısı/cursor'ı thread-safe DEĞİL.
         # Paylaşılan self.cursor iki thread'den eşzamanlı kullanılınca C
         # seviyesinde "access violation" (segfault) oluşuyordu (2026-06-03,
-        # aylık reçete kontrolünde çift sorgu thread'i). Bu kilit tüm DB
-        # erişimini serileştirir — aynı anda yalnızca bir sorgu çalışır.
-        self._sorgu_kilidi = threading.RLock()
+        # aylık reçete kontrolünde çift sorgu thread'i). Artık her sorgu
+        # havuzdan kendine ait bir bağlantı + cursor ödünç alır; bir bağlantı
+        # aynı anda tek thread'de kullanılır, bağımsız SELECT'ler paralel koşar.
+        self._baglanti_fabrikasi = baglanti_fabrikasi or self._pyodbc_baglan
+        # En az 2: sorgu_akis bir bağlantıyı akış boyunca tutarken aynı
+        # thread'in ara sorguları (toplu lookup'lar) kilitlenmesin.
+        self._havuz = BaglantiHavuzu(
+            self._baglanti_fabrikasi,
+            maks_boyut=max(2, int(self.config.get('havuz_maks_boyut',
+                                                  VARSAYILAN_MAKS_BOYUT))),
+            bosta_kalma_sn=self.config.get('havuz_bosta_kalma_sn', VARSAYILAN_BOSTA_KALMA_SN),
+            saglik_kontrol_sn=self.config.get('havuz_saglik_kontrol_sn',
+                                              VARSAYILAN_SAGLIK_KONTROL_SN),
+            bekleme_sn=self.config.get('havuz_bekleme_sn', VARSAYILAN_BEKLEME_SN),
+        )
+        self._baglanti_kilidi = threading.Lock()  # sadece baglan()/kapat() için
+        # Yerel ayna (botanik_ayna.py): rapor metodları açıkken aynadan okur
+        self._ayna = None
+        self.ayna_raporlari = bool(self.config.get('ayna_raporlari', False))
+        # Satış küpü (satis_kupu.py): aylık/günlük çıkış analizleri küpten okur
+        self._kup = None
+
+    @property
+    def son_sorgu_hatasi(self) -> Optional[str]:
+        """Bu thread'in son SQL hata metni (sorgular paralel koştuğu için
+        thread başına tutulur — başka thread'in hatası üzerine yazmaz)."""
+        return getattr(self._yerel, 'son_sorgu_hatasi', None)
+
+    @son_sorgu_hatasi.setter
+    def son_sorgu_hatasi(self, deger: Optional[str]):
+        self._yerel.son_sorgu_hatasi = deger
+
+    def ayna_bagla(self, ayna) -> None:
+        """Yerel aynayı (BotanikAyna) bağla; None verilirse ayrılır."""
+        self._ayna = ayna
+
+    @contextmanager
+    def aynadan(self):
+        """Bu blokta (bu thread'de) sorgular önce yerel aynada denenir."""
+        onceki = getattr(self._yerel, 'aynadan', False)
+        self._yerel.aynadan = True
+        try:
+            yield
+        finally:
+            self._yerel.aynadan = onceki
+
+    def kup_bagla(self, kup) -> None:
+        """Satış küpünü (SatisKupu) bağla; None verilirse ayrılır."""
+        self._kup = kup
+
+    def satis_kupu(self, esas: str = 'kayit', bas=None):
+        """Bu esasta kurulmuş, taze ve `bas` gününü kapsayan küp; yoksa None
+        (çağıran kendi SQL'ine düşer)."""
+        kup = self._kup
+        if kup is None:
+            return None
+        try:
+            return kup if kup.kullanilabilir_mi(esas, bas) else None
+        except Exception as e:
+            logger.warning("Satış küpü kullanılamadı, canlı sorgu: %s", e)
+            return None
 
-    def baglan(self) -> bool:
-        """Veritabanına bağlan"""
+    def _aynada_calistir(self, sql: str, params) -> Optional[List[Dict]]:
+        """Aynada çalıştır; çalıştırılamazsa None (çağıran canlıya düşer)."""
+        ayna = self._ayna
+        if ayna is None or not getattr(self._yerel, 'aynadan', False):
+            return None
         try:
-            conn_str = self._connection_string_olustur()
-            self.conn = pyodbc.connect(conn_str, timeout=30)
-            self.conn.timeout = 300  # Query timeout: 5 dakika
-            self.cursor = self.conn.cursor()
-            logger.info(f"Veritabanına bağlandı: {self.config['database']}")
-            return True
+            if not ayna.kullanilabilir_mi():
+                return None
+            return ayna.sorgu_calistir(sql, params)
+        except AynaDesteklenmiyor as e:
+            logger.debug("Ayna kullanılamadı, canlı sorgu: %s", e)
         except Exception as e:
-            logger.error(f"Veritabanı bağlantı hatası: {e}")
-            return False
+            logger.warning("Ayna sorgu hatası, canlı sorgu: %s", e)
+        return None
+
+    def _pyodbc_baglan(self):
+        """Havuz için yeni pyodbc bağlantısı aç"""
+        conn = pyodbc.connect(self._connection_string_olustur(), timeout=30)
+        conn.timeout = 300  # Query timeout: 5 dakika
+        return conn
+
+    def baglan(self) -> bool:
+        """Veritabanına bağlan (havuzu hazırla ve ilk bağlantıyı sına)"""
+        with self._baglanti_kilidi:
+            try:
+                self._havuz.yeniden_ac()
+                conn = self._havuz.al()
+                self._havuz.birak(conn)
+                self._bagli = True
+                logger.info(f"Veritabanına bağlandı: {self.config['database']}")
+                return True
+            except Exception as e:
+                logger.error(f"Veritabanı bağlantı hatası: {e}")
+                return False
 
     def _connection_string_olustur(self) -> str:
         """Bağlantı string'i oluştur"""
@@ -141,15 +260,28 @@ class BotanikDB:
         return ";".join(parts)
 
     def kapat(self):
-        """Bağlantıyı kapat"""
-        try:
-            if self.cursor:
-                self.cursor.close()
-            if self.conn:
-                self.conn.close()
-            logger.info("Veritabanı bağlantısı kapatıldı")
-        except Exception as e:
-            logger.error(f"Bağlantı kapatma hatası: {e}")
+        """Bağlantıyı kapat (havuzdaki tüm boş bağlantılar kapanır)"""
+        with self._baglanti_kilidi:
+            try:
+                self._havuz.kapat()
+                self._bagli = False
+                logger.info("Veritabanı bağlantısı kapatıldı")
+            except Exception as e:
+                logger.error(f"Bağlantı kapatma hatası: {e}")
+
+    def havuz_durumu(self) -> Dict:
+        """Bağlantı havuzunun anlık durumu (tanılama)"""
+        return self._havuz.durum()
+
+    @property
+    def conn(self) -> bool:
+        """Bağlı mı? (geriye uyumluluk; havuzdaki bağlantıya tutamak DEĞİL)"""
+        return self._bagli
+
+    @staticmethod
+    def _baglanti_hatasi_mi(hata: Exception) -> bool:
+        """Hata bağlantının kendisini bozan türden mi? (SQLSTATE 08xxx)"""
+        return baglanti_hatasi_mi(hata)
 
     def _guvenlik_kontrolu(self, sql: str) -> bool:
         """
@@ -233,37 +365,116 @@ class BotanikDB:
         Son hata mesajı self.son_sorgu_hatasi'na kaydedilir (boş sonuç tanılaması için).
         """
         self.son_sorgu_hatasi = None
-        # 🔒 Tek seferde tek thread — paylaşılan cursor'a eşzamanlı erişim
-        # pyodbc'de access violation (segfault) doğuruyor.
-        with self._sorgu_kilidi:
-            try:
-                # GÜVENLİK KONTROLÜ
-                if not self._guvenlik_kontrolu(sql):
-                    self.son_sorgu_hatasi = "Guvenlik kontrolu reddetti"
-                    logger.error("SORGU REDDEDİLDİ: Güvenlik kontrolünden geçemedi!")
-                    return []
-
-                if not self.conn:
-                    if not self.baglan():
-                        self.son_sorgu_hatasi = "DB baglantisi kurulamadi"
-                        return []
-
-                if params:
-                    self.cursor.execute(sql, params)
-                else:
-                    self.cursor.execute(sql)
+        # GÜVENLİK KONTROLÜ
+        if not self._guvenlik_kontrolu(sql):
+            self.son_sorgu_hatasi = "Guvenlik kontrolu reddetti"
+            logger.error("SORGU REDDEDİLDİ: Güvenlik kontrolünden geçemedi!")
+            return []
 
-                columns = [column[0] for column in self.cursor.description]
-                results = []
-                for row in self.cursor.fetchall():
-                    results.append(dict(zip(columns, row)))
-                return results
+        ayna_sonucu = self._aynada_calistir(sql, params)
+        if ayna_sonucu is not None:
+            return ayna_sonucu
 
-            except Exception as e:
-                self.son_sorgu_hatasi = str(e)
-                logger.error(f"Sorgu hatası: {e}")
+        if not self.conn:
+            if not self.baglan():
+                self.son_sorgu_hatasi = "DB baglantisi kurulamadi"
                 return []
 
+        # 🔒 Her sorgu havuzdan kendi bağlantısını ödünç alır — bağlantı/cursor
+        # thread'ler arasında paylaşılmaz (pyodbc access violation koruması).
+        try:
+            conn = self._havuz.al()
+        except Exception as e:
+            self.son_sorgu_hatasi = str(e)
+            logger.error(f"Sorgu hatası (bağlantı alınamadı): {e}")
+            return []
+
+        bozuk = False
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
+
+            columns = [column[0] for column in cursor.description]
+            results = []
+            for row in cursor.fetchall():
+                results.append(dict(zip(columns, row)))
+            return results
+
+        except Exception as e:
+            bozuk = self._baglanti_hatasi_mi(e)
+            self.son_sorgu_hatasi = str(e)
+            logger.error(f"Sorgu hatası: {e}")
+            return []
+        finally:
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    bozuk = True
+            self._havuz.birak(conn, bozuk=bozuk)
+
+    def sorgu_akis(self, sql: str, params: tuple = None,
+                   batch: int = VARSAYILAN_PARTI) -> Iterator[List[AkisSatiri]]:
+        """
+        SQL sorgusunu akışlı çalıştır: fetchmany ile `batch` satırlık
+        partiler (AkisSatiri listesi) üretir.
+
+        sorgu_calistir'dan farkı: tüm sonuç belleğe alınmaz ve satır başına
+        dict kurulmaz — satırlar tek bir kolon indeksini paylaşan tuple'lardır
+        (r["Kolon"], r.get("Kolon") çalışır). İlk parti, sorgunun tamamı
+        bitmeden çağırana ulaşır.
+
+        GÜVENLİK: sorgu_calistir ile aynı SELECT-only guard.
+        Bağlantı, akış tüketilene (ya da generator kapatılana) kadar havuzdan
+        ödünç tutulur. Hata olursa akış sessizce biter; metin
+        self.son_sorgu_hatasi'na yazılır (sorgu_calistir ile aynı sözleşme).
+        """
+        self.son_sorgu_hatasi = None
+        if not self._guvenlik_kontrolu(sql):
+            self.son_sorgu_hatasi = "Guvenlik kontrolu reddetti"
+            logger.error("SORGU REDDEDİLDİ: Güvenlik kontrolünden geçemedi!")
+            return
+
+        if not self.conn:
+            if not self.baglan():
+                self.son_sorgu_hatasi = "DB baglantisi kurulamadi"
+                return
+
+        try:
+            conn = self._havuz.al()
+        except Exception as e:
+            self.son_sorgu_hatasi = str(e)
+            logger.error(f"Sorgu hatası (bağlantı alınamadı): {e}")
+            return
+
+        bozuk = False
+        cursor = None
+        try:
+            cursor = conn.cursor()
+            if params:
+                cursor.execute(sql, params)
+            else:
+                cursor.execute(sql)
+            yield from cursor_akisi(cursor, batch)
+        except GeneratorExit:
+            # Çağıran akışı yarıda bıraktı — bağlantı sağlam, havuza döner
+            raise
+        except Exception as e:
+            bozuk = self._baglanti_hatasi_mi(e)
+            self.son_sorgu_hatasi = str(e)
+            logger.error(f"Sorgu hatası: {e}")
+        finally:
+            if cursor is not None:
+                try:
+                    cursor.close()
+                except Exception:
+                    bozuk = True
+            self._havuz.birak(conn, bozuk=bozuk)
+
     def tum_hareketler_getir(
         self,
         baslangic_tarih: Optional[date] = None,
@@ -274,7 +485,22 @@ class BotanikDB:
     ) -> List[Dict]:
         """
         Tüm stok hareketlerini getir - KAPSAMLI TÜM ALANLAR
+
+        Tarih filtresi türetilmiş Tarih kolonunda değil, her UNION kolunun
+        kendi tarih kolonunda yarı-açık aralık olarak uygulanır (sargable,
+        bitis_tarih günü dahil).
         """
+        params: List[Any] = []
+
+        def _tarih(kolon: str) -> str:
+            # f-string ifadeleri soldan sağa değerlenir → params sırası = ? sırası
+            kosul, prm = aralik_kosulu(kolon, baslangic_tarih or None,
+                                       bitis_tarih or None, bitis_dahil=True)
+            if not kosul:
+                return ""
+            params.extend(prm)
+            return f" AND {kosul}"
+
         sql = f"""
         SELECT TOP {limit} * FROM (
 
@@ -312,7 +538,7 @@ class BotanikDB:
             JOIN FaturaSatir fs ON fg.FGId = fs.FSFGId
             JOIN Urun u ON fs.FSUrunId = u.UrunId
             LEFT JOIN Depo d ON fg.FGIlgiliId = d.DepoId AND fg.FGIlgiliTipi = 1
-            WHERE fg.FGSilme = 0
+            WHERE fg.FGSilme = 0{_tarih('fg.FGFaturaTarihi')}
 
             UNION ALL
 
@@ -351,7 +577,7 @@ class BotanikDB:
             JOIN Urun u ON fcs.FSUrunId = u.UrunId
             LEFT JOIN Depo d ON fc.FGIlgiliId = d.DepoId AND fc.FGIlgiliTipi = 1
             LEFT JOIN Musteri c ON fc.FGIlgiliId = c.MusteriId AND fc.FGIlgiliTipi = 2
-            WHERE fc.FGSilme = 0
+            WHERE fc.FGSilme = 0{_tarih('fc.FGFaturaTarihi')}
 
             UNION ALL
 
@@ -392,7 +618,7 @@ class BotanikDB:
             LEFT JOIN Doktor dok ON ra.RxDoktorId = dok.DoktorId
             LEFT JOIN Hastane h ON ra.RxHastaneId = h.HastaneId
             LEFT JOIN Kurum k ON ra.RxKurumId = k.KurumId
-            WHERE ra.RxSilme = 0 AND ri.RISilme = 0
+            WHERE ra.RxSilme = 0 AND ri.RISilme = 0{_tarih('ra.RxIslemTarihi')}
 
             UNION ALL
 
@@ -430,7 +656,7 @@ class BotanikDB:
             JOIN TakasSatir ts ON t.TakasId = ts.TSTakasId
             JOIN Urun u ON ts.TSUrunId = u.UrunId
             LEFT JOIN Eczaneler e ON t.TakasEczaneId = e.EczaneId
-            WHERE t.TakasSilme = 0 AND ts.TSSilme = 0 AND t.TakasYonu = 1
+            WHERE t.TakasSilme = 0 AND ts.TSSilme = 0 AND t.TakasYonu = 1{_tarih('t.TakasTarihi')}
 
             UNION ALL
 
@@ -468,7 +694,7 @@ class BotanikDB:
             JOIN TakasSatir ts ON t.TakasId = ts.TSTakasId
             JOIN Urun u ON ts.TSUrunId = u.UrunId
             LEFT JOIN Eczaneler e ON t.TakasEczaneId = e.EczaneId
-            WHERE t.TakasSilme = 0 AND ts.TSSilme = 0 AND t.TakasYonu = 0
+            WHERE t.TakasSilme = 0 AND ts.TSSilme = 0 AND t.TakasYonu = 0{_tarih('t.TakasTarihi')}
 
             UNION ALL
 
@@ -505,6 +731,7 @@ class BotanikDB:
             FROM IadeTakip it
             JOIN Urun u ON it.ITUrunId = u.UrunId
             LEFT JOIN Depo d ON it.ITDepoId = d.DepoId
+            WHERE 1=1{_tarih('it.ITKayitTarihi')}
 
             UNION ALL
 
@@ -542,21 +769,12 @@ class BotanikDB:
             JOIN EldenIlaclari ei ON ea.RxId = ei.RIRxId
             JOIN Urun u ON ei.RIUrunId = u.UrunId
             LEFT JOIN Musteri m ON ea.RxMusteriId = m.MusteriId
-            WHERE ea.RxSilme = 0 AND ei.RISilme = 0
+            WHERE ea.RxSilme = 0 AND ei.RISilme = 0{_tarih('ea.RxIslemTarihi')}
 
         ) AS TumHareketler
         WHERE 1=1
         """
 
-        # Tarih filtreleri
-        if baslangic_tarih:
-            tarih_str = baslangic_tarih.strftime("%Y-%m-%d")
-            sql += f" AND Tarih >= '{tarih_str}'"
-
-        if bitis_tarih:
-            tarih_str = bitis_tarih.strftime("%Y-%m-%d")
-            sql += f" AND Tarih <= '{tarih_str}'"
-
         # Hareket tipi filtresi
         if hareket_tipi:
             sql += f" AND HareketTipi = '{hareket_tipi}'"
@@ -568,7 +786,7 @@ class BotanikDB:
 
         sql += " ORDER BY Tarih DESC, BelgeId DESC"
 
-        return self.sorgu_calistir(sql)
+        return self.sorgu_calistir(sql, tuple(params))
 
     def fatura_giris_detay(self, baslangic_tarih=None, bitis_tarih=None, depo_id=None, limit=1000):
         """Fatura girişleri detaylı"""
@@ -1667,6 +1885,16 @@ class BotanikDB:
                 'bitis': ay_sonu.strftime('%Y-%m-%d')
             })
 
+        # Yalnız satış tipleri seçiliyse satış küpünden (RxReceteTarihi esası)
+        satis_tipleri = {'RECETE_SATIS': 'recete', 'ELDEN_SATIS': 'elden'}
+        if hareket_tipleri and set(hareket_tipleri) <= set(satis_tipleri):
+            kup = self.satis_kupu('recete', baslangic_tarih)
+            if kup is not None:
+                kaynak = (satis_tipleri[hareket_tipleri[0]]
+                          if len(set(hareket_tipleri)) == 1 else None)
+                return self._stok_hareket_kupten(kup, baslangic_tarih, ay_kolonlari,
+                                                 kaynak, limit)
+
         # SQL sorgusu oluştur
         # Her hareket tipi için ayrı UNION bloğu
         hareket_bloklari = []
@@ -1821,6 +2049,51 @@ class BotanikDB:
 
         return self.sorgu_calistir(sql)
 
+    def _stok_hareket_kupten(self, kup, baslangic_tarih: str, ay_kolonlari: List[Dict],
+                             kaynak: Optional[str], limit: int) -> List[Dict]:
+        """stok_hareket_analiz_getir'in satış-tipi (CIKIS) satırları, küpten.
+
+        Aylık toplamlar küpten; ürün bilgisi Urun'dan IN listesiyle okunur.
+        """
+        from datetime import timedelta
+
+        toplam = kup.toplam(bas=baslangic_tarih, kaynak=kaynak, esas='recete')
+        islem = kup.toplam(bas=baslangic_tarih, olcu='islem', kaynak=kaynak, esas='recete')
+        aylik = []
+        for ay in ay_kolonlari:
+            bit = date.fromisoformat(ay['bitis']) + timedelta(days=1)
+            aylik.append(kup.toplam(list(toplam), bas=ay['baslangic'], bit=bit,
+                                    kaynak=kaynak, esas='recete'))
+
+        urun_bilgi = {}
+        idler = list(toplam)
+        for i in range(0, len(idler), 1000):
+            id_str = ','.join(map(str, idler[i:i + 1000]))
+            for r in self.sorgu_calistir(f"""
+                SELECT u.UrunId, u.UrunAdi,
+                    COALESCE(ut.UrunTipAdi, 'Belirsiz') as UrunTipi,
+                    u.UrunEsdegerId as EsdegerId,
+                    (u.UrunStokDepo + u.UrunStokRaf + u.UrunStokAcik) as Stok
+                FROM Urun u
+                LEFT JOIN UrunTip ut ON u.UrunUrunTipId = ut.UrunTipId
+                WHERE u.UrunSilme = 0 AND u.UrunId IN ({id_str})
+            """):
+                urun_bilgi[r['UrunId']] = r
+
+        sonuc = []
+        for uid, bilgi in urun_bilgi.items():
+            satir = dict(bilgi)
+            satir.update(Yon='CIKIS', ToplamAdet=toplam[uid], ToplamIslem=islem.get(uid, 0))
+            for ay in ay_kolonlari:
+                satir[f"Giris_Ay{ay['ay_no']}"] = 0
+            for ay, ay_toplam in zip(ay_kolonlari, aylik):
+                satir[f"Cikis_Ay{ay['ay_no']}"] = ay_toplam.get(uid, 0)
+            sonuc.append(satir)
+        # SQL Server ORDER BY: NULL eşdeğer önce
+        sonuc.sort(key=lambda r: (r['EsdegerId'] is not None, r['EsdegerId'] or 0,
+                                  r['UrunAdi'] or ''))
+        return sonuc[:limit]
+
     def stok_hareket_urunler_getir(
         self,
         yil_sayisi: int = 2,
@@ -2225,6 +2498,20 @@ class BotanikDB:
         bugun = datetime.now()
         baslangic = (bugun - relativedelta(months=ay_sayisi)).replace(day=1)
 
+        kup = self.satis_kupu('kayit', baslangic)
+        if kup is not None:
+            sgk = kup.grup_toplam({0: urun_idler}, bas=baslangic, donem='ay',
+                                  kaynak='recete')[0]
+            elden = kup.grup_toplam({0: urun_idler}, bas=baslangic, donem='ay',
+                                    kaynak='elden')[0]
+            sonuc = []
+            for n in range(ay_sayisi):
+                ay = (bugun - relativedelta(months=n)).strftime('%Y-%m')
+                s, e = sgk.get(ay, 0), elden.get(ay, 0)
+                sonuc.append({'AyKod': ay, 'SGKSatis': s, 'EldenSatis': e,
+                              'ToplamSatis': s + e})
+            return sonuc
+
         urun_id_str = ','.join(map(str, urun_idler))
 
         # NOT: Kayıt tarihi (RxKayitTarihi) kullanılıyor, reçete tarihi değil!
@@ -2341,6 +2628,7 @@ class BotanikDB:
             'ilac_detaylari': ilac_detaylari
         }
 
+    @_ayna_destekli
     def mf_satis_analizi_getir(
         self,
         urun_idler: List[int],
@@ -4717,7 +5005,12 @@ class BotanikDB:
             kurum_filtre = f" AND ra.RxKurumId = {int(kurum_id)} "
 
         # Kaynak UNION
-        recete_blok = """
+        # Tarih: sql_tarih_araligi ile yarı-açık aralık (bitiş günü dahil)
+        rx_kosul, rx_prm = aralik_kosulu("ra.RxIslemTarihi", bas_str, bit_str,
+                                         bitis_dahil=True)
+        el_kosul, el_prm = aralik_kosulu("ea.RxIslemTarihi", bas_str, bit_str,
+                                         bitis_dahil=True)
+        recete_blok = f"""
             SELECT
                 'RECETE' as Kaynak,
                 ra.RxId as RxId,
@@ -4728,11 +5021,10 @@ class BotanikDB:
             JOIN ReceteIlaclari ri ON ra.RxId = ri.RIRxId
             WHERE ra.RxSilme = 0 AND ri.RISilme = 0
                 AND (ri.RIIade = 0 OR ri.RIIade IS NULL)
-                AND ra.RxIslemTarihi >= ?
-                AND ra.RxIslemTarihi < DATEADD(DAY, 1, CAST(? as date))
+                AND {rx_kosul}
         """ + kurum_filtre
 
-        elden_blok = """
+        elden_blok = f"""
             SELECT
                 'ELDEN' as Kaynak,
                 ea.RxId as RxId,
@@ -4743,18 +5035,17 @@ class BotanikDB:
             JOIN EldenIlaclari ei ON ea.RxId = ei.RIRxId
             WHERE ea.RxSilme = 0 AND ei.RISilme = 0
                 AND (ei.RIIade = 0 OR ei.RIIade IS NULL)
-                AND ea.RxIslemTarihi >= ?
-                AND ea.RxIslemTarihi < DATEADD(DAY, 1, CAST(? as date))
+                AND {el_kosul}
         """
 
         kaynak_bloklari = []
         params = []
         if recete_aktif:
             kaynak_bloklari.append(recete_blok)
-            params.extend([bas_str, bit_str])
+            params.extend(rx_prm)
         if elden_aktif:
             kaynak_bloklari.append(elden_blok)
-            params.extend([bas_str, bit_str])
+            params.extend(el_prm)
 
         if not kaynak_bloklari:
             return []
@@ -5079,9 +5370,40 @@ def get_botanik_db() -> BotanikDB:
     global _db_instance
     if _db_instance is None:
         _db_instance = BotanikDB()
+        if _db_instance.ayna_raporlari:
+            _ayna_baslat(_db_instance)
+        if _db_instance.config.get('satis_kupu', False):
+            _kup_baslat(_db_instance)
     return _db_instance
 
 
+def _ayna_baslat(db: BotanikDB) -> None:
+    """db_config.json'da ayna_raporlari açıksa yerel aynayı bağla ve
+    arka planda periyodik senkronu başlat."""
+    from botanik_ayna import BotanikAyna, VARSAYILAN_YOL, VARSAYILAN_ARALIK_SN
+    try:
+        ayna = BotanikAyna(db.config.get('ayna_yolu') or VARSAYILAN_YOL)
+    except Exception as e:
+        logger.warning("Ayna açılamadı, raporlar canlıdan: %s", e)
+        return
+    db.ayna_bagla(ayna)
+    ayna.arka_plan_baslat(db, db.config.get('ayna_aralik_sn', VARSAYILAN_ARALIK_SN))
+
+
+def _kup_baslat(db: BotanikDB) -> None:
+    """db_config.json'da satis_kupu açıksa küpü bağla ve arka planda
+    periyodik yenilemeyi başlat (kurulmamış esaslar ilk turda kurulur)."""
+    from satis_kupu import paylasilan_kup, VARSAYILAN_YOL, VARSAYILAN_ARALIK_SN
+    try:
+        kup = paylasilan_kup(yol=db.config.get('satis_kupu_yolu') or VARSAYILAN_YOL)
+    except Exception as e:
+        logger.warning("Satış küpü açılamadı, analizler canlıdan: %s", e)
+        return
+    db.kup_bagla(kup)
+    kup.arka_plan_baslat(db, db.config.get('satis_kupu_esaslari', ('kayit', 'recete', 'islem')),
+                         db.config.get('satis_kupu_aralik_sn', VARSAYILAN_ARALIK_SN))
+
+
 # Test
 if __name__ == "__main__":
     db = BotanikDB()
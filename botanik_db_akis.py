@@ -0,0 +1,92 @@
+"""
+Botanik EOS - Akışlı (parça parça) Sorgu Sonuçları
+
+BotanikDB.sorgu_calistir() tüm sonucu fetchall() ile çekip her satır için
+ayrı bir dict kuruyordu; çok aylık reçete sorgularında bu, belleği taşırıp
+Python'u sert çökertiyordu (aylik_recete_sorgu_gui MAKS_SATIR_LIMITI notu).
+
+Bu modül:
+  - satir_sinifi(kolonlar): Sorgu başına TEK kolon indeksi paylaşan, tuple
+    tabanlı kompakt satır sınıfı üretir. Satır başına dict yoktur; ama
+    r["RxId"], r.get("RxId"), r[0] ve dict(r.items()) çalışır — mevcut
+    dict bekleyen kod (r.get(...)) değişmeden kullanılabilir.
+  - cursor_akisi(cursor, parti): cursor.fetchmany ile parti parti
+    AkisSatiri listeleri üretir (bellek parti boyutuyla sınırlı kalır).
+
+pyodbc'ye bağımlı DEĞİLDİR — herhangi bir DB-API cursor'ı ile çalışır.
+"""
+
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+VARSAYILAN_PARTI = 5000
+
+
+class AkisSatiri(tuple):
+    """Kolon adıyla da erişilebilen salt-okunur sonuç satırı.
+
+    Alt sınıflar `satir_sinifi()` ile üretilir; `kolonlar` ve `_indeks`
+    sınıf düzeyindedir (sorgudaki tüm satırlar paylaşır).
+    """
+
+    __slots__ = ()
+    kolonlar: Tuple[str, ...] = ()
+    _indeks: Dict[str, int] = {}
+
+    def __getitem__(self, anahtar):
+        if isinstance(anahtar, str):
+            return tuple.__getitem__(self, self._indeks[anahtar])
+        return tuple.__getitem__(self, anahtar)
+
+    def get(self, anahtar: str, varsayilan: Any = None) -> Any:
+        i = self._indeks.get(anahtar)
+        if i is None:
+            return varsayilan
+        return tuple.__getitem__(self, i)
+
+    def __contains__(self, anahtar) -> bool:
+        # dict semantiği: `"RxId" in r` kolon adını sorar
+        return anahtar in self._indeks
+
+    def keys(self) -> Tuple[str, ...]:
+        return self.kolonlar
+
+    def values(self) -> Tuple[Any, ...]:
+        return tuple(self)
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        return zip(self.kolonlar, tuple.__iter__(self))
+
+    def sozluk(self) -> Dict[str, Any]:
+        """Eski sorgu_calistir çıktısıyla birebir dict kopyası."""
+        return dict(zip(self.kolonlar, tuple.__iter__(self)))
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.sozluk()!r})"
+
+
+def satir_sinifi(kolonlar: Sequence[str]) -> type:
+    """Verilen kolon listesi için paylaşılan indeksli AkisSatiri alt sınıfı."""
+    kolonlar = tuple(kolonlar)
+    # Aynı isimli kolon varsa dict(zip(...)) davranışı gibi SONUNCUSU kazanır
+    indeks = {ad: i for i, ad in enumerate(kolonlar)}
+    return type("AkisSatiri", (AkisSatiri,), {
+        "__slots__": (),
+        "kolonlar": kolonlar,
+        "_indeks": indeks,
+    })
+
+
+def cursor_akisi(cursor, parti: int = VARSAYILAN_PARTI) -> Iterator[List[AkisSatiri]]:
+    """execute edilmiş cursor'dan fetchmany ile AkisSatiri partileri üret.
+
+    Sonuç kümesi yoksa (description None) hiçbir şey üretmez.
+    """
+    if cursor.description is None:
+        return
+    sinif = satir_sinifi([k[0] for k in cursor.description])
+    parti = max(1, int(parti))
+    while True:
+        ham = cursor.fetchmany(parti)
+        if not ham:
+            break
+        yield [sinif(r) for r in ham]
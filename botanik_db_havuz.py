@@ -0,0 +1,290 @@
+"""
+Botanik EOS - Salt-Okuma Bağlantı Havuzu
+
+BotanikDB.sorgu_calistir() eskiden tüm süreçte tek bir RLock + tek paylaşılan
+pyodbc cursor'ı üzerinden çalışıyordu; aylık reçete GUI'sinin sorgu thread'i,
+hasta takip tarayıcısı ve rapor ekranları birbirini bekliyordu.
+
+Bu modül sınırlı bir bağlantı havuzu sağlar:
+  - Her ödünç alan thread kendi bağlantısını (ve kendi cursor'ını) kullanır;
+    bir bağlantı aynı anda ASLA iki thread'e verilmez (pyodbc threadsafety=1,
+    2026-06-03 access violation'ının kök nedeni buydu).
+  - Havuz dolunca yeni ödünç isteyen thread, bir bağlantı iade edilene kadar
+    bekler (maks_boyut kadar eşzamanlı sorgu).
+  - Uzun süre boşta kalmış bağlantı verilmeden önce 'SELECT 1' ile
+    sağlık kontrolünden geçirilir; bozuksa atılır ve yenisi açılır.
+  - bosta_kalma_sn'den uzun süre kullanılmayan fazla bağlantılar kapatılır
+    (idle reaping) — SQL Server'da gereksiz oturum tutulmaz.
+
+Modül pyodbc'ye bağımlı DEĞİLDİR: bağlantıyı üreten fabrika fonksiyonu
+dışarıdan verilir (BotanikDB -> pyodbc.connect, testler -> sqlite3).
+Havuz sorgu içeriğine bakmaz; SELECT-only guard BotanikDB'de kalır.
+"""
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Varsayılanlar (db_config.json: havuz_maks_boyut / havuz_bosta_kalma_sn /
+# havuz_saglik_kontrol_sn / havuz_bekleme_sn ile ezilebilir)
+VARSAYILAN_MAKS_BOYUT = 4
+VARSAYILAN_BOSTA_KALMA_SN = 300.0
+VARSAYILAN_SAGLIK_KONTROL_SN = 30.0
+VARSAYILAN_BEKLEME_SN = 120.0
+
+
+class HavuzZamanAsimi(Exception):
+    """Havuzdan belirtilen süre içinde bağlantı alınamadı."""
+
+
+def baglanti_hatasi_mi(hata: BaseException) -> bool:
+    """Hata bağlantının kendisini bozan türden mi? (SQLSTATE 08xxx)
+
+    Sözdizimi/kolon hataları bağlantıyı bozmaz; onları havuza geri
+    koyarız. İletişim kopması vb. ise bağlantı atılır.
+    """
+    args = getattr(hata, 'args', ())
+    durum = str(args[0]) if args else ''
+    return durum.startswith('08')
+
+
+def _hata_bozar_mi(hata: BaseException) -> bool:
+    """odunc() varsayılanı: iletişim hatası ya da sorgu ortasında kesinti
+    (KeyboardInterrupt vb. — bağlantı yarım bir ifadede kalmış olabilir)."""
+    return not isinstance(hata, Exception) or baglanti_hatasi_mi(hata)
+
+
+class _HavuzKaydi:
+    """Havuzdaki tek bağlantı + son kullanım zamanı."""
+
+    __slots__ = ("conn", "son_kullanim")
+
+    def __init__(self, conn: Any, son_kullanim: float):
+        self.conn = conn
+        self.son_kullanim = son_kullanim
+
+
+class BaglantiHavuzu:
+    """Thread-safe, sınırlı boyutlu DB-API bağlantı havuzu.
+
+    Kullanım:
+        havuz = BaglantiHavuzu(lambda: pyodbc.connect(...), maks_boyut=4)
+        with havuz.odunc() as conn:
+            cur = conn.cursor()
+            ...
+    """
+
+    def __init__(
+        self,
+        baglanti_fabrikasi: Callable[[], Any],
+        maks_boyut: int = VARSAYILAN_MAKS_BOYUT,
+        bosta_kalma_sn: float = VARSAYILAN_BOSTA_KALMA_SN,
+        saglik_kontrol_sn: float = VARSAYILAN_SAGLIK_KONTROL_SN,
+        bekleme_sn: float = VARSAYILAN_BEKLEME_SN,
+        saat: Callable[[], float] = time.monotonic,
+        hata_bozar_mi: Callable[[BaseException], bool] = _hata_bozar_mi,
+    ):
+        """
+        Args:
+            baglanti_fabrikasi: Yeni bağlantı döndüren fonksiyon (hata fırlatabilir)
+            maks_boyut: Aynı anda açık olabilecek en fazla bağlantı
+            bosta_kalma_sn: Bu süreden uzun boşta kalan fazla bağlantılar kapatılır
+            saglik_kontrol_sn: Bu süreden uzun boşta kalan bağlantı, verilmeden
+                önce 'SELECT 1' ile sınanır (0 = her ödünçte sına)
+            bekleme_sn: Havuz doluyken ödünç için en fazla bekleme süresi
+            saat: Monoton saat (testlerde sahte saat verilebilir)
+            hata_bozar_mi: odunc() bloğundaki hata bağlantıyı bozar mı?
+                (varsayılan: yalnız SQLSTATE 08xxx iletişim hataları)
+        """
+        self._fabrika = baglanti_fabrikasi
+        self.maks_boyut = max(1, int(maks_boyut))
+        self.bosta_kalma_sn = float(bosta_kalma_sn)
+        self.saglik_kontrol_sn = float(saglik_kontrol_sn)
+        self.bekleme_sn = float(bekleme_sn)
+        self._saat = saat
+        self.hata_bozar_mi = hata_bozar_mi
+
+        self._kosul = threading.Condition(threading.Lock())
+        self._bostakiler: List[_HavuzKaydi] = []  # LIFO: en taze bağlantı önce
+        self._acik_sayisi = 0  # bostakiler + ödünçtekiler
+        self._kapali = False
+
+        # Tanılama sayaçları
+        self.olusturulan = 0
+        self.atilan = 0
+        self.en_yuksek_eszamanli = 0
+
+    # ------------------------------------------------------------------
+    # Ödünç alma / iade
+    # ------------------------------------------------------------------
+    def al(self, bekleme_sn: Optional[float] = None) -> Any:
+        """Havuzdan bir bağlantı ödünç al (gerekirse yenisini aç).
+
+        Raises:
+            HavuzZamanAsimi: Süre içinde bağlantı boşalmadı
+            Exception: Fabrika bağlantı açarken hata verdi
+        """
+        bekleme = self.bekleme_sn if bekleme_sn is None else bekleme_sn
+        son_an = self._saat() + bekleme
+        while True:
+            kayit = None
+            yeni_ac = False
+            with self._kosul:
+                if self._kapali:
+                    raise RuntimeError("Bağlantı havuzu kapatıldı")
+                self._bostalari_temizle_kilitli()
+                if self._bostakiler:
+                    kayit = self._bostakiler.pop()
+                elif self._acik_sayisi < self.maks_boyut:
+                    self._acik_sayisi += 1
+                    yeni_ac = True
+                else:
+                    kalan = son_an - self._saat()
+                    if kalan <= 0:
+                        raise HavuzZamanAsimi(
+                            f"{bekleme:.0f} sn içinde boş DB bağlantısı bulunamadı "
+                            f"(maks_boyut={self.maks_boyut})")
+                    self._kosul.wait(kalan)
+                    continue
+                self._eszamanli_guncelle_kilitli()
+
+            # Bağlantı açma / sağlık kontrolü kilit DIŞINDA (ağ gecikmesi
+            # diğer thread'leri bekletmesin)
+            if yeni_ac:
+                try:
+                    conn = self._fabrika()
+                except Exception:
+                    with self._kosul:
+                        self._acik_sayisi -= 1
+                        self._kosul.notify()
+                    raise
+                with self._kosul:
+                    self.olusturulan += 1
+                return conn
+
+            if self._saglikli_mi(kayit):
+                return kayit.conn
+            # Bozuk: at, döngü başına dön (yenisini açacak)
+            self._baglantiyi_at(kayit.conn)
+
+    def birak(self, conn: Any, bozuk: bool = False) -> None:
+        """Ödünç alınan bağlantıyı havuza iade et.
+
+        Args:
+            bozuk: True ise bağlantı kapatılır (ör. iletişim hatası sonrası)
+        """
+        if bozuk or self._kapali:
+            self._baglantiyi_at(conn)
+            return
+        with self._kosul:
+            self._bostakiler.append(_HavuzKaydi(conn, self._saat()))
+            self._kosul.notify()
+
+    @contextmanager
+    def odunc(self, bekleme_sn: Optional[float] = None):
+        """`with havuz.odunc() as conn:` — bloktaki hata hata_bozar_mi'ye
+        göre bağlantıyı bozuyorsa atılır; SQL/programlama hatasında iade edilir."""
+        conn = self.al(bekleme_sn)
+        bozuk = False
+        try:
+            yield conn
+        except BaseException as e:
+            try:
+                bozuk = bool(self.hata_bozar_mi(e))
+            except Exception:
+                bozuk = True
+            raise
+        finally:
+            self.birak(conn, bozuk=bozuk)
+
+    # ------------------------------------------------------------------
+    # Bakım
+    # ------------------------------------------------------------------
+    def bostalari_temizle(self) -> int:
+        """bosta_kalma_sn'yi aşan boştaki bağlantıları kapat. Kapatılan sayısı."""
+        with self._kosul:
+            return self._bostalari_temizle_kilitli()
+
+    def kapat(self) -> None:
+        """Boştaki tüm bağlantıları kapat; ödünçtekiler iade edilince kapanır."""
+        with self._kosul:
+            self._kapali = True
+            kayitlar, self._bostakiler = self._bostakiler, []
+            self._kosul.notify_all()
+        for kayit in kayitlar:
+            self._baglantiyi_at(kayit.conn)
+
+    def yeniden_ac(self) -> None:
+        """kapat() sonrası havuzu yeniden kullanılabilir yap."""
+        with self._kosul:
+            self._kapali = False
+
+    def durum(self) -> dict:
+        """Tanılama için anlık havuz durumu."""
+        with self._kosul:
+            return {
+                'maks_boyut': self.maks_boyut,
+                'acik': self._acik_sayisi,
+                'bosta': len(self._bostakiler),
+                'odunc': self._acik_sayisi - len(self._bostakiler),
+                'olusturulan': self.olusturulan,
+                'atilan': self.atilan,
+                'en_yuksek_eszamanli': self.en_yuksek_eszamanli,
+            }
+
+    # ------------------------------------------------------------------
+    # İç yardımcılar
+    # ------------------------------------------------------------------
+    def _eszamanli_guncelle_kilitli(self) -> None:
+        odunc = self._acik_sayisi - len(self._bostakiler)
+        if odunc > self.en_yuksek_eszamanli:
+            self.en_yuksek_eszamanli = odunc
+
+    def _bostalari_temizle_kilitli(self) -> int:
+        if self.bosta_kalma_sn <= 0 or not self._bostakiler:
+            return 0
+        sinir = self._saat() - self.bosta_kalma_sn
+        # LIFO listede en eskiler baştadır
+        eskiler = [k for k in self._bostakiler if k.son_kullanim < sinir]
+        if not eskiler:
+            return 0
+        self._bostakiler = [k for k in self._bostakiler if k.son_kullanim >= sinir]
+        self._acik_sayisi -= len(eskiler)
+        self.atilan += len(eskiler)
+        self._kosul.notify_all()
+        for kayit in eskiler:
+            self._sessiz_kapat(kayit.conn)
+        return len(eskiler)
+
+    def _saglikli_mi(self, kayit: _HavuzKaydi) -> bool:
+        if self._saat() - kayit.son_kullanim < self.saglik_kontrol_sn:
+            return True
+        try:
+            cur = kayit.conn.cursor()
+            try:
+                cur.execute("SELECT 1")
+                cur.fetchall()
+            finally:
+                cur.close()
+            return True
+        except Exception as e:
+            logger.warning("Havuz: bağlantı sağlık kontrolünden geçemedi, atılıyor: %s", e)
+            return False
+
+    def _baglantiyi_at(self, conn: Any) -> None:
+        self._sessiz_kapat(conn)
+        with self._kosul:
+            self._acik_sayisi -= 1
+            self.atilan += 1
+            self._kosul.notify()
+
+    @staticmethod
+    def _sessiz_kapat(conn: Any) -> None:
+        try:
+            conn.close()
+        except Exception:
+            pass
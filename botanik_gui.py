@@ -18,7 +18,6 @@ from botanik_bot import (
     BotanikBot,
     RaporTakip,
     tek_recete_isle,
-    tek_recete_rapor_kontrol,
     recete_turu_oku,
     popup_kontrol_ve_kapat,
     recete_kaydi_bulunamadi_mi,
@@ -33,6 +32,9 @@ from timing_settings import get_timing_settings
 from database import get_database
 from session_logger import SessionLogger
 from medula_settings import get_medula_settings
+from medula_surucu import kayit_surucusu_sar
+from recete_akisi import (RaporHattiSureleri, rapor_kontrol_hatti, rapor_kontrol_kurallari,
+                          rapor_kontrol_zenginlestirici)
 
 # Tema yönetimi
 try:
@@ -564,6 +566,7 @@ class BotanikGUI:
 
         # Renkli reçete kontrol (PDF'den yüklenen liste ile karşılaştırma)
         self.renkli_recete_kontrol = None  # Lazy init - PDF yüklenince oluşturulur
+        self._rapor_kontrol_zenginlestirici = None  # Rapor kontrol hattı EOS aşaması (lazy)
 
         # Bot
         self.bot = None
@@ -4855,6 +4858,36 @@ veya sadece reçete numaraları:
             self.root.after(0, lambda err=str(e): self.log_ekle(f"❌ Yeniden başlatma hatası: {err}"))
             return False  # Başarısız
 
+    def _recete_no_goster(self, grup, recete_no, sadece_rk):
+        """Okunan reçete no: grup label'ı, hafıza ve fonksiyon hafızası/label'ı."""
+        # Grup label'ını güncelle
+        self.root.after(0, lambda no=recete_no: self.grup_labels[grup].config(text=no))
+        # Hafızaya kaydet
+        self.grup_durumu.son_recete_guncelle(grup, recete_no)
+        self.root.after(0, lambda no=recete_no: self.log_ekle(f"🏷 No: {no}"))
+
+        if sadece_rk:
+            self.grup_durumu.son_recete_guncelle_fonksiyon(grup, "rapor_kontrol", recete_no)
+            self.root.after(0, lambda no=recete_no: self.grup_rapor_kontrol_labels[grup].config(text=f"RK: {no}"))
+        else:
+            self.grup_durumu.son_recete_guncelle_fonksiyon(grup, "ilac_takip", recete_no)
+
+    def _popup_kontrol(self):
+        """Reçete arası popup kontrolü: kapatılırsa GUI'ye ve oturum loguna yaz."""
+        try:
+            if popup_kontrol_ve_kapat():
+                self.root.after(0, lambda: self.log_ekle("✓ Popup kapatıldı"))
+                if self.session_logger:
+                    self.session_logger.info("Popup tespit edilip kapatıldı")
+        except Exception as e:
+            logger.warning(f"Popup kontrol hatası: {e}")
+
+    def _rapor_kontrol_zenginlestir(self, okuma):
+        """Rapor kontrol hattının EOS aşaması (oturum boyu tek önbellek; SELECT-only)."""
+        if self._rapor_kontrol_zenginlestirici is None:
+            self._rapor_kontrol_zenginlestirici = rapor_kontrol_zenginlestirici()
+        return self._rapor_kontrol_zenginlestirici(okuma)
+
     def otomasyonu_calistir(self, grup):
         """Ana otomasyon döngüsü"""
         try:
@@ -4898,6 +4931,49 @@ veya sadece reçete numaraları:
             MAX_AYNI_RECETE_DENEME = 3  # Aynı reçetede max deneme
             MAX_ARDISIK_ATLAMA = 5  # Ardışık max atlama sayısı
 
+            def recete_basarili(r_sira, r_no, takip_adet, recete_sure):
+                """Başarılı reçete: sayaçlar, istatistik, DB (bot thread'inden)."""
+                nonlocal son_basarili_recete_no, ardisik_atlanan
+                self.oturum_recete += 1
+                self.oturum_takip += takip_adet
+
+                # ✅ YENİ: Başarılı reçete - takip değişkenlerini güncelle
+                son_basarili_recete_no = r_no  # Son başarılı reçeteyi kaydet
+                ardisik_atlanan = 0  # Ardışık atlama sayacını sıfırla
+
+                # Takipli ilaç varsa takipli reçete sayacını artır
+                if takip_adet > 0:
+                    self.oturum_takipli_recete += 1
+
+                # Son 5 reçete süresini sakla
+                self.son_recete_sureleri.append(recete_sure)
+                if len(self.son_recete_sureleri) > 5:
+                    self.son_recete_sureleri.pop(0)  # En eskiyi sil
+
+                # Süreyi formatla (saniye.milisaniye)
+                sure_sn = int(recete_sure)
+                sure_ms = int((recete_sure * 1000) % 1000)
+
+                self.root.after(0, lambda r=r_sira, t=takip_adet, s=sure_sn, ms=sure_ms:
+                               self.log_ekle(f"✅ Reçete {r} | {t} ilaç takip | {s}.{ms:03d}s"))
+
+                # İstatistikleri güncelle
+                takipli_recete = 1 if takip_adet > 0 else 0
+                self.grup_durumu.istatistik_guncelle(grup, 1, takip_adet, takipli_recete, recete_sure)
+
+                # Aylık istatistik labelını güncelle
+                self.root.after(0, lambda g=grup: self.aylik_istatistik_guncelle(g))
+
+                # Database'e kaydet (her reçete sonrası)
+                if self.aktif_oturum_id:
+                    ortalama_sure = oturum_sure_toplam / self.oturum_recete if self.oturum_recete > 0 else 0
+                    self.database.oturum_guncelle(
+                        self.aktif_oturum_id,
+                        toplam_recete=self.oturum_recete,
+                        toplam_takip=self.oturum_takip,
+                        ortalama_recete_suresi=ortalama_sure
+                    )
+
             try:
                 while not self.stop_requested and self.is_running:
                     # Her iterasyonda kontrol et - DUR butonuna hızlı yanıt
@@ -4921,12 +4997,6 @@ veya sadece reçete numaraları:
                     # Reçete numarasını oku
                     medula_recete_no = self.bot.recete_no_oku()
                     if medula_recete_no:
-                        # Grup label'ını güncelle
-                        self.root.after(0, lambda no=medula_recete_no: self.grup_labels[grup].config(text=no))
-                        # Hafızaya kaydet
-                        self.grup_durumu.son_recete_guncelle(grup, medula_recete_no)
-                        self.root.after(0, lambda no=medula_recete_no: self.log_ekle(f"🏷 No: {no}"))
-
                         # Fonksiyona göre reçete hafızası ve label güncelle
                         _fa = self.grup_durumu.fonksiyon_ayarlari_al()
                         _sadece_rk = (
@@ -4934,11 +5004,7 @@ veya sadece reçete numaraları:
                             not _fa.get("ilac_takip_aktif", True) and
                             not _fa.get("rapor_toplama_aktif", True)
                         )
-                        if _sadece_rk:
-                            self.grup_durumu.son_recete_guncelle_fonksiyon(grup, "rapor_kontrol", medula_recete_no)
-                            self.root.after(0, lambda no=medula_recete_no: self.grup_rapor_kontrol_labels[grup].config(text=f"RK: {no}"))
-                        else:
-                            self.grup_durumu.son_recete_guncelle_fonksiyon(grup, "ilac_takip", medula_recete_no)
+                        self._recete_no_goster(grup, medula_recete_no, _sadece_rk)
 
                         # ✅ YENİ: Aynı reçete kontrolü (takılma önleme)
                         if medula_recete_no == onceki_recete_no:
@@ -5216,6 +5282,7 @@ veya sadece reçete numaraları:
                             logger.warning(f"Renkli reçete atlama - SONRA butonu hatası: {e}")
 
                     # Tek reçete işle
+                    hat_kullanildi = False
                     try:
                         # stop_check: DURDUR butonuna basıldığında hemen durması için
                         # onceden_okunan_recete_no: GUI'de zaten okundu, tekrar okuma yapılmasın
@@ -5302,24 +5369,74 @@ veya sadece reçete numaraları:
                                     self.root.after(0, lambda: self.log_ekle(
                                         "Renkli recete listesi yuklenmemis! Once liste yukleyin."))
 
-                            # Sadece renkli reçete kontrolü yap
-                            basari, medula_no, sorun_var, hata_nedeni = tek_recete_rapor_kontrol(
-                                self.bot, recete_sira,
-                                grup=self.aktif_grup,
-                                session_logger=self.session_logger,
-                                stop_check=lambda: self.stop_requested or not self.is_running,
-                                onceden_okunan_recete_no=medula_recete_no,
-                                renkli_kontrol=self.renkli_recete_kontrol
-                            )
-                            takip_adet = 0  # Rapor kontrolde takip yok
+                            # Ardışık düzen (recete_akisi.rapor_kontrol_hatti): bu thread
+                            # Medula'dan sonraki reçeteyi okurken önceki reçetenin EOS
+                            # zenginleştirmesi + SUT kontrolleri arka planda çalışır.
+                            # Sonuçlar sırayla bu thread'de kaydedilir; edinim ilk
+                            # başarısız okumada ya da döngünün ele alması gereken durumda
+                            # (görev sonu, aynı reçete, renkli liste) durur, son sonuç
+                            # aşağıdaki akışa (hata → yeniden başlatma) düşer.
+                            hat_kullanildi = True
+                            hat_sureleri = RaporHattiSureleri(recete_baslangic)
+                            hat_son = {"no": medula_recete_no}
+
+                            def hat_sonuclari_isle():
+                                nonlocal recete_sira, oturum_sure_toplam
+                                for sonuc, sure in hat_sureleri.isle():
+                                    h_basari, h_no, h_sorun, h_mesaj = sonuc
+                                    if h_sorun and h_mesaj:
+                                        self.root.after(0, lambda m=h_mesaj: self.log_ekle(f"⚠️ {m}"))
+                                    if not h_basari:
+                                        continue    # sondaki başarısız sonuç: süresi döngüde
+                                    oturum_sure_toplam += sure
+                                    recete_basarili(recete_sira, h_no, 0, sure)
+                                    recete_sira += 1
+
+                            def hat_hazirla(sira):
+                                hat_sonuclari_isle()
+                                if self.stop_requested or not self.is_running:
+                                    return None
+                                hat_sureleri.basla()
+                                self._popup_kontrol()
+                                if recete_kaydi_bulunamadi_mi(self.bot):
+                                    hat_sureleri.vazgec()
+                                    return None         # görev tamamlama döngüde
+                                no = self.bot.recete_no_oku()
+                                if (not no or no == hat_son["no"]
+                                        or (self.renkli_recete.liste_yuklu_mu()
+                                            and self.renkli_recete.recete_var_mi(no))):
+                                    hat_sureleri.vazgec()
+                                    return None         # okunamadı / ilerlemedi / renkli: döngü ele alır
+                                hat_son["no"] = no
+                                self.root.after(0, lambda r=sira: self.log_ekle(f"📋 Reçete {r} işleniyor..."))
+                                self._recete_no_goster(grup, no, sadece_rk=True)
+                                return no
 
-                            # Sorunlu reçete varsa logla
-                            if sorun_var and hata_nedeni:
-                                self.root.after(0, lambda m=hata_nedeni: self.log_ekle(f"⚠️ {m}"))
+                            try:
+                                _, hat_metrik = rapor_kontrol_hatti(
+                                    kayit_surucusu_sar(self.bot), None,
+                                    grup=self.aktif_grup,
+                                    session_logger=self.session_logger,
+                                    stop_check=lambda: self.stop_requested or not self.is_running,
+                                    renkli_kontrol=self.renkli_recete_kontrol,
+                                    zenginlestir=self._rapor_kontrol_zenginlestir,
+                                    kural_kontrol=rapor_kontrol_kurallari,
+                                    sonuc_geri_cagrisi=hat_sureleri.sonuc_geldi,
+                                    hazirla=hat_hazirla,
+                                    baslangic_sira=recete_sira,
+                                    ilk_recete_no=medula_recete_no
+                                )
+                                logger.info(f"Rapor kontrol hattı metrikleri: {hat_metrik}")
+                            finally:
+                                hat_sonuclari_isle()
+                                onceki_recete_no = hat_son["no"]
+
+                            basari, medula_no, sorun_var, hata_nedeni = hat_sureleri.son_sonuc
+                            takip_adet = 0  # Rapor kontrolde takip yok
                         else:
                             # Normal akış (ilaç takip ve/veya rapor toplama)
                             basari, medula_no, takip_adet, hata_nedeni = tek_recete_isle(
-                                self.bot, recete_sira, self.rapor_takip,
+                                kayit_surucusu_sar(self.bot), recete_sira, self.rapor_takip,
                                 grup=self.aktif_grup,
                                 session_logger=self.session_logger,
                                 onceden_okunan_recete_no=medula_recete_no,
@@ -5367,59 +5484,20 @@ veya sadece reçete numaraları:
                             break
 
                     # Popup kontrolü (reçete işlendikten sonra)
-                    try:
-                        if popup_kontrol_ve_kapat():
-                            self.root.after(0, lambda: self.log_ekle("✓ Popup kapatıldı"))
-                            if self.session_logger:
-                                self.session_logger.info("Popup tespit edilip kapatıldı")
-                    except Exception as e:
-                        logger.warning(f"Popup kontrol hatası: {e}")
+                    self._popup_kontrol()
 
-                    recete_sure = time.time() - recete_baslangic
+                    if hat_kullanildi:
+                        # Hattın başarılı reçeteleri hat_sonuclari_isle'de sayıldı
+                        recete_sure = hat_sureleri.kapanis_suresi()
+                    else:
+                        recete_sure = time.time() - recete_baslangic
                     oturum_sure_toplam += recete_sure
 
                     if basari:
-                        self.oturum_recete += 1
-                        self.oturum_takip += takip_adet
-
-                        # ✅ YENİ: Başarılı reçete - takip değişkenlerini güncelle
-                        son_basarili_recete_no = medula_recete_no  # Son başarılı reçeteyi kaydet
-                        ardisik_atlanan = 0  # Ardışık atlama sayacını sıfırla
-
-                        # Takipli ilaç varsa takipli reçete sayacını artır
-                        if takip_adet > 0:
-                            self.oturum_takipli_recete += 1
-
-                        # Son 5 reçete süresini sakla
-                        self.son_recete_sureleri.append(recete_sure)
-                        if len(self.son_recete_sureleri) > 5:
-                            self.son_recete_sureleri.pop(0)  # En eskiyi sil
-
-                        # Süreyi formatla (saniye.milisaniye)
-                        sure_sn = int(recete_sure)
-                        sure_ms = int((recete_sure * 1000) % 1000)
-
-                        self.root.after(0, lambda r=recete_sira, t=takip_adet, s=sure_sn, ms=sure_ms:
-                                       self.log_ekle(f"✅ Reçete {r} | {t} ilaç takip | {s}.{ms:03d}s"))
-
-                        # İstatistikleri güncelle
-                        takipli_recete = 1 if takip_adet > 0 else 0
-                        self.grup_durumu.istatistik_guncelle(grup, 1, takip_adet, takipli_recete, recete_sure)
-
-                        # Aylık istatistik labelını güncelle
-                        self.root.after(0, lambda g=grup: self.aylik_istatistik_guncelle(g))
-
-                        # Database'e kaydet (her reçete sonrası)
-                        if self.aktif_oturum_id:
-                            ortalama_sure = oturum_sure_toplam / self.oturum_recete if self.oturum_recete > 0 else 0
-                            self.database.oturum_guncelle(
-                                self.aktif_oturum_id,
-                                toplam_recete=self.oturum_recete,
-                                toplam_takip=self.oturum_takip,
-                                ortalama_recete_suresi=ortalama_sure
-                            )
-
-                        recete_sira += 1
+                        # Rapor kontrol hattı başarılı reçeteleri kendi içinde kaydetti
+                        if not hat_kullanildi:
+                            recete_basarili(recete_sira, medula_recete_no, takip_adet, recete_sure)
+                            recete_sira += 1
                     else:
                         # Hata nedenini loga yaz
                         if hata_nedeni:
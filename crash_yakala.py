@@ -5,6 +5,7 @@ Programın başında `from crash_yakala import kur; kur()` çağrılır.
 - faulthandler: C-level segfault için stack trace yazar
 - sys.excepthook: ana thread uncaught exception'ları loglar
 - threading.excepthook: arka plan thread'lerinde uncaught exception'ları loglar
+- her iki durumda açık oturum loglarının (session_logger) kuyruğu diske yazılır
 
 Loglar: BOT takip 20/crash_log.txt
 """
@@ -37,10 +38,19 @@ def _yaz(baslik: str, metin: str):
         pass
 
 
+def _oturum_loglarini_bosalt():
+    try:
+        from session_logger import tum_loglari_bosalt
+        tum_loglari_bosalt()
+    except Exception:
+        pass
+
+
 def _excepthook(tip, deger, tb):
     metin = "".join(traceback.format_exception(tip, deger, tb))
     _yaz("UNCAUGHT EXCEPTION (main thread)", metin)
     logger.error(f"UNCAUGHT: {tip.__name__}: {deger}")
+    _oturum_loglarini_bosalt()
     sys.__excepthook__(tip, deger, tb)
 
 
@@ -57,6 +67,7 @@ def _thread_excepthook(args):
         f"UNCAUGHT (thread {thread_adi}): "
         f"{args.exc_type.__name__}: {args.exc_value}"
     )
+    _oturum_loglarini_bosalt()
 
 
 def kur():
@@ -0,0 +1,335 @@
+"""
+Değişiklik Akışı — Botanik EOS'taki yeni reçete/elden satışları için tek,
+paylaşılan arka plan izleyicisi (yayınla/abone ol)
+
+Eskiden her modül kendi yoklamasını yapıyordu: aylık reçete ekranının anlık
+kontrolü ve yabancı hasta servisi 60 sn'de bir `SELECT MAX(RxId)` atıyor,
+yeni RxId görünce kendi sorgusunu çalıştırıyordu. Satıştan SUT uyarısına
+gecikme ~60 sn'ydi; her yeni izleyici DB yükünü katlıyordu.
+
+Bu modülde süreç başına TEK izleyici vardır:
+  - Her konu (ReceteAna / EldenAna) için bir RxId filigranı tutulur. Yoklama
+    `SELECT TOP n ... WHERE RxId > filigran ORDER BY RxId` — birincil anahtar
+    üzerinde aralık araması; yeni satır yoksa boş döner, ayrı MAX sorgusu
+    gerekmez. Yeni satırlar bir kez çekilir, filigran ilerler, olay tüm
+    abonelere yayınlanır.
+  - Sadece abonesi olan konular yoklanır.
+  - Aralık uyarlamalıdır: yeni satır gelince MIN_ARALIK_SN'ye iner, boş
+    geçen her turda BOSTA_CARPAN ile büyür; üst sınır mesai saatinde
+    MESAI_MAKS_ARALIK_SN, mesai dışında (gece/pazar) MESAI_DISI_MAKS_ARALIK_SN.
+    Nöbet gecesi satış başlarsa aralık kendiliğinden kısalır.
+  - DB hatasında aralık HATA_MAKS_ARALIK_SN'ye kadar geri çekilir, varsa
+    `baglanti_yenile` çağrılır.
+  - Her abonenin kendi teslim kuyruğu ve thread'i vardır: yavaş bir abone
+    (ör. SUT kontrolü) izleyiciyi ve diğer aboneleri bekletmez; olaylar
+    abone başına sırayla teslim edilir. Tk işleri abone içinde root.after
+    ile ana thread'e aktarılmalıdır.
+
+🚨 Botanik EOS'a yalnızca SELECT atılır (BotanikDB.sorgu_calistir guard'ı).
+
+Kullanım:
+    akis = paylasilan_akis()                    # süreç başına tek örnek
+    ab = akis.abone_ol(KONU_RECETE, lambda olay: ...)
+    # olay.onceki_filigran < RxId <= olay.filigran, olay.satirlar
+    ab.iptal()                                  # son abone gidince izleyici durur
+"""
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+KONU_RECETE = "recete"
+KONU_ELDEN = "elden"
+
+MIN_ARALIK_SN = 3.0
+MESAI_MAKS_ARALIK_SN = 10.0
+MESAI_DISI_MAKS_ARALIK_SN = 120.0
+HATA_MAKS_ARALIK_SN = 300.0
+BOSTA_CARPAN = 1.5
+PARTI = 500
+
+# Mesai: Pzt-Cts 09:00-19:00 (nobet_takvimi mesai segmentiyle aynı)
+MESAI_GUNLERI = frozenset(range(6))
+MESAI_BASLANGIC_SAAT = 9
+MESAI_BITIS_SAAT = 19
+
+# Konu → (filigran başlangıcı SQL, yeni satırlar SQL). Yeni satır sorgusu
+# aboneler için ortak, hafif başlık bilgisini getirir (yabancı hasta uyarısı
+# TC/Kapsam'ı buradan okur, ayrıca sorgu atmaz).
+_KONU_SQL: Dict[str, tuple] = {
+    KONU_RECETE: (
+        "SELECT MAX(RxId) AS m FROM ReceteAna WHERE RxSilme = 0",
+        """
+        SELECT TOP {parti}
+               ra.RxId            AS RxId,
+               ra.RxEReceteNo     AS ReceteNo,
+               ra.RxMusteriId     AS MusteriId,
+               m.MusteriTCKN      AS TC,
+               m.MusteriAdiSoyadi AS Hasta,
+               k.KapsamAdi        AS Kapsam
+        FROM ReceteAna ra
+        LEFT JOIN Musteri m ON ra.RxMusteriId = m.MusteriId
+        LEFT JOIN Kapsam  k ON m.MusteriKapsamId = k.KapsamId
+        WHERE ra.RxSilme = 0 AND ra.RxId > ?
+        ORDER BY ra.RxId
+        """,
+    ),
+    KONU_ELDEN: (
+        "SELECT MAX(RxId) AS m FROM EldenAna WHERE RxSilme = 0",
+        """
+        SELECT TOP {parti}
+               ea.RxId        AS RxId,
+               ea.RxMusteriId AS MusteriId
+        FROM EldenAna ea
+        WHERE ea.RxSilme = 0 AND ea.RxId > ?
+        ORDER BY ea.RxId
+        """,
+    ),
+}
+
+
+@dataclass
+class YeniKayitlar:
+    """Bir yoklamada gelen yeni satırlar: onceki_filigran < RxId <= filigran."""
+    konu: str
+    onceki_filigran: int
+    filigran: int
+    satirlar: List[Dict] = field(default_factory=list)
+
+
+def mesai_mi(an: datetime) -> bool:
+    return (an.weekday() in MESAI_GUNLERI
+            and MESAI_BASLANGIC_SAAT <= an.hour < MESAI_BITIS_SAAT)
+
+
+class UyarlamaliAralik:
+    """Yoklama aralığı: etkinlikte kısalır, boşta/gece/hatada uzar."""
+
+    def __init__(self, min_sn: float = MIN_ARALIK_SN,
+                 mesai_maks_sn: float = MESAI_MAKS_ARALIK_SN,
+                 mesai_disi_maks_sn: float = MESAI_DISI_MAKS_ARALIK_SN,
+                 hata_maks_sn: float = HATA_MAKS_ARALIK_SN,
+                 carpan: float = BOSTA_CARPAN):
+        self.min_sn = min_sn
+        self.mesai_maks_sn = mesai_maks_sn
+        self.mesai_disi_maks_sn = mesai_disi_maks_sn
+        self.hata_maks_sn = hata_maks_sn
+        self.carpan = carpan
+        self.simdiki = min_sn
+
+    def sonraki(self, yeni_var: bool, hata: bool, an: datetime) -> float:
+        if hata:
+            self.simdiki = min(max(self.simdiki, self.min_sn) * 2, self.hata_maks_sn)
+        elif yeni_var:
+            self.simdiki = self.min_sn
+        else:
+            ust = self.mesai_maks_sn if mesai_mi(an) else self.mesai_disi_maks_sn
+            self.simdiki = min(self.simdiki * self.carpan, ust)
+            if self.simdiki < self.min_sn:
+                self.simdiki = self.min_sn
+        return self.simdiki
+
+
+class Abonelik:
+    """Tek abone: kendi kuyruğu + teslim thread'i (olaylar sırayla)."""
+
+    def __init__(self, akis: "DegisiklikAkisi", konu: str,
+                 geri_cagir: Callable[[YeniKayitlar], None]):
+        self.akis = akis
+        self.konu = konu
+        self.geri_cagir = geri_cagir
+        self._kuyruk: "queue.Queue[Optional[YeniKayitlar]]" = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._teslim_dongu, name=f"DegisiklikAbone-{konu}", daemon=True)
+        self._thread.start()
+
+    def _teslim_dongu(self):
+        while True:
+            olay = self._kuyruk.get()
+            if olay is None:
+                return
+            try:
+                self.geri_cagir(olay)
+            except Exception as e:
+                logger.warning("Değişiklik abonesi hata (%s): %s", self.konu, e)
+
+    def _ilet(self, olay: YeniKayitlar):
+        self._kuyruk.put(olay)
+
+    def iptal(self):
+        self.akis.abonelikten_cik(self)
+        self._kuyruk.put(None)
+
+
+class DegisiklikAkisi:
+    """Konu başına RxId filigranı tutan tek yoklayıcı + abonelere yayın."""
+
+    def __init__(self, db, aralik: Optional[UyarlamaliAralik] = None,
+                 baglanti_yenile: Optional[Callable[[], object]] = None,
+                 parti: int = PARTI, simdi: Callable[[], datetime] = datetime.now):
+        self.db = db
+        self.aralik = aralik or UyarlamaliAralik()
+        self.baglanti_yenile = baglanti_yenile
+        self.parti = parti
+        self._simdi = simdi
+        self._lock = threading.RLock()
+        self._aboneler: Dict[str, List[Abonelik]] = {}
+        self._filigran: Dict[str, int] = {}
+        self._dur = threading.Event()
+        self._uyandir = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.son_yoklama: Optional[datetime] = None
+        self.yoklama_sayisi = 0
+
+    # ── abonelik ────────────────────────────────────────────────────────
+    def abone_ol(self, konu: str,
+                 geri_cagir: Callable[[YeniKayitlar], None]) -> Abonelik:
+        """Konuya abone ol; izleyici çalışmıyorsa başlatılır. Filigran ilk
+        abonede (MAX(RxId)) kurulur — geçmiş satırlar yayınlanmaz."""
+        if konu not in _KONU_SQL:
+            raise ValueError(f"Bilinmeyen konu: {konu}")
+        ab = Abonelik(self, konu, geri_cagir)
+        with self._lock:
+            self._aboneler.setdefault(konu, []).append(ab)
+            if konu not in self._filigran:
+                self.filigran_kur(konu)
+            self._baslat()
+        return ab
+
+    def abonelikten_cik(self, ab: Abonelik):
+        with self._lock:
+            liste = self._aboneler.get(ab.konu, [])
+            if ab in liste:
+                liste.remove(ab)
+            if not liste:
+                self._aboneler.pop(ab.konu, None)
+                self._filigran.pop(ab.konu, None)
+            if not self._aboneler:
+                self.durdur()
+
+    def filigran(self, konu: str) -> Optional[int]:
+        return self._filigran.get(konu)
+
+    def filigran_kur(self, konu: str) -> Optional[int]:
+        """Konunun filigranını şu anki MAX(RxId)'ye kur (DB hatasında None;
+        ilk başarılı yoklamada yeniden denenir)."""
+        try:
+            rows = self.db.sorgu_calistir(_KONU_SQL[konu][0])
+            if rows and not getattr(self.db, "son_sorgu_hatasi", None):
+                m = rows[0].get("m")
+                self._filigran[konu] = int(m) if m is not None else 0  # boş tablo
+                return self._filigran[konu]
+        except Exception as e:
+            logger.warning("Değişiklik akışı filigran (%s): %s", konu, e)
+        return None
+
+    # ── yoklama ─────────────────────────────────────────────────────────
+    def _yeni_satirlar(self, konu: str, filigran: int) -> List[Dict]:
+        sql = _KONU_SQL[konu][1].format(parti=int(self.parti))
+        rows = self.db.sorgu_calistir(sql, (int(filigran),))
+        hata = getattr(self.db, "son_sorgu_hatasi", None)
+        if hata:
+            raise RuntimeError(hata)
+        return rows or []
+
+    def tik(self) -> Dict[str, int]:
+        """Tek yoklama turu (abonesi olan her konu). Dolu gelen parti varsa
+        konu aynı turda tekrar okunur. Returns: {konu: yayınlanan satır}."""
+        with self._lock:
+            konular = {k: list(v) for k, v in self._aboneler.items() if v}
+        sonuc: Dict[str, int] = {}
+        for konu, aboneler in konular.items():
+            with self._lock:
+                if konu not in self._aboneler:
+                    continue                    # son abone tur başlamadan çıktı
+                if konu not in self._filigran and self.filigran_kur(konu) is None:
+                    raise RuntimeError(f"{konu} filigranı kurulamadı")
+            toplam = 0
+            while True:
+                with self._lock:
+                    onceki = self._filigran.get(konu)
+                if onceki is None:
+                    break                       # yoklama sırasında abonelikten çıkıldı
+                satirlar = self._yeni_satirlar(konu, onceki)
+                if not satirlar:
+                    break
+                yeni = max(int(s["RxId"]) for s in satirlar)
+                with self._lock:
+                    # Filigran bu arada düştüyse/yeniden kurulduysa (çık + yeniden
+                    # abone) bu parti artık kimseye ait değil: yayınlama
+                    if self._filigran.get(konu) != onceki:
+                        break
+                    self._filigran[konu] = yeni
+                olay = YeniKayitlar(konu, onceki, yeni, satirlar)
+                for ab in aboneler:
+                    ab._ilet(olay)
+                toplam += len(satirlar)
+                if len(satirlar) < self.parti:
+                    break
+            sonuc[konu] = toplam
+        self.son_yoklama = self._simdi()
+        self.yoklama_sayisi += 1
+        return sonuc
+
+    def _dongu(self, dur: threading.Event):
+        while not dur.is_set():
+            hata = False
+            yeni_var = False
+            try:
+                yeni_var = any(self.tik().values())
+            except Exception as e:
+                hata = True
+                logger.warning("Değişiklik akışı yoklama hatası: %s", e)
+                if self.baglanti_yenile:
+                    try:
+                        self.baglanti_yenile()
+                    except Exception as e2:
+                        logger.debug("Bağlantı yenileme: %s", e2)
+            bekle = self.aralik.sonraki(yeni_var, hata, self._simdi())
+            self._uyandir.wait(bekle)
+            self._uyandir.clear()
+
+    def _baslat(self):
+        if self._thread and self._thread.is_alive() and not self._dur.is_set():
+            return
+        # Durdurulmuş (ama son beklemesini bitirmemiş) thread kendi olayıyla
+        # çıkar; yenisi taze olayla başlar
+        self._dur = threading.Event()
+        self._thread = threading.Thread(
+            target=self._dongu, args=(self._dur,), name="DegisiklikAkisi",
+            daemon=True)
+        self._thread.start()
+
+    def simdi_yokla(self):
+        """Beklemeyi kes, hemen yokla (ör. kullanıcı 'yenile' dedi)."""
+        self._uyandir.set()
+
+    def durdur(self):
+        self._dur.set()
+        self._uyandir.set()
+
+
+_paylasilan: Optional[DegisiklikAkisi] = None
+_paylasilan_lock = threading.Lock()
+
+
+def paylasilan_akis(db=None, **kw) -> DegisiklikAkisi:
+    """Süreç başına tek DegisiklikAkisi; sonraki çağrılar aynı örneği döndürür.
+
+    db verilmezse akış kendi BotanikDB'sini açar — bir ekranın bağlantısı
+    ekranla birlikte kapanınca diğer abonelerin akışı kesilmesin diye
+    ekranlar db vermeden çağırır."""
+    global _paylasilan
+    with _paylasilan_lock:
+        if _paylasilan is None:
+            if db is None:
+                from botanik_db import BotanikDB
+                db = BotanikDB(production=True)
+                kw.setdefault("baglanti_yenile", db.baglan)
+            _paylasilan = DegisiklikAkisi(db, **kw)
+        return _paylasilan
@@ -1208,8 +1208,6 @@ class DepoEkstreModul:
 
     def _ekstre_sonuc_penceresi_olustur(self, df_depo, df_eczane, dosya1_yol, dosya2_yol):
         """Büyük karşılaştırma sonuç penceresi - ACCORDION PANELLER İLE"""
-        import pandas as pd
-
         pencere = tk.Toplevel(self.root)
         pencere.title("📊 Depo Ekstre Karşılaştırma Sonuçları")
         pencere.configure(bg='#ECEFF1')
@@ -1334,181 +1332,26 @@ class DepoEkstreModul:
                 self._sonuc_pencere = None
                 return
 
-        # Filtre fonksiyonu
-        def satir_filtreli_mi(row, kaynak):
-            filtreler = self.ekstre_filtreler.get(kaynak, {})
-            for col, degerler in filtreler.items():
-                if col in row.index:
-                    satir_degeri = str(row[col]).strip() if pd.notna(row[col]) else ""
-                    if satir_degeri in degerler:
-                        return True
-            return False
-
-        depo_filtreli = 0
-        eczane_filtreli = 0
-        filtrelenen_depo_satirlar = []
-        filtrelenen_eczane_satirlar = []
-
-        # Tekrar eden fatura numaralarını ayrı key ile sakla
-        def benzersiz_fatura_ekle(data_dict, fatura, kayit):
-            if fatura not in data_dict:
-                data_dict[fatura] = kayit
-            else:
-                counter = 2
-                while f"{fatura} ({counter})" in data_dict:
-                    counter += 1
-                data_dict[f"{fatura} ({counter})"] = kayit
-                logger.warning(f"Tekrar eden fatura no: '{fatura}' → '{fatura} ({counter})' olarak eklendi")
-
-        # Verileri hazırla
-        faturasiz_depo_sayac = 0
-        faturasiz_eczane_sayac = 0
-
-        depo_data = {}
-        for _, row in df_depo.iterrows():
-            if satir_filtreli_mi(row, 'depo'):
-                depo_filtreli += 1
-                fatura = str(row[depo_fatura_col]).strip() if pd.notna(row[depo_fatura_col]) else ""
-                borc = float(row[depo_borc_col]) if depo_borc_col and pd.notna(row[depo_borc_col]) else 0
-                alacak = float(row[depo_alacak_col]) if depo_alacak_col and pd.notna(row[depo_alacak_col]) else 0
-                tarih = str(row[depo_tarih_col]).strip() if depo_tarih_col and pd.notna(row[depo_tarih_col]) else ""
-                tip = str(row[depo_tip_col]).strip() if depo_tip_col and pd.notna(row[depo_tip_col]) else ""
-                filtrelenen_depo_satirlar.append((fatura, {'borc': borc, 'alacak': alacak, 'tarih': tarih, 'tip': tip}))
-                continue
-
-            fatura = str(row[depo_fatura_col]).strip() if pd.notna(row[depo_fatura_col]) else ""
-            borc = float(row[depo_borc_col]) if depo_borc_col and pd.notna(row[depo_borc_col]) else 0
-            alacak = float(row[depo_alacak_col]) if depo_alacak_col and pd.notna(row[depo_alacak_col]) else 0
-            tarih = str(row[depo_tarih_col]).strip() if depo_tarih_col and pd.notna(row[depo_tarih_col]) else ""
-            tip = str(row[depo_tip_col]).strip() if depo_tip_col and pd.notna(row[depo_tip_col]) else ""
-            tutar_var = abs(borc) > 0.01 or abs(alacak) > 0.01
-            tarih_var = tarih and tarih != 'nan'
-            fatura_var = fatura and fatura != 'nan'
-
-            if not fatura_var:
-                if not tarih_var or not tutar_var:
-                    # Fatura no, tarih veya tutar yok → alt toplam/başlık satırı, atla
-                    continue
-                # Tarih ve tutar var ama fatura no yok → numara ata
-                faturasiz_depo_sayac += 1
-                fatura = f"[Faturasız-D{faturasiz_depo_sayac}]"
-
-            benzersiz_fatura_ekle(depo_data, fatura, {'borc': borc, 'alacak': alacak, 'tarih': tarih, 'tip': tip, 'row': row})
-
-        eczane_data = {}
-        for _, row in df_eczane.iterrows():
-            if satir_filtreli_mi(row, 'eczane'):
-                eczane_filtreli += 1
-                fatura = str(row[eczane_fatura_col]).strip() if pd.notna(row[eczane_fatura_col]) else ""
-                borc = float(row[eczane_borc_col]) if eczane_borc_col and pd.notna(row[eczane_borc_col]) else 0
-                alacak = float(row[eczane_alacak_col]) if eczane_alacak_col and pd.notna(row[eczane_alacak_col]) else 0
-                tarih = str(row[eczane_tarih_col]).strip() if eczane_tarih_col and pd.notna(row[eczane_tarih_col]) else ""
-                tip = str(row[eczane_tip_col]).strip() if eczane_tip_col and pd.notna(row[eczane_tip_col]) else ""
-                filtrelenen_eczane_satirlar.append((fatura, {'borc': borc, 'alacak': alacak, 'tarih': tarih, 'tip': tip}))
-                continue
-
-            fatura = str(row[eczane_fatura_col]).strip() if pd.notna(row[eczane_fatura_col]) else ""
-            borc = float(row[eczane_borc_col]) if eczane_borc_col and pd.notna(row[eczane_borc_col]) else 0
-            alacak = float(row[eczane_alacak_col]) if eczane_alacak_col and pd.notna(row[eczane_alacak_col]) else 0
-            tarih = str(row[eczane_tarih_col]).strip() if eczane_tarih_col and pd.notna(row[eczane_tarih_col]) else ""
-            tip = str(row[eczane_tip_col]).strip() if eczane_tip_col and pd.notna(row[eczane_tip_col]) else ""
-            tutar_var = abs(borc) > 0.01 or abs(alacak) > 0.01
-            tarih_var = tarih and tarih != 'nan'
-            fatura_var = fatura and fatura != 'nan'
-
-            if not fatura_var:
-                if not tarih_var or not tutar_var:
-                    # Fatura no, tarih veya tutar yok → alt toplam/başlık satırı, atla
-                    continue
-                # Tarih ve tutar var ama fatura no yok → numara ata
-                faturasiz_eczane_sayac += 1
-                fatura = f"[Faturasız-E{faturasiz_eczane_sayac}]"
-
-            benzersiz_fatura_ekle(eczane_data, fatura, {'borc': borc, 'alacak': alacak, 'tarih': tarih, 'tip': tip, 'row': row})
-
-        # Karşılaştırma
-        tum_faturalar = set(depo_data.keys()) | set(eczane_data.keys())
-
-        yesil_satirlar = []
-        sari_satirlar = []
-        turuncu_satirlar = []
-        kirmizi_depo = []
-        kirmizi_eczane = []
-
-        # Net tutar hesaplama fonksiyonu - borç veya alacak hangisi doluysa onu al
-        def get_net_tutar(kayit):
-            borc = kayit.get('borc', 0) or 0
-            alacak = kayit.get('alacak', 0) or 0
-            return borc if abs(borc) > 0.01 else abs(alacak)
-
-        eslesen_faturalar = set()
-        for fatura in tum_faturalar:
-            depo_kayit = depo_data.get(fatura)
-            eczane_kayit = eczane_data.get(fatura)
-
-            if depo_kayit and eczane_kayit:
-                eslesen_faturalar.add(fatura)
-
-                # Net tutarları al - borç/alacak farkı gözetmeksizin
-                depo_tutar = get_net_tutar(depo_kayit)
-                eczane_tutar = get_net_tutar(eczane_kayit)
-                tutar_esit = abs(depo_tutar - eczane_tutar) < 0.01
-
-                if tutar_esit:
-                    yesil_satirlar.append((fatura, depo_kayit, eczane_kayit))
-                else:
-                    turuncu_satirlar.append((fatura, depo_kayit, eczane_kayit))
-
-        # Tutar bazlı eşleştirme
-        eslesmeyen_depo = {f: d for f, d in depo_data.items() if f not in eslesen_faturalar}
-        eslesmeyen_eczane = {f: d for f, d in eczane_data.items() if f not in eslesen_faturalar}
-
-        tutar_eslesen_depo = set()
-        tutar_eslesen_eczane = set()
-
-        def parse_tarih(tarih_str):
-            if not tarih_str or tarih_str == '' or tarih_str == 'nan':
-                return pd.Timestamp('1900-01-01')
-            try:
-                return pd.to_datetime(tarih_str)
-            except Exception:
-                return pd.Timestamp('1900-01-01')
-
-        for depo_fatura, depo_kayit in eslesmeyen_depo.items():
-            if depo_fatura in tutar_eslesen_depo:
-                continue
-
-            # Net tutarı al - borç/alacak farkı gözetmeksizin
-            depo_tutar = get_net_tutar(depo_kayit)
-            depo_tarih = parse_tarih(depo_kayit.get('tarih', ''))
-
-            adaylar = []
-            for eczane_fatura, eczane_kayit in eslesmeyen_eczane.items():
-                if eczane_fatura in tutar_eslesen_eczane:
-                    continue
-
-                # Net tutarı al - borç/alacak farkı gözetmeksizin
-                eczane_tutar = get_net_tutar(eczane_kayit)
-
-                if abs(depo_tutar - eczane_tutar) < 0.01 and depo_tutar > 0:
-                    eczane_tarih = parse_tarih(eczane_kayit.get('tarih', ''))
-                    tarih_fark = abs((depo_tarih - eczane_tarih).days)
-                    adaylar.append((tarih_fark, eczane_fatura, eczane_kayit))
-
-            if adaylar:
-                adaylar.sort(key=lambda x: x[0])
-                en_yakin_tarih_fark, en_yakin_fatura, en_yakin_kayit = adaylar[0]
-                sari_satirlar.append((depo_fatura, en_yakin_fatura, depo_kayit, en_yakin_kayit))
-                tutar_eslesen_depo.add(depo_fatura)
-                tutar_eslesen_eczane.add(en_yakin_fatura)
-
-        for depo_fatura, depo_kayit in eslesmeyen_depo.items():
-            if depo_fatura not in tutar_eslesen_depo:
-                kirmizi_depo.append((depo_fatura, depo_kayit))
-
-        for eczane_fatura, eczane_kayit in eslesmeyen_eczane.items():
-            if eczane_fatura not in tutar_eslesen_eczane:
-                kirmizi_eczane.append((eczane_fatura, eczane_kayit))
+        # Kayıtları hazırla ve eşleştir (Tk'dan bağımsız motor: depo_ekstre_mutabakat)
+        from depo_ekstre_mutabakat import ekstre_kayitlari_hazirla, ekstre_eslestir
+
+        depo_data, filtrelenen_depo_satirlar = ekstre_kayitlari_hazirla(df_depo, {
+            'fatura': depo_fatura_col, 'borc': depo_borc_col, 'alacak': depo_alacak_col,
+            'tarih': depo_tarih_col, 'tip': depo_tip_col,
+        }, self.ekstre_filtreler.get('depo', {}), 'D')
+        eczane_data, filtrelenen_eczane_satirlar = ekstre_kayitlari_hazirla(df_eczane, {
+            'fatura': eczane_fatura_col, 'borc': eczane_borc_col, 'alacak': eczane_alacak_col,
+            'tarih': eczane_tarih_col, 'tip': eczane_tip_col,
+        }, self.ekstre_filtreler.get('eczane', {}), 'E')
+        depo_filtreli = len(filtrelenen_depo_satirlar)
+        eczane_filtreli = len(filtrelenen_eczane_satirlar)
+
+        eslesme = ekstre_eslestir(depo_data, eczane_data)
+        yesil_satirlar = eslesme['yesil']
+        sari_satirlar = eslesme['sari']
+        turuncu_satirlar = eslesme['turuncu']
+        kirmizi_depo = eslesme['kirmizi_depo']
+        kirmizi_eczane = eslesme['kirmizi_eczane']
 
         # === ANA PENCERE İÇERİĞİ ===
         main_frame = tk.Frame(pencere, bg='#ECEFF1')
@@ -3938,36 +3781,13 @@ class DepoEkstreModul:
 
     def _ilac_ismi_normalize(self, isim):
         """İlaç ismini karşılaştırma için normalize et"""
-        if not isim:
-            return ""
-        # Büyük harf, gereksiz boşluklar temizle
-        s = isim.upper().strip()
-        # Noktalama temizle
-        for ch in ['.', ',', '(', ')', '/', '-', "'", '"']:
-            s = s.replace(ch, ' ')
-        # Çoklu boşlukları teke indir
-        s = ' '.join(s.split())
-        return s
+        from depo_ekstre_mutabakat import ilac_ismi_normalize
+        return ilac_ismi_normalize(isim)
 
     def _ilac_ismi_benzerlik(self, isim1, isim2):
         """İki ilaç isminin benzerlik skoru (0-1)"""
-        n1 = self._ilac_ismi_normalize(isim1)
-        n2 = self._ilac_ismi_normalize(isim2)
-
-        if n1 == n2:
-            return 1.0
-
-        # Kelime bazlı karşılaştırma
-        words1 = set(n1.split())
-        words2 = set(n2.split())
-
-        if not words1 or not words2:
-            return 0.0
-
-        ortak = words1 & words2
-        toplam = words1 | words2
-
-        return len(ortak) / len(toplam)
+        from depo_ekstre_mutabakat import ilac_ismi_benzerlik
+        return ilac_ismi_benzerlik(isim1, isim2)
 
     def _iade_fatura_karsilastir(self, pencere, depo_text_widget, _unused1, _unused2):
         """İade fatura detaylarını karşılaştır ve sonuçları göster (konsolide)"""
@@ -4091,78 +3911,11 @@ class DepoEkstreModul:
         Depo ve Botanik satırlarını eşleştir.
         Öncelik: Barkod > İlaç ismi benzerliği
         Aynı isimli birden fazla satırda miktar+tutar yakınlığı da dikkate alınır.
+        Aday çiftler ters kelime indeksiyle bulunur, çakışmalar optimal atamayla
+        çözülür (depo_ekstre_mutabakat.iade_satirlari_eslestir).
         """
-        eslesmeler = []
-        kullanilan_botanik = set()
-        kullanilan_depo = set()
-
-        # Tüm olası eşleşmeleri skorla
-        adaylar = []
-        for d_idx, depo in enumerate(depo_satirlari):
-            for b_idx, botanik in enumerate(botanik_satirlari):
-                skor = 0.0
-
-                # Barkod eşleşmesi
-                if depo.get('barkod') and botanik.get('barkod'):
-                    if depo['barkod'] == botanik['barkod']:
-                        skor = 1.0
-
-                # İsim benzerliği
-                if skor < 1.0:
-                    skor = self._ilac_ismi_benzerlik(depo['urun_adi'], botanik['urun_adi'])
-
-                if skor >= 0.4:
-                    # Miktar eşleşmesi bonus (aynı isimli çoklu satırları doğru eşleştirmek için)
-                    d_miktar = int(depo.get('miktar', 0) or 0)
-                    b_miktar = int(botanik.get('miktar', 0) or 0)
-                    d_tutar = float(depo.get('tutar', 0) or 0)
-                    b_tutar = float(botanik.get('toplam_tutar', 0) or 0)
-
-                    miktar_bonus = 0.05 if d_miktar == b_miktar else 0
-                    tutar_bonus = 0.03 if abs(d_tutar - b_tutar) < 1.0 else 0
-
-                    adaylar.append({
-                        'depo_idx': d_idx,
-                        'botanik_idx': b_idx,
-                        'skor': skor + miktar_bonus + tutar_bonus,
-                        'benzerlik': skor
-                    })
-
-        # En yüksek skordan başlayarak eşleştir (greedy)
-        adaylar.sort(key=lambda x: x['skor'], reverse=True)
-
-        for aday in adaylar:
-            d_idx = aday['depo_idx']
-            b_idx = aday['botanik_idx']
-
-            if d_idx in kullanilan_depo or b_idx in kullanilan_botanik:
-                continue
-
-            eslesmeler.append({
-                'depo_idx': d_idx,
-                'botanik_idx': b_idx,
-                'depo': depo_satirlari[d_idx],
-                'botanik': botanik_satirlari[b_idx],
-                'benzerlik': aday['benzerlik']
-            })
-            kullanilan_depo.add(d_idx)
-            kullanilan_botanik.add(b_idx)
-
-        # Eşleşmeyenler
-        eslesmeyen_depo = [
-            (i, depo_satirlari[i]) for i in range(len(depo_satirlari))
-            if i not in kullanilan_depo
-        ]
-        eslesmeyen_botanik = [
-            (i, botanik_satirlari[i]) for i in range(len(botanik_satirlari))
-            if i not in kullanilan_botanik
-        ]
-
-        return {
-            'eslesmeler': eslesmeler,
-            'eslesmeyen_depo': eslesmeyen_depo,
-            'eslesmeyen_botanik': eslesmeyen_botanik
-        }
+        from depo_ekstre_mutabakat import iade_satirlari_eslestir
+        return iade_satirlari_eslestir(depo_satirlari, botanik_satirlari)
 
     def _iade_sonuclari_goster(self, sonuclar, depo_satirlari, botanik_satirlari):
         """İade karşılaştırma sonuçlarını göster"""
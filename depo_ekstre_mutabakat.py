@@ -0,0 +1,441 @@
+"""
+Depo Ekstre Mutabakat Motoru — Tk'dan bağımsız eşleştirme çekirdeği
+
+DepoEkstreModul'ün iki ağır işini arayüzden ayırır:
+
+  1. Ekstre karşılaştırma (depo Excel ↔ eczane Excel)
+     - Kolonlar tek seferde normalize edilir (iterrows + hücre başına
+       pd.notna/float yerine vektörel to_numeric/astype/isin).
+     - Fatura no eşleşmesi sözlük (hash join) ile.
+     - Fatura no tutmayanlar tutar kuruşuna göre kovalanır; aynı tutarlı
+       birden fazla depo/eczane kaydı olan belirsiz gruplarda tarih farkı
+       toplamını en küçükleyen OPTİMAL atama yapılır (açgözlü sıra
+       bağımlılığı yok).
+
+  2. İade faturası satır eşleştirme (depo satırı ↔ Botanik satırı)
+     - Barkod eşitliği hash join ile.
+     - İsim benzerliği (kelime Jaccard) için ters kelime indeksi: yalnız en
+       az bir kelime paylaşan çiftler skorlanır; ortak kelime sayısı indeks
+       taramasında sayıldığından küme işlemi yapılmaz.
+     - Çakışan adaylar (bağlı bileşenler) toplam skoru en büyükleyen atama
+       ile çözülür.
+
+Skor ve tutar kuralları DepoEkstreModul'deki eski döngülerle birebir aynıdır
+(tolerans 0.01, benzerlik eşiği 0.4, miktar/tutar bonusları).
+
+Kullanım:
+    depo_data, depo_filtrelenen = ekstre_kayitlari_hazirla(df_depo, kolonlar, filtreler, 'D')
+    sonuc = ekstre_eslestir(depo_data, eczane_data)
+    sonuc['yesil'], sonuc['turuncu'], sonuc['sari'], sonuc['kirmizi_depo'], ...
+"""
+
+import logging
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Tutar eşitliği toleransı (TL)
+TUTAR_TOLERANS = 0.01
+# İade satırlarında aday sayılacak en düşük isim benzerliği
+BENZERLIK_ESIGI = 0.4
+# Bu boyutu aşan belirsiz bileşenlerde O(n³) atama yerine açgözlü seçim
+OPTIMAL_ATAMA_SINIRI = 400
+
+_BOS_TARIH = pd.Timestamp('1900-01-01')
+_NOKTALAMA = str.maketrans({ch: ' ' for ch in '.,()/-\'"'})
+
+
+# ---------------------------------------------------------------------------
+# Atama (Macar algoritması)
+# ---------------------------------------------------------------------------
+
+def atama_coz(maliyet) -> List[Tuple[int, int]]:
+    """Dikdörtgen maliyet matrisinde toplam maliyeti en küçük atama.
+
+    min(satır, sütun) kadar (satır, sütun) çifti döner. Kuramsal O(n²·m);
+    iç döngü numpy ile vektörel (e-maxx Macar algoritması).
+    """
+    a = np.asarray(maliyet, dtype=float)
+    if a.ndim != 2 or a.size == 0:
+        return []
+    ters = a.shape[0] > a.shape[1]
+    if ters:
+        a = a.T
+    n, m = a.shape
+    u = np.zeros(n + 1)
+    v = np.zeros(m + 1)
+    p = np.zeros(m + 1, dtype=np.int64)     # p[j]: j sütununa atanmış satır (1-tabanlı)
+    yol = np.zeros(m + 1, dtype=np.int64)
+    for i in range(1, n + 1):
+        p[0] = i
+        j0 = 0
+        minv = np.full(m + 1, np.inf)
+        kullanildi = np.zeros(m + 1, dtype=bool)
+        while True:
+            kullanildi[j0] = True
+            i0 = p[j0]
+            cur = a[i0 - 1] - u[i0] - v[1:]
+            serbest = ~kullanildi[1:]
+            guncelle = serbest & (cur < minv[1:])
+            minv[1:][guncelle] = cur[guncelle]
+            yol[1:][guncelle] = j0
+            aday = np.where(serbest, minv[1:], np.inf)
+            j1 = int(np.argmin(aday)) + 1
+            delta = aday[j1 - 1]
+            u[p[kullanildi]] += delta
+            v[kullanildi] -= delta
+            minv[~kullanildi] -= delta
+            j0 = j1
+            if p[j0] == 0:
+                break
+        while j0:
+            j1 = yol[j0]
+            p[j0] = p[j1]
+            j0 = j1
+    ciftler = [(int(p[j]) - 1, j - 1) for j in range(1, m + 1) if p[j]]
+    if ters:
+        ciftler = [(j, i) for i, j in ciftler]
+    return sorted(ciftler)
+
+
+# ---------------------------------------------------------------------------
+# Ekstre karşılaştırma
+# ---------------------------------------------------------------------------
+
+def _metin_kolonu(df, col) -> pd.Series:
+    """str(hucre).strip(); boş hücre → ''."""
+    if not col:
+        return pd.Series([""] * len(df), index=df.index, dtype=object)
+    s = df[col]
+    return s.astype(str).str.strip().where(s.notna(), "")
+
+
+def _sayi_kolonu(df, col) -> np.ndarray:
+    """float(hucre); boş/sayı olmayan hücre → 0."""
+    if not col:
+        return np.zeros(len(df))
+    return pd.to_numeric(df[col], errors='coerce').fillna(0.0).to_numpy(dtype=float)
+
+
+def _benzersiz_fatura_ekle(data_dict, fatura, kayit):
+    """Tekrar eden fatura numaralarını ayrı anahtarla sakla."""
+    if fatura not in data_dict:
+        data_dict[fatura] = kayit
+        return
+    counter = 2
+    while f"{fatura} ({counter})" in data_dict:
+        counter += 1
+    data_dict[f"{fatura} ({counter})"] = kayit
+    logger.warning(f"Tekrar eden fatura no: '{fatura}' → '{fatura} ({counter})' olarak eklendi")
+
+
+def ekstre_kayitlari_hazirla(df, kolonlar: Dict[str, Optional[str]],
+                             filtreler: Optional[Dict[str, Sequence[str]]] = None,
+                             faturasiz_harf: str = 'D'):
+    """Ekstre DataFrame'ini {fatura: kayit} sözlüğüne çevir.
+
+    kolonlar: {'fatura', 'borc', 'alacak', 'tarih', 'tip'} → DataFrame kolon adı
+    filtreler: {kolon: [atlanacak değerler]} — eşleşen satırlar filtrelenir
+
+    Returns: (data, filtrelenen) — data: {fatura: {'borc','alacak','tarih','tip'}},
+    filtrelenen: [(fatura, kayit), ...]. Fatura no'su olmayan ama tarih ve
+    tutarı olan satırlara "[Faturasız-<harf><n>]" atanır; tarih veya tutarı
+    da olmayanlar (alt toplam / başlık) atlanır.
+    """
+    fatura = _metin_kolonu(df, kolonlar.get('fatura')).tolist()
+    borc = _sayi_kolonu(df, kolonlar.get('borc'))
+    alacak = _sayi_kolonu(df, kolonlar.get('alacak'))
+    tarih = _metin_kolonu(df, kolonlar.get('tarih')).tolist()
+    tip = _metin_kolonu(df, kolonlar.get('tip')).tolist()
+
+    filtreli = np.zeros(len(df), dtype=bool)
+    for col, degerler in (filtreler or {}).items():
+        if col in df.columns and degerler:
+            filtreli |= _metin_kolonu(df, col).isin(set(degerler)).to_numpy()
+
+    tutar_var = (np.abs(borc) > 0.01) | (np.abs(alacak) > 0.01)
+    borc_l = borc.tolist()
+    alacak_l = alacak.tolist()
+
+    data: Dict[str, Dict] = {}
+    filtrelenen: List[Tuple[str, Dict]] = []
+    faturasiz = 0
+    for i, (f, b, a, t, tp) in enumerate(zip(fatura, borc_l, alacak_l, tarih, tip)):
+        kayit = {'borc': b, 'alacak': a, 'tarih': t, 'tip': tp}
+        if filtreli[i]:
+            filtrelenen.append((f, kayit))
+            continue
+        if not f or f == 'nan':
+            if not t or t == 'nan' or not tutar_var[i]:
+                continue
+            faturasiz += 1
+            f = f"[Faturasız-{faturasiz_harf}{faturasiz}]"
+        _benzersiz_fatura_ekle(data, f, kayit)
+    return data, filtrelenen
+
+
+def net_tutar(kayit) -> float:
+    """Borç veya alacak hangisi doluysa onu al (borç/alacak farkı gözetmeksizin)."""
+    borc = kayit.get('borc', 0) or 0
+    alacak = kayit.get('alacak', 0) or 0
+    return borc if abs(borc) > 0.01 else abs(alacak)
+
+
+def _tarih_cozucu():
+    """Aynı tarih metnini bir kez ayrıştıran parse_tarih (eski davranışla aynı)."""
+    onbellek: Dict[str, pd.Timestamp] = {}
+
+    def parse_tarih(tarih_str):
+        ts = onbellek.get(tarih_str)
+        if ts is None:
+            if not tarih_str or tarih_str == 'nan':
+                ts = _BOS_TARIH
+            else:
+                try:
+                    ts = pd.to_datetime(tarih_str)
+                except Exception:
+                    ts = _BOS_TARIH
+                if ts is pd.NaT:
+                    ts = _BOS_TARIH
+            onbellek[tarih_str] = ts
+        return ts
+    return parse_tarih
+
+
+def _kurus(tutar: float) -> int:
+    return int(round(tutar * 100))
+
+
+def ekstre_eslestir(depo_data: Dict[str, Dict], eczane_data: Dict[str, Dict]) -> Dict[str, list]:
+    """Depo ve eczane kayıtlarını eşleştir.
+
+    Returns: {
+        'yesil':   [(fatura, depo_kayit, eczane_kayit)]      fatura + tutar tutuyor
+        'turuncu': [(fatura, depo_kayit, eczane_kayit)]      fatura tutuyor, tutar farklı
+        'sari':    [(depo_fatura, eczane_fatura, depo_kayit, eczane_kayit)]
+                   fatura farklı, tutar aynı (tarihçe en yakın optimal atama)
+        'kirmizi_depo': [(fatura, kayit)], 'kirmizi_eczane': [(fatura, kayit)]
+    }
+    """
+    yesil, turuncu = [], []
+    for fatura, depo_kayit in depo_data.items():
+        eczane_kayit = eczane_data.get(fatura)
+        if eczane_kayit is None:
+            continue
+        if abs(net_tutar(depo_kayit) - net_tutar(eczane_kayit)) < TUTAR_TOLERANS:
+            yesil.append((fatura, depo_kayit, eczane_kayit))
+        else:
+            turuncu.append((fatura, depo_kayit, eczane_kayit))
+
+    eslesmeyen_depo = [(f, k) for f, k in depo_data.items() if f not in eczane_data]
+    eslesmeyen_eczane = [(f, k) for f, k in eczane_data.items() if f not in depo_data]
+
+    # Tutar kovaları (kuruş) — yalnız pozitif depo tutarları aday
+    depo_kova: Dict[int, List[int]] = defaultdict(list)
+    for i, (_, kayit) in enumerate(eslesmeyen_depo):
+        tutar = net_tutar(kayit)
+        if tutar > 0:
+            depo_kova[_kurus(tutar)].append(i)
+    eczane_kova: Dict[int, List[int]] = defaultdict(list)
+    for j, (_, kayit) in enumerate(eslesmeyen_eczane):
+        eczane_kova[_kurus(net_tutar(kayit))].append(j)
+
+    parse_tarih = _tarih_cozucu()
+    sari_ciftler: List[Tuple[int, int]] = []
+    for kurus, d_idx in depo_kova.items():
+        e_idx = eczane_kova.get(kurus)
+        if not e_idx:
+            continue
+        d_tarih = [parse_tarih(eslesmeyen_depo[i][1].get('tarih', '')) for i in d_idx]
+        e_tarih = [parse_tarih(eslesmeyen_eczane[j][1].get('tarih', '')) for j in e_idx]
+        if len(d_idx) == 1 or len(e_idx) == 1:
+            # Belirsizlik yok: tek taraf tek kayıt → en yakın tarih
+            if len(d_idx) == 1:
+                k = min(range(len(e_idx)), key=lambda x: abs((d_tarih[0] - e_tarih[x]).days))
+                sari_ciftler.append((d_idx[0], e_idx[k]))
+            else:
+                k = min(range(len(d_idx)), key=lambda x: abs((d_tarih[x] - e_tarih[0]).days))
+                sari_ciftler.append((d_idx[k], e_idx[0]))
+            continue
+        fark = np.abs(np.subtract.outer(
+            np.array([t.value for t in d_tarih], dtype=np.int64),
+            np.array([t.value for t in e_tarih], dtype=np.int64)) // 86_400_000_000_000)
+        for a, b in atama_coz(fark):
+            sari_ciftler.append((d_idx[a], e_idx[b]))
+
+    sari_ciftler.sort()
+    sari = []
+    eslesen_d, eslesen_e = set(), set()
+    for i, j in sari_ciftler:
+        d_fatura, d_kayit = eslesmeyen_depo[i]
+        e_fatura, e_kayit = eslesmeyen_eczane[j]
+        sari.append((d_fatura, e_fatura, d_kayit, e_kayit))
+        eslesen_d.add(i)
+        eslesen_e.add(j)
+
+    return {
+        'yesil': yesil,
+        'turuncu': turuncu,
+        'sari': sari,
+        'kirmizi_depo': [x for i, x in enumerate(eslesmeyen_depo) if i not in eslesen_d],
+        'kirmizi_eczane': [x for j, x in enumerate(eslesmeyen_eczane) if j not in eslesen_e],
+    }
+
+
+# ---------------------------------------------------------------------------
+# İade faturası satır eşleştirme
+# ---------------------------------------------------------------------------
+
+def ilac_ismi_normalize(isim) -> str:
+    """İlaç ismini karşılaştırma için normalize et."""
+    if not isim:
+        return ""
+    return ' '.join(isim.upper().strip().translate(_NOKTALAMA).split())
+
+
+def ilac_ismi_benzerlik(isim1, isim2) -> float:
+    """İki ilaç isminin benzerlik skoru (0-1) — kelime Jaccard."""
+    n1 = ilac_ismi_normalize(isim1)
+    n2 = ilac_ismi_normalize(isim2)
+    if n1 == n2:
+        return 1.0
+    words1 = set(n1.split())
+    words2 = set(n2.split())
+    if not words1 or not words2:
+        return 0.0
+    ortak = words1 & words2
+    return len(ortak) / len(words1 | words2)
+
+
+def _bonuslu_skor(depo, botanik, skor) -> float:
+    """Aynı isimli çoklu satırları ayırmak için miktar/tutar bonusu."""
+    d_miktar = int(depo.get('miktar', 0) or 0)
+    b_miktar = int(botanik.get('miktar', 0) or 0)
+    d_tutar = float(depo.get('tutar', 0) or 0)
+    b_tutar = float(botanik.get('toplam_tutar', 0) or 0)
+    miktar_bonus = 0.05 if d_miktar == b_miktar else 0
+    tutar_bonus = 0.03 if abs(d_tutar - b_tutar) < 1.0 else 0
+    return skor + miktar_bonus + tutar_bonus
+
+
+def iade_adaylari(depo_satirlari, botanik_satirlari) -> Dict[Tuple[int, int], float]:
+    """Benzerliği eşiği geçen (depo_idx, botanik_idx) → ham benzerlik.
+
+    Barkod ve normalize isim eşitliği hash join; kelime benzerliği ters
+    indeksle yalnız ortak kelimeli çiftler için hesaplanır.
+    """
+    b_norm = [ilac_ismi_normalize(b['urun_adi']) for b in botanik_satirlari]
+    b_kelime = [set(n.split()) for n in b_norm]
+    barkod_idx: Dict[str, List[int]] = defaultdict(list)
+    isim_idx: Dict[str, List[int]] = defaultdict(list)
+    kelime_idx: Dict[str, List[int]] = defaultdict(list)
+    for j, b in enumerate(botanik_satirlari):
+        if b.get('barkod'):
+            barkod_idx[b['barkod']].append(j)
+        isim_idx[b_norm[j]].append(j)
+        for k in b_kelime[j]:
+            kelime_idx[k].append(j)
+
+    adaylar: Dict[Tuple[int, int], float] = {}
+    for i, d in enumerate(depo_satirlari):
+        tam = set(isim_idx.get(ilac_ismi_normalize(d['urun_adi']), ()))
+        if d.get('barkod'):
+            tam.update(barkod_idx.get(d['barkod'], ()))
+        for j in tam:
+            adaylar[(i, j)] = 1.0
+        kelimeler = set(ilac_ismi_normalize(d['urun_adi']).split())
+        if not kelimeler:
+            continue
+        ortak: Dict[int, int] = defaultdict(int)
+        for k in kelimeler:
+            for j in kelime_idx.get(k, ()):
+                ortak[j] += 1
+        la = len(kelimeler)
+        for j, c in ortak.items():
+            if j in tam:
+                continue
+            skor = c / (la + len(b_kelime[j]) - c)
+            if skor >= BENZERLIK_ESIGI:
+                adaylar[(i, j)] = skor
+    return adaylar
+
+
+def _bilesenler(kenarlar) -> List[List[Tuple[int, int]]]:
+    """İki parçalı aday grafiğini bağlı bileşenlerine ayır (union-find)."""
+    ebeveyn: Dict = {}
+
+    def bul(x):
+        while ebeveyn.setdefault(x, x) != x:
+            ebeveyn[x] = ebeveyn[ebeveyn[x]]
+            x = ebeveyn[x]
+        return x
+
+    for i, j in kenarlar:
+        ra, rb = bul(('d', i)), bul(('b', j))
+        if ra != rb:
+            ebeveyn[ra] = rb
+    gruplar: Dict = defaultdict(list)
+    for i, j in kenarlar:
+        gruplar[bul(('d', i))].append((i, j))
+    return list(gruplar.values())
+
+
+def iade_satirlari_eslestir(depo_satirlari, botanik_satirlari) -> Dict[str, list]:
+    """Depo ve Botanik iade satırlarını eşleştir.
+
+    Öncelik: Barkod > ilaç ismi benzerliği; aynı isimli birden fazla satırda
+    miktar + tutar yakınlığı bonusu. Çakışan adaylar toplam skoru en büyük
+    atama ile çözülür.
+    """
+    adaylar = iade_adaylari(depo_satirlari, botanik_satirlari)
+    skorlar = {
+        (i, j): _bonuslu_skor(depo_satirlari[i], botanik_satirlari[j], s)
+        for (i, j), s in adaylar.items()
+    }
+
+    secilen: List[Tuple[int, int]] = []
+    for kenarlar in _bilesenler(list(skorlar)):
+        d_idx = sorted({i for i, _ in kenarlar})
+        b_idx = sorted({j for _, j in kenarlar})
+        if len(kenarlar) == 1:
+            secilen.append(kenarlar[0])
+            continue
+        if len(d_idx) == 1 or len(b_idx) == 1 or max(len(d_idx), len(b_idx)) > OPTIMAL_ATAMA_SINIRI:
+            # Tek taraflı yıldızda açgözlü zaten optimal; çok büyük grupta yedek yol
+            kullanilan_d, kullanilan_b = set(), set()
+            for i, j in sorted(kenarlar, key=lambda k: -skorlar[k]):
+                if i not in kullanilan_d and j not in kullanilan_b:
+                    secilen.append((i, j))
+                    kullanilan_d.add(i)
+                    kullanilan_b.add(j)
+            continue
+        d_pos = {i: n for n, i in enumerate(d_idx)}
+        b_pos = {j: n for n, j in enumerate(b_idx)}
+        maliyet = np.zeros((len(d_idx), len(b_idx)))
+        for i, j in kenarlar:
+            maliyet[d_pos[i], b_pos[j]] = -skorlar[(i, j)]
+        for a, b in atama_coz(maliyet):
+            k = (d_idx[a], b_idx[b])
+            if k in skorlar:
+                secilen.append(k)
+
+    secilen.sort(key=lambda k: (-skorlar[k], k))
+    eslesmeler = [{
+        'depo_idx': i,
+        'botanik_idx': j,
+        'depo': depo_satirlari[i],
+        'botanik': botanik_satirlari[j],
+        'benzerlik': adaylar[(i, j)],
+    } for i, j in secilen]
+    kullanilan_depo = {i for i, _ in secilen}
+    kullanilan_botanik = {j for _, j in secilen}
+    return {
+        'eslesmeler': eslesmeler,
+        'eslesmeyen_depo': [(i, d) for i, d in enumerate(depo_satirlari) if i not in kullanilan_depo],
+        'eslesmeyen_botanik': [(j, b) for j, b in enumerate(botanik_satirlari)
+                               if j not in kullanilan_botanik],
+    }
@@ -0,0 +1,149 @@
+"""
+Ekleme Günlüğü — sadece-sona-ekleme (append-only) JSON-lines kalıcılığı
+
+Küçük değişiklikte tüm JSON dosyasını yeniden yazmak yerine her değişiklik
+tek satır olarak dosyanın sonuna eklenir; dosya periyodik olarak sıkıştırılır
+(canlı durum yeni dosyaya yazılıp atomik `os.replace` ile değiştirilir).
+
+Çökme güvenliği:
+  - Ekleme tek `write` + `flush` (istenirse `os.fsync`) — süreç çökerse en
+    fazla son satır yarım kalır; okuma yarım/bozuk satırları atlar.
+  - Sıkıştırma geçici dosyaya yazılır, fsync edilir, sonra atomik değiştirilir
+    — yarıda kesilirse eski günlük aynen durur.
+
+Kullanım:
+    g = EklemeGunlugu(Path("x.jsonl"))
+    for kayit in g.oku(): ...            # açılışta durumu yeniden kur
+    g.ekle({"r": "1ABC23", "d": "2026-10"})
+    if g.sikistirma_gerekli_mi(canli_kayit_sayisi):
+        g.sikistir(canli_kayitlar)
+"""
+
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sıkıştırma eşiği: günlük satırı canlı kaydın bu katını + payı aşınca
+SIKISTIRMA_KAT = 2
+SIKISTIRMA_PAYI = 1024
+
+
+class EklemeGunlugu:
+    """Thread-safe JSON-lines ekleme günlüğü (kayıt = dict)."""
+
+    def __init__(self, yol: Path, fsync: bool = False):
+        self.yol = Path(yol)
+        self.fsync = fsync
+        self.satir_sayisi = 0
+        self.bozuk_satir = 0
+        self._dosya = None
+        self._lock = threading.Lock()
+
+    def oku(self) -> Iterator[Dict]:
+        """Günlükteki kayıtları sırayla döndür (bozuk/yarım satırlar atlanır)."""
+        self.satir_sayisi = 0
+        self.bozuk_satir = 0
+        if not self.yol.exists():
+            return
+        with open(self.yol, 'r', encoding='utf-8', errors='replace') as f:
+            for satir in f:
+                satir = satir.strip()
+                if not satir:
+                    continue
+                try:
+                    kayit = json.loads(satir)
+                except ValueError:
+                    self.bozuk_satir += 1
+                    continue
+                if isinstance(kayit, dict):
+                    self.satir_sayisi += 1
+                    yield kayit
+                else:
+                    self.bozuk_satir += 1
+        if self.bozuk_satir:
+            logger.warning(f"{self.yol.name}: {self.bozuk_satir} bozuk satır atlandı")
+
+    def _ac(self):
+        if self._dosya is None:
+            self.yol.parent.mkdir(parents=True, exist_ok=True)
+            self._dosya = open(self.yol, 'a', encoding='utf-8')
+            # Önceki çökmeden kalan yarım satır varsa yeni kayıt ona yapışmasın
+            if self._dosya.tell() > 0:
+                with open(self.yol, 'rb') as f:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        self._dosya.write('\n')
+        return self._dosya
+
+    def ekle(self, kayit: Dict) -> None:
+        self.ekle_coklu((kayit,))
+
+    def ekle_coklu(self, kayitlar: Iterable[Dict]) -> None:
+        """Kayıtları tek yazma ile sona ekle."""
+        metin = ''.join(json.dumps(k, ensure_ascii=False, separators=(',', ':')) + '\n'
+                        for k in kayitlar)
+        if not metin:
+            return
+        with self._lock:
+            f = self._ac()
+            f.write(metin)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+            self.satir_sayisi += metin.count('\n')
+
+    def sikistirma_gerekli_mi(self, canli_kayit: int) -> bool:
+        return self.satir_sayisi > SIKISTIRMA_KAT * canli_kayit + SIKISTIRMA_PAYI
+
+    def sikistir(self, kayitlar: Iterable[Dict]) -> bool:
+        """Günlüğü yalnız verilen kayıtlarla atomik olarak yeniden yaz."""
+        gecici = self.yol.with_name(self.yol.name + '.tmp')
+        with self._lock:
+            try:
+                self.yol.parent.mkdir(parents=True, exist_ok=True)
+                adet = 0
+                with open(gecici, 'w', encoding='utf-8') as f:
+                    for k in kayitlar:
+                        f.write(json.dumps(k, ensure_ascii=False, separators=(',', ':')) + '\n')
+                        adet += 1
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._kapat_kilitsiz()
+                os.replace(gecici, self.yol)
+                self.satir_sayisi = adet
+                return True
+            except Exception as e:
+                logger.error(f"{self.yol.name} sıkıştırma hatası: {e}")
+                try:
+                    gecici.unlink()
+                except OSError:
+                    pass
+                return False
+
+    def _kapat_kilitsiz(self) -> None:
+        if self._dosya is not None:
+            try:
+                self._dosya.close()
+            finally:
+                self._dosya = None
+
+    def kapat(self) -> None:
+        with self._lock:
+            self._kapat_kilitsiz()
+
+
+def eski_json_oku(yol: Path) -> Optional[object]:
+    """Göç için eski tam-JSON dosyasını oku (yoksa/bozuksa None)."""
+    if not Path(yol).exists():
+        return None
+    try:
+        with open(yol, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"{Path(yol).name} okunamadı: {e}")
+        return None
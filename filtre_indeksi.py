@@ -0,0 +1,584 @@
+"""
+Filtre İndeksi — aylık reçete tablosu için artımlı (incremental) filtre motoru
+
+AylikReceteSorguGUI'de her filtre tıklaması tüm satırları Python'da tek tek
+filtre fonksiyonundan geçiriyordu (50k satırda yüzlerce ms). Bu modül satırları
+bir kez sütun sütun sözlük-kodlar (dictionary encoding: her sütun için
+"benzersiz değer listesi + satır başına değer kodu" numpy dizisi) ve filtreleri
+satır maskesi (bool bitmap) olarak hesaplar:
+
+  - Değer/etiket filtreleri (verdict, teyit, renk, reçete türü, msj, rapor,
+    Excel-tipi değer listesi): koşul yalnız BENZERSİZ değerler üzerinde
+    değerlendirilir → lookup tablosu → lut[kodlar] ile maske (vektörel).
+  - Sütun arama kutuları: benzersiz değerlerin küçük harfli hali önbellekte;
+    yazmaya devam edildikçe ("met" → "metf") yalnız önceki eşleşenler taranır.
+  - Hızlı filtre yüklemleri (_f_statin, _f_yoak…): satır başına bir kez
+    hesaplanıp maske olarak saklanır; sonraki tıklamalar bedava.
+  - Görünür küme = maskelerin AND'i; önceki maskeyle farkı (eklenen / çıkan
+    iid'ler) ızgaraya yalnız fark olarak uygulanır.
+
+Kontrol sonrası değişen sütunlar (verdict*, ai_*, secim, teyit) "uçucu"dur:
+her filtre turunda (yeni_tur) yeniden kodlanır; SQL'den gelen sütunlar indeks
+ömrü boyunca bir kez kodlanır. Satır verisi değiştiğinde (boyama, yeniden
+kontrol, sıralama, yeni sorgu) çağıran yeni bir FiltreIndeksi kurar.
+
+satir_gecer_mi aynı filtre semantiğinin tek satırlık hâlidir (akışlı yükleme
+partileri ve karşılaştırma testi için).
+
+Kullanım:
+    indeks = FiltreIndeksi(tum_satirlar)
+    durum = FiltreDurumu(verdict_filtre={"UYGUN": False, ...},
+                         renkler=satir_renkleri, renk_acik={"beyaz"})
+    maske = filtre_maskesi(indeks, durum)
+    eklenen, cikan = indeks.fark(maske)
+    gorunen = indeks.iidler(maske)
+"""
+
+import logging
+import re
+from dataclasses import dataclass, field
+from itertools import repeat
+import operator
+from operator import methodcaller
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from recete_kontrol.sut_kontrolleri import _tr_lower
+
+logger = logging.getLogger(__name__)
+
+# Kontrol / teyit / AI sonrası satır içinde değişen sütunlar
+UCUCU_KOLON_ONEKLERI = ("verdict", "ai_", "secim", "teyit", "renkli_rr", "hasta_tc")
+
+_KDI_KOLONU = "_ilac_atc_etkin"
+_TEYIT_KOLONU = "_teyit"
+_RENK_KOLONU = "_renk"
+
+
+def varsayilan_ucucu_mu(kod: str) -> bool:
+    return kod.startswith(UCUCU_KOLON_ONEKLERI)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# METİN OPERATÖR FİLTRELERİ (başlar/biter/içerir… — VE/VEYA grupları)
+# ═══════════════════════════════════════════════════════════════════════
+def metin_filtre_normalize(kosullar) -> list:
+    """Geriye dönük uyum: eski (op, deger) tuple → tek-koşul liste.
+    Yeni format zaten liste; aynen döner."""
+    if isinstance(kosullar, tuple) and len(kosullar) == 2:
+        op, deger = kosullar
+        return [{"baglac": None, "op": op, "deger": deger}]
+    if isinstance(kosullar, list):
+        return kosullar
+    return []
+
+
+def metin_kosulu_anlamli(k: dict) -> bool:
+    """Boş değer + boş-olmayan op = anlamsız (filtre kapalı sayılır)."""
+    op = k.get("op", "icerir")
+    if op in ("bos", "bos_degil"):
+        return True
+    return bool((k.get("deger") or "").strip())
+
+
+def metin_kosulu_test(s_str: str, k: dict) -> bool:
+    """Tek koşul s_str'e uyuyor mu? s_str ZATEN lowercase olmalı."""
+    return _kosul_gecer(s_str, k.get("op", "icerir"), _tr_lower(k.get("deger") or ""))
+
+
+def _kosul_gecer(s_str: str, op: str, d_str: str) -> bool:
+    if op == "icerir":
+        return d_str in s_str
+    if op == "icermez":
+        return d_str not in s_str
+    if op == "baslar":
+        return s_str.startswith(d_str)
+    if op == "biter":
+        return s_str.endswith(d_str)
+    if op == "esit":
+        return s_str == d_str
+    if op == "esit_degil":
+        return s_str != d_str
+    if op == "bos":
+        return not s_str
+    if op == "bos_degil":
+        return bool(s_str)
+    if op == "regex":
+        try:
+            return bool(re.search(d_str, s_str, re.IGNORECASE))
+        except re.error:
+            return True  # geçersiz regex → koşulu yutkun
+    return True
+
+
+def metin_gruplari(kosullar) -> List[List[dict]]:
+    """Koşul listesini VEYA'lara göre gruplara böler; anlamlı koşulu olmayan
+    grupları (ör. değer boş & op=içerir) atar. Boş liste = filtre yok."""
+    kosul_listesi = metin_filtre_normalize(kosullar)
+    gruplar: List[List[dict]] = []
+    mevcut: List[dict] = []
+    for i, k in enumerate(kosul_listesi):
+        if i > 0 and k.get("baglac") == "veya":
+            if mevcut:
+                gruplar.append(mevcut)
+            mevcut = []
+        mevcut.append(k)
+    if mevcut:
+        gruplar.append(mevcut)
+    return [[k for k in g if metin_kosulu_anlamli(k)]
+            for g in gruplar if any(metin_kosulu_anlamli(k) for k in g)]
+
+
+def metin_gruplari_gecer(s_str: str, gruplar: List[List[dict]]) -> bool:
+    """En az bir grubun tüm koşulları sağlanmalı (gruplar OR, grup içi AND)."""
+    if not gruplar:
+        return True
+    return any(all(metin_kosulu_test(s_str, k) for k in g) for g in gruplar)
+
+
+def _kosul_fonksiyonu(op: str, d_str: str) -> Callable[[str], bool]:
+    if op == "icerir":
+        return methodcaller("__contains__", d_str)
+    if op == "baslar":
+        return methodcaller("startswith", d_str)
+    if op == "biter":
+        return methodcaller("endswith", d_str)
+    if op == "esit":
+        return d_str.__eq__
+    if op == "bos":
+        return operator.not_
+    if op == "bos_degil":
+        return bool
+    return lambda s_str: _kosul_gecer(s_str, op, d_str)
+
+
+def _metin_kosulu(gruplar: List[List[dict]]) -> Callable[[str], bool]:
+    """metin_gruplari_gecer'in derlenmiş hâli — koşul değerleri bir kez
+    küçük harfe çevrilir, sık operatörler C düzeyinde metot çağrısıdır."""
+    derli = []
+    for g in gruplar:
+        fns = [_kosul_fonksiyonu(k.get("op", "icerir"), _tr_lower(k.get("deger") or ""))
+               for k in g]
+        derli.append(fns[0] if len(fns) == 1
+                     else (lambda s_str, fns=fns: all(f(s_str) for f in fns)))
+    if len(derli) == 1:
+        return derli[0]
+    return lambda s_str: any(f(s_str) for f in derli)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# FİLTRE DURUMU (Tk değişkenlerinden bağımsız anlık görüntü)
+# ═══════════════════════════════════════════════════════════════════════
+@dataclass
+class FiltreDurumu:
+    """Tablo filtrelerinin Tk'sız anlık görüntüsü.
+
+    Etiket filtreleri {etiket: açık_mı}; listede olmayan etiket "" (boş)
+    bucket'ının durumunu alır. `renk_acik` None ise renk filtresi yoktur.
+    """
+    kontrol_disi: List[Tuple[Callable, Any]] = field(default_factory=list)
+    msj_mod: str = "hepsi"
+    rapor_mod: str = "hepsi"
+    verdict_filtre: Dict[str, bool] = field(default_factory=dict)
+    teyit_filtre: Dict[str, bool] = field(default_factory=dict)
+    teyit_harita: Dict[str, str] = field(default_factory=dict)
+    arama: Dict[str, str] = field(default_factory=dict)
+    deger: Dict[str, Set[str]] = field(default_factory=dict)
+    metin: Dict[str, Any] = field(default_factory=dict)
+    renkler: Dict[str, str] = field(default_factory=dict)
+    renk_acik: Optional[Set[str]] = None
+    varsayilan_renk: str = ""
+    gizli_recete_turleri: Set[str] = field(default_factory=set)
+
+
+def _etiket_acik_mi(etiket: str, filtre: Dict[str, bool]) -> bool:
+    acik = filtre.get(etiket)
+    if acik is None:
+        # Bilinmeyen etiket (ATLANDI vb.) → "" (boş) bucket'ına eşitle
+        acik = filtre.get("")
+    return acik is None or bool(acik)
+
+
+def _hepsi_acik(filtre: Dict[str, bool]) -> bool:
+    return all(filtre.values())
+
+
+def _arama_parcalari(metin: str) -> Tuple[str, ...]:
+    # Boşlukla ayrılmış kelimeler AND ile birleşir; her biri substring
+    return tuple(_tr_lower((metin or "").strip()).split())
+
+
+def _kdi_gecer(eslesir: Callable, setler, ilac, atc, etkin) -> bool:
+    try:
+        return not eslesir(ilac, atc, etkin, setler)
+    except Exception:
+        return True
+
+
+def _kdi_degeri(s: dict) -> tuple:
+    return (s.get("ilac"), s.get("atc"), s.get("etkin"))
+
+
+def _verdict_gecer(v, filtre: Dict[str, bool]) -> bool:
+    try:
+        return _etiket_acik_mi((v or "").strip(), filtre)
+    except Exception:
+        return True
+
+
+def _msj_gecer(v, mod: str) -> bool:
+    try:
+        return (v or "").strip().lower() == mod
+    except Exception:
+        return True
+
+
+def _rapor_gecer(v, mod: str) -> bool:
+    try:
+        raporlu = bool((v or "").strip())
+    except Exception:
+        return True
+    return raporlu if mod == "raporlu" else not raporlu
+
+
+def _rec_tip_gecer(v, gizli: Set[str]) -> bool:
+    return (v or "").strip() not in gizli
+
+
+def _aktif_kdi(durum: FiltreDurumu) -> List[Tuple[Callable, Any]]:
+    return [(f, st) for f, st in durum.kontrol_disi if st and any(st)]
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# SATIR BAZLI DEĞERLENDİRME (akışlı partiler / referans)
+# ═══════════════════════════════════════════════════════════════════════
+def satir_gecer_mi(s: dict, iid: str, durum: FiltreDurumu) -> bool:
+    """Tek satır tüm filtrelerden geçiyor mu? filtre_maskesi ile aynı sonuç."""
+    for eslesir, setler in _aktif_kdi(durum):
+        if not _kdi_gecer(eslesir, setler, s.get("ilac"), s.get("atc"),
+                          s.get("etkin")):
+            return False
+    if durum.msj_mod in ("var", "yok") and not _msj_gecer(s.get("msj"), durum.msj_mod):
+        return False
+    if (durum.rapor_mod in ("raporlu", "raporsuz")
+            and not _rapor_gecer(s.get("rap_kod"), durum.rapor_mod)):
+        return False
+    if durum.verdict_filtre and not _verdict_gecer(s.get("verdict"), durum.verdict_filtre):
+        return False
+    if durum.teyit_filtre:
+        tyt = str(durum.teyit_harita.get(iid) or "")
+        if not _etiket_acik_mi(tyt, durum.teyit_filtre):
+            return False
+    for kod, metin in durum.arama.items():
+        parcalar = _arama_parcalari(metin)
+        if parcalar:
+            deger = _tr_lower(str(s.get(kod, "")))
+            if not all(p in deger for p in parcalar):
+                return False
+    for kod, secili in durum.deger.items():
+        if secili and str(s.get(kod, "")) not in secili:
+            return False
+    for kod, kosullar in durum.metin.items():
+        gruplar = metin_gruplari(kosullar)
+        if gruplar and not metin_gruplari_gecer(
+                _tr_lower(str(s.get(kod, "") or "")), gruplar):
+            return False
+    if (durum.renk_acik is not None
+            and durum.renkler.get(iid, durum.varsayilan_renk) not in durum.renk_acik):
+        return False
+    if durum.gizli_recete_turleri and not _rec_tip_gecer(
+            s.get("rec_tip"), durum.gizli_recete_turleri):
+        return False
+    return True
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# İNDEKS
+# ═══════════════════════════════════════════════════════════════════════
+class KodluKolon:
+    """Sözlük-kodlu sütun: benzersiz değerler + satır başına değer kodu."""
+
+    __slots__ = ("degerler", "kodlar", "_metinler")
+
+    def __init__(self, liste: List[Any]):
+        try:
+            benzersiz = list(dict.fromkeys(liste))
+        except TypeError:
+            # hash'lenemeyen hücre (liste/dict) — metin hâliyle kodla
+            liste = [str(v) for v in liste]
+            benzersiz = list(dict.fromkeys(liste))
+        sozluk = {v: k for k, v in enumerate(benzersiz)}
+        self.degerler: List[Any] = benzersiz
+        self.kodlar = np.fromiter(map(sozluk.__getitem__, liste),
+                                  dtype=np.int32, count=len(liste))
+        self._metinler: Dict[Callable, List[str]] = {}
+
+    def lut(self, kosul: Callable[[Any], bool],
+            donustur: Optional[Callable[[List[Any]], List[str]]] = None) -> np.ndarray:
+        """Benzersiz değerler (ya da önbellekli dönüştürülmüş metinleri)
+        üzerinde koşul tablosu (lookup table)."""
+        degerler = self.degerler if donustur is None else self.metinler(donustur)
+        return np.fromiter(map(kosul, degerler), dtype=bool, count=len(degerler))
+
+    def metinler(self, donustur: Callable[[List[Any]], List[str]]) -> List[str]:
+        """Benzersiz değerlerin dönüştürülmüş (ör. küçük harf) hâli — önbellekli.
+        donustur tüm değer listesini alır (toplu dönüşüm)."""
+        m = self._metinler.get(donustur)
+        if m is None:
+            m = self._metinler[donustur] = donustur(self.degerler)
+        return m
+
+    def sayim(self, maske: Optional[np.ndarray] = None) -> Dict[Any, int]:
+        """{değer: satır sayısı} — maske verilirse yalnız maskedeki satırlar."""
+        kodlar = self.kodlar if maske is None else self.kodlar[maske]
+        adet = np.bincount(kodlar, minlength=len(self.degerler))
+        return {self.degerler[k]: int(a) for k, a in enumerate(adet) if a}
+
+
+def _toplu_kucult(metinler: List[str]) -> List[str]:
+    """_tr_lower'ın liste hâli — birleşik tek metin üzerinde translate+lower
+    (C düzeyinde tek geçiş), sonra ayraçtan bölünür."""
+    sonuc = _tr_lower("\x00".join(metinler)).split("\x00")
+    if len(sonuc) != len(metinler):
+        return [_tr_lower(m) for m in metinler]
+    return sonuc
+
+
+def _arama_metinleri(degerler: List[Any]) -> List[str]:
+    return _toplu_kucult(list(map(str, degerler)))
+
+
+def _metin_metinleri(degerler: List[Any]) -> List[str]:
+    return _toplu_kucult([str(v or "") for v in degerler])
+
+
+class FiltreIndeksi:
+    """Sabit satır sırası üzerinde sütun indeksleri + maske önbellekleri."""
+
+    def __init__(self, satirlar: List[dict],
+                 iid_al: Optional[Callable[[dict], str]] = None,
+                 ucucu_mu: Callable[[str], bool] = varsayilan_ucucu_mu):
+        iid_al = iid_al or (lambda s: str(s["ri_id"]))
+        self.satirlar = satirlar
+        self.iid_listesi: List[str] = [iid_al(s) for s in satirlar]
+        self._iid_dizi = np.array(self.iid_listesi, dtype=object)
+        self.n = len(self.iid_listesi)
+        self._ucucu_mu = ucucu_mu
+        self._tur = 0
+        # ad -> [geçerli olduğu tur | None = kalıcı, kolon, uçucuysa ham değerler]
+        self._kolonlar: Dict[str, list] = {}
+        self._haritalar: Dict[str, Tuple[Any, dict]] = {}   # harita kolonu anlık kopyası
+        self._lutlar: Dict[Tuple[str, Hashable], np.ndarray] = {}
+        self._aramalar: Dict[str, Tuple[Tuple[str, ...], np.ndarray]] = {}
+        self._yuklemler: Dict[Hashable, np.ndarray] = {}
+        self._son: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self.n
+
+    def yeni_tur(self) -> None:
+        """Yeni filtre turu — uçucu sütunlar bir sonraki kullanımda yeniden kodlanır."""
+        self._tur += 1
+
+    # ------------------------------------------------------------ sütunlar
+    def _kolon_kur(self, ad: str, ham: List[Any], ucucu: bool) -> KodluKolon:
+        kayit = self._kolonlar.get(ad)
+        if ucucu and kayit is not None and kayit[2] == ham:
+            # Uçucu sütun bu turda değişmemiş — kodlar ve lookup tabloları geçerli
+            kayit[0] = self._tur
+            return kayit[1]
+        kolon = KodluKolon(ham)
+        self._kolonlar[ad] = [self._tur if ucucu else None, kolon,
+                              ham if ucucu else None]
+        for anahtar in [a for a in self._lutlar if a[0] == ad]:
+            del self._lutlar[anahtar]
+        self._aramalar.pop(ad, None)
+        return kolon
+
+    def _gecerli(self, ad: str) -> Optional[KodluKolon]:
+        kayit = self._kolonlar.get(ad)
+        if kayit is not None and (kayit[0] is None or kayit[0] == self._tur):
+            return kayit[1]
+        return None
+
+    def kolon(self, ad: str, deger_al: Optional[Callable[[dict], Any]] = None) -> KodluKolon:
+        """Satır sütununun kodlu hâli (varsayılan: s.get(ad, ""))."""
+        kolon = self._gecerli(ad)
+        if kolon is None:
+            deger_al = deger_al or methodcaller("get", ad, "")
+            kolon = self._kolon_kur(ad, list(map(deger_al, self.satirlar)),
+                                    self._ucucu_mu(ad))
+        return kolon
+
+    def harita_kolonu(self, ad: str, harita: Dict[str, Any], varsayilan: Any = "") -> KodluKolon:
+        """iid → değer haritasından (renk, teyit) sütun — her turda tazelenir;
+        harita önceki turdakiyle aynıysa (C düzeyinde dict karşılaştırması)
+        satırlar yeniden taranmaz."""
+        kolon = self._gecerli(ad)
+        if kolon is not None:
+            return kolon
+        onceki = self._haritalar.get(ad)
+        kayit = self._kolonlar.get(ad)
+        if (onceki is not None and kayit is not None and onceki[0] == varsayilan
+                and onceki[1] == harita):
+            kayit[0] = self._tur
+            return kayit[1]
+        kolon = self._kolon_kur(
+            ad, list(map(harita.get, self.iid_listesi, repeat(varsayilan, self.n))),
+            True)
+        self._haritalar[ad] = (varsayilan, dict(harita))
+        return kolon
+
+    def hazirla(self, kodlar: Iterable[str] = ("msj", "rap_kod", "rec_tip")) -> None:
+        """Sık kullanılan SQL sütunlarını önceden kodla (ilk filtre tıklaması
+        kodlama maliyeti ödemesin) — veri yüklendikten sonra boşta çağrılır."""
+        for kod in kodlar:
+            self.kolon(kod)
+        self.kolon(_KDI_KOLONU, _kdi_degeri)
+
+    # ------------------------------------------------------------ maskeler
+    def tumu(self) -> np.ndarray:
+        return np.ones(self.n, dtype=bool)
+
+    def kosul_maskesi(self, kolon: KodluKolon, kosul: Callable[[Any], bool],
+                      anahtar: Optional[Tuple[str, Hashable]] = None,
+                      donustur: Optional[Callable[[List[Any]], List[str]]] = None
+                      ) -> np.ndarray:
+        """Benzersiz değer koşulunu satır maskesine çevir; anahtar verilirse
+        lookup tablosu sütun yeniden kodlanana kadar saklanır."""
+        tablo = self._lutlar.get(anahtar) if anahtar is not None else None
+        if tablo is None:
+            tablo = kolon.lut(kosul, donustur)
+            if anahtar is not None:
+                self._lutlar[anahtar] = tablo
+        return tablo[kolon.kodlar]
+
+    def iceren_maskesi(self, ad: str, parcalar: Tuple[str, ...]) -> np.ndarray:
+        """Sütun metni (Türkçe küçük harf) tüm parçaları içeriyor mu.
+
+        Yeni arama öncekinin daraltılmışıysa (her eski parça bir yeni parçanın
+        içinde) yalnız önceki eşleşen değerler taranır."""
+        kolon = self.kolon(ad)
+        metinler = kolon.metinler(_arama_metinleri)
+        adaylar = None
+        onceki = self._aramalar.get(ad)
+        if onceki is not None:
+            eski, eski_tablo = onceki
+            if eski == parcalar:
+                return eski_tablo[kolon.kodlar]
+            if all(any(e in y for y in parcalar) for e in eski):
+                adaylar = np.flatnonzero(eski_tablo).tolist()
+        tablo = np.zeros(len(metinler), dtype=bool)
+        for k in (range(len(metinler)) if adaylar is None else adaylar):
+            m = metinler[k]
+            if all(p in m for p in parcalar):
+                tablo[k] = True
+        self._aramalar[ad] = (parcalar, tablo)
+        return tablo[kolon.kodlar]
+
+    def yuklem_maskesi(self, anahtar: Hashable, fn: Callable[[dict], bool]) -> np.ndarray:
+        """Satır yüklemi (ör. _f_statin) maskesi — indeks ömrü boyunca bir kez
+        hesaplanır; yalnız SQL sütunlarına bakan yüklemler için. Hata → False."""
+        maske = self._yuklemler.get(anahtar)
+        if maske is None:
+            def _guvenli(s):
+                try:
+                    return bool(fn(s))
+                except Exception:
+                    return False
+            maske = np.fromiter((_guvenli(s) for s in self.satirlar),
+                                dtype=bool, count=self.n)
+            self._yuklemler[anahtar] = maske
+        return maske
+
+    # ------------------------------------------------------------ sonuç
+    def iidler(self, maske: np.ndarray) -> List[str]:
+        """Maskedeki satırların iid'leri (indeks sırasıyla)."""
+        return self._iid_dizi[maske].tolist()
+
+    def fark(self, maske: np.ndarray) -> Tuple[List[str], List[str]]:
+        """Önceki `fark` çağrısına göre (eklenen, çıkan) iid'ler; maske saklanır."""
+        onceki = self._son
+        self._son = maske
+        if onceki is None:
+            return self.iidler(maske), []
+        return (self._iid_dizi[maske & ~onceki].tolist(),
+                self._iid_dizi[onceki & ~maske].tolist())
+
+
+def filtre_maskesi(indeks: FiltreIndeksi, durum: FiltreDurumu) -> np.ndarray:
+    """Tüm filtrelerin AND'i → görünür satır maskesi. Her çağrı yeni bir
+    filtre turudur (uçucu sütunlar tazelenir); pasif filtreler hiç dokunulmaz."""
+    indeks.yeni_tur()
+    maske = indeks.tumu()
+
+    kdi = _aktif_kdi(durum)
+    if kdi:
+        kolon = indeks.kolon(_KDI_KOLONU, _kdi_degeri)
+        for eslesir, setler in kdi:
+            maske &= indeks.kosul_maskesi(
+                kolon, lambda v, f=eslesir, st=setler: _kdi_gecer(f, st, *v))
+    if durum.msj_mod in ("var", "yok"):
+        maske &= indeks.kosul_maskesi(
+            indeks.kolon("msj"), lambda v: _msj_gecer(v, durum.msj_mod),
+            ("msj", durum.msj_mod))
+    if durum.rapor_mod in ("raporlu", "raporsuz"):
+        maske &= indeks.kosul_maskesi(
+            indeks.kolon("rap_kod"), lambda v: _rapor_gecer(v, durum.rapor_mod),
+            ("rap_kod", durum.rapor_mod))
+    if durum.verdict_filtre and not _hepsi_acik(durum.verdict_filtre):
+        maske &= indeks.kosul_maskesi(
+            indeks.kolon("verdict"), lambda v: _verdict_gecer(v, durum.verdict_filtre))
+    if durum.teyit_filtre and not _hepsi_acik(durum.teyit_filtre):
+        maske &= indeks.kosul_maskesi(
+            indeks.harita_kolonu(_TEYIT_KOLONU, durum.teyit_harita, ""),
+            lambda v: _etiket_acik_mi(str(v or ""), durum.teyit_filtre))
+    for kod, metin in durum.arama.items():
+        parcalar = _arama_parcalari(metin)
+        if parcalar:
+            maske &= indeks.iceren_maskesi(kod, parcalar)
+    for kod, secili in durum.deger.items():
+        if secili:
+            maske &= indeks.kosul_maskesi(
+                indeks.kolon(kod), lambda v, sec=secili: str(v) in sec)
+    for kod, kosullar in durum.metin.items():
+        gruplar = metin_gruplari(kosullar)
+        if gruplar:
+            maske &= indeks.kosul_maskesi(
+                indeks.kolon(kod), _metin_kosulu(gruplar), (kod, repr(gruplar)),
+                donustur=_metin_metinleri)
+    if durum.renk_acik is not None:
+        maske &= indeks.kosul_maskesi(
+            indeks.harita_kolonu(_RENK_KOLONU, durum.renkler, durum.varsayilan_renk),
+            lambda v: v in durum.renk_acik)
+    if durum.gizli_recete_turleri:
+        maske &= indeks.kosul_maskesi(
+            indeks.kolon("rec_tip"),
+            lambda v: _rec_tip_gecer(v, durum.gizli_recete_turleri))
+    return maske
+
+
+def _etiket_sayimi(kolon: KodluKolon, etiketler: Iterable[str],
+                   donustur: Callable[[Any], str]) -> Dict[str, int]:
+    sayim = {e: 0 for e in etiketler}
+    for deger, adet in kolon.sayim().items():
+        etk = donustur(deger)
+        if etk in sayim:
+            sayim[etk] += adet
+        else:
+            sayim[""] = sayim.get("", 0) + adet  # bilinmeyen → "boş" bucket
+    return sayim
+
+
+def verdict_sayimi(indeks: FiltreIndeksi, etiketler: Iterable[str]) -> Dict[str, int]:
+    """Verdict checkbox sayımları (filtresiz, tüm satırlar)."""
+    return _etiket_sayimi(indeks.kolon("verdict"), etiketler,
+                          lambda v: (v or "").strip())
+
+
+def teyit_sayimi(indeks: FiltreIndeksi, harita: Dict[str, str],
+                 etiketler: Iterable[str]) -> Dict[str, int]:
+    """Teyit checkbox sayımları (filtresiz, tüm satırlar)."""
+    return _etiket_sayimi(indeks.harita_kolonu(_TEYIT_KOLONU, harita, ""),
+                          etiketler, lambda v: str(v or ""))
@@ -140,6 +140,16 @@ class HastaTakipGUI:
         self._ozet_oto_calisiyor = False
         self.root.after(20000, self._ozet_zamanlayici_tik)
 
+        # Değişiklik akışı: kuyrukta bekleyen bir hastaya yeni reçete
+        # kaydedilince o hastanın kaydı taramayı beklemeden doğrulanır.
+        # Abonelik (akışın BotanikDB'si + filigran sorgusu) EOS'a gider;
+        # ekran açılışı beklemesin diye arka planda kurulur.
+        self._akis_abonelik = None
+        self._akis_kilidi = threading.Lock()
+        self._akis_kapandi = False
+        threading.Thread(target=self._akisa_abone_ol, name="HastaTakipAkisAbone",
+                         daemon=True).start()
+
     # ================================================================= SEKME 1
     def _sekme_yazdirma_olustur(self) -> tk.Frame:
         """Dar ekran için iş akışına göre düzenlenmiş kompakt tasarım:
@@ -4392,6 +4402,30 @@ class HastaTakipGUI:
                 "Yerleşim uygulanamadı.\n\n" + "\n".join(parca),
             )
 
+    def _yeni_recete_geldi(self, olay):
+        """Değişiklik akışı olayı (abone thread'i): yeni reçetesi gelen ve
+        kuyrukta bekleyen hastaların ilaçlarını en güncel alımla doğrula."""
+        gelen = {int(r["MusteriId"]) for r in olay.satirlar
+                 if r.get("MusteriId")}
+        bekleyen = gelen & self.kuyruk.bekleyen_musteri_seti()
+        if bekleyen and self.kuyruk.bekleyen_yeni_alimla_guncelle(bekleyen):
+            self.root.after(0, self._kuyruktan_yukle)
+
+    def _akisa_abone_ol(self):
+        """Değişiklik akışına abone ol (arka plan thread'i). Ekran bu sırada
+        kapandıysa abonelik hemen iptal edilir."""
+        try:
+            from degisiklik_akisi import KONU_RECETE, paylasilan_akis
+            abonelik = paylasilan_akis().abone_ol(KONU_RECETE, self._yeni_recete_geldi)
+        except Exception as e:
+            logger.debug(f"Değişiklik akışına abone olunamadı: {e}")
+            return
+        with self._akis_kilidi:
+            if not self._akis_kapandi:
+                self._akis_abonelik = abonelik
+                return
+        abonelik.iptal()
+
     # -----------------------------------------------------------------
     def _kapat(self):
         try:
@@ -4399,6 +4433,11 @@ class HastaTakipGUI:
             get_servis().dur()
         except Exception:
             pass
+        with self._akis_kilidi:
+            self._akis_kapandi = True
+            abonelik, self._akis_abonelik = self._akis_abonelik, None
+        if abonelik is not None:
+            abonelik.iptal()
         try:
             if self.db:
                 self.db.kapat()
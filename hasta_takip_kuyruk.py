@@ -15,7 +15,9 @@ import os
 import sqlite3
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from recete_kontrol.tr_normalize import norm_tr_upper
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +25,17 @@ _SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 _DB_PATH = os.path.join(_SCRIPT_DIR, "hasta_takip.db")
 _AYAR_PATH = os.path.join(_SCRIPT_DIR, "hasta_takip_ayarlari.json")
 
+# Toplu rapor durumu sorgusunda parti başına (musteri, urun) çifti —
+# ürün adları (ad başına en fazla iki yazım) parametre olarak gider, SQL
+# Server'ın 2100 parametre sınırının altında kalır.
+RAPOR_SORGU_PARTI = 500
+
+
+def _urun_anahtari(urun_adi: Optional[str]) -> str:
+    """Rapor durumu eşlemesinde ürün adı anahtarı: EOS UPPER() Türkçe
+    collation'da i→İ verir, Python .upper() i→I — ikisi de aynı ASCII'ye iner."""
+    return norm_tr_upper((urun_adi or "").strip())
+
 
 @dataclass
 class HastaTakipAyarlari:
@@ -434,6 +447,10 @@ class MesajKuyrugu:
         ürünleri Botanik DB'de kontrol eder; rapor_kod_id'si 0/null olanları
         (raporsuz) çıkarır. İlac_json boş kalan kayıtları iptal eder.
 
+        Tüm (musteri, urun) çiftleri önce toplanır, rapor durumu
+        _urunler_raporlu_mu ile parti halinde sorgulanır (çift başına iki
+        sorgu yerine parti başına iki sorgu).
+
         Returns: temizlenen ilaç adedi.
         """
         try:
@@ -444,22 +461,37 @@ class MesajKuyrugu:
             logger.warning("Raporsuz temizlik: Botanik DB açılamadı: %s", e)
             return 0
 
-        silinen = 0
-        bos_kayitlar: list = []
         with self._conn() as c:
             rows = c.execute(
                 "SELECT id, musteri_id, ilac_json FROM mesaj_kuyrugu "
                 "WHERE durum='bekliyor'"
             ).fetchall()
 
-            for row in rows:
-                try:
-                    ilaclar = json.loads(row["ilac_json"])
-                except Exception:
-                    continue
-                if not isinstance(ilaclar, list):
-                    continue
+        kayit_data = []
+        ciftler: set = set()
+        for row in rows:
+            try:
+                ilaclar = json.loads(row["ilac_json"])
+            except Exception:
+                continue
+            if not isinstance(ilaclar, list):
+                continue
+            kayit_data.append((row["id"], row["musteri_id"], ilaclar))
+            for il in ilaclar:
+                urun_adi = (il.get("urun_adi") or "").strip()
+                if urun_adi:
+                    ciftler.add((int(row["musteri_id"]), urun_adi))
 
+        durumlar = self._urunler_raporlu_mu(bdb, ciftler) if ciftler else {}
+        try:
+            bdb.kapat()
+        except Exception:
+            pass
+
+        silinen = 0
+        bos_kayitlar: list = []
+        with self._conn() as c:
+            for kid, mid, ilaclar in kayit_data:
                 kalan: list = []
                 degisti = False
                 for il in ilaclar:
@@ -467,7 +499,7 @@ class MesajKuyrugu:
                     if not urun_adi:
                         continue
 
-                    raporlu = self._urun_raporlu_mu(bdb, row["musteri_id"], urun_adi)
+                    raporlu = durumlar.get((int(mid), _urun_anahtari(urun_adi)))
                     if raporlu is True:
                         kalan.append(il)
                     elif raporlu is False:
@@ -480,11 +512,11 @@ class MesajKuyrugu:
                 if not degisti:
                     continue
                 if not kalan:
-                    bos_kayitlar.append(row["id"])
+                    bos_kayitlar.append(kid)
                 else:
                     c.execute(
                         "UPDATE mesaj_kuyrugu SET ilac_json=? WHERE id=?",
-                        (json.dumps(kalan, ensure_ascii=False), row["id"]),
+                        (json.dumps(kalan, ensure_ascii=False), kid),
                     )
 
             for kid in bos_kayitlar:
@@ -497,6 +529,13 @@ class MesajKuyrugu:
             )
         return silinen
 
+    def bekleyen_musteri_seti(self) -> set:
+        """Kuyrukta 'bekliyor' durumunda kaydı olan musteri_id'ler."""
+        with self._conn() as c:
+            return {int(r["musteri_id"]) for r in c.execute(
+                "SELECT DISTINCT musteri_id FROM mesaj_kuyrugu "
+                "WHERE durum='bekliyor'").fetchall()}
+
     def yerel_haber_verilenler_seti(self) -> set:
         """Yerel DB'de (gonderim_ilac_log) kaydı olan tüm
         (musteri_id, urun_adi_UPPER, bitis_tarihi) üçlülerini döndür."""
@@ -606,7 +645,9 @@ class MesajKuyrugu:
                 harita[(int(r["musteri_id"]), rk, em_sgk, bitis)] = (r["zaman"] or "")[:16]
         return harita
 
-    def bekleyen_yeni_alimla_guncelle(self) -> int:
+    def bekleyen_yeni_alimla_guncelle(
+        self, musteri_idler: Optional[Iterable[int]] = None,
+    ) -> int:
         """Kuyrukta bekleyen ilaçları, Botanik DB'deki en güncel alımla doğrula.
 
         Bir hasta kuyruğa eklendikten sonra aynı ilaçtan yeni bir reçete almış
@@ -615,17 +656,13 @@ class MesajKuyrugu:
         Bu metod her (musteri, urun) çifti için DB'deki en geç bitiş tarihini
         alıp, kuyruktaki eski ilaçları düşürür.
 
+        musteri_idler verilirse sadece o hastaların bekleyen kayıtlarına bakılır
+        (değişiklik akışında yeni reçetesi gelen hastalar).
+
         Returns: düşürülen ilaç adedi.
         """
-        try:
-            from botanik_db import BotanikDB
-            bdb = BotanikDB()
-            if not bdb.baglan():
-                return 0
-        except Exception as e:
-            logger.warning("Yeni alım kontrolü: Botanik DB açılamadı: %s", e)
-            return 0
-
+        hedef = ({int(m) for m in musteri_idler}
+                 if musteri_idler is not None else None)
         with self._conn() as c:
             rows = c.execute(
                 "SELECT id, musteri_id, ilac_json FROM mesaj_kuyrugu "
@@ -641,11 +678,21 @@ class MesajKuyrugu:
                 continue
             if not isinstance(ilaclar, list) or not ilaclar:
                 continue
+            if hedef is not None and int(row["musteri_id"]) not in hedef:
+                continue
             kayit_data.append((row["id"], row["musteri_id"], ilaclar))
             mid_set.add(int(row["musteri_id"]))
 
         if not mid_set:
-            bdb.kapat()
+            return 0
+
+        try:
+            from botanik_db import BotanikDB
+            bdb = BotanikDB()
+            if not bdb.baglan():
+                return 0
+        except Exception as e:
+            logger.warning("Yeni alım kontrolü: Botanik DB açılamadı: %s", e)
             return 0
 
         ids_str = ",".join(str(m) for m in mid_set)
@@ -702,52 +749,125 @@ class MesajKuyrugu:
             )
         return silinen
 
+    @staticmethod
+    def _recete_rk_raporlu(rk) -> bool:
+        """ReceteIlaclari.RIRaporKodId → raporlu mu."""
+        try:
+            return int(rk or 0) > 0
+        except (TypeError, ValueError):
+            return False
+
+    @staticmethod
+    def _medula_rk_raporlu(rk) -> bool:
+        """MedulaHastaIlaclari.RaporKodu → raporlu mu."""
+        if rk is None:
+            return False
+        if isinstance(rk, str):
+            return bool(rk.strip())
+        try:
+            return int(rk) > 0
+        except (TypeError, ValueError):
+            return False
+
     @staticmethod
     def _urun_raporlu_mu(bdb, musteri_id: int, urun_adi: str) -> Optional[bool]:
         """Botanik DB'de (musteri_id + urun_adi) için rapor durumu.
         True=raporlu, False=raporsuz, None=bilinmiyor.
         Hem ReceteIlaclari hem MedulaHastaIlaclari kontrol edilir."""
-        try:
-            sql = """
-            SELECT TOP 1 ri.RIRaporKodId AS rk
-            FROM ReceteIlaclari ri
-            INNER JOIN ReceteAna ra ON ra.RxId = ri.RIRxId
-            LEFT  JOIN Urun      u  ON u.UrunId = ri.RIUrunId
-            WHERE ra.RxMusteriId = ?
-              AND LTRIM(RTRIM(u.UrunAdi)) = ?
-              AND ri.RISilme = 0 AND ra.RxSilme = 0
-              AND (ri.RIIade IS NULL OR ri.RIIade = 0)
-            ORDER BY ri.RIBitisTarihi DESC
-            """
-            res = bdb.sorgu_calistir(sql, (musteri_id, urun_adi))
-            if res:
-                rk = res[0].get("rk")
-                try:
-                    return int(rk or 0) > 0
-                except (TypeError, ValueError):
-                    return False
-
-            sql_m = """
-            SELECT TOP 1 mhi.RaporKodu AS rk
-            FROM MedulaHastaIlaclari mhi
-            WHERE mhi.MusteriId = ?
-              AND LTRIM(RTRIM(mhi.UrunAdi)) = ?
-            ORDER BY mhi.VerilecekTarih DESC
-            """
-            res = bdb.sorgu_calistir(sql_m, (musteri_id, urun_adi))
-            if res:
-                rk = res[0].get("rk")
-                if rk is None:
-                    return False
-                if isinstance(rk, str):
-                    return bool(rk.strip())
-                try:
-                    return int(rk) > 0
-                except (TypeError, ValueError):
-                    return False
-        except Exception as e:
-            logger.debug("Rapor durumu sorgu hatası (%s, %s): %s", musteri_id, urun_adi, e)
-        return None
+        durumlar = MesajKuyrugu._urunler_raporlu_mu(bdb, [(musteri_id, urun_adi)])
+        return durumlar.get((int(musteri_id), _urun_anahtari(urun_adi)))
+
+    @staticmethod
+    def _urunler_raporlu_mu(
+        bdb, ciftler: Iterable[Tuple[int, str]], parti: int = RAPOR_SORGU_PARTI
+    ) -> Dict[Tuple[int, str], Optional[bool]]:
+        """_urun_raporlu_mu'nun parti hali: çok sayıda (musteri_id, urun_adi)
+        çifti için rapor durumu, parti başına en fazla iki SELECT ile.
+
+        Her çift için ReceteIlaclari'ndaki en geç bitişli satır (ROW_NUMBER)
+        belirleyicidir; orada hiç satırı olmayan çiftler MedulaHastaIlaclari'nda
+        en geç VerilecekTarih'li satıra bakılarak çözülür.
+
+        Returns: {(musteri_id, _urun_anahtari(urun_adi)): True/False/None}
+        — iki tabloda da bulunmayan ya da sorgusu hata veren çiftler None.
+        Anahtar Türkçe-duyarlı normalizedir (SQL UPPER() 'İ' ↔ Python 'I').
+        IN listesine her ad hem verildiği gibi hem .upper() haliyle gider:
+        Türkçe collation'da 'i' ile 'I' farklı harftir.
+        """
+        orijinal: Dict[str, set] = {}
+        for mid, urun in ciftler:
+            if (urun or "").strip():
+                orijinal.setdefault(_urun_anahtari(urun), set()).update(
+                    (urun.strip(), urun.strip().upper()))
+        istenen = sorted({
+            (int(mid), _urun_anahtari(urun))
+            for mid, urun in ciftler if (urun or "").strip()
+        })
+        sonuc: Dict[Tuple[int, str], Optional[bool]] = {k: None for k in istenen}
+
+        def sorgu_adlari(ciftler_):
+            return sorted({ad for _, u in ciftler_ for ad in orijinal[u]})
+
+        for i in range(0, len(istenen), parti):
+            grup = set(istenen[i:i + parti])
+            ids_str = ",".join(str(m) for m in sorted({m for m, _ in grup}))
+            adlar = sorgu_adlari(grup)
+            yer = ",".join("?" * len(adlar))
+            try:
+                sql = f"""
+                SELECT x.mid, x.urun_adi, x.rk
+                FROM (
+                    SELECT ra.RxMusteriId AS mid,
+                           UPPER(LTRIM(RTRIM(u.UrunAdi))) AS urun_adi,
+                           ri.RIRaporKodId AS rk,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY ra.RxMusteriId, UPPER(LTRIM(RTRIM(u.UrunAdi)))
+                               ORDER BY ri.RIBitisTarihi DESC) AS sira
+                    FROM ReceteIlaclari ri
+                    INNER JOIN ReceteAna ra ON ra.RxId = ri.RIRxId
+                    LEFT  JOIN Urun      u  ON u.UrunId = ri.RIUrunId
+                    WHERE ra.RxMusteriId IN ({ids_str})
+                      AND LTRIM(RTRIM(u.UrunAdi)) IN ({yer})
+                      AND ri.RISilme = 0 AND ra.RxSilme = 0
+                      AND (ri.RIIade IS NULL OR ri.RIIade = 0)
+                ) x
+                WHERE x.sira = 1
+                """
+                bulunan: set = set()
+                for r in bdb.sorgu_calistir(sql, tuple(adlar)):
+                    key = (int(r["mid"]), _urun_anahtari(r["urun_adi"]))
+                    if key in grup:
+                        sonuc[key] = MesajKuyrugu._recete_rk_raporlu(r.get("rk"))
+                        bulunan.add(key)
+
+                kalan = grup - bulunan
+                if not kalan:
+                    continue
+                ids_str = ",".join(str(m) for m in sorted({m for m, _ in kalan}))
+                adlar = sorgu_adlari(kalan)
+                yer = ",".join("?" * len(adlar))
+                sql_m = f"""
+                SELECT x.mid, x.urun_adi, x.rk
+                FROM (
+                    SELECT mhi.MusteriId AS mid,
+                           UPPER(LTRIM(RTRIM(mhi.UrunAdi))) AS urun_adi,
+                           mhi.RaporKodu AS rk,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY mhi.MusteriId, UPPER(LTRIM(RTRIM(mhi.UrunAdi)))
+                               ORDER BY mhi.VerilecekTarih DESC) AS sira
+                    FROM MedulaHastaIlaclari mhi
+                    WHERE mhi.MusteriId IN ({ids_str})
+                      AND LTRIM(RTRIM(mhi.UrunAdi)) IN ({yer})
+                ) x
+                WHERE x.sira = 1
+                """
+                for r in bdb.sorgu_calistir(sql_m, tuple(adlar)):
+                    key = (int(r["mid"]), _urun_anahtari(r["urun_adi"]))
+                    if key in kalan:
+                        sonuc[key] = MesajKuyrugu._medula_rk_raporlu(r.get("rk"))
+            except Exception as e:
+                logger.debug("Toplu rapor durumu sorgu hatası (%d çift): %s", len(grup), e)
+        return sonuc
 
     def hasta_mesajlarini_upsert(
         self, hasta_satirlari: List[Dict], ayarlar: HastaTakipAyarlari,
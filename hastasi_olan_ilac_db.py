@@ -10,8 +10,11 @@ GUVENLIK: Tum sorgular SELECT-only. Botanik EOS veritabanina YAZMA YAPILMAZ.
 """
 
 import logging
+from datetime import date
 from typing import List, Dict, Optional
 
+from dateutil.relativedelta import relativedelta
+
 from botanik_db import BotanikDB
 
 logger = logging.getLogger(__name__)
@@ -283,6 +286,12 @@ class HastasiOlanIlacDB:
         benzersiz = list({int(uid) for uid in urun_ids if uid})
         sonuc: Dict[int, Dict[str, int]] = {}
 
+        # Satis kupu varsa (islem tarihi esasi) ayni dokum bellekten gelir
+        bas = date.today() - relativedelta(months=self.GERIYE_AY)
+        kup = self.db.satis_kupu('islem', bas)
+        if kup is not None:
+            return kup.donemsel(benzersiz, bas=bas, donem='ay', esas='islem')
+
         BATCH = 500
         for i in range(0, len(benzersiz), BATCH):
             chunk = benzersiz[i:i + BATCH]
@@ -0,0 +1,226 @@
+"""
+İnceleme Durum Deposu — aylık reçete incelemesinin dönem bazlı renk durumu (SQLite)
+
+Eskiden tüm dönemlerin renk haritası tek bir JSON dosyasında tutuluyordu
+(aylik_inceleme_state.json): bir dönemi açmak bütün dosyayı okuyup
+ayrıştırıyor, tek bir satırı boyamak bütün dosyayı yeniden yazıyordu — geçmiş
+aylar biriktikçe her yenileme O(geçmiş) iş yapıyordu.
+
+Bu modül aynı durumu (dönem, ri_id) anahtarlı bir SQLite tablosunda tutar:
+  - Okuma noktasaldır: sadece istenen dönemin satırları (birincil anahtar
+    öneki) okunur ve bellekte önbelleklenir.
+  - Yazma farka dayalıdır: dönem haritası önbellekteki haliyle karşılaştırılır,
+    sadece değişen satırlar bekleyen yazma kuyruğuna girer. Kuyruk kısa bir
+    gecikmeyle (debounce) tek transaction'da toplu UPSERT/DELETE olarak
+    yazılır; art arda boyamalar tek diske yazmaya iner.
+  - Beyaz (varsayılan) renk saklanmaz — JSON'daki yer tasarrufu kuralı aynen.
+  - Eski JSON dosyası ilk açılışta bir kez tabloya taşınır, dosya
+    `<ad>.tasindi` olarak yedeklenir.
+
+Kullanım:
+    depo = IncelemeDurumDeposu("aylik_inceleme_state.db",
+                               json_yolu="aylik_inceleme_state.json")
+    renkler = depo.donem_renkleri("2026-09")      # {ri_id: renk}
+    depo.donem_kaydet("2026-09", satir_renkleri)  # farkı kuyruğa al
+    depo.bekleyenleri_yaz()                       # (kapanışta) hemen yaz
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+VARSAYILAN_RENK = "beyaz"
+# Son değişiklikten sonra toplu yazmaya kadar beklenen süre (sn)
+YAZMA_GECIKMESI_SN = 0.5
+_GOC_ANAHTARI = "json_goc"
+
+
+class IncelemeDurumDeposu:
+    """Thread-safe dönem → ri_id → renk deposu (gecikmeli toplu yazma)."""
+
+    def __init__(self, db_yolu, json_yolu=None,
+                 gecikme_sn: float = YAZMA_GECIKMESI_SN,
+                 varsayilan_renk: str = VARSAYILAN_RENK):
+        self.db_yolu = Path(db_yolu)
+        self.gecikme_sn = gecikme_sn
+        self.varsayilan_renk = varsayilan_renk
+        self._lock = threading.RLock()
+        self._onbellek: Dict[str, Dict[str, str]] = {}
+        # (dönem, ri_id) → renk; None = sil
+        self._bekleyen: Dict[tuple, Optional[str]] = {}
+        self._zamanlayici: Optional[threading.Timer] = None
+        self._conn = self._baglan()
+        if json_yolu:
+            self.json_goc(json_yolu)
+
+    def _baglan(self) -> sqlite3.Connection:
+        self.db_yolu.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(self.db_yolu), check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS satir_renk (
+                donem  TEXT NOT NULL,
+                ri_id  TEXT NOT NULL,
+                renk   TEXT NOT NULL,
+                PRIMARY KEY (donem, ri_id)
+            ) WITHOUT ROWID
+            """
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS meta (anahtar TEXT PRIMARY KEY, deger TEXT)")
+        conn.commit()
+        return conn
+
+    # ------------------------------------------------------------ GÖÇ
+    def json_goc(self, json_yolu) -> int:
+        """Eski tek-dosya JSON durumunu bir kez tabloya taşı.
+
+        Tabloda zaten bulunan (dönem, ri_id) kayıtlarına dokunulmaz. Başarılı
+        taşımadan sonra dosya `<ad>.tasindi` olarak yeniden adlandırılır.
+        Returns: taşınan satır sayısı (göç yapılmadıysa 0)."""
+        yol = Path(json_yolu)
+        with self._lock:
+            if self._meta_oku(_GOC_ANAHTARI) or not yol.exists():
+                return 0
+            try:
+                with open(yol, "r", encoding="utf-8") as f:
+                    tum = json.load(f)
+            except Exception as e:
+                logger.warning("Durum JSON okunamadı, göç atlandı: %s", e)
+                return 0
+            kayitlar = []
+            if isinstance(tum, dict):
+                for donem, harita in tum.items():
+                    if not isinstance(harita, dict):
+                        continue
+                    kayitlar.extend(
+                        (str(donem), str(iid), str(renk))
+                        for iid, renk in harita.items()
+                        if renk and renk != self.varsayilan_renk)
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR IGNORE INTO satir_renk (donem, ri_id, renk) "
+                        "VALUES (?, ?, ?)", kayitlar)
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO meta (anahtar, deger) VALUES (?, ?)",
+                        (_GOC_ANAHTARI, str(yol.name)))
+            except Exception as e:
+                logger.error("Durum JSON göçü başarısız: %s", e)
+                return 0
+            self._onbellek.clear()
+        try:
+            os.replace(yol, yol.with_name(yol.name + ".tasindi"))
+        except OSError as e:
+            logger.warning("Taşınan JSON yeniden adlandırılamadı: %s", e)
+        logger.info("Durum JSON → SQLite: %d satır taşındı", len(kayitlar))
+        return len(kayitlar)
+
+    def _meta_oku(self, anahtar: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT deger FROM meta WHERE anahtar=?", (anahtar,)).fetchone()
+        return row[0] if row else None
+
+    # ------------------------------------------------------------ OKUMA
+    def donem_renkleri(self, donem: str) -> Dict[str, str]:
+        """Dönemin kayıtlı (beyaz olmayan) renkleri: {ri_id: renk} (kopya)."""
+        if not donem:
+            return {}
+        with self._lock:
+            return dict(self._donem_haritasi(donem))
+
+    def _donem_haritasi(self, donem: str) -> Dict[str, str]:
+        harita = self._onbellek.get(donem)
+        if harita is None:
+            try:
+                cur = self._conn.execute(
+                    "SELECT ri_id, renk FROM satir_renk WHERE donem=?", (donem,))
+                harita = {str(r[0]): r[1] for r in cur.fetchall()}
+            except Exception as e:
+                logger.warning("Dönem durumu okunamadı (%s): %s", donem, e)
+                harita = {}
+            self._onbellek[donem] = harita
+        return harita
+
+    # ------------------------------------------------------------ YAZMA
+    def donem_kaydet(self, donem: str, renkler: Dict[str, str]) -> int:
+        """Dönemin renk haritasını (tamamı) kaydet — eski JSON'daki
+        "dönemi üzerine yaz" anlamı korunur, ama sadece fark kuyruğa girer.
+
+        Returns: kuyruğa giren değişiklik sayısı."""
+        if not donem:
+            return 0
+        yeni = {str(iid): r for iid, r in renkler.items()
+                if r and r != self.varsayilan_renk}
+        with self._lock:
+            eski = self._donem_haritasi(donem)
+            degisen = 0
+            for iid, renk in yeni.items():
+                if eski.get(iid) != renk:
+                    self._bekleyen[(donem, iid)] = renk
+                    degisen += 1
+            for iid in eski.keys() - yeni.keys():
+                self._bekleyen[(donem, iid)] = None
+                degisen += 1
+            self._onbellek[donem] = yeni
+            if degisen:
+                self._zamanla()
+        return degisen
+
+    def _zamanla(self):
+        if self.gecikme_sn <= 0:
+            self.bekleyenleri_yaz()
+            return
+        if self._zamanlayici is not None:
+            self._zamanlayici.cancel()
+        self._zamanlayici = threading.Timer(self.gecikme_sn, self.bekleyenleri_yaz)
+        self._zamanlayici.daemon = True
+        self._zamanlayici.start()
+
+    def bekleyenleri_yaz(self) -> int:
+        """Bekleyen değişiklikleri tek transaction'da yaz.
+        Returns: yazılan (upsert + silme) satır sayısı."""
+        with self._lock:
+            if self._zamanlayici is not None:
+                self._zamanlayici.cancel()
+                self._zamanlayici = None
+            if not self._bekleyen:
+                return 0
+            bekleyen, self._bekleyen = self._bekleyen, {}
+            ekle = [(d, i, r) for (d, i), r in bekleyen.items() if r is not None]
+            sil = [(d, i) for (d, i), r in bekleyen.items() if r is None]
+            try:
+                with self._conn:
+                    if ekle:
+                        self._conn.executemany(
+                            "INSERT INTO satir_renk (donem, ri_id, renk) "
+                            "VALUES (?, ?, ?) ON CONFLICT(donem, ri_id) "
+                            "DO UPDATE SET renk=excluded.renk", ekle)
+                    if sil:
+                        self._conn.executemany(
+                            "DELETE FROM satir_renk WHERE donem=? AND ri_id=?", sil)
+            except Exception as e:
+                # Yazılamayanlar kaybolmasın — sonraki yazmada tekrar denenir
+                for anahtar, r in bekleyen.items():
+                    self._bekleyen.setdefault(anahtar, r)
+                logger.warning("Durum yazılamadı (%d bekliyor): %s",
+                               len(self._bekleyen), e)
+                return 0
+            return len(ekle) + len(sil)
+
+    def kapat(self):
+        """Bekleyenleri yaz ve bağlantıyı kapat."""
+        with self._lock:
+            self.bekleyenleri_yaz()
+            try:
+                self._conn.close()
+            except Exception:
+                pass
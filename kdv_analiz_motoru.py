@@ -32,6 +32,7 @@ from datetime import date
 from typing import Dict, List, Optional
 
 from botanik_db import BotanikDB
+from sql_tarih_araligi import aralik_kosulu
 
 logger = logging.getLogger(__name__)
 
@@ -190,6 +191,7 @@ def _ekle(oz: Dict[int, OranOzeti], oran: Optional[int], tutar: float,
 
 
 def _elden_satislari_topla(db: BotanikDB, bas: str, bit: str, sonuc: KDVAnalizSonucu):
+    kosul, prm = aralik_kosulu("ea.RxIslemTarihi", bas, bit)
     sql = f"""
     SELECT
         ei.RIToplam AS Tutar,
@@ -201,10 +203,9 @@ def _elden_satislari_topla(db: BotanikDB, bas: str, bit: str, sonuc: KDVAnalizSo
     LEFT JOIN KDV k ON u.UrunKDVId = k.KDVId
     WHERE ea.RxSilme = 0 AND ei.RISilme = 0
       AND (ei.RIIade = 0 OR ei.RIIade IS NULL)
-      AND CAST(ea.RxIslemTarihi AS date) >= '{bas}'
-      AND CAST(ea.RxIslemTarihi AS date) <  '{bit}'
+      AND {kosul}
     """
-    for satir in db.sorgu_calistir(sql):
+    for satir in db.sorgu_calistir(sql, tuple(prm)):
         tutar = float(satir.get("Tutar") or 0)
         if tutar <= 0:
             continue
@@ -221,6 +222,7 @@ def _recete_satislari_topla(db: BotanikDB, bas: str, bit: str, sonuc: KDVAnalizS
     alınan ek için RIIskonto gibi alanlar kullanılır.
     Eczanenin toplam satış cirosu RIToplam (kurum + hasta toplamı) olarak alınır.
     """
+    kosul, prm = aralik_kosulu("ra.RxIslemTarihi", bas, bit)
     sql = f"""
     SELECT
         ri.RIToplam AS Tutar,
@@ -232,10 +234,9 @@ def _recete_satislari_topla(db: BotanikDB, bas: str, bit: str, sonuc: KDVAnalizS
     LEFT JOIN KDV k ON u.UrunKDVId = k.KDVId
     WHERE ra.RxSilme = 0 AND ri.RISilme = 0
       AND (ri.RIIade = 0 OR ri.RIIade IS NULL)
-      AND CAST(ra.RxIslemTarihi AS date) >= '{bas}'
-      AND CAST(ra.RxIslemTarihi AS date) <  '{bit}'
+      AND {kosul}
     """
-    for satir in db.sorgu_calistir(sql):
+    for satir in db.sorgu_calistir(sql, tuple(prm)):
         tutar = float(satir.get("Tutar") or 0)
         if tutar <= 0:
             continue
@@ -251,6 +252,7 @@ def _fatura_cikis_topla(db: BotanikDB, bas: str, bit: str, sonuc: KDVAnalizSonuc
     FaturaCikis: ReceteAna dışı manuel kurum/perakende faturaları.
     Satır bazında KDV oranı FaturaCikisSatir'da yoksa Urun.UrunKDVId üzerinden alınır.
     """
+    kosul, prm = aralik_kosulu("fc.FGFaturaTarihi", bas, bit)
     sql = f"""
     SELECT
         fcs.FSUrunAdet * fcs.FSBirimFiyat AS Tutar,
@@ -259,10 +261,9 @@ def _fatura_cikis_topla(db: BotanikDB, bas: str, bit: str, sonuc: KDVAnalizSonuc
     JOIN FaturaCikisSatir fcs ON fc.FGId = fcs.FSFGId
     JOIN Urun u ON fcs.FSUrunId = u.UrunId
     LEFT JOIN KDV k ON u.UrunKDVId = k.KDVId
-    WHERE CAST(fc.FGFaturaTarihi AS date) >= '{bas}'
-      AND CAST(fc.FGFaturaTarihi AS date) <  '{bit}'
+    WHERE {kosul}
     """
-    for satir in db.sorgu_calistir(sql):
+    for satir in db.sorgu_calistir(sql, tuple(prm)):
         tutar = float(satir.get("Tutar") or 0)
         if tutar <= 0:
             continue
@@ -283,15 +284,15 @@ def _alim_faturalarini_topla(db: BotanikDB, bas: str, bit: str, sonuc: KDVAnaliz
        seviyesindeki KESİN matrah/KDV'ye eşit kalır.
     """
     # 1) Fatura başlık toplamı
+    kosul, prm = aralik_kosulu("fg.FGFaturaTarihi", bas, bit)
     sql_fatura = f"""
     SELECT
         SUM(fg.FGToplamTutar) AS ToplamTutar,
         SUM(fg.FGKDVTutar) AS ToplamKdv
     FROM FaturaGiris fg
-    WHERE fg.FGFaturaTarihi >= '{bas}'
-      AND fg.FGFaturaTarihi <  '{bit}'
+    WHERE {kosul}
     """
-    r = db.sorgu_calistir(sql_fatura)
+    r = db.sorgu_calistir(sql_fatura, tuple(prm))
     if not r or not r[0]:
         return
     toplam_tutar_kdv_dahil = float(r[0].get("ToplamTutar") or 0)
@@ -309,11 +310,10 @@ def _alim_faturalarini_topla(db: BotanikDB, bas: str, bit: str, sonuc: KDVAnaliz
     FROM FaturaGiris fg
     JOIN FaturaSatir fs ON fg.FGId = fs.FSFGId
     LEFT JOIN KDV k ON fs.FSKDVId = k.KDVId
-    WHERE fg.FGFaturaTarihi >= '{bas}'
-      AND fg.FGFaturaTarihi <  '{bit}'
+    WHERE {kosul}
     GROUP BY k.KDVOran
     """
-    satir_sonuc = db.sorgu_calistir(sql_satir)
+    satir_sonuc = db.sorgu_calistir(sql_satir, tuple(prm))
     # Ağırlıklı matrah/KDV pay et: matrahı oran ağırlığına ve KDV'yi
     # (matrah × oran) ağırlığına göre dağıt. Bu sayede:
     #  - sum(matrah_grup) = toplam_matrah
@@ -348,6 +348,7 @@ def _alim_faturalarini_topla(db: BotanikDB, bas: str, bit: str, sonuc: KDVAnaliz
 
 
 def _fis_kesilmis_durumunu_hesapla(db: BotanikDB, bas: str, bit: str, sonuc: KDVAnalizSonucu):
+    kosul, prm = aralik_kosulu("ea.RxIslemTarihi", bas, bit)
     sql = f"""
     SELECT
         ea.RxId,
@@ -358,11 +359,10 @@ def _fis_kesilmis_durumunu_hesapla(db: BotanikDB, bas: str, bit: str, sonuc: KDV
     LEFT JOIN KesilenFisTakibi kft
         ON ea.RxId = kft.KFTIlgiliId AND kft.KFTIlgiliTip = 2 AND kft.KFTFisDurumu = 1
     WHERE ea.RxSilme = 0
-      AND CAST(ea.RxIslemTarihi AS date) >= '{bas}'
-      AND CAST(ea.RxIslemTarihi AS date) <  '{bit}'
+      AND {kosul}
     GROUP BY ea.RxId
     """
-    for satir in db.sorgu_calistir(sql):
+    for satir in db.sorgu_calistir(sql, tuple(prm)):
         tutar = float(satir.get("Tutar") or 0)
         if satir.get("FisVar"):
             sonuc.fis_kesilmis_adet += 1
@@ -377,16 +377,16 @@ def _pos_dagilimini_hesapla(db: BotanikDB, bas: str, bit: str, sonuc: KDVAnalizS
     PosTahsilat: belge tipine göre ne kadar POS girişi var.
     PTIlgiliTipi: 1=Reçete, 2=Elden, 3=FaturaCikis, 99=Diğer.
     """
+    kosul, prm = aralik_kosulu("PTTahsilatTarihi", bas, bit)
     sql = f"""
     SELECT PTIlgiliTipi AS Tip, COUNT(*) AS Adet, SUM(PTTahsilatTutari) AS Tutar
     FROM PosTahsilat
     WHERE ISNULL(PTSilme, 0) = 0
-      AND CAST(PTTahsilatTarihi AS date) >= '{bas}'
-      AND CAST(PTTahsilatTarihi AS date) <  '{bit}'
+      AND {kosul}
     GROUP BY PTIlgiliTipi
     """
     tip_adi = {1: "Reçete", 2: "Elden", 3: "Fatura Çıkış", 99: "Diğer"}
-    for satir in db.sorgu_calistir(sql):
+    for satir in db.sorgu_calistir(sql, tuple(prm)):
         tip = satir.get("Tip")
         sonuc.pos_dagilim[tip] = {
             "ad": tip_adi.get(tip, f"Tip {tip}"),
@@ -619,6 +619,10 @@ class KurulumWizard:
                     "password": password,
                     "trusted_connection": trusted,
                     "trust_server_certificate": True,
+                    # Salt-okuma bağlantı havuzu (botanik_db_havuz.py)
+                    "havuz_maks_boyut": 4,
+                    # Raporlar yerel SQLite aynasından (botanik_ayna.py)
+                    "ayna_raporlari": False,
                     "kurulum_tamamlandi": True
                 }
                 with open(DB_CONFIG_PATH, "w", encoding="utf-8") as f:
@@ -0,0 +1,552 @@
+"""
+Medula sayfasının anlık (snapshot) DOM okuyucusu.
+
+Reçete / rapor sayfası okunurken her alan için ayrı COM çağrısı yapmak
+(getElementsByTagName → item(i) → getAttribute / innerText ...) eleman
+sayısıyla doğrusal sayıda süreçler arası çağrı demektir. Bu modül sayfa
+durumu başına TEK çağrıyla ``documentElement.outerHTML`` alır, HTML'i
+süreç içinde (stdlib html.parser) hafif bir ağaca çevirir ve okuyucular bu
+ağaç üzerinde çalışır. COM / Tk / pywinauto bağımlılığı yoktur; kayıtlı
+sayfalarla (örn. tools/_inceleme_html.html) Linux'ta test edilebilir.
+
+Okuyucular botun bugün kullandığı yapıları döndürür:
+    ilac_tablosu(anlik)            → ilac_tablosu_toplu_oku satır listesi
+    rapor_listesi_satirlari(anlik) → rapor_listesini_topla row_data listeleri
+    hak_sahibi_adi(anlik)          → _hak_sahibi_adini_oku "AD SOYAD"
+    hasta_basligi(anlik)           → reçete sayfası başlık alanları (dict)
+
+Kullanım:
+    doc = bot._get_html_document()
+    anlik = DomAnlik.belgeden(doc)      # outerHTML bir kez okunur
+    if anlik is not None:
+        satirlar = ilac_tablosu(anlik)
+
+ilac_tablosu_com_oku aynı tabloyu eski yoldan (canlı COM DOM'u üzerinde
+eleman eleman) okur; anlık alınamazsa geri dönüş yolu olarak kullanılır.
+"""
+
+import logging
+import re
+import time
+from html.parser import HTMLParser
+
+logger = logging.getLogger(__name__)
+
+# Kapanış etiketi olmayan (boş) elemanlar
+_BOS_ETIKETLER = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+    "meta", "param", "source", "track", "wbr",
+})
+# innerText'e katılmayan içerik
+_ATLANAN = frozenset({"script", "style", "title", "head"})
+# innerText'te satır sonu üreten blok elemanlar
+_BLOK = frozenset({
+    "div", "p", "table", "tbody", "thead", "tfoot", "tr", "ul", "ol", "li",
+    "form", "h1", "h2", "h3", "h4", "h5", "h6", "fieldset",
+})
+# Kapanışı yazılmamış elemanları örtük kapatan açılış etiketleri
+_ORTUK_KAPATIR = {
+    "td": ("td", "th"),
+    "th": ("td", "th"),
+    "tr": ("td", "th", "tr"),
+    "option": ("option",),
+    "li": ("li",),
+    "p": ("p",),
+}
+
+# IE innerText yalnız ASCII boşlukları tekilleştirir (&nbsp; → \xa0 kalır)
+_BOSLUK = re.compile(r"[ \t\r\n\f]+")
+
+RAPOR_TABLOSU = "tableExRaporTeshisList"
+
+# Reçete sayfası başlık alanları: anahtar → HTML id
+BASLIK_ALANLARI = {
+    "recete_no": "f:t13",
+    "karekod_durumu": "f:text21",
+    "kapsam": "f:text29",
+    "fatura_turu": "f:t193",
+    "tc": "f:t18",
+    "ad": "f:t15",
+    "soyad": "f:t16",
+    "recete_tarihi": "f:t29",
+    "ilac_alim_tarihi": "f:t31",
+    "tesis_kodu": "f:t33",
+    "recete_turu": "f:m4",
+    "alt_tur": "f:m8",
+    "protokol_no": "f:t24",
+    "doktor_adi": "f:t41",
+    "doktor_soyadi": "f:t42",
+    "brans": "f:t45",
+}
+
+
+class DomDugum:
+    """Anlık ağaç düğümü: etiket (küçük harf), nitelikler, çocuklar (düğüm / metin)."""
+
+    __slots__ = ("etiket", "nitelikler", "cocuklar", "ust")
+
+    def __init__(self, etiket, nitelikler, ust=None):
+        self.etiket = etiket
+        self.nitelikler = nitelikler
+        self.cocuklar = []
+        self.ust = ust
+
+    def nitelik(self, ad, varsayilan=None):
+        """getAttribute karşılığı (ad büyük/küçük harf duyarsız)."""
+        return self.nitelikler.get(ad.lower(), varsayilan)
+
+    def alt_etiketler(self, etiket):
+        """getElementsByTagName karşılığı: alt ağaçtaki etiketler, belge sırasıyla."""
+        etiket = etiket.lower()
+        sonuc = []
+        yigin = [c for c in reversed(self.cocuklar) if isinstance(c, DomDugum)]
+        while yigin:
+            d = yigin.pop()
+            if d.etiket == etiket:
+                sonuc.append(d)
+            yigin.extend(c for c in reversed(d.cocuklar) if isinstance(c, DomDugum))
+        return sonuc
+
+    @property
+    def metin(self):
+        """innerText yaklaşığı: boşluklar tekilleşir, <br>/blok sınırı satır sonu olur."""
+        parcalar = []
+        _metin_topla(self, parcalar)
+        satirlar = (_BOSLUK.sub(" ", s).strip(" ") for s in "".join(parcalar).split("\n"))
+        return "\n".join(s for s in satirlar if s)
+
+    def __repr__(self):
+        kimlik = self.nitelikler.get("id")
+        return f"<DomDugum {self.etiket}{' #' + kimlik if kimlik else ''}>"
+
+
+def _metin_topla(dugum, parcalar):
+    for c in dugum.cocuklar:
+        if isinstance(c, str):
+            parcalar.append(_BOSLUK.sub(" ", c))
+        elif c.etiket == "br":
+            parcalar.append("\n")
+        elif c.etiket in _ATLANAN:
+            continue
+        elif c.etiket in _BLOK:
+            parcalar.append("\n")
+            _metin_topla(c, parcalar)
+            parcalar.append("\n")
+        elif c.etiket in ("td", "th"):
+            parcalar.append(" ")
+            _metin_topla(c, parcalar)
+            parcalar.append(" ")
+        else:
+            _metin_topla(c, parcalar)
+
+
+class _Ayristirici(HTMLParser):
+    """IE outerHTML'ini (büyük harf etiket, tırnaksız nitelik) ağaca çevirir."""
+
+    def __init__(self, kok):
+        super().__init__(convert_charrefs=True)
+        self.yigin = [kok]
+        self.kimlikler = {}
+        self.etiketler = {}
+
+    def _ac(self, etiket, attrs):
+        ust = self.yigin[-1]
+        dugum = DomDugum(etiket, {k: (v if v is not None else "") for k, v in attrs}, ust)
+        ust.cocuklar.append(dugum)
+        self.etiketler.setdefault(etiket, []).append(dugum)
+        kimlik = dugum.nitelikler.get("id")
+        if kimlik and kimlik not in self.kimlikler:   # getElementById: ilk eşleşme
+            self.kimlikler[kimlik] = dugum
+        return dugum
+
+    def handle_starttag(self, tag, attrs):
+        kapatilan = _ORTUK_KAPATIR.get(tag)
+        if kapatilan:
+            while len(self.yigin) > 1 and self.yigin[-1].etiket in kapatilan:
+                self.yigin.pop()
+        dugum = self._ac(tag, attrs)
+        if tag not in _BOS_ETIKETLER:
+            self.yigin.append(dugum)
+
+    def handle_startendtag(self, tag, attrs):
+        self._ac(tag, attrs)
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.yigin) - 1, 0, -1):
+            if self.yigin[i].etiket == tag:
+                del self.yigin[i:]
+                return
+        # Eşi açık olmayan kapanış etiketi (örn. </BR>) yok sayılır
+
+    def handle_data(self, data):
+        self.yigin[-1].cocuklar.append(data)
+
+
+class DomAnlik:
+    """Bir sayfa durumunun ayrıştırılmış kopyası (id ve etiket indeksli)."""
+
+    def __init__(self, html):
+        self.kok = DomDugum("#document", {})
+        ayristirici = _Ayristirici(self.kok)
+        ayristirici.feed(html or "")
+        ayristirici.close()
+        self._kimlikler = ayristirici.kimlikler
+        self._etiketler = ayristirici.etiketler
+
+    @classmethod
+    def belgeden(cls, doc):
+        """COM IHTMLDocument2'den anlık al (tek outerHTML çağrısı); olmazsa None."""
+        if doc is None:
+            return None
+        try:
+            html = doc.documentElement.outerHTML
+        except Exception as e:
+            logger.debug(f"DOM anlık alınamadı: {type(e).__name__}: {e}")
+            return None
+        if not html:
+            return None
+        return cls(html)
+
+    @property
+    def eleman_sayisi(self):
+        return sum(len(v) for v in self._etiketler.values())
+
+    def eleman(self, kimlik):
+        """getElementById karşılığı; yoksa None."""
+        return self._kimlikler.get(kimlik)
+
+    def etiketler(self, etiket):
+        """document.getElementsByTagName karşılığı (belge sırası)."""
+        return self._etiketler.get(etiket.lower(), [])
+
+    def deger(self, kimlik):
+        """Alanın ekranda görünen değeri; eleman yoksa None.
+
+        INPUT → value, SELECT → seçili seçeneğin metni, diğerleri →
+        innerText (boşsa value niteliği). Sonuç strip edilir.
+        """
+        d = self._kimlikler.get(kimlik)
+        if d is None:
+            return None
+        if d.etiket == "input":
+            return (d.nitelik("value") or "").strip()
+        if d.etiket == "select":
+            secenekler = d.alt_etiketler("option")
+            secili = next((o for o in secenekler if "selected" in o.nitelikler),
+                          secenekler[0] if secenekler else None)
+            return secili.metin.strip() if secili is not None else ""
+        return _icerik(d)
+
+    def metinler(self):
+        """Görünür metin parçaları belge sırasıyla (UIA Text taraması karşılığı)."""
+        return _metin_parcalari(self.kok, [])
+
+
+class AnlikBelge:
+    """Anlığın üzerine IHTMLDocument2 yüzeyi (getElementById, getElementsByTagName,
+    documentElement.outerHTML; elemanlarda getAttribute / innerText / value).
+
+    COM'suz ortamda DOM okuyucularını çalıştırmak için (medula_surucu.TekrarSurucu,
+    testler). Her çağrı `cagri` sayacını artırır ve `gecikme` sn bekler —
+    süreçler arası COM çağrısı bedelinin benzetimi.
+    """
+
+    def __init__(self, html, gecikme=0.0):
+        self._html = html
+        self.anlik = DomAnlik(html)
+        self.gecikme = gecikme
+        self.cagri = 0
+
+    def bekle(self):
+        self.cagri += 1
+        if self.gecikme:
+            son = time.perf_counter() + self.gecikme
+            while time.perf_counter() < son:
+                pass
+
+    def getElementById(self, kimlik):
+        self.bekle()
+        d = self.anlik.eleman(kimlik)
+        return _AnlikEleman(d, self) if d is not None else None
+
+    def getElementsByTagName(self, etiket):
+        self.bekle()
+        return _AnlikListe(self.anlik.etiketler(etiket), self)
+
+    @property
+    def documentElement(self):
+        return _AnlikKok(self)
+
+
+class _AnlikKok:
+    def __init__(self, belge):
+        self._belge = belge
+
+    @property
+    def outerHTML(self):
+        self._belge.bekle()
+        return self._belge._html
+
+
+class _AnlikListe:
+    def __init__(self, dugumler, belge):
+        self._dugumler, self._belge = dugumler, belge
+
+    @property
+    def length(self):
+        self._belge.cagri += 1
+        return len(self._dugumler)
+
+    def item(self, i):
+        self._belge.cagri += 1
+        return _AnlikEleman(self._dugumler[i], self._belge)
+
+
+class _AnlikEleman:
+    def __init__(self, dugum, belge):
+        self._d, self._belge = dugum, belge
+
+    def getAttribute(self, ad):
+        self._belge.bekle()
+        return self._d.nitelik(ad)
+
+    @property
+    def innerText(self):
+        self._belge.bekle()
+        return self._d.metin
+
+    @property
+    def value(self):
+        self._belge.bekle()
+        return self._d.nitelik("value") or ""
+
+    def getElementsByTagName(self, etiket):
+        self._belge.bekle()
+        return _AnlikListe(self._d.alt_etiketler(etiket), self._belge)
+
+
+def _metin_parcalari(dugum, sonuc):
+    yigin = [iter(dugum.cocuklar)]
+    while yigin:
+        c = next(yigin[-1], None)
+        if c is None:
+            yigin.pop()
+        elif isinstance(c, str):
+            metin = _BOSLUK.sub(" ", c).strip()
+            if metin:
+                sonuc.append(metin)
+        elif c.etiket not in _ATLANAN:
+            yigin.append(iter(c.cocuklar))
+    return sonuc
+
+
+def _icerik(d):
+    """(elem.innerText or elem.getAttribute("value") or "").strip() karşılığı."""
+    return (d.metin or d.nitelik("value") or "").strip()
+
+
+# ── İlaç tablosu (f:tbl1) ──────────────────────────────────────────────────
+
+def _eos_hucreleri(satir_hucreleri):
+    """Skyblue (BotanikEOS enjeksiyonu) satırının hücre (metin, stil) çiftlerinden EOS bilgisi."""
+    eos = {'rapor_dozu': None, 'arka_plan': None, 'doz_uygun': None,
+           'sgk_etkin_madde': None, 'sgk_kodu': None, 'etkin_madde': None}
+    for cell_text, cell_style in satir_hucreleri:
+        if not cell_text:
+            continue
+        if "background-color" in cell_style.lower() and "x" in cell_text.lower():
+            eos['rapor_dozu'] = cell_text
+            sl = cell_style.lower()
+            if "lightgreen" in sl:
+                eos['arka_plan'] = "lightgreen"
+                eos['doz_uygun'] = True
+            elif "lightcoral" in sl or "red" in sl:
+                eos['arka_plan'] = "lightcoral"
+                eos['doz_uygun'] = False
+            elif "yellow" in sl or "goldenrod" in sl:
+                eos['arka_plan'] = "yellow"
+                eos['doz_uygun'] = None
+        elif "SGK" in cell_text.upper() and "-" in cell_text:
+            eos['sgk_etkin_madde'] = cell_text
+            parts = cell_text.split("-", 1)
+            eos['sgk_kodu'] = parts[0].strip()
+            eos['etkin_madde'] = parts[1].strip() if len(parts) > 1 else None
+    return eos
+
+
+def _ilac_satiri(i, barkod, ilac_adi, msj, rapor_kodu, eos):
+    return {
+        'satir': i,
+        'barkod': barkod.strip(),
+        'ilac_adi': ilac_adi,
+        'msj': msj,
+        'rapor_kodu': rapor_kodu,
+        'eos_rapor_dozu': eos.get('rapor_dozu'),
+        'eos_arka_plan': eos.get('arka_plan'),
+        'eos_doz_uygun': eos.get('doz_uygun'),
+        'eos_sgk_etkin_madde': eos.get('sgk_etkin_madde'),
+        'eos_sgk_kodu': eos.get('sgk_kodu'),
+        'eos_etkin_madde': eos.get('etkin_madde'),
+    }
+
+
+def ilac_tablosu(anlik, max_satir=20):
+    """İlaç tablosu satırları — ilac_tablosu_toplu_oku ile aynı yapı.
+
+    Returns:
+        list[dict]: satir, barkod, ilac_adi, msj, rapor_kodu ve eos_* alanları
+    """
+    eos_bilgileri = {}
+    skyblue_idx = 0
+    for row in anlik.etiketler("tr"):
+        if "skyblue" not in (row.nitelik("style") or "").lower():
+            continue
+        eos_bilgileri[skyblue_idx] = _eos_hucreleri(
+            (cell.metin.strip(), cell.nitelik("style") or "")
+            for cell in row.alt_etiketler("td"))
+        skyblue_idx += 1
+
+    satirlar = []
+    for i in range(max_satir):
+        barkod_elem = anlik.eleman(f"f:tbl1:{i}:t1")
+        if barkod_elem is None:
+            break
+        barkod = barkod_elem.nitelik("value") or ""
+        if not barkod.strip():
+            break
+        ilac_elem = anlik.eleman(f"f:tbl1:{i}:t6")
+        ilac_adi = _icerik(ilac_elem) if ilac_elem is not None else None
+        msj_elem = anlik.eleman(f"f:tbl1:{i}:t11")
+        msj = _icerik(msj_elem) if msj_elem is not None else None
+        rapor_elem = anlik.eleman(f"f:tbl1:{i}:t9")
+        rapor_kodu = (_icerik(rapor_elem) or None) if rapor_elem is not None else None
+        satirlar.append(_ilac_satiri(i, barkod, ilac_adi, msj, rapor_kodu,
+                                     eos_bilgileri.get(i, {})))
+    return satirlar
+
+
+def ilac_tablosu_com_oku(doc, max_satir=20):
+    """Aynı tabloyu canlı COM DOM'undan eleman eleman okur (anlık alınamazsa)."""
+    eos_bilgileri = {}
+    try:
+        rows = doc.getElementsByTagName("TR")
+        skyblue_idx = 0
+        for i in range(rows.length):
+            row = rows.item(i)
+            if not row:
+                continue
+            style = row.getAttribute("style") or ""
+            if "skyblue" not in style.lower():
+                continue
+            hucreler = []
+            cells = row.getElementsByTagName("TD")
+            for j in range(cells.length):
+                cell = cells.item(j)
+                if cell:
+                    hucreler.append(((cell.innerText or "").strip(),
+                                     cell.getAttribute("style") or ""))
+            eos_bilgileri[skyblue_idx] = _eos_hucreleri(hucreler)
+            skyblue_idx += 1
+    except Exception as e:
+        logger.debug(f"EOS bilgileri okuma hatası: {e}")
+
+    satirlar = []
+    for i in range(max_satir):
+        barkod_elem = doc.getElementById(f"f:tbl1:{i}:t1")
+        if not barkod_elem:
+            break
+        barkod = barkod_elem.getAttribute("value") or ""
+        if not barkod.strip():
+            break
+
+        ilac_adi = None
+        ilac_elem = doc.getElementById(f"f:tbl1:{i}:t6")
+        if ilac_elem:
+            ilac_adi = (ilac_elem.innerText or ilac_elem.getAttribute("value") or "").strip()
+
+        msj = None
+        msj_elem = doc.getElementById(f"f:tbl1:{i}:t11")
+        if msj_elem:
+            msj = (msj_elem.innerText or msj_elem.getAttribute("value") or "").strip()
+
+        rapor_kodu = None
+        rapor_elem = doc.getElementById(f"f:tbl1:{i}:t9")
+        if rapor_elem:
+            rapor_kodu = (rapor_elem.innerText or rapor_elem.getAttribute("value") or "").strip()
+            if not rapor_kodu:
+                rapor_kodu = None
+
+        satirlar.append(_ilac_satiri(i, barkod, ilac_adi, msj, rapor_kodu,
+                                     eos_bilgileri.get(i, {})))
+    return satirlar
+
+
+# ── Rapor listesi (RaporListe.jsp) ─────────────────────────────────────────
+
+def rapor_satirlarini_grupla(metinler):
+    """Metin dizisini 9 haneli Rapor Takip No ile başlayan satırlara böler.
+
+    rapor_listesini_topla'daki kural: satır en az 4 değer, en fazla 8 değer.
+    """
+    rapor_satir_verileri = []
+    current_row = []
+    for text in metinler:
+        text = text.strip()
+        if not text:
+            continue
+        if text.isdigit() and len(text) == 9:
+            if current_row and len(current_row) >= 4:
+                rapor_satir_verileri.append(current_row)
+            current_row = [text]
+        elif current_row:
+            if len(current_row) < 8:
+                current_row.append(text)
+    if current_row and len(current_row) >= 4:
+        rapor_satir_verileri.append(current_row)
+    return rapor_satir_verileri
+
+
+def rapor_listesi_satirlari(anlik):
+    """Rapor tablosunun satırları (_parse_rapor_satiri_v2'ye verilecek row_data listeleri).
+
+    Tablo id'si (form1:tableExRaporTeshisList) varsa yalnız onun hücreleri,
+    yoksa sayfanın tüm görünür metinleri gruplanır.
+    """
+    tablo = next((t for t in anlik.etiketler("table")
+                  if RAPOR_TABLOSU in (t.nitelik("id") or "")), None)
+    if tablo is None:
+        return rapor_satirlarini_grupla(anlik.metinler())
+    return rapor_satirlarini_grupla(_metin_parcalari(tablo, []))
+
+
+def hak_sahibi_adi(anlik):
+    """"Adı / Soyadı" etiketini izleyen ilk iki alfabetik metin; yoksa "Bilinmeyen"."""
+    metinler = anlik.metinler()
+    ad_aday = soyad_aday = None
+    for i, text in enumerate(metinler):
+        if "Adı" in text and "Soyadı" in text:
+            for next_text in metinler[i + 1:i + 5]:
+                if next_text != ":" and len(next_text) < 30 \
+                        and next_text.replace(" ", "").isalpha():
+                    if not ad_aday:
+                        ad_aday = next_text
+                    elif not soyad_aday:
+                        soyad_aday = next_text
+                        break
+            if ad_aday and soyad_aday:
+                return f"{ad_aday} {soyad_aday}"
+    return "Bilinmeyen"
+
+
+# ── Reçete sayfası başlığı ─────────────────────────────────────────────────
+
+def hasta_basligi(anlik):
+    """Reçete sayfası başlık alanları; sayfada olmayan alan None.
+
+    Ek anahtarlar: ad_soyad ("AD SOYAD"), doktor ("AD SOYAD").
+    """
+    baslik = {anahtar: anlik.deger(kimlik) for anahtar, kimlik in BASLIK_ALANLARI.items()}
+    baslik["ad_soyad"] = " ".join(p for p in (baslik["ad"], baslik["soyad"]) if p) or None
+    baslik["doktor"] = " ".join(
+        p for p in (baslik["doktor_adi"], baslik["doktor_soyadi"]) if p) or None
+    return baslik
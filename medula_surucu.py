@@ -0,0 +1,440 @@
+"""
+Medula sürücüsü: oturum kaydı ve tekrar oynatma.
+
+recete_akisi'ndaki akışlar Medula'ya yalnız `bot` sürücüsü üzerinden erişir.
+Gerçek sürücü BotanikBot'tur (pywinauto + IE COM). Bu modül iki sürücü daha
+sağlar:
+
+    KayitSurucu(bot, dizin)  → gerçek botu sarar; akışın çağırdığı her
+                               adımın sonucunu ve süresini, adımdan sonraki
+                               sayfa HTML'ini ve okunan kontrol ağacı
+                               metinlerini fikstür dizinine yazar
+    TekrarSurucu(dizin)      → fikstürü tekrar oynatır: adım sonuçlarını
+                               kayıttaki sırayla, ayarlanabilir gecikmeyle
+                               döndürür; HTML anlıklarını ve kontrol
+                               ağaçlarını benzetir (COM / pywinauto gerekmez)
+
+Böylece reçete başı gecikme bütçesi (reçete/dakika, adım süreleri) eczane
+bilgisayarı dışında, Linux'ta ölçülebilir.
+
+Fikstür dizini:
+    oturum.jsonl          her satır bir olay (ekleme_gunlugu biçimi):
+                          {"ad": adım, "sonuc": ..., "sure": sn, "sayfa": özet}
+                          {"ad": adım, "hata": sınıf, "mesaj": ...}
+                          {"pencere": "descendants", "tur": ..., "metinler": [...]}
+                          {"pencere": "window_text", "metin": ...}
+    sayfalar/<özet>.html  adım sonrası documentElement.outerHTML
+    zamanlama.json        kayıt anındaki timing ayarları
+
+Kayıt modu GUI'de ECZASIST_MEDULA_KAYIT=<dizin> ortam değişkeniyle açılır
+(kayit_surucusu_sar).
+
+Kullanım:
+    surucu = TekrarSurucu("fikstur/", gecikme_carpani=1.0, bekleme_carpani=0)
+    tek_recete_isle(surucu, 1, None, grup="A")
+    print(verim_ozeti(recete_sureleri, surucu.timing.olcumler))
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+
+from bekleme_motoru import BeklemeMotoru
+from ekleme_gunlugu import EklemeGunlugu
+
+logger = logging.getLogger(__name__)
+
+KAYIT_ORTAM_DEGISKENI = "ECZASIST_MEDULA_KAYIT"
+
+# Akışların sürücüde çağırdığı, sonucu kaydedilip tekrar oynatılan adımlar.
+# Sürücü ayrıca bekle, tus_gonder, timed_sleep, retry_with_popup_check,
+# timing, main_window, medula_hwnd / medula_pid ve _get_html_document sağlar.
+SURUCU_ADIMLARI = (
+    "baglanti_kur",
+    "bizden_alinanlarin_sec_tusuna_tikla",
+    "bulunamadi_mesaji_kontrol",
+    "cikis_butonu_var_mi",
+    "donem_sec",
+    "geri_don_butonuna_tikla",
+    "grup_butonuna_tikla",
+    "ilac_butonuna_tikla",
+    "ilac_cakismasi_uyarisini_kapat",
+    "ilac_ekrani_yuklendi_mi",
+    "ilac_listesi_penceresini_kapat",
+    "ilk_ilaca_sag_tik_ve_takip_et",
+    "ilk_recete_ac",
+    "kritik_popup_kontrol_ve_kapat",
+    "laba_lama_uyarisini_kapat",
+    "medula_ac_ve_giris_yap",
+    "medula_taskkill",
+    "rapor_listesini_topla",
+    "recete_kaydi_var_mi_kontrol_hizli",
+    "recete_listesi_ac",
+    "recete_no_yaz",
+    "recete_sayfasi_hizli_tarama",
+    "recete_sorgu_ac_kademeli",
+    "recete_telefon_kontrol_birlesik",
+    "recete_turu_oku",
+    "sadece_doz_kontrolu",
+    "sonra_butonuna_tikla",
+    "sorgula_butonuna_tikla",
+    "tesis_numarasi_oku",
+    "textboxlara_122_yaz",
+    "uyari_penceresini_kapat",
+    "y_tusuna_tikla",
+    "yeni_pencereyi_bul",
+)
+
+
+# ── Sonuç kodlama ──────────────────────────────────────────────────────────
+
+def _kodla(deger):
+    """Adım sonucunu JSON'a çevir; UI kontrolleri metinleriyle saklanır."""
+    if deger is None or isinstance(deger, (bool, int, float, str)):
+        return deger
+    if isinstance(deger, (list, tuple)):
+        return [_kodla(d) for d in deger]
+    if isinstance(deger, dict):
+        return {str(k): _kodla(v) for k, v in deger.items()}
+    try:
+        metin = deger.window_text()
+    except Exception:
+        metin = ""
+    return {"__kontrol__": metin}
+
+
+def _coz(deger):
+    if isinstance(deger, list):
+        return [_coz(d) for d in deger]
+    if isinstance(deger, dict):
+        if set(deger) == {"__kontrol__"}:
+            return SahteKontrol(deger["__kontrol__"])
+        return {k: _coz(v) for k, v in deger.items()}
+    return deger
+
+
+class SahteKontrol:
+    """Kayıttaki UI kontrolünün yerine geçen nesne (exists / click_input / window_text)."""
+
+    def __init__(self, metin=""):
+        self.metin = metin
+        self.tiklama = 0
+
+    def window_text(self):
+        return self.metin
+
+    def exists(self, timeout=0):
+        return True
+
+    def click_input(self, *args, **kwargs):
+        self.tiklama += 1
+
+    def __repr__(self):
+        return f"<SahteKontrol {self.metin!r}>"
+
+
+# ── Kayıt ──────────────────────────────────────────────────────────────────
+
+class _KayitPencere:
+    """main_window vekili: descendants / window_text sonuçlarını kaydeder."""
+
+    def __init__(self, pencere, kayit):
+        self._pencere = pencere
+        self._kayit = kayit
+
+    def descendants(self, **kosullar):
+        kontroller = self._pencere.descendants(**kosullar)
+        metinler = []
+        for k in kontroller:
+            try:
+                metinler.append(k.window_text())
+            except Exception:
+                metinler.append("")
+        self._kayit._yaz({"pencere": "descendants",
+                          "tur": kosullar.get("control_type", ""), "metinler": metinler})
+        return kontroller
+
+    def window_text(self):
+        metin = self._pencere.window_text()
+        self._kayit._yaz({"pencere": "window_text", "metin": metin})
+        return metin
+
+    def __getattr__(self, ad):
+        return getattr(self._pencere, ad)
+
+
+class KayitSurucu:
+    """Gerçek sürücüyü (BotanikBot) sarıp oturumu fikstür dizinine kaydeder."""
+
+    def __init__(self, bot, dizin):
+        object.__setattr__(self, "_bot", bot)
+        object.__setattr__(self, "dizin", Path(dizin))
+        object.__setattr__(self, "_sayfalar", set())
+        (self.dizin / "sayfalar").mkdir(parents=True, exist_ok=True)
+        object.__setattr__(self, "_gunluk", EklemeGunlugu(self.dizin / "oturum.jsonl"))
+        self._sayfalar.update(p.stem for p in (self.dizin / "sayfalar").glob("*.html"))
+        try:
+            zamanlama = dict(bot.timing.ayarlar)
+            (self.dizin / "zamanlama.json").write_text(
+                json.dumps(zamanlama, ensure_ascii=False, indent=1), encoding="utf-8")
+        except Exception as e:
+            logger.debug(f"Zamanlama ayarları kaydedilemedi: {e}")
+
+    def _yaz(self, kayit):
+        try:
+            self._gunluk.ekle(kayit)
+        except Exception as e:
+            logger.debug(f"Oturum kaydı yazılamadı: {e}")
+
+    def _sayfa_kaydet(self):
+        """Geçerli sayfanın outerHTML'ini içerik özetiyle sakla; özet döner."""
+        try:
+            doc = self._bot._get_html_document(timeout=0)
+            html = doc.documentElement.outerHTML if doc else None
+        except Exception:
+            html = None
+        if not html:
+            return None
+        ozet = hashlib.sha1(html.encode("utf-8", "replace")).hexdigest()[:16]
+        if ozet not in self._sayfalar:
+            (self.dizin / "sayfalar" / f"{ozet}.html").write_text(html, encoding="utf-8")
+            self._sayfalar.add(ozet)
+        return ozet
+
+    def _adim(self, ad, fn):
+        def kayitli(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                sonuc = fn(*args, **kwargs)
+            except Exception as e:
+                self._yaz({"ad": ad, "hata": type(e).__name__, "mesaj": str(e),
+                           "sure": time.perf_counter() - t0, "sayfa": self._sayfa_kaydet()})
+                raise
+            sure = time.perf_counter() - t0
+            self._yaz({"ad": ad, "sonuc": _kodla(sonuc), "sure": sure,
+                       "sayfa": self._sayfa_kaydet()})
+            return sonuc
+        return kayitli
+
+    def __getattr__(self, ad):
+        deger = getattr(self._bot, ad)
+        if ad in SURUCU_ADIMLARI:
+            return self._adim(ad, deger)
+        if ad == "main_window" and deger is not None:
+            return _KayitPencere(deger, self)
+        return deger
+
+    def __setattr__(self, ad, deger):
+        # Akış main_window'u geri yüklerken vekili değil gerçek pencereyi yaz
+        if isinstance(deger, _KayitPencere):
+            deger = deger._pencere
+        setattr(self._bot, ad, deger)
+
+    def kapat(self):
+        self._gunluk.kapat()
+
+
+def kayit_surucusu_sar(bot):
+    """ECZASIST_MEDULA_KAYIT tanımlıysa botu KayitSurucu ile sar (bot başına bir kez)."""
+    dizin = os.environ.get(KAYIT_ORTAM_DEGISKENI, "").strip()
+    if not dizin or bot is None:
+        return bot
+    surucu = getattr(bot, "_kayit_surucusu", None)
+    if surucu is None:
+        surucu = KayitSurucu(bot, dizin)
+        bot._kayit_surucusu = surucu
+        logger.info(f"Medula oturum kaydı: {dizin}")
+    return surucu
+
+
+# ── Tekrar oynatma ─────────────────────────────────────────────────────────
+
+class _Zamanlama:
+    """timing_settings yerine: kayıttaki ayarlar + bellek içi ölçümler."""
+
+    def __init__(self, ayarlar=None):
+        self.ayarlar = dict(ayarlar or {})
+        self.olcumler = {}
+        self.bekleme = BeklemeMotoru()
+
+    def get(self, anahtar, varsayilan=0.1):
+        return self.ayarlar.get(anahtar, varsayilan)
+
+    def kayit_ekle(self, anahtar, gercek_sure):
+        self.olcumler.setdefault(anahtar, []).append(gercek_sure)
+        self.bekleme.kaydet(anahtar, gercek_sure)
+
+    def kosul_bekle(self, kosul, anahtar=None, **kwargs):
+        return self.bekleme.kosul_bekle(kosul, anahtar, **kwargs)
+
+
+class _TekrarPencere:
+    """main_window benzetimi: kayıttaki kontrol ağacı metinlerini döndürür."""
+
+    def __init__(self, surucu):
+        self._surucu = surucu
+        self.odak = 0
+
+    def descendants(self, **kosullar):
+        metinler = self._surucu._pencere_olayi(("descendants", kosullar.get("control_type", "")))
+        return [SahteKontrol(m) for m in (metinler or [])]
+
+    def window_text(self):
+        return self._surucu._pencere_olayi(("window_text", None)) or "MEDULA"
+
+    def set_focus(self):
+        self.odak += 1
+
+
+class TekrarSurucu:
+    """Fikstür dizinindeki oturumu tekrar oynatan sürücü.
+
+    Her adım, kayıtta o adıma ait sıradaki sonucu döndürür (adım başına
+    ayrı sıra; sona gelince başa sarar). Yanıt gecikmesi kayıttaki süre ×
+    gecikme_carpani'dır; `gecikmeler` adım adına sabit saniye verir.
+    Akışın sabit beklemeleri (bot.bekle / timed_sleep) bekleme_carpani ile
+    ölçeklenir (0 → beklemesiz).
+    """
+
+    def __init__(self, dizin, gecikme_carpani=1.0, gecikmeler=None, bekleme_carpani=1.0):
+        self.dizin = Path(dizin)
+        self.gecikme_carpani = gecikme_carpani
+        self.gecikmeler = dict(gecikmeler or {})
+        self.bekleme_carpani = bekleme_carpani
+        self._adimlar = {}
+        self._pencere = {}
+        self._sira = {}
+        for kayit in EklemeGunlugu(self.dizin / "oturum.jsonl").oku():
+            if "pencere" in kayit:
+                anahtar = (kayit["pencere"], kayit.get("tur"))
+                self._pencere.setdefault(anahtar, []).append(
+                    kayit.get("metinler", kayit.get("metin")))
+            elif "ad" in kayit:
+                self._adimlar.setdefault(kayit["ad"], []).append(kayit)
+        zamanlama = self.dizin / "zamanlama.json"
+        ayarlar = json.loads(zamanlama.read_text(encoding="utf-8")) if zamanlama.exists() else {}
+        self.timing = _Zamanlama(ayarlar)
+        self.main_window = _TekrarPencere(self)
+        self.medula_hwnd = None
+        self.medula_pid = None
+        self.sayfa = None
+        self.gonderilen_tuslar = []
+        self.cagrilar = []          # (adım, süre) — tekrar oynatılan her çağrı
+        self._html_onbellek = {}
+
+    # -- kayıttan okuma --
+
+    def _sonraki(self, anahtar, liste):
+        i = self._sira.get(anahtar, 0)
+        self._sira[anahtar] = i + 1
+        return liste[i % len(liste)]
+
+    def _pencere_olayi(self, anahtar):
+        liste = self._pencere.get(anahtar)
+        return self._sonraki(anahtar, liste) if liste else None
+
+    def _adim(self, ad):
+        def tekrar(*args, **kwargs):
+            kayitlar = self._adimlar.get(ad)
+            if not kayitlar:
+                logger.debug(f"Tekrar: '{ad}' kayıtta yok")
+                return None
+            kayit = self._sonraki(ad, kayitlar)
+            gecikme = self.gecikmeler.get(ad, kayit.get("sure", 0.0) * self.gecikme_carpani)
+            if gecikme > 0:
+                time.sleep(gecikme)
+            self.cagrilar.append((ad, gecikme))
+            if kayit.get("sayfa"):
+                self.sayfa = kayit["sayfa"]
+            if "hata" in kayit:
+                from recete_akisi import SistemselHataException
+                sinif = (SistemselHataException if kayit["hata"] == "SistemselHataException"
+                         else RuntimeError)
+                raise sinif(kayit.get("mesaj", ""))
+            return _coz(kayit.get("sonuc"))
+        return tekrar
+
+    def __getattr__(self, ad):
+        if ad in SURUCU_ADIMLARI:
+            return self._adim(ad)
+        raise AttributeError(ad)
+
+    def basa_sar(self):
+        """Tüm adım sıralarını başa al (oturumu baştan oynatmak için)."""
+        self._sira.clear()
+
+    # -- sürücü yardımcıları --
+
+    def bekle(self, saniye):
+        if saniye and self.bekleme_carpani:
+            time.sleep(saniye * self.bekleme_carpani)
+
+    def timed_sleep(self, key, default=0.1):
+        self.bekle(self.timing.get(key, default))
+
+    def tus_gonder(self, tuslar):
+        self.gonderilen_tuslar.append(tuslar)
+
+    def retry_with_popup_check(self, operation_func, operation_name, max_retries=5, critical=True):
+        """BotanikBot.retry_with_popup_check'in popup'sız karşılığı."""
+        for _ in range(max_retries):
+            if operation_func():
+                return True
+        if critical:
+            from recete_akisi import SistemselHataException
+            raise SistemselHataException(f"{operation_name} tüm denemeler sonrası başarısız")
+        return False
+
+    def sayfa_html(self):
+        """Geçerli sayfanın kayıttaki HTML'i (yoksa None)."""
+        if not self.sayfa:
+            return None
+        html = self._html_onbellek.get(self.sayfa)
+        if html is None:
+            yol = self.dizin / "sayfalar" / f"{self.sayfa}.html"
+            if not yol.exists():
+                return None
+            html = self._html_onbellek[self.sayfa] = yol.read_text(encoding="utf-8")
+        return html
+
+    def _get_html_document(self, timeout=1):
+        from medula_dom_anlik import AnlikBelge
+        html = self.sayfa_html()
+        return AnlikBelge(html) if html else None
+
+    def dom_anlik_al(self, timeout=1):
+        from medula_dom_anlik import DomAnlik
+        html = self.sayfa_html()
+        return DomAnlik(html) if html else None
+
+
+# ── Verim özeti ────────────────────────────────────────────────────────────
+
+def verim_ozeti(recete_sureleri, olcumler=None):
+    """Reçete süreleri (sn) ve adım ölçümlerinden (timing anahtarı → [sn]) özet.
+
+    Returns:
+        dict: recete_sayisi, toplam_sn, recete_dakika, ort_sn,
+              adimlar: {anahtar: {adet, ort_ms, p95_ms, toplam_ms}}
+    """
+    toplam = sum(recete_sureleri)
+    adimlar = {}
+    for anahtar, sureler in sorted((olcumler or {}).items()):
+        sirali = sorted(sureler)
+        p95 = sirali[min(len(sirali) - 1, int(round(0.95 * (len(sirali) - 1))))]
+        adimlar[anahtar] = {
+            "adet": len(sirali),
+            "ort_ms": round(sum(sirali) / len(sirali) * 1000, 1),
+            "p95_ms": round(p95 * 1000, 1),
+            "toplam_ms": round(sum(sirali) * 1000, 1),
+        }
+    return {
+        "recete_sayisi": len(recete_sureleri),
+        "toplam_sn": round(toplam, 3),
+        "recete_dakika": round(len(recete_sureleri) * 60 / toplam, 1) if toplam > 0 else 0.0,
+        "ort_sn": round(toplam / len(recete_sureleri), 3) if recete_sureleri else 0.0,
+        "adimlar": adimlar,
+    }
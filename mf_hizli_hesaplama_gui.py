@@ -1814,16 +1814,9 @@ class MFHizliHesaplamaGUI:
         npv_toplu = (alinan * maliyet) / ((1 + gunluk_faiz) ** toplu_odeme_gun)
 
         # Zam kazancı
-        zam_kazanc = 0
-        if zam_orani > 0 and zam_gun > 0:
-            zam_oncesi_tuketim = min(toplam_stok, zam_gun * gunluk_sarf)
-            zam_sonrasi_miktar = max(0, toplam_stok - zam_oncesi_tuketim)
-
-            if zam_sonrasi_miktar > 0:
-                zam_fark = maliyet * (zam_orani / 100)
-                ort_satis_gun = zam_gun + (zam_sonrasi_miktar / gunluk_sarf / 2) if gunluk_sarf > 0 else zam_gun
-                iskonto = (1 + gunluk_faiz) ** ort_satis_gun
-                zam_kazanc = (zam_sonrasi_miktar * zam_fark) / iskonto
+        import zam_npv_motoru
+        zam_kazanc = zam_npv_motoru.zam_kazanci(toplam_stok, maliyet, aylik_ort, faiz_yillik,
+                                                zam_gun, zam_orani)
 
         kazanc = npv_aylik - npv_toplu + zam_kazanc
 
@@ -1849,21 +1842,32 @@ class MFHizliHesaplamaGUI:
         # Zam tarihine kadar tüketilebilecek miktar
         zam_oncesi_tuketim = zam_gun * gunluk_sarf
 
-        # Farklı miktarlar için kar hesapla
-        sonuclar = []
+        # Farklı miktarlar için kar hesapla (_npv_mf_hesapla ile aynı, tek taramada)
         max_miktar = int(aylik_ort * 6)  # Max 6 aylık
+        miktarlar = list(range(int(gunluk_sarf), max_miktar + 1, max(1, int(gunluk_sarf / 2))))
 
-        for miktar in range(int(gunluk_sarf), max_miktar + 1, max(1, int(gunluk_sarf / 2))):
-            npv_sonuc = self._npv_mf_hesapla(
-                alinan=miktar, bedava=0, maliyet=maliyet, aylik_ort=aylik_ort,
-                mevcut_stok=stok, faiz_yillik=faiz, depo_vade=depo_vade,
-                zam_gun=zam_gun, zam_orani=zam_orani
-            )
+        import zam_npv_motoru
+        if maliyet > 0 and miktarlar:
+            npv_aylik = zam_npv_motoru.aylik_npv_egrileri([{
+                'miktarlar': miktarlar, 'maliyet': maliyet, 'aylik_ort': aylik_ort,
+                'mevcut_stok': stok, 'zam_gun': zam_gun, 'zam_orani': zam_orani,
+                'faiz_yillik': faiz, 'depo_vade': depo_vade
+            }], sema='takvim')[0]
+            toplu_iskonto = zam_npv_motoru.toplu_iskonto(faiz, depo_vade, sema='takvim')
+
+        sonuclar = []
+        for i, miktar in enumerate(miktarlar):
+            kar = 0
+            if miktar > 0 and maliyet > 0:
+                npv_toplu = (miktar * maliyet) / toplu_iskonto
+                zam_kazanc = zam_npv_motoru.zam_kazanci(stok + miktar, maliyet, aylik_ort,
+                                                        faiz, zam_gun, zam_orani)
+                kar = round(float(npv_aylik[i]) - npv_toplu + zam_kazanc, 2)
             yatirim = miktar * maliyet
-            roi = (npv_sonuc['kazanc'] / yatirim * 100) if yatirim > 0 else 0
+            roi = (kar / yatirim * 100) if yatirim > 0 else 0
             sonuclar.append({
                 'miktar': miktar,
-                'kar': npv_sonuc['kazanc'],
+                'kar': kar,
                 'roi': roi
             })
 
@@ -1901,96 +1905,25 @@ class MFHizliHesaplamaGUI:
         if zam_gun <= 0 or zam_orani <= 0:
             return None
 
-        aylik_faiz = (faiz / 100) / 12
-        gunluk_faiz = (1 + aylik_faiz) ** (1/30) - 1
-        gunluk_sarf = aylik_ort / 30
-
         max_miktar = int(aylik_ort * 12)
         if max_miktar < 50:
             max_miktar = 200
 
-        miktarlar, kazanclar, roi_ler = [], [], []
-
-        for test_miktar in range(0, max_miktar + 1):
-            if test_miktar == 0:
-                miktarlar.append(0)
-                kazanclar.append(0)
-                roi_ler.append(0)
-                continue
-
-            # NPV hesabı
-            kalan_mevcut = stok
-            kalan_yeni = test_miktar
-            npv_aylik = 0
-
-            gun = 0
-            while kalan_yeni > 0 and gun < 720:
-                harcanan = gunluk_sarf
-                mevcut_harcanan = min(kalan_mevcut, harcanan)
-                kalan_mevcut -= mevcut_harcanan
-                yeni_harcanan = min(harcanan - mevcut_harcanan, kalan_yeni)
-
-                if yeni_harcanan > 0:
-                    fiyat = maliyet if gun < zam_gun else maliyet * (1 + zam_orani / 100)
-                    # TAKVİMSEL HESAPLAMA
-                    odeme_gun = self._odeme_gun_hesapla(gun, depo_vade)
-                    iskonto = (1 + gunluk_faiz) ** odeme_gun
-                    npv_aylik += (yeni_harcanan * fiyat) / iskonto
-                    kalan_yeni -= yeni_harcanan
-                gun += 1
-
-            # TAKVİMSEL HESAPLAMA
-            toplu_odeme_gun = self._odeme_gun_hesapla(0, depo_vade)
-            npv_toplu = (test_miktar * maliyet) / ((1 + gunluk_faiz) ** toplu_odeme_gun)
-            kazanc = npv_aylik - npv_toplu
-            yatirim = test_miktar * maliyet
-
-            miktarlar.append(test_miktar)
-            kazanclar.append(kazanc)
-            roi = (kazanc / yatirim * 100) if yatirim > 0 else 0
-            roi_ler.append(roi)
-
-        if not miktarlar:
-            return None
-
-        # Kritik noktaları bul
-        # 1. Max ROI noktası
-        max_roi_idx = 1
-        max_roi_val = roi_ler[1] if len(roi_ler) > 1 else 0
-        for i in range(2, len(roi_ler)):
-            if roi_ler[i] > max_roi_val:
-                max_roi_val = roi_ler[i]
-                max_roi_idx = i
-
-        # 2. Yarım ROI (eğim azalması) noktası
-        yarim_roi_idx = max_roi_idx
-        for i in range(max_roi_idx, len(roi_ler)):
-            if roi_ler[i] <= max_roi_val / 2:
-                yarim_roi_idx = i
-                break
-
-        # 3. Sıfır ROI (negatife dönüş) noktası
-        sifir_roi_idx = len(roi_ler) - 1
-        for i in range(max_roi_idx, len(roi_ler)):
-            if roi_ler[i] <= 0:
-                sifir_roi_idx = i
-                break
-
-        # 4. Optimum (tepe kazanç) noktası
-        optimum_idx = 1
-        max_kazanc = kazanclar[1] if len(kazanclar) > 1 else 0
-        for i in range(2, len(kazanclar)):
-            if kazanclar[i] > max_kazanc:
-                max_kazanc = kazanclar[i]
-                optimum_idx = i
-
-        # 5. Pareto (%80 kazanç) noktası
-        pareto_hedef = kazanclar[optimum_idx] * 0.80 if optimum_idx < len(kazanclar) else 0
-        pareto_idx = 0
-        for i, k in enumerate(kazanclar):
-            if k >= pareto_hedef:
-                pareto_idx = i
-                break
+        # Tüm miktarlar için kazanç (TAKVİMSEL HESAPLAMA) tek taramada
+        import zam_npv_motoru
+        kazanc_arr = zam_npv_motoru.kazanc_egrisi(
+            range(0, max_miktar + 1), maliyet, aylik_ort, stok,
+            zam_gun, zam_orani, faiz, depo_vade, sema='takvim')
+        _, roi_arr, _ = zam_npv_motoru.roi_egrileri(kazanc_arr, maliyet)
+
+        miktarlar = list(range(0, max_miktar + 1))
+        kazanclar = kazanc_arr.tolist()
+        roi_ler = roi_arr.tolist()
+
+        # Kritik noktaları bul (optimum 0 adet hariç)
+        kn = zam_npv_motoru.kritik_noktalar(kazanc_arr, roi_arr, optimum_sifir_dahil=False)
+        max_roi_idx, yarim_roi_idx, sifir_roi_idx = kn['max_roi'], kn['yarim_roi'], kn['sifir_roi']
+        optimum_idx, pareto_idx = kn['optimum'], kn['pareto']
 
         return {
             'max_roi': {'m': miktarlar[max_roi_idx], 'k': kazanclar[max_roi_idx], 'r': roi_ler[max_roi_idx]},
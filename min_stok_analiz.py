@@ -4,10 +4,13 @@ Bilimsel yontemler (Syntetos-Boylan) ve finansal basabas noktasi bazli minimum s
 """
 
 import math
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,8 +62,13 @@ def talep_pattern_analiz(db, urun_id: int, ay_sayisi: int = 12) -> dict:
     GROUP BY CAST(ea.RxKayitTarihi AS DATE)
     """
 
+    kup = db.satis_kupu('kayit', baslangic) if hasattr(db, 'satis_kupu') else None
     try:
-        gunluk_veriler = db.sorgu_calistir(sql)
+        if kup is not None:
+            gunluk_veriler = [{'Tarih': t, 'Adet': a}
+                              for t, a in kup.gunluk(urun_id, bas=baslangic).items()]
+        else:
+            gunluk_veriler = db.sorgu_calistir(sql)
     except Exception as e:
         logger.error(f"Talep analizi hatasi (UrunId={urun_id}): {e}")
         return None
@@ -852,6 +860,266 @@ def rop_safety_stock_hesapla(
     }
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# Toplu (kume bazli) analiz - tum katalog icin urun basi sorgu yerine
+# Gunluk talep parca parca (IN listesi) tek seferde cekilir, istatistikler
+# tum urunler icin NumPy ile birlikte hesaplanir. Sonuclar urun basi
+# talep_pattern_analiz / finansal_periyot_analiz ile aynidir.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+TOPLU_PARCA = 500      # IN listesi basina urun
+TOPLU_PARALEL = 3      # ayni anda kosan parca sorgusu (BotanikDB havuzu >= 4)
+
+
+def _parca_gunluk_talep(db, urun_ids: list, baslangic: str):
+    """Bir parca urunun gunluk talebi: [(UrunId, Tarih, Adet)]; hata → None."""
+    id_str = ','.join(str(int(u)) for u in urun_ids)
+    sql = f"""
+    SELECT
+        ri.RIUrunId as UrunId,
+        CAST(ra.RxKayitTarihi AS DATE) as Tarih,
+        SUM(ri.RIAdet) as Adet
+    FROM ReceteIlaclari ri
+    JOIN ReceteAna ra ON ri.RIRxId = ra.RxId
+    WHERE ri.RIUrunId IN ({id_str})
+    AND ra.RxSilme = 0 AND ri.RISilme = 0
+    AND (ri.RIIade = 0 OR ri.RIIade IS NULL)
+    AND ra.RxKayitTarihi >= '{baslangic}'
+    GROUP BY ri.RIUrunId, CAST(ra.RxKayitTarihi AS DATE)
+
+    UNION ALL
+
+    SELECT
+        ei.RIUrunId as UrunId,
+        CAST(ea.RxKayitTarihi AS DATE) as Tarih,
+        SUM(ei.RIAdet) as Adet
+    FROM EldenIlaclari ei
+    JOIN EldenAna ea ON ei.RIRxId = ea.RxId
+    WHERE ei.RIUrunId IN ({id_str})
+    AND ea.RxSilme = 0 AND ei.RISilme = 0
+    AND (ei.RIIade = 0 OR ei.RIIade IS NULL)
+    AND ea.RxKayitTarihi >= '{baslangic}'
+    GROUP BY ei.RIUrunId, CAST(ea.RxKayitTarihi AS DATE)
+    """
+    try:
+        satirlar = db.sorgu_calistir(sql)
+    except Exception as e:
+        logger.error(f"Toplu talep sorgusu hatasi ({len(urun_ids)} urun): {e}")
+        return None
+    # sorgu_calistir hatada [] doner; hata metni bu thread'e yazilir
+    if getattr(db, 'son_sorgu_hatasi', None):
+        logger.error(f"Toplu talep sorgusu hatasi ({len(urun_ids)} urun): {db.son_sorgu_hatasi}")
+        return None
+    return [(r['UrunId'], r['Tarih'], r['Adet']) for r in satirlar]
+
+
+def toplu_gunluk_talep(db, urun_ids: list, ay_sayisi: int,
+                       progress_callback=None) -> dict:
+    """
+    Urunlerin son `ay_sayisi` aylik gunluk talebi (receteli + elden birlesik).
+
+    Satis kupu tazeyse tek cagrida kupten; degilse TOPLU_PARCA'lik IN
+    listeleriyle, parcalar TOPLU_PARALEL thread'de paralel sorgulanir.
+
+    Returns:
+        dict: {UrunId: {date: miktar}} — hic satisi olmayan urun {} ile,
+              sorgusu hata veren parcanin urunleri None ile doner.
+    """
+    bugun = datetime.now()
+    baslangic = (bugun - relativedelta(months=ay_sayisi)).strftime('%Y-%m-%d')
+    ids = list(dict.fromkeys(int(u) for u in urun_ids))
+    sonuc = {u: {} for u in ids}
+
+    kup = db.satis_kupu('kayit', baslangic) if hasattr(db, 'satis_kupu') else None
+    if kup is not None:
+        for uid, gunler in kup.donemsel(ids, bas=baslangic, donem='gun').items():
+            sonuc[uid] = {t: float(a) for t, a in gunler.items()}
+        if progress_callback:
+            progress_callback(len(ids), len(ids))
+        return sonuc
+
+    parcalar = [ids[i:i + TOPLU_PARCA] for i in range(0, len(ids), TOPLU_PARCA)]
+    biten = 0
+    with ThreadPoolExecutor(max_workers=TOPLU_PARALEL) as havuz:
+        for parca, satirlar in zip(parcalar, havuz.map(
+                lambda p: _parca_gunluk_talep(db, p, baslangic), parcalar)):
+            if satirlar is None:
+                for uid in parca:
+                    sonuc[uid] = None
+            else:
+                for uid, tarih, adet in satirlar:
+                    try:
+                        if isinstance(tarih, datetime):
+                            tarih = tarih.date()
+                        elif isinstance(tarih, str):
+                            tarih = datetime.strptime(tarih[:10], '%Y-%m-%d').date()
+                    except Exception:
+                        continue
+                    gunler = sonuc[int(uid)]
+                    gunler[tarih] = gunler.get(tarih, 0) + float(adet or 0)
+            biten += len(parca)
+            if progress_callback:
+                progress_callback(biten, len(ids))
+    return sonuc
+
+
+def _duz_diziler(gunluk: dict):
+    """{UrunId: {date: miktar}} → (urun listesi, urun indeksi, gun, miktar) dizileri."""
+    urunler = [u for u, g in gunluk.items() if g]
+    uzunluk = np.array([len(gunluk[u]) for u in urunler], dtype=np.int64)
+    idx = np.repeat(np.arange(len(urunler)), uzunluk)
+    gun = np.array([t for u in urunler for t in gunluk[u]], dtype='datetime64[D]')
+    adet = np.array([a for u in urunler for a in gunluk[u].values()], dtype=np.float64)
+    return urunler, idx, gun, adet
+
+
+def _talep_yok(ay_sayisi: int) -> dict:
+    return {
+        'toplam_miktar': 0,
+        'talep_sayisi': 0,
+        'talep_gunleri': 0,
+        'aylik_ort': 0,
+        'ort_parti': 0,
+        'cv': 0,
+        'adi': 999,
+        'sinif': 'NO_DEMAND',
+        'parti_std': 0,
+        'aylik_dokum': [0.0] * ay_sayisi
+    }
+
+
+def toplu_talep_analiz(gunluk: dict, ay_sayisi: int = 12) -> dict:
+    """
+    talep_pattern_analiz'in tum urunler icin vektorel karsiligi.
+
+    Args:
+        gunluk: toplu_gunluk_talep() sonucu
+        ay_sayisi: Analiz donemi (ay) — gunluk ayni pencereyle cekilmis olmali
+
+    Returns:
+        dict: {UrunId: talep_pattern_analiz sozlugu (hata → None)}
+    """
+    bugun = datetime.now()
+    toplam_gun = ay_sayisi * 30
+    sonuc = {u: (None if g is None else _talep_yok(ay_sayisi)) for u, g in gunluk.items()}
+    urunler, idx, gun, adet = _duz_diziler({u: g for u, g in gunluk.items() if g})
+    if not urunler:
+        return sonuc
+    n = len(urunler)
+
+    toplam = np.bincount(idx, weights=adet, minlength=n)
+    sayi = np.bincount(idx, minlength=n)
+    ort_parti = toplam / sayi
+    gunluk_ort = toplam / toplam_gun
+    # Varyans = sum(x_i^2)/N - mean^2  (sifir gunler 0^2=0 katki yapar)
+    kareler = np.bincount(idx, weights=adet ** 2, minlength=n)
+    gunluk_std = np.sqrt(np.maximum(0, kareler / toplam_gun - gunluk_ort ** 2))
+    # CV: parti buyuklugu populasyon std / ortalama (tek talepte 0)
+    sapma = np.bincount(idx, weights=(adet - ort_parti[idx]) ** 2, minlength=n)
+    parti_std = np.where(sayi > 1, np.sqrt(sapma / sayi), 0.0)
+    cv = np.where((sayi > 1) & (ort_parti > 0), parti_std / np.where(ort_parti > 0, ort_parti, 1), 0.0)
+    adi = toplam_gun / sayi
+    # Syntetos-Boylan (CV = 0.49, ADI = 1.32)
+    sinif = np.select([(cv < 0.49) & (adi < 1.32), (cv >= 0.49) & (adi < 1.32), cv < 0.49],
+                      ['SMOOTH', 'ERRATIC', 'INTERMITTENT'], 'LUMPY')
+    # Ay-be-ay dokum (index 0 = bu ay)
+    bu_ay = (bugun.year - 1970) * 12 + bugun.month - 1
+    ay_index = bu_ay - gun.astype('datetime64[M]').astype(np.int64)
+    icerde = (ay_index >= 0) & (ay_index < ay_sayisi)
+    dokum = np.bincount(idx[icerde] * ay_sayisi + ay_index[icerde], weights=adet[icerde],
+                        minlength=n * ay_sayisi).reshape(n, ay_sayisi)
+
+    for i, (uid, t, k, op, go, gs, c, ps, a, s, d) in enumerate(zip(
+            urunler, toplam.tolist(), sayi.tolist(), ort_parti.tolist(), gunluk_ort.tolist(),
+            gunluk_std.tolist(), cv.tolist(), parti_std.tolist(), adi.tolist(),
+            sinif.tolist(), dokum.tolist())):
+        sonuc[uid] = {
+            'toplam_miktar': t,
+            'talep_sayisi': k,
+            'talep_gunleri': k,
+            'aylik_ort': t / ay_sayisi,
+            'ort_parti': op,
+            'cv': c if k > 1 else 0,
+            'adi': a,
+            'sinif': s,
+            'parti_std': ps if k > 1 else 0,
+            'gunluk_ort': go,
+            'gunluk_std': gs,
+            'toplam_gun': toplam_gun,
+            'aylik_dokum': d,
+            'gunluk_parti': dict(gunluk[uid]),
+        }
+    return sonuc
+
+
+def toplu_finansal_periyot_analiz(gunluk_24ay: dict, kar_marji: float,
+                                  yillik_faiz: float) -> dict:
+    """
+    finansal_periyot_analiz'in tum urunler icin vektorel karsiligi.
+
+    Args:
+        gunluk_24ay: toplu_gunluk_talep(db, ids, 24) sonucu
+
+    Returns:
+        dict: {UrunId: finansal_periyot_analiz sozlugu}
+    """
+    basabas_ay = basabas_noktasi_hesapla(kar_marji, yillik_faiz)
+
+    def _bos(aciklama):
+        return {
+            'basabas_ay': basabas_ay,
+            'dilim_sayisi': 0, 'satisli_dilim': 0,
+            'ort_parti': 0, 'talep_sayisi': 0, 'toplam_miktar': 0,
+            'min_onerilen': 0, 'aciklama': aciklama
+        }
+
+    if basabas_ay <= 0 or basabas_ay >= 999:
+        return {u: _bos('Başabaş hesaplanamadı') for u in gunluk_24ay}
+    sonuc = {u: _bos('Sorgu hatası' if g is None else '24 ayda satış yok')
+             for u, g in gunluk_24ay.items()}
+    urunler, idx, gun, adet = _duz_diziler({u: g for u, g in gunluk_24ay.items() if g})
+    if not urunler:
+        return sonuc
+    n = len(urunler)
+
+    toplam = np.bincount(idx, weights=adet, minlength=n)
+    sayi = np.bincount(idx, minlength=n)
+    ort_parti = toplam / sayi
+
+    # 24 ayi basabas periyoduna gore dilimlere bol — sinirlar tum urunlerde ortak
+    basabas_ay_tam = max(1, math.ceil(basabas_ay))
+    dilim_sayisi = max(1, math.floor(24 / basabas_ay_tam))
+    bugun = datetime.now()
+    satisli = np.zeros(n, dtype=np.int64)
+    for i in range(dilim_sayisi):
+        bit = np.datetime64((bugun - relativedelta(months=i * basabas_ay_tam)).date(), 'D')
+        bas = np.datetime64((bugun - relativedelta(months=(i + 1) * basabas_ay_tam)).date(), 'D')
+        # Sinirlar iki uctan dahil (urun basi fonksiyonla ayni)
+        satisli += np.bincount(idx[(gun >= bas) & (gun <= bit)], minlength=n) > 0
+
+    for uid, t, k, op, sd in zip(urunler, toplam.tolist(), sayi.tolist(),
+                                 ort_parti.tolist(), satisli.tolist()):
+        if sd > dilim_sayisi / 2:
+            min_onerilen = max(1, round(op))
+            aciklama = (f'Başabaş:{basabas_ay:.1f}ay | {dilim_sayisi} dilimden {sd} satışlı | '
+                        f'Ort:{op:.1f} → Min={min_onerilen}')
+        else:
+            min_onerilen = 0
+            aciklama = (f'Başabaş:{basabas_ay:.1f}ay | {dilim_sayisi} dilimden {sd} satışlı | '
+                        f'Çoğunluk sağlanmadı → Min=0')
+        sonuc[uid] = {
+            'basabas_ay': round(basabas_ay, 1),
+            'dilim_sayisi': dilim_sayisi,
+            'satisli_dilim': sd,
+            'ort_parti': round(op, 1),
+            'talep_sayisi': k,
+            'toplam_miktar': t,
+            'min_onerilen': min_onerilen,
+            'aciklama': aciklama
+        }
+    return sonuc
+
+
 def tum_ilaclari_analiz_et(
     db,
     ay_sayisi: int = 12,
@@ -863,7 +1131,8 @@ def tum_ilaclari_analiz_et(
     progress_callback=None,
     servis_seviyesi: float = 95.0,
     tedarik_suresi: int = 0,
-    inceleme_periyodu: int = 1
+    inceleme_periyodu: int = 1,
+    toplu: bool = True
 ) -> list:
     """
     Tum ilaclari analiz et ve minimum stok onerisi olustur
@@ -880,6 +1149,8 @@ def tum_ilaclari_analiz_et(
         tedarik_suresi: ROP icin tedarik suresi (gun)
         inceleme_periyodu: ROP icin inceleme periyodu (gun)
         progress_callback: Ilerleme callback fonksiyonu (current, total)
+        toplu: True → gunluk talep parca parca tek seferde cekilir ve
+            istatistikler vektorel hesaplanir; False → urun basi sorgu (eski yol)
 
     Returns:
         list: [{
@@ -970,19 +1241,34 @@ def tum_ilaclari_analiz_et(
     sonuclar = []
     toplam = len(ilaclar)
 
+    analiz_ay = 24 if hesaplama_modu == 'finansal' else ay_sayisi
+    if toplu:
+        gunluk = toplu_gunluk_talep(db, [ilac['UrunId'] for ilac in ilaclar], analiz_ay,
+                                    progress_callback)
+        toplu_talep = toplu_talep_analiz(gunluk, analiz_ay)
+        if hesaplama_modu == 'finansal':
+            toplu_finansal = toplu_finansal_periyot_analiz(gunluk, kar_marji, yillik_faiz)
+
     for i, ilac in enumerate(ilaclar):
         urun_id = ilac['UrunId']
 
-        # Progress callback
-        if progress_callback and i % 50 == 0:
+        # Progress callback (toplu yolda ilerlemeyi sorgu parcalari bildirir)
+        if progress_callback and not toplu and i % 50 == 0:
             progress_callback(i, toplam)
 
+        if toplu:
+            analiz = toplu_talep.get(urun_id)
+        else:
+            analiz = talep_pattern_analiz(db, urun_id, analiz_ay)
+
         if hesaplama_modu == 'finansal':
             # Finansal başabaş periyodu bazlı analiz (24 ay)
-            fin_sonuc = finansal_periyot_analiz(db, urun_id, kar_marji, yillik_faiz)
+            if toplu:
+                fin_sonuc = toplu_finansal[urun_id]
+            else:
+                fin_sonuc = finansal_periyot_analiz(db, urun_id, kar_marji, yillik_faiz)
 
             # 24 aylık talep analizi (istatistik bilgileri için)
-            analiz = talep_pattern_analiz(db, urun_id, 24)
             if not analiz:
                 continue
 
@@ -1008,7 +1294,6 @@ def tum_ilaclari_analiz_et(
             })
         elif hesaplama_modu == 'rop':
             # ROP + Safety Stock bazli analiz (bilimsel yontem)
-            analiz = talep_pattern_analiz(db, urun_id, ay_sayisi)
             if not analiz:
                 continue
 
@@ -1038,8 +1323,6 @@ def tum_ilaclari_analiz_et(
             })
         else:
             # Frekans bazlı analiz — dönem bazlı yeni kurallar
-            analiz = talep_pattern_analiz(db, urun_id, ay_sayisi)
-
             if not analiz:
                 continue
 
@@ -0,0 +1,257 @@
+# -*- coding: utf-8 -*-
+"""
+Ana Menü Ön Isıtma — sık açılan modülleri arka planda içe aktarır
+
+Ana menü çizildikten kısa süre sonra bir daemon thread, kullanıcının en sık
+açtığı modüllerin Python modüllerini (GUI sınıfı + ağır bağımlılıkları:
+sut_kontrolleri, pandas, matplotlib, selenium...) sırayla import eder.
+Kullanıcı karta tıkladığında import zaten bitmiş olur; Tk thread'i yalnız
+pencereyi kurar. Isıtma yalnız import yapar — pencere, DB bağlantısı,
+Tk nesnesi OLUŞTURMAZ.
+
+pywinauto/comtypes/pywin32 yükleyen modüller (botanik_gui → botanik_bot,
+recete_rapor_kontrol_gui) ısıtılmaz: COM import sırasında çağıran thread'de
+CoInitialize eder, daemon thread'de başlatılırsa ana thread'in UI
+otomasyonu yanlış apartment ile çalışır. Bu kartlar ana thread'de, ilk
+tıklamada import edilir.
+
+Sıklık, kart tıklamalarının sayıldığı yerel JSON'dan (modul_kullanim.json)
+okunur; hiç kayıt yoksa VARSAYILAN_SIRA kullanılır. Sayaç bellekte tutulur,
+dosyaya arka plan thread'inde yazılır (tıklamada Tk thread'i diske gitmez).
+
+Kullanım (AnaMenu):
+    isitici = OnIsitici(en_sik_moduller())
+    isitici.start()
+    ...
+    if isitici.ilk_kullanim("aylik_recete_sorgu_gui"):
+        ...  # ısıtıcı yeni yükledi — DEV_MODE reload'u atla
+    isitici.durdur()
+"""
+
+import importlib
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Menü kartı → açılışta import edilen modüller (bağımlılık sırasıyla).
+# AnaMenu.*_ac metotlarındaki import'larla aynı tutulmalı. COM yükleyen
+# kartlar (ilac_takip, rapor_kontrol) bilerek yok — modül docstring'i.
+ISITMA_MODULLERI: Dict[str, Tuple[str, ...]] = {
+    "depo_ekstre": ("depo_ekstre_modul",),
+    "kasa_takip": ("kasa_takip_modul",),
+    "aylik_recete_sorgu": ("recete_kontrol.sut_kontrolleri",
+                           "recete_kontrol.eski_rapor_kontrol",
+                           "recete_kontrol.anlik_kontrol",
+                           "aylik_recete_sorgu_gui"),
+    "ek_raporlar": ("ek_raporlar_gui",),
+    "mf_analiz": ("nf_analiz_gui",),
+    "mf_hizli": ("mf_hizli_hesaplama_gui",),
+    "siparis_verme": ("siparis_verme_gui",),
+    "min_stok_analiz": ("min_stok_analiz_gui",),
+    "prim_raporlama": ("prim_raporlama_gui",),
+    "stok_maliyet_analiz": ("stok_maliyet_analiz_gui",),
+    "hasta_takip": ("hasta_takip_gui",),
+    "stok_takip": ("stok_takip_gui",),
+    "erecete_cozucu": ("erecete_cozucu_gui",),
+    "hasta_sure": ("hasta_sure_gui",),
+    "kdv_analiz": ("kdv_analiz_gui",),
+    "sgk_barem": ("sgk_barem_gui",),
+    "satis_raporlari": ("satis_raporlari_gui",),
+}
+
+# Import sonrası çağrılacak ısıtma kancaları: (modül, fonksiyon).
+# Dispatch indeksi ilk reçete kontrolünde ~40 kural modülünü çözer.
+ISITMA_KANCALARI: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "aylik_recete_sorgu": (("recete_kontrol.anlik_kontrol", "dispatch_indeksi"),),
+}
+
+# Kullanım kaydı yokken ısıtılacak modüller
+VARSAYILAN_SIRA: Tuple[str, ...] = ("aylik_recete_sorgu", "hasta_takip", "satis_raporlari")
+
+# Kaç modül ısıtılır (her biri bellekte kalır)
+MAKS_ISITMA = 3
+
+_KULLANIM_DOSYA = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                               "modul_kullanim.json")
+_kullanim_kilidi = threading.Lock()
+_yazim_kilidi = threading.Lock()            # yazıcılar sırayla: son görüntü en son yazılır
+_sayac: Optional[Dict[str, int]] = None     # bellekteki sayaç (_sayac_yolu için)
+_sayac_yolu: Optional[str] = None
+_yazim_bekliyor = False
+
+
+def _kullanim_oku() -> Dict[str, int]:
+    try:
+        if os.path.exists(_KULLANIM_DOSYA):
+            with open(_KULLANIM_DOSYA, "r", encoding="utf-8") as f:
+                veri = json.load(f)
+            return {k: int(v) for k, v in veri.items() if isinstance(v, (int, float))}
+    except Exception:
+        pass
+    return {}
+
+
+def _sayac_al() -> Dict[str, int]:
+    """Bellekteki sayaç; ilk çağrıda (ya da dosya yolu değişince) diskten yüklenir.
+
+    _kullanim_kilidi tutularak çağrılmalı.
+    """
+    global _sayac, _sayac_yolu
+    if _sayac is None or _sayac_yolu != _KULLANIM_DOSYA:
+        _sayac, _sayac_yolu = _kullanim_oku(), _KULLANIM_DOSYA
+    return _sayac
+
+
+def _kullanim_yaz() -> None:
+    """Sayacın anlık görüntüsünü atomik yaz (arka plan thread'i).
+
+    Görüntü yazım kilidi altında alınır: önceki yazıcı bitmeden sonraki
+    görüntü alınmaz, eski görüntü yenisinin üzerine yazılamaz.
+    """
+    global _yazim_bekliyor
+    with _yazim_kilidi:
+        with _kullanim_kilidi:
+            _yazim_bekliyor = False
+            yol, veri = _sayac_yolu, dict(_sayac or {})
+        gecici = f"{yol}.tmp"
+        try:
+            with open(gecici, "w", encoding="utf-8") as f:
+                json.dump(veri, f, ensure_ascii=False, indent=2)
+            os.replace(gecici, yol)
+        except Exception as e:
+            logger.debug(f"Modül kullanım kaydı yazılamadı: {e}")
+
+
+def modul_kullanim_kaydet(modul_key: str) -> None:
+    """Menü kartı tıklamasını say; dosyaya arka planda yazılır (hata sessiz geçilir).
+
+    Peş peşe tıklamalarda bekleyen tek yazım son durumu yazar.
+    """
+    global _yazim_bekliyor
+    with _kullanim_kilidi:
+        sayac = _sayac_al()
+        sayac[modul_key] = sayac.get(modul_key, 0) + 1
+        if _yazim_bekliyor:
+            return
+        _yazim_bekliyor = True
+    threading.Thread(target=_kullanim_yaz, name="ModulKullanimYaz", daemon=True).start()
+
+
+def en_sik_moduller(adet: int = MAKS_ISITMA) -> List[str]:
+    """Isıtılacak menü kartları: en sık açılanlar, eksik kalırsa varsayılanlar."""
+    with _kullanim_kilidi:
+        sayac = dict(_sayac_al())
+    sirali = sorted((k for k in sayac if k in ISITMA_MODULLERI),
+                    key=lambda k: -sayac[k])
+    for k in VARSAYILAN_SIRA:
+        if k not in sirali:
+            sirali.append(k)
+    return sirali[:adet]
+
+
+class OnIsitici(threading.Thread):
+    """Verilen menü kartlarının modüllerini arka planda import eden thread.
+
+    Args:
+        modul_keyleri: ISITMA_MODULLERI anahtarları (öncelik sırasıyla)
+        gecikme_sn: Başlamadan önce bekleme (menü önce çizilsin)
+        ara_sn: Modüller arası bekleme (Tk thread'ine GIL nefesi)
+    """
+
+    def __init__(self, modul_keyleri: Iterable[str], gecikme_sn: float = 0.5,
+                 ara_sn: float = 0.05):
+        super().__init__(name="OnIsitici", daemon=True)
+        self.modul_keyleri = [k for k in modul_keyleri if k in ISITMA_MODULLERI]
+        self.gecikme_sn = gecikme_sn
+        self.ara_sn = ara_sn
+        # modül adı → import süresi (sn); hata verenler hatalar'da
+        self.sureler: Dict[str, float] = {}
+        self.hatalar: Dict[str, str] = {}
+        self._isitilan: Set[str] = set()
+        self._kilit = threading.Lock()
+        self._dur = threading.Event()
+        self.bitti = threading.Event()
+
+    def run(self) -> None:
+        try:
+            if self._dur.wait(self.gecikme_sn):
+                return
+            for key in self.modul_keyleri:
+                if not self._kart_isit(key):
+                    continue
+                for modul_adi, fonksiyon_adi in ISITMA_KANCALARI.get(key, ()):
+                    if self._dur.is_set():
+                        return
+                    try:
+                        getattr(sys.modules[modul_adi], fonksiyon_adi)()
+                    except Exception as e:
+                        self.hatalar[f"{modul_adi}.{fonksiyon_adi}"] = str(e)
+        finally:
+            self.bitti.set()
+            logger.info(self.ozet())
+
+    def _kart_isit(self, key: str) -> bool:
+        """Kartın modüllerini sırayla import et; biri patlarsa kartı bırak."""
+        for ad in ISITMA_MODULLERI[key]:
+            if self._dur.wait(self.ara_sn):
+                return False
+            if ad in sys.modules:
+                continue
+            # Import sürerken tıklanırsa: ana thread reload etmesin, modül
+            # kilidinde bu import'un bitmesini beklesin (ilk_kullanim True)
+            with self._kilit:
+                self._isitilan.add(ad)
+            t0 = time.perf_counter()
+            try:
+                importlib.import_module(ad)
+            except Exception as e:
+                with self._kilit:
+                    self._isitilan.discard(ad)
+                self.hatalar[ad] = f"{type(e).__name__}: {e}"
+                logger.debug(f"Ön ısıtma atlandı ({ad}): {e}")
+                return False
+            self.sureler[ad] = time.perf_counter() - t0
+        return True
+
+    def ilk_kullanim(self, modul_adi: str) -> bool:
+        """Modül bu ısıtıcı tarafından yüklendi (ya da yükleniyor) ve ilk kez mi kullanılıyor?
+
+        True döndüğünde kayıt silinir — AnaMenu'nun DEV_MODE reload'u yalnız
+        ilk açılışta atlanır, sonraki açılışlarda eskisi gibi çalışır.
+        """
+        with self._kilit:
+            if modul_adi in self._isitilan:
+                self._isitilan.discard(modul_adi)
+                return True
+        return False
+
+    def durdur(self) -> None:
+        """Sıradaki modüle geçmeden dur (sürmekte olan import tamamlanır)."""
+        self._dur.set()
+
+    def ozet(self) -> str:
+        toplam = sum(self.sureler.values())
+        parcalar = [f"{ad} {sn * 1000:.0f} ms" for ad, sn in self.sureler.items()]
+        satir = f"Ön ısıtma: {len(self.sureler)} modül, {toplam * 1000:.0f} ms"
+        if parcalar:
+            satir += " (" + ", ".join(parcalar) + ")"
+        if self.hatalar:
+            satir += f"; atlanan: {', '.join(self.hatalar)}"
+        return satir
+
+
+def isitma_baslat(adet: int = MAKS_ISITMA, gecikme_sn: float = 0.5) -> Optional[OnIsitici]:
+    """En sık açılan kartlar için ısıtıcıyı başlat; başlatılamazsa None."""
+    try:
+        isitici = OnIsitici(en_sik_moduller(adet), gecikme_sn=gecikme_sn)
+        isitici.start()
+        return isitici
+    except Exception as e:
+        logger.debug(f"Ön ısıtma başlatılamadı: {e}")
+        return None
@@ -7,12 +7,13 @@ import json
 import sys
 import io
 
+from timing_settings import istatistikleri_oku
+
 # UTF-8 çıktı için
 sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8')
 
-# İstatistikleri oku
-with open('timing_stats.json', 'r', encoding='utf-8') as f:
-    stats = json.load(f)
+# İstatistikleri oku (timing_stats.jsonl günlüğü; yoksa eski timing_stats.json)
+stats = istatistikleri_oku()
 
 # Optimal değerleri hesapla (%30 fazla)
 MULTIPLIER = 1.3
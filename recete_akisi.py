@@ -0,0 +1,1320 @@
+"""
+Reçete işleme akışları — sürücüden bağımsız.
+
+tek_recete_isle, tek_recete_rapor_kontrol, rapor_kontrol_hatti ve
+medula_yeniden_baslat_ve_giris_yap Medula'ya yalnız `bot` sürücüsü üzerinden erişir: BotanikBot (pywinauto +
+IE COM) ya da medula_surucu.TekrarSurucu (kayıtlı oturumu tekrar oynatan,
+Linux'ta çalışan sürücü). Bu yüzden modül pywinauto / win32 içe aktarmaz;
+akışlardaki sabit beklemeler de bot.bekle, tuş basımları bot.tus_gonder,
+adım süresi kayıtları bot.timing.kayit_ekle üzerinden geçer.
+
+Sürücünün sağlaması gereken adımlar medula_surucu.SURUCU_ADIMLARI'nda
+listelidir. botanik_bot bu akışları eski adlarıyla yeniden dışa aktarır.
+"""
+
+import logging
+import time
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== CUSTOM EXCEPTIONS ====================
+class SistemselHataException(Exception):
+    """MEDULA'da sistemsel hata oluştuğunda fırlatılan exception"""
+    pass
+
+
+def tek_recete_isle(bot, recete_sira_no, rapor_takip, grup="", session_logger=None, stop_check=None, onceden_okunan_recete_no=None, onceki_recete_no=None, fonksiyon_ayarlari=None):
+    """
+    Tek bir reçete için tüm işlemleri yap
+
+    Args:
+        bot: Medula sürücüsü (BotanikBot veya medula_surucu.TekrarSurucu)
+        recete_sira_no: Reçete sıra numarası (1, 2, 3...)
+        rapor_takip: RaporTakip instance (CSV kaydı için)
+        grup: Grup bilgisi (A, B, C, GK) (varsayılan: "")
+        session_logger: SessionLogger instance (oturum logları için, opsiyonel)
+        stop_check: Durdurma kontrolü için callback fonksiyonu (True dönerse işlem durur)
+        onceden_okunan_recete_no: GUI'de zaten okunan reçete numarası (tekrar okumayı önler)
+        onceki_recete_no: Bir önceki işlenen reçete numarası (ardışık aynı reçete kontrolü için)
+        fonksiyon_ayarlari: Dict - hangi fonksiyonların aktif olduğu
+            - ilac_takip_aktif: bool
+            - rapor_toplama_aktif: bool
+            - rapor_kontrol_aktif: bool
+
+    Returns:
+        tuple: (başarı durumu: bool, medula reçete no: str veya None, takip sayısı: int, hata nedeni: str veya None)
+    """
+    # Varsayılan fonksiyon ayarları
+    if fonksiyon_ayarlari is None:
+        fonksiyon_ayarlari = {
+            "ilac_takip_aktif": True,
+            "rapor_toplama_aktif": True,
+            "rapor_kontrol_aktif": True
+        }
+
+    ilac_takip_aktif = fonksiyon_ayarlari.get("ilac_takip_aktif", True)
+    rapor_toplama_aktif = fonksiyon_ayarlari.get("rapor_toplama_aktif", True)
+    rapor_kontrol_aktif = fonksiyon_ayarlari.get("rapor_kontrol_aktif", True)
+
+    # Durdurma kontrolü helper fonksiyonu
+    def should_stop():
+        """Stop_check callback varsa kontrol et, True dönerse durulmalı"""
+        if stop_check and callable(stop_check):
+            return stop_check()
+        return False
+    recete_baslangic = time.time()
+    adim_sureleri = []
+
+    def log_sure(ad, baslangic, timing_key=None):
+        """Bir adımın süresini kaydet ve yazdır."""
+        sure = time.time() - baslangic
+        adim_sureleri.append((ad, sure))
+        logger.info(f"⏱ {ad}: {sure:.2f}s")
+
+        # Timing istatistiğine kaydet
+        if timing_key:
+            bot.timing.kayit_ekle(timing_key, sure)
+
+        # Oturum loguna adım (trace zaman çizelgesi)
+        if session_logger:
+            session_logger.adim(ad, sure, recete=medula_recete_no, baslangic=baslangic,
+                                anahtar=timing_key, sira=recete_sira_no)
+
+        return sure
+
+    medula_recete_no = None
+    takip_sayisi = 0  # Takip edilen ilaç sayısı
+    baslik_loglandi = False
+    if session_logger:
+        session_logger.aktif_recete = None  # önceki reçetenin no'su taşınmasın
+
+    def log_recete_baslik(no_degeri=None):
+        """Üst başlıkta Reçete sıra ve numarasını göster."""
+        nonlocal baslik_loglandi
+        if baslik_loglandi:
+            return
+        no_text = no_degeri if no_degeri else (medula_recete_no if medula_recete_no else "-")
+        logger.info(f"📋 REÇETE {recete_sira_no} | No: {no_text}")
+        baslik_loglandi = True
+
+    # DURDURMA KONTROLÜ - başlangıçta
+    if should_stop():
+        logger.info("⏸ İşlem durduruldu (kullanıcı talebi)")
+        return (False, None, 0, "Kullanıcı tarafından durduruldu")
+
+    # OPTİMİZE: Ardışık aynı reçete kontrolü (SONRA basınca aynı reçete gelirse = "Reçete kaydı bulunamadı")
+    # Sadece aynı reçete numarası geldiğinde hızlı kontrol yap, farklıysa atla
+    if onceki_recete_no and onceden_okunan_recete_no and onceki_recete_no == onceden_okunan_recete_no:
+        # Aynı reçete numarası → "Reçete kaydı bulunamadı" uyarısı var mı kontrol et
+        adim_baslangic = time.time()
+        recete_kaydi_var = bot.recete_kaydi_var_mi_kontrol_hizli()
+        log_sure("Reçete kontrolü (aynı no)", adim_baslangic, "recete_kontrol")
+        if not recete_kaydi_var:
+            logger.error("❌ Reçete kaydı yok (ardışık aynı numara)")
+            log_recete_baslik()
+            return (False, medula_recete_no, takip_sayisi, "Reçete kaydı bulunamadı")
+
+    # Reçete notu ve uyarı kontrolü KALDIRILDI - retry mekanizması gerektiğinde yapacak
+
+    # ===== BİRLEŞİK KONTROL: TESİS + TELEFON + AYNI REÇETE (TEK DÖNGÜ) =====
+    # 1) Yasaklı tesis → atla
+    # 2) Telefon yok → atla
+    # 3) SONRA basıldıktan sonra aynı reçete geldi mi → son reçete kontrolü
+    from medula_settings import get_medula_settings
+    medula_settings = get_medula_settings()
+    telefonsuz_atla = medula_settings.get("telefonsuz_atla", False)
+    yasakli_tesisler = medula_settings.get("yasakli_tesis_numaralari", [])
+    tesis_kontrolu_aktif = (grup == "B" and len(yasakli_tesisler) > 0)
+
+    # Kontrol gerekiyor mu?
+    if tesis_kontrolu_aktif or telefonsuz_atla:
+        atlanan_sayisi = 0
+        max_atlama = 50  # Sonsuz döngü koruması
+        onceki_loop_recete = onceden_okunan_recete_no  # İlk reçete no (varsa)
+        loop_hizli_sonuc = None  # Önceki iterasyondan kalan hızlı tarama sonucu
+
+        while atlanan_sayisi < max_atlama:
+            if should_stop():
+                return (False, None, 0, "Kullanıcı tarafından durduruldu")
+
+            atlama_nedeni = None
+            current_recete = None
+
+            # 1) TESİS KONTROLÜ (hızlı - tek element MSHTML okuma)
+            if tesis_kontrolu_aktif:
+                adim_baslangic = time.time()
+                tesis_no = bot.tesis_numarasi_oku()
+                log_sure("Tesis no okuma", adim_baslangic, "tesis_kontrol")
+
+                if tesis_no and tesis_no in yasakli_tesisler:
+                    atlama_nedeni = f"yasaklı tesis: {tesis_no}"
+
+            # 2) TELEFON KONTROLÜ + REÇETE NO (tek hızlı taramada ikisi birden)
+            if not atlama_nedeni and telefonsuz_atla:
+                adim_baslangic = time.time()
+                hizli_sonuc = bot.recete_sayfasi_hizli_tarama(max_deneme=2, bekleme_suresi=0.15)
+                if hizli_sonuc:
+                    telefon_var = hizli_sonuc['telefon_var']
+                    current_recete = hizli_sonuc.get('recete_no')
+                    loop_hizli_sonuc = hizli_sonuc
+                    log_sure("Telefon+Reçete kontrolü (hızlı)", adim_baslangic, "telefon_kontrol")
+                else:
+                    birlesik_sonuc = bot.recete_telefon_kontrol_birlesik(max_deneme=2, bekleme_suresi=0.2)
+                    telefon_var = birlesik_sonuc['telefon_var']
+                    current_recete = birlesik_sonuc.get('recete_no')
+                    log_sure("Telefon+Reçete kontrolü (fallback)", adim_baslangic, "telefon_kontrol")
+
+                if not telefon_var:
+                    atlama_nedeni = "telefon yok"
+
+            # 3) AYNI REÇETE KONTROLÜ (son reçeteye gelindi mi?)
+            # Telefon kontrolünden gelen reçete no ile karşılaştır - ek okuma yok
+            if not atlama_nedeni and onceki_loop_recete and current_recete:
+                if onceki_loop_recete == current_recete:
+                    # Aynı reçete - doğrulama: 0.5s bekle + tekrar oku
+                    bot.bekle(0.5)
+                    dogrulama = bot.recete_sayfasi_hizli_tarama(max_deneme=2, bekleme_suresi=0.2)
+                    dogrulama_recete = dogrulama.get('recete_no') if dogrulama else None
+
+                    if dogrulama_recete and onceki_loop_recete == dogrulama_recete:
+                        if not bot.recete_kaydi_var_mi_kontrol_hizli():
+                            logger.error("❌ Reçete kaydı bulunamadı (son reçete)")
+                            return (False, None, takip_sayisi, "Reçete kaydı bulunamadı")
+                    else:
+                        current_recete = dogrulama_recete
+
+            # Her şey OK - döngüden çık
+            if not atlama_nedeni:
+                if atlanan_sayisi > 0:
+                    logger.info(f"✓ {atlanan_sayisi} reçete atlandı, devam ediliyor")
+                break
+
+            # SONRA butonuna bas
+            atlanan_sayisi += 1
+            logger.info(f"⏭ Reçete atlanıyor ({atlama_nedeni}) [{atlanan_sayisi}]")
+
+            adim_baslangic = time.time()
+            sonra = bot.retry_with_popup_check(
+                lambda: bot.sonra_butonuna_tikla(),
+                "SONRA butonu",
+                max_retries=5
+            )
+            log_sure("Sonra butonu (atlama)", adim_baslangic, "sonra_butonu")
+            if not sonra:
+                return (False, None, takip_sayisi, f"SONRA butonu başarısız ({atlama_nedeni})")
+
+            # Sayfanın yüklenmesi için kısa bekleme
+            bot.bekle(0.4)
+
+            onceki_loop_recete = current_recete or onceki_loop_recete
+            # onceden_okunan_recete_no artık geçersiz (yeni sayfadayız)
+            onceden_okunan_recete_no = None
+        else:
+            # max_atlama'ya ulaşıldı
+            logger.error(f"❌ {max_atlama} ardışık reçete atlandı, durduruluyor")
+            return (False, None, takip_sayisi, f"{max_atlama} ardışık reçete atlandı")
+
+    # İlaç butonu referansı (hızlı taramadan alınacak)
+    ilac_butonu_ref = None
+
+    # Reçete numarası zaten GUI'de okunmuşsa tekrar okuma (performans optimizasyonu)
+    if onceden_okunan_recete_no:
+        medula_recete_no = onceden_okunan_recete_no
+    else:
+        # ★ ULTRA OPTİMİZE: CONTAINER-BASED HIZLI TARAMA ★
+        # Reçete no + telefon + ilaç butonu referansı TEK TARAMADA
+        adim_baslangic = time.time()
+
+        # Önce hızlı tarama dene (container-based, ~0.5-1 saniye)
+        hizli_sonuc = bot.recete_sayfasi_hizli_tarama(max_deneme=2, bekleme_suresi=0.15)
+
+        if hizli_sonuc:
+            # Hızlı tarama başarılı
+            medula_recete_no = hizli_sonuc['recete_no']
+            kayit_var = hizli_sonuc['kayit_var']
+            telefon_var = hizli_sonuc['telefon_var']
+            ilac_butonu_ref = hizli_sonuc.get('ilac_butonu')
+            log_sure("Reçete+Telefon+Buton (hızlı)", adim_baslangic, "recete_kontrol")
+        else:
+            # Fallback: Eski yöntem (~1.5 saniye)
+            birlesik_sonuc = bot.recete_telefon_kontrol_birlesik()
+            medula_recete_no = birlesik_sonuc['recete_no']
+            kayit_var = birlesik_sonuc['kayit_var']
+            telefon_var = birlesik_sonuc['telefon_var']
+            log_sure("Reçete+Telefon kontrolü (fallback)", adim_baslangic, "recete_kontrol")
+
+        # Kayıt yok kontrolü
+        if not kayit_var:
+            logger.error("❌ Reçete kaydı bulunamadı")
+            log_recete_baslik()
+            return (False, medula_recete_no, takip_sayisi, "Reçete kaydı bulunamadı")
+
+    log_recete_baslik(medula_recete_no)
+    if session_logger:
+        session_logger.aktif_recete = medula_recete_no
+
+    # DURDURMA KONTROLÜ - telefon kontrolünden sonra
+    if should_stop():
+        logger.info("⏸ İşlem durduruldu (kullanıcı talebi)")
+        return (False, medula_recete_no, 0, "Kullanıcı tarafından durduruldu")
+
+    # Genel muayene uyarısı kontrolü (reçete açıldıktan hemen sonra)
+    try:
+        if bot.uyari_penceresini_kapat(max_bekleme=0.5):
+            logger.info("✓ Genel muayene uyarısı kapatıldı")
+    except Exception as e:
+        logger.debug(f"Uyarı kontrol hatası: {e}")
+
+    # ===== İLAÇ TAKİP PASİFSE ATLA =====
+    # İlaç takip aktif değilse, direkt rapor toplama/kontrol kısmına geç
+    if not ilac_takip_aktif:
+        logger.info("⏭ İlaç takip pasif, atlanıyor...")
+
+        # Sadece rapor işlemleri yap
+        sonraki_zaten_basildi = False
+
+        # Rapor toplama (aktifse)
+        if rapor_toplama_aktif and rapor_takip:
+            try:
+                if session_logger:
+                    session_logger.info("🔵 Rapor toplama başlatılıyor...")
+                rapor_verileri = bot.rapor_listesini_topla()
+                if rapor_verileri:
+                    sonraki_zaten_basildi = rapor_verileri.get('sonraki_basildi', False)
+                    if rapor_verileri.get('raporlar'):
+                        ad_soyad = rapor_verileri.get('ad_soyad', 'Bilinmeyen')
+                        telefon = rapor_verileri.get('telefon', '')
+                        raporlar = rapor_verileri.get('raporlar', [])
+                        rapor_takip.toplu_rapor_ekle(ad_soyad, telefon, raporlar, grup)
+                        logger.info(f"✓ Hasta raporları kaydedildi: {ad_soyad}")
+            except Exception as e:
+                logger.warning(f"Rapor kaydetme hatası: {e}")
+
+        # Rapor kontrol (aktifse)
+        if rapor_kontrol_aktif:
+            try:
+                from recete_kontrol import get_kontrol_motoru
+                kontrol_motoru = get_kontrol_motoru()
+                recete_verisi = {'recete_no': medula_recete_no, 'grup': grup}
+                sonuclar = kontrol_motoru.recete_kontrol_et(recete_verisi)
+                for kontrol_adi, rapor in sonuclar.items():
+                    if kontrol_adi != '_genel':
+                        logger.info(f"[Kontrol] {kontrol_adi}: {rapor.mesaj}")
+            except ImportError:
+                pass
+            except Exception as e:
+                logger.warning(f"Rapor kontrol hatası: {e}")
+
+        # Sonraki reçeteye geç
+        if not sonraki_zaten_basildi:
+            sonra = bot.retry_with_popup_check(
+                lambda: bot.sonra_butonuna_tikla(),
+                "SONRA butonu",
+                max_retries=5
+            )
+            if not sonra:
+                return (False, medula_recete_no, 0, "SONRA butonu başarısız")
+
+        return (True, medula_recete_no, 0, None)
+
+    # ===== İLAÇ TAKİP (AKTİF) =====
+    # İlaç butonuna tıkla (5 deneme + popup kontrolü)
+    # ★ OPTİMİZASYON: Eğer hızlı taramadan referans varsa direkt kullan ★
+    adim_baslangic = time.time()
+    ilac_butonu = False
+
+    if ilac_butonu_ref:
+        # Referans var - direkt tıkla (arama atlanıyor = ~1-2 saniye kazanç)
+        try:
+            if ilac_butonu_ref.exists(timeout=0.2):
+                ilac_butonu_ref.click_input()
+                ilac_butonu = True
+                logger.info("✓ İlaç butonuna tıklandı (referans ile - hızlı)")
+                bot.timed_sleep("ilac_butonu")
+        except Exception as e:
+            logger.debug(f"Referans tıklama hatası: {type(e).__name__}, fallback yapılıyor...")
+
+    # Referans yoksa veya başarısız olduysa normal yöntemi dene
+    if not ilac_butonu:
+        ilac_butonu = bot.retry_with_popup_check(
+            lambda: bot.ilac_butonuna_tikla(),
+            "İlaç butonu",
+            max_retries=5
+        )
+
+    log_sure("İlaç butonu", adim_baslangic, "ilac_butonu")
+    if not ilac_butonu:
+        log_recete_baslik()
+        return (False, medula_recete_no, takip_sayisi, "İlaç butonu başarısız")
+
+    # "Kullanılan İlaç Listesi" ekranının yüklenmesini bekle (5 saniye - yavaş bağlantı için artırıldı)
+    adim_baslangic = time.time()
+    ilac_ekrani = bot.ilac_ekrani_yuklendi_mi(max_bekleme=5)
+    log_sure("İlaç ekranı yükleme", adim_baslangic, "ilac_ekran_bekleme")
+    if not ilac_ekrani:
+        logger.error("❌ İlaç ekranı yüklenemedi")
+        log_recete_baslik()
+        return (False, medula_recete_no, takip_sayisi, "İlaç ekranı yüklenemedi")
+
+    # DURDURMA KONTROLÜ - ilaç ekranı sonrası
+    if should_stop():
+        logger.info("⏸ İşlem durduruldu (kullanıcı talebi)")
+        return (False, medula_recete_no, 0, "Kullanıcı tarafından durduruldu")
+
+    # Y butonuna tıkla (retry_with_popup_check ile - REÇETE NOTU vb. popup kontrolü)
+    ana_pencere = bot.main_window
+    adim_baslangic = time.time()
+    y_butonu = bot.retry_with_popup_check(
+        lambda: bot.y_tusuna_tikla(),
+        "Y butonu",
+        max_retries=5,
+        critical=False  # Y butonu başarısız olursa devam et, aşağıda tekrar denenir
+    )
+    log_sure("Y butonu", adim_baslangic, "y_butonu")
+
+    # İlaç Listesi penceresini akıllı bekleme ile bul
+    # ÖNEMLİ: Y'ye tıklama başarılı dönse bile, popup yüzünden İlaç Listesi çıkmayabilir!
+    # Üstel aralıkla yoklanır; üst süre pencerenin p95 açılma süresinden türetilir
+    # (yeterli ölçüm yoksa 1 sn) - popup varsa aşağıdaki kurtarmaya erken geçilir
+    adim_baslangic = time.time()
+
+    def ilac_listesi_acik():
+        return bot.yeni_pencereyi_bul("İlaç Listesi")
+
+    ilac_penceresi_bulundu = bot.timing.kosul_bekle(
+        ilac_listesi_acik, "ilac_listesi_penceresi", varsayilan=1.0,
+        uyku=bot.bekle, statik_aralik=bot.timing.get("pencere_bulma"))
+
+    log_sure("İlaç penceresi bulma", adim_baslangic, "pencere_bulma")
+
+    # İlaç Listesi bulunamadıysa kritik popup kontrolü yap (REÇETE NOTU dahil)
+    # ===== POPUP WATCHER VARKEN BU KISIM NADIREN ÇALIŞIR =====
+    # Windows Hook popup watcher otomatik olarak popup'ları kapatır
+    if not ilac_penceresi_bulundu:
+        # ★ ÖNCELİKLE KRİTİK POPUP KONTROLÜ (REÇETE NOTU + UYARIDIR) ★
+        logger.info("⚠ İlaç Listesi bulunamadı → Kritik popup kontrolü yapılıyor...")
+        try:
+            if bot.kritik_popup_kontrol_ve_kapat():
+                logger.info("✓ Kritik popup kapatıldı (REÇETE NOTU veya UYARIDIR)")
+                bot.bekle(0.3)
+        except Exception as e:
+            logger.debug(f"Kritik popup kontrol hatası: {type(e).__name__}")
+
+        # Ardından ESC tuşları ile diğer popup'ları kapat
+        logger.info("⚠ 3x ESC tuşuna basılıyor (LABA/LAMA uyarısı kapatma)")
+        for i in range(3):
+            bot.tus_gonder("{ESC}")
+            bot.bekle(0.1)  # ESC'ler arası kısa bekleme (OPT: 0.15 → 0.1)
+        logger.info("✓ 3x ESC tuşuna basıldı")
+        bot.bekle(bot.timing.get("esc_sonrasi_bekleme", 0.3))  # OPT: 0.5 → timing
+
+        # Y butonuna tekrar tıkla (popup kontrolü ile)
+        logger.info("🔄 Y tuşuna tekrar basılıyor...")
+        adim_baslangic = time.time()
+        y_butonu = bot.retry_with_popup_check(
+            lambda: bot.y_tusuna_tikla(),
+            "Y butonu (ESC sonrası)",
+            max_retries=3,
+            critical=False
+        )
+        log_sure("Y butonu (ESC sonrası)", adim_baslangic, "y_butonu")
+
+        # İlaç Listesi penceresini tekrar ara (OPT: 1.0 → 0.8)
+        ilac_penceresi_bulundu = bot.timing.kosul_bekle(
+            ilac_listesi_acik, "ilac_listesi_penceresi", varsayilan=0.8, zaman_asimi=0.8,
+            uyku=bot.bekle, statik_aralik=bot.timing.get("pencere_bulma"))
+        if ilac_penceresi_bulundu:
+            logger.info("✓ İlaç Listesi bulundu (ESC + Y sonrası)")
+
+        log_sure("İlaç penceresi bulma (ESC sonrası)", adim_baslangic, "pencere_bulma")
+
+    # İlaç Listesi hala bulunamadıysa ENTER tuşu ile popup kapat (2. deneme)
+    if not ilac_penceresi_bulundu:
+        # ★ TEKRAR KRİTİK POPUP KONTROLÜ ★
+        try:
+            if bot.kritik_popup_kontrol_ve_kapat():
+                logger.info("✓ Kritik popup kapatıldı (2. kontrol)")
+                bot.bekle(0.3)
+        except Exception:
+            pass
+
+        logger.info("⚠ İlaç Listesi hala bulunamadı → ENTER basılıyor...")
+        bot.bekle(bot.timing.get("enter_oncesi_bekleme", 0.5))  # OPT: 1.0 → timing
+        bot.tus_gonder("{ENTER}")
+        logger.info("✓ ENTER tuşuna basıldı (1. deneme)")
+
+        # İlaç Listesi penceresini tekrar ara (OPT: 1.0 → 0.8)
+        adim_baslangic = time.time()
+        ilac_penceresi_bulundu = bot.timing.kosul_bekle(
+            ilac_listesi_acik, "ilac_listesi_penceresi", varsayilan=0.8, zaman_asimi=0.8,
+            uyku=bot.bekle, statik_aralik=bot.timing.get("pencere_bulma"))
+        if ilac_penceresi_bulundu:
+            logger.info("✓ İlaç Listesi bulundu (ENTER sonrası)")
+
+        log_sure("İlaç penceresi bulma (ENTER sonrası)", adim_baslangic, "pencere_bulma")
+
+    # Hala bulunamadıysa ENTER tuşu ile popup kapat (3. deneme)
+    if not ilac_penceresi_bulundu:
+        # ★ SON KRİTİK POPUP KONTROLÜ ★
+        try:
+            if bot.kritik_popup_kontrol_ve_kapat():
+                logger.info("✓ Kritik popup kapatıldı (3. kontrol)")
+                bot.bekle(0.3)
+        except Exception:
+            pass
+
+        logger.info("⚠ İlaç Listesi hala bulunamadı → tekrar ENTER basılıyor...")
+        bot.bekle(bot.timing.get("enter_oncesi_bekleme", 0.5))  # OPT: 1.0 → timing
+        bot.tus_gonder("{ENTER}")
+        logger.info("✓ ENTER tuşuna basıldı (2. deneme)")
+
+        # Y butonuna tekrar tıkla (popup kontrolü ile)
+        bot.bekle(bot.timing.get("laba_sonrasi_bekleme"))
+        adim_baslangic = time.time()
+        y_butonu = bot.retry_with_popup_check(
+            lambda: bot.y_tusuna_tikla(),
+            "Y butonu (2. ENTER sonrası)",
+            max_retries=3,
+            critical=False
+        )
+        log_sure("Y butonu (2. ENTER sonrası)", adim_baslangic, "y_ikinci_deneme")
+
+        # İlaç Listesi penceresini tekrar ara
+        adim_baslangic = time.time()
+        ilac_penceresi_bulundu = bot.timing.kosul_bekle(
+            ilac_listesi_acik, "ilac_listesi_penceresi", varsayilan=1.0, zaman_asimi=1.0,
+            uyku=bot.bekle, statik_aralik=bot.timing.get("pencere_bulma"))
+        if ilac_penceresi_bulundu:
+            logger.info("✓ İlaç Listesi bulundu (2. ENTER + Y sonrası)")
+
+        log_sure("İlaç penceresi bulma (2. deneme)", adim_baslangic, "pencere_bulma")
+
+    # Hala bulunamadıysa gerçek hata
+    if not ilac_penceresi_bulundu:
+        logger.error("❌ İlaç Listesi penceresi bulunamadı (2x ENTER + Y sonrası bile)")
+        log_recete_baslik()
+        return (False, medula_recete_no, takip_sayisi, "İlaç Listesi penceresi bulunamadı")
+
+    # ===== YENİ AKIŞ: Textbox'lara 122 yaz =====
+    adim_baslangic = time.time()
+    bot.textboxlara_122_yaz()
+    log_sure("Textbox 122 yazma", adim_baslangic, "textbox_yazma")
+
+    # "Bizden Alınmayanları Seç" butonunu ara
+    adim_baslangic = time.time()
+    alinmayan_secildi = bot.bizden_alinanlarin_sec_tusuna_tikla()
+    log_sure("Alınmayanları Seç", adim_baslangic, "alinmayanlari_sec")
+
+    # Eğer buton bulunamadıysa → LABA/LAMA veya İlaç Çakışması uyarısı var olabilir
+    if not alinmayan_secildi:
+        logger.info("⚠ Bizden Alınmayanları Seç bulunamadı → LABA/LAMA kontrolü yapılıyor...")
+
+        # 1. LABA/LAMA kontrol ve kapat
+        laba_baslangic = time.time()
+        laba_kapatildi = bot.laba_lama_uyarisini_kapat(max_bekleme=1.5)
+        log_sure("LABA/LAMA kontrol", laba_baslangic, "laba_uyari")
+
+        # 2. LABA/LAMA kapatıldıysa, İlaç Çakışması kontrol ve kapat
+        ilac_cakismasi_kapatildi = False
+        if laba_kapatildi:
+            logger.info("⚠ LABA/LAMA kapatıldı → İlaç Çakışması kontrolü yapılıyor...")
+            ilac_baslangic = time.time()
+            ilac_cakismasi_kapatildi = bot.ilac_cakismasi_uyarisini_kapat(max_bekleme=1.5)
+            log_sure("İlaç Çakışması kontrol (LABA sonrası)", ilac_baslangic, "ilac_cakismasi_uyari")
+
+        # 3. Herhangi bir popup kapatıldıysa İlaç Listesi penceresini tekrar bul
+        if laba_kapatildi or ilac_cakismasi_kapatildi:
+            bot.bekle(bot.timing.get("laba_sonrasi_bekleme"))
+
+            # İlaç Listesi penceresini tekrar bul
+            adim_baslangic = time.time()
+            ilac_penceresi_bulundu = bot.yeni_pencereyi_bul("İlaç Listesi")
+            log_sure("İlaç penceresi 2. bulma", adim_baslangic, "pencere_bulma")
+
+            if ilac_penceresi_bulundu:
+                # Tekrar "Bizden Alınmayanları Seç" butonunu ara
+                adim_baslangic = time.time()
+                alinmayan_secildi = bot.bizden_alinanlarin_sec_tusuna_tikla()
+                log_sure("Alınmayanları Seç (2. deneme)", adim_baslangic, "alinmayanlari_sec")
+
+        # Hala bulanamadıysa hata
+        if not alinmayan_secildi:
+            logger.error("❌ Bizden Alınmayanları Seç butonu bulunamadı (2 deneme)")
+            log_recete_baslik()
+            return (False, medula_recete_no, takip_sayisi, "Bizden Alınmayanları Seç butonu bulunamadı")
+
+    # ===== YENİ AKIŞ: Checkbox kontrolü YOK - direkt sağ tıkla ve Takip Et =====
+    # DURDURMA KONTROLÜ
+    if should_stop():
+        logger.info("⏸ İşlem durduruldu (kullanıcı talebi)")
+        return (False, medula_recete_no, 0, "Kullanıcı tarafından durduruldu")
+
+    # Kısa bekleme - seçim işleminin tamamlanması için
+    adim_baslangic = time.time()
+    bot.bekle(0.3)
+
+    # Direkt sağ tıkla ve "Takip Et" - checkbox kontrolü YOK
+    takip_basarili = bot.ilk_ilaca_sag_tik_ve_takip_et()
+
+    if takip_basarili:
+        # Takip edilen ilaç sayısını say
+        try:
+            cells = bot.main_window.descendants(control_type="DataItem")
+            takip_sayisi = sum(1 for cell in cells if "Seçim satır" in cell.window_text())
+            logger.info(f"✓ {takip_sayisi} ilaç takip edildi")
+        except Exception as e:
+            logger.debug(f"Takip sayısı alınamadı: {type(e).__name__}")
+            takip_sayisi = 1
+    else:
+        logger.warning("⚠ Takip Et başarısız - pencere kapatılıyor")
+        takip_sayisi = 0
+
+    log_sure("İlaç seçimi ve takip", adim_baslangic, "ilac_secim_bekleme")
+
+    # İlaç Listesi penceresini kapat
+    adim_baslangic = time.time()
+    bot.ilac_listesi_penceresini_kapat()
+    log_sure("İlaç penceresi kapatma", adim_baslangic, "kapat_butonu")
+
+    # Ana Medula penceresine geri dön (main_window'u geri yükle)
+    bot.main_window = ana_pencere
+
+    # MEDULA penceresine odaklan ve hazır olmasını bekle
+    try:
+        bot.main_window.set_focus()
+        bot.bekle(0.5)  # Pencere odaklanması için bekle
+        logger.info(f"✓ MEDULA penceresine geri dönüldü: {bot.main_window.window_text()}")
+    except Exception as focus_err:
+        logger.warning(f"⚠ MEDULA odaklama hatası: {type(focus_err).__name__}, yeniden bağlanılıyor...")
+        # Yeniden bağlan
+        if not bot.baglanti_kur("MEDULA"):
+            logger.error("❌ MEDULA'ya yeniden bağlanılamadı")
+        else:
+            logger.info("✓ MEDULA'ya yeniden bağlanıldı")
+
+    # DURDURMA KONTROLÜ - geri dön'den önce
+    if should_stop():
+        logger.info("⏸ İşlem durduruldu (kullanıcı talebi)")
+        return (False, medula_recete_no, takip_sayisi, "Kullanıcı tarafından durduruldu")
+
+    # Geri Dön butonuna tıkla (İlaç Listesi → Reçete Ana Sayfasına geçiş)
+    adim_baslangic = time.time()
+    geri_don = bot.geri_don_butonuna_tikla()
+    log_sure("Geri Dön butonu", adim_baslangic, "geri_don_butonu")
+    if not geri_don:
+        log_recete_baslik()
+        return (False, medula_recete_no, takip_sayisi, "Geri Dön butonu başarısız")
+
+    # ÖNEMLİ: Rapor toplama işlemi Geri Dön'den SONRA yapılmalı!
+    # Çünkü Rapor butonu (f:buttonRaporListesi) Reçete Ana Sayfasında (ReceteListe.jsp) bulunur.
+    # Geri Dön'e tıklandıktan sonra bu sayfaya geçilir ve Rapor butonu görünür olur.
+    # Rapor toplama sonrası Sonraki butonuna basılıp basılmadığını takip et
+    sonraki_zaten_basildi = False
+
+    if rapor_toplama_aktif and rapor_takip:
+        try:
+            if session_logger:
+                session_logger.info("🔵 Rapor toplama başlatılıyor (Reçete Ana Sayfasında)...")
+
+            adim_baslangic = time.time()
+            rapor_verileri = bot.rapor_listesini_topla()
+            log_sure("Rapor toplama", adim_baslangic, "rapor_toplama")
+
+            if rapor_verileri:
+                # Sonraki butonu basılmış mı kontrol et
+                sonraki_zaten_basildi = rapor_verileri.get('sonraki_basildi', False)
+
+                if rapor_verileri.get('raporlar'):
+                    ad_soyad = rapor_verileri.get('ad_soyad', 'Bilinmeyen')
+                    telefon = rapor_verileri.get('telefon', '')
+                    raporlar = rapor_verileri.get('raporlar', [])
+
+                    # Raporları CSV'ye kaydet
+                    rapor_takip.toplu_rapor_ekle(ad_soyad, telefon, raporlar, grup)
+                    logger.info(f"✓ Hasta raporları kaydedildi: {ad_soyad}")
+                    if session_logger:
+                        session_logger.basari(f"✅ {len(raporlar)} rapor CSV'ye kaydedildi - {ad_soyad} ({telefon})")
+                else:
+                    logger.info("Bu hastada rapor bulunamadı")
+                    if session_logger:
+                        session_logger.warning(f"⚠️ Rapor bulunamadı - {rapor_verileri.get('ad_soyad', 'Bilinmeyen')}")
+            else:
+                logger.info("Rapor okuma başarısız")
+                if session_logger:
+                    session_logger.warning("⚠️ Rapor okuma başarısız (rapor butonu tıklanamadı)")
+        except Exception as e:
+            logger.warning(f"Rapor kaydetme hatası (devam ediliyor): {e}")
+            if session_logger:
+                session_logger.error(f"❌ Rapor kaydetme hatası: {e}")
+
+    # SONRA butonuna tıkla - SADECE rapor toplarken basılmadıysa (5 deneme)
+    if sonraki_zaten_basildi:
+        logger.info("✓ Sonraki butonu rapor sayfasından zaten basıldı, atlanıyor...")
+    else:
+        adim_baslangic = time.time()
+        sonra = bot.retry_with_popup_check(
+            lambda: bot.sonra_butonuna_tikla(),
+            "SONRA butonu",
+            max_retries=5
+        )
+        log_sure("Sonra butonu", adim_baslangic, "sonra_butonu")
+        if not sonra:
+            log_recete_baslik()
+            return (False, medula_recete_no, takip_sayisi, "SONRA butonu başarısız")
+
+    # Toplam reçete süresi
+    toplam_sure = time.time() - recete_baslangic
+    if session_logger:
+        session_logger.adim("Reçete", toplam_sure, recete=medula_recete_no,
+                            baslangic=recete_baslangic, sira=recete_sira_no)
+    if toplam_sure >= 60:
+        dakika = int(toplam_sure // 60)
+        saniye = int(toplam_sure % 60)
+        logger.info(f"🕐 TOPLAM: {dakika}dk {saniye}s")
+    else:
+        logger.info(f"🕐 TOPLAM: {toplam_sure:.2f}s")
+
+    return (True, medula_recete_no, takip_sayisi, None)
+
+
+def medula_yeniden_baslat_ve_giris_yap(bot, grup="A", son_recete=None):
+    """
+    Sistemsel hata durumunda MEDULA'yı yeniden başlatır ve giriş yapar
+
+    Args:
+        bot: Medula sürücüsü (BotanikBot veya medula_surucu.TekrarSurucu)
+        grup: Hangi gruba gidileceği ("A", "B" veya "C")
+        son_recete: Son işlenen reçete numarası (varsa bu reçeteden devam edilir)
+
+    Returns:
+        bool: Başarılıysa True
+
+    Raises:
+        Exception: Yeniden başlatma başarısız olursa
+    """
+    try:
+        from medula_settings import get_medula_settings
+
+
+        logger.info("=" * 60)
+        logger.error("🔄 SİSTEMSEL HATA - MEDULA YENİDEN BAŞLATILIYOR...")
+        logger.info("=" * 60)
+
+        # 1. MEDULA'yı kapat
+        logger.info("1️⃣ MEDULA kapatılıyor...")
+        bot.medula_taskkill()
+        bot.bekle(3)  # Programın tamamen kapanması için ekstra bekleme
+
+        # 2. Ayarları yükle
+        medula_settings = get_medula_settings()
+
+        # 3. MEDULA'yı aç ve giriş yap
+        logger.info("2️⃣ MEDULA açılıyor ve giriş yapılıyor...")
+        if not bot.medula_ac_ve_giris_yap(medula_settings):
+            logger.error("❌ MEDULA açma/giriş başarısız")
+            return False
+
+        # 4. Bot'un bağlantısını yenile
+        logger.info("3️⃣ Bot bağlantısı yenileniyor...")
+        # Cache'i temizle
+        bot.medula_hwnd = None
+        bot.medula_pid = None
+
+        # Yeni bağlantı kur
+        if not bot.baglanti_kur("MEDULA", ilk_baglanti=False):
+            logger.error("❌ Bot bağlantısı kurulamadı")
+            return False
+
+        # 5. Ana sayfaya git
+        logger.info("⏳ Ana sayfa yüklenmesi bekleniyor...")
+        bot.bekle(bot.timing.get("ana_sayfa"))
+
+        # 6. Reçete Listesi'ne git
+        logger.info("4️⃣ Reçete Listesi açılıyor...")
+        try:
+            if not bot.recete_listesi_ac():
+                logger.error("❌ Reçete Listesi açılamadı")
+                return False
+        except SistemselHataException as e:
+            logger.error(f"⚠️ Reçete Listesi açma sırasında sistemsel hata: {e}")
+            logger.warning("🔄 MEDULA bir kez daha yeniden başlatılacak...")
+            # Recursive call - kendini bir kez daha çağır (son_recete ile)
+            return medula_yeniden_baslat_ve_giris_yap(bot, grup, son_recete)
+
+        # 7. Dönem seç (index=2)
+        logger.info("5️⃣ Dönem seçiliyor...")
+        if not bot.donem_sec(index=2):
+            logger.warning("⚠ Dönem 2 seçilemedi, dönem 1 deneniyor...")
+            if not bot.donem_sec(index=1):
+                logger.error("❌ Dönem seçimi başarısız")
+                return False
+
+        # 8. Grup seç
+        logger.info(f"6️⃣ Grup {grup} seçiliyor...")
+        if not bot.grup_butonuna_tikla(grup):
+            logger.error(f"❌ Grup {grup} seçimi başarısız")
+            return False
+
+        # Pencereyi yenile
+        bot.baglanti_kur("MEDULA", ilk_baglanti=False)
+
+        # 8.5. Reçete bulunamadı kontrolü
+        logger.info("🔍 Reçete varlığı kontrol ediliyor...")
+        if bot.bulunamadi_mesaji_kontrol():
+            logger.warning(f"⚠ Grup {grup}'da bu dönem için reçete bulunamadı")
+
+            # Farklı dönemler dene
+            donem_bulundu = False
+            for donem_index in [1, 0]:  # Dönem 2 (index 1), Dönem 1 (index 0) dene
+                logger.info(f"🔄 Dönem {donem_index + 1} deneniyor...")
+
+                # Dönem seç
+                if not bot.donem_sec(index=donem_index):
+                    logger.warning(f"⚠ Dönem {donem_index + 1} seçilemedi")
+                    continue
+
+                # Grup seç
+                if not bot.grup_butonuna_tikla(grup):
+                    logger.error(f"❌ Grup {grup} seçimi başarısız")
+                    continue
+
+                # Pencereyi yenile
+                bot.baglanti_kur("MEDULA", ilk_baglanti=False)
+
+                # Tekrar kontrol et
+                if not bot.bulunamadi_mesaji_kontrol():
+                    logger.info(f"✅ Dönem {donem_index + 1}'de reçete bulundu!")
+                    donem_bulundu = True
+                    break
+                else:
+                    logger.warning(f"⚠ Dönem {donem_index + 1}'de de reçete bulunamadı")
+
+            if not donem_bulundu:
+                # Farklı grupları dene
+                logger.warning(f"⚠ Grup {grup}'da hiçbir dönemde reçete bulunamadı, diğer gruplar deneniyor...")
+                for alternatif_grup in ["A", "B", "C"]:
+                    if alternatif_grup == grup:
+                        continue
+
+                    logger.info(f"🔄 Grup {alternatif_grup} deneniyor...")
+
+                    # Dönem seç (index=2)
+                    if not bot.donem_sec(index=2):
+                        if not bot.donem_sec(index=1):
+                            continue
+
+                    # Grup seç
+                    if not bot.grup_butonuna_tikla(alternatif_grup):
+                        continue
+
+                    # Pencereyi yenile
+                    bot.baglanti_kur("MEDULA", ilk_baglanti=False)
+
+                    # Kontrol et
+                    if not bot.bulunamadi_mesaji_kontrol():
+                        logger.info(f"✅ Grup {alternatif_grup}'da reçete bulundu!")
+                        grup = alternatif_grup  # Grubu güncelle
+                        donem_bulundu = True
+                        break
+
+                if not donem_bulundu:
+                    logger.error("❌ Hiçbir grup ve dönemde reçete bulunamadı")
+                    return False
+
+        # 9. Son reçeteye git (varsa) veya ilk reçeteyi aç
+        if son_recete:
+            logger.info(f"7️⃣ Son reçeteye gidiliyor: {son_recete}")
+            # Reçete Sorgu sayfasını aç (KADEMELİ KURTARMA ile)
+            if not bot.recete_sorgu_ac_kademeli():
+                logger.warning("⚠ Reçete Sorgu açılamadı (kademeli kurtarma sonrası), ilk reçete açılıyor...")
+                if not bot.ilk_recete_ac():
+                    logger.error("❌ İlk reçete açılamadı")
+                    return False
+            else:
+                # Reçete numarasını yaz
+                bot.bekle(0.5)
+                if not bot.recete_no_yaz(son_recete):
+                    logger.warning(f"⚠ Reçete numarası yazılamadı: {son_recete}")
+                    if not bot.ilk_recete_ac():
+                        logger.error("❌ İlk reçete açılamadı")
+                        return False
+                else:
+                    # Sorgula butonuna tıkla
+                    bot.bekle(0.3)
+                    if not bot.sorgula_butonuna_tikla():
+                        logger.warning("⚠ Sorgula butonu tıklanamadı, ilk reçete açılıyor...")
+                        if not bot.ilk_recete_ac():
+                            logger.error("❌ İlk reçete açılamadı")
+                            return False
+                    else:
+                        # Sorgulama başarılı - şimdi listedeki ilk reçeteyi aç
+                        logger.info(f"✓ Reçete sorgulandı: {son_recete}")
+                        bot.bekle(0.5)  # Sorgu sonucunun yüklenmesi için bekle
+                        if not bot.ilk_recete_ac():
+                            logger.error("❌ Sorgulanan reçete açılamadı")
+                            return False
+                        logger.info(f"✓ Kaldığı reçete açıldı: {son_recete}")
+        else:
+            logger.info("7️⃣ İlk reçete açılıyor...")
+            if not bot.ilk_recete_ac():
+                logger.error("❌ İlk reçete açılamadı")
+                return False
+
+        logger.info("=" * 60)
+        logger.info(f"✅ MEDULA BAŞARIYLA YENİDEN BAŞLATILDI - GRUP {grup}")
+        if son_recete:
+            logger.info(f"📍 Kaldığı yerden devam: {son_recete}")
+        logger.info("=" * 60)
+        bot.bekle(2)  # Kullanıcının mesajı görmesi için
+
+        return True
+
+    except Exception as e:
+        logger.error(f"❌ MEDULA yeniden başlatma hatası: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def tek_recete_rapor_kontrol(bot, recete_sira_no, grup="", session_logger=None, stop_check=None,
+                              onceden_okunan_recete_no=None, renkli_kontrol=None):
+    """
+    Tek bir reçete için SADECE rapor kontrol işlemi yap.
+    (İlaç takip ve rapor toplama YOK - sadece renkli reçete kontrolü)
+
+    Medula okuması (rapor_kontrol_oku) ile kural değerlendirmesinin
+    (rapor_kontrol_degerlendir) ardışık birleşimidir; rapor_kontrol_hatti
+    aynı iki yarıyı ardışık düzende (pipeline) çalıştırır.
+
+    Args:
+        bot: Medula sürücüsü (BotanikBot veya medula_surucu.TekrarSurucu)
+        recete_sira_no: Reçete sıra numarası (1, 2, 3...)
+        grup: Grup bilgisi (A, B, C, GK)
+        session_logger: SessionLogger instance
+        stop_check: Durdurma kontrolü callback
+        onceden_okunan_recete_no: Önceden okunan reçete numarası
+        renkli_kontrol: RenkliReceteKontrol instance
+
+    Returns:
+        tuple: (başarı, medula_recete_no, sorun_var_mi, mesaj)
+    """
+    okuma = rapor_kontrol_oku(bot, recete_sira_no, session_logger, stop_check, onceden_okunan_recete_no)
+    return rapor_kontrol_degerlendir(okuma, renkli_kontrol, grup)
+
+
+def rapor_kontrol_oku(bot, recete_sira_no, session_logger=None, stop_check=None,
+                      onceden_okunan_recete_no=None):
+    """
+    Rapor kontrolünün Medula (UI) yarısı: reçete no, tür ve doz raporunu oku,
+    SONRA butonuyla sonraki reçeteye geç. Kural değerlendirmesi yapmaz —
+    pywinauto/COM çağırdığı için tek thread'den çağrılmalıdır.
+
+    Returns:
+        dict: sira, recete_no, recete_turu, doz_rapor (okunamadıysa None),
+              durum (None: tamam, "durduruldu_bas", "numara_yok", "durduruldu",
+              "sonra_basarisiz", "hata"), hata (durum "hata" ise mesaj)
+    """
+    def should_stop():
+        if stop_check and callable(stop_check):
+            return stop_check()
+        return False
+
+    okuma = {"sira": recete_sira_no, "recete_no": None, "recete_turu": None,
+             "doz_rapor": None, "durum": None, "hata": None}
+    if session_logger:
+        session_logger.aktif_recete = None
+
+    if should_stop():
+        logger.info("⏸ İşlem durduruldu (kullanıcı talebi)")
+        okuma["durum"] = "durduruldu_bas"
+        return okuma
+
+    try:
+        # 1. Reçete numarasını al
+        if onceden_okunan_recete_no:
+            medula_recete_no = onceden_okunan_recete_no
+        else:
+            # Hızlı tarama ile reçete no al
+            hizli_sonuc = bot.recete_sayfasi_hizli_tarama(max_deneme=2, bekleme_suresi=0.15)
+            if hizli_sonuc:
+                medula_recete_no = hizli_sonuc.get('recete_no')
+            else:
+                # Fallback
+                birlesik_sonuc = bot.recete_telefon_kontrol_birlesik(max_deneme=2, bekleme_suresi=0.2)
+                medula_recete_no = birlesik_sonuc.get('recete_no')
+
+        if not medula_recete_no:
+            logger.warning(f"⚠ Reçete {recete_sira_no}: Numara okunamadı")
+            okuma["durum"] = "numara_yok"
+            return okuma
+
+        okuma["recete_no"] = medula_recete_no
+        if session_logger:
+            session_logger.aktif_recete = medula_recete_no
+        logger.info(f"📋 REÇETE {recete_sira_no} | No: {medula_recete_no}")
+
+        # 2. Reçete türünü oku
+        recete_turu = bot.recete_turu_oku()
+
+        if not recete_turu:
+            logger.warning(f"⚠ Reçete {medula_recete_no}: Tür okunamadı, Normal kabul ediliyor")
+            recete_turu = "Normal"
+
+        okuma["recete_turu"] = recete_turu
+        logger.info(f"📝 Reçete türü: {recete_turu}")
+
+        # 3. Doz kontrolü (raporlu ilaçlar için rapor sayfasından doz oku)
+        if should_stop():
+            okuma["durum"] = "durduruldu"
+            return okuma
+
+        try:
+            doz_rapor = bot.sadece_doz_kontrolu(session_logger, stop_check)
+
+            # İlaç tablosunda hiç satır bulunamadıysa sayfa düşmüş olabilir
+            if doz_rapor['toplam_ilac'] == 0:
+                logger.warning(f"⚠ İlaç tablosunda satır bulunamadı - sayfa düşmüş olabilir!")
+                # Çıkış butonu kontrolü ile sayfa durumunu doğrula
+                try:
+                    if not bot.cikis_butonu_var_mi():
+                        logger.error("❌ Çıkış butonu da bulunamadı - MEDULA oturumu düşmüş!")
+                        raise SistemselHataException("MEDULA oturumu düşmüş - ilaç tablosu ve çıkış butonu bulunamadı")
+                    else:
+                        logger.info("Çıkış butonu mevcut - sayfa açık ama ilaç tablosu boş")
+                except SistemselHataException:
+                    raise
+                except Exception as e:
+                    logger.error(f"Çıkış butonu kontrol hatası: {e}")
+                    raise SistemselHataException("MEDULA durumu belirsiz - ilaç tablosu boş ve çıkış butonu kontrol edilemedi")
+
+            okuma["doz_rapor"] = doz_rapor
+
+        except SistemselHataException:
+            raise
+        except Exception as e:
+            logger.error(f"Doz kontrolü hatası: {e}")
+
+        # 4. Sonraki reçeteye geç
+        if should_stop():
+            okuma["durum"] = "durduruldu"
+            return okuma
+
+        sonra = bot.retry_with_popup_check(
+            lambda: bot.sonra_butonuna_tikla(),
+            "SONRA butonu",
+            max_retries=5
+        )
+
+        if not sonra:
+            logger.error(f"❌ Reçete {medula_recete_no}: SONRA butonu başarısız")
+            okuma["durum"] = "sonra_basarisiz"
+        return okuma
+
+    except Exception as e:
+        logger.error(f"❌ Reçete kontrol hatası: {e}")
+        okuma["durum"] = "hata"
+        okuma["hata"] = str(e)
+        return okuma
+
+
+def rapor_kontrol_degerlendir(okuma, renkli_kontrol=None, grup=""):
+    """
+    Rapor kontrolünün kural yarısı: rapor_kontrol_oku çıktısını renkli reçete
+    ve doz kurallarına göre değerlendir; okuma rapor_kontrol_kurallari'ndan
+    geçtiyse SUT uyarılarını da sonuca ekle. Medula'ya dokunmaz.
+
+    Returns:
+        tuple: (başarı, medula_recete_no, sorun_var_mi, mesaj) —
+               tek_recete_rapor_kontrol ile aynı
+    """
+    durum = okuma["durum"]
+    medula_recete_no = okuma["recete_no"]
+    if durum == "durduruldu_bas":
+        return (False, None, False, "Kullanıcı tarafından durduruldu")
+    if durum == "numara_yok":
+        return (False, None, False, "Reçete numarası okunamadı")
+    if durum == "hata":
+        return (False, medula_recete_no, False, okuma["hata"])
+
+    try:
+        # Renkli reçete kontrolü
+        sorun_var = False
+        mesaj = ""
+
+        if renkli_kontrol:
+            sorun_var, mesaj = renkli_kontrol.kontrol_et(medula_recete_no, okuma["recete_turu"], grup)
+            if sorun_var:
+                logger.warning(f"⚠ {mesaj}")
+        else:
+            logger.debug("Renkli reçete kontrolü aktif değil")
+
+        # Doz kontrolü
+        doz_rapor = okuma["doz_rapor"]
+        if doz_rapor:
+            if doz_rapor['doz_asimi'] > 0:
+                sorun_var = True
+                logger.warning(f"⚠ Reçetede {doz_rapor['doz_asimi']} adet doz aşımı var")
+
+            if doz_rapor['okunamayanlar'] > 0:
+                logger.info(f"⚠ {doz_rapor['okunamayanlar']} ilaç için doz okunamadı")
+
+        # SUT kural uyarıları (rapor_kontrol_kurallari aşaması çalıştıysa)
+        uyarilar = okuma.get("kural_uyarilari") or []
+        if uyarilar:
+            sorun_var = True
+            sut_mesaj = "; ".join(f"SUT {u['ilac_adi']}: {u['sonuc']} — {u['mesaj']}" for u in uyarilar)
+            logger.warning(f"⚠ {sut_mesaj}")
+            mesaj = f"{mesaj} | {sut_mesaj}" if mesaj else sut_mesaj
+
+    except Exception as e:
+        logger.error(f"❌ Reçete kontrol hatası: {e}")
+        return (False, medula_recete_no, False, str(e))
+
+    if durum == "durduruldu":
+        return (True, medula_recete_no, sorun_var, "Durduruldu")
+    if durum == "sonra_basarisiz":
+        return (False, medula_recete_no, sorun_var, "SONRA butonu başarısız")
+    return (True, medula_recete_no, sorun_var, mesaj if sorun_var else "OK")
+
+
+def rapor_kontrol_zenginlestirici(db_getir=None):
+    """
+    rapor_kontrol_hatti için EOS zenginleştirme aşaması üret.
+
+    Okunan her raporlu ilaç (doz_rapor['detaylar']) için Botanik EOS'tan etken
+    madde(ler) SELECT ile çekilir, rapor tedavi şemasında eşleşen etken bulunur
+    ve SUT kontrolünün beklediği ilac_sonuc dict'i okuma["ilac_sonuclari"]
+    altına kurulur. Aynı ilaç adı oturum boyunca bir kez sorgulanır; EOS
+    yanıt vermezse etken madde boş kalır, okuma yine geçer.
+
+    Args:
+        db_getir: fn() → etkin_madde_getir_ilac_adiyla sağlayan nesne;
+                  varsayılan botanik_db.get_botanik_db (ilk reçetede, aşama thread'inde)
+
+    Returns:
+        fn(okuma) → okuma — tek işçili aşama içindir (önbellek kilitsizdir)
+    """
+    from recete_kontrol.tr_normalize import norm_tr_upper
+
+    onbellek = {}
+    db_kutu = []
+
+    def etkenler(ilac_adi):
+        if ilac_adi in onbellek:
+            return onbellek[ilac_adi]
+        if not db_kutu:
+            if db_getir is None:
+                from botanik_db import get_botanik_db
+                db_kutu.append(get_botanik_db())
+            else:
+                db_kutu.append(db_getir())
+        db = db_kutu[0]
+        try:
+            bulunan = db.etkin_madde_getir_ilac_adiyla(ilac_adi)
+            if not bulunan and " " in ilac_adi:
+                # Medula adı EOS ürün adından uzun olabilir: marka ile tekrar dene
+                bulunan = db.etkin_madde_getir_ilac_adiyla(ilac_adi.split()[0])
+        except Exception as e:
+            logger.warning(f"EOS etken madde sorgusu başarısız ({ilac_adi}): {e}")
+            return []
+        onbellek[ilac_adi] = list(bulunan or [])
+        return onbellek[ilac_adi]
+
+    def zenginlestir(okuma):
+        doz_rapor = okuma.get("doz_rapor")
+        if not doz_rapor:
+            return okuma
+        ilac_sonuclari = []
+        for detay in doz_rapor.get("detaylar") or []:
+            ilac_adi = detay.get("ilac_adi") or ""
+            if not ilac_adi:
+                continue
+            etken = etkenler(ilac_adi)
+            etken_norm = [norm_tr_upper(e) for e in etken]
+            tedavi = detay.get("rapor_tedavi_semasi") or []
+            eslesen = next((ts for ts in tedavi
+                            if any(e and e in norm_tr_upper(ts.get("etkin_madde") or "")
+                                   for e in etken_norm)), None)
+            if eslesen is not None:
+                detay["eslesen_etkin_madde"] = eslesen.get("etkin_madde")
+            aciklamalar = list(detay.get("rapor_aciklamalari") or [])
+            ilac_sonuclari.append({
+                "ilac_adi": ilac_adi,
+                "etkin_madde": ", ".join(etken) or (eslesen or {}).get("etkin_madde", ""),
+                "rapor_kodu": detay.get("rapor_kodu") or "",
+                "rapor_aciklamalari": aciklamalar,
+                "rapor_metni": " ".join(aciklamalar),
+                "recete_teshisleri": [],
+                "recete_doz": detay.get("recete_doz"),
+                "rapor_tedavi_semasi": tedavi,
+            })
+        okuma["ilac_sonuclari"] = ilac_sonuclari
+        return okuma
+
+    return zenginlestir
+
+
+def rapor_kontrol_kurallari(okuma, kontrol_et=None):
+    """
+    Rapor kontrolünün SUT kural aşaması: okuma["ilac_sonuclari"]'ndaki her
+    kalemi anlik_kontrol.kontrol_et_tekil'den geçir; uyarı gerektiren
+    sonuçları okuma["kural_uyarilari"]'na yaz (rapor_kontrol_degerlendir
+    bunları reçete sonucuna ekler). Medula'ya ve EOS'a dokunmaz.
+
+    Args:
+        kontrol_et: fn(ilac_sonuc) → (kategori, KontrolRaporu); varsayılan
+                    anlik_kontrol.kontrol_et_tekil
+    """
+    from recete_kontrol.anlik_kontrol import uyari_gerekir_mi
+    if kontrol_et is None:
+        from recete_kontrol.anlik_kontrol import kontrol_et_tekil as kontrol_et
+
+    uyarilar = []
+    for ilac_sonuc in okuma.get("ilac_sonuclari") or []:
+        try:
+            kategori, rapor = kontrol_et(ilac_sonuc)
+        except Exception as e:
+            logger.warning(f"SUT kontrol hatası ({ilac_sonuc.get('ilac_adi')}): {e}")
+            continue
+        if rapor is not None and uyari_gerekir_mi(rapor.sonuc, kategori):
+            uyarilar.append({"ilac_adi": ilac_sonuc.get("ilac_adi"), "kategori": kategori,
+                             "sonuc": rapor.sonuc.value, "mesaj": rapor.mesaj})
+    okuma["kural_uyarilari"] = uyarilar
+    return okuma
+
+
+def rapor_kontrol_hatti(bot, adet=None, grup="", session_logger=None, stop_check=None,
+                        renkli_kontrol=None, zenginlestir=None, kuyruk_boyu=2,
+                        sonuc_geri_cagrisi=None, kural_kontrol=None, hazirla=None,
+                        baslangic_sira=1, ilk_recete_no=None):
+    """
+    Ardışık reçeteleri ardışık düzende (recete_hatti.ReceteHatti) rapor
+    kontrolünden geçir: bu thread Medula'dan N+1. reçeteyi okurken N. reçete
+    arka planda zenginleştirilir, SUT kurallarından geçer ve değerlendirilir.
+
+    Aşamalar: edinim (rapor_kontrol_oku, çağıran thread) → zenginlestirme
+    (verilirse; ör. rapor_kontrol_zenginlestirici) → kural_kontrol (verilirse;
+    ör. rapor_kontrol_kurallari) → degerlendirme (rapor_kontrol_degerlendir).
+    Değerlendirme tek işçilidir — RenkliReceteKontrol sayaçları thread
+    güvenli değildir. Zenginleştirme ve kural aşamalarının hatası reçeteyi
+    başarısız saymaz: reçete Medula'da okunmuş ve SONRA'ya basılmıştır,
+    hata loglanır ve okuma o aşamanın katkısı olmadan değerlendirilir.
+
+    Edinim, okuma başarısız olunca (numara okunamadı, SONRA başarısız, hata,
+    durdurma) o reçeteden sonra durur; kuyruktaki reçeteler yine değerlendirilir.
+
+    Args:
+        adet: en fazla okunacak reçete; None → hazirla/stop_check durdurana kadar
+        zenginlestir: fn(okuma) → okuma; değerlendirmeden önce arka planda çalışır
+        kural_kontrol: fn(okuma) → okuma; zenginleştirmeden sonra arka planda
+        kuyruk_boyu: okunup değerlendirilmemiş en fazla reçete (aşama başına)
+        sonuc_geri_cagrisi: fn(sonuc_tuple) — her reçete için sırayla
+            (hat işçi thread'inden; hızlı olmalı)
+        hazirla: fn(sira) → reçete no / None; ilk reçeteden sonraki her
+            reçetenin okumasından önce edinim thread'inde çağrılır. None
+            dönerse edinim (o reçeteyi okumadan) durur — çağıran kendi
+            döngüsüne döner (görev sonu, aynı reçete, renkli liste vb.)
+        baslangic_sira: ilk reçetenin sıra numarası
+        ilk_recete_no: ilk reçetenin önceden okunmuş numarası
+
+    Returns:
+        tuple: (sonuçlar, metrikler) — sonuçlar tek_recete_rapor_kontrol
+               tuple'larının sıralı listesi, metrikler ReceteHatti.metrikler()
+    """
+    from recete_hatti import Asama, ReceteHatti
+
+    def sonuca_cevir(s):
+        if s.hata is None:
+            return s.deger
+        return (False, s.girdi["recete_no"], False, str(s.hata))
+
+    def en_iyi_caba(ad, fn):
+        def sarili(okuma):
+            try:
+                return fn(okuma)
+            except Exception as e:
+                logger.warning(f"⚠ Rapor kontrol '{ad}' aşaması atlandı ({okuma.get('recete_no')}): {e}")
+                return okuma
+        return sarili
+
+    asamalar = []
+    if zenginlestir:
+        asamalar.append(Asama("zenginlestirme", en_iyi_caba("zenginlestirme", zenginlestir)))
+    if kural_kontrol:
+        asamalar.append(Asama("kural_kontrol", en_iyi_caba("kural_kontrol", kural_kontrol)))
+    asamalar.append(Asama("degerlendirme",
+                          lambda okuma: rapor_kontrol_degerlendir(okuma, renkli_kontrol, grup)))
+    geri_cagri = (lambda s: sonuc_geri_cagrisi(sonuca_cevir(s))) if sonuc_geri_cagrisi else None
+    hat = ReceteHatti(asamalar, kuyruk_boyu=kuyruk_boyu, sonuc_geri_cagrisi=geri_cagri)
+
+    def okuyucu():
+        sira = baslangic_sira
+        onceden = ilk_recete_no
+        while adet is None or sira < baslangic_sira + adet:
+            if sira != baslangic_sira and hazirla is not None:
+                onceden = hazirla(sira)
+                if not onceden:
+                    return
+            okuma = rapor_kontrol_oku(bot, sira, session_logger, stop_check, onceden)
+            yield okuma
+            if okuma["durum"] is not None:
+                break
+            sira += 1
+            onceden = None
+
+    sonuclar = [sonuca_cevir(s) for s in hat.isle(okuyucu())]
+    return sonuclar, hat.metrikler()
+
+
+class RaporHattiSureleri:
+    """
+    rapor_kontrol_hatti'nı süren döngü için reçete başına süre muhasebesi.
+
+    Edinim thread'i her reçeteyi okumadan önce basla() (okumadan vazgeçerse
+    vazgec()), hat işçisi sonuc_geri_cagrisi olarak sonuc_geldi() çağırır;
+    isle() biten sonuçları edinim thread'inde sırayla (sonuc, sure) olarak
+    verir. Başarılı reçetenin süresi orada sayılır (toplam_sure); sondaki
+    başarısız reçetenin süresi None döner ve kapanis_suresi() ile döngü
+    sonunda sayılır — hiçbir süre iki kez toplanmaz.
+    """
+
+    def __init__(self, ilk_baslangic, saat=time.time):
+        self.saat = saat
+        self._bitenler = deque()                # hat işçisi → edinim thread'i
+        self._baslangiclar = deque([ilk_baslangic])
+        self.son_sonuc = None
+        self.toplam_sure = 0.0
+        self._acik_baslangic = None             # sondaki başarısız reçetenin başlangıcı
+
+    def basla(self):
+        self._baslangiclar.append(self.saat())
+
+    def vazgec(self):
+        self._baslangiclar.pop()
+
+    def sonuc_geldi(self, sonuc):
+        self._bitenler.append((sonuc, self.saat()))
+
+    def isle(self):
+        """Biten sonuçları sırayla ver → (sonuc, sure); başarısızsa sure None."""
+        while self._bitenler:
+            sonuc, bitis = self._bitenler.popleft()
+            baslangic = self._baslangiclar.popleft() if self._baslangiclar else bitis
+            self.son_sonuc = sonuc
+            if not sonuc[0]:
+                self._acik_baslangic = baslangic
+                yield sonuc, None
+                continue
+            self._acik_baslangic = None
+            sure = bitis - baslangic
+            self.toplam_sure += sure
+            yield sonuc, sure
+
+    def kapanis_suresi(self):
+        """Döngü sonunda oturuma eklenecek süre: son sonuç başarısızsa o
+        reçetenin süresi, başarılıysa 0 (süresi isle()'de sayıldı)."""
+        if self._acik_baslangic is None:
+            return 0.0
+        return self.saat() - self._acik_baslangic
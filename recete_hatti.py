@@ -0,0 +1,281 @@
+"""
+Reçete hattı: sınırlı kuyruklu, aşamalı ardışık işleme (pipeline).
+
+Bot döngüsü her reçeteyi sırayla işler: Medula'dan oku → zenginleştir (EOS
+sorguları, rapor geçmişi) → kuralları değerlendir → sonrakine geç. UI
+otomasyonu beklerken CPU/DB işi, kontroller çalışırken UI boşta kalır.
+ReceteHatti bu adımları aşamalara böler:
+
+    edinim (çağıran thread, UI)  →  [kuyruk]  →  aşama 1  →  [kuyruk]  →  aşama 2 ...
+
+  - edinim tek thread'dir (pywinauto/COM çağıran thread); N. reçetenin
+    kontrolleri, N+1. reçete Medula'dan okunurken arka planda çalışır
+  - kuyruklar sınırlıdır (kuyruk_boyu): arka aşamalar yetişemezse edinim
+    bekler (geri basınç), bellek ve "okunup kontrol edilmemiş" reçete
+    sayısı sınırlı kalır
+  - bir aşamada birden çok işçi olabilir; sonuçlar yine de giriş sırasıyla
+    yayılır (sira numarası + yeniden sıralama tamponu)
+  - aşama hatası reçeteyi düşürmez: sonuç `hata` alanıyla yayılır, sonraki
+    aşamalar o reçeteyi atlar
+  - aşama başına kullanım ölçülür: meşgul / boş (girdi bekleme) / tıkalı
+    (çıktı kuyruğu dolu) süreleri
+
+Kullanım:
+    hat = ReceteHatti([Asama("zenginlestirme", zenginlestir),
+                       Asama("degerlendirme", degerlendir)], kuyruk_boyu=2)
+    sonuclar = hat.isle(okuyucu())          # okuyucu: UI'dan okuma üreteci
+    print(hat.metrikler())
+"""
+
+import logging
+import queue
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+_BITIS = object()
+
+# bitir() varsayılanı: takılan bir aşama otomasyon thread'ini sonsuza dek bekletmesin
+VARSAYILAN_BITIS_ZAMAN_ASIMI = 120.0
+
+
+class Asama:
+    """Hat aşaması: fn(deger) → yeni değer; `isci` paralel thread sayısı."""
+
+    __slots__ = ("ad", "fn", "isci")
+
+    def __init__(self, ad, fn, isci=1):
+        self.ad = ad
+        self.fn = fn
+        self.isci = max(1, int(isci))
+
+
+class HatSonucu:
+    """Yayılan sonuç: giriş sırası, edinimden gelen girdi, son değer, hata."""
+
+    __slots__ = ("sira", "girdi", "deger", "hata", "hata_asamasi")
+
+    def __init__(self, sira, girdi, deger=None, hata=None, hata_asamasi=None):
+        self.sira = sira
+        self.girdi = girdi
+        self.deger = deger
+        self.hata = hata
+        self.hata_asamasi = hata_asamasi
+
+    def __repr__(self):
+        durum = f"hata={self.hata!r}@{self.hata_asamasi}" if self.hata else f"deger={self.deger!r}"
+        return f"<HatSonucu {self.sira} {durum}>"
+
+
+class _Olcum:
+    __slots__ = ("adet", "mesgul", "bos", "tikali", "max_kuyruk")
+
+    def __init__(self):
+        self.adet = 0
+        self.mesgul = 0.0
+        self.bos = 0.0
+        self.tikali = 0.0
+        self.max_kuyruk = 0
+
+
+class ReceteHatti:
+    """Edinim + arka plan aşamaları; sıralı sonuç yayımı ve aşama metrikleri.
+
+    Args:
+        asamalar: Asama listesi (edinimden sonra sırayla)
+        kuyruk_boyu: aşamalar arası her kuyruğun kapasitesi (geri basınç)
+        sonuc_geri_cagrisi: her sonuç için giriş sırasıyla çağrılır
+            (son aşamanın işçi thread'inden; hızlı olmalı)
+        saat: süre ölçümü için saat (test için değiştirilebilir)
+    """
+
+    def __init__(self, asamalar, kuyruk_boyu=2, sonuc_geri_cagrisi=None, saat=time.perf_counter):
+        if not asamalar:
+            raise ValueError("En az bir aşama gerekli")
+        self.asamalar = list(asamalar)
+        self.kuyruk_boyu = max(1, int(kuyruk_boyu))
+        self.sonuc_geri_cagrisi = sonuc_geri_cagrisi
+        self.saat = saat
+        self._kuyruklar = None
+        self._threadler = []
+        self._lock = threading.Lock()
+        self._yayim_kilidi = threading.Lock()   # geri çağrıları sırada tutar; _lock'suz
+        self._biten_isci = []
+        self._bitti = threading.Event()
+        self._tampon = {}
+        self._siradaki = 0
+        self._gonderilen = 0
+        self._sonuclar = []
+        self._olcumler = {}
+        self._baslangic = None
+        self._bitis = None
+
+    # ── Yaşam döngüsü ────────────────────────────────────────────────────
+
+    def baslat(self):
+        """Aşama işçilerini başlat (isle() bunu kendisi çağırır)."""
+        if self._kuyruklar is not None:
+            raise RuntimeError("Hat zaten başlatıldı")
+        self._kuyruklar = [queue.Queue(self.kuyruk_boyu) for _ in self.asamalar]
+        self._biten_isci = [0] * len(self.asamalar)
+        self._olcumler = {"edinim": _Olcum()}
+        for asama in self.asamalar:
+            self._olcumler[asama.ad] = _Olcum()
+        self._baslangic = self.saat()
+        for k, asama in enumerate(self.asamalar):
+            for i in range(asama.isci):
+                t = threading.Thread(target=self._isci, args=(k,), daemon=True,
+                                     name=f"ReceteHatti-{asama.ad}-{i}")
+                t.start()
+                self._threadler.append(t)
+        return self
+
+    def gonder(self, girdi):
+        """Edinim çıktısını hatta ver; ilk kuyruk doluysa yer açılana kadar bekler."""
+        olcum = self._olcumler["edinim"]
+        oge = (self._gonderilen, girdi, girdi, None, None)
+        self._gonderilen += 1
+        t0 = self.saat()
+        self._kuyruklar[0].put(oge)
+        olcum.tikali += self.saat() - t0
+        olcum.adet += 1
+        olcum.max_kuyruk = max(olcum.max_kuyruk, self._kuyruklar[0].qsize())
+
+    def bitir(self, zaman_asimi=VARSAYILAN_BITIS_ZAMAN_ASIMI):
+        """Edinimi kapat, kalan işleri bitir; sonuçları giriş sırasıyla döndür.
+
+        zaman_asimi dolarsa (takılan aşama) o ana kadar yayılan sonuçlarla
+        döner; işçiler daemon'dur, süreci tutmaz. None: sınırsız bekle.
+        """
+        for _ in range(self.asamalar[0].isci):
+            self._kuyruklar[0].put(_BITIS)
+        son = None if zaman_asimi is None else time.monotonic() + zaman_asimi
+        if not self._bitti.wait(zaman_asimi):
+            logger.warning(f"Reçete hattı {zaman_asimi} sn içinde bitmedi; "
+                           f"{self._gonderilen - len(self._sonuclar)} reçete yayılmadı")
+        for t in self._threadler:
+            t.join(None if son is None else max(0.0, son - time.monotonic()))
+        self._bitis = self.saat()
+        with self._lock:
+            return list(self._sonuclar)
+
+    def isle(self, kaynak):
+        """kaynak'ı (edinim üreteci) bu thread'de tüket, hattan geçir.
+
+        Edinim meşgul süresi kaynak'ın bir sonraki öğeyi üretme süresidir.
+        """
+        self.baslat()
+        olcum = self._olcumler["edinim"]
+        yineleyici = iter(kaynak)
+        try:
+            while True:
+                t0 = self.saat()
+                try:
+                    girdi = next(yineleyici)
+                except StopIteration:
+                    break
+                finally:
+                    olcum.mesgul += self.saat() - t0
+                self.gonder(girdi)
+        finally:
+            sonuclar = self.bitir()
+        return sonuclar
+
+    # ── İşçiler ──────────────────────────────────────────────────────────
+
+    def _isci(self, k):
+        asama = self.asamalar[k]
+        olcum = self._olcumler[asama.ad]
+        giris = self._kuyruklar[k]
+        son_asama = k == len(self.asamalar) - 1
+        cikis = None if son_asama else self._kuyruklar[k + 1]
+        while True:
+            t0 = self.saat()
+            oge = giris.get()
+            t1 = self.saat()
+            if oge is _BITIS:
+                self._isci_bitti(k)
+                return
+            sira, girdi, deger, hata, hata_asamasi = oge
+            if hata is None:
+                try:
+                    deger = asama.fn(deger)
+                except Exception as e:
+                    logger.warning(f"Reçete hattı '{asama.ad}' hatası (sıra {sira}): {e}")
+                    deger, hata, hata_asamasi = None, e, asama.ad
+            t2 = self.saat()
+            with self._lock:
+                olcum.bos += t1 - t0
+                olcum.mesgul += t2 - t1
+                olcum.adet += 1
+            if son_asama:
+                self._yay(HatSonucu(sira, girdi, deger, hata, hata_asamasi))
+            else:
+                cikis.put((sira, girdi, deger, hata, hata_asamasi))
+                t3 = self.saat()
+                with self._lock:
+                    olcum.tikali += t3 - t2
+                    olcum.max_kuyruk = max(olcum.max_kuyruk, cikis.qsize())
+
+    def _isci_bitti(self, k):
+        with self._lock:
+            self._biten_isci[k] += 1
+            hepsi = self._biten_isci[k] == self.asamalar[k].isci
+        if not hepsi:
+            return
+        if k == len(self.asamalar) - 1:
+            self._bitti.set()
+        else:
+            for _ in range(self.asamalar[k + 1].isci):
+                self._kuyruklar[k + 1].put(_BITIS)
+
+    def _yay(self, sonuc):
+        """Sonucu tampona al; sıradaki hazırsa sırayla yay.
+
+        Geri çağrı _lock bırakıldıktan sonra çağrılır (metrikler() vb.
+        çağırabilir); _yayim_kilidi çok işçide de giriş sırasını korur.
+        """
+        with self._yayim_kilidi:
+            hazirlar = []
+            with self._lock:
+                self._tampon[sonuc.sira] = sonuc
+                while self._siradaki in self._tampon:
+                    hazir = self._tampon.pop(self._siradaki)
+                    self._siradaki += 1
+                    self._sonuclar.append(hazir)
+                    hazirlar.append(hazir)
+            if not self.sonuc_geri_cagrisi:
+                return
+            for hazir in hazirlar:
+                try:
+                    self.sonuc_geri_cagrisi(hazir)
+                except Exception as e:
+                    logger.warning(f"Reçete hattı sonuç geri çağrısı hatası: {e}")
+
+    # ── Metrikler ────────────────────────────────────────────────────────
+
+    def metrikler(self):
+        """Aşama başına adet, meşgul/boş/tıkalı süre ve kullanım oranı.
+
+        Returns:
+            dict: {"sure_sn": toplam, "asamalar": {ad: {isci, adet, mesgul_sn,
+                   bos_sn, tikali_sn, kullanim, max_kuyruk}}}
+        """
+        bitis = self._bitis if self._bitis is not None else self.saat()
+        sure = max(bitis - (self._baslangic or bitis), 1e-9)
+        asamalar = {}
+        iscler = {"edinim": 1}
+        iscler.update({a.ad: a.isci for a in self.asamalar})
+        with self._lock:
+            for ad, o in self._olcumler.items():
+                asamalar[ad] = {
+                    "isci": iscler[ad],
+                    "adet": o.adet,
+                    "mesgul_sn": round(o.mesgul, 4),
+                    "bos_sn": round(o.bos, 4),
+                    "tikali_sn": round(o.tikali, 4),
+                    "kullanim": round(o.mesgul / (sure * iscler[ad]), 3),
+                    "max_kuyruk": o.max_kuyruk,
+                }
+        return {"sure_sn": round(sure, 4), "asamalar": asamalar}
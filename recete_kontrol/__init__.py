@@ -4,12 +4,30 @@ Reçete Kontrol Modülü
 
 SUT kurallarına göre reçete uygunluk kontrolü yapar.
 Her ilaç grubu için ayrı kontrol sınıfları bulunur.
+
+Paket dışa açtığı adları TEMBEL yükler (PEP 562 ``__getattr__``):
+``import recete_kontrol.anlik_kontrol`` artık 24 bin satırlık
+sut_kontrolleri'ni peşinen içe aktarmaz; ``recete_kontrol.sut_kontrol_yap``
+gibi bir ada ilk erişildiğinde ilgili alt modül yüklenir ve ad paket
+sözlüğüne yazılır (sonraki erişimler doğrudan). Açılışta ısıtmak için
+``on_isitma`` modülüne bakın.
 """
 
-from .kontrol_motoru import KontrolMotoru, get_kontrol_motoru
-from .base_kontrol import BaseKontrol, KontrolSonucu, KontrolRaporu
-from .renkli_recete import RenkliReceteKontrol, get_renkli_recete_kontrol, RenkliReceteKontrolRaporu
-from .sut_kontrolleri import sut_kontrol_yap, sut_kategorisi_tespit_et
+import importlib
+
+# Dışa açılan ad → tanımlandığı alt modül
+_TEMBEL_ADLAR = {
+    'KontrolMotoru': '.kontrol_motoru',
+    'get_kontrol_motoru': '.kontrol_motoru',
+    'BaseKontrol': '.base_kontrol',
+    'KontrolSonucu': '.base_kontrol',
+    'KontrolRaporu': '.base_kontrol',
+    'RenkliReceteKontrol': '.renkli_recete',
+    'get_renkli_recete_kontrol': '.renkli_recete',
+    'RenkliReceteKontrolRaporu': '.renkli_recete',
+    'sut_kontrol_yap': '.sut_kontrolleri',
+    'sut_kategorisi_tespit_et': '.sut_kontrolleri',
+}
 
 __all__ = [
     'KontrolMotoru', 'get_kontrol_motoru',
@@ -17,3 +35,18 @@ __all__ = [
     'RenkliReceteKontrol', 'get_renkli_recete_kontrol', 'RenkliReceteKontrolRaporu',
     'sut_kontrol_yap', 'sut_kategorisi_tespit_et'
 ]
+
+
+def __getattr__(ad):
+    modul_adi = _TEMBEL_ADLAR.get(ad)
+    if modul_adi is None:
+        # Alt modül adları (from recete_kontrol import sut_kontrolleri) için
+        # import sistemi AttributeError'dan sonra kendisi yükler.
+        raise AttributeError(f"module {__name__!r} has no attribute {ad!r}")
+    deger = getattr(importlib.import_module(modul_adi, __name__), ad)
+    globals()[ad] = deger
+    return deger
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -125,6 +125,12 @@ def alerji_asisi_kapsami_mi(ilac_sonuc: Dict) -> bool:
             or _iceriyor(m, ORAL_TICARI))
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc_icerir': ('V01AA',),   # _ATC_RE
+    'metin': SOLUNUM_TICARI | VENOM_TICARI | ORAL_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # Yardımcılar
 # ═══════════════════════════════════════════════════════════════════════
@@ -189,6 +189,12 @@ def alprostadil_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, ALPROSTADIL_ETKEN) or _iceriyor(m, ALPROSTADIL_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_ALPROSTADIL_UROLOJIK,
+    'metin': ALPROSTADIL_ETKEN | ALPROSTADIL_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # İLK / DEVAM DİSPATCHER
 # ═══════════════════════════════════════════════════════════════════════
@@ -11,6 +11,13 @@ Yönlendirme önceliği:
   4) Genel master dispatcher (sut_kontrolleri.sut_kontrol_yap) — kategori tespit
      + KATEGORI_KONTROL_FONKSIYONU haritası (diyabet/statin/hepatit/klop/...)
 
+Özel + atomik modüller tek bir sıralı tabloda (_DISPATCH_TABLOSU) durur.
+Her kalemde 40 tespitçiyi sırayla çağırmak yerine, modüllerin ihraç ettiği
+DISPATCH_ANAHTARLARI bildirimlerinden (ATC öneki / ad-etken ibaresi) ilk
+çağrıda bir indeks kurulur; kalem yalnızca anahtarı tutan 0–2 aday modüle
+(+ bildirimi olmayanlara) gider. Aday sırası tablo sırasıdır, yani sonuç
+kontrol_et_tekil_sirali (eski tam tarama) ile birebir aynıdır.
+
 ⚠️ Botanik EOS kırmızı çizgisi: bu modül DB'ye yazmaz; yalnızca verilen
 ilac_sonuc dict'i üzerinde saf hesaplama yapar.
 """
@@ -18,9 +25,11 @@ ilac_sonuc dict'i üzerinde saf hesaplama yapar.
 from __future__ import annotations
 
 import importlib
-from typing import Dict, List, Optional, Tuple
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
 
 from recete_kontrol.base_kontrol import KontrolRaporu, KontrolSonucu
+from recete_kontrol.tr_normalize import norm_tr_upper
 
 # Uyarı çıkaran sonuçlar (kullanıcı kuralı 2026-06-04: UYGUN DEĞİL + TIBBEN +
 # ŞÜPHELİ + ŞARTLI). UYGUN / DİĞER RAPOR UYGUN / ATLANDI sessiz geçer.
@@ -167,13 +176,16 @@ def _ek_modul_dispatch(ilac_sonuc: Dict) -> Tuple[Optional[str], Optional[Kontro
     bağlamında → migren modülü ATLANDI). Bu durumda kısa-devre YAPMA;
     sonraki modüllere ve genel dispatcher'a düşmesine izin ver (topiramat
     epilepsi → ANTIEPILEPTIK). ATLANDI = "benim kuralım değil, aramaya devam".
+
+    Fonksiyonlar satır başına importlib ile değil, paylaşılan indeksin bir
+    kez çözdüğü tablodan alınır.
     """
-    for kategori, modul_yolu, tespit_adi, giris_adi in _EK_MODUL_DISPATCH:
+    indeks = dispatch_indeksi()
+    for i in range(len(_ONCELIKLI_DISPATCH), len(_DISPATCH_TABLOSU)):
+        kategori = _DISPATCH_TABLOSU[i][0]
         try:
-            modul = importlib.import_module(modul_yolu)
-            tespit = getattr(modul, tespit_adi)
+            tespit, giris = indeks.fonksiyon(i)
             if tespit(ilac_sonuc):
-                giris = getattr(modul, giris_adi)
                 rapor = giris(ilac_sonuc)
                 if rapor is not None and rapor.sonuc == KontrolSonucu.ATLANDI:
                     continue  # bu kural uygulanmadı — aramaya devam
@@ -194,84 +206,202 @@ def uyari_gerekir_mi(sonuc: Optional[KontrolSonucu],
     return sonuc in UYARI_SONUCLARI
 
 
-def kontrol_et_tekil(ilac_sonuc: Dict) -> Tuple[Optional[str], Optional[KontrolRaporu]]:
-    """Tek bir reçete kalemini uygun SUT kontrolüne yönlendir.
-
-    Returns: (kategori, KontrolRaporu) — kontrol uygulanmadıysa (None, None).
-    """
+# ═══════════════════════════════════════════════════════════════════════
+# DİSPATCH TABLOSU + ANAHTAR İNDEKSİ
+# ═══════════════════════════════════════════════════════════════════════
+# Öncelikli 7 özel modül: tespitçi True → sonuç ATLANDI olsa bile döner.
+# Format: _EK_MODUL_DISPATCH ile aynı.
+_ONCELIKLI_DISPATCH: List[Tuple[str, str, str, str]] = [
     # 1) 4.2.9.A — ESA (eritropoietin/darbepo/Mircera/roksadustat)
-    try:
-        from recete_kontrol.eritropoietin_4_2_9_a import (
-            _ilac_sinifi as _esa_sinifi, eritropoietin_kontrol_4_2_9_a)
-        if _esa_sinifi(ilac_sonuc):
-            return 'ERITROPOIETIN', eritropoietin_kontrol_4_2_9_a(ilac_sonuc)
-    except Exception:
-        pass
-
+    ('ERITROPOIETIN', 'recete_kontrol.eritropoietin_4_2_9_a',
+     '_ilac_sinifi', 'eritropoietin_kontrol_4_2_9_a'),
     # 2) 4.2.14.B — kanser/hormon + G-CSF
-    try:
-        from recete_kontrol.kanser_gcsf_4_2_14_b import (
-            kanser_gcsf_yolak_belirle, kanser_gcsf_kontrol_4_2_14_b)
-        if kanser_gcsf_yolak_belirle(ilac_sonuc):
-            return 'KANSER_GCSF', kanser_gcsf_kontrol_4_2_14_b(ilac_sonuc)
-    except Exception:
-        pass
-
+    ('KANSER_GCSF', 'recete_kontrol.kanser_gcsf_4_2_14_b',
+     'kanser_gcsf_yolak_belirle', 'kanser_gcsf_kontrol_4_2_14_b'),
     # 3) 4.2.1.C-1 — Anti-TNF biyolojik ajanlar (adalimumab/etanersept/
     #    infliksimab/sertolizumab/golimumab — ATC L04AB*)
-    try:
-        from recete_kontrol.anti_tnf_4_2_1_c1 import (
-            anti_tnf_kapsami_mi, anti_tnf_kontrol_4_2_1_c1)
-        if anti_tnf_kapsami_mi(ilac_sonuc):
-            return 'ANTI_TNF', anti_tnf_kontrol_4_2_1_c1(ilac_sonuc)
-    except Exception:
-        pass
-
+    ('ANTI_TNF', 'recete_kontrol.anti_tnf_4_2_1_c1',
+     'anti_tnf_kapsami_mi', 'anti_tnf_kontrol_4_2_1_c1'),
     # 4) 4.2.12.B — Spesifik olmayan immünglobulin (IVIG/SCIG — ATC J06BA*)
-    try:
-        from recete_kontrol.immunglobulin_4_2_12_b import (
-            immunglobulin_kapsami_mi, immunglobulin_kontrol_4_2_12_b)
-        if immunglobulin_kapsami_mi(ilac_sonuc):
-            return 'IMMUNGLOBULIN', immunglobulin_kontrol_4_2_12_b(ilac_sonuc)
-    except Exception:
-        pass
-
+    ('IMMUNGLOBULIN', 'recete_kontrol.immunglobulin_4_2_12_b',
+     'immunglobulin_kapsami_mi', 'immunglobulin_kontrol_4_2_12_b'),
     # 5) 4.2.33 — Göz anti-VEGF (ranibizumab/aflibersept/deksametazon implant/
     #    verteporfin; bevacizumab → ATLANDI/günübirlik, sessiz geçer)
-    try:
-        from recete_kontrol.goz_antivegf_4_2_33 import (
-            goz_antivegf_yolak_belirle, goz_antivegf_kontrol_4_2_33)
-        if goz_antivegf_yolak_belirle(ilac_sonuc):
-            return 'GOZ_ANTIVEGF', goz_antivegf_kontrol_4_2_33(ilac_sonuc)
-    except Exception:
-        pass
-
+    ('GOZ_ANTIVEGF', 'recete_kontrol.goz_antivegf_4_2_33',
+     'goz_antivegf_yolak_belirle', 'goz_antivegf_kontrol_4_2_33'),
     # 6) 4.2.14.C-(çç) — Ruksolitinib (JAKAVI; miyelofibrozis/GvHD/polisitemi vera)
-    try:
-        from recete_kontrol.ruksolitinib_4_2_14_c_cc import (
-            ruksolitinib_kapsami_mi, ruksolitinib_kontrol_4_2_14_cc)
-        if ruksolitinib_kapsami_mi(ilac_sonuc):
-            return 'RUKSOLITINIB', ruksolitinib_kontrol_4_2_14_cc(ilac_sonuc)
-    except Exception:
-        pass
-
+    ('RUKSOLITINIB', 'recete_kontrol.ruksolitinib_4_2_14_c_cc',
+     'ruksolitinib_kapsami_mi', 'ruksolitinib_kontrol_4_2_14_cc'),
     # 7) 4.2.9.B — Fosfor bağlayıcı (sevelamer/lantanyum karbonat/alüminyum
     #    klorür hidroksit — ATC V03AE02/03)
-    try:
-        from recete_kontrol.sevelamer_fosfor_4_2_9_b import (
-            sevelamer_fosfor_kapsami_mi, sevelamer_fosfor_kontrol_4_2_9_b)
-        if sevelamer_fosfor_kapsami_mi(ilac_sonuc):
-            return 'FOSFOR_BAGLAYICI', sevelamer_fosfor_kontrol_4_2_9_b(ilac_sonuc)
-    except Exception:
-        pass
+    ('FOSFOR_BAGLAYICI', 'recete_kontrol.sevelamer_fosfor_4_2_9_b',
+     'sevelamer_fosfor_kapsami_mi', 'sevelamer_fosfor_kontrol_4_2_9_b'),
+]
+
+# (kategori, modül_yolu, tespit, giriş, ek_modul_mu) — kontrol_et_tekil sırası
+_DISPATCH_TABLOSU: List[Tuple[str, str, str, str, bool]] = (
+    [(*k, False) for k in _ONCELIKLI_DISPATCH]
+    + [(*k, True) for k in _EK_MODUL_DISPATCH])
+
+# İbare indeksi anahtar uzunluğu: bu kadar karakterden kısa ibareler
+# doğrusal listede taranır.
+_IBARE_ONEK = 4
+
+
+def _duzlestir(deger) -> List[str]:
+    """Bildirim değeri (str | küme | iç içe liste/demet) → düz str listesi."""
+    if isinstance(deger, str):
+        return [deger]
+    sonuc: List[str] = []
+    for d in deger or ():
+        sonuc.extend(_duzlestir(d))
+    return sonuc
+
+
+def _metin_anahtari(ilac_sonuc: Dict) -> str:
+    """Modüllerin _arama_metni'sinin üst kümesi: ' AD ETKEN ' (boşluk dolgulu).
+
+    Tespitçilerin ad+etken birleştirme varyantlarının (boş parçayı atlayan /
+    atlamayan) hepsi bu metnin alt-string'idir.
+    """
+    ad = ilac_sonuc.get('ilac_adi') or ilac_sonuc.get('ilac') or ''
+    etken = ilac_sonuc.get('etkin_madde') or ilac_sonuc.get('etkin') or ''
+    return f" {norm_tr_upper(ad)} {norm_tr_upper(etken)} "
+
+
+class DispatchIndeksi:
+    """_DISPATCH_TABLOSU için ATC öneki + ad/etken ibaresi → aday indeksi.
+
+    Sözleşme: modülün DISPATCH_ANAHTARLARI bildirimi, tespitçisinin True
+    dönebildiği her kalem için en az bir anahtarı tutmalıdır:
+        'atc'        : ATC önekleri (atc.startswith)
+        'atc_icerir' : ATC alt-string'leri (tespitçi regex/`in` kullanıyorsa)
+        'metin'      : norm_tr_upper(ad + etken) alt-string'leri
+    Bildirimsiz / yüklenemeyen modüller her kalemde denenir (eski davranış).
+    Fazladan aday yalnızca süreye mal olur; eksik aday sonucu değiştirir —
+    bu yüzden bildirim tespitçiyle birlikte güncellenir.
+    """
+
+    def __init__(self, tablo: List[Tuple[str, str, str, str, bool]]):
+        self.tablo = tablo
+        # Çözülmüş (tespit, giriş) — None: her çağrıda importlib ile (eski yol)
+        self.fonksiyonlar: List[Optional[Tuple[Callable, Callable]]] = []
+        self.her_zaman: Set[int] = set()
+        self._atc: Dict[str, Set[int]] = {}
+        self._atc_uzunluklar: Tuple[int, ...] = ()
+        self._atc_icerir: List[Tuple[str, int]] = []
+        self._ibare: Dict[str, List[Tuple[str, int]]] = {}
+        self._kisa_ibare: List[Tuple[str, int]] = []
+        for i, (_, modul_yolu, tespit_adi, giris_adi, _) in enumerate(tablo):
+            try:
+                modul = importlib.import_module(modul_yolu)
+                self.fonksiyonlar.append(
+                    (getattr(modul, tespit_adi), getattr(modul, giris_adi)))
+            except Exception:
+                self.fonksiyonlar.append(None)
+                self.her_zaman.add(i)
+                continue
+            bildirim = getattr(modul, 'DISPATCH_ANAHTARLARI', None)
+            if not self._bildirim_ekle(i, bildirim):
+                self.her_zaman.add(i)
+        self._atc_uzunluklar = tuple(sorted({len(k) for k in self._atc}))
+
+    def _bildirim_ekle(self, i: int, bildirim: Optional[Dict]) -> bool:
+        if not isinstance(bildirim, dict):
+            return False
+        atc = [norm_tr_upper(k) for k in _duzlestir(bildirim.get('atc'))]
+        atc_icerir = [norm_tr_upper(k) for k in _duzlestir(bildirim.get('atc_icerir'))]
+        ibareler = [norm_tr_upper(k) for k in _duzlestir(bildirim.get('metin'))]
+        # Boş anahtar her kalemi tutar — bildirim anlamsız, her zaman dene
+        if not (atc or atc_icerir or ibareler) or '' in atc + atc_icerir + ibareler:
+            return False
+        for k in atc:
+            self._atc.setdefault(k, set()).add(i)
+        self._atc_icerir.extend((k, i) for k in atc_icerir)
+        for k in ibareler:
+            if len(k) < _IBARE_ONEK:
+                self._kisa_ibare.append((k, i))
+            else:
+                self._ibare.setdefault(k[:_IBARE_ONEK], []).append((k, i))
+        return True
+
+    def adaylar(self, ilac_sonuc: Dict) -> List[int]:
+        """Kalem için denenecek tablo satırları (tablo sırasında)."""
+        try:
+            atc = norm_tr_upper(ilac_sonuc.get('atc_kodu') or ilac_sonuc.get('atc') or '')
+            metin = _metin_anahtari(ilac_sonuc)
+        except Exception:
+            # Tespitçiler de aynı alanlarda patlar — eski yola bırak
+            return list(range(len(self.tablo)))
+        secilen = set(self.her_zaman)
+        if atc:
+            for uzunluk in self._atc_uzunluklar:
+                if uzunluk > len(atc):
+                    break
+                secilen.update(self._atc.get(atc[:uzunluk], ()))
+            secilen.update(i for k, i in self._atc_icerir if k in atc)
+        for bas in range(len(metin) - _IBARE_ONEK + 1):
+            for k, i in self._ibare.get(metin[bas:bas + _IBARE_ONEK], ()):
+                if metin.startswith(k, bas):
+                    secilen.add(i)
+        secilen.update(i for k, i in self._kisa_ibare if k in metin)
+        return sorted(secilen)
+
+    def fonksiyon(self, i: int) -> Tuple[Callable, Callable]:
+        cozulen = self.fonksiyonlar[i]
+        if cozulen is not None:
+            return cozulen
+        return _tablo_fonksiyonu(self.tablo[i])
+
+
+def _tablo_fonksiyonu(kayit: Tuple[str, str, str, str, bool]) -> Tuple[Callable, Callable]:
+    modul = importlib.import_module(kayit[1])
+    return getattr(modul, kayit[2]), getattr(modul, kayit[3])
+
+
+_indeks: Optional[DispatchIndeksi] = None
+_indeks_kilidi = threading.Lock()
+
+
+def dispatch_indeksi() -> DispatchIndeksi:
+    """Paylaşılan indeks (ilk çağrıda kurulur; açılışta ısıtmak için çağırın)."""
+    global _indeks
+    if _indeks is None:
+        with _indeks_kilidi:
+            if _indeks is None:
+                _indeks = DispatchIndeksi(_DISPATCH_TABLOSU)
+    return _indeks
+
+
+def _tablo_dispatch(ilac_sonuc: Dict, sira: Iterable[int],
+                    fonksiyon: Callable[[int], Tuple[Callable, Callable]]
+                    ) -> Tuple[bool, Optional[str], Optional[KontrolRaporu]]:
+    """Tablo satırlarını verilen sırada dene → (bitti_mi, kategori, rapor).
+
+    Öncelikli modül: tespitçi True → sonuç ne olursa dön. Ek modül:
+    ATLANDI → aramaya devam; rapor None → tabloyu bırak, genel dispatcher'a
+    düş (_ek_modul_dispatch davranışı). Her satır kendi try/except'inde.
+    """
+    for i in sira:
+        kategori, _, _, _, ek_modul = _DISPATCH_TABLOSU[i]
+        try:
+            tespit, giris = fonksiyon(i)
+            if not tespit(ilac_sonuc):
+                continue
+            rapor = giris(ilac_sonuc)
+        except Exception:
+            continue
+        if not ek_modul:
+            return True, kategori, rapor
+        if rapor is None:
+            break
+        if rapor.sonuc == KontrolSonucu.ATLANDI:
+            continue  # bu kural uygulanmadı — aramaya devam
+        return True, kategori, rapor
+    return False, None, None
 
-    # 8) Standalone atomik modüller (kayıt defteri — Parkinson/MS/Migren/
-    #    Pulmoner HT/Melanom/Parenteral Demir/Palivizumab/Grip/EK-4F'ler vb.)
-    kat, rap = _ek_modul_dispatch(ilac_sonuc)
-    if kat is not None and rap is not None:
-        return kat, rap
 
-    # 9) Genel master dispatcher (kategori tespit + kontrol)
+def _genel_dispatch(ilac_sonuc: Dict) -> Tuple[Optional[str], Optional[KontrolRaporu]]:
     try:
         from recete_kontrol.sut_kontrolleri import sut_kontrol_yap
         res = sut_kontrol_yap(ilac_sonuc)
@@ -279,10 +409,39 @@ def kontrol_et_tekil(ilac_sonuc: Dict) -> Tuple[Optional[str], Optional[KontrolR
             return res.get('kategori'), res['kontrol_raporu']
     except Exception:
         pass
-
     return None, None
 
 
+def kontrol_et_tekil(ilac_sonuc: Dict) -> Tuple[Optional[str], Optional[KontrolRaporu]]:
+    """Tek bir reçete kalemini uygun SUT kontrolüne yönlendir.
+
+    Özel (1–7) + standalone atomik modüller (8) yalnızca indeksin seçtiği
+    adaylar üzerinden, ardından genel master dispatcher (9).
+
+    Returns: (kategori, KontrolRaporu) — kontrol uygulanmadıysa (None, None).
+    """
+    indeks = dispatch_indeksi()
+    bitti, kat, rap = _tablo_dispatch(ilac_sonuc, indeks.adaylar(ilac_sonuc),
+                                      indeks.fonksiyon)
+    if bitti:
+        return kat, rap
+    return _genel_dispatch(ilac_sonuc)
+
+
+def kontrol_et_tekil_sirali(ilac_sonuc: Dict) -> Tuple[Optional[str], Optional[KontrolRaporu]]:
+    """İndekssiz referans yol: tüm tabloyu sırayla tara (eski davranış).
+
+    kontrol_et_tekil ile aynı sonucu vermelidir — test/benchmark karşılaştırması
+    ve bir modülün bildirimi şüpheli olduğunda teşhis için.
+    """
+    bitti, kat, rap = _tablo_dispatch(
+        ilac_sonuc, range(len(_DISPATCH_TABLOSU)),
+        lambda i: _tablo_fonksiyonu(_DISPATCH_TABLOSU[i]))
+    if bitti:
+        return kat, rap
+    return _genel_dispatch(ilac_sonuc)
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # Basit self-test (DB gerektirmeyen yönlendirme + uyarı eşiği)
 # ═══════════════════════════════════════════════════════════════════════
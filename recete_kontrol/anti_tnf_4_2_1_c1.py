@@ -276,6 +276,12 @@ def anti_tnf_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(_arama_metni(ilac_sonuc), ANTI_TNF_HEPSI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_ANTI_TNF_PREFIX,
+    'metin': ANTI_TNF_HEPSI,
+}
+
+
 def anti_tnf_yolak_belirle(ilac_sonuc: Dict) -> Optional[str]:
     """Endikasyon yolağını belirle. Returns yolak kodu | None (kapsam dışı)."""
     if not anti_tnf_kapsami_mi(ilac_sonuc):
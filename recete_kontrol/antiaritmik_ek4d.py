@@ -155,6 +155,12 @@ def antiaritmik_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return antiaritmik_kategori(ilac_sonuc) != 'NONE'
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': [ATC_C01B_PREFIX] + [p for _, p, _ in _KATEGORI_TANIM],
+    'metin': [_DIGER_ETKEN] + [ib for _, _, ib in _KATEGORI_TANIM],
+}
+
+
 def _parenteral_mi(ilac_sonuc: Dict) -> bool:
     ad = norm_tr_upper(ilac_sonuc.get('ilac_adi') or ilac_sonuc.get('ilac') or '')
     return any(ib in ad for ib in _PARENTERAL_IBARELER)
@@ -142,6 +142,12 @@ def antifungal_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, AMFOTERISIN) or _iceriyor(m, EKINOKANDIN) or _iceriyor(m, AZOL)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_4223,
+    'metin': AMFOTERISIN | EKINOKANDIN | AZOL,
+}
+
+
 def _form_belirle(ilac_sonuc: Dict) -> str:
     """'PARENTERAL' | 'ORAL' | 'BELIRSIZ'."""
     atc = norm_tr_upper(ilac_sonuc.get('atc_kodu') or ilac_sonuc.get('atc') or '')
@@ -173,6 +173,11 @@ def aprepitant_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return False
 
 
+DISPATCH_ANAHTARLARI = {
+    'metin': APREPITANT_TICARI | {'APREPITANT'},
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ATOMLAR
 # ═══════════════════════════════════════════════════════════════════════
@@ -110,6 +110,12 @@ def atomoksetin_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, ATOMOKSETIN_ETKEN) or _iceriyor(m, ATOMOKSETIN_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_ATOMOKSETIN,
+    'metin': ATOMOKSETIN_ETKEN | ATOMOKSETIN_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ATOMLAR
 # ═══════════════════════════════════════════════════════════════════════
@@ -333,6 +333,12 @@ def biyolojik_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return biyolojik_madde_belirle(ilac_sonuc) is not None
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': [MADDE_ATC.get(kod, ()) for kod in AKTIF_MADDELER],
+    'metin': [etkenler for kod, etkenler in MADDE_ETKEN if kod in AKTIF_MADDELER],
+}
+
+
 def biyolojik_madde_belirle(ilac_sonuc: Dict) -> Optional[str]:
     """Etken/ATC → madde kodu ('C4'…). Yalnız AKTİF maddeler döner."""
     m = _arama_metni(ilac_sonuc)
@@ -92,6 +92,12 @@ def demans_als_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, DEMANS_ALS_ETKEN) or _iceriyor(m, DEMANS_ALS_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_PREFIXLER,
+    'metin': DEMANS_ALS_ETKEN | DEMANS_ALS_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ATOMLAR — tek VEYA grubu (yetki)
 # ═══════════════════════════════════════════════════════════════════════
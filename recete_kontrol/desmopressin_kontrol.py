@@ -114,6 +114,12 @@ def desmopressin_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, DESMOPRESSIN_ETKEN) or _iceriyor(m, DESMOPRESSIN_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_DESMOPRESSIN,
+    'metin': DESMOPRESSIN_ETKEN | DESMOPRESSIN_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ATOMLAR
 # ═══════════════════════════════════════════════════════════════════════
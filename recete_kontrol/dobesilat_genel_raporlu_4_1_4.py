@@ -131,6 +131,12 @@ def dobesilat_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, DOBESILAT_ETKEN) or _iceriyor(m, DOBESILAT_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_DOBESILAT,
+    'metin': DOBESILAT_ETKEN | DOBESILAT_TICARI,
+}
+
+
 def _rapor_var_mi(ilac_sonuc: Dict) -> Tuple[bool, str]:
     """Rapor varlığı dispatcher'ı. Kod/takip no en güçlü sinyal."""
     rapor_kodu = (ilac_sonuc.get('rapor_kodu') or '').strip()
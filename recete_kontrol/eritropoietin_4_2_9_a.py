@@ -198,6 +198,12 @@ def _ilac_sinifi(ilac_sonuc: Dict) -> Optional[str]:
     return None
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': tuple(ATC_ESA),
+    'metin': EPOETIN | MIRCERA | DARBEPOETIN | ROKSADUSTAT,
+}
+
+
 def _endikasyon_belirle(ilac_sonuc: Dict) -> Tuple[bool, bool]:
     """(mds, kby) — ICD + rapor metni sinyalleri."""
     icd = _teshis_birlesik(ilac_sonuc)
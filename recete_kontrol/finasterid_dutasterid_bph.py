@@ -96,6 +96,12 @@ def finasterid_dutasterid_kapsami_mi(ilac_sonuc: Dict) -> bool:
         ilac_sonuc.get('atc_kodu') or ilac_sonuc.get('atc') or '')
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_5ARI_PREFIX + ATC_5ARI_KOMBO,
+    'metin': ARI5_ETKEN | ARI5_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ATOMLAR
 # ═══════════════════════════════════════════════════════════════════════
@@ -175,6 +175,12 @@ def fludrokortizon_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, FLUDRO_ETKEN) or _iceriyor(m, FLUDRO_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_FLUDRO,
+    'metin': FLUDRO_ETKEN | FLUDRO_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # DİSPATCHER — endikasyon yolağı
 # ═══════════════════════════════════════════════════════════════════════
@@ -129,6 +129,12 @@ def ginkgo_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, GINKGO_ETKEN) or _iceriyor(m, GINKGO_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_GINKGO,
+    'metin': GINKGO_ETKEN | GINKGO_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ATOMLAR
 # ═══════════════════════════════════════════════════════════════════════
@@ -92,6 +92,12 @@ def glokom_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, GLOKOM_ETKEN) or _iceriyor(m, GLOKOM_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_GLOKOM_PREFIX,
+    'metin': GLOKOM_ETKEN | GLOKOM_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ATOMLAR — tek VEYA grubu (yetki)
 # ═══════════════════════════════════════════════════════════════════════
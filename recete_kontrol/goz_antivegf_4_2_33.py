@@ -226,6 +226,13 @@ def goz_antivegf_yolak_belirle(ilac_sonuc: Dict) -> Optional[str]:
     return _ilac_sinifi(ilac_sonuc)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ('L01XC07', 'L01FG01', 'S01LA04', 'S01LA05', 'S01LA01'),
+    'metin': (BEVACIZUMAB | RANIBIZUMAB | AFLIBERSEPT | VERTEPORFIN
+              | DEKSAMETAZON_IMPLANT_MARKA | DEKSAMETAZON_ETKEN),
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # DİSPATCHER — endikasyon
 # ═══════════════════════════════════════════════════════════════════════
@@ -92,6 +92,12 @@ def grip_asisi_kapsamda_mi(ilac_sonuc: Dict) -> bool:
     return influenza and asi
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc_icerir': ('J07BB',),   # _ATC_RE
+    'metin': GRIP_TICARI | {'INFLUENZA', 'GRIP'},
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # Yardımcılar
 # ═══════════════════════════════════════════════════════════════════════
@@ -335,6 +335,14 @@ def immunglobulin_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return False
 
 
+# SPESIFIK_DISLAMA / J06BB dışlaması tespitçide kalır; indeks yalnız
+# olası-pozitif anahtarları taşır.
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_NONSPESIFIK_PREFIX,
+    'metin': NONSPESIFIK_ANAHTAR,
+}
+
+
 def ig_route_belirle(ilac_sonuc: Dict) -> str:
     """Route ipucu → 'IGM' | 'SC' | 'IV' | 'BELIRSIZ'."""
     atc = _atc(ilac_sonuc)
@@ -168,6 +168,12 @@ def ivermektin_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, IVERMEKTIN_ETKEN) or _iceriyor(m, IVERMEKTIN_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_IVERMEKTIN,
+    'metin': IVERMEKTIN_ETKEN | IVERMEKTIN_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # DİSPATCHER — endikasyon yolağı
 # ═══════════════════════════════════════════════════════════════════════
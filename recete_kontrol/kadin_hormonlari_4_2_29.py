@@ -159,6 +159,12 @@ def kadin_hormonlari_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(metin, KAPSAM_ETKEN)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_KAPSAM_PREFIX,
+    'metin': KAPSAM_ETKEN,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # DISPATCHER — yolak belirleme
 # ═══════════════════════════════════════════════════════════════════════
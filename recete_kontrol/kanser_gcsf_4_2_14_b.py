@@ -223,6 +223,11 @@ def kanser_gcsf_yolak_belirle(ilac_sonuc: Dict) -> Optional[str]:
     return None
 
 
+DISPATCH_ANAHTARLARI = {
+    'metin': GCSF_ILACLAR | YOLAK1_ILACLAR,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ORTAK ATOM: Sağlık kurulu raporu (A1 / B1)
 # ═══════════════════════════════════════════════════════════════════════
@@ -5,16 +5,32 @@ Kontrol Motoru
 Tüm reçete kontrol sınıflarını yönetir ve koordine eder.
 """
 
-import json
 import logging
 from pathlib import Path
 from typing import Dict, List, Optional, Set
 from datetime import datetime
 
+from ekleme_gunlugu import EklemeGunlugu, eski_json_oku
+
 from .base_kontrol import BaseKontrol, KontrolRaporu, KontrolSonucu
 
 logger = logging.getLogger(__name__)
 
+# Kontrol hafızasında tutulan dönem (ay) sayısı — içinde bulunulan ay dahil.
+# Daha eski dönemlerde işaretlenen reçeteler açılışta/sıkıştırmada düşer.
+VARSAYILAN_SAKLAMA_AY = 3
+
+
+def _donem(zaman: Optional[datetime] = None) -> str:
+    return (zaman or datetime.now()).strftime('%Y-%m')
+
+
+def _donem_siniri(saklama_ay: int, simdi: Optional[datetime] = None) -> str:
+    """saklama_ay dönem geriye gidildiğinde tutulacak en eski dönem ('YYYY-MM')."""
+    simdi = simdi or datetime.now()
+    ay_no = simdi.year * 12 + simdi.month - 1 - (saklama_ay - 1)
+    return f"{ay_no // 12:04d}-{ay_no % 12 + 1:02d}"
+
 
 class KontrolMotoru:
     """
@@ -25,13 +41,18 @@ class KontrolMotoru:
     - Sonuçları raporlar
     """
 
-    def __init__(self, hafiza_dosyasi: str = "kontrol_edilenler.json"):
+    def __init__(self, hafiza_dosyasi: str = "kontrol_edilenler.json",
+                 saklama_ay: Optional[int] = VARSAYILAN_SAKLAMA_AY):
         # Kontrol sınıfları listesi
         self.kontrol_siniflari: List[BaseKontrol] = []
 
-        # Kontrol edilen reçeteler hafızası
+        # Kontrol edilen reçeteler hafızası: bellekte küme, diskte ekleme
+        # günlüğü (kontrol_edilenler.jsonl). Eski .json varsa bir kez taşınır.
         script_dir = Path(__file__).parent.parent
         self.hafiza_dosyasi = script_dir / hafiza_dosyasi
+        self.saklama_ay = saklama_ay
+        self._gunluk = EklemeGunlugu(self.hafiza_dosyasi.with_suffix('.jsonl'))
+        self._donemler: Dict[str, str] = {}   # reçete no → işaretlendiği dönem
         self.kontrol_edilenler: Set[str] = self._hafizayi_yukle()
 
         # Kayıtlı kontrol sınıflarını yükle
@@ -51,25 +72,49 @@ class KontrolMotoru:
         logger.info(f"Kontrol sınıfı eklendi: {kontrol.GRUP_ADI}")
 
     def _hafizayi_yukle(self) -> Set[str]:
-        """Kontrol edilen reçeteleri dosyadan yükle"""
-        if self.hafiza_dosyasi.exists():
-            try:
-                with open(self.hafiza_dosyasi, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return set(data.get('kontrol_edilenler', []))
-            except Exception as e:
-                logger.error(f"Hafıza yükleme hatası: {e}")
-        return set()
+        """Kontrol edilen reçeteleri günlükten (yoksa eski JSON'dan) yükle"""
+        tasindi = False
+        try:
+            if self._gunluk.yol.exists():
+                for kayit in self._gunluk.oku():
+                    no = kayit.get('r')
+                    if no:
+                        self._donemler[str(no)] = kayit.get('d', '')
+            else:
+                data = eski_json_oku(self.hafiza_dosyasi)
+                if isinstance(data, dict):
+                    donem = str(data.get('son_guncelleme') or '')[:7] or _donem()
+                    for no in data.get('kontrol_edilenler', []):
+                        self._donemler[str(no)] = donem
+                    tasindi = bool(self._donemler)
+                    if tasindi:
+                        logger.info(f"Kontrol hafızası günlüğe taşınıyor: "
+                                    f"{len(self._donemler)} reçete")
+        except Exception as e:
+            logger.error(f"Hafıza yükleme hatası: {e}")
+        duste = self._eski_donemleri_dusur()
+        if duste or tasindi or self._gunluk.sikistirma_gerekli_mi(len(self._donemler)):
+            self._hafizayi_sikistir()
+        return set(self._donemler)
+
+    def _eski_donemleri_dusur(self) -> int:
+        if not self.saklama_ay:
+            return 0
+        sinir = _donem_siniri(self.saklama_ay)
+        eskiler = [no for no, d in self._donemler.items() if d and d < sinir]
+        for no in eskiler:
+            del self._donemler[no]
+        return len(eskiler)
+
+    def _hafizayi_sikistir(self) -> bool:
+        """Günlüğü canlı kümeyle atomik olarak yeniden yaz"""
+        return self._gunluk.sikistir(
+            {'r': no, 'd': d} for no, d in self._donemler.items())
 
     def _hafizayi_kaydet(self):
-        """Kontrol edilen reçeteleri dosyaya kaydet"""
+        """Kontrol edilen reçeteleri diske yaz (tam sıkıştırma)"""
         try:
-            data = {
-                'son_guncelleme': datetime.now().isoformat(),
-                'kontrol_edilenler': list(self.kontrol_edilenler)
-            }
-            with open(self.hafiza_dosyasi, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            self._hafizayi_sikistir()
         except Exception as e:
             logger.error(f"Hafıza kaydetme hatası: {e}")
 
@@ -85,15 +130,27 @@ class KontrolMotoru:
         """
         return recete_no in self.kontrol_edilenler
 
-    def kontrol_edildi_isaretle(self, recete_no: str):
+    def kontrol_edildi_isaretle(self, recete_no: str, donem: Optional[str] = None):
         """
         Reçeteyi kontrol edildi olarak işaretle.
 
+        Dosyayı yeniden yazmaz; günlüğe tek satır ekler (O(1)).
+
         Args:
             recete_no: Reçete numarası
+            donem: 'YYYY-MM' (saklama süresi için; varsayılan: bu ay)
         """
+        donem = donem or _donem()
+        if self._donemler.get(recete_no) == donem:
+            return
         self.kontrol_edilenler.add(recete_no)
-        self._hafizayi_kaydet()
+        self._donemler[recete_no] = donem
+        try:
+            self._gunluk.ekle({'r': recete_no, 'd': donem})
+            if self._gunluk.sikistirma_gerekli_mi(len(self._donemler)):
+                self._hafizayi_sikistir()
+        except Exception as e:
+            logger.error(f"Hafıza kaydetme hatası: {e}")
 
     def recete_kontrol_et(self, recete_verisi: Dict, zorla: bool = False) -> Dict[str, KontrolRaporu]:
         """
@@ -152,9 +209,28 @@ class KontrolMotoru:
     def hafizayi_temizle(self):
         """Kontrol hafızasını temizle (ay sonu için)"""
         self.kontrol_edilenler.clear()
+        self._donemler.clear()
         self._hafizayi_kaydet()
         logger.info("Kontrol hafızası temizlendi")
 
+    def eski_donemleri_temizle(self, saklama_ay: Optional[int] = None) -> int:
+        """saklama_ay'dan eski dönemlerde işaretlenen reçeteleri unut.
+
+        Returns: düşürülen reçete sayısı
+        """
+        if saklama_ay is not None:
+            self.saklama_ay = saklama_ay
+        adet = self._eski_donemleri_dusur()
+        if adet:
+            self.kontrol_edilenler.intersection_update(self._donemler)
+            self._hafizayi_sikistir()
+            logger.info(f"Kontrol hafızası: {adet} eski dönem reçetesi düşürüldü")
+        return adet
+
+    def kapat(self):
+        """Günlük dosyasını kapat (uygulama çıkışında)"""
+        self._gunluk.kapat()
+
     def istatistik_al(self) -> Dict:
         """Kontrol istatistiklerini al"""
         return {
@@ -163,6 +163,12 @@ def leflunomid_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, LEFLUNOMID_ETKEN) or _iceriyor(m, LEFLUNOMID_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_LEFLUNOMID,
+    'metin': LEFLUNOMID_ETKEN | LEFLUNOMID_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # Endikasyon flagleri
 # ═══════════════════════════════════════════════════════════════════════
@@ -101,6 +101,12 @@ def meklozin_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, MEKLOZIN_ETKEN) or _iceriyor(m, MEKLOZIN_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_MEKLOZIN,
+    'metin': MEKLOZIN_ETKEN | MEKLOZIN_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ATOM — tek endikasyon kapısı (3 alt-bağlam OR)
 # ═══════════════════════════════════════════════════════════════════════
@@ -185,6 +185,13 @@ def melanom_yolak_belirle(ilac_sonuc: Dict) -> Optional[str]:
     return None
 
 
+# ATC eşleşmesi tespitçide alt-string ('kod in atc') — önek değil.
+DISPATCH_ANAHTARLARI = {
+    'atc_icerir': tuple(_ATC_YOLAK),
+    'metin': list(YOLAK_ETKEN.values()),
+}
+
+
 def _melanom_endikasyon(ilac_sonuc: Dict) -> bool:
     """Malign melanom var mı? ICD C43* veya lafız 'malign melanom'/'melanom'."""
     icd = _teshis_birlesik(ilac_sonuc)
@@ -204,6 +204,14 @@ def migren_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return migren_yolak_belirle(ilac_sonuc) is not None
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': (ATC_TRIPTAN_PREFIX, ATC_TOPIRAMAT),
+    'metin': [TOPIRAMAT_ANAHTAR] + [
+        {e for e in esler if not e.startswith('N02CC')}
+        for esler in TRIPTAN_KANON.values()],
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # YOLAK 1 — TRIPTAN (paragraf 1 + 3)
 # ═══════════════════════════════════════════════════════════════════════
@@ -298,6 +298,11 @@ def ms_yolak_belirle(ilac_sonuc: Dict) -> Optional[str]:
     return DRUG_KEY_TO_YOLAK[key]
 
 
+DISPATCH_ANAHTARLARI = {
+    'metin': [etken | ticari for etken, ticari in DRUG_DEFS.values()],
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ATOMLAR
 # ═══════════════════════════════════════════════════════════════════════
@@ -0,0 +1,342 @@
+# -*- coding: utf-8 -*-
+"""NormalizeMetin — reçete kalemi metninin bir kez normalize edilmiş hali +
+çoklu ibare eşleştirici.
+
+Sorun: `sut_kontrolleri._turkce_ara(metin, ibare)` her çağrıda hem metni hem
+ibareyi baştan normalize ediyordu (maketrans tabloları + digraph/x→ks/çift
+ünsüz regex'i); kural modülleri aynı `tum_metin` üzerinde yüzlerce ayrı arama
+yapıyor. Bu modül:
+
+  - `fonetik_normalize(s)` — `_turkce_normalize`'in tek otoritesi (tablolar
+    modül düzeyinde, sonuç LRU önbellekte: aynı ibare/metin bir kez işlenir).
+  - `NormalizeMetin` — bir metnin varyantları, ihtiyaç anında bir kez:
+        .ham      özgün metin
+        .kucuk    str.lower()
+        .tr       _tr_lower (TR→ASCII lower, fonetik dönüşüm YOK)
+        .fonetik  fonetik_normalize (+ konum haritası → özgün metin)
+    `normalize_metin(s)` aynı metin için aynı (değişmez) nesneyi döndürür;
+    böylece bir reçete satırının tüm kontrolleri tek normalize paylaşır.
+  - `IbareKumesi` — ibare listesi fonetik-normalize edilip TEK derlenmiş
+    alternation regex'ine çevrilir; "listeden biri geçiyor mu" tek taramadır.
+    Modüller kümelerini import anında `ibare_kumesi(ad, ibareler)` ile
+    kaydeder (benchmark/teşhis için `kayitli_kumeler()`).
+  - `DesenKumesi` — sıralı regex listesi (atom desenleri) için birleşik ön
+    süzgeç: hiçbiri eşleşmiyorsa tek tarama; eşleşiyorsa listedeki İLK
+    eşleşen desen sırayla bulunur (eski for-döngüsüyle aynı sonuç).
+
+Anlam korunur: `IbareKumesi.var_mi(m)` ≡ `any(_turkce_ara(m, k) for k in ibareler)`.
+
+Kullanım:
+    from recete_kontrol.normalize_metin import ibare_kumesi, normalize_metin
+    _METFORMIN = ibare_kumesi("glisemik_metformin", ("metformin", "glifor"))
+    nm = normalize_metin(tum_metin)
+    if _METFORMIN.var_mi(nm):
+        ibare, parca = _METFORMIN.ilk(nm)   # parca: özgün metindeki karşılığı
+"""
+from __future__ import annotations
+
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+# ═══════════════════════════════════════════════════════════════════════
+# Tablolar (eskiden her _turkce_normalize çağrısında yeniden kuruluyordu)
+# ═══════════════════════════════════════════════════════════════════════
+
+# Türkçe büyük harfler lower()'dan ÖNCE (İ.lower() = i + combining dot)
+_TR_BUYUK = str.maketrans({
+    'İ': 'i', 'I': 'i',
+    'Ö': 'o', 'Ü': 'u', 'Ş': 's', 'Ç': 'c', 'Ğ': 'g',
+})
+
+# Kalan Türkçe + Avrupa aksanlı karakterler + harf denkliği
+_NORM_MAP = str.maketrans({
+    'ı': 'i', 'ö': 'o', 'ü': 'u', 'ş': 's', 'ç': 'c', 'ğ': 'g',
+    # Avrupa aksanlı
+    'â': 'a', 'à': 'a', 'á': 'a', 'ã': 'a', 'ä': 'a', 'å': 'a',
+    'è': 'e', 'é': 'e', 'ê': 'e', 'ë': 'e',
+    'ì': 'i', 'í': 'i', 'î': 'i', 'ï': 'i',
+    'ò': 'o', 'ó': 'o', 'ô': 'o', 'õ': 'o',
+    'ù': 'u', 'ú': 'u', 'û': 'u',
+    'ñ': 'n', 'ý': 'y', 'ÿ': 'y',
+    # Harf denkliği
+    'w': 'v', 'q': 'k',
+})
+
+# Digraph / fonetik dönüşümler (sıra önemli — her biri tüm metne sırayla)
+_DIGRAPHS = (
+    ('ph', 'f'), ('th', 't'), ('sh', 's'), ('ch', 'c'), ('ck', 'k'),
+    ('qu', 'k'), ('wh', 'v'), ('gh', 'g'), ('ae', 'e'), ('oe', 'o'),
+)
+
+# Çift ünsüz → tek (alerjik/allerjik tıbbi yazım varyasyonları)
+_UNSUZLER = frozenset('bcçdfgğhjklmnprsştvyz')
+_CIFT_UNSUZ = re.compile(r'([bcçdfgğhjklmnprsştvyz])\1+')
+
+# _tr_lower tablosu (sut_kontrolleri._tr_lower bunu kullanır)
+TR_LOWER_MAP = str.maketrans({
+    'İ': 'i', 'I': 'i', 'ı': 'i',
+    'Ş': 's', 'ş': 's',
+    'Ğ': 'g', 'ğ': 'g',
+    'Ç': 'c', 'ç': 'c',
+    'Ö': 'o', 'ö': 'o',
+    'Ü': 'u', 'ü': 'u',
+})
+
+
+def tr_lower(s) -> str:
+    """TR→ASCII lower (fonetik dönüşüm yok) — bkz. sut_kontrolleri._tr_lower."""
+    if not s:
+        return ''
+    return str(s).translate(TR_LOWER_MAP).lower()
+
+
+@lru_cache(maxsize=4096)
+def fonetik_normalize(metin: str) -> str:
+    """Kapsamlı Türkçe/Latince normalize (sut_kontrolleri._turkce_normalize).
+
+    1. Türkçe büyük harfler → ASCII, 2. lower, 3. aksan/TR küçük → ASCII +
+    w→v, q→k, ß→ss, 4. digraph'lar (ph→f, th→t, …), x→ks, 5. çift ünsüz → tek.
+    """
+    t = metin.translate(_TR_BUYUK).lower().translate(_NORM_MAP)
+    t = t.replace('ß', 'ss')
+    for digraph, yerine in _DIGRAPHS:
+        t = t.replace(digraph, yerine)
+    t = t.replace('x', 'ks')
+    return _CIFT_UNSUZ.sub(r'\1', t)
+
+
+def _fonetik_konumlu(metin: str) -> Tuple[str, List[int]]:
+    """fonetik_normalize + her çıktı karakterinin özgün metindeki konumu.
+
+    Adımlar karakter düzeyinde yeniden uygulanır; sonuç metni
+    fonetik_normalize ile aynı değilse (ör. bağlama duyarlı Yunanca sigma
+    lower'ı) konum haritası yaklaşık kalır — metnin kendisi her zaman
+    fonetik_normalize çıktısıdır."""
+    harfler: List[str] = []
+    konumlar: List[int] = []
+    for i, c in enumerate(metin.translate(_TR_BUYUK)):
+        for k in c.lower().translate(_NORM_MAP).replace('ß', 'ss'):
+            harfler.append(k)
+            konumlar.append(i)
+    for digraph, yerine in _DIGRAPHS:
+        if digraph not in ''.join(harfler):
+            continue
+        yeni_h, yeni_k, i = [], [], 0
+        while i < len(harfler):
+            if harfler[i] == digraph[0] and i + 1 < len(harfler) \
+                    and harfler[i + 1] == digraph[1]:
+                yeni_h.append(yerine)
+                yeni_k.append(konumlar[i])
+                i += 2
+                continue
+            yeni_h.append(harfler[i])
+            yeni_k.append(konumlar[i])
+            i += 1
+        harfler, konumlar = yeni_h, yeni_k
+    son_h: List[str] = []
+    son_k: List[int] = []
+    onceki = None
+    for h, k in zip(harfler, konumlar):
+        parca = 'ks' if h == 'x' else h
+        for p in parca:
+            # Çift ünsüz: öncekiyle aynı ünsüz → düş
+            if p == onceki and p in _UNSUZLER:
+                continue
+            son_h.append(p)
+            son_k.append(k)
+            onceki = p
+    metin_n = ''.join(son_h)
+    if metin_n != fonetik_normalize(metin):
+        metin_n = fonetik_normalize(metin)
+        son_k = [min(i, len(metin) - 1) for i in range(len(metin_n))]
+    return metin_n, son_k
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# NormalizeMetin
+# ═══════════════════════════════════════════════════════════════════════
+
+class NormalizeMetin:
+    """Bir metnin normalize varyantları (tembel, bir kez hesaplanır).
+
+    Nesne paylaşılır (normalize_metin önbelleği) — değiştirilmemelidir."""
+
+    __slots__ = ('ham', '_kucuk', '_tr', '_fonetik', '_konumlar')
+
+    def __init__(self, ham: str):
+        self.ham = ham or ''
+        self._kucuk: Optional[str] = None
+        self._tr: Optional[str] = None
+        self._fonetik: Optional[str] = None
+        self._konumlar: Optional[List[int]] = None
+
+    @property
+    def kucuk(self) -> str:
+        if self._kucuk is None:
+            self._kucuk = self.ham.lower()
+        return self._kucuk
+
+    @property
+    def tr(self) -> str:
+        if self._tr is None:
+            self._tr = tr_lower(self.ham)
+        return self._tr
+
+    @property
+    def fonetik(self) -> str:
+        if self._fonetik is None:
+            self._fonetik = fonetik_normalize(self.ham)
+        return self._fonetik
+
+    def ara(self, ibare: str) -> bool:
+        """`_turkce_ara(ham, ibare)` ile aynı: fonetik alt-dizgi araması."""
+        return fonetik_normalize(ibare) in self.fonetik
+
+    def ham_parca(self, bas: int, son: int) -> str:
+        """fonetik[bas:son] aralığının özgün metindeki karşılığı."""
+        if self._konumlar is None:
+            _, self._konumlar = _fonetik_konumlu(self.ham)
+        if not self._konumlar or bas >= son:
+            return ''
+        ham_bas = self._konumlar[bas]
+        ham_son = self._konumlar[min(son, len(self._konumlar)) - 1] + 1
+        return self.ham[ham_bas:ham_son]
+
+    def __bool__(self) -> bool:
+        return bool(self.ham)
+
+    def __repr__(self) -> str:
+        return f"NormalizeMetin({self.ham[:40]!r}{'…' if len(self.ham) > 40 else ''})"
+
+
+@lru_cache(maxsize=512)
+def _normalize_metin(metin: str) -> NormalizeMetin:
+    return NormalizeMetin(metin)
+
+
+def normalize_metin(metin: Union[str, NormalizeMetin, None]) -> NormalizeMetin:
+    """Metnin paylaşılan NormalizeMetin'i (aynı metin → aynı nesne)."""
+    if isinstance(metin, NormalizeMetin):
+        return metin
+    return _normalize_metin(metin or '')
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Çoklu ibare / desen eşleştirici
+# ═══════════════════════════════════════════════════════════════════════
+
+class IbareKumesi:
+    """Fonetik-normalize ibareler için tek derlenmiş alternation.
+
+    Desen ilk kullanımda derlenir — modül import'u (açılış) ucuz kalır."""
+
+    def __init__(self, ad: str, ibareler: Iterable[str]):
+        self.ad = ad
+        self.ibareler: Tuple[str, ...] = tuple(ibareler)
+        self._norm: Dict[str, str] = {}
+        self._derli: Optional['re.Pattern'] = None
+
+    @property
+    def _desen(self) -> 're.Pattern':
+        if self._derli is None:
+            # normalize ibare → ilk özgün ibare (liste sırası korunur)
+            norm: Dict[str, str] = {}
+            for k in self.ibareler:
+                norm.setdefault(fonetik_normalize(k), k)
+            # Uzun ibare önce: ilk() en uzun eşleşmeyi özgün metinde göstersin
+            sirali = sorted(norm, key=len, reverse=True)
+            self._norm = norm
+            self._derli = re.compile('|'.join(re.escape(k) for k in sirali))
+        return self._derli
+
+    def var_mi(self, metin: Union[str, NormalizeMetin, None]) -> bool:
+        """any(_turkce_ara(metin, k) for k in ibareler)."""
+        return self._desen.search(normalize_metin(metin).fonetik) is not None
+
+    def ilk(self, metin: Union[str, NormalizeMetin, None]) -> Tuple[Optional[str], str]:
+        """Metinde en önde geçen ibare ve özgün metindeki karşılığı."""
+        nm = normalize_metin(metin)
+        m = self._desen.search(nm.fonetik)
+        if m is None:
+            return None, ''
+        return self._norm[m.group(0)], nm.ham_parca(m.start(), m.end())
+
+    def bulunanlar(self, metin: Union[str, NormalizeMetin, None]) -> List[str]:
+        """Metinde geçen tüm ibareler (liste sırasıyla; çakışanlar dahil)."""
+        fonetik = normalize_metin(metin).fonetik
+        if self._desen.search(fonetik) is None:
+            return []
+        return [k for k in self.ibareler if fonetik_normalize(k) in fonetik]
+
+    def __repr__(self) -> str:
+        return f"IbareKumesi({self.ad!r}, {len(self.ibareler)} ibare)"
+
+
+class DesenKumesi:
+    """Sıralı regex listesi — birleşik ön süzgeç + sıralı ilk eşleşme.
+
+    `ilk(metin)` ≡ eski `for d in desenler: m = re.search(d, metin)` döngüsünün
+    ilk eşleşmesi. Birleştirilemeyen listeler (geri referans, satır içi bayrak,
+    derleme hatası) süzgeçsiz eski döngüyle çalışır. Derleme ilk kullanımda."""
+
+    _GERI_REF = re.compile(r'\\[1-9]|\(\?P=|\(\?[aiLmsux]+\)')
+
+    def __init__(self, desenler: Sequence[str], bayraklar: int = 0):
+        self.desenler: Tuple[str, ...] = tuple(desenler)
+        self.bayraklar = bayraklar
+        self._derli: Optional[List['re.Pattern']] = None
+        self._suzgec = None
+
+    def _derle(self) -> List['re.Pattern']:
+        if self._derli is None:
+            derli = [re.compile(d, self.bayraklar) for d in self.desenler]
+            if self.desenler and not any(self._GERI_REF.search(d) for d in self.desenler):
+                try:
+                    self._suzgec = re.compile(
+                        '|'.join(f'(?:{d})' for d in self.desenler), self.bayraklar)
+                except re.error:
+                    self._suzgec = None
+            self._derli = derli
+        return self._derli
+
+    def ilk(self, metin: str) -> Tuple[Optional[str], Optional['re.Match']]:
+        """(ilk eşleşen desen, eşleşme) — yoksa (None, None)."""
+        derli = self._derle()
+        if self._suzgec is not None and self._suzgec.search(metin) is None:
+            return None, None
+        for d, r in zip(self.desenler, derli):
+            m = r.search(metin)
+            if m:
+                return d, m
+        return None, None
+
+    def var_mi(self, metin: str) -> bool:
+        derli = self._derle()
+        if self._suzgec is not None:
+            return self._suzgec.search(metin) is not None
+        return any(r.search(metin) for r in derli)
+
+
+@lru_cache(maxsize=1024)
+def desen_kumesi(desenler: Tuple[str, ...], bayraklar: int = 0) -> DesenKumesi:
+    """Aynı desen listesi için paylaşılan DesenKumesi (derleme bir kez)."""
+    return DesenKumesi(desenler, bayraklar)
+
+
+_kumeler: Dict[str, IbareKumesi] = {}
+_kume_kilidi = threading.Lock()
+
+
+def ibare_kumesi(ad: str, ibareler: Iterable[str]) -> IbareKumesi:
+    """İbare kümesini adıyla kaydet (modül import anında çağrılır)."""
+    kume = IbareKumesi(ad, ibareler)
+    with _kume_kilidi:
+        _kumeler[ad] = kume
+    return kume
+
+
+def kayitli_kumeler() -> Dict[str, IbareKumesi]:
+    with _kume_kilidi:
+        return dict(_kumeler)
@@ -264,6 +264,12 @@ def ala_kapsaisin_kapsami_mi(ilac_sonuc: Dict) -> bool:
             or _iceriyor(m, KAPSAISIN_ETKEN) or _iceriyor(m, KAPSAISIN_TICARI))
 
 
+DISPATCH_ANAHTARLARI = {
+    'metin': (ALFA_LIPOIK_ETKEN | ALFA_LIPOIK_TICARI
+              | KAPSAISIN_ETKEN | KAPSAISIN_TICARI),
+}
+
+
 def noropatik_yolak_belirle(ilac_sonuc: Dict) -> Dict[str, Optional[str]]:
     """{'durum': 'yolak'|'atlandi'|'disi', 'yolak': str|None, 'mesaj': str}."""
     m = _arama_metni(ilac_sonuc)
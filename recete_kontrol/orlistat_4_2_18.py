@@ -125,6 +125,12 @@ def orlistat_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, ORLISTAT_ETKEN) or _iceriyor(m, ORLISTAT_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_ORLISTAT,
+    'metin': ORLISTAT_ETKEN | ORLISTAT_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ATOMLAR
 # ═══════════════════════════════════════════════════════════════════════
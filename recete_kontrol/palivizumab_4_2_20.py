@@ -90,6 +90,12 @@ def palivizumab_kapsamda_mi(ilac_sonuc: Dict) -> bool:
     return any(t in m for t in PALIVIZUMAB_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc_icerir': ('J06BB16', 'J06BD01'),   # _ATC_RE
+    'metin': PALIVIZUMAB_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # Yardımcılar
 # ═══════════════════════════════════════════════════════════════════════
@@ -210,6 +210,12 @@ def _ilac_sinifi(ilac_sonuc: Dict) -> Optional[str]:
     return None
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_PARENTERAL,
+    'metin': TICARI_PARENTERAL | ETKEN_PARENTERAL,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ENDİKASYON ATOMLARI (a–k) — hepsi VEYA grubu
 # ═══════════════════════════════════════════════════════════════════════
@@ -260,6 +260,12 @@ def parkinson_yolak_belirle(ilac_sonuc: Dict) -> Optional[str]:
     return None
 
 
+DISPATCH_ANAHTARLARI = {
+    'metin': (Y1_ETKEN | Y1_TICARI | Y2_ETKEN | Y2_TICARI
+              | AMANTADIN_GENEL | AMANTADIN_TICARI),
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ORTAK ÇEKİRDEK ATOM — UZMAN_YETKİ (Y1/Y3/Y4)
 # ═══════════════════════════════════════════════════════════════════════
@@ -108,6 +108,12 @@ def pentoksifilin_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, PENTOKS_ETKEN) or _iceriyor(m, PENTOKS_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_PENTOKSIFILIN,
+    'metin': PENTOKS_ETKEN | PENTOKS_TICARI,
+}
+
+
 def _teshis_tokenlari(ilac_sonuc: Dict) -> List[str]:
     """Rapor/reçete teşhis ICD kodlarını normalize edilmiş liste olarak topla."""
     ham: List[str] = []
@@ -134,6 +134,12 @@ def pentosan_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, PENTOSAN_ETKEN) or _iceriyor(m, PENTOSAN_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_PENTOSAN,
+    'metin': PENTOSAN_ETKEN | PENTOSAN_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # BAŞLANGIÇ / DEVAM DİSPATCHER (EOS rapor-ordinalitesi)
 # ═══════════════════════════════════════════════════════════════════════
@@ -105,6 +105,13 @@ def pimtak_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return False
 
 
+# Topikal form ibaresi tespitçide aranır; indeks etken adını taşır.
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_TOPIKAL,
+    'metin': PIMEKROLIMUS_KW | TAKROLIMUS_TOPIKAL_TICARI | {'TAKROLIMUS', 'TACROLIMUS'},
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # RAPOR DURUMU + LİMİT
 # ═══════════════════════════════════════════════════════════════════════
@@ -378,6 +378,13 @@ def pulmoner_ht_yolak_belirle(ilac_sonuc: Dict) -> Optional[str]:
     return DRUG_KEY_TO_SINIF[key]
 
 
+# sildenafil/tadalafil PAH bağlamı tespitçide süzülür.
+DISPATCH_ANAHTARLARI = {
+    'atc': PAH_ATC_PREFIX,
+    'metin': [etken | ticari for etken, ticari in DRUG_DEFS.values()],
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ORTAK ATOMLAR (madde 1 tanı kriterleri + madde 4 yetki)
 # ═══════════════════════════════════════════════════════════════════════
@@ -128,6 +128,12 @@ def rifaksimin_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, RIFAKSIMIN_ETKEN) or _iceriyor(m, RIFAKSIMIN_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': ATC_RIFAKSIMIN,
+    'metin': RIFAKSIMIN_ETKEN | RIFAKSIMIN_TICARI,
+}
+
+
 def _form_guc(ilac_sonuc: Dict) -> str:
     """'550' | '200' | 'BELIRSIZ' (ilaç adındaki güçten)."""
     ad = _ad(ilac_sonuc)
@@ -196,6 +196,12 @@ def ruksolitinib_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _iceriyor(m, RUKSOLITINIB_ETKEN) or _iceriyor(m, RUKSOLITINIB_TICARI)
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': (ATC_RUKSOLITINIB, ATC_RUKSOLITINIB_ESKI),
+    'metin': RUKSOLITINIB_ETKEN | RUKSOLITINIB_TICARI,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # DİSPATCHER — endikasyon yolağı
 # ═══════════════════════════════════════════════════════════════════════
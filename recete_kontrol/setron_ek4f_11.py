@@ -99,6 +99,13 @@ def setron_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return setron_yolak_belirle(ilac_sonuc) is not None
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': (ATC_PALONOSETRON,) + ATC_DIGER_SETRON,
+    'metin': (PALONOSETRON_ETKEN | PALONOSETRON_TICARI
+              | DIGER_SETRON_ETKEN | DIGER_SETRON_TICARI),
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # ATOMLAR
 # ═══════════════════════════════════════════════════════════════════════
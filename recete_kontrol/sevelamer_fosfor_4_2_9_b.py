@@ -230,6 +230,12 @@ def sevelamer_fosfor_kapsami_mi(ilac_sonuc: Dict) -> bool:
     return _ilac_sinifi(ilac_sonuc) is not None
 
 
+DISPATCH_ANAHTARLARI = {
+    'atc': tuple(ATC_FOSFOR),
+    'metin': FOSFOR_EOS_KEYWORDS,
+}
+
+
 # ═══════════════════════════════════════════════════════════════════════
 # BAŞLANGIÇ RAPORU BAĞLAMI (G1/G2 kaynağı)
 # ═══════════════════════════════════════════════════════════════════════
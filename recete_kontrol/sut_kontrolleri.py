@@ -16,6 +16,8 @@ import logging
 from typing import Dict, List, Optional, Tuple
 from .base_kontrol import (BaseKontrol, KontrolSonucu, KontrolRaporu,
                             SartDurumu, SartSonuc)
+from .normalize_metin import (TR_LOWER_MAP, fonetik_normalize, ibare_kumesi,
+                              normalize_metin)
 
 logger = logging.getLogger(__name__)
 
@@ -1324,78 +1326,22 @@ def _turkce_normalize(metin: str) -> str:
       3. Avrupa aksanlı karakterler → ASCII (â→a, é→e, ñ→n, vb.)
       4. Digraph / fonetik dönüşümler (ph→f, th→t, sh→s, ch→c, ck→k, qu→k, wh→v)
       5. Harf denkliği (x→ks, w→v, q→k, y→i geçişleri)
-    """
-    # 1. Türkçe büyük harfleri ÖNCE dönüştür (İ.lower() = i+combining dot sorunu)
-    _TR_BUYUK = str.maketrans({
-        'İ': 'i', 'I': 'i',
-        'Ö': 'o', 'Ü': 'u', 'Ş': 's', 'Ç': 'c', 'Ğ': 'g',
-    })
-    t = metin.translate(_TR_BUYUK)
-
-    # 2. Lowercase (artık İ sorunu yok)
-    t = t.lower()
-
-    # 3. Kalan Türkçe + Avrupa aksanlı karakterler + harf denkliği
-    _NORM_MAP = str.maketrans({
-        'ı': 'i', 'ö': 'o', 'ü': 'u', 'ş': 's', 'ç': 'c', 'ğ': 'g',
-        # Avrupa aksanlı
-        'â': 'a', 'à': 'a', 'á': 'a', 'ã': 'a', 'ä': 'a', 'å': 'a',
-        'è': 'e', 'é': 'e', 'ê': 'e', 'ë': 'e',
-        'ì': 'i', 'í': 'i', 'î': 'i', 'ï': 'i',
-        'ò': 'o', 'ó': 'o', 'ô': 'o', 'õ': 'o',
-        'ù': 'u', 'ú': 'u', 'û': 'u',
-        'ñ': 'n', 'ý': 'y', 'ÿ': 'y',
-        # Harf denkliği
-        'w': 'v', 'q': 'k',
-    })
-    t = t.translate(_NORM_MAP)
-    # ß → ss (translate tek char → tek char, bu özel)
-    t = t.replace('ß', 'ss')
-
-    # 4. Digraph / fonetik dönüşümler (sıra önemli — uzun olanlar önce)
-    _DIGRAPHS = [
-        ('ph', 'f'),
-        ('th', 't'),
-        ('sh', 's'),
-        ('ch', 'c'),
-        ('ck', 'k'),
-        ('qu', 'k'),
-        ('wh', 'v'),
-        ('gh', 'g'),
-        ('ae', 'e'),
-        ('oe', 'o'),
-    ]
-    for digraph, replacement in _DIGRAPHS:
-        t = t.replace(digraph, replacement)
-
-    # x → ks
-    t = t.replace('x', 'ks')
-
-    # 5. Çift ünsüz → tek (alerjik/allerjik, akut/acut, mg tıbbi yazım varyasyonları)
-    # Bu Türkçede anlam değiştirmez, "hall" → "hal" gibi bazı kelimeleri etkileyebilir
-    # ama tıbbi terim eşleşmelerinde kritik.
-    import re as _re
-    t = _re.sub(r'([bcçdfgğhjklmnprsştvyz])\1+', r'\1', t)
 
-    return t
+    Uygulama normalize_metin.fonetik_normalize'dadır (tablolar bir kez
+    kurulur, sonuç önbelleklenir).
+    """
+    return fonetik_normalize(metin)
 
 
 def _turkce_ara(metin: str, aranan: str) -> bool:
     """Türkçe karakter farkı gözetmeden metin içinde arama.
     İ/i/I/ı, Ü/ü/U/u, Ö/ö/O/o, Ş/ş/S/s, Ç/ç/C/c, Ğ/ğ/G/g fark etmez.
     Örnek: _turkce_ara("SÜLFONİLÜRELER", "sülfonilüre") → True
-    """
-    return _turkce_normalize(aranan) in _turkce_normalize(metin)
-
 
-_TR_LOWER_MAP = str.maketrans({
-    'İ': 'i', 'I': 'i', 'ı': 'i',
-    'Ş': 's', 'ş': 's',
-    'Ğ': 'g', 'ğ': 'g',
-    'Ç': 'c', 'ç': 'c',
-    'Ö': 'o', 'ö': 'o',
-    'Ü': 'u', 'ü': 'u',
-})
+    Metin satır başına bir kez normalize edilir (normalize_metin önbelleği);
+    ibare listeleri için IbareKumesi tek taramada arar.
+    """
+    return normalize_metin(metin).ara(aranan)
 
 
 def _tr_lower(s) -> str:
@@ -1417,7 +1363,7 @@ def _tr_lower(s) -> str:
     """
     if not s:
         return ''
-    return str(s).translate(_TR_LOWER_MAP).lower()
+    return str(s).translate(TR_LOWER_MAP).lower()
 
 
 def _tum_metinleri_birlesir(ilac_sonuc: Dict) -> str:
@@ -5025,6 +4971,17 @@ _GLISEMIK_MAKS_DOZ = (
     'önerilen maksimum', 'onerilen maksimum',
 )
 
+# Tek taramalık kayıtlı kümeler (any(_turkce_ara(m, k) for k in ...) ≡ .var_mi(m))
+_GLISEMIK_KUMELERI = {
+    ad: ibare_kumesi(f"glisemik_{ad}", ibareler) for ad, ibareler in (
+        ("metformin", _GLISEMIK_METFORMIN),
+        ("sulfonilure", _GLISEMIK_SULFONILURE),
+        ("olcum", _GLISEMIK_OLCUM),
+        ("yetersiz", _GLISEMIK_YETERSIZ),
+        ("maks_doz", _GLISEMIK_MAKS_DOZ),
+    )
+}
+
 
 def _diy_glisemik_sart_var(metin: str) -> Tuple[bool, str]:
     """SUT 4.2.38(4)(6)(7) — 'metformin/sülfonilüre maks tolere doz yetersiz
@@ -5046,11 +5003,11 @@ def _diy_glisemik_sart_var(metin: str) -> Tuple[bool, str]:
     """
     if not metin:
         return False, ''
-    var_met = any(_turkce_ara(metin, k) for k in _GLISEMIK_METFORMIN)
-    var_sul = any(_turkce_ara(metin, k) for k in _GLISEMIK_SULFONILURE)
-    var_ol = any(_turkce_ara(metin, k) for k in _GLISEMIK_OLCUM)
-    var_yet = any(_turkce_ara(metin, k) for k in _GLISEMIK_YETERSIZ)
-    var_mks = any(_turkce_ara(metin, k) for k in _GLISEMIK_MAKS_DOZ)
+    var_met = _GLISEMIK_KUMELERI["metformin"].var_mi(metin)
+    var_sul = _GLISEMIK_KUMELERI["sulfonilure"].var_mi(metin)
+    var_ol = _GLISEMIK_KUMELERI["olcum"].var_mi(metin)
+    var_yet = _GLISEMIK_KUMELERI["yetersiz"].var_mi(metin)
+    var_mks = _GLISEMIK_KUMELERI["maks_doz"].var_mi(metin)
     var_oad = var_met or var_sul
 
     eslesti = (
@@ -5324,11 +5281,11 @@ def _kontrol_diyabet_dpp4_sglt2_impl(ilac_sonuc: Dict, sartlar: List[SartSonuc])
     # (kullanıcı isteği 2026-05-17: metformin/sülfonilüre etken+ticari ad,
     # HbA1c/glikoz/glisemik indeks, yetersiz/regülasyon/optimal/kombinasyon,
     # maks tolere/en yüksek doz varyasyonları).
-    metformin_ib = any(_turkce_ara(tum_metin, k) for k in _GLISEMIK_METFORMIN)
-    sulfonilure_ib = any(_turkce_ara(tum_metin, k) for k in _GLISEMIK_SULFONILURE)
-    glisemik_ib = any(_turkce_ara(tum_metin, k) for k in _GLISEMIK_OLCUM)
-    yetersiz_ib = any(_turkce_ara(tum_metin, k) for k in _GLISEMIK_YETERSIZ)
-    maks_doz_ib = any(_turkce_ara(tum_metin, k) for k in _GLISEMIK_MAKS_DOZ)
+    metformin_ib = _GLISEMIK_KUMELERI["metformin"].var_mi(tum_metin)
+    sulfonilure_ib = _GLISEMIK_KUMELERI["sulfonilure"].var_mi(tum_metin)
+    glisemik_ib = _GLISEMIK_KUMELERI["olcum"].var_mi(tum_metin)
+    yetersiz_ib = _GLISEMIK_KUMELERI["yetersiz"].var_mi(tum_metin)
+    maks_doz_ib = _GLISEMIK_KUMELERI["maks_doz"].var_mi(tum_metin)
 
     # HbA1c değeri (örn. "HbA1c: 8.2", "HbA1c %9")
     hba1c_deger = None
@@ -19531,6 +19488,142 @@ def kontrol_solunum(ilac_sonuc: Dict) -> KontrolRaporu:
     )
 
 
+# kontrol_genel_raporlu kategori tespiti: etken madde ibareleri kayıtlı
+# tek-tarama kümeleridir (any(_turkce_ara(etkin, e) for e in ...) ≡ .var_mi(etkin)).
+_GENEL_GNRH_ETKIN = ibare_kumesi('genel_raporlu_gnrh', (
+    'LOPROLID', 'LÖPROLID', 'LEUPROLID', 'LEUPRORELIN', 'GOSERELIN', 'GOSRELIN',
+    'TRIPTORELIN', 'BUSERELIN', 'BÜSERELIN', 'DEGARELIX', 'NAFARELIN',
+))
+_GENEL_BH_ETKIN = ibare_kumesi('genel_raporlu_bh', (
+    'SOMATROPIN', 'SOMATOTROPIN',
+))
+_GENEL_ESA_ETKIN = ibare_kumesi('genel_raporlu_esa', (
+    'ERITROPOIETIN', 'ERITROPOETIN', 'EPOETIN', 'DARBEPOETIN', 'DARBEPOETIN ALFA',
+    'METOKSIPOLIETILENGLIKOL',
+))
+_GENEL_IMMUNSUP_ETKIN = ibare_kumesi('genel_raporlu_immunsup', (
+    'MIKOFENOLAT', 'MIKOFENOLAT MOFETIL', 'MIKOFENOLIK ASIT', 'TAKROLIMUS',
+    'SIKLOSPORIN', 'EVEROLIMUS', 'SIROLIMUS', 'AZATIOPRIN', 'BASILIKSIMAB',
+))
+_GENEL_BIYOLOJIK_ETKIN = ibare_kumesi('genel_raporlu_biyolojik', (
+    'ADALIMUMAB', 'ETANERSEPT', 'INFLIKSIMAB', 'GOLIMUMAB', 'SERTOLIZUMAB',
+    'SEKUKINUMAB', 'IKSEKIZUMAB', 'USTEKINUMAB', 'VEDOLIZUMAB', 'TOFASITINIB',
+    'BARICITINIB', 'UPADACITINIB', 'GUSELKUMAB', 'RISANKIZUMAB', 'TOCILIZUMAB',
+    'SARILUMAB', 'ABATASEPT', 'RITUKSIMAB', 'BELIMUMAB', 'DUPILUMAB', 'OMALIZUMAB',
+    'BENRALIZUMAB', 'MEPOLIZUMAB',
+))
+_GENEL_IVIG_ETKIN = ibare_kumesi('genel_raporlu_ivig', (
+    'IMMUNOGLOBULIN', 'IMMÜNGLOBULIN', 'IMMUNGLOBULIN',
+))
+_GENEL_FAKTOR_ETKIN = ibare_kumesi('genel_raporlu_faktor', (
+    'FAKTOR VIII', 'FAKTÖR VIII', 'FAKTOR IX', 'FAKTÖR IX', 'FAKTOR VII', 'FAKTÖR VII',
+    'VON WILLEBRAND', 'EMICIZUMAB', 'FITUSIRAN',
+))
+_GENEL_ANTIFUNGAL_ETKIN = ibare_kumesi('genel_raporlu_antifungal', (
+    'VORIKONAZOL', 'KASPOFUNGIN', 'ANIDULAFUNGIN', 'MIKAFUNGIN', 'AMFOTERISIN',
+    'POSAKONAZOL', 'ISAVUKONAZOL', 'FLUKONAZOL',
+))
+_GENEL_PH_ETKIN = ibare_kumesi('genel_raporlu_ph', (
+    'BOSENTAN', 'AMBRISENTAN', 'MACITENTAN', 'SILDENAFIL', 'TADALAFIL', 'RIOCIGUAT',
+    'SELEKSIPAG', 'ILOPROST', 'TREPROSTINIL', 'EPOPROSTENOL',
+))
+_GENEL_MS_ETKIN = ibare_kumesi('genel_raporlu_ms', (
+    'INTERFERON BETA', 'GLATIRAMER', 'FINGOLIMOD', 'DIMETIL FUMARAT', 'TERIFLUNOMID',
+    'NATALIZUMAB', 'ALEMTUZUMAB', 'OKRELIZUMAB', 'SIPONIMOD', 'OZANIMOD', 'KLADRIBIN',
+    'OFATUMUMAB',
+))
+_GENEL_NSAID_ETKIN = ibare_kumesi('genel_raporlu_nsaid', (
+    'ETODOLAK', 'ETODOLAC', 'DIKLOFENAK', 'NAPROKSEN', 'IBUPROFEN', 'MELOKSIKAM',
+    'PIROKSIKAM', 'TENOKSIKAM', 'LORNOKSIKAM', 'INDOMETASIN', 'INDOMETAZIN',
+    'KETOPROFEN', 'FLURBIPROFEN', 'DEKKETOPROFEN', 'DEKSKETOPROFEN', 'ASETILSALISILIK',
+    'NIMESULID', 'SELEKOKSIB', 'ETORIKOKSIB', 'ASEKLOFENAC', 'NABUMETON', 'TOLMETIN',
+    'FENOPROFEN', 'OKSAPROZIN', 'DIFLUNISAL', 'SULINDAK',
+))
+_GENEL_ANTIEPIL_ETKIN = ibare_kumesi('genel_raporlu_antiepil', (
+    'PREGABALIN', 'GABAPENTIN', 'LEVETIRASETAM', 'LAMOTRIJIN', 'KARBAMAZEPIN',
+    'OKSKARBAZAPIN', 'VALPROIK', 'VALPROAT', 'TOPIRAMAT', 'ZONISAMID', 'LAKOSAMID',
+    'PERAMPANEL', 'BRIVARASETAM', 'ESLIKARBAZAPIN', 'FENITOIN', 'FENOBARBITAL',
+    'ETOSUKSIMID', 'KLOBAZAM', 'KLONAZEPAM', 'VIGABATRIN', 'STIRIPENTOL', 'RUFINAMID',
+))
+_GENEL_ALZHEIMER_ETKIN = ibare_kumesi('genel_raporlu_alzheimer', (
+    'DONEPEZIL', 'RIVASTIGMIN', 'RIVASTIGMINE', 'GALANTAMIN', 'MEMANTIN', 'MEMANTINE',
+))
+_GENEL_PARKINSON_ETKIN = ibare_kumesi('genel_raporlu_parkinson', (
+    'LEVODOPA', 'KARBIDOPA', 'BENSERAZID', 'PRAMIPEKSOL', 'ROPINIROL', 'ROTIGOTIN',
+    'ENTAKAPON', 'OPICAPON', 'TOLKAPON', 'AMANTADIN', 'APOMORFIN',
+))
+_GENEL_HEPATIT_ETKIN = ibare_kumesi('genel_raporlu_hepatit', (
+    'ENTEKAVIR', 'TENOFOVIR', 'TENOFOVIR DISOPROKSIL', 'TENOFOVIR ALAFENAMID',
+    'LAMIVUDIN', 'SOFOSBUVIR', 'LEDIPASVIR', 'VELPATASVIR', 'GLECAPREVIR',
+    'PIBRENTASVIR', 'DAKLATASVIR', 'OMBITASVIR', 'PARITAPREVIR', 'DASABUVIR',
+    'RIBAVIRIN', 'PEGINTERFERON',
+))
+_GENEL_ANTIVEGF_ETKIN = ibare_kumesi('genel_raporlu_antivegf', (
+    'RANIBIZUMAB', 'AFLIBERSEPT', 'BROLUCIZUMAB', 'FARICIMAB', 'BEVACIZUMAB',
+))
+_GENEL_OSTEO_BIYO_ETKIN = ibare_kumesi('genel_raporlu_osteo_biyo', (
+    'DENOSUMAB', 'TERIPARATID', 'TERIPARATIDE', 'ROMOSOZUMAB', 'STRONSIYUM RANELAT',
+))
+_GENEL_PPI_ETKIN = ibare_kumesi('genel_raporlu_ppi', (
+    'OMEPRAZOL', 'LANSOPRAZOL', 'PANTOPRAZOL', 'RABEPRAZOL', 'ESOMEPRAZOL',
+    'DEKSLANSOPRAZOL',
+))
+_GENEL_BPH_ETKIN = ibare_kumesi('genel_raporlu_bph', (
+    'TAMSULOSIN', 'ALFUZOSIN', 'SILODOSIN', 'TERAZOSIN', 'SOLIFENASIN', 'DARIFENASIN',
+    'FESOTERODIN', 'TOLTERODINE', 'OKSIBUTININ', 'MIRABEGRON', 'DUTASTERID',
+    'FINASTERID', 'DUTASTERID/TAMSULOSIN',
+))
+_GENEL_OPIOID_ETKIN = ibare_kumesi('genel_raporlu_opioid', (
+    'MORFIN', 'FENTANIL', 'OKSIKODON', 'HIDROKODON', 'BUPRENORFIN', 'TAPENTADOL',
+    'KODEIN', 'PETIDIN', 'METADON',
+))
+_GENEL_TBU_ETKIN = ibare_kumesi('genel_raporlu_tbu', (
+    'ENTERAL BESLENME', 'PARENTERAL BESLENME',
+))
+_GENEL_INSULIN_ETKIN = ibare_kumesi('genel_raporlu_insulin', (
+    'INSULIN GLARJIN', 'INSULIN DETEMIR', 'INSULIN DEGLUDEK', 'INSULIN ASPART',
+    'INSULIN LISPRO', 'INSULIN GLULISIN', 'INSULIN NPH', 'INSULIN REGULAR',
+))
+_GENEL_KAS_ETKIN = ibare_kumesi('genel_raporlu_kas', (
+    'TIZANIDIN', 'BAKLOFEN', 'SIKLOBENZAPRIN', 'DANTROLEN', 'METAMIZOL', 'KLORZOKSAZON',
+    'METOKARBAMOL', 'PRIDINOL', 'TIYOKOLSIKOZID', 'TIYOKOLSIKOSID', 'THIOCOLCHICOSIDE',
+))
+_GENEL_GIS_OTC_ETKIN = ibare_kumesi('genel_raporlu_gis_otc', (
+    'LOPERAMID', 'DIOSMEKTIT', 'BIZMUT', 'SUKRALFAT', 'SIMETIDIN', 'FAMOTIDIN',
+    'RANITIDIN', 'MEBEVERIN', 'TRIMEBUTIN', 'ALVERIN', 'DOMPERIDON', 'METOKLOPRAMID',
+    'ONDANSETRON',
+))
+_GENEL_ANTIHIPERTANSIF_ETKIN = ibare_kumesi('genel_raporlu_antihipertansif', (
+    'AMLODIPIN', 'NIFEDIPIN', 'LERKANIDIPIN', 'DILTIAZEM', 'VERAPAMIL', 'METOPROLOL',
+    'BISOPROLOL', 'NEBIVOLOL', 'KARVEDILOL', 'ATENOLOL', 'PROPRANOLOL', 'ENALAPRIL',
+    'RAMIPRIL', 'PERINDOPRIL', 'LISINOPRIL', 'KAPTOPRIL', 'BENAZEPRIL', 'FOSINOPRIL',
+    'KINAPRIL', 'SPIRONOLAKTON', 'FUROSEMID', 'HIDROKLOROTIYAZID', 'INDAPAMID',
+    'TORASEMID', 'AMILORID',
+))
+_GENEL_ANTIBIYOTIK_ETKIN = ibare_kumesi('genel_raporlu_antibiyotik', (
+    'AMOKSISILIN', 'AMOKSISILIN/KLAVULANAT', 'AMPISILIN', 'SEFALEKSIN', 'SEFUROKSIM',
+    'SEFTRIAKSON', 'SEFDINIR', 'SEFPODOKSIM', 'SEFIKSIM', 'AZITROMISIN',
+    'KLARITROMISIN', 'ERITROMISIN', 'DOKSISIKLIN', 'TETRASIKLIN', 'TRIMETOPRIM',
+    'SULFAMETOKSAZOL', 'NITROFURANTOIN', 'FOSFOMISIN', 'METRONIDAZOL', 'ORNIDAZOL',
+    'SEKNIDAZOL', 'GENTAMISIN', 'AMIKASIN', 'TOBRAMISIN', 'LINEZOLID', 'DAPTOMISIN',
+    'TEIKOPLANIN', 'VANKOMISIN', 'MEROPENEM', 'IMIPENEM', 'ERTAPENEM', 'DORIPENEM',
+    'PIPERASILIN', 'KOLISTIN', 'TIGESIKLIN',
+))
+_GENEL_KST_ETKIN = ibare_kumesi('genel_raporlu_kst', (
+    'LINEZOLID', 'DAPTOMISIN', 'TEIKOPLANIN', 'VANKOMISIN', 'MEROPENEM', 'IMIPENEM',
+    'ERTAPENEM', 'DORIPENEM', 'PIPERASILIN', 'KOLISTIN', 'TIGESIKLIN',
+))
+_GENEL_TIROID_ETKIN = ibare_kumesi('genel_raporlu_tiroid', (
+    'LEVOTIROKSIN', 'LIYOTIRONIN', 'PROPILTIYOURASIL', 'METIMAZOL', 'TIAMAZOL',
+    'KARBIMAZOL',
+))
+_GENEL_VITAMIN_ETKIN = ibare_kumesi('genel_raporlu_vitamin', (
+    'DEMIR', 'FERRÖZ', 'DEMIR SÜLFAT', 'DEMIR FUMARAT', 'KALSIYUM', 'KOLEKALSITEROL',
+    'ERGOKALSIFEROL', 'FOLIK ASIT', 'SIYANOKOBALAMIN', 'B12', 'ASKORBIK ASIT',
+    'TOKOFEROL', 'PIRIDOKSIN',
+))
+
+
 def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
     """
     Genel raporlu ilaçlar - Detaylı SUT kontrolleri.
@@ -19572,12 +19665,9 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
                              'Rapor/mesaj metni yok — kontrol yapılamadı')
 
     # ── 1. GnRH (LHRH) Analogları (SUT 4.2.14.C) ──
-    gnrh_etkin = ['LOPROLID', 'LÖPROLID', 'LEUPROLID', 'LEUPRORELIN',
-                  'GOSERELIN', 'GOSRELIN', 'TRIPTORELIN', 'BUSERELIN', 'BÜSERELIN',
-                  'DEGARELIX', 'NAFARELIN']
     gnrh_ilac = ['LUCRIN', 'ELIGARD', 'ZOLADEX', 'GONAPEPTYL', 'DECAPEPTYL',
                  'DIPHERELINE', 'SUPREFACT', 'FIRMAGON', 'ENANTONE', 'PROSTAP']
-    gnrh_mi = any(_turkce_ara(etkin_madde, e) for e in gnrh_etkin) or \
+    gnrh_mi = _GENEL_GNRH_ETKIN.var_mi(etkin_madde) or \
               any(i in ilac_adi for i in gnrh_ilac)
 
     if gnrh_mi:
@@ -19646,10 +19736,9 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 2. Büyüme Hormonu (SUT 4.2.14.A) ──
-    bh_etkin = ['SOMATROPIN', 'SOMATOTROPIN']
     bh_ilac = ['GENOTROPIN', 'NORDITROPIN', 'HUMATROPE', 'SAIZEN', 'OMNITROPE',
                'NUTROPIN', 'ZOMACTON']
-    bh_mi = any(_turkce_ara(etkin_madde, e) for e in bh_etkin) or \
+    bh_mi = _GENEL_BH_ETKIN.var_mi(etkin_madde) or \
             any(i in ilac_adi for i in bh_ilac)
 
     if bh_mi:
@@ -19657,12 +19746,10 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         return _buyume_hormonu_detayli_kontrol(ilac_adi, etkin_madde, rapor_kodu, metin, teshis_metin_local)
 
     # ── 3. Eritropoietin / ESA (SUT 4.2.30) ──
-    esa_etkin = ['ERITROPOIETIN', 'ERITROPOETIN', 'EPOETIN', 'DARBEPOETIN',
-                 'DARBEPOETIN ALFA', 'METOKSIPOLIETILENGLIKOL']
     esa_ilac = ['EPREX', 'NEORECORMON', 'ARANESP', 'MIRCERA', 'BINOCRIT',
                 'RETACRIT', 'ERYPRO', 'EPOBEL', 'EPOKINE', 'EPORON',
                 'DYNEPO', 'ABSEAMED', 'BIOPOIN', 'SILAPO']
-    esa_mi = any(_turkce_ara(etkin_madde, e) for e in esa_etkin) or \
+    esa_mi = _GENEL_ESA_ETKIN.var_mi(etkin_madde) or \
              any(i in ilac_adi for i in esa_ilac)
 
     if esa_mi:
@@ -19672,13 +19759,10 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
                                      teshis_metin_local, ilac_sonuc=ilac_sonuc)
 
     # ── 4. İmmünosüpresifler (SUT 4.2.32) ──
-    immunsup_etkin = ['MIKOFENOLAT', 'MIKOFENOLAT MOFETIL', 'MIKOFENOLIK ASIT',
-                      'TAKROLIMUS', 'SIKLOSPORIN', 'EVEROLIMUS', 'SIROLIMUS',
-                      'AZATIOPRIN', 'BASILIKSIMAB']
     immunsup_ilac = ['CELLCEPT', 'MYFORTIC', 'PROGRAF', 'ADVAGRAF', 'ENVARSUS',
                      'SANDIMMUN', 'NEORAL', 'CERTICAN', 'RAPAMUNE',
                      'IMURAN', 'SIMULECT']
-    immunsup_mi = any(_turkce_ara(etkin_madde, e) for e in immunsup_etkin) or \
+    immunsup_mi = _GENEL_IMMUNSUP_ETKIN.var_mi(etkin_madde) or \
                   any(i in ilac_adi for i in immunsup_ilac)
 
     if immunsup_mi:
@@ -19686,12 +19770,6 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         return _immunsupresif_detayli_kontrol(ilac_adi, etkin_madde, rapor_kodu, metin, teshis_metin_local)
 
     # ── 5. Biyolojik İlaçlar / TNF İnhibitörleri (SUT 4.2.1.C) ──
-    biyolojik_etkin = ['ADALIMUMAB', 'ETANERSEPT', 'INFLIKSIMAB', 'GOLIMUMAB',
-                       'SERTOLIZUMAB', 'SEKUKINUMAB', 'IKSEKIZUMAB', 'USTEKINUMAB',
-                       'VEDOLIZUMAB', 'TOFASITINIB', 'BARICITINIB', 'UPADACITINIB',
-                       'GUSELKUMAB', 'RISANKIZUMAB', 'TOCILIZUMAB', 'SARILUMAB',
-                       'ABATASEPT', 'RITUKSIMAB', 'BELIMUMAB', 'DUPILUMAB',
-                       'OMALIZUMAB', 'BENRALIZUMAB', 'MEPOLIZUMAB']
     biyolojik_ilac = ['HUMIRA', 'ENBREL', 'REMICADE', 'SIMPONI', 'CIMZIA',
                       'COSENTYX', 'TALTZ', 'STELARA', 'ENTYVIO', 'XELJANZ',
                       'OLUMIANT', 'RINVOQ', 'TREMFYA', 'SKYRIZI', 'ACTEMRA',
@@ -19699,7 +19777,7 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
                       'XOLAIR', 'FASENRA', 'NUCALA', 'IMRALDI', 'HYRIMOZ',
                       'HADLIMA', 'HULIO', 'ERELZI', 'BENEPALI', 'INFLECTRA',
                       'REMSIMA', 'FLIXABI']
-    biyolojik_mi = any(_turkce_ara(etkin_madde, e) for e in biyolojik_etkin) or \
+    biyolojik_mi = _GENEL_BIYOLOJIK_ETKIN.var_mi(etkin_madde) or \
                    any(i in ilac_adi for i in biyolojik_ilac)
 
     if biyolojik_mi:
@@ -19707,10 +19785,9 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         return _biyolojik_tnf_detayli_kontrol(ilac_adi, etkin_madde, rapor_kodu, metin, teshis_metin_local)
 
     # ── 6. İmmünglobulinler (SUT 4.2.6) ──
-    ivig_etkin = ['IMMUNOGLOBULIN', 'IMMÜNGLOBULIN', 'IMMUNGLOBULIN']
     ivig_ilac = ['OCTAGAM', 'PRIVIGEN', 'KIOVIG', 'FLEBOGAMMA', 'HIZENTRA',
                  'CUTAQUIG', 'INTRATECT', 'IVIG', 'SUBCUVIA']
-    ivig_mi = any(_turkce_ara(etkin_madde, e) for e in ivig_etkin) or \
+    ivig_mi = _GENEL_IVIG_ETKIN.var_mi(etkin_madde) or \
               any(i in ilac_adi for i in ivig_ilac)
 
     if ivig_mi:
@@ -19718,13 +19795,10 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         return _ivig_detayli_kontrol(ilac_adi, etkin_madde, rapor_kodu, metin, teshis_metin_local)
 
     # ── 7. Koagülasyon Faktörleri (SUT 4.2.5) ──
-    faktor_etkin = ['FAKTOR VIII', 'FAKTÖR VIII', 'FAKTOR IX', 'FAKTÖR IX',
-                    'FAKTOR VII', 'FAKTÖR VII', 'VON WILLEBRAND',
-                    'EMICIZUMAB', 'FITUSIRAN']
     faktor_ilac = ['ADVATE', 'KOGENATE', 'REFACTO', 'BENEFIX', 'NOVOSEVEN',
                    'HEMLIBRA', 'RIXUBIS', 'NUWIQ', 'ELOCTA', 'ALPROLIX',
                    'FEIBA', 'WILATE', 'HAEMATE', 'AFSTYLA']
-    faktor_mi = any(_turkce_ara(etkin_madde, e) for e in faktor_etkin) or \
+    faktor_mi = _GENEL_FAKTOR_ETKIN.var_mi(etkin_madde) or \
                 any(i in ilac_adi for i in faktor_ilac)
 
     if faktor_mi:
@@ -19732,11 +19806,9 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         return _koagulasyon_detayli_kontrol(ilac_adi, etkin_madde, rapor_kodu, metin, teshis_metin_local)
 
     # ── 8. Sistemik Antifungaller (SUT EK-4/E) ──
-    antifungal_etkin = ['VORIKONAZOL', 'KASPOFUNGIN', 'ANIDULAFUNGIN', 'MIKAFUNGIN',
-                        'AMFOTERISIN', 'POSAKONAZOL', 'ISAVUKONAZOL', 'FLUKONAZOL']
     antifungal_ilac = ['VFEND', 'CANCIDAS', 'ECALTA', 'MYCAMINE', 'AMBISOME',
                        'ABELCET', 'NOXAFIL', 'CRESEMBA', 'DIFLUCAN', 'TRIFLUCAN']
-    antifungal_mi = any(_turkce_ara(etkin_madde, e) for e in antifungal_etkin) or \
+    antifungal_mi = _GENEL_ANTIFUNGAL_ETKIN.var_mi(etkin_madde) or \
                     any(i in ilac_adi for i in antifungal_ilac)
 
     if antifungal_mi:
@@ -19767,13 +19839,11 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 9. Pulmoner Hipertansiyon İlaçları (SUT 4.2.26) ──
-    ph_etkin = ['BOSENTAN', 'AMBRISENTAN', 'MACITENTAN', 'SILDENAFIL', 'TADALAFIL',
-                'RIOCIGUAT', 'SELEKSIPAG', 'ILOPROST', 'TREPROSTINIL', 'EPOPROSTENOL']
     ph_ilac = ['TRACLEER', 'VOLIBRIS', 'OPSUMIT', 'REVATIO', 'ADCIRCA',
                'ADEMPAS', 'UPTRAVI', 'VENTAVIS', 'REMODULIN', 'FLOLAN']
     # Sildenafil/Tadalafil PH dışında da kullanılır — rapor kodu ile ayır
     ph_rapor = rapor_kodu.startswith('04.') or rapor_kodu.startswith('05.') if rapor_kodu else False
-    ph_mi = (any(_turkce_ara(etkin_madde, e) for e in ph_etkin) or
+    ph_mi = (_GENEL_PH_ETKIN.var_mi(etkin_madde) or
              any(i in ilac_adi for i in ph_ilac))
     # Sildenafil/Tadalafil sadece PH rapor kodu varsa bu kategoriye girer
     sild_tad = _turkce_ara(etkin_madde, 'sildenafil') or _turkce_ara(etkin_madde, 'tadalafil')
@@ -19798,13 +19868,10 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 10. Multipl Skleroz İlaçları (SUT 4.2.25) ──
-    ms_etkin = ['INTERFERON BETA', 'GLATIRAMER', 'FINGOLIMOD', 'DIMETIL FUMARAT',
-                'TERIFLUNOMID', 'NATALIZUMAB', 'ALEMTUZUMAB', 'OKRELIZUMAB',
-                'SIPONIMOD', 'OZANIMOD', 'KLADRIBIN', 'OFATUMUMAB']
     ms_ilac = ['AVONEX', 'REBIF', 'BETAFERON', 'EXTAVIA', 'COPAXONE',
                'GILENYA', 'TECFIDERA', 'AUBAGIO', 'TYSABRI', 'LEMTRADA',
                'OCREVUS', 'MAYZENT', 'ZEPOSIA', 'MAVENCLAD', 'KESIMPTA']
-    ms_mi = any(_turkce_ara(etkin_madde, e) for e in ms_etkin) or \
+    ms_mi = _GENEL_MS_ETKIN.var_mi(etkin_madde) or \
             any(i in ilac_adi for i in ms_ilac)
 
     if ms_mi:
@@ -19827,13 +19894,6 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 11. NSAİD / Antiinflamatuarlar (SUT EK-4/A — Raporsuz yazılabilir) ──
-    nsaid_etkin = ['ETODOLAK', 'ETODOLAC', 'DIKLOFENAK', 'NAPROKSEN', 'IBUPROFEN',
-                   'MELOKSIKAM', 'PIROKSIKAM', 'TENOKSIKAM', 'LORNOKSIKAM',
-                   'INDOMETASIN', 'INDOMETAZIN', 'KETOPROFEN', 'FLURBIPROFEN',
-                   'DEKKETOPROFEN', 'DEKSKETOPROFEN', 'ASETILSALISILIK',
-                   'NIMESULID', 'SELEKOKSIB', 'ETORIKOKSIB', 'ASEKLOFENAC',
-                   'NABUMETON', 'TOLMETIN', 'FENOPROFEN', 'OKSAPROZIN',
-                   'DIFLUNISAL', 'SULINDAK']
     nsaid_ilac = ['ETOL', 'ETODOL', 'ETOPAN', 'LODINE',
                   'VOLTAREN', 'DIKLORON', 'DICLOMEC', 'ARTROTEC',
                   'NAPROSYN', 'APRANAX', 'PROXEN', 'NAPREN',
@@ -19846,7 +19906,7 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
                   'CELEBREX', 'CELECOX',
                   'ARCOXIA', 'ETORIX',
                   'AIRTAL', 'PRESERVEX']
-    nsaid_mi = any(_turkce_ara(etkin_madde, e) for e in nsaid_etkin) or \
+    nsaid_mi = _GENEL_NSAID_ETKIN.var_mi(etkin_madde) or \
                any(i in ilac_adi for i in nsaid_ilac)
 
     if nsaid_mi:
@@ -19868,12 +19928,6 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 12. Antiepileptikler (SUT 4.2.1) ──
-    antiepil_etkin = ['PREGABALIN', 'GABAPENTIN', 'LEVETIRASETAM', 'LAMOTRIJIN',
-                      'KARBAMAZEPIN', 'OKSKARBAZAPIN', 'VALPROIK', 'VALPROAT',
-                      'TOPIRAMAT', 'ZONISAMID', 'LAKOSAMID', 'PERAMPANEL',
-                      'BRIVARASETAM', 'ESLIKARBAZAPIN', 'FENITOIN', 'FENOBARBITAL',
-                      'ETOSUKSIMID', 'KLOBAZAM', 'KLONAZEPAM', 'VIGABATRIN',
-                      'STIRIPENTOL', 'RUFINAMID']
     antiepil_ilac = ['LYRICA', 'PREGABALIN', 'NEURONTIN', 'GABAPENTIN', 'GABANTIN',
                      'KEPPRA', 'LEVEBON', 'EPITERRA',
                      'LAMICTAL', 'LAMOTRIX',
@@ -19883,7 +19937,7 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
                      'TOPAMAX', 'TOPAMAC',
                      'ZONEGRAN', 'VIMPAT', 'FYCOMPA',
                      'EPANUTIN', 'LUMINAL', 'RIVOTRIL', 'FRISIUM']
-    antiepil_mi = any(_turkce_ara(etkin_madde, e) for e in antiepil_etkin) or \
+    antiepil_mi = _GENEL_ANTIEPIL_ETKIN.var_mi(etkin_madde) or \
                   any(i in ilac_adi for i in antiepil_ilac)
 
     if antiepil_mi:
@@ -19942,11 +19996,9 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 13. Alzheimer İlaçları (SUT 4.2.27) ──
-    alzheimer_etkin = ['DONEPEZIL', 'RIVASTIGMIN', 'RIVASTIGMINE', 'GALANTAMIN',
-                       'MEMANTIN', 'MEMANTINE']
     alzheimer_ilac = ['ARICEPT', 'DONECEPT', 'REMINYL', 'EXELON',
                       'EBIXA', 'MEMANTINE', 'MEMANTIN']
-    alzheimer_mi = any(_turkce_ara(etkin_madde, e) for e in alzheimer_etkin) or \
+    alzheimer_mi = _GENEL_ALZHEIMER_ETKIN.var_mi(etkin_madde) or \
                    any(i in ilac_adi for i in alzheimer_ilac)
 
     if alzheimer_mi:
@@ -19975,13 +20027,10 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 14. Parkinson İlaçları (SUT 4.2.3) ──
-    parkinson_etkin = ['LEVODOPA', 'KARBIDOPA', 'BENSERAZID', 'PRAMIPEKSOL',
-                       'ROPINIROL', 'ROTIGOTIN', 'ENTAKAPON', 'OPICAPON',
-                       'TOLKAPON', 'AMANTADIN', 'APOMORFIN']
     parkinson_ilac = ['MADOPAR', 'SINEMET', 'STALEVO', 'MIRAPEX', 'PEXOLA',
                       'REQUIP', 'NEUPRO', 'COMTAN', 'ONGENTYS', 'TASMAR',
                       'SYMMETREL', 'PK-MERZ']
-    parkinson_mi = any(_turkce_ara(etkin_madde, e) for e in parkinson_etkin) or \
+    parkinson_mi = _GENEL_PARKINSON_ETKIN.var_mi(etkin_madde) or \
                    any(i in ilac_adi for i in parkinson_ilac)
 
     if parkinson_mi:
@@ -20008,16 +20057,11 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 15. Hepatit B/C İlaçları (SUT 4.2.19) ──
-    hepatit_etkin = ['ENTEKAVIR', 'TENOFOVIR', 'TENOFOVIR DISOPROKSIL',
-                     'TENOFOVIR ALAFENAMID', 'LAMIVUDIN',
-                     'SOFOSBUVIR', 'LEDIPASVIR', 'VELPATASVIR', 'GLECAPREVIR',
-                     'PIBRENTASVIR', 'DAKLATASVIR', 'OMBITASVIR', 'PARITAPREVIR',
-                     'DASABUVIR', 'RIBAVIRIN', 'PEGINTERFERON']
     hepatit_ilac = ['BARACLUDE', 'VIREAD', 'VEMLIDY', 'ZEFFIX', 'HEPSERA',
                     'SOVALDI', 'HARVONI', 'EPCLUSA', 'MAVYRET', 'MAVIRET',
                     'DAKLINZA', 'VIEKIRAX', 'EXVIERA', 'COPEGUS', 'PEGASYS',
                     'PEGINTRON']
-    hepatit_mi = any(_turkce_ara(etkin_madde, e) for e in hepatit_etkin) or \
+    hepatit_mi = _GENEL_HEPATIT_ETKIN.var_mi(etkin_madde) or \
                  any(i in ilac_adi for i in hepatit_ilac)
 
     if hepatit_mi:
@@ -20047,10 +20091,8 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 16. Anti-VEGF Göz İlaçları (SUT 4.2.12.C) ──
-    antivegf_etkin = ['RANIBIZUMAB', 'AFLIBERSEPT', 'BROLUCIZUMAB', 'FARICIMAB',
-                      'BEVACIZUMAB']
     antivegf_ilac = ['LUCENTIS', 'EYLEA', 'BEOVU', 'VABYSMO', 'AVASTIN']
-    antivegf_mi = any(_turkce_ara(etkin_madde, e) for e in antivegf_etkin) or \
+    antivegf_mi = _GENEL_ANTIVEGF_ETKIN.var_mi(etkin_madde) or \
                   any(i in ilac_adi for i in antivegf_ilac)
 
     if antivegf_mi:
@@ -20076,11 +20118,9 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 17. Osteoporoz Biyolojik İlaçları (SUT 4.2.28.C) ──
-    osteo_biyo_etkin = ['DENOSUMAB', 'TERIPARATID', 'TERIPARATIDE',
-                        'ROMOSOZUMAB', 'STRONSIYUM RANELAT']
     osteo_biyo_ilac = ['PROLIA', 'XGEVA', 'FORTEO', 'FORSTEO', 'MOVYMIA',
                        'EVENITY', 'PROTELOS']
-    osteo_biyo_mi = any(_turkce_ara(etkin_madde, e) for e in osteo_biyo_etkin) or \
+    osteo_biyo_mi = _GENEL_OSTEO_BIYO_ETKIN.var_mi(etkin_madde) or \
                     any(i in ilac_adi for i in osteo_biyo_ilac)
 
     if osteo_biyo_mi:
@@ -20108,12 +20148,10 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 18. PPI - Proton Pompa İnhibitörleri (Raporsuz yazılabilir) ──
-    ppi_etkin = ['OMEPRAZOL', 'LANSOPRAZOL', 'PANTOPRAZOL', 'RABEPRAZOL',
-                 'ESOMEPRAZOL', 'DEKSLANSOPRAZOL']
     ppi_ilac = ['LOSEC', 'NEXIUM', 'LANSOR', 'OGASTRO', 'PANTPAS', 'CONTROLOC',
                 'PARIET', 'DEXILANT', 'EMANERA', 'ESOPRAL',
                 'PANTOPRAZOL', 'LANSOR']
-    ppi_mi = any(_turkce_ara(etkin_madde, e) for e in ppi_etkin) or \
+    ppi_mi = _GENEL_PPI_ETKIN.var_mi(etkin_madde) or \
              any(i in ilac_adi for i in ppi_ilac)
 
     if ppi_mi:
@@ -20130,14 +20168,10 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 19. BPH / Alfa Bloker / İnkontinans İlaçları (SUT 4.2.16) ──
-    bph_etkin = ['TAMSULOSIN', 'ALFUZOSIN', 'SILODOSIN', 'TERAZOSIN',
-                 'SOLIFENASIN', 'DARIFENASIN', 'FESOTERODIN', 'TOLTERODINE',
-                 'OKSIBUTININ', 'MIRABEGRON', 'DUTASTERID', 'FINASTERID',
-                 'DUTASTERID/TAMSULOSIN']
     bph_ilac = ['FLOMAX', 'TAMSOL', 'TAMEK', 'XATRAL', 'UROREC', 'RAPAFLO',
                 'VESICARE', 'ENABLEX', 'TOVIAZ', 'DETRUSITOL', 'DITROPAN',
                 'BETMIGA', 'AVODART', 'PROSCAR', 'COMBODART', 'DUODART']
-    bph_mi = any(_turkce_ara(etkin_madde, e) for e in bph_etkin) or \
+    bph_mi = _GENEL_BPH_ETKIN.var_mi(etkin_madde) or \
              any(i in ilac_adi for i in bph_ilac)
 
     if bph_mi:
@@ -20199,13 +20233,10 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 20. Opioid Analjezikler (Kırmızı/Yeşil Reçete) ──
-    opioid_etkin = ['MORFIN', 'FENTANIL', 'OKSIKODON', 'HIDROKODON',
-                    'BUPRENORFIN', 'TAPENTADOL', 'KODEIN', 'PETIDIN',
-                    'METADON']
     opioid_ilac = ['MSCONTIN', 'DUROGESIC', 'OXYCONTIN', 'MATRIFEN',
                    'FENTANYL', 'SUBOXONE', 'PALEXIA', 'TRAMAL',
                    'CODEINE', 'DOLCONTRAL']
-    opioid_mi = any(_turkce_ara(etkin_madde, e) for e in opioid_etkin) or \
+    opioid_mi = _GENEL_OPIOID_ETKIN.var_mi(etkin_madde) or \
                 any(i in ilac_adi for i in opioid_ilac)
 
     if opioid_mi:
@@ -20227,11 +20258,10 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 21. Tıbbi Beslenme Ürünleri (SUT 4.2.4) ──
-    tbu_etkin = ['ENTERAL BESLENME', 'PARENTERAL BESLENME']
     tbu_ilac = ['ENSURE', 'FRESUBIN', 'NUTRISON', 'RESOURCE', 'FORTIMEL',
                 'ISOSOURCE', 'MODULEN', 'PEPTAMEN', 'NUTREN', 'IMPACT',
                 'NEOCATE', 'INFATRINI', 'NUTRAMIGEN']
-    tbu_mi = any(_turkce_ara(etkin_madde, e) for e in tbu_etkin) or \
+    tbu_mi = _GENEL_TBU_ETKIN.var_mi(etkin_madde) or \
              any(i in ilac_adi for i in tbu_ilac)
 
     if tbu_mi:
@@ -20255,13 +20285,10 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 22. İnsülin Analogları (SUT 4.2.38.C) ──
-    insulin_etkin = ['INSULIN GLARJIN', 'INSULIN DETEMIR', 'INSULIN DEGLUDEK',
-                     'INSULIN ASPART', 'INSULIN LISPRO', 'INSULIN GLULISIN',
-                     'INSULIN NPH', 'INSULIN REGULAR']
     insulin_ilac = ['LANTUS', 'TOUJEO', 'LEVEMIR', 'TRESIBA', 'NOVORAPID',
                     'HUMALOG', 'APIDRA', 'NOVOMIX', 'HUMULIN', 'FIASP',
                     'INSULATARD']
-    insulin_mi = any(_turkce_ara(etkin_madde, e) for e in insulin_etkin) or \
+    insulin_mi = _GENEL_INSULIN_ETKIN.var_mi(etkin_madde) or \
                  any(i in ilac_adi for i in insulin_ilac)
 
     if insulin_mi:
@@ -20286,12 +20313,9 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 23. Kas Gevşeticiler (Raporsuz yazılabilir) ──
-    kas_etkin = ['TIZANIDIN', 'BAKLOFEN', 'SIKLOBENZAPRIN', 'DANTROLEN',
-                 'METAMIZOL', 'KLORZOKSAZON', 'METOKARBAMOL', 'PRIDINOL',
-                 'TIYOKOLSIKOZID', 'TIYOKOLSIKOSID', 'THIOCOLCHICOSIDE']
     kas_ilac = ['SIRDALUD', 'LIORESAL', 'MUSCORIL', 'DANTRIUM',
                 'NOVALGIN', 'DEVALJIN', 'MYOGESIC', 'THIOCOLCHICOSIDE']
-    kas_mi = any(_turkce_ara(etkin_madde, e) for e in kas_etkin) or \
+    kas_mi = _GENEL_KAS_ETKIN.var_mi(etkin_madde) or \
              any(i in ilac_adi for i in kas_ilac)
 
     if kas_mi:
@@ -20310,14 +20334,10 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 24. Antidiyareik / GİS İlaçları (Raporsuz yazılabilir) ──
-    gis_otc_etkin = ['LOPERAMID', 'DIOSMEKTIT', 'BIZMUT', 'SUKRALFAT',
-                     'SIMETIDIN', 'FAMOTIDIN', 'RANITIDIN', 'MEBEVERIN',
-                     'TRIMEBUTIN', 'ALVERIN', 'DOMPERIDON', 'METOKLOPRAMID',
-                     'ONDANSETRON']
     gis_otc_ilac = ['IMODIUM', 'SMECTA', 'PEPTO', 'ULCURAN', 'FAMODIN',
                     'DUSPATALIN', 'DEBRIDAT', 'MOTILIUM', 'METPAMID',
                     'ZOFRAN', 'ONDAREN']
-    gis_otc_mi = any(_turkce_ara(etkin_madde, e) for e in gis_otc_etkin) or \
+    gis_otc_mi = _GENEL_GIS_OTC_ETKIN.var_mi(etkin_madde) or \
                  any(i in ilac_adi for i in gis_otc_ilac)
 
     if gis_otc_mi:
@@ -20333,18 +20353,11 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 25. Antihipertansifler - Kalsiyum Kanal Blokerleri / BB (Raporsuz) ──
-    antihipertansif_etkin = ['AMLODIPIN', 'NIFEDIPIN', 'LERKANIDIPIN', 'DILTIAZEM',
-                             'VERAPAMIL', 'METOPROLOL', 'BISOPROLOL', 'NEBIVOLOL',
-                             'KARVEDILOL', 'ATENOLOL', 'PROPRANOLOL', 'ENALAPRIL',
-                             'RAMIPRIL', 'PERINDOPRIL', 'LISINOPRIL', 'KAPTOPRIL',
-                             'BENAZEPRIL', 'FOSINOPRIL', 'KINAPRIL',
-                             'SPIRONOLAKTON', 'FUROSEMID', 'HIDROKLOROTIYAZID',
-                             'INDAPAMID', 'TORASEMID', 'AMILORID']
     antihipertansif_ilac = ['NORVASC', 'ADALAT', 'LERCANIL', 'DILTIAZEM', 'ISOPTIN',
                             'BELOC', 'CONCOR', 'NEBILET', 'DILATREND', 'TENORMIN',
                             'DIDERAL', 'RENITEC', 'DELIX', 'COVERSYL', 'ZESTRIL',
                             'KAPTORIL', 'ALDACTONE', 'LASIX', 'FURORESE']
-    antihipertansif_mi = any(_turkce_ara(etkin_madde, e) for e in antihipertansif_etkin) or \
+    antihipertansif_mi = _GENEL_ANTIHIPERTANSIF_ETKIN.var_mi(etkin_madde) or \
                          any(i in ilac_adi for i in antihipertansif_ilac)
 
     if antihipertansif_mi:
@@ -20360,16 +20373,6 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 26. Antibiyotikler (EK-4/E — Genel) ──
-    antibiyotik_etkin = ['AMOKSISILIN', 'AMOKSISILIN/KLAVULANAT', 'AMPISILIN',
-                         'SEFALEKSIN', 'SEFUROKSIM', 'SEFTRIAKSON', 'SEFDINIR',
-                         'SEFPODOKSIM', 'SEFIKSIM', 'AZITROMISIN', 'KLARITROMISIN',
-                         'ERITROMISIN', 'DOKSISIKLIN', 'TETRASIKLIN',
-                         'TRIMETOPRIM', 'SULFAMETOKSAZOL', 'NITROFURANTOIN',
-                         'FOSFOMISIN', 'METRONIDAZOL', 'ORNIDAZOL', 'SEKNIDAZOL',
-                         'GENTAMISIN', 'AMIKASIN', 'TOBRAMISIN',
-                         'LINEZOLID', 'DAPTOMISIN', 'TEIKOPLANIN', 'VANKOMISIN',
-                         'MEROPENEM', 'IMIPENEM', 'ERTAPENEM', 'DORIPENEM',
-                         'PIPERASILIN', 'KOLISTIN', 'TIGESIKLIN']
     antibiyotik_ilac = ['AUGMENTIN', 'AMOKLAVIN', 'KLAMOKS', 'CROXILEX',
                         'DUOCID', 'CEFZIL', 'ZINNAT', 'CEFAKS',
                         'CEFTRIAXONE', 'CEDAX', 'SUPRAX',
@@ -20381,19 +20384,16 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
                         'LINEZOLID', 'CUBICIN', 'TARGOCID', 'VANKOMISIN',
                         'MERONEM', 'TIENAM', 'INVANZ',
                         'TAZOCIN', 'KOLISTIN']
-    antibiyotik_mi = any(_turkce_ara(etkin_madde, e) for e in antibiyotik_etkin) or \
+    antibiyotik_mi = _GENEL_ANTIBIYOTIK_ETKIN.var_mi(etkin_madde) or \
                      any(i in ilac_adi for i in antibiyotik_ilac)
 
     if antibiyotik_mi:
         detaylar = {'alt_kategori': 'ANTIBIYOTIK_GENEL'}
         uyarilar = []
         # Parenteral/yatan hasta antibiyotikleri — rapor gerektirebilir
-        kst_etkin = ['LINEZOLID', 'DAPTOMISIN', 'TEIKOPLANIN', 'VANKOMISIN',
-                     'MEROPENEM', 'IMIPENEM', 'ERTAPENEM', 'DORIPENEM',
-                     'PIPERASILIN', 'KOLISTIN', 'TIGESIKLIN']
         kst_ilac = ['LINEZOLID', 'CUBICIN', 'TARGOCID', 'VANKOMISIN',
                     'MERONEM', 'TIENAM', 'INVANZ', 'TAZOCIN', 'KOLISTIN']
-        kisitli_mi = any(_turkce_ara(etkin_madde, e) for e in kst_etkin) or \
+        kisitli_mi = _GENEL_KST_ETKIN.var_mi(etkin_madde) or \
                      any(i in ilac_adi for i in kst_ilac)
 
         if kisitli_mi:
@@ -20422,11 +20422,9 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 27. Tiroid İlaçları (Raporsuz yazılabilir) ──
-    tiroid_etkin = ['LEVOTIROKSIN', 'LIYOTIRONIN', 'PROPILTIYOURASIL',
-                    'METIMAZOL', 'TIAMAZOL', 'KARBIMAZOL']
     tiroid_ilac = ['EUTHYROX', 'LEVOTIRON', 'TIROMEL', 'PROPYCIL', 'THYROZOL',
                    'UNIMAZOL']
-    tiroid_mi = any(_turkce_ara(etkin_madde, e) for e in tiroid_etkin) or \
+    tiroid_mi = _GENEL_TIROID_ETKIN.var_mi(etkin_madde) or \
                 any(i in ilac_adi for i in tiroid_ilac)
 
     if tiroid_mi:
@@ -20443,15 +20441,11 @@ def kontrol_genel_raporlu(ilac_sonuc: Dict) -> KontrolRaporu:
         )
 
     # ── 28. Demir / Vitamin / Mineral Preparatları (Raporsuz) ──
-    vitamin_etkin = ['DEMIR', 'FERRÖZ', 'DEMIR SÜLFAT', 'DEMIR FUMARAT',
-                     'KALSIYUM', 'KOLEKALSITEROL', 'ERGOKALSIFEROL',
-                     'FOLIK ASIT', 'SIYANOKOBALAMIN', 'B12',
-                     'ASKORBIK ASIT', 'TOKOFEROL', 'PIRIDOKSIN']
     vitamin_ilac = ['FERROSANOL', 'MALTOFER', 'FERRO', 'VENOFER',
                     'CALCIMAGON', 'CALTRATE', 'DEVIT',
                     'FOLBIOL', 'DODEX', 'BEMIKS',
                     'CEVIKAP', 'EVICAP']
-    vitamin_mi = any(_turkce_ara(etkin_madde, e) for e in vitamin_etkin) or \
+    vitamin_mi = _GENEL_VITAMIN_ETKIN.var_mi(etkin_madde) or \
                  any(i in ilac_adi for i in vitamin_ilac)
 
     if vitamin_mi:
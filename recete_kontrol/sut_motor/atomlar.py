@@ -17,6 +17,7 @@ from dataclasses import dataclass
 from typing import Callable, Dict, List, Optional, Tuple
 
 from recete_kontrol.base_kontrol import SartDurumu
+from recete_kontrol.normalize_metin import DesenKumesi, desen_kumesi
 from recete_kontrol.tr_normalize import norm_tr_upper
 
 
@@ -136,10 +137,11 @@ def atom_metin_regex(baglam, *, desenler: List[str],
     if not metin:
         return AtomSonuc(SartDurumu.KONTROL_EDILEMEDI,
                          f"Metin boş — {etiket or 'desen'} aranamadı")
-    for d in desenler:
-        if re.search(d, metin):
-            return AtomSonuc(SartDurumu.VAR,
-                             f"{etiket or 'Desen'} eşleşti: /{d}/")
+    # Derlenmiş desen kümesi (kural başına bir kez) — eşleşme yoksa tek tarama
+    d, _ = desen_kumesi(tuple(desenler)).ilk(metin)
+    if d is not None:
+        return AtomSonuc(SartDurumu.VAR,
+                         f"{etiket or 'Desen'} eşleşti: /{d}/")
     return AtomSonuc(SartDurumu.YOK,
                      f"{etiket or 'Desen'} bulunamadı")
 
@@ -337,6 +339,24 @@ def atom_doktor_brans_in(baglam, *, anahtarlar: List[str],
 # Python kontrol_fibrat/kontrol_statin ile aynı kanıt katmanlarını kullanır.
 # ─────────────────────────────────────────────────────────────
 
+_DM_DESENLERI = DesenKumesi([
+    r'\bdiyabet', r'\bdiabet', r'\bdm\b', r'\bt[12]dm\b',
+    r'\bniddm\b', r'\biddm\b',
+    r'tip\s*[12]\s*(?:dm|diyabet|diabet)',
+    r'şeker\s*hastal', r'seker\s*hastal'])
+_DM_OAD_DESENLERI = DesenKumesi([
+    r'\bmetformin', r'\bglukofa', r'\bdiabinor',
+    r'\bsülfanilür', r'\bsulfanilur', r'\bsülfonilür',
+    r'\bsulfonilur', r'\bglikla[zs]i', r'\bglimepir',
+    r'\bgliben(?:klamid|klamit)',
+    r'\boad\b', r'oral\s*antidiyabet', r'oral\s*antidiabet',
+    r'\binsulin\b', r'\binsülin\b',
+    r'\bdpp[- ]?4', r'glipti[nz]',
+    r'\bsglt[- ]?2',
+    r'\bakar?boz\b',
+])
+
+
 @atom("kv_dm")
 def atom_kv_dm(baglam) -> AtomSonuc:
     """Diabetes mellitus — 4 katman + DOLAYLI KANIT (HÜSEYİN SAAT 2RCDQJV).
@@ -353,30 +373,14 @@ def atom_kv_dm(baglam) -> AtomSonuc:
     if any(k in teshis for k in ['E10', 'E11', 'E12', 'E13', 'E14']):
         return AtomSonuc(SartDurumu.VAR, "ICD E10-E14 (DM)")
     metin = baglam.metin_lower
-    patterns = [r'\bdiyabet', r'\bdiabet', r'\bdm\b', r'\bt[12]dm\b',
-                r'\bniddm\b', r'\biddm\b',
-                r'tip\s*[12]\s*(?:dm|diyabet|diabet)',
-                r'şeker\s*hastal', r'seker\s*hastal']
-    for p in patterns:
-        if re.search(p, metin):
-            return AtomSonuc(SartDurumu.VAR, f"DM ibaresi (aktif): /{p}/")
+    p, _ = _DM_DESENLERI.ilk(metin)
+    if p is not None:
+        return AtomSonuc(SartDurumu.VAR, f"DM ibaresi (aktif): /{p}/")
     # DOLAYLI KANITLAR (aktif metin)
-    oad_patterns = [
-        r'\bmetformin', r'\bglukofa', r'\bdiabinor',
-        r'\bsülfanilür', r'\bsulfanilur', r'\bsülfonilür',
-        r'\bsulfonilur', r'\bglikla[zs]i', r'\bglimepir',
-        r'\bgliben(?:klamid|klamit)',
-        r'\boad\b', r'oral\s*antidiyabet', r'oral\s*antidiabet',
-        r'\binsulin\b', r'\binsülin\b',
-        r'\bdpp[- ]?4', r'glipti[nz]',
-        r'\bsglt[- ]?2',
-        r'\bakar?boz\b',
-    ]
-    for p in oad_patterns:
-        m = re.search(p, metin)
-        if m:
-            return AtomSonuc(SartDurumu.VAR,
-                             f"DM (dolaylı: {m.group(0)})")
+    _, m = _DM_OAD_DESENLERI.ilk(metin)
+    if m:
+        return AtomSonuc(SartDurumu.VAR,
+                         f"DM (dolaylı: {m.group(0)})")
     if re.search(r'glisemik\s*kontrol|kan\s*[şs]ekeri\s*kontrol', metin):
         return AtomSonuc(SartDurumu.VAR,
                          "DM (dolaylı: glisemik kontrol ibaresi)")
@@ -400,8 +404,8 @@ def atom_kv_dm(baglam) -> AtomSonuc:
     # Geçmiş metin (lafzen + dolaylı kanıtlar)
     gv2, gs2 = baglam._sk._lipid_gecmis_metin_ara(
         baglam.diger_rapor_metinleri,
-        '|'.join(patterns + oad_patterns
-                 + [r'glisemik\s*kontrol', r'kan\s*[şs]ekeri\s*kontrol']))
+        '|'.join(_DM_DESENLERI.desenler + _DM_OAD_DESENLERI.desenler
+                 + (r'glisemik\s*kontrol', r'kan\s*[şs]ekeri\s*kontrol')))
     if gv2:
         return AtomSonuc(SartDurumu.VAR, f"DM ({gs2})")
     return AtomSonuc(SartDurumu.YOK,
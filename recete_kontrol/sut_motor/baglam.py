@@ -7,6 +7,8 @@ parse etmemek için cache'ler.
 """
 from typing import Dict, List, Optional
 
+from recete_kontrol.normalize_metin import NormalizeMetin, normalize_metin
+
 
 class Baglam:
     """Bir reçete kalemi için motor değerlendirme bağlamı.
@@ -53,8 +55,10 @@ class Baglam:
 
         self.tum_metin: str = _sk._tum_metinleri_birlesir(self.ham) or ''
         self.birlesik_metin: str = (self.tum_metin + ' ' + self.teshis_metin).strip()
-        self.metin_lower: str = (_sk._tr_lower(self.birlesik_metin)
-                                 if self.birlesik_metin else '')
+        # Normalize varyantları (tr / fonetik + konum haritası) satır başına
+        # bir kez — aynı metni gören kural fonksiyonlarıyla paylaşılır.
+        self.metin: NormalizeMetin = normalize_metin(self.birlesik_metin)
+        self.metin_lower: str = self.metin.tr
 
         # Geçmiş rapor verileri (FERİDE EGE 3KTNEKA — 2026-05-16):
         # GUI önceki raporları toplar; statin/fibrat kalıbı: KV risk faktörleri
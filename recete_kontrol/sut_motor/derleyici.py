@@ -0,0 +1,353 @@
+# -*- coding: utf-8 -*-
+"""SUT Motor v2 — kural derleyici (bir kez parse et, çok kez değerlendir).
+
+degerlendir_v2(kural, ilac_sonuc) her çağrıda şemayı yeniden doğrular,
+formülleri yeniden parse eder ve regex desenlerini ham string olarak
+re.search'e verir. Aylık toplu kontrolde aynı kural binlerce satıra
+uygulandığı için bu iş her satırda tekrarlanıyordu.
+
+KuralDerleyici bir v2 JSON'unu değişmez bir DerlenmisKural'a çevirir:
+    - şema doğrulaması bir kez (hata varsa DerlenmisKural.hata'da saklanır,
+      değerlendirme degerlendir_v2 ile aynı KE raporunu döndürür)
+    - yolak / on_kontrol formül ağaçları önceden parse edilmiş
+    - regex / regex_negatif / lab_olcum / dispatcher regex_metin desenleri
+      önceden derlenmiş; regex atomlarında tüm desenler ayrıca TEK
+      alternation'da birleştirilir (eşleşmeyen metin tek geçişte elenir)
+    - dosyadan yüklemede (mtime, boyut) duyarlı önbellek
+
+Sonuçlar degerlendir_v2 ile birebir aynıdır (verdict, şart listesi,
+nedenler dahil) — yalnızca hazırlık işi çağrı dışına taşınır.
+
+Kullanım:
+    derleyici = KuralDerleyici()
+    dk = derleyici.yukle('sut_kurallari/v2/akut_hepatit_b_4_2_13_3.json')
+    for satir in satirlar:
+        rapor = degerlendir_derlenmis(dk, satir)
+"""
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import os
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from recete_kontrol.base_kontrol import KontrolRaporu, KontrolSonucu, SartDurumu
+from .atomlar import AtomSonuc
+from .baglam import Baglam
+from .formul_parser import ParserHatasi, kullanilan_atomlar, parse_formul
+from .motor_v2 import (
+    _INLINE_TIPLER, _atom_calistir_v2, _atom_lab_olcum, _atom_regex,
+    _atom_regex_negatif, _belirsiz_yolak_raporu, _detaylar,
+    _dispatcher_calistir, _dispatcher_sinyalleri, _formul_calistir,
+    _ilac_sonuc_normalize, _lab_desenleri, _on_kontrol_raporu,
+    _atom_maliyeti, _sessizlik_uygula, _tembel_plan, _v2_dogrula,
+    _verdict_raporu, _yolak_agaci, _yolak_degerlendir,
+)
+
+logger = logging.getLogger(__name__)
+
+AtomCalistirici = Callable[[Baglam], AtomSonuc]
+
+# Birleştirmede numara kayması anlamı bozar: geri-referans / koşullu grup
+_BIRLESTIRILEMEZ_RE = re.compile(r'\\[1-9]|\(\?\(|\(\?P=')
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# Derlenmiş yapılar
+# ─────────────────────────────────────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class DerlenmisYolak:
+    """Tek yolak: atom tanımları + hazır çalıştırıcılar + formül ağacı."""
+    atomlar: Dict[str, Dict]
+    calistiricilar: Dict[str, AtomCalistirici]
+    agac: Optional[Dict]
+    hata: Optional[str] = None       # formül parse hatası (ValueError metni)
+    tanim: Optional[Dict] = None     # yolaklar[ad] (tek yolakta None)
+    prefix: str = ''
+    plan: Optional[Dict] = None      # tembel mod: maliyete göre sıralı ağaç
+
+
+@dataclass(frozen=True)
+class DerlenmisOnKontrol:
+    ek: Dict
+    agac: Optional[Dict]
+    calistiricilar: Dict[str, AtomCalistirici]
+    hata: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class DerlenmisKural:
+    """Değişmez derlenmiş v2 kuralı (KuralDerleyici.derle çıktısı).
+
+    `kural` derleme anındaki JSON'un kopyasıdır — çağıranın sözlüğü sonradan
+    değişse de derlenmiş nesne etkilenmez. Salt-okunur kullanın.
+    """
+    kural: Dict
+    hata: Optional[str] = None       # şema hatası → her değerlendirmede KE
+    on_kontrol: Tuple[DerlenmisOnKontrol, ...] = ()
+    dispatcher: Optional[Dict] = None
+    sinyaller: Tuple[Dict, ...] = ()
+    dispatcher_regexler: Dict[str, "re.Pattern"] = field(default_factory=dict)
+    yolaklar: Dict[str, DerlenmisYolak] = field(default_factory=dict)
+    tek_yolak: Optional[DerlenmisYolak] = None
+
+    @property
+    def sut_etiketi(self) -> str:
+        return self.kural.get('sut_kurali_etiketi') or self.kural.get('adi') or ''
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# Atom derleme
+# ─────────────────────────────────────────────────────────────────────────
+
+
+def _desenleri_derle(desenler: List[str]) -> Tuple[Optional["re.Pattern"],
+                                                    List["re.Pattern"]]:
+    """(birleşik alternation | None, [tekil derlenmiş]) — bkz. motor_v2._ilk_eslesen."""
+    tekiller = [re.compile(d, re.IGNORECASE) for d in desenler]
+    birlesik = None
+    if len(desenler) > 1 and not any(_BIRLESTIRILEMEZ_RE.search(d) for d in desenler):
+        try:
+            birlesik = re.compile('|'.join(f'(?:{d})' for d in desenler), re.IGNORECASE)
+        except re.error:
+            # Ortada global bayrak ((?i)...), çakışan grup adı vb. — tekil yeterli
+            birlesik = None
+    return birlesik, tekiller
+
+
+def _atom_derle(tanim: Dict) -> AtomCalistirici:
+    """Atom tanımını baglam → AtomSonuc çalıştırıcısına çevir.
+
+    Regex/lab tipleri önceden derlenmiş desenlerle; diğer tipler
+    _atom_calistir_v2 ile (aynı sözleşme) çalışır.
+
+    Raises:
+        ValueError: Bilinmeyen tip / geçersiz regex deseni.
+    """
+    tip = tanim.get('tip')
+    if tip not in _INLINE_TIPLER:
+        raise ValueError(f"Bilinmeyen atom tipi: {tip!r}. "
+                         f"Geçerli tipler: {sorted(_INLINE_TIPLER)}")
+    params = tanim.get('params', {}) or {}
+    kaynak_alani = tanim.get('kaynak', '')
+    try:
+        if tip in ('regex', 'metin_regex'):
+            derli: Any = _desenleri_derle(params.get('desenler', []) or [])
+            fn = _atom_regex
+        elif tip == 'regex_negatif':
+            derli = (_desenleri_derle(params.get('poz_desenler', []) or []),
+                     _desenleri_derle(params.get('neg_desenler', []) or []))
+            fn = _atom_regex_negatif
+        elif tip == 'lab_olcum':
+            derli = _lab_desenleri(params)
+            fn = _atom_lab_olcum
+        else:
+            return lambda baglam: _atom_calistir_v2(tanim, baglam)
+    except re.error as e:
+        raise ValueError(f"Geçersiz regex deseni ({tip}): {e}")
+
+    def _calistir(baglam: Baglam) -> AtomSonuc:
+        return _sessizlik_uygula(
+            tanim, fn(baglam, params, kaynak_alani=kaynak_alani, derlenmis=derli))
+    return _calistir
+
+
+def _yolak_derle(atomlar: Dict, formul_str: str, tanim: Optional[Dict] = None,
+                 prefix: str = '') -> DerlenmisYolak:
+    calistiricilar = {ad: _atom_derle(t) for ad, t in atomlar.items()}
+    try:
+        agac, hata = _yolak_agaci(atomlar, formul_str), None
+    except ValueError as e:
+        agac, hata = None, str(e)
+    plan = None
+    if agac is not None:
+        plan = _tembel_plan(agac, {ad: _atom_maliyeti(t) for ad, t in atomlar.items()})
+    return DerlenmisYolak(atomlar=atomlar, calistiricilar=calistiricilar,
+                          agac=agac, hata=hata, tanim=tanim, prefix=prefix,
+                          plan=plan)
+
+
+def _on_kontrol_derle(kural: Dict) -> Tuple[DerlenmisOnKontrol, ...]:
+    atomlar_global = kural.get('atomlar', {}) or {}
+    sonuc = []
+    for ek in kural.get('on_kontrol', []) or []:
+        if not ek.get('kosul'):
+            continue
+        yerel_atomlar = {**atomlar_global, **(ek.get('atomlar_ek') or {})}
+        try:
+            agac = parse_formul(ek['kosul'])
+            calistiricilar = {}
+            for ad in kullanilan_atomlar(agac):
+                if ad not in yerel_atomlar:
+                    raise ValueError(f"on_kontrol kosul'da tanımsız atom: {ad}")
+                calistiricilar[ad] = _atom_derle(yerel_atomlar[ad])
+        except (ValueError, ParserHatasi) as e:
+            # degerlendir_v2 gibi: bu girdi atlanır (her değerlendirmede uyarı)
+            sonuc.append(DerlenmisOnKontrol(ek=ek, agac=None, calistiricilar={},
+                                            hata=str(e)))
+            continue
+        sonuc.append(DerlenmisOnKontrol(ek=ek, agac=agac, calistiricilar=calistiricilar))
+    return tuple(sonuc)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# Derleyici + önbellek
+# ─────────────────────────────────────────────────────────────────────────
+
+
+class KuralDerleyici:
+    """v2 kural JSON'u → DerlenmisKural; dosya yüklemeleri mtime önbellekli.
+
+    Thread-safe: önbellek kilit altında; DerlenmisKural değişmez olduğundan
+    aynı nesne birden çok thread'de paylaşılabilir.
+    """
+
+    def __init__(self):
+        self._onbellek: Dict[str, Tuple[Tuple[int, int], DerlenmisKural]] = {}
+        self._kilit = threading.Lock()
+
+    @staticmethod
+    def derle(kural: Dict) -> DerlenmisKural:
+        """Kural sözlüğünü derle. Şema hatası exception değil, `hata` alanıdır
+        (degerlendir_v2 de şema hatasında KE raporu döndürür)."""
+        kural = copy.deepcopy(kural)
+        try:
+            _v2_dogrula(kural)
+            on_kontrol = _on_kontrol_derle(kural)
+            yolaklar_def = kural.get('yolaklar')
+            if yolaklar_def:
+                disp = kural.get('dispatcher', {}) or {}
+                sinyaller = tuple(_dispatcher_sinyalleri(disp))
+                regexler = {}
+                for s in sinyaller:
+                    if s.get('tip') == 'regex_metin':
+                        for desen in (s.get('kurallar') or {}):
+                            regexler[desen] = re.compile(desen, re.IGNORECASE)
+                yolaklar = {
+                    ad: _yolak_derle(y.get('atomlar', {}), y.get('formul', ''),
+                                     tanim=y, prefix=f'{ad}:')
+                    for ad, y in yolaklar_def.items()}
+                return DerlenmisKural(kural=kural, on_kontrol=on_kontrol,
+                                      dispatcher=disp, sinyaller=sinyaller,
+                                      dispatcher_regexler=regexler,
+                                      yolaklar=yolaklar)
+            tek = _yolak_derle(kural.get('atomlar', {}), kural.get('formul', ''))
+            return DerlenmisKural(kural=kural, on_kontrol=on_kontrol, tek_yolak=tek)
+        except (ValueError, re.error) as e:
+            return DerlenmisKural(kural=kural, hata=str(e))
+
+    def yukle(self, yol: str) -> DerlenmisKural:
+        """JSON dosyasını derleyerek yükle; dosya değişmediyse önbellekten.
+
+        Raises:
+            OSError / json.JSONDecodeError: dosya okunamazsa.
+        """
+        anahtar = os.path.abspath(yol)
+        st = os.stat(anahtar)
+        imza = (st.st_mtime_ns, st.st_size)
+        with self._kilit:
+            kayit = self._onbellek.get(anahtar)
+            if kayit is not None and kayit[0] == imza:
+                return kayit[1]
+        with open(anahtar, 'r', encoding='utf-8') as f:
+            derlenmis = self.derle(json.load(f))
+        if derlenmis.hata:
+            logger.warning("v2 kural derlenemedi (%s): %s", yol, derlenmis.hata)
+        with self._kilit:
+            self._onbellek[anahtar] = (imza, derlenmis)
+        return derlenmis
+
+    def temizle(self) -> None:
+        with self._kilit:
+            self._onbellek.clear()
+
+
+_varsayilan_derleyici = KuralDerleyici()
+
+
+def derlenmis_kural_yukle(yol: str) -> DerlenmisKural:
+    """Modül düzeyi paylaşılan önbellekle yükle."""
+    return _varsayilan_derleyici.yukle(yol)
+
+
+# ─────────────────────────────────────────────────────────────────────────
+# Değerlendirme
+# ─────────────────────────────────────────────────────────────────────────
+
+
+def _on_kontrol_calistir_derlenmis(dk: DerlenmisKural,
+                                   baglam: Baglam) -> Optional[KontrolRaporu]:
+    for ok in dk.on_kontrol:
+        if ok.hata is not None:
+            logger.warning("on_kontrol değerlendirme hatası: %s", ok.hata)
+            continue
+        try:
+            atom_sonuclari = {}
+            for ad, calistir in ok.calistiricilar.items():
+                a_sonuc = calistir(baglam)
+                atom_sonuclari[ad] = (a_sonuc.durum, a_sonuc.neden)
+            durum = _formul_calistir(ok.agac, atom_sonuclari)
+        except (ValueError, ParserHatasi) as e:
+            logger.warning("on_kontrol değerlendirme hatası: %s", e)
+            continue
+        if durum == SartDurumu.VAR:
+            return _on_kontrol_raporu(dk.kural, ok.ek)
+    return None
+
+
+def degerlendir_derlenmis(dk: DerlenmisKural, ilac_sonuc: Dict,
+                          tembel: bool = False) -> KontrolRaporu:
+    """Derlenmiş v2 kuralını reçete satırına uygula (degerlendir_v2 eşdeğeri).
+
+    tembel: True → kısa devreli atom değerlendirme (verdict aynı; atlanan
+        atomlar şart listesinde NA). GUI denetim izi için False bırakın.
+    """
+    kural = dk.kural
+    ilac_sonuc = _ilac_sonuc_normalize(ilac_sonuc)
+    baglam = Baglam(ilac_sonuc)
+    detaylar = _detaylar(kural, baglam)
+
+    if dk.hata is not None:
+        return KontrolRaporu(
+            sonuc=KontrolSonucu.KONTROL_EDILEMEDI,
+            mesaj=f"v2 kural şeması hatalı: {dk.hata}",
+            sut_kurali=dk.sut_etiketi, detaylar=detaylar)
+
+    erken = _on_kontrol_calistir_derlenmis(dk, baglam)
+    if erken is not None:
+        return erken
+
+    if dk.yolaklar:
+        secilen, neden = _dispatcher_calistir(
+            dk.dispatcher, baglam, sinyaller=dk.sinyaller,
+            regexler=dk.dispatcher_regexler)
+        detaylar['dispatcher_neden'] = neden
+        if secilen is None or secilen not in dk.yolaklar:
+            return _belirsiz_yolak_raporu(kural, dk.dispatcher, detaylar)
+        yolak = dk.yolaklar[secilen]
+        detaylar['aktif_yolak'] = secilen
+        detaylar['alt_dal'] = yolak.tanim.get('ad', secilen)
+    else:
+        yolak = dk.tek_yolak
+
+    try:
+        if yolak.hata is not None:
+            raise ValueError(yolak.hata)
+        kok_durum, sartlar, sartli_atomlar = _yolak_degerlendir(
+            yolak.atomlar, '', baglam, yolak_prefix=yolak.prefix,
+            agac=yolak.agac, calistiricilar=yolak.calistiricilar,
+            tembel=tembel, plan=yolak.plan)
+    except ValueError as e:
+        return KontrolRaporu(
+            sonuc=KontrolSonucu.KONTROL_EDILEMEDI,
+            mesaj=f"Değerlendirme hatası: {e}",
+            sut_kurali=dk.sut_etiketi, detaylar=detaylar)
+
+    return _verdict_raporu(kural, yolak.tanim, kok_durum, sartlar,
+                           sartli_atomlar, detaylar)
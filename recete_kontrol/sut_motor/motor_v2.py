@@ -80,12 +80,62 @@ _TIP_DEFAULT_SESSIZLIK = {
 }
 
 
+# Tip → göreli maliyet ipucu (tembel değerlendirmede ucuz atom önce denenir).
+# Atom tanımında 'maliyet' alanı bu değeri ezer.
+_TIP_MALIYET = {
+    'her_zaman_var': 0,
+    'rapor_kodu_var': 1,
+    'rapor_metni_var': 1,
+    'rapor_kodu_in': 1,
+    'yas_op': 1,
+    'manuel_kontrol': 1,
+    'icd_in': 2,
+    'doktor_brans': 2,
+    'etken_iceriyor': 2,
+    'kombi_iceriyor': 3,
+    'regex': 5,
+    'metin_regex': 5,
+    'regex_negatif': 6,
+    'lab_olcum': 8,
+    'lab_var': 8,
+    'custom_python': 10,
+}
+_VARSAYILAN_MALIYET = 5
+
+# Kısa devre ile hiç çalıştırılmayan atomun şart listesindeki nedeni
+KISA_DEVRE_NEDENI = 'Kısa devre — formül sonucu bu atomdan önce belirlendi'
+
+
 # ─────────────────────────────────────────────────────────────────────────
 # Inline atom çalıştırıcıları
 # ─────────────────────────────────────────────────────────────────────────
 
 
-def _atom_regex(baglam: Baglam, params: Dict, kaynak_alani: str = '') -> AtomSonuc:
+def _ilk_eslesen(desenler: List[str], metin: str,
+                 derlenmis: Optional[Tuple] = None) -> Optional[str]:
+    """Listede metinde eşleşen İLK deseni döndür (yoksa None).
+
+    derlenmis: (birlesik_regex | None, [derlenmiş desenler]) — kural
+    derleyicinin önceden hazırladığı hali. Birleşik alternation yalnızca
+    hızlı ret içindir; eşleşme varsa raporlanan desen yine liste sırasıyla
+    bulunur (mesajlar derlenmemiş yolla birebir aynı kalır).
+    """
+    if derlenmis is None:
+        for d in desenler:
+            if re.search(d, metin, re.IGNORECASE):
+                return d
+        return None
+    birlesik, tekiller = derlenmis
+    if birlesik is not None and not birlesik.search(metin):
+        return None
+    for d, r in zip(desenler, tekiller):
+        if r.search(metin):
+            return d
+    return None
+
+
+def _atom_regex(baglam: Baglam, params: Dict, kaynak_alani: str = '',
+                derlenmis: Optional[Tuple] = None) -> AtomSonuc:
     """Verilen regex desenlerinden ≥1 metinde eşleşiyor mu? VAR/YOK/KE."""
     desenler = params.get('desenler', []) or []
     etiket = params.get('etiket', 'desen')
@@ -93,17 +143,21 @@ def _atom_regex(baglam: Baglam, params: Dict, kaynak_alani: str = '') -> AtomSon
     if not metin:
         return AtomSonuc(SartDurumu.KONTROL_EDILEMEDI,
                          f"Metin boş — {etiket} aranamadı")
-    for d in desenler:
-        if re.search(d, metin, re.IGNORECASE):
-            return AtomSonuc(SartDurumu.VAR,
-                             f"{etiket} eşleşti: /{d}/")
+    d = _ilk_eslesen(desenler, metin, derlenmis)
+    if d is not None:
+        return AtomSonuc(SartDurumu.VAR,
+                         f"{etiket} eşleşti: /{d}/")
     return AtomSonuc(SartDurumu.YOK, f"{etiket} bulunamadı")
 
 
 def _atom_regex_negatif(baglam: Baglam, params: Dict,
-                         kaynak_alani: str = '') -> AtomSonuc:
+                         kaynak_alani: str = '',
+                         derlenmis: Optional[Tuple] = None) -> AtomSonuc:
     """Üç-yönlü parser: pozitif desen varsa YOK, negatif desen varsa VAR,
-    ikisi de yoksa KE (sessizlik → örtük kabul yasak)."""
+    ikisi de yoksa KE (sessizlik → örtük kabul yasak).
+
+    derlenmis: (poz_derlenmis, neg_derlenmis) — bkz. _ilk_eslesen.
+    """
     poz = params.get('poz_desenler', []) or []
     neg = params.get('neg_desenler', []) or []
     etiket = params.get('etiket', 'sart')
@@ -111,14 +165,15 @@ def _atom_regex_negatif(baglam: Baglam, params: Dict,
     if not metin:
         return AtomSonuc(SartDurumu.KONTROL_EDILEMEDI,
                          f"Metin boş — {etiket} aranamadı (manuel)")
-    for d in poz:
-        if re.search(d, metin, re.IGNORECASE):
-            return AtomSonuc(SartDurumu.YOK,
-                             f"{etiket} POZ ibare: /{d}/ (kontrendikasyon)")
-    for d in neg:
-        if re.search(d, metin, re.IGNORECASE):
-            return AtomSonuc(SartDurumu.VAR,
-                             f"{etiket} NEG ibare: /{d}/")
+    poz_d, neg_d = derlenmis if derlenmis is not None else (None, None)
+    d = _ilk_eslesen(poz, metin, poz_d)
+    if d is not None:
+        return AtomSonuc(SartDurumu.YOK,
+                         f"{etiket} POZ ibare: /{d}/ (kontrendikasyon)")
+    d = _ilk_eslesen(neg, metin, neg_d)
+    if d is not None:
+        return AtomSonuc(SartDurumu.VAR,
+                         f"{etiket} NEG ibare: /{d}/")
     return AtomSonuc(SartDurumu.KONTROL_EDILEMEDI,
                      f"{etiket} hiç bahsedilmemiş — manuel doğrulama")
 
@@ -167,8 +222,34 @@ def _atom_rapor_metni_var(baglam: Baglam, params: Dict, **_) -> AtomSonuc:
     return AtomSonuc(SartDurumu.VAR, "Metin mevcut")
 
 
+_LAB_EKLEME_RE = re.compile(
+    r'\(?\s*ekleme\s*[=:]\s*\d{1,2}[./\-]\d{1,2}[./\-]\d{2,4}'
+    r'(?:\s+\d{1,2}:\d{2}(?::\d{2})?)?\)?', re.IGNORECASE)
+_LAB_TARIH_SONU_RE = re.compile(r'[./\-]\d{1,2}[./\-]\d')
+
+
+def _lab_desenleri(params: Dict) -> List["re.Pattern"]:
+    """lab_olcum ibare + alternatifleri için değer yakalama regex'leri."""
+    ibare = params.get('ibare', '')
+    alternatif = params.get('alternatif_ibareler', []) or []
+    desenler = []
+    for k in [ibare] + list(alternatif):
+        kk = k.lower().replace('İ', 'i').replace('I', 'i').replace('ı', 'i')
+        # Pattern: ibare + opsiyonel araya 0-20 karakter + sayı (tam ya da ondalık)
+        # word-boundary ibare için (kısa kısaltma 'inr' 'tg' vs.)
+        if len(kk) <= 4:
+            pattern = (rf'\b{re.escape(kk)}\b\.?\s*[:=]?\s*'
+                       rf'(\d{{1,4}}(?:[.,]\d+)?)')
+        else:
+            pattern = (rf'{re.escape(kk)}[a-z]*[^0-9]{{0,20}}'
+                       rf'(\d{{1,4}}(?:[.,]\d+)?)')
+        desenler.append(re.compile(pattern))
+    return desenler
+
+
 def _atom_lab_olcum(baglam: Baglam, params: Dict,
-                    kaynak_alani: str = '') -> AtomSonuc:
+                    kaynak_alani: str = '',
+                    derlenmis: Optional[List] = None) -> AtomSonuc:
     """Lab sayısal değer + karşılaştırma. Ondalık (INR=2.1) ve tamsayı
     (TG=500) ikisini de destekler.
 
@@ -178,9 +259,9 @@ def _atom_lab_olcum(baglam: Baglam, params: Dict,
       op: '>'|'>='|'<'|'<='|'='
       deger: float eşik
       min_hane: minimum hane (default 1; lab parser için)
+    derlenmis: _lab_desenleri(params) çıktısı (kural derleyiciden)
     """
     ibare = params.get('ibare', '')
-    alternatif = params.get('alternatif_ibareler', []) or []
     op = params.get('op', '>=')
     deger = float(params.get('deger', 0))
     if not ibare:
@@ -196,30 +277,16 @@ def _atom_lab_olcum(baglam: Baglam, params: Dict,
     # Türkçe normalize (İ→i, ı→i)
     metin_sade = metin.replace('İ', 'i').replace('I', 'i').replace('ı', 'i').lower()
     # Tarih bloklarını sil (DD/MM/YYYY HH:MM tarih bileşeni sayı sanılmasın)
-    metin_sade = re.sub(
-        r'\(?\s*ekleme\s*[=:]\s*\d{1,2}[./\-]\d{1,2}[./\-]\d{2,4}'
-        r'(?:\s+\d{1,2}:\d{2}(?::\d{2})?)?\)?',
-        ' ', metin_sade, flags=re.IGNORECASE,
-    )
+    metin_sade = _LAB_EKLEME_RE.sub(' ', metin_sade)
 
     bulunan_degerler: List[float] = []
-    anahtarlar = [ibare] + list(alternatif)
-    for k in anahtarlar:
-        kk = k.lower().replace('İ', 'i').replace('I', 'i').replace('ı', 'i')
-        # Pattern: ibare + opsiyonel araya 0-20 karakter + sayı (tam ya da ondalık)
-        # word-boundary ibare için (kısa kısaltma 'inr' 'tg' vs.)
-        if len(kk) <= 4:
-            pattern = (rf'\b{re.escape(kk)}\b\.?\s*[:=]?\s*'
-                       rf'(\d{{1,4}}(?:[.,]\d+)?)')
-        else:
-            pattern = (rf'{re.escape(kk)}[a-z]*[^0-9]{{0,20}}'
-                       rf'(\d{{1,4}}(?:[.,]\d+)?)')
-        for m in re.finditer(pattern, metin_sade):
+    for pattern in (derlenmis if derlenmis is not None else _lab_desenleri(params)):
+        for m in pattern.finditer(metin_sade):
             captured = m.group(1).replace(',', '.')
             # Tarih bileşeni reddi (01/11/2023 → "01" yakalanmasın)
             son_idx = m.start(1) + len(m.group(1))
             sonrasi = metin_sade[son_idx:son_idx + 8]
-            if re.match(r'[./\-]\d{1,2}[./\-]\d', sonrasi):
+            if _LAB_TARIH_SONU_RE.match(sonrasi):
                 continue
             try:
                 bulunan_degerler.append(float(captured))
@@ -396,9 +463,13 @@ def _atom_calistir_v2(atom_def: Dict, baglam: Baglam) -> AtomSonuc:
     except TypeError:
         # Bazı çağrı yolları kaynak_alani parametresini almaz
         sonuc = fn(baglam, params)
+    return _sessizlik_uygula(atom_def, sonuc)
 
-    # Sessizlik default: motor KE döndü ama JSON daha spesifik default verdiyse
-    # uygula (örn. NEGATİF atomda sessiz → KE; POZİTİF atomda sessiz → YOK)
+
+def _sessizlik_uygula(atom_def: Dict, sonuc: AtomSonuc) -> AtomSonuc:
+    """Sessizlik default: motor KE döndü ama JSON daha spesifik default
+    verdiyse uygula (örn. NEGATİF atomda sessiz → KE; POZİTİF atomda
+    sessiz → YOK)."""
     if sonuc.durum == SartDurumu.KONTROL_EDILEMEDI:
         sd = atom_def.get('sessizlik_default', '').upper()
         if sd and sd in _DURUM_HARITA:
@@ -468,6 +539,63 @@ def _formul_calistir(agac: Dict, atom_sonuclari: Dict[str, Tuple[SartDurumu, str
     raise ValueError(f"Bilinmeyen formül tipi: {tip!r}")
 
 
+def _atom_maliyeti(tanim: Dict) -> float:
+    maliyet = tanim.get('maliyet')
+    if isinstance(maliyet, (int, float)):
+        return float(maliyet)
+    return float(_TIP_MALIYET.get(tanim.get('tip'), _VARSAYILAN_MALIYET))
+
+
+def _tembel_plan(agac: Dict, maliyetler: Dict[str, float]) -> Dict:
+    """Formül ağacının, AND/OR çocukları tahmini maliyete göre (ucuzdan
+    pahalıya) sıralanmış kopyası. Üç değerli AND/OR sıradan bağımsız
+    olduğundan sonuç değişmez; yalnızca kısa devre erkene çekilir."""
+    if 'atom_ref' in agac:
+        return agac
+    altlar = [_tembel_plan(a, maliyetler) for a in agac.get('alt', [])]
+    if agac.get('tip') in ('AND', 'OR'):
+        altlar.sort(key=lambda a: _agac_maliyeti(a, maliyetler))
+    return {**agac, 'alt': altlar}
+
+
+def _agac_maliyeti(agac: Dict, maliyetler: Dict[str, float]) -> float:
+    if 'atom_ref' in agac:
+        return maliyetler.get(agac['atom_ref'], _VARSAYILAN_MALIYET)
+    return sum(_agac_maliyeti(a, maliyetler) for a in agac.get('alt', []))
+
+
+def _formul_tembel(agac: Dict, getir: Callable[[str], SartDurumu]) -> SartDurumu:
+    """Formülü atom sonuçlarını İHTİYAÇ OLDUKÇA çekerek hesapla.
+
+    Üç değerli kısa devre: AND ilk YOK'ta, OR ilk VAR'da durur; KE görülmüş
+    olsa bile devam edilir (sonra gelen YOK/VAR KE'yi ezer). Sonuç
+    _formul_calistir ile aynıdır (_and_birlestir/_or_birlestir semantiği).
+    """
+    if 'atom_ref' in agac:
+        return _negatif_uygula(getir(agac['atom_ref']), bool(agac.get('negatif')))
+    tip = agac.get('tip')
+    altlar = agac.get('alt', [])
+    if tip == 'NOT':
+        if not altlar:
+            return SartDurumu.NA
+        return _negatif_uygula(_formul_tembel(altlar[0], getir), True)
+    if tip not in ('AND', 'OR'):
+        raise ValueError(f"Bilinmeyen formül tipi: {tip!r}")
+    if not altlar:
+        return SartDurumu.NA
+    kesen = SartDurumu.YOK if tip == 'AND' else SartDurumu.VAR
+    ke_var = False
+    for alt in altlar:
+        durum = _formul_tembel(alt, getir)
+        if durum == kesen:
+            return kesen
+        if durum == SartDurumu.KONTROL_EDILEMEDI:
+            ke_var = True
+    if ke_var:
+        return SartDurumu.KONTROL_EDILEMEDI
+    return SartDurumu.VAR if tip == 'AND' else SartDurumu.YOK
+
+
 # ─────────────────────────────────────────────────────────────────────────
 # JSON v2 doğrulama
 # ─────────────────────────────────────────────────────────────────────────
@@ -536,10 +664,23 @@ def _v2_dogrula(kural: Dict) -> None:
 # ─────────────────────────────────────────────────────────────────────────
 
 
-def _dispatcher_calistir(disp: Dict, baglam: Baglam) -> Tuple[Optional[str], str]:
-    """Yolak seç. Dönen: (yolak_adi, dispatcher_nedeni)."""
-    for sinyal in sorted(disp.get('sinyaller', []),
-                          key=lambda s: s.get('oncelik', 99)):
+def _dispatcher_sinyalleri(disp: Dict) -> List[Dict]:
+    """Sinyaller öncelik sırasıyla (eşit öncelikte JSON sırası korunur)."""
+    return sorted(disp.get('sinyaller', []), key=lambda s: s.get('oncelik', 99))
+
+
+def _dispatcher_calistir(disp: Dict, baglam: Baglam,
+                         sinyaller: Optional[List[Dict]] = None,
+                         regexler: Optional[Dict[str, "re.Pattern"]] = None
+                         ) -> Tuple[Optional[str], str]:
+    """Yolak seç. Dönen: (yolak_adi, dispatcher_nedeni).
+
+    sinyaller / regexler: kural derleyicinin önceden sıraladığı sinyaller
+    ve derlediği regex_metin desenleri (verilmezse her çağrıda hazırlanır).
+    """
+    if sinyaller is None:
+        sinyaller = _dispatcher_sinyalleri(disp)
+    for sinyal in sinyaller:
         tip = sinyal.get('tip')
         kurallar = sinyal.get('kurallar', {}) or {}
         if tip == 'rapor_kodu_prefix':
@@ -559,7 +700,9 @@ def _dispatcher_calistir(disp: Dict, baglam: Baglam) -> Tuple[Optional[str], str
         elif tip == 'regex_metin':
             metin = (baglam.tum_metin or '').lower()
             for desen, yolak in kurallar.items():
-                if re.search(desen, metin, re.IGNORECASE):
+                r = regexler.get(desen) if regexler else None
+                if (r.search(metin) if r is not None
+                        else re.search(desen, metin, re.IGNORECASE)):
                     return yolak, f"metin /{desen}/ → {yolak}"
         elif tip == 'etken_iceriyor':
             aday = (baglam.etkin_madde + ' ' + baglam.ilac_adi).upper()
@@ -576,7 +719,6 @@ def _dispatcher_calistir(disp: Dict, baglam: Baglam) -> Tuple[Optional[str], str
 
 def _on_kontrol_calistir(kural: Dict, baglam: Baglam) -> Optional[KontrolRaporu]:
     """on_kontrol kurallarını sırayla dener; ilk eşleşeni döner."""
-    sut_etiketi = kural.get('sut_kurali_etiketi') or kural.get('adi') or ''
     atomlar_global = kural.get('atomlar', {}) or {}
     for ek in kural.get('on_kontrol', []) or []:
         kosul_str = ek.get('kosul')
@@ -599,73 +741,152 @@ def _on_kontrol_calistir(kural: Dict, baglam: Baglam) -> Optional[KontrolRaporu]
             continue
         if durum != SartDurumu.VAR:
             continue
-        # Eşleşti
-        sartlar = []
-        for s_dict in ek.get('sartlar_ekle', []) or []:
-            sartlar.append(SartSonuc(
-                ad=s_dict.get('ad', ''),
-                durum=_DURUM_HARITA.get(s_dict.get('durum', 'KE').upper(),
-                                         SartDurumu.KONTROL_EDILEMEDI),
-                neden=s_dict.get('neden', ''),
-                kaynak=s_dict.get('kaynak', ''),
-                grup=s_dict.get('grup', '')))
-        return KontrolRaporu(
-            sonuc=_SONUC_HARITA.get(
-                ek.get('sonuc', 'KONTROL_EDILEMEDI').upper(),
-                KontrolSonucu.KONTROL_EDILEMEDI),
-            mesaj=ek.get('mesaj', ''),
-            sut_kurali=sut_etiketi,
-            detaylar={'erken_cikis': ek.get('ad', ''),
-                      'sut_kodu': kural.get('sut_kodu', '')},
-            sartlar=sartlar,
-            aranan_ibare=ek.get('aranan_ibare'))
+        return _on_kontrol_raporu(kural, ek)
     return None
 
 
+def _on_kontrol_raporu(kural: Dict, ek: Dict) -> KontrolRaporu:
+    """Eşleşen on_kontrol girdisinden erken-çıkış raporunu üret."""
+    sut_etiketi = kural.get('sut_kurali_etiketi') or kural.get('adi') or ''
+    sartlar = []
+    for s_dict in ek.get('sartlar_ekle', []) or []:
+        sartlar.append(SartSonuc(
+            ad=s_dict.get('ad', ''),
+            durum=_DURUM_HARITA.get(s_dict.get('durum', 'KE').upper(),
+                                     SartDurumu.KONTROL_EDILEMEDI),
+            neden=s_dict.get('neden', ''),
+            kaynak=s_dict.get('kaynak', ''),
+            grup=s_dict.get('grup', '')))
+    return KontrolRaporu(
+        sonuc=_SONUC_HARITA.get(
+            ek.get('sonuc', 'KONTROL_EDILEMEDI').upper(),
+            KontrolSonucu.KONTROL_EDILEMEDI),
+        mesaj=ek.get('mesaj', ''),
+        sut_kurali=sut_etiketi,
+        detaylar={'erken_cikis': ek.get('ad', ''),
+                  'sut_kodu': kural.get('sut_kodu', '')},
+        sartlar=sartlar,
+        aranan_ibare=ek.get('aranan_ibare'))
+
+
 # ─────────────────────────────────────────────────────────────────────────
 # Tek yolak değerlendirme (atomlar + formül → SartSonuc listesi + kök durum)
 # ─────────────────────────────────────────────────────────────────────────
 
 
+def _sartli_mi(tanim: Dict) -> bool:
+    return bool(tanim.get('sartli_atom', False) or tanim.get('bilgi', False))
+
+
+def _sart_sonucu(ad: str, tanim: Dict, durum: SartDurumu, neden: str,
+                 yolak_prefix: str) -> SartSonuc:
+    return SartSonuc(
+        ad=tanim.get('ad', ad),
+        durum=durum,
+        neden=neden,
+        kaynak=tanim.get('kaynak', ''),
+        grup=tanim.get('grup', '') or yolak_prefix,
+        veya_grubu=bool(tanim.get('veya_grubu', False)),
+        sartli_atom=_sartli_mi(tanim))
+
+
 def _yolak_degerlendir(atomlar: Dict, formul_str: str, baglam: Baglam,
-                        yolak_prefix: str = ''
+                        yolak_prefix: str = '',
+                        agac: Optional[Dict] = None,
+                        calistiricilar: Optional[Dict[str, Callable]] = None,
+                        tembel: bool = False,
+                        plan: Optional[Dict] = None
                         ) -> Tuple[SartDurumu, List[SartSonuc],
                                    List[SartSonuc]]:
-    """Tek yolak için tüm atomları çalıştır + formülü hesapla.
+    """Tek yolak için atomları çalıştır + formülü hesapla.
 
     Dönen: (kök_durum, sartlar_listesi, sartli_atomlar)
     yolak_prefix: SartSonuc.grup için kullanılır (örn. 'D-1:').
+    agac / calistiricilar: kural derleyicinin önceden parse ettiği formül
+        ağacı ve atom başına hazır çalıştırıcılar (baglam → AtomSonuc).
+    tembel: True → atomlar formülün ihtiyaç duyduğu sırayla (ucuz önce)
+        çalışır, sonucu belirlenmiş dallar atlanır. Verdict tam modla
+        aynıdır: şartlı/bilgi atomları her zaman çalışır; kök KE ise
+        verdict'i etkileyen şartlı-olmayan KE aranana kadar devam edilir.
+        Atlanan atomlar şart listesinde NA + KISA_DEVRE_NEDENI ile yer
+        alır (mesajdaki eksik/KE grupları yalnızca çalışanları sayar).
+        GUI'nin tam denetim izi için tembel=False (varsayılan).
+    plan: tembel mod için _tembel_plan çıktısı (derleyiciden; yoksa kurulur)
     """
-    atom_sonuclari: Dict[str, Tuple[SartDurumu, str]] = {}
-    sartlar: List[SartSonuc] = []
+    if agac is None:
+        agac = _yolak_agaci(atomlar, formul_str)
+
+    def _calistir(ad: str) -> AtomSonuc:
+        if calistiricilar is not None:
+            return calistiricilar[ad](baglam)
+        return _atom_calistir_v2(atomlar[ad], baglam)
+
+    if not tembel:
+        atom_sonuclari: Dict[str, Tuple[SartDurumu, str]] = {}
+        sartlar: List[SartSonuc] = []
+        for ad, tanim in atomlar.items():
+            a_sonuc = _calistir(ad)
+            atom_sonuclari[ad] = (a_sonuc.durum, a_sonuc.neden)
+            sartlar.append(_sart_sonucu(ad, tanim, a_sonuc.durum, a_sonuc.neden,
+                                        yolak_prefix))
+        kok_durum = _formul_calistir(agac, atom_sonuclari)
+    else:
+        tanimsiz = sorted(kullanilan_atomlar(agac) - set(atomlar))
+        if tanimsiz:
+            raise ValueError(f"Formülde tanımsız atom: {tanimsiz[0]!r}")
+        if plan is None:
+            plan = _tembel_plan(agac, {ad: _atom_maliyeti(t) for ad, t in atomlar.items()})
+        sonuclar: Dict[str, AtomSonuc] = {}
+
+        def _getir(ad: str) -> SartDurumu:
+            if ad not in sonuclar:
+                sonuclar[ad] = _calistir(ad)
+            return sonuclar[ad].durum
+
+        kok_durum = _formul_tembel(plan, _getir)
+        # Verdict'i belirleyen şartlı/bilgi atomları (genelde formül dışı)
+        for ad, tanim in atomlar.items():
+            if _sartli_mi(tanim):
+                _getir(ad)
+        # Kök KE + şartlı KE varken: şartlı-olmayan bir KE var mı? (ŞÜPHELİ
+        # ile ŞARTLI UYGUN ayrımı) — ilk bulunana kadar ucuzdan pahalıya
+        if kok_durum == SartDurumu.KONTROL_EDILEMEDI:
+            ke = SartDurumu.KONTROL_EDILEMEDI
+            sartli_ke = any(sonuclar[ad].durum == ke
+                            for ad, t in atomlar.items() if _sartli_mi(t))
+            sartsiz_ke = any(r.durum == ke for ad, r in sonuclar.items()
+                             if not _sartli_mi(atomlar[ad]))
+            if sartli_ke and not sartsiz_ke:
+                kalanlar = sorted((ad for ad in atomlar if ad not in sonuclar),
+                                  key=lambda ad: _atom_maliyeti(atomlar[ad]))
+                for ad in kalanlar:
+                    if _getir(ad) == ke:
+                        break
+        sartlar = []
+        for ad, tanim in atomlar.items():
+            r = sonuclar.get(ad)
+            if r is None:
+                sartlar.append(_sart_sonucu(ad, tanim, SartDurumu.NA,
+                                            KISA_DEVRE_NEDENI, yolak_prefix))
+            else:
+                sartlar.append(_sart_sonucu(ad, tanim, r.durum, r.neden,
+                                            yolak_prefix))
+
+    sartli_atomlar = [s for s in sartlar
+                       if s.sartli_atom
+                       and s.durum == SartDurumu.KONTROL_EDILEMEDI]
+    return kok_durum, sartlar, sartli_atomlar
 
-    for ad, tanim in atomlar.items():
-        a_sonuc = _atom_calistir_v2(tanim, baglam)
-        atom_sonuclari[ad] = (a_sonuc.durum, a_sonuc.neden)
-        grup_ham = tanim.get('grup', '') or yolak_prefix
-        sartlar.append(SartSonuc(
-            ad=tanim.get('ad', ad),
-            durum=a_sonuc.durum,
-            neden=a_sonuc.neden,
-            kaynak=tanim.get('kaynak', ''),
-            grup=grup_ham,
-            veya_grubu=bool(tanim.get('veya_grubu', False)),
-            sartli_atom=bool(tanim.get('sartli_atom', False)
-                              or tanim.get('bilgi', False))))
 
+def _yolak_agaci(atomlar: Dict, formul_str: str) -> Dict:
+    """Yolak formülünü parse et (formül yoksa tüm atomların AND'i)."""
     if not formul_str:
         # Formül yoksa AND varsayalım
         formul_str = ' ∧ '.join(atomlar.keys())
     try:
-        agac = parse_formul(formul_str)
+        return parse_formul(formul_str)
     except ParserHatasi as e:
         raise ValueError(f"Formül parse hatası: {e}")
-    kok_durum = _formul_calistir(agac, atom_sonuclari)
-
-    sartli_atomlar = [s for s in sartlar
-                       if s.sartli_atom
-                       and s.durum == SartDurumu.KONTROL_EDILEMEDI]
-    return kok_durum, sartlar, sartli_atomlar
 
 
 # ─────────────────────────────────────────────────────────────────────────
@@ -691,7 +912,30 @@ def _ilac_sonuc_normalize(ham: Dict) -> Dict:
     return yeni
 
 
-def degerlendir_v2(kural: Dict, ilac_sonuc: Dict) -> KontrolRaporu:
+def _detaylar(kural: Dict, baglam: Baglam) -> Dict[str, Any]:
+    return {
+        'sut_kodu': kural.get('sut_kodu', ''),
+        'ilac_adi': baglam.ilac_adi,
+        'rapor_kodu': baglam.rapor_kodu,
+        'doktor_uzm': baglam.doktor_uzm,
+        'schema_version': 'v2',
+    }
+
+
+def _belirsiz_yolak_raporu(kural: Dict, disp: Dict,
+                           detaylar: Dict) -> KontrolRaporu:
+    return KontrolRaporu(
+        sonuc=_SONUC_HARITA.get(
+            disp.get('belirsiz_default', 'KE').upper(),
+            KontrolSonucu.KONTROL_EDILEMEDI),
+        mesaj=disp.get('belirsiz_mesaj',
+                        'Yolak belirsiz — manuel doğrulama'),
+        sut_kurali=kural.get('sut_kurali_etiketi') or kural.get('adi') or '',
+        detaylar=detaylar)
+
+
+def degerlendir_v2(kural: Dict, ilac_sonuc: Dict,
+                   tembel: bool = False) -> KontrolRaporu:
     """JSON v2 kuralı ilac_sonuc reçete satırına uygula → KontrolRaporu.
 
     Adımlar:
@@ -700,19 +944,17 @@ def degerlendir_v2(kural: Dict, ilac_sonuc: Dict) -> KontrolRaporu:
       3. (Çoklu yolak ise) dispatcher → yolak seç
       4. Atomları çalıştır → formülü hesapla → kök durum
       5. Verdict eşleme → KontrolRaporu
+
+    Aynı kural çok sayıda satıra uygulanacaksa derleyici.KuralDerleyici +
+    degerlendir_derlenmis kullanın (doğrulama/parse/regex derleme bir kez).
+
+    tembel: True → kısa devreli atom değerlendirme (toplu kontrol; verdict
+        aynı, şart listesinde atlanan atomlar NA). Bkz. _yolak_degerlendir.
     """
     ilac_sonuc = _ilac_sonuc_normalize(ilac_sonuc)
     baglam = Baglam(ilac_sonuc)
     sut_etiketi = kural.get('sut_kurali_etiketi') or kural.get('adi') or ''
-    aranan = kural.get('aranan_ibare')
-
-    detaylar: Dict[str, Any] = {
-        'sut_kodu': kural.get('sut_kodu', ''),
-        'ilac_adi': baglam.ilac_adi,
-        'rapor_kodu': baglam.rapor_kodu,
-        'doktor_uzm': baglam.doktor_uzm,
-        'schema_version': 'v2',
-    }
+    detaylar = _detaylar(kural, baglam)
 
     # 1) Şema doğrulama (defensive — yükleme zamanı kaçırılmışsa)
     try:
@@ -730,18 +972,13 @@ def degerlendir_v2(kural: Dict, ilac_sonuc: Dict) -> KontrolRaporu:
 
     # 3) Yolak seçimi (varsa)
     yolaklar = kural.get('yolaklar')
+    yolak_def = None
     if yolaklar:
         disp = kural.get('dispatcher', {})
         secilen, neden = _dispatcher_calistir(disp, baglam)
         detaylar['dispatcher_neden'] = neden
         if secilen is None or secilen not in yolaklar:
-            return KontrolRaporu(
-                sonuc=_SONUC_HARITA.get(
-                    disp.get('belirsiz_default', 'KE').upper(),
-                    KontrolSonucu.KONTROL_EDILEMEDI),
-                mesaj=disp.get('belirsiz_mesaj',
-                                'Yolak belirsiz — manuel doğrulama'),
-                sut_kurali=sut_etiketi, detaylar=detaylar)
+            return _belirsiz_yolak_raporu(kural, disp, detaylar)
         yolak_def = yolaklar[secilen]
         detaylar['aktif_yolak'] = secilen
         detaylar['alt_dal'] = yolak_def.get('ad', secilen)
@@ -756,20 +993,33 @@ def degerlendir_v2(kural: Dict, ilac_sonuc: Dict) -> KontrolRaporu:
     # 4) Atomları çalıştır + formülü hesapla
     try:
         kok_durum, sartlar, sartli_atomlar = _yolak_degerlendir(
-            atomlar_aktif, formul_aktif, baglam, yolak_prefix=yolak_prefix)
+            atomlar_aktif, formul_aktif, baglam, yolak_prefix=yolak_prefix,
+            tembel=tembel)
     except ValueError as e:
         return KontrolRaporu(
             sonuc=KontrolSonucu.KONTROL_EDILEMEDI,
             mesaj=f"Değerlendirme hatası: {e}",
             sut_kurali=sut_etiketi, detaylar=detaylar)
 
+    # 5) Verdict eşleme
+    return _verdict_raporu(kural, yolak_def, kok_durum, sartlar,
+                           sartli_atomlar, detaylar)
+
+
+def _verdict_raporu(kural: Dict, yolak_def: Optional[Dict],
+                    kok_durum: SartDurumu, sartlar: List[SartSonuc],
+                    sartli_atomlar: List[SartSonuc],
+                    detaylar: Dict[str, Any]) -> KontrolRaporu:
+    """Kök durum + şart listesi → verdict_eslemesi'ne göre KontrolRaporu."""
+    sut_etiketi = kural.get('sut_kurali_etiketi') or kural.get('adi') or ''
+    aranan = kural.get('aranan_ibare')
+
     # Üst-VEYA çiftleri metadata'sını detaylar'a aktar (GUI okur)
     if kural.get('ust_or_ciftleri'):
         detaylar['ust_or_ciftleri'] = kural['ust_or_ciftleri']
-    if yolaklar and yolak_def.get('ust_or_ciftleri'):
+    if yolak_def and yolak_def.get('ust_or_ciftleri'):
         detaylar['ust_or_ciftleri'] = yolak_def['ust_or_ciftleri']
 
-    # 5) Verdict eşleme
     eslesme = kural.get('verdict_eslemesi', {}) or {}
     eksik_gruplar = sorted({s.grup for s in sartlar
                             if s.durum == SartDurumu.YOK and s.grup})
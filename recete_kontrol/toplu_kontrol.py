@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+"""Toplu SUT Kontrolü — aylık denetim için süreç havuzlu kalem değerlendirme.
+
+Aylık reçete ekranında bir ayın tüm kalemlerini kontrol_et_tekil'den
+geçirmek tek thread'de satır satır yürüyordu; kontroller saf CPU işidir
+(ilac_sonuc dict'i üzerinde regex/metin), GIL yüzünden thread'le
+hızlanmaz. Bu modül kalemleri partiler halinde bir ProcessPoolExecutor'a
+dağıtır:
+
+  - İşçi süreçler açılışta kural modüllerini (anlik_kontrol + sut_kontrolleri
+    + dispatch tablosundaki tüm atomik modüller) bir kez import edip
+    dispatch indeksini kurar; partiler ısınmış süreçlere gider.
+  - Sonuçlar GİRİŞ SIRASIYLA akıtılır (generator) — GUI ilk partiler
+    biter bitmez ızgarayı güncelleyebilir; önde bekleyen parti sayısı
+    sınırlıdır (bellek sabit kalır).
+  - Kategori bazlı süre (adet / toplam / en uzun) TopluIstatistik'e yazılır.
+  - Raporu pickle edilemeyen kalem (detaylar'da modül/kilit vb.) ana
+    süreçte yeniden hesaplanır; havuz kırılırsa kalan partiler de ana
+    süreçte sürdürülür — sonuç kümesi her durumda aynıdır.
+  - workers ≤ 1 veya az kalemde havuz hiç açılmaz (aynı yol, tek süreç).
+
+Havuz "spawn" bağlamıyla kurulur (eczane PC'si Windows; Linux'ta da aynı
+yol sınansın diye) ve çağrılar arasında yeniden kullanılır; uygulama
+kapanırken havuzu_kapat() çağrılır.
+
+⚠️ Botanik EOS kırmızı çizgisi: bu modül DB'ye yazmaz. Bazı kurallar
+(hepatit/diğer rapor) işçi sürecinde kendi SELECT-only BotanikDB
+singleton'ını açabilir — guard her süreçte aynen geçerlidir.
+
+Kullanım:
+    from recete_kontrol.toplu_kontrol import TopluIstatistik, toplu_kontrol
+    ist = TopluIstatistik()
+    for sira, kategori, rapor in toplu_kontrol(ilac_sonuclari, workers=7,
+                                               istatistik=ist):
+        ...                       # sira: ilac_sonuclari içindeki konum
+    print(ist.rapor())
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from recete_kontrol.base_kontrol import KontrolRaporu
+
+logger = logging.getLogger(__name__)
+
+# Bu sayının altındaki işte süreç açmak (spawn + import) kazançtan pahalı
+MIN_HAVUZ_KALEM = 200
+# İşçi başına önde bekletilen parti sayısı (akış + sabit bellek)
+ON_YUKLEME = 2
+# Otomatik parti boyu sınırları
+MIN_PARTI = 16
+MAKS_PARTI = 256
+# Kategori bulunamayan (kontrol uygulanmayan) kalemlerin istatistik etiketi
+KATEGORISIZ = "—"
+
+# İşçi sonucu: (kategori, pickle'lanmış rapor | None, süre_sn, hata | None);
+# rapor pickle edilemezse bayt yerine _YEREL döner → ana süreç hesaplar.
+_YEREL = "__yerel__"
+
+
+def varsayilan_isci_sayisi() -> int:
+    """Bir çekirdek arayüze kalsın: cpu_count - 1 (en az 1)."""
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# İstatistik
+# ═══════════════════════════════════════════════════════════════════════
+
+@dataclass
+class KategoriSuresi:
+    adet: int = 0
+    toplam_sn: float = 0.0
+    maks_sn: float = 0.0
+
+
+@dataclass
+class TopluIstatistik:
+    """Bir toplu_kontrol çağrısının sayaçları (çağıran doldurulmak üzere verir)."""
+    kalem: int = 0
+    hata: int = 0
+    yerel: int = 0            # ana süreçte (yeniden) hesaplanan kalem
+    isci: int = 0             # 0 = havuzsuz
+    duvar_sn: float = 0.0
+    kategoriler: Dict[str, KategoriSuresi] = field(default_factory=dict)
+
+    def ekle(self, kategori: Optional[str], sure_sn: float) -> None:
+        k = self.kategoriler.get(kategori or KATEGORISIZ)
+        if k is None:
+            k = self.kategoriler[kategori or KATEGORISIZ] = KategoriSuresi()
+        k.adet += 1
+        k.toplam_sn += sure_sn
+        if sure_sn > k.maks_sn:
+            k.maks_sn = sure_sn
+
+    @property
+    def kural_sn(self) -> float:
+        """Kalem sürelerinin toplamı (süreçler paralel çalıştığında duvar
+        süresinden büyüktür)."""
+        return sum(k.toplam_sn for k in self.kategoriler.values())
+
+    def rapor(self, ilk: int = 15) -> str:
+        """Toplam süreye göre azalan kategori tablosu (metin)."""
+        hiz = self.kalem / self.duvar_sn if self.duvar_sn > 0 else 0.0
+        satirlar = [
+            f"{self.kalem} kalem, {self.duvar_sn:.2f} sn duvar "
+            f"({hiz:,.0f} kalem/sn), kural toplamı {self.kural_sn:.2f} sn, "
+            f"işçi {self.isci or 'yok'}, hata {self.hata}, yerel {self.yerel}",
+            f"{'KATEGORİ':<32} {'ADET':>7} {'TOPLAM sn':>10} {'ORT ms':>8} {'MAKS ms':>8}",
+        ]
+        sirali = sorted(self.kategoriler.items(), key=lambda kv: -kv[1].toplam_sn)
+        for ad, k in sirali[:ilk]:
+            satirlar.append(
+                f"{ad[:32]:<32} {k.adet:>7} {k.toplam_sn:>10.3f} "
+                f"{k.toplam_sn / k.adet * 1000:>8.2f} {k.maks_sn * 1000:>8.1f}")
+        if len(sirali) > ilk:
+            satirlar.append(f"… {len(sirali) - ilk} kategori daha")
+        return "\n".join(satirlar)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# İşçi tarafı
+# ═══════════════════════════════════════════════════════════════════════
+
+def _kalem_kontrol(ilac_sonuc: Dict) -> Tuple[Optional[str], Optional[KontrolRaporu],
+                                               float, Optional[str]]:
+    from recete_kontrol.anlik_kontrol import kontrol_et_tekil
+    t0 = time.perf_counter()
+    try:
+        kategori, rapor = kontrol_et_tekil(ilac_sonuc)
+        hata = None
+    except Exception as e:
+        kategori, rapor, hata = None, None, f"{type(e).__name__}: {e}"
+    return kategori, rapor, time.perf_counter() - t0, hata
+
+
+def _isci_hazirla() -> None:
+    """Havuz initializer'ı: kural modüllerini bir kez import et, indeksi kur."""
+    try:
+        from recete_kontrol import sut_kontrolleri  # noqa: F401
+        from recete_kontrol.anlik_kontrol import dispatch_indeksi
+        indeks = dispatch_indeksi()
+        for i in range(len(indeks.tablo)):
+            try:
+                indeks.fonksiyon(i)
+            except Exception:
+                pass
+        # Kural fonksiyonlarının tembel import'ları (sut_motor vb.) da ısınsın
+        _kalem_kontrol({"ilac_adi": "", "etkin_madde": "", "atc_kodu": ""})
+    except Exception as e:
+        logger.warning("Toplu kontrol işçisi ısıtılamadı: %s", e)
+
+
+def _parti_calistir(partisi: List[Dict]) -> List[Tuple[Optional[str], object,
+                                                         float, Optional[str]]]:
+    sonuclar = []
+    for ilac_sonuc in partisi:
+        kategori, rapor, sure, hata = _kalem_kontrol(ilac_sonuc)
+        if rapor is None:
+            sonuclar.append((kategori, None, sure, hata))
+            continue
+        try:
+            veri = pickle.dumps(rapor, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            veri = _YEREL
+        sonuclar.append((kategori, veri, sure, hata))
+    return sonuclar
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Havuz (çağrılar arası paylaşılan)
+# ═══════════════════════════════════════════════════════════════════════
+
+_havuz: Optional[ProcessPoolExecutor] = None
+_havuz_isci = 0
+_havuz_kilidi = threading.Lock()
+
+
+def _havuz_al(workers: int) -> ProcessPoolExecutor:
+    global _havuz, _havuz_isci
+    with _havuz_kilidi:
+        if _havuz is not None and _havuz_isci != workers:
+            _havuz.shutdown(wait=False, cancel_futures=True)
+            _havuz = None
+        if _havuz is None:
+            _havuz = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_isci_hazirla)
+            _havuz_isci = workers
+        return _havuz
+
+
+def _havuzu_birak(havuz: ProcessPoolExecutor) -> None:
+    """Kırılan havuzu bırak — sonraki çağrı yenisini kurar."""
+    global _havuz
+    with _havuz_kilidi:
+        if _havuz is havuz:
+            _havuz = None
+    try:
+        havuz.shutdown(wait=False, cancel_futures=True)
+    except Exception:
+        pass
+
+
+def havuzu_kapat() -> None:
+    """Paylaşılan işçi havuzunu kapat (uygulama çıkışında)."""
+    global _havuz
+    with _havuz_kilidi:
+        havuz, _havuz = _havuz, None
+    if havuz is not None:
+        havuz.shutdown(wait=True, cancel_futures=True)
+
+
+# ═══════════════════════════════════════════════════════════════════════
+# Toplu API
+# ═══════════════════════════════════════════════════════════════════════
+
+def _parti_boyu(n: int, workers: int) -> int:
+    # İşçi başına ~8 parti: kuyruk dengeli kalsın, IPC yükü küçük kalsın
+    return max(MIN_PARTI, min(MAKS_PARTI, n // max(1, workers * 8) or 1))
+
+
+def toplu_kontrol(ilac_sonuclari: Iterable[Dict], workers: Optional[int] = None,
+                  parti: Optional[int] = None,
+                  istatistik: Optional[TopluIstatistik] = None,
+                  ) -> Iterator[Tuple[int, Optional[str], Optional[KontrolRaporu]]]:
+    """Kalemleri kontrol_et_tekil'den geçir; (sira, kategori, rapor) akıt.
+
+    Sonuçlar giriş sırasıyla ve kontrol_et_tekil'in tek süreçte vereceği
+    değerlerle aynıdır; hata veren kalem (sira, None, None) döner ve
+    istatistik.hata'ya sayılır.
+
+    Args:
+        ilac_sonuclari: birleşik ilac_sonuc dict'leri (pickle edilebilir).
+        workers: işçi süreç sayısı; None → varsayilan_isci_sayisi(),
+                 ≤ 1 → havuzsuz (ana süreçte).
+        parti: işçiye tek seferde giden kalem sayısı (None → otomatik).
+        istatistik: verilirse kategori süreleri ve sayaçlar buraya yazılır.
+    """
+    kalemler = ilac_sonuclari if isinstance(ilac_sonuclari, list) else list(ilac_sonuclari)
+    ist = istatistik if istatistik is not None else TopluIstatistik()
+    workers = varsayilan_isci_sayisi() if workers is None else int(workers)
+    t0 = time.perf_counter()
+    try:
+        if workers <= 1 or len(kalemler) < MIN_HAVUZ_KALEM:
+            ist.isci = 0
+            for sira, ilac_sonuc in enumerate(kalemler):
+                yield (sira,) + _yerel_sonuc(ilac_sonuc, ist)
+            return
+        ist.isci = workers
+        yield from _havuzla(kalemler, workers,
+                            parti or _parti_boyu(len(kalemler), workers), ist)
+    finally:
+        ist.duvar_sn += time.perf_counter() - t0
+
+
+def _yerel_sonuc(ilac_sonuc: Dict, ist: TopluIstatistik):
+    kategori, rapor, sure, hata = _kalem_kontrol(ilac_sonuc)
+    ist.kalem += 1
+    ist.ekle(kategori, sure)
+    if hata:
+        ist.hata += 1
+        logger.warning("Toplu kontrol kalem hatası (%s): %s",
+                       ilac_sonuc.get("ilac_adi"), hata)
+    return kategori, rapor
+
+
+def _havuzla(kalemler: List[Dict], workers: int, parti: int,
+             ist: TopluIstatistik):
+    try:
+        havuz = _havuz_al(workers)
+    except Exception as e:
+        logger.warning("Toplu kontrol havuzu açılamadı, tek süreçte: %s", e)
+        havuz = None
+    baslangiclar = iter(range(0, len(kalemler), parti))
+    bekleyen: deque = deque()
+
+    def _gonder():
+        nonlocal havuz
+        if havuz is None:
+            return False
+        bas = next(baslangiclar, None)
+        if bas is None:
+            return False
+        try:
+            bekleyen.append((bas, havuz.submit(_parti_calistir,
+                                               kalemler[bas:bas + parti])))
+        except Exception as e:     # kırık/kapanmış havuz
+            logger.warning("Toplu kontrol havuzu kullanılamıyor: %s", e)
+            _havuzu_birak(havuz)
+            havuz = None
+            bekleyen.append((bas, None))
+        return True
+
+    for _ in range(workers * ON_YUKLEME):
+        if not _gonder():
+            break
+    try:
+        while bekleyen:
+            bas, gelecek = bekleyen.popleft()
+            dilim = kalemler[bas:bas + parti]
+            sonuclar = None
+            if gelecek is not None:
+                try:
+                    sonuclar = gelecek.result()
+                except Exception as e:
+                    # Pickle edilemeyen girdi veya çöken işçi → bu parti yerelde
+                    logger.warning("Toplu kontrol partisi (%d) yerelde: %s", bas, e)
+                    if havuz is not None and isinstance(e, BrokenProcessPool):
+                        _havuzu_birak(havuz)
+                        havuz = None
+            _gonder()
+            if sonuclar is None:
+                ist.yerel += len(dilim)
+                for j, ilac_sonuc in enumerate(dilim):
+                    yield (bas + j,) + _yerel_sonuc(ilac_sonuc, ist)
+                continue
+            for j, (kategori, veri, sure, hata) in enumerate(sonuclar):
+                if veri == _YEREL:
+                    ist.yerel += 1
+                    yield (bas + j,) + _yerel_sonuc(dilim[j], ist)
+                    continue
+                ist.kalem += 1
+                ist.ekle(kategori, sure)
+                if hata:
+                    ist.hata += 1
+                    logger.warning("Toplu kontrol kalem hatası (%s): %s",
+                                   dilim[j].get("ilac_adi"), hata)
+                yield bas + j, kategori, (pickle.loads(veri) if veri else None)
+        # Havuz yarıda kırıldıysa gönderilemeyen partiler
+        for bas in baslangiclar:
+            ist.yerel += len(kalemler[bas:bas + parti])
+            for j, ilac_sonuc in enumerate(kalemler[bas:bas + parti]):
+                yield (bas + j,) + _yerel_sonuc(ilac_sonuc, ist)
+    finally:
+        # Tüketici erken bıraktıysa sıradaki partiler boşuna çalışmasın
+        for _, gelecek in bekleyen:
+            if gelecek is not None:
+                gelecek.cancel()
@@ -20,6 +20,12 @@ TEYİT eder. Bu modül teyitleri SQLite'a yazar/okur.
 
 Tek satır = bir reçete kalemi. Tekrar teyit "üzerine yaz" mantığıyla
 INSERT OR REPLACE ile son durumu saklar.
+
+teyit_haritasi / ai_sonuc_haritasi bir ri_id listesiyle çağrıldığında
+(aylık tablo yenilemesi: sadece açık dönemin satırları) sonuçlar süreç içi
+önbellekte tutulur; sonraki yenilemelerde yalnız önbellekte olmayan ri_id'ler
+parça parça (IN listesi) sorgulanır. Yazma fonksiyonları önbelleği
+güncellediği için ayrıca geçersiz kılma gerekmez.
 """
 from __future__ import annotations
 
@@ -61,6 +67,13 @@ def _db_yolu() -> Path:
 
 _conn: sqlite3.Connection | None = None
 
+# Noktasal okuma önbelleği: {ri_id: teyit_sonucu | None}, {ri_id: ai_dict | None}
+# (None = DB'de kayıt yok olarak bilinir). Yazma fonksiyonları günceller.
+_teyit_onbellek: dict[str, str | None] = {}
+_ai_onbellek: dict[str, dict | None] = {}
+# SQLite'ın eski sürümlerinde IN listesi en fazla 999 parametre alır
+_IN_PARCA = 900
+
 
 # AI Kontrol sütunları (Faz 1 — kullanıcı isteği 2026-05-21)
 # AI butonunun ürettiği sonuç + açıklama bu sütunlara yazılır.
@@ -164,6 +177,9 @@ def teyit_kaydet(
             ),
         )
         conn.commit()
+        _teyit_onbellek[str(ri_id)] = teyit_sonucu
+        # INSERT OR REPLACE satırı yeniden yazar — AI alanları da sıfırlanır
+        _ai_onbellek[str(ri_id)] = None
         return True
     except Exception as e:
         logger.error("teyit_kaydet hatası: %s", e)
@@ -202,33 +218,57 @@ def teyit_oku(ri_id: str) -> dict | None:
         return None
 
 
+def _parca_parca_oku(sql_sablon: str, ri_idler: list[str]):
+    """`WHERE ri_id IN (...)` sorgusunu _IN_PARCA'lık parçalarla çalıştır."""
+    conn = _baglanti()
+    for i in range(0, len(ri_idler), _IN_PARCA):
+        parca = ri_idler[i:i + _IN_PARCA]
+        yer = ",".join("?" for _ in parca)
+        yield from conn.execute(sql_sablon.format(yer=yer), parca).fetchall()
+
+
 def teyit_haritasi(ri_idler: list[str] | None = None) -> dict[str, str]:
     """Birden fazla ri_id için teyit_sonucu eşlemesi döndür.
 
-    ri_idler verilmezse TÜM kayıtları döndürür.
+    ri_idler verilmezse TÜM kayıtları döndürür. Liste verilirse önbellekte
+    olmayanlar DB'den okunur (noktasal), bilinenler önbellekten gelir.
     Returns: {ri_id: teyit_sonucu}
     """
     try:
-        conn = _baglanti()
         if ri_idler is None:
-            cur = conn.execute(
+            cur = _baglanti().execute(
                 f"SELECT ri_id, teyit_sonucu FROM {_TABLO}"
             )
-        else:
-            if not ri_idler:
-                return {}
-            placeholders = ",".join("?" for _ in ri_idler)
-            cur = conn.execute(
-                f"SELECT ri_id, teyit_sonucu FROM {_TABLO} "
-                f"WHERE ri_id IN ({placeholders})",
-                tuple(str(x) for x in ri_idler),
-            )
-        return {str(r[0]): r[1] for r in cur.fetchall() if r[1]}
+            return {str(r[0]): r[1] for r in cur.fetchall() if r[1]}
+        anahtarlar = [str(x) for x in ri_idler]
+        eksik = [k for k in dict.fromkeys(anahtarlar)
+                 if k not in _teyit_onbellek]
+        if eksik:
+            bulunan = {
+                str(r[0]): r[1] for r in _parca_parca_oku(
+                    f"SELECT ri_id, teyit_sonucu FROM {_TABLO} "
+                    f"WHERE ri_id IN ({{yer}})", eksik)
+                if r[1]
+            }
+            for k in eksik:
+                _teyit_onbellek[k] = bulunan.get(k)
+        sonuc = {}
+        for k in anahtarlar:
+            v = _teyit_onbellek.get(k)
+            if v:
+                sonuc[k] = v
+        return sonuc
     except Exception as e:
         logger.error("teyit_haritasi hatası: %s", e)
         return {}
 
 
+def onbellegi_temizle() -> None:
+    """Noktasal okuma önbelleklerini boşalt (DB dışarıdan değiştiyse)."""
+    _teyit_onbellek.clear()
+    _ai_onbellek.clear()
+
+
 def teyit_sil(ri_id: str) -> bool:
     """Bir teyit kaydını sil."""
     if not ri_id:
@@ -237,6 +277,8 @@ def teyit_sil(ri_id: str) -> bool:
         conn = _baglanti()
         conn.execute(f"DELETE FROM {_TABLO} WHERE ri_id=?", (str(ri_id),))
         conn.commit()
+        _teyit_onbellek[str(ri_id)] = None
+        _ai_onbellek[str(ri_id)] = None
         return True
     except Exception as e:
         logger.error("teyit_sil hatası: %s", e)
@@ -324,6 +366,8 @@ def ai_sonuc_kaydet(
             ),
         )
         conn.commit()
+        # Teyit alanına dokunulmadı; AI kaydı sonraki okumada DB'den gelir
+        _ai_onbellek.pop(str(ri_id), None)
         return True
     except Exception as e:
         logger.error("ai_sonuc_kaydet hatası: %s", e)
@@ -358,40 +402,51 @@ def ai_sonuc_oku(ri_id: str) -> dict | None:
         return None
 
 
+def _ai_kaydi(r) -> dict:
+    return {
+        "ai_sonuc": r[1],
+        "ai_aciklama": r[2] or "",
+        "ai_model": r[3] or "",
+        "ai_tarih": r[4] or "",
+        "ai_guven": r[5] or 0.0,
+        "ai_sut_ref": r[6] or "",
+    }
+
+
 def ai_sonuc_haritasi(ri_idler: list[str] | None = None) -> dict[str, dict]:
-    """Birden fazla ri_id için AI sonucu haritası döndür."""
+    """Birden fazla ri_id için AI sonucu haritası döndür.
+
+    ri_idler verilirse teyit_haritasi gibi önbellekli noktasal okuma yapılır."""
     try:
-        conn = _baglanti()
         if ri_idler is None:
-            cur = conn.execute(
+            cur = _baglanti().execute(
                 f"""SELECT ri_id, ai_sonuc, ai_aciklama, ai_model,
                            ai_tarih, ai_guven, ai_sut_ref
                     FROM {_TABLO}
                     WHERE ai_sonuc IS NOT NULL AND ai_sonuc <> ''"""
             )
-        else:
-            if not ri_idler:
-                return {}
-            placeholders = ",".join("?" for _ in ri_idler)
-            cur = conn.execute(
-                f"""SELECT ri_id, ai_sonuc, ai_aciklama, ai_model,
-                           ai_tarih, ai_guven, ai_sut_ref
-                    FROM {_TABLO}
-                    WHERE ri_id IN ({placeholders})
-                      AND ai_sonuc IS NOT NULL AND ai_sonuc <> ''""",
-                tuple(str(x) for x in ri_idler),
-            )
-        return {
-            str(r[0]): {
-                "ai_sonuc": r[1],
-                "ai_aciklama": r[2] or "",
-                "ai_model": r[3] or "",
-                "ai_tarih": r[4] or "",
-                "ai_guven": r[5] or 0.0,
-                "ai_sut_ref": r[6] or "",
+            return {str(r[0]): _ai_kaydi(r) for r in cur.fetchall() if r[1]}
+        anahtarlar = [str(x) for x in ri_idler]
+        eksik = [k for k in dict.fromkeys(anahtarlar) if k not in _ai_onbellek]
+        if eksik:
+            bulunan = {
+                str(r[0]): _ai_kaydi(r) for r in _parca_parca_oku(
+                    f"""SELECT ri_id, ai_sonuc, ai_aciklama, ai_model,
+                               ai_tarih, ai_guven, ai_sut_ref
+                        FROM {_TABLO}
+                        WHERE ri_id IN ({{yer}})
+                          AND ai_sonuc IS NOT NULL AND ai_sonuc <> ''""",
+                    eksik)
+                if r[1]
             }
-            for r in cur.fetchall() if r[1]
-        }
+            for k in eksik:
+                _ai_onbellek[k] = bulunan.get(k)
+        sonuc = {}
+        for k in anahtarlar:
+            v = _ai_onbellek.get(k)
+            if v:
+                sonuc[k] = v
+        return sonuc
     except Exception as e:
         logger.error("ai_sonuc_haritasi hatası: %s", e)
         return {}
@@ -0,0 +1,326 @@
+"""
+Sanal Tablo — büyük listeler için sanallaştırılmış ttk.Treeview ızgarası
+
+Treeview'e on binlerce satır eklemek (ve her satırın hücre metnini önceden
+üretmek) arayüzü saniyelerce dondurur. SanalTablo görünüm sırasını yalnızca
+iid listesi olarak tutar; Treeview'de sadece ekrandaki pencere + iki yanda
+küçük bir tampon kadar satır bulunur. Satır değerleri (values, tags) ilk
+görüntülendiklerinde `satir_uret(iid)` ile üretilip önbelleğe alınır.
+
+  - Filtre / sıralama çağıranın işidir: sonuç iid sırası `veri_ayarla` ile
+    verilir (satır render'ı yapılmaz → 50k satır milisaniyeler).
+  - Kaydırma: dikey kaydırma çubuğu toplam satıra göre konumlanır; Treeview'in
+    kendi kaydırması (tekerlek, ok tuşları, see) pencere kenarına yaklaşınca
+    pencere yeni konuma kaydırılır — eklenen/silinen yalnız fark satırlarıdır.
+  - iid'ler gerçek satır anahtarlarıdır: identify_row, item, set, selection
+    görünen satırlarda olduğu gibi çalışır. Pencereden çıkan satırların
+    vurgusu (Tk seçimi) hatırlanır, geri gelince yeniden uygulanır.
+
+Kullanım:
+    grid = SanalTablo(tv, lambda iid: (values, tags), ysb=ysb)
+    grid.veri_ayarla([iid1, iid2, ...])      # filtre/sıralama sonrası sıra
+    grid.veri_ayarla(gorunen, onbellegi_koru=True)   # yalnız filtre değişti
+    grid.yenile(iid)                         # tek satırın verisi değişti
+    grid.sec(iid)                            # seç + görünür yap
+"""
+
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+VARSAYILAN_TAMPON = 150      # görünür alanın üstünde/altında tutulan satır
+VARSAYILAN_GORUNUR = 40      # ilk ölçümden önce tahmini görünür satır
+
+SatirUretici = Callable[[str], Tuple[Sequence, Sequence]]
+
+
+class SanalTablo:
+    """ttk.Treeview için pencereli (virtual) satır modeli."""
+
+    def __init__(self, tv, satir_uret: SatirUretici, ysb=None,
+                 tampon: int = VARSAYILAN_TAMPON):
+        self.tv = tv
+        self.satir_uret = satir_uret
+        self.ysb = ysb
+        self.tampon = max(10, int(tampon))
+        self._sira: List[str] = []
+        self._konum: Optional[Dict[str, int]] = None
+        self._onbellek: Dict[str, Tuple[tuple, tuple]] = {}
+        self._pencere: List[str] = []
+        self._bas = 0
+        self._ust = 0
+        self._gorunur = VARSAYILAN_GORUNUR
+        self._vurgu: set = set()
+        self._ortalama_bekliyor = False
+
+        tv.configure(yscrollcommand=self._tv_yscroll)
+        if ysb is not None:
+            ysb.configure(command=self.yview)
+        tv.bind("<<TreeviewSelect>>", self._secim_degisti, add="+")
+        tv.bind("<Button-1>", self._tik, add="+")
+
+    # ------------------------------------------------------------ model
+    def __len__(self) -> int:
+        return len(self._sira)
+
+    def __contains__(self, iid) -> bool:
+        return iid in self._konumlar()
+
+    def gorunen_iidler(self) -> List[str]:
+        """Filtreden geçen tüm satırlar (görünüm sırasıyla)."""
+        return list(self._sira)
+
+    def konum(self, iid: str) -> int:
+        """Satırın görünüm sırasındaki yeri (yoksa -1)."""
+        return self._konumlar().get(iid, -1)
+
+    def _konumlar(self) -> Dict[str, int]:
+        if self._konum is None:
+            self._konum = {iid: i for i, iid in enumerate(self._sira)}
+        return self._konum
+
+    def veri_ayarla(self, iidler: Iterable[str], konumu_koru: bool = True,
+                    onbellegi_koru: bool = False) -> None:
+        """Görünüm sırasını değiştir; render önbelleği temizlenir.
+
+        onbellegi_koru: satır verisi değişmedi, yalnız filtre değişti — render
+        önbelleği ve pencerede kalan satırlar korunur, Treeview'e yalnız fark
+        satırları eklenir/silinir; görünür alanın ilk (hâlâ görünen) satırı
+        yerinde kalır."""
+        yeni = [str(i) for i in iidler]
+        if not onbellegi_koru:
+            self._sira = yeni
+            self._konum = None
+            self._onbellek.clear()
+            self._pencereyi_bosalt()
+            ust = self._ust if konumu_koru else 0
+            self._ortala(self._sinirla(ust))
+            return
+        konum = {iid: i for i, iid in enumerate(yeni)}
+        ust = 0
+        if konumu_koru:
+            ust = self._ust
+            for iid in self._sira[self._ust:self._ust + self._gorunur]:
+                if iid in konum:
+                    ust = konum[iid]
+                    break
+        kalan = [konum[i] for i in self._pencere if i in konum]
+        if any(a > b for a, b in zip(kalan, kalan[1:])):
+            # Sıra değişmiş — fark uygulanamaz
+            self._pencereyi_bosalt()
+        self._sira = yeni
+        self._konum = konum
+        self._ortala(self._sinirla(ust))
+
+    def ekle(self, iidler: Iterable[str]) -> None:
+        """Sona satır ekle (akışlı yükleme) — mevcut pencere korunur."""
+        yeni = [str(i) for i in iidler]
+        if not yeni:
+            return
+        if self._konum is not None:
+            n = len(self._sira)
+            for k, iid in enumerate(yeni):
+                self._konum[iid] = n + k
+        self._sira.extend(yeni)
+        if self._bas + len(self._pencere) < self._ust + self._gorunur + self.tampon:
+            self._ortala(self._ust)
+        else:
+            self._kaydirma_cubugu()
+
+    def temizle(self) -> None:
+        self._sira = []
+        self._konum = None
+        self._onbellek.clear()
+        self._vurgu.clear()
+        self._pencereyi_bosalt()
+        self._ust = 0
+        self._kaydirma_cubugu()
+
+    def yenile(self, iid: Optional[str] = None) -> None:
+        """Satır(lar)ın verisi değişti: önbelleği düşür, pencerede ise yeniden çiz."""
+        if iid is None:
+            self._onbellek.clear()
+            hedef = list(self._pencere)
+        else:
+            iid = str(iid)
+            self._onbellek.pop(iid, None)
+            hedef = [iid] if iid in set(self._pencere) else []
+        for i in hedef:
+            values, tags = self._satir(i)
+            try:
+                self.tv.item(i, values=values, tags=tags)
+            except Exception as e:
+                logger.debug("sanal tablo satır yenileme (%s): %s", i, e)
+
+    def deger(self, iid: str, sutun_sira: int) -> str:
+        """Satırın görüntülenen hücre metni (pencerede olmasa da)."""
+        values, _ = self._satir(str(iid))
+        try:
+            return str(values[sutun_sira])
+        except IndexError:
+            return ""
+
+    def _satir(self, iid: str) -> Tuple[tuple, tuple]:
+        r = self._onbellek.get(iid)
+        if r is None:
+            values, tags = self.satir_uret(iid)
+            r = (tuple(values), tuple(tags or ()))
+            self._onbellek[iid] = r
+        return r
+
+    # ------------------------------------------------------------ seçim
+    def _secim_degisti(self, _e=None) -> None:
+        pencere = set(self._pencere)
+        self._vurgu = {i for i in self._vurgu if i not in pencere}
+        self._vurgu.update(self.tv.selection())
+
+    def _tik(self, event) -> None:
+        # Shift/Ctrl'süz tık tek satır seçer — pencere dışı eski vurguyu unut
+        if not (getattr(event, "state", 0) & 0x0005):
+            self._vurgu.clear()
+
+    def vurgulananlar(self) -> List[str]:
+        """Tk seçimi + pencere dışında kalmış vurgulu satırlar (görünüm sırasıyla)."""
+        self._secim_degisti()
+        konum = self._konumlar()
+        return sorted((i for i in self._vurgu if i in konum), key=konum.__getitem__)
+
+    def goster(self, iid: str) -> bool:
+        """Satırı görünür alana getir."""
+        idx = self.konum(str(iid))
+        if idx < 0:
+            return False
+        if not (self._ust <= idx < self._ust + self._gorunur):
+            self.kaydir(idx - self._gorunur // 2)
+        try:
+            self.tv.see(str(iid))
+        except Exception:
+            pass
+        return True
+
+    def sec(self, iid: str) -> bool:
+        """Satırı seç, odakla ve görünür yap."""
+        iid = str(iid)
+        if not self.goster(iid):
+            return False
+        self._vurgu = {iid}
+        try:
+            self.tv.selection_set(iid)
+            self.tv.focus(iid)
+        except Exception:
+            pass
+        return True
+
+    # ------------------------------------------------------------ kaydırma
+    def _sinirla(self, ust: int) -> int:
+        return max(0, min(int(ust), max(0, len(self._sira) - self._gorunur)))
+
+    def yview(self, *args) -> None:
+        """Dikey kaydırma çubuğu komutu (moveto / scroll N units|pages)."""
+        if not args:
+            return
+        if args[0] == "moveto":
+            ust = int(float(args[1]) * len(self._sira))
+        elif args[0] == "scroll":
+            adim = int(args[1])
+            birim = args[2] if len(args) > 2 else "units"
+            ust = self._ust + adim * (max(1, self._gorunur - 1) if birim.startswith("page") else 1)
+        else:
+            return
+        self.kaydir(ust)
+
+    def kaydir(self, ust: int) -> None:
+        """Görünür alanın ilk satırını `ust` yap."""
+        ust = self._sinirla(ust)
+        son = self._bas + len(self._pencere)
+        if (self._pencere and self._bas <= ust and ust + self._gorunur <= son
+                and not self._kenara_yakin(ust)):
+            self._ust = ust
+            self.tv.yview_moveto((ust - self._bas) / len(self._pencere))
+            self._kaydirma_cubugu()
+        else:
+            self._ortala(ust)
+
+    def _kenara_yakin(self, ust: int) -> bool:
+        esik = self.tampon // 2
+        son = self._bas + len(self._pencere)
+        ust_kenar = self._bas > 0 and ust - self._bas < esik
+        alt_kenar = son < len(self._sira) and son - (ust + self._gorunur) < esik
+        return ust_kenar or alt_kenar
+
+    def _tv_yscroll(self, first, last) -> None:
+        """Treeview'in kendi kaydırması (tekerlek/ok/see) — konumu izle."""
+        n = len(self._pencere)
+        if n:
+            f, l = float(first), float(last)
+            self._ust = self._bas + int(round(f * n))
+            gorunur = int(round((l - f) * n))
+            if gorunur > 0 and (l < 1.0 or self._bas + n >= len(self._sira)):
+                self._gorunur = gorunur
+            if self._kenara_yakin(self._ust) and not self._ortalama_bekliyor:
+                self._ortalama_bekliyor = True
+                try:
+                    self.tv.after_idle(self._bekleyen_ortala)
+                except Exception:
+                    self._bekleyen_ortala()
+        self._kaydirma_cubugu()
+
+    def _bekleyen_ortala(self) -> None:
+        self._ortalama_bekliyor = False
+        self._ortala(self._ust)
+
+    def _kaydirma_cubugu(self) -> None:
+        if self.ysb is None:
+            return
+        toplam = len(self._sira)
+        if not toplam:
+            self.ysb.set(0.0, 1.0)
+            return
+        self.ysb.set(self._ust / toplam, min(1.0, (self._ust + self._gorunur) / toplam))
+
+    # ------------------------------------------------------------ pencere
+    def _pencereyi_bosalt(self) -> None:
+        try:
+            cocuklar = self.tv.get_children()
+            if cocuklar:
+                self.tv.delete(*cocuklar)
+        except Exception as e:
+            logger.debug("sanal tablo temizleme: %s", e)
+        self._pencere = []
+        self._bas = 0
+
+    def _ortala(self, ust: int) -> None:
+        """Pencereyi [ust - tampon, ust + görünür + tampon) aralığına taşı."""
+        ust = self._sinirla(ust)
+        bas = max(0, ust - self.tampon)
+        son = min(len(self._sira), ust + self._gorunur + self.tampon)
+        self._pencere_uygula(bas, son)
+        self._ust = ust
+        if self._pencere:
+            self.tv.yview_moveto((ust - bas) / len(self._pencere))
+        self._kaydirma_cubugu()
+
+    def _pencere_uygula(self, bas: int, son: int) -> None:
+        yeni = self._sira[bas:son]
+        if yeni == self._pencere:
+            self._bas = bas
+            return
+        yeni_set = set(yeni)
+        silinecek = [i for i in self._pencere if i not in yeni_set]
+        if silinecek:
+            self.tv.delete(*silinecek)
+        mevcut = set(self._pencere) - set(silinecek)
+        for idx, iid in enumerate(yeni):
+            if iid in mevcut:
+                continue
+            values, tags = self._satir(iid)
+            self.tv.insert("", idx, iid=iid, values=values, tags=tags)
+        self._pencere = yeni
+        self._bas = bas
+        geri = [i for i in yeni if i in self._vurgu]
+        if geri:
+            try:
+                self.tv.selection_add(*geri)
+            except Exception:
+                pass
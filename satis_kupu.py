@@ -0,0 +1,508 @@
+"""
+Aylık Satış Küpü — UrunId × gün çıkış küpü (yerel, artımlı, salt-okuma beslemeli)
+
+Stok/sipariş/MF analizleri (min_stok_analiz.talep_pattern_analiz,
+HastasiOlanIlacDB.aylik_cikis_topla, BotanikDB.mf_aylik_satis_getir,
+stok_hareket_analiz_getir, sipariş ekranı) aynı şeyi — ürün başına
+günlük/aylık çıkış — ReceteIlaclari + EldenIlaclari üzerinde kendi UNION ALL
+sorgularıyla, çoğu zaman ürün ürün, yıllarca satırı yeniden toplayarak
+hesaplıyordu. Bu modül o toplamı bir kez yerel SQLite dosyasına indirir:
+
+  (esas, UrunId, gün, kaynak) → adet, tutar, iade_adet, iade_tutar, islem
+
+  esas   : gün hangi tarihe göre: 'kayit' (RxKayitTarihi — Botanik Guide),
+           'recete' (RxReceteTarihi), 'islem' (RxIslemTarihi). Her esas ayrı
+           tutulur; tüketici bugünkü sorgusunun esasını kullanır, sonuç
+           değişmez. Bir esas ilk istendiğinde kurulur.
+  kaynak : 0 = reçeteli (ReceteIlaclari), 1 = elden (EldenIlaclari)
+  adet/tutar        : iade olmayan kalemler (RIAdet / RIToplam)
+  iade_adet/tutar   : RIIade ≠ 0 kalemler
+  islem             : iade olmayan kalem satırı sayısı
+
+Besleme (EOS tarafı SADECE SELECT — BotanikDB.sorgu_calistir guard'ı):
+  - İlk kurulum: son `gecmis_gun` gün, ay ay `GROUP BY UrunId, gün`.
+  - Artımlı yenileme: son `geri_gun` günde KAYDEDİLEN satırların düştüğü en
+    eski esas gününden bugüne kadar olan hücreler yeniden toplanıp tek
+    transaction'da değiştirilir (geç gelen silme/iade/adet düzeltmeleri,
+    geriye tarihli reçeteler).
+  - Kaynak hata verirse (boş liste + son_sorgu_hatasi) KupSenkronHatasi;
+    küpte hiçbir şey değişmez.
+
+Sorgu: küp belleğe sütun dizileri (numpy) olarak yüklenir; toplam, dönemsel
+(gün/hafta/ay) döküm, N aylık pencere, eşdeğer grubu toplamları milisaniye
+mertebesinde hesaplanır. Yenilemeden sonra bellek görüntüsü tazelenir.
+
+Küp dosyası EczAsist'in kendi dosyasıdır; Botanik EOS'a yazma yoktur.
+
+Kullanım:
+    kup = SatisKupu()
+    kup.yenile(db, 'kayit')                          # ya da arka_plan_baslat(db)
+    kup.donemsel([123, 456], bas=date(2026, 1, 1))   # {UrunId: {'2026-01': 12, ...}}
+    kup.grup_toplam({'ESD-7': [123, 456]}, bas=ay_basi(6), donem='ay')
+"""
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from sql_tarih_araligi import aralik_kosulu
+
+logger = logging.getLogger(__name__)
+
+_SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+VARSAYILAN_YOL = os.path.join(_SCRIPT_DIR, "satis_kupu.db")
+
+VARSAYILAN_GECMIS_GUN = 3 * 366       # ilk kurulum derinliği
+VARSAYILAN_GERI_GUN = 35              # ay sonu teyit/iade düzeltmeleri dahil
+VARSAYILAN_MAKS_YAS_SN = 6 * 3600     # daha eski küp rapora kullanılmaz
+VARSAYILAN_ARALIK_SN = 15 * 60        # arka plan yenileme aralığı
+
+# esas → tarih kolonu (ReceteAna ve EldenAna'da aynı ad)
+ESASLAR = {
+    'kayit': 'RxKayitTarihi',
+    'recete': 'RxReceteTarihi',
+    'islem': 'RxIslemTarihi',
+}
+
+# kaynak kodu → (ad, ilaç tablosu, ana tablo)
+KAYNAKLAR = {
+    0: ('recete', 'ReceteIlaclari', 'ReceteAna'),
+    1: ('elden', 'EldenIlaclari', 'EldenAna'),
+}
+_KAYNAK_KODU = {ad: kod for kod, (ad, _, _) in KAYNAKLAR.items()}
+
+OLCULER = ('adet', 'tutar', 'iade_adet', 'iade_tutar', 'islem')
+_EPOCH = date(1970, 1, 1)
+_DILIM_ESIGI = 256   # bundan az ürün sorgusunda tam tarama yerine ikili arama
+_DURUM_ONBELLEK_SN = 30
+_DONEM_BIT = 24      # (UrunId << 24 | dönem no) tek int64 anahtar
+
+TarihLike = Union[date, datetime, str, None]
+
+
+class KupSenkronHatasi(Exception):
+    """Kaynak (EOS) sorgusu hata verdi — yenileme yarıda bırakıldı."""
+
+
+def _gun(deger: TarihLike) -> Optional[date]:
+    if deger is None:
+        return None
+    if isinstance(deger, datetime):
+        return deger.date()
+    if isinstance(deger, date):
+        return deger
+    metin = str(deger).strip()
+    if len(metin) == 8 and metin.isdigit():
+        return date(int(metin[:4]), int(metin[4:6]), int(metin[6:8]))
+    return date.fromisoformat(metin[:10])
+
+
+def _epoch_gun(deger: date) -> int:
+    return (deger - _EPOCH).days
+
+
+def ay_basi(geri_ay: int = 0, bugun: TarihLike = None) -> date:
+    """Bu aydan `geri_ay` önceki ayın ilk günü (0 = bu ayın 1'i)."""
+    b = _gun(bugun) or date.today()
+    ay = b.year * 12 + b.month - 1 - geri_ay
+    return date(ay // 12, ay % 12 + 1, 1)
+
+
+def _ay_etiketi(ay_no: int) -> str:
+    return f"{ay_no // 12 + 1970:04d}-{ay_no % 12 + 1:02d}"
+
+
+def _sayi(deger: float) -> Union[int, float]:
+    """SUM(int) sonucu gibi görünsün: tam sayıysa int."""
+    d = float(deger)
+    return int(d) if d.is_integer() else d
+
+
+def _kup_sql(esas: str, kaynak: int) -> Tuple[str, str]:
+    """(SELECT gövdesi, tarih kolonu) — WHERE'e aralık koşulu eklenir."""
+    _, ilac_tablo, ana_tablo = KAYNAKLAR[kaynak]
+    kolon = f"a.{ESASLAR[esas]}"
+    iade = "ISNULL(i.RIIade, 0) = 0"
+    sql = (
+        f"SELECT i.RIUrunId AS UrunId, CAST({kolon} AS date) AS Gun, "
+        f"SUM(CASE WHEN {iade} THEN i.RIAdet ELSE 0 END) AS Adet, "
+        f"SUM(CASE WHEN {iade} THEN ISNULL(i.RIToplam, 0) ELSE 0 END) AS Tutar, "
+        f"SUM(CASE WHEN {iade} THEN 0 ELSE i.RIAdet END) AS IadeAdet, "
+        f"SUM(CASE WHEN {iade} THEN 0 ELSE ISNULL(i.RIToplam, 0) END) AS IadeTutar, "
+        f"SUM(CASE WHEN {iade} THEN 1 ELSE 0 END) AS Islem "
+        f"FROM {ilac_tablo} i JOIN {ana_tablo} a ON i.RIRxId = a.RxId "
+        f"WHERE a.RxSilme = 0 AND i.RISilme = 0 AND {{aralik}} "
+        f"GROUP BY i.RIUrunId, CAST({kolon} AS date)")
+    return sql, kolon
+
+
+class _Bellek:
+    """Bir esasın sütun dizileri — (urun, gun) sıralı."""
+
+    __slots__ = ('urun', 'gun', 'kaynak', 'olcu', 'bas', 'son')
+
+    def __init__(self, satirlar: List[tuple], bas: date, son: date):
+        n = len(satirlar)
+        self.bas, self.son = bas, son
+        self.urun = np.fromiter((r[0] for r in satirlar), dtype=np.int64, count=n)
+        self.gun = np.array([r[1] for r in satirlar], dtype='datetime64[D]').astype(np.int64) \
+            if n else np.empty(0, dtype=np.int64)
+        self.kaynak = np.fromiter((r[2] for r in satirlar), dtype=np.int8, count=n)
+        self.olcu = {ad: np.fromiter((r[3 + i] or 0 for r in satirlar),
+                                     dtype=np.float64, count=n)
+                     for i, ad in enumerate(OLCULER)}
+
+
+class SatisKupu:
+    """UrunId × gün satış küpü (yerel SQLite + bellek içi sütun görüntüsü).
+
+    Args:
+        yol: SQLite dosyası
+        gecmis_gun: İlk kurulumda kaç gün geriye gidilir
+        geri_gun: Artımlı yenilemede yeniden toplanan kayıt penceresi (gün)
+        maks_yas_sn: Bundan eski yenilenmiş küp kullanilabilir_mi → False
+    """
+
+    def __init__(self, yol: str = VARSAYILAN_YOL,
+                 gecmis_gun: int = VARSAYILAN_GECMIS_GUN,
+                 geri_gun: int = VARSAYILAN_GERI_GUN,
+                 maks_yas_sn: float = VARSAYILAN_MAKS_YAS_SN):
+        self.yol = yol
+        self.gecmis_gun = int(gecmis_gun)
+        self.geri_gun = int(geri_gun)
+        self.maks_yas_sn = maks_yas_sn
+        self._yenileme_kilidi = threading.Lock()
+        self._bellek_kilidi = threading.Lock()
+        self._bellek: Dict[str, _Bellek] = {}
+        self._dur = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._durum_onbellek: Optional[Tuple[float, Dict[str, Dict[str, Any]]]] = None
+        with self._baglan() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kup ("
+                " esas TEXT NOT NULL, UrunId INTEGER NOT NULL, gun TEXT NOT NULL,"
+                " kaynak INTEGER NOT NULL, adet REAL, tutar REAL, iade_adet REAL,"
+                " iade_tutar REAL, islem INTEGER,"
+                " PRIMARY KEY (esas, UrunId, gun, kaynak)) WITHOUT ROWID")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_kup_gun ON kup (esas, gun)")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS kup_durum ("
+                " esas TEXT PRIMARY KEY, bas TEXT, son_yenileme TEXT, satir INTEGER)")
+
+    def _baglan(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.yol, timeout=60)
+        conn.execute("PRAGMA journal_mode=WAL")  # okuyucular yenilemeyi beklemez
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # ── durum ───────────────────────────────────────────────────────────
+
+    def durum(self) -> Dict[str, Dict[str, Any]]:
+        """Esas başına kapsama başlangıcı, son yenileme zamanı ve hücre sayısı."""
+        conn = sqlite3.connect(self.yol, timeout=60)
+        try:
+            return {r[0]: {"bas": r[1], "son_yenileme": r[2], "satir": r[3]}
+                    for r in conn.execute("SELECT * FROM kup_durum")}
+        finally:
+            conn.close()
+
+    def kullanilabilir_mi(self, esas: str = 'kayit', bas: TarihLike = None) -> bool:
+        """Esas kurulmuş, maks_yas_sn içinde yenilenmiş ve `bas` gününü kapsıyor mu?"""
+        # Tüketiciler ürün başına sorabilir: durum kısa süre bellekte tutulur
+        # (başka süreç yenilediyse en geç _DURUM_ONBELLEK_SN sonra görülür)
+        onbellek = self._durum_onbellek
+        if onbellek is None or time.monotonic() - onbellek[0] > _DURUM_ONBELLEK_SN:
+            onbellek = self._durum_onbellek = (time.monotonic(), self.durum())
+        d = onbellek[1].get(esas)
+        if not d or not d["son_yenileme"]:
+            return False
+        if datetime.fromisoformat(d["son_yenileme"]) < \
+                datetime.now() - timedelta(seconds=self.maks_yas_sn):
+            return False
+        istenen = _gun(bas)
+        return istenen is None or istenen >= date.fromisoformat(d["bas"])
+
+    # ── besleme ─────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _kaynaktan(kaynak, sql: str, params) -> List[Dict]:
+        satirlar = kaynak.sorgu_calistir(sql, tuple(params) or None)
+        hata = getattr(kaynak, "son_sorgu_hatasi", None)
+        if hata:
+            raise KupSenkronHatasi(hata)
+        return satirlar
+
+    def _topla(self, kaynak, esas: str, bas: date, bit: date) -> List[tuple]:
+        """[bas, bit) esas günleri için küp hücreleri (kaynaktan, ay ay)."""
+        hucreler: List[tuple] = []
+        for kod in KAYNAKLAR:
+            sablon, kolon = _kup_sql(esas, kod)
+            parca_bas = bas
+            while parca_bas < bit:
+                parca_bit = min(bit, ay_basi(-1, parca_bas))
+                aralik, params = aralik_kosulu(kolon, parca_bas, parca_bit)
+                for r in self._kaynaktan(kaynak, sablon.format(aralik=aralik), params):
+                    gun = _gun(r["Gun"])
+                    if r["UrunId"] is None or gun is None:
+                        continue
+                    hucreler.append((
+                        esas, int(r["UrunId"]), gun.isoformat(), kod,
+                        float(r["Adet"] or 0), float(r["Tutar"] or 0),
+                        float(r["IadeAdet"] or 0), float(r["IadeTutar"] or 0),
+                        int(r["Islem"] or 0)))
+                parca_bas = parca_bit
+        return hucreler
+
+    def _yeniden_baslangic(self, kaynak, esas: str, sinir: date) -> date:
+        """Son geri_gun'de kaydedilen satırların en eski esas günü (≤ sinir)."""
+        if esas == 'kayit':
+            return sinir
+        en_eski = sinir
+        for _, _, ana_tablo in KAYNAKLAR.values():
+            aralik, params = aralik_kosulu("RxKayitTarihi", sinir)
+            r = self._kaynaktan(
+                kaynak, f"SELECT MIN(CAST({ESASLAR[esas]} AS date)) AS EnEski "
+                        f"FROM {ana_tablo} WHERE {aralik}", params)
+            gun = _gun(r[0]["EnEski"]) if r and r[0].get("EnEski") else None
+            if gun is not None and gun < en_eski:
+                en_eski = gun
+        return en_eski
+
+    def yenile(self, kaynak, esas: str = 'kayit', tam: bool = False) -> int:
+        """Kaynaktan (BotanikDB — SADECE SELECT) küpü güncelle.
+
+        Args:
+            esas: 'kayit' / 'recete' / 'islem'
+            tam: True → bu esası baştan kur (gecmis_gun)
+
+        Returns:
+            Yazılan hücre sayısı
+        Raises:
+            KupSenkronHatasi: Kaynak sorgusu hata verdiyse (küp değişmez).
+        """
+        if esas not in ESASLAR:
+            raise ValueError(f"Bilinmeyen esas: {esas}")
+        with self._yenileme_kilidi:
+            t0 = time.perf_counter()
+            bugun = date.today()
+            bit = bugun + timedelta(days=1)
+            onceki = self.durum().get(esas)
+            if tam or not onceki:
+                kapsama = bugun - timedelta(days=self.gecmis_gun)
+                bas = kapsama
+            else:
+                kapsama = date.fromisoformat(onceki["bas"])
+                bas = max(kapsama, self._yeniden_baslangic(
+                    kaynak, esas, bugun - timedelta(days=self.geri_gun)))
+            hucreler = self._topla(kaynak, esas, bas, bit)
+            conn = self._baglan()
+            try:
+                with conn:
+                    conn.execute("DELETE FROM kup WHERE esas = ? AND gun >= ?",
+                                 (esas, bas.isoformat()))
+                    conn.executemany("INSERT INTO kup VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                                     hucreler)
+                    satir = conn.execute("SELECT COUNT(*) FROM kup WHERE esas = ?",
+                                         (esas,)).fetchone()[0]
+                    conn.execute(
+                        "INSERT OR REPLACE INTO kup_durum VALUES (?, ?, ?, ?)",
+                        (esas, kapsama.isoformat(),
+                         datetime.now().replace(microsecond=0).isoformat(sep=" "), satir))
+            finally:
+                conn.close()
+            with self._bellek_kilidi:
+                self._bellek.pop(esas, None)
+            self._durum_onbellek = None
+            logger.info("Satış küpü %s: %s → bugün, %d hücre (%.1f sn)",
+                        esas, bas, len(hucreler), time.perf_counter() - t0)
+            return len(hucreler)
+
+    def arka_plan_baslat(self, kaynak, esaslar: Iterable[str] = ('kayit',),
+                         aralik_sn: float = VARSAYILAN_ARALIK_SN) -> None:
+        """Daemon thread'de periyodik yenileme (ilk yenileme hemen)."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._dur.clear()
+        esaslar = tuple(esaslar)
+
+        def _dongu():
+            while not self._dur.is_set():
+                for esas in esaslar:
+                    try:
+                        self.yenile(kaynak, esas)
+                    except Exception as e:
+                        logger.warning("Satış küpü yenileme hatası (%s): %s", esas, e)
+                self._dur.wait(aralik_sn)
+
+        self._thread = threading.Thread(target=_dongu, name="SatisKupuYenile", daemon=True)
+        self._thread.start()
+
+    def arka_plan_durdur(self) -> None:
+        self._dur.set()
+
+    # ── sorgu ───────────────────────────────────────────────────────────
+
+    def _veri(self, esas: str) -> _Bellek:
+        with self._bellek_kilidi:
+            bellek = self._bellek.get(esas)
+            if bellek is not None:
+                return bellek
+            conn = sqlite3.connect(f"file:{self.yol}?mode=ro", uri=True, timeout=60)
+            try:
+                satirlar = conn.execute(
+                    f"SELECT UrunId, gun, kaynak, {', '.join(OLCULER)} FROM kup "
+                    f"WHERE esas = ? ORDER BY UrunId, gun", (esas,)).fetchall()
+                d = conn.execute("SELECT bas FROM kup_durum WHERE esas = ?",
+                                 (esas,)).fetchone()
+            finally:
+                conn.close()
+            bas = date.fromisoformat(d[0]) if d else date.today()
+            bellek = _Bellek(satirlar, bas, date.today())
+            self._bellek[esas] = bellek
+            return bellek
+
+    def _secim(self, v: _Bellek, urun_ids, bas: TarihLike, bit: TarihLike,
+               kaynak: Optional[str], olcu: str) -> np.ndarray:
+        """Filtreye uyan satırların indeksleri (urun, gun sıralı)."""
+        if olcu not in OLCULER:
+            raise ValueError(f"Bilinmeyen ölçü: {olcu}")
+        if urun_ids is None:
+            secim = np.arange(len(v.urun))
+        else:
+            ids = np.unique(np.fromiter((int(u) for u in urun_ids if u is not None),
+                                        dtype=np.int64))
+            if len(ids) <= _DILIM_ESIGI:
+                # Diziler UrunId'ye göre sıralı: ürün başına ikili arama + dilim
+                sol = np.searchsorted(v.urun, ids, 'left')
+                sag = np.searchsorted(v.urun, ids, 'right')
+                dilimler = [np.arange(a, b) for a, b in zip(sol, sag) if b > a]
+                secim = np.concatenate(dilimler) if dilimler else np.empty(0, np.int64)
+            else:
+                secim = np.flatnonzero(np.isin(v.urun, ids))
+        # Satır var = o ölçüde kalem var (eski GROUP BY'ın satır döndürdüğü günler)
+        maske = (v.olcu['islem'][secim] > 0) if not olcu.startswith('iade') \
+            else (v.olcu['iade_adet'][secim] != 0)
+        b, e = _gun(bas), _gun(bit)
+        if b is not None:
+            maske &= v.gun[secim] >= _epoch_gun(b)
+        if e is not None:
+            maske &= v.gun[secim] < _epoch_gun(e)
+        if kaynak is not None:
+            maske &= v.kaynak[secim] == _KAYNAK_KODU[kaynak]
+        return secim[maske]
+
+    @staticmethod
+    def _donem_anahtari(gun: np.ndarray, donem: str) -> Tuple[np.ndarray, callable]:
+        """Gün dizisi → (dönem numarası, numara → etiket)."""
+        if donem == 'ay':
+            ay = gun.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+            return ay, _ay_etiketi
+        if donem == 'hafta':
+            # 1970-01-05 Pazartesi → hafta numarası; etiket haftanın Pazartesi'si
+            hafta = (gun - 4) // 7
+            return hafta, lambda h: (_EPOCH + timedelta(days=int(h) * 7 + 4)).isoformat()
+        if donem == 'gun':
+            return gun, lambda g: _EPOCH + timedelta(days=int(g))
+        raise ValueError(f"Bilinmeyen dönem: {donem}")
+
+    def toplam(self, urun_ids: Optional[Iterable[int]] = None, bas: TarihLike = None,
+               bit: TarihLike = None, olcu: str = 'adet', kaynak: Optional[str] = None,
+               esas: str = 'kayit') -> Dict[int, Union[int, float]]:
+        """Ürün başına [bas, bit) toplamı — {UrunId: değer} (hareketsiz ürün yok)."""
+        v = self._veri(esas)
+        m = self._secim(v, urun_ids, bas, bit, kaynak, olcu)
+        urunler, ters = np.unique(v.urun[m], return_inverse=True)
+        toplamlar = np.bincount(ters, weights=v.olcu[olcu][m], minlength=len(urunler))
+        return {int(u): _sayi(t) for u, t in zip(urunler, toplamlar)}
+
+    def donemsel(self, urun_ids: Optional[Iterable[int]] = None, bas: TarihLike = None,
+                 bit: TarihLike = None, donem: str = 'ay', olcu: str = 'adet',
+                 kaynak: Optional[str] = None, esas: str = 'kayit'
+                 ) -> Dict[int, Dict[Any, Union[int, float]]]:
+        """Ürün × dönem dökümü — {UrunId: {'2026-01': 12, ...}}.
+
+        donem: 'ay' ('YYYY-MM'), 'hafta' (Pazartesi 'YYYY-MM-DD'), 'gun' (date).
+        Yalnız kalemi olan dönemler döner.
+        """
+        v = self._veri(esas)
+        m = self._secim(v, urun_ids, bas, bit, kaynak, olcu)
+        no, etiket = self._donem_anahtari(v.gun[m], donem)
+        anahtarlar, ters = np.unique((v.urun[m] << _DONEM_BIT) | no, return_inverse=True)
+        toplamlar = np.bincount(ters.ravel(), weights=v.olcu[olcu][m],
+                                minlength=len(anahtarlar))
+        donemler = anahtarlar & ((1 << _DONEM_BIT) - 1)
+        etiketler = {d: etiket(d) for d in np.unique(donemler).tolist()}
+        sonuc: Dict[int, Dict[Any, Union[int, float]]] = {}
+        for u, d, t in zip((anahtarlar >> _DONEM_BIT).tolist(), donemler.tolist(),
+                           toplamlar.tolist()):
+            sonuc.setdefault(u, {})[etiketler[d]] = int(t) if t.is_integer() else t
+        return sonuc
+
+    def gunluk(self, urun_id: int, bas: TarihLike = None, bit: TarihLike = None,
+               olcu: str = 'adet', kaynak: Optional[str] = None,
+               esas: str = 'kayit') -> Dict[date, Union[int, float]]:
+        """Tek ürünün günlük serisi — {date: değer} (reçeteli + elden aynı gün birleşik)."""
+        return self.donemsel([urun_id], bas, bit, 'gun', olcu, kaynak, esas).get(int(urun_id), {})
+
+    def grup_toplam(self, gruplar: Dict[Any, Iterable[int]], bas: TarihLike = None,
+                    bit: TarihLike = None, donem: Optional[str] = None,
+                    olcu: str = 'adet', kaynak: Optional[str] = None,
+                    esas: str = 'kayit') -> Dict[Any, Any]:
+        """Ürün grupları (ör. eşdeğer grubu) toplamı.
+
+        donem None → {grup: değer}; verilirse {grup: {dönem: değer}}.
+        Bir ürün birden çok gruba girebilir.
+        """
+        tum = {int(u) for uyeler in gruplar.values() for u in uyeler}
+        if donem is None:
+            urun = self.toplam(tum, bas, bit, olcu, kaynak, esas)
+            return {g: _sayi(sum(urun.get(int(u), 0) for u in set(uyeler)))
+                    for g, uyeler in gruplar.items()}
+        urun = self.donemsel(tum, bas, bit, donem, olcu, kaynak, esas)
+        sonuc: Dict[Any, Dict[Any, Union[int, float]]] = {}
+        for g, uyeler in gruplar.items():
+            birikim: Dict[Any, float] = {}
+            for u in {int(x) for x in uyeler}:
+                for d, t in urun.get(u, {}).items():
+                    birikim[d] = birikim.get(d, 0) + t
+            sonuc[g] = {d: _sayi(t) for d, t in sorted(birikim.items())}
+        return sonuc
+
+    def pencere(self, urun_ids: Optional[Iterable[int]] = None, ay_sayisi: int = 6,
+                olcu: str = 'adet', kaynak: Optional[str] = None, esas: str = 'kayit',
+                bugun: TarihLike = None) -> Dict[int, Union[int, float]]:
+        """Son N takvim ayı (bu ay dahil) toplamı."""
+        b = _gun(bugun) or date.today()
+        return self.toplam(urun_ids, ay_basi(ay_sayisi - 1, b), b + timedelta(days=1),
+                           olcu, kaynak, esas)
+
+    def urunler(self, bas: TarihLike = None, bit: TarihLike = None,
+                esas: str = 'kayit') -> List[int]:
+        """[bas, bit) içinde satış ya da iade kalemi olan ürünler."""
+        v = self._veri(esas)
+        m = (v.olcu['islem'] > 0) | (v.olcu['iade_adet'] != 0)
+        b, e = _gun(bas), _gun(bit)
+        if b is not None:
+            m &= v.gun >= _epoch_gun(b)
+        if e is not None:
+            m &= v.gun < _epoch_gun(e)
+        return np.unique(v.urun[m]).tolist()
+
+
+_paylasilan: Optional[SatisKupu] = None
+_paylasilan_lock = threading.Lock()
+
+
+def paylasilan_kup(**kw) -> SatisKupu:
+    """Süreç başına tek SatisKupu (aynı dosyaya tek yazıcı, tek bellek görüntüsü)."""
+    global _paylasilan
+    with _paylasilan_lock:
+        if _paylasilan is None:
+            _paylasilan = SatisKupu(**kw)
+        return _paylasilan
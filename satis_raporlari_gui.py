@@ -17,6 +17,8 @@ import threading
 from datetime import datetime, date, timedelta
 from typing import List, Dict, Optional, Tuple
 
+from sanal_tablo import SanalTablo
+
 try:
     from tkcalendar import DateEntry
     TKCALENDAR_AVAILABLE = True
@@ -3664,6 +3666,8 @@ class TopluZamanAnomaliPopup:
         self.parent = parent
         self.db = db
         self.sonuclar: List[Dict] = []
+        # Tabloda gösterilen (sıra no, kayıt) — sanal ızgara iid'i = liste indeksi
+        self._tablo_kayitlari: List[Tuple[int, Dict]] = []
         # Sıralama durumu
         self._son_sirala_sutun: Optional[str] = None
         self._son_sirala_ters: bool = False
@@ -3874,9 +3878,11 @@ class TopluZamanAnomaliPopup:
             )
             self.tree.column(c, width=widths[c], anchor=anchors.get(c, 'w'))
         self.tree.pack(side="left", fill="both", expand=True)
-        sb = ttk.Scrollbar(tab, orient="vertical", command=self.tree.yview)
+        sb = ttk.Scrollbar(tab, orient="vertical")
         sb.pack(side="right", fill="y")
-        self.tree.configure(yscrollcommand=sb.set)
+        # Geniş aralık taraması on binlerce satır döndürebilir: yalnız görünen
+        # pencere Treeview'de tutulur (sanal_tablo)
+        self._grid = SanalTablo(self.tree, self._satir_render, ysb=sb)
 
         self.tree.tag_configure('negatif', background='#FFCDD2')
         self.tree.tag_configure('cok_buyuk', background='#FFAB91')
@@ -3890,19 +3896,16 @@ class TopluZamanAnomaliPopup:
 
     def _secili_detayi_ac(self, _event=None):
         """Seçili anomali satırının RECETE/ELDEN detayını ayrı pencerede aç."""
-        sec = self.tree.selection()
+        sec = self._grid.vurgulananlar()
         if not sec:
             messagebox.showinfo("Seçim yok",
                 "Önce ANOMALİ SATIŞLAR tablosundan bir satır seçin "
                 "(satıra tek tıkla mavi yap, sonra butona bas — "
                 "veya satıra çift-tıkla).")
             return
-        vals = self.tree.item(sec[0], 'values')
-        # Kolon sırası: no, kaynak, rxid, islem, kayit, fark_sn, fark
-        if not vals or len(vals) < 3:
-            return
-        kaynak = (vals[1] or '').strip().upper()
-        rx_id = (vals[2] or '').strip()
+        _, k = self._tablo_kayitlari[int(sec[0])]
+        kaynak = str(k.get('Kaynak') or '').strip().upper()
+        rx_id = str(k.get('RxId') or '').strip()
         if kaynak not in ('RECETE', 'ELDEN') or not rx_id:
             messagebox.showinfo("Geçersiz satır",
                 "Bu satır bir RECETE/ELDEN kaydına karşılık gelmiyor.")
@@ -4363,8 +4366,8 @@ class TopluZamanAnomaliPopup:
                  f"(eşik {esik_sn}sn) — bu işlem dakikalar sürebilir.",
             fg='#C62828',
         )
-        for c in self.tree.get_children():
-            self.tree.delete(c)
+        self._tablo_kayitlari = []
+        self._grid.temizle()
         self.ozet_text.delete('1.0', tk.END)
         self.ozet_text.insert('1.0', "⏳ Tarama sürüyor...")
 
@@ -4401,31 +4404,23 @@ class TopluZamanAnomaliPopup:
         self._tabloyu_doldur_anomali()
 
     def _tabloyu_doldur_anomali(self):
-        """self.sonuclar'ı tabloya yaz; checkbox filtreleri uygulanır."""
-        def _dt_fmt(d):
-            if d is None:
-                return ''
-            if hasattr(d, 'hour'):
-                return d.strftime('%Y-%m-%d %H:%M:%S')
-            if hasattr(d, 'strftime'):
-                return d.strftime('%Y-%m-%d') + ' (saat yok)'
-            return str(d)
+        """self.sonuclar'ı tabloya yaz; checkbox filtreleri uygulanır.
 
-        for c in self.tree.get_children():
-            self.tree.delete(c)
+        Yalnız görünüm sırası kurulur; satır metinleri ekrana gelince
+        _satir_render ile üretilir."""
+
+        def _haric(ad):
+            var = getattr(self, ad, None)
+            return bool(var.get()) if var is not None else False
 
-        don_haric = bool(getattr(self, 'donusum_haric_var',
-                                  tk.BooleanVar(value=False)).get())
-        anti_haric = bool(getattr(self, 'antibiyotik_haric_var',
-                                   tk.BooleanVar(value=False)).get())
-        bank_haric = bool(getattr(self, 'is_bankasi_haric_var',
-                                   tk.BooleanVar(value=False)).get())
-        bez_haric = bool(getattr(self, 'bez_haric_var',
-                                  tk.BooleanVar(value=False)).get())
-        cez_haric = bool(getattr(self, 'cezaevi_haric_var',
-                                  tk.BooleanVar(value=False)).get())
+        don_haric = _haric('donusum_haric_var')
+        anti_haric = _haric('antibiyotik_haric_var')
+        bank_haric = _haric('is_bankasi_haric_var')
+        bez_haric = _haric('bez_haric_var')
+        cez_haric = _haric('cezaevi_haric_var')
 
         idx = 0
+        kayitlar: List[Tuple[int, Dict]] = []
         for k in (self.sonuclar or []):
             if don_haric and k.get('DonusumMu'):
                 continue
@@ -4438,11 +4433,26 @@ class TopluZamanAnomaliPopup:
             if cez_haric and k.get('CezaeviMidir'):
                 continue
             idx += 1
-            i = idx
-            self._tabloyu_satir_ekle(i, k, _dt_fmt)
+            if k.get('FarkSn') is None:
+                continue
+            kayitlar.append((idx, k))
+        self._tablo_kayitlari = kayitlar
+        self._grid.veri_ayarla((str(j) for j in range(len(kayitlar))), konumu_koru=False)
 
-    def _tabloyu_satir_ekle(self, i: int, k: Dict, _dt_fmt):
-        """Tek bir kaydı tabloya ekler — _tabloyu_doldur_anomali'den çağrılır."""
+    @staticmethod
+    def _dt_fmt(d):
+        if d is None:
+            return ''
+        if hasattr(d, 'hour'):
+            return d.strftime('%Y-%m-%d %H:%M:%S')
+        if hasattr(d, 'strftime'):
+            return d.strftime('%Y-%m-%d') + ' (saat yok)'
+        return str(d)
+
+    def _satir_render(self, iid):
+        """Sanal ızgara satır üreticisi → (values, tags)"""
+        i, k = self._tablo_kayitlari[int(iid)]
+        _dt_fmt = self._dt_fmt
         islem = k.get('IslemTarihi')
         kayit = k.get('KayitTarihi')
         kontrol = k.get('KontrolTarihi')
@@ -4450,8 +4460,6 @@ class TopluZamanAnomaliPopup:
         fark_tipi = k.get('FarkTipi') or 'sn'
         kontrol_fark = k.get('KontrolFarkSn')
 
-        if fark is None:
-            return
         islem_s = _dt_fmt(islem)
         kayit_s = _dt_fmt(kayit)
         kontrol_s = _dt_fmt(kontrol) if kontrol is not None else '—'
@@ -4502,11 +4510,11 @@ class TopluZamanAnomaliPopup:
         bez_str = '🩹' if k.get('BezMidir') else ''
         cez_str = '🔒' if k.get('CezaeviMidir') else ''
 
-        self.tree.insert('', 'end', values=(
+        return (
             i, k.get('Kaynak'), k.get('RxId'), islem_s, kayit_s,
             kayit_fark_str, kontrol_s, kontrol_fark_str,
             don_str, anti_str, bank_str, bez_str, cez_str,
-        ), tags=(tag,))
+        ), (tag,)
 
     def _sirala(self, sutun_kod: str):
         """Anomali tablosunu sütuna göre sırala. Aynı sütuna ikinci tıkta
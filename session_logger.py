@@ -1,19 +1,95 @@
 """
 Botanik Bot - Oturum Log Dosyası Yöneticisi
 Her oturumun loglarını ayrı txt dosyasına kaydeder
+
+yaz() çağıran thread'de dosya açıp kapatmaz: kayıt (zaman, seviye, mesaj,
+reçete, adım, süre, thread) kuyruğa atılır, arka plan yazıcı thread'i
+partiler halinde (toplu_boyut kayıt ya da toplu_sure saniye, ERROR hemen)
+yazar. Yanında yapılandırılmış kayıtlar için .jsonl dosyası tutulur; adim()
+ile kaydedilen adım süreleri buradan Chrome trace (chrome://tracing,
+Perfetto) zaman çizelgesine aktarılır. Dosyalar max_boyut'u aşınca döndürülür
+(.txt.1, .jsonl.1 ...); açık loglar çıkışta ve çökme yakalayıcısında
+(crash_yakala) boşaltılır.
 """
 
 from pathlib import Path
 from datetime import datetime
+import atexit
+import json
 import logging
+import queue
+import threading
+import time
+import weakref
 
 logger = logging.getLogger(__name__)
 
+# Boşaltılmamış kayıtları olabilecek açık loglar (çıkış / çökme anında boşaltılır)
+_acik_loggerlar = weakref.WeakSet()
+
+
+def _saat_metni(ts):
+    """Milisaniye dahil zaman formatı: 14:30:25.123"""
+    now = datetime.fromtimestamp(ts)
+    return now.strftime("%H:%M:%S") + f".{now.microsecond // 1000:03d}"
+
+
+def tum_loglari_bosalt(zaman_asimi=2.0):
+    """Açık tüm oturum loglarının kuyruğunu diske yaz (çıkış / çökme)."""
+    for session_logger in list(_acik_loggerlar):
+        try:
+            session_logger.bosalt(zaman_asimi)
+        except Exception:
+            pass
+
+
+atexit.register(tum_loglari_bosalt)
+
+
+def jsonl_parcalari(yol):
+    """Döndürülmüş parçalar dahil .jsonl dosyaları, eskiden yeniye."""
+    yol = Path(yol)
+    parcalar = sorted((p for p in yol.parent.glob(yol.name + ".*") if p.suffix[1:].isdigit()),
+                      key=lambda p: int(p.suffix[1:]), reverse=True)
+    if yol.exists():
+        parcalar.append(yol)
+    return parcalar
+
+
+def kayitlari_oku(yol):
+    """Oturumun yapılandırılmış kayıtları (dict), eskiden yeniye."""
+    for parca in jsonl_parcalari(yol):
+        with open(parca, encoding="utf-8") as f:
+            for satir in f:
+                try:
+                    yield json.loads(satir)
+                except ValueError:
+                    continue  # çökmede yarım kalan satır
+
+
+def chrome_trace(kayitlar, surec_adi="Botanik Bot"):
+    """Kayıtlardan Chrome trace olay listesi: adımlar süreli (X), log satırları anlık (i)."""
+    kayitlar = list(kayitlar)
+    t0 = min((k["ts"] for k in kayitlar), default=0.0)
+    olaylar = [{"name": "process_name", "ph": "M", "pid": 1, "args": {"name": surec_adi}}]
+    for k in kayitlar:
+        args = {"recete": k["recete"]} if k.get("recete") is not None else {}
+        olay = {"pid": 1, "tid": k.get("tid", 0), "ts": round((k["ts"] - t0) * 1e6, 1)}
+        if "adim" in k:
+            args.update(k.get("ek") or {})
+            olay.update(name=k["adim"], cat="adim", ph="X", dur=round(k["sure"] * 1e6, 1))
+        else:
+            olay.update(name=k["mesaj"][:80], cat=k["seviye"], ph="i", s="t")
+        olay["args"] = args
+        olaylar.append(olay)
+    return {"traceEvents": olaylar, "displayTimeUnit": "ms"}
+
 
 class SessionLogger:
     """Oturum loglarını dosyaya yazan sınıf"""
 
-    def __init__(self, oturum_id, grup, log_klasoru="oturum_loglari"):
+    def __init__(self, oturum_id, grup, log_klasoru="oturum_loglari", toplu_boyut=256,
+                 toplu_sure=0.5, max_boyut=5 * 1024 * 1024, yedek_sayisi=5):
         import os
         script_dir = os.path.dirname(os.path.abspath(__file__))
         self.log_klasoru = Path(script_dir) / log_klasoru
@@ -30,10 +106,28 @@ class SessionLogger:
         timestamp = self.baslangic_zamani.strftime("%Y%m%d_%H%M%S")
         dosya_adi = f"oturum_{oturum_id}_Grup{grup}_{timestamp}.txt"
         self.log_dosya = self.log_klasoru / dosya_adi
+        self.jsonl_dosya = self.log_dosya.with_suffix(".jsonl")
+
+        # Yazıcı thread ayarları
+        self.toplu_boyut = toplu_boyut
+        self.toplu_sure = toplu_sure
+        self.max_boyut = max_boyut
+        self.yedek_sayisi = yedek_sayisi
+        # Sonraki kayıtlara eklenecek reçete no (akış okuyunca günceller)
+        self.aktif_recete = None
+        self._kuyruk = queue.SimpleQueue()
+        self._txt = None
+        self._jsonl = None
+        self._kapali = False
 
         # Başlık yaz
         self.baslik_yaz()
 
+        self._yazici = threading.Thread(target=self._yazici_dongu, daemon=True,
+                                        name=f"SessionLogger-{oturum_id}")
+        self._yazici.start()
+        _acik_loggerlar.add(self)
+
     def baslik_yaz(self):
         """Log dosyasının başlığını yaz"""
         try:
@@ -49,18 +143,34 @@ class SessionLogger:
         except Exception as e:
             logger.error(f"Log dosyası başlık yazma hatası: {e}")
 
-    def yaz(self, mesaj, seviye="INFO"):
-        """Log dosyasına mesaj yaz"""
-        try:
-            # Milisaniye dahil zaman formatı
-            now = datetime.now()
-            zaman = now.strftime("%H:%M:%S") + f".{now.microsecond // 1000:03d}"
-            satir = f"[{zaman}] [{seviye}] {mesaj}\n"
+    def yaz(self, mesaj, seviye="INFO", recete=None, adim=None, sure=None):
+        """Log dosyasına mesaj yaz (kuyruğa at; dosyaya yazıcı thread yazar)"""
+        if recete is None:
+            recete = self.aktif_recete
+        if self._kapali:
+            self._senkron_yaz(f"[{_saat_metni(time.time())}] [{seviye}] {mesaj}\n")
+            return
+        ek = {"adim": adim, "sure": sure} if adim is not None or sure is not None else None
+        self._kuyruk.put(("satir", time.time(), seviye, mesaj, ek, recete, None,
+                          threading.get_ident()))
 
-            with open(self.log_dosya, 'a', encoding='utf-8') as f:
-                f.write(satir)
-        except Exception as e:
-            logger.error(f"Log yazma hatası: {e}")
+    def adim(self, ad, sure, recete=None, baslangic=None, **ek):
+        """Adım süresini (span) yapılandırılmış loga kaydet — txt'ye yazılmaz.
+
+        Args:
+            ad: adım adı (trace'te olay adı)
+            sure: adım süresi (sn)
+            baslangic: adımın başladığı time.time(); yoksa şimdi - sure
+            ek: trace'te olay argümanları (ör. timing anahtarı)
+        """
+        if self._kapali:
+            return
+        if recete is None:
+            recete = self.aktif_recete
+        if baslangic is None:
+            baslangic = time.time() - sure
+        self._kuyruk.put(("adim", baslangic, "ADIM", ad, ek or None, recete, sure,
+                          threading.get_ident()))
 
     def info(self, mesaj):
         """INFO seviyesinde log yaz"""
@@ -74,6 +184,10 @@ class SessionLogger:
         """ERROR seviyesinde log yaz"""
         self.yaz(mesaj, "ERROR")
 
+    def hata(self, mesaj):
+        """ERROR seviyesinde log yaz (error ile aynı)"""
+        self.yaz(mesaj, "ERROR")
+
     def basari(self, mesaj):
         """BAŞARI seviyesinde log yaz"""
         self.yaz(mesaj, "BAŞARI")
@@ -89,29 +203,194 @@ class SessionLogger:
             dakika = int(toplam_saniye // 60)
             saniye = int(toplam_saniye % 60)
 
-            with open(self.log_dosya, 'a', encoding='utf-8') as f:
-                f.write("\n" + "=" * 80 + "\n")
-                f.write("OTURUM ÖZETİ\n")
-                f.write("=" * 80 + "\n")
-                f.write(f"Bitiş: {bitis_zamani.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                f.write(f"Toplam Süre: {dakika} dakika {saniye} saniye\n")
-                f.write(f"Toplam Reçete: {toplam_recete}\n")
-                f.write(f"Toplam Takip: {toplam_takip}\n")
-                f.write(f"Ortalama Reçete Süresi: {toplam_sure:.2f} saniye\n")
-                f.write(f"Yeniden Başlatma: {yeniden_baslatma} kez\n")
-                f.write(f"Taskkill: {taskkill} kez\n")
-                f.write("=" * 80 + "\n")
+            metin = ("\n" + "=" * 80 + "\n"
+                     "OTURUM ÖZETİ\n"
+                     + "=" * 80 + "\n"
+                     f"Bitiş: {bitis_zamani.strftime('%Y-%m-%d %H:%M:%S')}\n"
+                     f"Toplam Süre: {dakika} dakika {saniye} saniye\n"
+                     f"Toplam Reçete: {toplam_recete}\n"
+                     f"Toplam Takip: {toplam_takip}\n"
+                     f"Ortalama Reçete Süresi: {toplam_sure:.2f} saniye\n"
+                     f"Yeniden Başlatma: {yeniden_baslatma} kez\n"
+                     f"Taskkill: {taskkill} kez\n"
+                     + "=" * 80 + "\n")
+            self._ham_yaz(metin)
 
             logger.info(f"✓ Oturum özeti yazıldı: {self.log_dosya.name}")
         except Exception as e:
             logger.error(f"Özet yazma hatası: {e}")
 
+    def bosalt(self, zaman_asimi=5.0):
+        """Kuyruktaki kayıtlar diske yazılana kadar bekle.
+
+        Returns:
+            bool: süre dolmadan boşaldıysa True
+        """
+        if self._kapali:
+            return True
+        tamam = threading.Event()
+        self._kuyruk.put(("bosalt", tamam))
+        return tamam.wait(zaman_asimi)
+
     def kapat(self):
         """Log dosyasını kapat (son satır ekle)"""
+        if self._kapali:
+            return
+        self._ham_yaz(f"\n[{_saat_metni(time.time())}] Oturum log dosyası kapatıldı.\n")
+        # Bayrak "kapat"tan ÖNCE: bundan sonraki yaz()/adim() ölü kuyruğa
+        # düşmez, senkron yola gider; ikinci kapat() hemen döner
+        self._kapali = True
+        _acik_loggerlar.discard(self)
         try:
-            now = datetime.now()
-            zaman = now.strftime("%H:%M:%S") + f".{now.microsecond // 1000:03d}"
-            with open(self.log_dosya, 'a', encoding='utf-8') as f:
-                f.write(f"\n[{zaman}] Oturum log dosyası kapatıldı.\n")
+            tamam = threading.Event()
+            self._kuyruk.put(("kapat", tamam))
+            tamam.wait(5.0)
         except Exception as e:
             logger.error(f"Log kapatma hatası: {e}")
+
+    def trace_disa_aktar(self, hedef=None):
+        """Oturumun adım zaman çizelgesini Chrome trace JSON'u olarak yaz.
+
+        Returns:
+            Path: yazılan dosya (varsayılan: <log>.trace.json)
+        """
+        self.bosalt()
+        hedef = Path(hedef) if hedef else self.log_dosya.with_suffix(".trace.json")
+        trace = chrome_trace(kayitlari_oku(self.jsonl_dosya),
+                             f"Oturum {self.oturum_id} - Grup {self.grup}")
+        with open(hedef, "w", encoding="utf-8") as f:
+            json.dump(trace, f, ensure_ascii=False)
+        logger.info(f"✓ Oturum zaman çizelgesi yazıldı: {hedef.name}")
+        return hedef
+
+    # ── Yazıcı thread ────────────────────────────────────────────────────
+
+    def _ham_yaz(self, metin):
+        if self._kapali:
+            self._senkron_yaz(metin)
+        else:
+            self._kuyruk.put(("ham", time.time(), None, metin, None, None, None, None))
+
+    def _senkron_yaz(self, metin):
+        try:
+            with open(self.log_dosya, 'a', encoding='utf-8') as f:
+                f.write(metin)
+        except Exception as e:
+            logger.error(f"Log yazma hatası: {e}")
+
+    def _yazici_dongu(self):
+        parti = []
+        ilk = 0.0
+        while True:
+            try:
+                if parti:
+                    oge = self._kuyruk.get(timeout=max(0.0, self.toplu_sure - (time.monotonic() - ilk)))
+                else:
+                    oge = self._kuyruk.get()
+            except queue.Empty:
+                oge = None
+
+            if oge is not None and oge[0] in ("bosalt", "kapat"):
+                bekleyenler = [oge[1]]
+                if oge[0] == "kapat":
+                    # _kapali'yı kapat'tan hemen önce geçen yaz()/adim() kayıtları
+                    # "kapat"ın arkasına düşebilir: kaybolmasınlar
+                    kalanlar, olaylar = self._kalanlari_al()
+                    parti.extend(kalanlar)
+                    bekleyenler.extend(olaylar)
+                self._parti_yaz(parti)
+                parti = []
+                if oge[0] == "kapat":
+                    self._dosyalari_kapat()
+                    for olay in bekleyenler:
+                        olay.set()
+                    return
+                oge[1].set()
+                continue
+
+            if oge is not None:
+                if not parti:
+                    ilk = time.monotonic()
+                parti.append(oge)
+                if len(parti) < self.toplu_boyut and oge[2] != "ERROR":
+                    continue
+            self._parti_yaz(parti)
+            parti = []
+
+    def _kalanlari_al(self):
+        """Kuyrukta kalanları bekletmeden al → (kayıtlar, bosalt/kapat olayları)."""
+        kalanlar, olaylar = [], []
+        while True:
+            try:
+                oge = self._kuyruk.get_nowait()
+            except queue.Empty:
+                return kalanlar, olaylar
+            if oge[0] in ("bosalt", "kapat"):
+                olaylar.append(oge[1])
+            else:
+                kalanlar.append(oge)
+
+    def _parti_yaz(self, parti):
+        if not parti:
+            return
+        try:
+            txt, jsonl = [], []
+            for tur, ts, seviye, mesaj, ek, recete, sure, tid in parti:
+                if tur == "ham":
+                    txt.append(mesaj)
+                    continue
+                if tur == "satir":
+                    txt.append(f"[{_saat_metni(ts)}] [{seviye}] {mesaj}\n")
+                    kayit = {"ts": round(ts, 6), "seviye": seviye, "mesaj": mesaj}
+                    if ek:
+                        kayit.update((k, v) for k, v in ek.items() if v is not None)
+                else:
+                    kayit = {"ts": round(ts, 6), "seviye": seviye, "adim": mesaj,
+                             "sure": round(sure, 6)}
+                    if ek:
+                        kayit["ek"] = ek
+                if recete is not None:
+                    kayit["recete"] = recete
+                kayit["tid"] = tid
+                jsonl.append(json.dumps(kayit, ensure_ascii=False) + "\n")
+
+            if self._txt is None:
+                self._txt = open(self.log_dosya, 'a', encoding='utf-8')
+                self._jsonl = open(self.jsonl_dosya, 'a', encoding='utf-8')
+            self._txt.write("".join(txt))
+            self._jsonl.write("".join(jsonl))
+            self._txt.flush()
+            self._jsonl.flush()
+            if self.max_boyut and (self._txt.tell() > self.max_boyut
+                                   or self._jsonl.tell() > self.max_boyut):
+                self._dondur()
+        except Exception as e:
+            logger.error(f"Log yazma hatası: {e}")
+
+    def _dondur(self):
+        """Dosyaları .1, .2 ... olarak döndür; en eski yedek silinir."""
+        self._dosyalari_kapat()
+        for yol in (self.log_dosya, self.jsonl_dosya):
+            for i in range(self.yedek_sayisi, 0, -1):
+                eski = Path(f"{yol}.{i}")
+                if not eski.exists():
+                    continue
+                if i == self.yedek_sayisi:
+                    eski.unlink()
+                else:
+                    eski.replace(f"{yol}.{i + 1}")
+            if not yol.exists():
+                continue
+            if self.yedek_sayisi:
+                yol.replace(f"{yol}.1")
+            else:
+                yol.unlink()
+
+    def _dosyalari_kapat(self):
+        for f in (self._txt, self._jsonl):
+            if f is not None:
+                try:
+                    f.close()
+                except Exception:
+                    pass
+        self._txt = self._jsonl = None
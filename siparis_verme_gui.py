@@ -1271,6 +1271,22 @@ class SiparisVermeGUI:
                 'kazanc_maksimum': float
             }
         """
+        return self._zam_oncesi_optimum_toplu_hesapla(
+            [(maliyet, aylik_ort, mevcut_stok)], zam_tarihi, zam_orani, faiz_yillik, depo_vade
+        )[0]
+
+    def _zam_oncesi_optimum_toplu_hesapla(self, kalemler: list, zam_tarihi: date,
+                                          zam_orani: float, faiz_yillik: float,
+                                          depo_vade: int) -> list:
+        """
+        Sipariş listesinin tamamı için _zam_oncesi_optimum_hesapla.
+
+        Args:
+            kalemler: [(maliyet, aylik_ort, mevcut_stok), ...]
+
+        Returns:
+            list[dict]: kalemlerle aynı sırada karar noktaları
+        """
         bos_sonuc = {
             'verimlilik': 0, 'verimlilik_roi': 0, 'verimlilik_kazanc': 0,
             'pareto': 0, 'pareto_kazanc': 0,
@@ -1278,111 +1294,26 @@ class SiparisVermeGUI:
             'maksimum': 0, 'kazanc_maksimum': 0
         }
 
-        if not zam_tarihi or zam_orani <= 0 or aylik_ort <= 0:
-            return bos_sonuc
+        sonuclar = [dict(bos_sonuc) for _ in kalemler]
+        if not zam_tarihi or zam_orani <= 0:
+            return sonuclar
 
         bugun = date.today()
         zam_gun = (zam_tarihi - bugun).days
         if zam_gun <= 0:
-            return bos_sonuc
-
-        # Gün bazlı faiz hesabı (smooth hesaplama için)
-        aylik_faiz = (faiz_yillik / 100) / 12
-        gunluk_faiz = (1 + aylik_faiz) ** (1/30) - 1
-        gunluk_sarf = aylik_ort / 30
-
-        # 12 aya kadar test et
-        max_test = int(aylik_ort * 12)
-        if max_test < 10:
-            max_test = 100
-
-        # Tüm miktarlar için kazanç hesapla
-        kazanclar = []
-        for test_miktar in range(0, max_test + 1):
-            if test_miktar == 0:
-                kazanclar.append(0)
-                continue
-
-            kalan_mevcut = mevcut_stok
-            kalan_yeni = test_miktar
-            npv_aylik = 0
-
-            gun = 0
-            while kalan_yeni > 0 and gun < 720:
-                harcanan = gunluk_sarf
-                mevcut_harcanan = min(kalan_mevcut, harcanan)
-                kalan_mevcut -= mevcut_harcanan
-                yeni_harcanan = min(harcanan - mevcut_harcanan, kalan_yeni)
-
-                if yeni_harcanan > 0:
-                    if gun < zam_gun:
-                        fiyat = maliyet
-                    else:
-                        fiyat = maliyet * (1 + zam_orani / 100)
-
-                    # Gün bazlı iskonto
-                    odeme_gun = gun + 30 + depo_vade
-                    odeme = yeni_harcanan * fiyat
-                    iskonto = (1 + gunluk_faiz) ** odeme_gun
-                    npv_aylik += odeme / iskonto
-                    kalan_yeni -= yeni_harcanan
-                gun += 1
-
-            # Toplu alım NPV
-            npv_toplu = (test_miktar * maliyet) / ((1 + gunluk_faiz) ** (30 + depo_vade))
-            kazanc = npv_aylik - npv_toplu
-            kazanclar.append(kazanc)
-
-        # ===== KARAR NOKTALARI =====
-
-        # 1. OPTİMUM (Pik) - Maksimum kazanç
-        optimum_miktar = 0
-        en_iyi_kazanc = 0
-        for i, k in enumerate(kazanclar):
-            if k > en_iyi_kazanc:
-                en_iyi_kazanc = k
-                optimum_miktar = i
-
-        # 2. MAKSİMUM (Sınır) - Son pozitif kazanç noktası
-        maksimum_miktar = 0
-        for i, k in enumerate(kazanclar):
-            if k > 0:
-                maksimum_miktar = i
-
-        # 3. PARETO (%80) - %80 kazanca ulaşılan ilk nokta
-        hedef_80 = en_iyi_kazanc * 0.80
-        pareto_miktar = 0
-        pareto_kazanc = 0
-        for i, k in enumerate(kazanclar):
-            if k >= hedef_80:
-                pareto_miktar = i
-                pareto_kazanc = k
-                break
-
-        # 4. VERİMLİLİK (Max ROI) - Kazanç/Yatırım maksimum
-        verimlilik_miktar = 0
-        verimlilik_roi = 0
-        verimlilik_kazanc = 0
-        for i, k in enumerate(kazanclar):
-            if i > 0 and k > 0:
-                yatirim = i * maliyet
-                roi = (k / yatirim) * 100
-                if roi > verimlilik_roi:
-                    verimlilik_roi = roi
-                    verimlilik_miktar = i
-                    verimlilik_kazanc = k
-
-        return {
-            'verimlilik': verimlilik_miktar,
-            'verimlilik_roi': round(verimlilik_roi, 1),
-            'verimlilik_kazanc': round(verimlilik_kazanc, 2),
-            'pareto': pareto_miktar,
-            'pareto_kazanc': round(pareto_kazanc, 2),
-            'optimum': optimum_miktar,
-            'kazanc_optimum': round(en_iyi_kazanc, 2),
-            'maksimum': maksimum_miktar,
-            'kazanc_maksimum': round(kazanclar[maksimum_miktar] if maksimum_miktar > 0 else 0, 2)
-        }
+            return sonuclar
+
+        # 12 aya kadar tüm miktarlar için kazanç (gün bazlı iskonto) tek taramada
+        import zam_npv_motoru
+        hesaplanacak = [i for i, (_, aylik_ort, _) in enumerate(kalemler) if aylik_ort > 0]
+        karar = zam_npv_motoru.toplu_karar_noktalari([{
+            'maliyet': kalemler[i][0], 'aylik_ort': kalemler[i][1],
+            'mevcut_stok': kalemler[i][2], 'zam_gun': zam_gun, 'zam_orani': zam_orani,
+            'faiz_yillik': faiz_yillik, 'depo_vade': depo_vade
+        } for i in hesaplanacak])
+        for i, sonuc in zip(hesaplanacak, karar):
+            sonuclar[i] = sonuc
+        return sonuclar
 
     # ═══════════════════════════════════════════════════════════════════════
     # KARLILIK GRAFİĞİ FONKSİYONLARI
@@ -1522,86 +1453,27 @@ class SiparisVermeGUI:
         if zam_gun <= 0 or aylik_ort <= 0 or maliyet <= 0:
             return None
 
-        aylik_faiz = (faiz_yillik / 100) / 12
-        gunluk_faiz = (1 + aylik_faiz) ** (1/30) - 1
-        gunluk_sarf = aylik_ort / 30
-
         max_miktar = int(aylik_ort * 12)
         if max_miktar < 50:
             max_miktar = 200
 
-        miktarlar, kazanclar, yatirimlar, roi_ler, marjinal_roi = [], [], [], [], []
+        # Tüm miktarlar için kazanç (ay sonu senet + depo vadesi) tek taramada
+        import zam_npv_motoru
+        kazanc_arr = zam_npv_motoru.kazanc_egrisi(
+            range(0, max_miktar + 1), maliyet, aylik_ort, mevcut_stok,
+            zam_gun, zam_orani, faiz_yillik, depo_vade, sema='ay_sonu')
+        yatirim_arr, roi_arr, marjinal_arr = zam_npv_motoru.roi_egrileri(kazanc_arr, maliyet)
 
-        for test_miktar in range(0, max_miktar + 1):
-            if test_miktar == 0:
-                miktarlar.append(0)
-                kazanclar.append(0)
-                yatirimlar.append(0)
-                roi_ler.append(0)
-                marjinal_roi.append(0)
-                continue
-
-            kalan_mevcut = mevcut_stok
-            kalan_yeni = test_miktar
-            npv_aylik = 0
-
-            gun = 0
-            while kalan_yeni > 0 and gun < 720:
-                harcanan = gunluk_sarf
-                mevcut_harcanan = min(kalan_mevcut, harcanan)
-                kalan_mevcut -= mevcut_harcanan
-                yeni_harcanan = min(harcanan - mevcut_harcanan, kalan_yeni)
-
-                if yeni_harcanan > 0:
-                    fiyat = maliyet if gun < zam_gun else maliyet * (1 + zam_orani / 100)
-                    ay_sonu = ((gun // 30) + 1) * 30
-                    odeme_gun = ay_sonu + depo_vade
-                    iskonto = (1 + gunluk_faiz) ** odeme_gun
-                    npv_aylik += (yeni_harcanan * fiyat) / iskonto
-                    kalan_yeni -= yeni_harcanan
-                gun += 1
-
-            npv_toplu = (test_miktar * maliyet) / ((1 + gunluk_faiz) ** (30 + depo_vade))
-            kazanc = npv_aylik - npv_toplu
-            yatirim = test_miktar * maliyet
-
-            miktarlar.append(test_miktar)
-            kazanclar.append(kazanc)
-            yatirimlar.append(yatirim)
-            roi = (kazanc / yatirim * 100) if yatirim > 0 else 0
-            roi_ler.append(roi)
-
-            if test_miktar > 1:
-                ek_kazanc = kazanc - kazanclar[-2]
-                m_roi = (ek_kazanc / maliyet * 100) if maliyet > 0 else 0
-                marjinal_roi.append(m_roi)
-            else:
-                marjinal_roi.append(roi)
+        miktarlar = list(range(0, max_miktar + 1))
+        kazanclar = kazanc_arr.tolist()
+        yatirimlar = yatirim_arr.tolist()
+        roi_ler = roi_arr.tolist()
+        marjinal_roi = marjinal_arr.tolist()
 
         # Kritik noktalar
-        roi_arr = np.array(roi_ler)
-        kazanc_arr = np.array(kazanclar)
-
-        roi_arr_copy = roi_arr.copy()
-        roi_arr_copy[0] = -999
-        max_roi_idx = int(np.argmax(roi_arr_copy))
-
-        max_roi_val = roi_ler[max_roi_idx]
-        yarim_roi_idx = max_roi_idx
-        for i in range(max_roi_idx, len(roi_ler)):
-            if roi_ler[i] <= max_roi_val / 2:
-                yarim_roi_idx = i
-                break
-
-        sifir_roi_idx = len(roi_ler) - 1
-        for i in range(max_roi_idx, len(roi_ler)):
-            if roi_ler[i] <= 0:
-                sifir_roi_idx = i
-                break
-
-        optimum_idx = int(np.argmax(kazanc_arr))
-        pareto_hedef = kazanclar[optimum_idx] * 0.80
-        pareto_idx = next((i for i, k in enumerate(kazanclar) if k >= pareto_hedef), 0)
+        kn = zam_npv_motoru.kritik_noktalar(kazanc_arr, roi_arr)
+        max_roi_idx, yarim_roi_idx, sifir_roi_idx = kn['max_roi'], kn['yarim_roi'], kn['sifir_roi']
+        optimum_idx, pareto_idx = kn['optimum'], kn['pareto']
 
         return {
             'miktarlar': miktarlar, 'kazanclar': kazanclar, 'yatirimlar': yatirimlar,
@@ -1764,64 +1636,27 @@ class SiparisVermeGUI:
         if zam_gun <= 0 or aylik_ort <= 0 or maliyet <= 0:
             return None
 
-        aylik_faiz = (faiz_yillik / 100) / 12
-        gunluk_faiz = (1 + aylik_faiz) ** (1/30) - 1
-        gunluk_sarf = aylik_ort / 30
-
         max_miktar = int(aylik_ort * 12)
         if max_miktar < 50:
             max_miktar = 200
 
-        miktarlar, kazanclar, roi_ler = [], [], []
-
-        for test_miktar in range(0, max_miktar + 1):
-            if test_miktar == 0:
-                miktarlar.append(0)
-                kazanclar.append(0)
-                roi_ler.append(0)
-                continue
+        # Tüm miktarlar için kazanç (ay sonu senet + depo vadesi) tek taramada
+        import zam_npv_motoru
+        kazanc_arr = zam_npv_motoru.kazanc_egrisi(
+            range(0, max_miktar + 1), maliyet, aylik_ort, mevcut_stok,
+            zam_gun, zam_orani, faiz_yillik, depo_vade, sema='ay_sonu')
+        _, roi_arr, _ = zam_npv_motoru.roi_egrileri(kazanc_arr, maliyet)
 
-            kalan_mevcut = mevcut_stok
-            kalan_yeni = test_miktar
-            npv_aylik = 0
-
-            gun = 0
-            while kalan_yeni > 0 and gun < 720:
-                harcanan = gunluk_sarf
-                mevcut_harcanan = min(kalan_mevcut, harcanan)
-                kalan_mevcut -= mevcut_harcanan
-                yeni_harcanan = min(harcanan - mevcut_harcanan, kalan_yeni)
-
-                if yeni_harcanan > 0:
-                    fiyat = maliyet if gun < zam_gun else maliyet * (1 + zam_orani / 100)
-                    ay_sonu = ((gun // 30) + 1) * 30
-                    odeme_gun = ay_sonu + depo_vade
-                    iskonto = (1 + gunluk_faiz) ** odeme_gun
-                    npv_aylik += (yeni_harcanan * fiyat) / iskonto
-                    kalan_yeni -= yeni_harcanan
-                gun += 1
-
-            npv_toplu = (test_miktar * maliyet) / ((1 + gunluk_faiz) ** (30 + depo_vade))
-            kazanc = npv_aylik - npv_toplu
-
-            miktarlar.append(test_miktar)
-            kazanclar.append(kazanc)
-            yatirim = test_miktar * maliyet
-            roi_ler.append((kazanc / yatirim * 100) if yatirim > 0 else 0)
+        miktarlar = list(range(0, max_miktar + 1))
+        kazanclar = kazanc_arr.tolist()
+        roi_ler = roi_arr.tolist()
 
         # Marjinal kazançlar
         marjinal = [0] + [kazanclar[i] - kazanclar[i-1] for i in range(1, len(kazanclar))]
 
         # Kritik noktalar
-        kazanc_arr = np.array(kazanclar)
-        roi_arr = np.array(roi_ler)
-
-        optimum_idx = np.argmax(kazanc_arr)
-        roi_arr[0] = -999
-        max_roi_idx = np.argmax(roi_arr)
-
-        pareto_hedef = kazanclar[optimum_idx] * 0.80
-        pareto_idx = next((i for i, k in enumerate(kazanclar) if k >= pareto_hedef), 0)
+        kn = zam_npv_motoru.kritik_noktalar(kazanc_arr, roi_arr)
+        optimum_idx, max_roi_idx, pareto_idx = kn['optimum'], kn['max_roi'], kn['pareto']
 
         negatif_idx = max((i for i, k in enumerate(kazanclar) if k > 0), default=0)
         if negatif_idx < len(kazanclar) - 1:
@@ -2261,6 +2096,11 @@ class SiparisVermeGUI:
 
         tipler_sql = ', '.join([f"'{t}'" for t in urun_tipleri])
 
+        kup = db.satis_kupu('kayit', hareket_baslangic) if hasattr(db, 'satis_kupu') else None
+        if kup is not None:
+            return self._verileri_getir_kupten(db, kup, hareket_baslangic, aylik_baslangic,
+                                               ay_sayisi, tipler_sql)
+
         # Aylık CASE ifadeleri
         aylik_cases = []
         for i in range(ay_sayisi):
@@ -2343,6 +2183,47 @@ class SiparisVermeGUI:
 
         return db.sorgu_calistir(sql)
 
+    def _verileri_getir_kupten(self, db, kup, hareket_baslangic, aylik_baslangic,
+                               ay_sayisi, tipler_sql):
+        """_verileri_getir_sql ile aynı satırlar: çıkışlar satış küpünden,
+        ürün bilgisi Urun'dan (hareketli ürünlerin IN listesi)"""
+        hareketli = kup.urunler(bas=hareket_baslangic)
+        toplam = kup.toplam(hareketli, bas=aylik_baslangic)
+        aylik = kup.donemsel(hareketli, bas=aylik_baslangic, donem='ay')
+        ay_kodlari = [(datetime.now() - relativedelta(months=i)).strftime('%Y-%m')
+                      for i in range(ay_sayisi)]
+
+        sonuc = []
+        for i in range(0, len(hareketli), 1000):
+            id_str = ','.join(map(str, hareketli[i:i + 1000]))
+            sonuc.extend(db.sorgu_calistir(f"""
+            SELECT
+                u.UrunId,
+                u.UrunAdi,
+                COALESCE(ut.UrunTipAdi, 'Belirsiz') as UrunTipi,
+                u.UrunEsdegerId as EsdegerId,
+                (COALESCE(u.UrunStokDepo,0) + COALESCE(u.UrunStokRaf,0) + COALESCE(u.UrunStokAcik,0)) as Stok,
+                COALESCE(u.UrunMinimum, 0) as MinStok,
+                COALESCE(u.UrunFiyatEtiket, 0) as PSF,
+                COALESCE(u.UrunIskontoKamu, 0) as IskontoKamu
+            FROM Urun u
+            LEFT JOIN UrunTip ut ON u.UrunUrunTipId = ut.UrunTipId
+            WHERE u.UrunSilme = 0
+            AND ut.UrunTipAdi IN ({tipler_sql})
+            AND u.UrunId IN ({id_str})
+            """))
+
+        for satir in sonuc:
+            uid = satir['UrunId']
+            satir['ToplamCikis'] = toplam.get(uid, 0)
+            ay_dokum = aylik.get(uid, {})
+            for i, ay in enumerate(ay_kodlari):
+                satir[f'Ay_{i}'] = ay_dokum.get(ay, 0)
+        # SQL Server ORDER BY: NULL eşdeğer önce
+        sonuc.sort(key=lambda r: (r['EsdegerId'] is not None, r['EsdegerId'] or 0,
+                                  r['UrunAdi'] or ''))
+        return sonuc
+
     def _mf_sartlari_getir(self, db):
         """Son 1 yılda alınan MF şartlarını getir (5+1 formatında)"""
         bugun = datetime.now()
@@ -2428,9 +2309,33 @@ class SiparisVermeGUI:
         # Efektif ay: (ay_sayisi - 1) tam ay + bu ayın oranı
         efektif_ay_sayisi = (ay_sayisi - 1) + (bu_ay_gecen_gun / 30)
 
+        # Zam analizi (NPV bazlı) - zam aktif ise tüm liste için tek taramada
+        zam_onerileri = {}
+        if zam_aktif and zam_orani > 0:
+            zam_kalemleri = {}
+            for i, veri in enumerate(veriler):
+                depocu_fiyat = self._depocu_fiyat_hesapla(veri.get('PSF', 0) or 0,
+                                                          veri.get('IskontoKamu', 0) or 0)
+                toplam_cikis = veri.get('ToplamCikis', 0) or 0
+                aylik_ort = toplam_cikis / efektif_ay_sayisi if efektif_ay_sayisi > 0 else 0
+                if depocu_fiyat > 0 and aylik_ort > 0:
+                    zam_kalemleri[i] = (depocu_fiyat, aylik_ort, veri.get('Stok', 0) or 0)
+            if zam_kalemleri:
+                try:
+                    sonuclar = self._zam_oncesi_optimum_toplu_hesapla(
+                        list(zam_kalemleri.values()),
+                        zam_tarihi=self.zam_tarih_entry.get_date(),
+                        zam_orani=zam_orani * 100,  # Yüzde olarak
+                        faiz_yillik=self._aktif_faiz_getir(),
+                        depo_vade=self.depo_vadesi.get()
+                    )
+                    zam_onerileri = dict(zip(zam_kalemleri, sonuclar))
+                except Exception as e:
+                    logger.warning(f"Zam hesaplama hatası: {e}")
+
         islenenmis = []
 
-        for veri in veriler:
+        for sira, veri in enumerate(veriler):
             urun_id = veri.get('UrunId')
             stok = veri.get('Stok', 0) or 0
 
@@ -2467,25 +2372,8 @@ class SiparisVermeGUI:
             else:
                 ay_bitis = stok / aylik_ort
 
-            # Zam analizi (NPV bazlı) - zam aktif ise öncelikli hesapla
-            zam_oneri = None
-            if zam_aktif and zam_orani > 0 and depocu_fiyat > 0 and aylik_ort > 0:
-                try:
-                    zam_tarihi = self.zam_tarih_entry.get_date()
-                    faiz = self._aktif_faiz_getir()
-                    vade = self.depo_vadesi.get()
-
-                    zam_oneri = self._zam_oncesi_optimum_hesapla(
-                        maliyet=depocu_fiyat,
-                        aylik_ort=aylik_ort,
-                        mevcut_stok=stok,
-                        zam_tarihi=zam_tarihi,
-                        zam_orani=zam_orani * 100,  # Yüzde olarak
-                        faiz_yillik=faiz,
-                        depo_vade=vade
-                    )
-                except Exception as e:
-                    logger.warning(f"Zam hesaplama hatası: {e}")
+            # Zam analizi (NPV bazlı) - döngü öncesinde toplu hesaplandı
+            zam_oneri = zam_onerileri.get(sira)
 
             # Sipariş önerisi hesaplama
             if zam_aktif and zam_oneri:
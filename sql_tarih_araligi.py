@@ -0,0 +1,201 @@
+"""
+SQL Tarih Aralığı Derleyici (sargable tarih filtreleri)
+
+Yıl / ay / gün seçimlerini `YEAR(kolon) IN (...)`, `MONTH(kolon) IN (...)`,
+`DAY(kolon) IN (...)` yerine en az sayıda yarı-açık aralığa derler:
+
+    (kolon >= ? AND kolon < ?) OR (kolon >= ? AND kolon < ?) ...
+
+Fonksiyon sarılı kolon SQL Server'ın RxKayitTarihi vb. üzerindeki indeksi
+kullanmasını engeller (ReceteAna'da tam tarama). Yarı-açık aralıklar ise
+index seek'e izin verir; bitişik aralıklar (ardışık aylar, ardışık günler)
+tek aralıkta birleştirilir. Anlam birebir aynıdır.
+
+Parametreler 'YYYYMMDD' metni olarak üretilir — SQL Server'da dil/DATEFORMAT
+ayarından bağımsız tek tarih biçimi budur ('YYYY-MM-DD', Türkçe oturumda
+datetime için YDM okunabilir).
+
+Kullanım:
+    kosul, params = donem_kosulu("ra.RxKayitTarihi", [2026], [3, 4])
+    # kosul  -> "(ra.RxKayitTarihi >= ? AND ra.RxKayitTarihi < ?)"
+    # params -> ['20260301', '20260501']
+
+Sadece WHERE parçası üretir — SELECT-only guard BotanikDB'de kalır.
+"""
+
+import calendar
+from datetime import date, datetime, timedelta
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+TarihAraligi = Tuple[date, date]  # [baslangic, bitis) — bitis HARİÇ
+
+# Bu sayıdan fazla aralık çıkarsa (ör. seçili günler × çok ay × çok yıl)
+# OR listesi yerine tek kapsayıcı aralık + eski YEAR/MONTH/DAY süzgeci
+# üretilir: seek yine kapsayıcı aralıkla yapılır, anlam değişmez.
+MAKS_ARALIK = 48
+
+
+def _tekil(degerler: Optional[Iterable[int]]) -> Optional[List[int]]:
+    """None / boş liste → None ('Tümü'); aksi halde sıralı tekil int listesi."""
+    if degerler is None:
+        return None
+    liste = sorted({int(d) for d in degerler})
+    return liste or None
+
+
+def araliklari_birlestir(araliklar: Iterable[TarihAraligi]) -> List[TarihAraligi]:
+    """Çakışan/bitişik yarı-açık aralıkları birleştir."""
+    sirali = sorted(araliklar)
+    sonuc: List[TarihAraligi] = []
+    for bas, bit in sirali:
+        if sonuc and bas <= sonuc[-1][1]:
+            if bit > sonuc[-1][1]:
+                sonuc[-1] = (sonuc[-1][0], bit)
+        else:
+            sonuc.append((bas, bit))
+    return sonuc
+
+
+def _ay_sonrasi(yil: int, ay: int) -> date:
+    return date(yil + 1, 1, 1) if ay == 12 else date(yil, ay + 1, 1)
+
+
+def donem_araliklari(yillar: Optional[Sequence[int]],
+                     aylar: Optional[Sequence[int]] = None,
+                     gunler: Optional[Sequence[int]] = None
+                     ) -> Optional[List[TarihAraligi]]:
+    """Yıl × ay × gün seçimini birleştirilmiş yarı-açık aralıklara çevir.
+
+    Anlam: YEAR IN yillar AND MONTH IN aylar AND DAY IN gunler
+    (None/boş = o bileşende filtre yok). Ayda olmayan günler (ör. 31 Nisan)
+    sessizce atlanır — DAY() filtresinde de eşleşmezdi.
+
+    Returns:
+        Aralık listesi; yıl 'Tümü' ise None (sınırsız — aralığa çevrilemez).
+        Seçim hiçbir güne denk gelmiyorsa boş liste.
+    """
+    yillar = _tekil(yillar)
+    if yillar is None:
+        return None
+    aylar = _tekil(aylar) or list(range(1, 13))
+    gunler = _tekil(gunler)
+
+    araliklar: List[TarihAraligi] = []
+    for y in yillar:
+        for a in aylar:
+            if not 1 <= a <= 12:
+                continue
+            if gunler is None:
+                araliklar.append((date(y, a, 1), _ay_sonrasi(y, a)))
+                continue
+            ay_gun = calendar.monthrange(y, a)[1]
+            for g in gunler:
+                if 1 <= g <= ay_gun:
+                    gun = date(y, a, g)
+                    araliklar.append((gun, gun + timedelta(days=1)))
+    return araliklari_birlestir(araliklar)
+
+
+def _param(t: Union[date, datetime, str]) -> str:
+    """Tarihi dil/DATEFORMAT'tan bağımsız SQL Server metnine çevir."""
+    if isinstance(t, datetime):
+        if (t.hour, t.minute, t.second, t.microsecond) == (0, 0, 0, 0):
+            return t.strftime('%Y%m%d')
+        return t.strftime('%Y%m%d %H:%M:%S')
+    if isinstance(t, date):
+        return t.strftime('%Y%m%d')
+    return _param(_tarih_coz(t))
+
+
+def _tarih_coz(t: Union[date, datetime, str]) -> Union[date, datetime]:
+    if isinstance(t, (date, datetime)):
+        return t
+    metin = str(t).strip()
+    for bicim in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d', '%Y%m%d', '%d.%m.%Y'):
+        try:
+            dt = datetime.strptime(metin, bicim)
+        except ValueError:
+            continue
+        return dt if bicim.endswith('%S') else dt.date()
+    raise ValueError(f"Tarih çözülemedi: {t!r}")
+
+
+def aralik_kosulu(kolon: str,
+                  baslangic: Union[date, datetime, str, None] = None,
+                  bitis: Union[date, datetime, str, None] = None,
+                  bitis_dahil: bool = False) -> Tuple[str, list]:
+    """Tek aralık için sargable koşul: `kolon >= ? AND kolon < ?`.
+
+    Args:
+        baslangic: Dahil alt sınır (None = sınırsız)
+        bitis: Üst sınır (None = sınırsız). Varsayılan HARİÇ.
+        bitis_dahil: True ise bitis GÜNÜ dahildir (gün → ertesi gün 00:00'a
+            kadar, `< bitis + 1 gün`). Saatli datetime verilirse `<=`.
+
+    Returns:
+        (sql_parcasi, params) — sınır yoksa ("", [])
+    """
+    parcalar: List[str] = []
+    params: list = []
+    if baslangic is not None:
+        parcalar.append(f"{kolon} >= ?")
+        params.append(_param(baslangic))
+    if bitis is not None:
+        bit = _tarih_coz(bitis)
+        saatli = isinstance(bit, datetime) and (
+            bit.hour, bit.minute, bit.second, bit.microsecond) != (0, 0, 0, 0)
+        if bitis_dahil and saatli:
+            parcalar.append(f"{kolon} <= ?")
+        else:
+            if bitis_dahil:
+                bit = (bit.date() if isinstance(bit, datetime) else bit) + timedelta(days=1)
+            parcalar.append(f"{kolon} < ?")
+        params.append(_param(bit))
+    return " AND ".join(parcalar), params
+
+
+def donem_kosulu(kolon: str,
+                 yillar: Optional[Sequence[int]],
+                 aylar: Optional[Sequence[int]] = None,
+                 gunler: Optional[Sequence[int]] = None,
+                 maks_aralik: int = MAKS_ARALIK) -> Tuple[str, list]:
+    """Yıl/ay/gün seçimini sargable WHERE parçasına derle.
+
+    - Hepsi 'Tümü' (None/boş) → ("", []) — filtre yok.
+    - Yıl 'Tümü' ama ay/gün seçili → aralığa çevrilemez; MONTH()/DAY() IN
+      süzgeci döner (eski davranış).
+    - Aralık sayısı maks_aralik'i aşarsa → kapsayıcı aralık (seek) + eski
+      YEAR/MONTH/DAY IN süzgeci (anlamı korur).
+    - Seçim hiçbir güne denk gelmiyorsa → "1 = 0".
+    """
+    yil_l, ay_l, gun_l = _tekil(yillar), _tekil(aylar), _tekil(gunler)
+    if yil_l is None and ay_l is None and gun_l is None:
+        return "", []
+
+    def _in_suzgeci() -> Tuple[str, list]:
+        parcalar, prm = [], []
+        for fonk, liste in (("YEAR", yil_l), ("MONTH", ay_l), ("DAY", gun_l)):
+            if liste:
+                parcalar.append(
+                    f"{fonk}({kolon}) IN ({','.join('?' * len(liste))})")
+                prm.extend(liste)
+        return " AND ".join(parcalar), prm
+
+    araliklar = donem_araliklari(yil_l, ay_l, gun_l)
+    if araliklar is None:
+        return _in_suzgeci()
+    if not araliklar:
+        return "1 = 0", []
+
+    if len(araliklar) <= maks_aralik:
+        parcalar, params = [], []
+        for bas, bit in araliklar:
+            parcalar.append(f"({kolon} >= ? AND {kolon} < ?)")
+            params.extend([_param(bas), _param(bit)])
+        if len(parcalar) == 1:
+            return parcalar[0], params
+        return "(" + " OR ".join(parcalar) + ")", params
+
+    kapsayici, kap_params = aralik_kosulu(kolon, araliklar[0][0], araliklar[-1][1])
+    suzgec, suz_params = _in_suzgeci()
+    return f"{kapsayici} AND {suzgec}", kap_params + suz_params
@@ -16,6 +16,8 @@ from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 
+from sanal_tablo import SanalTablo
+
 logger = logging.getLogger(__name__)
 
 
@@ -221,9 +223,12 @@ class StokHareketAnalizGUI:
         self.tree = ttk.Treeview(tablo_frame, columns=[], show='headings', height=25)
 
         # Scrollbarlar
-        vsb = ttk.Scrollbar(tablo_frame, orient="vertical", command=self.tree.yview)
+        vsb = ttk.Scrollbar(tablo_frame, orient="vertical")
         hsb = ttk.Scrollbar(tablo_frame, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+        self.tree.configure(xscrollcommand=hsb.set)
+        # Sanal ızgara: sadece görünen satırlar Treeview'e eklenir
+        self._tablo_veriler = []
+        self._grid = SanalTablo(self.tree, self._satir_render, ysb=vsb)
 
         # Grid
         self.tree.grid(row=0, column=0, sticky='nsew')
@@ -1099,37 +1104,34 @@ class StokHareketAnalizGUI:
         messagebox.showerror("Sorgu Hatası", hata_mesaji)
 
     def _tabloyu_guncelle(self, veriler):
-        """Tabloyu verilerle güncelle"""
-        # Mevcut verileri temizle
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-
-        if not veriler:
-            return
-
-        # Verileri ekle
-        for veri in veriler:
-            satir_tipi = veri.get('satir_tipi', 'cikis')
-
-            # Değerleri al
-            values = []
-            for col_id, _ in self.aktif_sutunlar:
-                val = veri.get(col_id, '')
-                if isinstance(val, float):
-                    val = round(val, 1)
-                values.append(val if val != '' else '')
-
-            # Tag belirle
-            if satir_tipi == 'grup_baslik':
-                tag = 'grup_baslik'
-            elif satir_tipi == 'alt_toplam':
-                tag = 'alt_toplam'
-            elif satir_tipi == 'giris':
-                tag = 'giris'
-            else:
-                tag = 'cikis'
-
-            self.tree.insert('', 'end', values=values, tags=(tag,))
+        """Tabloyu verilerle güncelle (satırlar göründükçe üretilir)"""
+        self._tablo_veriler = list(veriler or [])
+        self._grid.veri_ayarla((str(i) for i in range(len(self._tablo_veriler))),
+                               konumu_koru=False)
+
+    def _satir_render(self, iid):
+        """Sanal ızgara satır üreticisi → (values, tags)"""
+        veri = self._tablo_veriler[int(iid)]
+        satir_tipi = veri.get('satir_tipi', 'cikis')
+
+        # Değerleri al
+        values = []
+        for col_id, _ in self.aktif_sutunlar:
+            val = veri.get(col_id, '')
+            if isinstance(val, float):
+                val = round(val, 1)
+            values.append(val if val != '' else '')
+
+        # Tag belirle
+        if satir_tipi == 'grup_baslik':
+            tag = 'grup_baslik'
+        elif satir_tipi == 'alt_toplam':
+            tag = 'alt_toplam'
+        elif satir_tipi == 'giris':
+            tag = 'giris'
+        else:
+            tag = 'cikis'
+        return values, (tag,)
 
     def _siralama_yap(self, column):
         """Sütuna göre sırala"""
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Anlık kontrol dispatch indeksi — indeksli yol ≡ sıralı tam tarama testleri.
+
+Bildirimlerden bağımsız, gerçek ilaç kalemleri (ticari ad, etken madde,
+ATC; tablodaki her modülden en az bir ilaç, eksik alanlı türevleri ve
+karıştırıcı adlar) üzerinde:
+  - her ilaç beklenen modüle gitmeli,
+  - indeksin aday DIŞI bıraktığı hiçbir modülün tespitçisi True dönmemeli,
+  - kontrol_et_tekil ile kontrol_et_tekil_sirali (indekssiz tam tarama)
+    aynı sonucu vermeli.
+
+Çalıştır: python test_anlik_dispatch_indeksi.py
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from recete_kontrol.anlik_kontrol import (
+    _DISPATCH_TABLOSU, DispatchIndeksi, _tablo_dispatch,
+    dispatch_indeksi, kontrol_et_tekil, kontrol_et_tekil_sirali,
+)
+
+_KARISTIRICI = [
+    {"ilac_adi": "PAROL 500 MG", "etkin_madde": "PARASETAMOL", "atc_kodu": "N02BE01"},
+    {"ilac_adi": "ATOR 20 MG", "etkin_madde": "ATORVASTATIN", "atc_kodu": "C10AA05"},
+    {"ilac_adi": "GLIFOR 1000", "etkin_madde": "METFORMIN"},
+    {"ilac_adi": "PROGRAF 1 MG KAPSUL", "etkin_madde": "TAKROLIMUS", "atc_kodu": "L04AD02"},
+    {"ilac_adi": "PROTOPIC %0,1 MERHEM", "etkin_madde": "TAKROLIMUS"},
+    {"ilac_adi": "IVEMEND 150 MG", "etkin_madde": "FOSAPREPITANT"},
+    {"ilac_adi": "BELOC", "etkin_madde": "METOPROLOL", "atc_kodu": "C07AB02"},
+    {"ilac_adi": "DARIZOL", "etkin_madde": "SOTALOL", "atc_kodu": "C07AA07"},
+    {"ilac_adi": "VIAGRA", "etkin_madde": "SILDENAFIL", "atc_kodu": "G04BE03"},
+    {"ilac_adi": "DEKORT 8 MG AMPUL", "etkin_madde": "DEKSAMETAZON"},
+    {"ilac_adi": "FERRO SANOL", "etkin_madde": "DEMIR", "atc_kodu": "B03AA07"},
+    {"ilac_adi": "GAMMA ANTI-D", "etkin_madde": "IMMUNGLOBULIN", "atc_kodu": "J06BB01"},
+    {"ilac_adi": "", "etkin_madde": "", "atc_kodu": ""},
+    {"ilac_adi": "PK-MERZ", "etkin_madde": "AMANTADIN SULFAT"},
+    {"ilac_adi": "JAKAVI", "etkin_madde": "", "atc_kodu": "D11AH09"},
+    {"ilac_adi": "tıoktık asit", "etkin_madde": "alfa lipoik"},
+    {"ilac_adi": 12345, "etkin_madde": None},
+]
+
+
+# (beklenen kategori, ticari ad, etken madde, ATC)
+_ILACLAR = [    ("ERITROPOIETIN", "EPREX 4000 IU", "EPOETIN ALFA", "B03XA01"),
+    ("ERITROPOIETIN", "ARANESP 40 MCG", "DARBEPOETIN ALFA", "B03XA02"),
+    ("KANSER_GCSF", "NEULASTA 6 MG", "PEGFILGRASTIM", "L03AA13"),
+    ("KANSER_GCSF", "ZOLADEX 3,6 MG", "GOSERELIN", "L02AE03"),
+    ("ANTI_TNF", "HUMIRA 40 MG", "ADALIMUMAB", "L04AB04"),
+    ("ANTI_TNF", "ENBREL 50 MG", "ETANERSEPT", "L04AB01"),
+    ("IMMUNGLOBULIN", "OCTAGAM %10", "IMMUNGLOBULIN G", "J06BA02"),
+    ("GOZ_ANTIVEGF", "LUCENTIS 10 MG/ML", "RANIBIZUMAB", "S01LA04"),
+    ("GOZ_ANTIVEGF", "EYLEA 40 MG/ML", "AFLIBERSEPT", "S01LA05"),
+    ("RUKSOLITINIB", "JAKAVI 15 MG", "RUKSOLITINIB", "L01EJ01"),
+    ("FOSFOR_BAGLAYICI", "RENVELA 800 MG", "SEVELAMER KARBONAT", "V03AE02"),
+    ("PARKINSON", "PEXOLA 0,25 MG", "PRAMIPEKSOL", "N04BC05"),
+    ("PARKINSON", "AZILECT 1 MG", "RASAJILIN", "N04BD02"),
+    ("MULTIPL_SKLEROZ", "GILENYA 0,5 MG", "FINGOLIMOD", "L04AA27"),
+    ("MIGREN", "RELPAX 40 MG", "ELETRIPTAN", "N02CC06"),
+    ("DEMANS_ALS", "ARICEPT 10 MG", "DONEPEZIL", "N06DA02"),
+    ("DEMANS_ALS", "RILUTEK 50 MG", "RILUZOL", "N07XX02"),
+    ("GINKGO", "TEBOKAN 80 MG", "GINKGO BILOBA", "N06DX02"),
+    ("ATOMOKSETIN", "STRATTERA 40 MG", "ATOMOKSETIN", "N06BA09"),
+    ("NOROPATIK_ALA_KAPSAISIN", "THIOCTACID 600 HR", "ALFA LIPOIK ASIT", "A16AX01"),
+    ("PULMONER_HT", "TRACLEER 125 MG", "BOSENTAN", "C02KX01"),
+    ("ANTIARITMIK", "MULTAQ 400 MG", "DRONEDARON", "C01BD07"),
+    ("MELANOM", "TAFINLAR 75 MG", "DABRAFENIB", "L01EC02"),
+    ("LEFLUNOMID", "ARAVA 20 MG", "LEFLUNOMID", "L04AA13"),
+    ("BIYOLOJIK_C", "MABTHERA 500 MG", "RITUKSIMAB", "L01FA01"),
+    ("PARENTERAL_DEMIR", "FERINJECT 500 MG/10 ML", "FERRIK KARBOKSIMALTOZ", "B03AC01"),
+    ("PALIVIZUMAB", "SYNAGIS 100 MG", "PALIVIZUMAB", "J06BD01"),
+    ("GRIP_ASISI", "VAXIGRIP TETRA", "INFLUENZA ASISI", "J07BB02"),
+    ("ALERJI_ASISI", "ALUTARD SQ", "ALERJEN EKSTRESI", "V01AA03"),
+    ("ANTIFUNGAL", "VFEND 200 MG", "VORIKONAZOL", "J02AC03"),
+    ("IVERMEKTIN", "STROMECTOL 3 MG", "IVERMEKTIN", "P02CF01"),
+    ("RIFAKSIMIN", "NORMIX 200 MG", "RIFAKSIMIN", "A07AA11"),
+    ("PENTOSAN", "ELMIRON 100 MG", "PENTOSAN POLISULFAT SODYUM", "G04BX15"),
+    ("ALPROSTADIL", "CAVERJECT 20 MCG", "ALPROSTADIL", "G04BE01"),
+    ("FINASTERID_DUTASTERID", "AVODART 0,5 MG", "DUTASTERID", "G04CB02"),
+    ("DESMOPRESSIN", "MINIRIN 0,1 MG", "DESMOPRESSIN", "H01BA02"),
+    ("GLOKOM", "XALATAN %0,005", "LATANOPROST", "S01EE01"),
+    ("PIMEKROLIMUS_TAKROLIMUS", "ELIDEL %1 KREM", "PIMEKROLIMUS", "D11AH02"),
+    ("ORLISTAT", "XENICAL 120 MG", "ORLISTAT", "A08AB01"),
+    ("FLUDROKORTIZON", "ASTONIN H 0,1 MG", "FLUDROKORTIZON", "H02AA02"),
+    ("KADIN_HORMON", "PROGYNOVA 2 MG", "ESTRADIOL VALERAT", "G03CA03"),
+    ("SETRON", "ZOFRAN 8 MG", "ONDANSETRON", "A04AA01"),
+    ("APREPITANT", "EMEND 125 MG", "APREPITANT", "A04AD12"),
+    ("MEKLOZIN", "POSTAFEN 25 MG", "MEKLOZIN", "R06AE05"),
+    ("DOBESILAT", "DOXIUM 500 MG", "KALSIYUM DOBESILAT", "C05BX01"),
+    ("PENTOKSIFILIN", "TRENTAL 400 MG", "PENTOKSIFILIN", "C04AD03"),
+]
+
+
+def _kalemler():
+    """Her ilacın tam kaydı + ATC'siz / etkensiz / küçük harf türevleri + karıştırıcılar."""
+    kalemler = list(_KARISTIRICI)
+    for _, ad, etken, atc in _ILACLAR:
+        kalemler.append({"ilac_adi": ad, "etkin_madde": etken, "atc_kodu": atc})
+        kalemler.append({"ilac_adi": ad, "etkin_madde": etken})
+        kalemler.append({"ilac_adi": ad, "etkin_madde": "", "atc_kodu": atc})
+        kalemler.append({"ilac_adi": "", "etkin_madde": etken.lower()})
+        kalemler.append({"ilac_adi": ad.split()[0].lower(), "etkin_madde": ""})
+    return kalemler
+
+
+def test_1_tum_moduller_bildirim_ihrac_eder():
+    indeks = dispatch_indeksi()
+    eksik = [_DISPATCH_TABLOSU[i][1] for i in sorted(indeks.her_zaman)]
+    assert not eksik, f"DISPATCH_ANAHTARLARI yok/boş: {eksik}"
+
+
+def test_2_her_ilac_beklenen_modulde():
+    kategoriler = {k[0] for k in _DISPATCH_TABLOSU}
+    assert {b for b, _, _, _ in _ILACLAR} == kategoriler
+    for beklenen, ad, etken, atc in _ILACLAR:
+        kategori, rapor = kontrol_et_tekil({"ilac_adi": ad, "etkin_madde": etken,
+                                            "atc_kodu": atc})
+        assert kategori == beklenen and rapor is not None, (ad, beklenen, kategori)
+
+
+def test_3_aday_disi_modulun_tespitcisi_true_donmez():
+    indeks = dispatch_indeksi()
+    for kalem in _kalemler():
+        adaylar = set(indeks.adaylar(kalem))
+        for i in range(len(_DISPATCH_TABLOSU)):
+            if i in adaylar:
+                continue
+            tespit, _ = indeks.fonksiyon(i)
+            try:
+                sonuc = tespit(kalem)
+            except Exception:
+                continue
+            assert not sonuc, (_DISPATCH_TABLOSU[i][0], kalem)
+
+
+def test_4_indeksli_tablo_sonucu_sirali_ile_ayni():
+    indeks = dispatch_indeksi()
+    for kalem in _kalemler():
+        hizli = _tablo_dispatch(kalem, indeks.adaylar(kalem), indeks.fonksiyon)
+        sirali = _tablo_dispatch(kalem, range(len(_DISPATCH_TABLOSU)), indeks.fonksiyon)
+        assert hizli[:2] == sirali[:2], (kalem, hizli[:2], sirali[:2])
+        if hizli[2] is not None:
+            assert (hizli[2].sonuc, hizli[2].mesaj) == (sirali[2].sonuc, sirali[2].mesaj)
+
+
+def test_5_uctan_uca_genel_dispatcher_dahil_ayni():
+    for kalem in _kalemler():
+        k1, r1 = kontrol_et_tekil(kalem)
+        k2, r2 = kontrol_et_tekil_sirali(kalem)
+        assert k1 == k2, (kalem, k1, k2)
+        assert (r1 is None) == (r2 is None)
+        if r1 is not None:
+            assert (r1.sonuc, r1.mesaj) == (r2.sonuc, r2.mesaj)
+
+
+def test_6_aday_sayisi_kucuk():
+    indeks = dispatch_indeksi()
+    assert indeks.adaylar({"ilac_adi": "PAROL", "etkin_madde": "PARASETAMOL",
+                           "atc_kodu": "N02BE01"}) == []
+    adaylar = indeks.adaylar({"ilac_adi": "XALATAN", "etkin_madde": "LATANOPROST",
+                              "atc_kodu": "S01EE01"})
+    assert [_DISPATCH_TABLOSU[i][0] for i in adaylar] == ["GLOKOM"]
+
+
+def test_7_yuklenemeyen_modul_her_zaman_aday():
+    tablo = [("YOK", "recete_kontrol.boyle_bir_modul_yok", "a", "b", True),
+             _DISPATCH_TABLOSU[0]]
+    indeks = DispatchIndeksi(tablo)
+    assert indeks.her_zaman == {0}
+    assert indeks.adaylar({"ilac_adi": "PAROL"}) == [0]
+
+
+def main() -> int:
+    testler = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    basarisiz = 0
+    for t in testler:
+        try:
+            t()
+            print(f"✓ {t.__name__}")
+        except AssertionError as e:
+            basarisiz += 1
+            print(f"✗ {t.__name__}: {e}")
+    print(f"\n{len(testler) - basarisiz}/{len(testler)} geçti")
+    return 1 if basarisiz else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
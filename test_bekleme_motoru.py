@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Yüzdelik tabanlı bekleme motoru (bekleme_motoru) testleri.
+
+Logaritmik kovalı histogramın yüzdelikleri kova çözünürlüğü içinde ve
+güvenli (üst) tarafta verdiği; zaman aşımının yeterli ölçüm birikince
+yüzdelik × marjdan türetildiği; koşul yoklamasının sahte saatle üstel
+aralıklarla ilerleyip koşul sağlanınca hemen döndüğü ve kazanılan süreyi
+raporladığı; süresi dolan beklemelerin histograma girip aşırı kısalmış zaman
+aşımını geri büyüttüğü; TimingSettings'in histogramı istatistik günlüğünde
+saklayıp sıkıştırmadan sonra da geri kurduğu doğrulanır.
+
+Çalıştır: python test_bekleme_motoru.py
+"""
+from __future__ import annotations
+
+import random
+import sys
+import tempfile
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bekleme_motoru import (KOVA_ORANI, BeklemeMotoru, GecikmeHistogrami, kova_indeksi,
+                            kova_ust_siniri)
+from timing_settings import TimingSettings
+
+
+class SahteSaat:
+    """saat() / uyku(sn) çifti: uyku gerçek beklemeden zamanı ilerletir."""
+
+    def __init__(self):
+        self.simdi = 100.0
+        self.uykular = []
+
+    def saat(self):
+        return self.simdi
+
+    def uyku(self, sure):
+        self.uykular.append(round(sure, 6))
+        self.simdi += sure
+
+
+def _motor(saat, **kwargs):
+    return BeklemeMotoru(saat=saat.saat, uyku=saat.uyku, **kwargs)
+
+
+def test_1_histogram_yuzdelik_kova_cozunurlugunde():
+    rnd = random.Random(7)
+    sureler = [rnd.lognormvariate(-1.5, 0.6) for _ in range(5000)]
+    h = GecikmeHistogrami()
+    for s in sureler:
+        h.ekle(s)
+    sirali = sorted(sureler)
+    for p in (0.5, 0.9, 0.95, 0.99):
+        gercek = sirali[int(p * len(sirali)) - 1]
+        tahmin = h.yuzdelik(p)
+        assert gercek <= tahmin <= gercek * KOVA_ORANI * 1.01, (p, gercek, tahmin)
+    # Kova sınırları: üst sınır kendi kovasında, hemen üstü sonraki kovada
+    assert kova_indeksi(kova_ust_siniri(20)) == 20
+    assert kova_indeksi(kova_ust_siniri(20) * 1.0001) == 21
+    assert kova_indeksi(0) == 0 and kova_indeksi(1e9) == 99
+    # Birleştirme ve sözlük gidiş-dönüşü
+    kopya = GecikmeHistogrami(h.sozluk())
+    kopya.birlestir(h)
+    assert kopya.adet == 2 * h.adet and kopya.yuzdelik(0.95) == h.yuzdelik(0.95)
+    assert GecikmeHistogrami().yuzdelik(0.95) is None
+
+
+def test_2_zaman_asimi_yuzdelikten_turetilir():
+    saat = SahteSaat()
+    motor = _motor(saat, yuzdelik=0.9, marj=1.5, min_ornek=10)
+    for _ in range(9):
+        motor.kaydet("pencere", 0.1)
+    assert motor.zaman_asimi("pencere", 1.0) == 1.0          # ölçüm az: sabit
+    motor.kaydet("pencere", 0.1)
+    p90 = motor.histogram("pencere").yuzdelik(0.9)
+    assert abs(motor.zaman_asimi("pencere", 1.0) - p90 * 1.5) < 1e-12
+    assert motor.zaman_asimi("pencere", 0.05) == 0.1         # tavan: varsayılan × 2
+    for _ in range(10):
+        motor.kaydet("hizli", 0.001)
+    assert motor.zaman_asimi("hizli", 1.0) == motor.alt_sinir
+
+
+def test_3_kosul_bekle_ustel_yoklama_ve_tasarruf():
+    saat = SahteSaat()
+    motor = _motor(saat, ilk_aralik=0.01, aralik_carpani=2.0, max_aralik=0.2)
+    hazir = saat.simdi + 0.12                                   # pencere 120 ms'de açılır
+    sonuc = motor.kosul_bekle(lambda: saat.simdi >= hazir and "pencere",
+                              "ilac_listesi", varsayilan=1.0, statik_aralik=0.2)
+    assert sonuc == "pencere"
+    assert saat.uykular == [0.01, 0.02, 0.04, 0.08]            # 150 ms'de görüldü
+    assert motor.histogram("ilac_listesi").adet == 1
+
+    # Gelmeyen koşul: süre dolunca biter, son uyku kalan süreye kırpılır,
+    # histograma zaman aşımı anında ölçüm olarak girer
+    saat.uykular.clear()
+    assert motor.kosul_bekle(lambda: False, "ilac_listesi", varsayilan=1.0,
+                             zaman_asimi=0.5, statik_aralik=0.2) is False
+    assert abs(sum(saat.uykular) - 0.5) < 1e-9 and max(saat.uykular) <= 0.2
+    h = motor.histogram("ilac_listesi")
+    assert h.adet == 2 and h.kovalar.get(kova_indeksi(0.5)) == 1
+
+    rapor = motor.tasarruf_raporu()["ilac_listesi"]
+    # statik: 0.2 ızgarası (başarı) + 1.0 (zaman aşımı); gerçek: 0.15 + 0.5
+    assert rapor["adet"] == 2 and rapor["zaman_asimi"] == 1
+    assert rapor["statik_sn"] == 1.2 and rapor["gercek_sn"] == 0.65
+    assert rapor["kazanc_sn"] == 0.55 and rapor["p95_sn"] is not None
+
+    # Sabit uyku yerine: statik_aralik yoksa sabit model tam varsayılanı öder
+    motor.kosul_bekle(lambda: True, "sabit", varsayilan=0.3)
+    assert motor.tasarruf_raporu()["sabit"]["kazanc_sn"] == 0.3
+
+
+def test_4_kosul_bekle_yuzdelik_zaman_asimini_kullanir():
+    saat = SahteSaat()
+    motor = _motor(saat, yuzdelik=0.95, marj=1.2, min_ornek=20)
+    for _ in range(20):
+        motor.kaydet("pencere", 0.2)
+    beklenen = motor.zaman_asimi("pencere", 1.0)
+    assert beklenen < 0.3
+    bas = saat.simdi
+    motor.kosul_bekle(lambda: False, "pencere", varsayilan=1.0)
+    assert abs((saat.simdi - bas) - beklenen) < 1e-9           # 1 sn yerine ~0.24 sn
+
+
+def test_5_timing_settings_histogrami_saklar():
+    dizin = Path(tempfile.mkdtemp())
+    ayar, stat = str(dizin / "ts.json"), str(dizin / "timing_stats.json")
+    ts = TimingSettings(ayar, stat, bekleme_yuzdelik=0.9)
+    for i in range(30):
+        ts.kayit_ekle("ilac_butonu", 0.1 + i * 0.01)
+    ts.bekleme.saat = SahteSaat().saat
+    ts.kosul_bekle(lambda: True, "ilac_listesi_penceresi", varsayilan=1.0)
+    p90 = ts.yuzdelik_al("ilac_butonu")
+    assert 0.37 <= p90 <= 0.37 * KOVA_ORANI
+
+    ts2 = TimingSettings(ayar, stat, bekleme_yuzdelik=0.9)
+    assert ts2.yuzdelik_al("ilac_butonu") == p90
+    assert ts2.istatistik_al("ilac_listesi_penceresi")["count"] == 1
+    assert ts2.istatistik_kaydet()                              # sıkıştır: "h" satırları
+    ts3 = TimingSettings(ayar, stat, bekleme_yuzdelik=0.9)
+    assert ts3.yuzdelik_al("ilac_butonu") == p90
+    assert ts3.bekleme.histogram("ilac_butonu").adet == 30
+    assert ts3.tasarruf_raporu() == {}
+
+
+def test_6_optimize_modu_kuyrugu_kullanir():
+    dizin = Path(tempfile.mkdtemp())
+    ts = TimingSettings(str(dizin / "ts.json"), str(dizin / "timing_stats.json"))
+    ts.optimize_mode_ac(multiplier=1.3, baslangic_suresi=3.0)
+    ts.kayit_ekle("y_butonu", 0.1)                              # ilk ölçüm × 1.3
+    assert abs(ts.get("y_butonu") - 0.13) < 1e-9
+    for _ in range(ts.bekleme.min_ornek - 3):
+        ts.kayit_ekle("y_butonu", 0.1)
+    assert abs(ts.get("y_butonu") - 0.13) < 1e-9                # ortalama değil ilk ölçüm
+    ts.kayit_ekle("y_butonu", 0.5)                              # kuyruk (%10)
+    ts.kayit_ekle("y_butonu", 0.5)
+    p95 = ts.yuzdelik_al("y_butonu")
+    assert p95 >= 0.5 and ts.get("y_butonu") == round(p95 * 1.3, 3)
+
+
+def test_7_zaman_asimi_olcumu_yuzdeligi_geri_buyutur():
+    # Hızlı geçmiş (popup'suz günler) zaman aşımını alt sınıra çekmiş; pencere
+    # artık 0.3 sn'de açılıyor. Süre dolan beklemeler ölçüm sayılmasaydı
+    # zaman aşımı 0.02 sn'de kalır, pencere hiç görülmezdi.
+    saat = SahteSaat()
+    motor = _motor(saat, yuzdelik=0.95, marj=1.2, min_ornek=20)
+    for _ in range(20):
+        motor.kaydet("ilac_listesi_penceresi", 0.005)
+    assert motor.zaman_asimi("ilac_listesi_penceresi", 1.0) == motor.alt_sinir
+
+    bulunan = []
+    for _ in range(40):
+        hazir = saat.simdi + 0.3
+        bulunan.append(motor.kosul_bekle(lambda: saat.simdi >= hazir,
+                                         "ilac_listesi_penceresi", varsayilan=1.0))
+    ilk = bulunan.index(True)
+    assert ilk < 25 and all(bulunan[ilk:]), bulunan
+    assert 0.3 <= motor.zaman_asimi("ilac_listesi_penceresi", 1.0) <= 2.0
+    assert motor.tasarruf_raporu()["ilac_listesi_penceresi"]["zaman_asimi"] == ilk
+
+
+def main():
+    testler = [(ad, fn) for ad, fn in sorted(globals().items())
+               if ad.startswith("test_") and callable(fn)]
+    gecen = 0
+    for ad, fn in testler:
+        try:
+            fn()
+            print(f"✓ {ad}")
+            gecen += 1
+        except Exception as e:
+            print(f"✗ {ad}: {e!r}")
+    print(f"\n{gecen}/{len(testler)} geçti")
+    return 0 if gecen == len(testler) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""botanik_ayna — yerel SQLite aynası senkron ve T-SQL çeviri testleri.
+
+Botanik EOS yerine bellek içi SQLite "kaynak" kullanılır; kaynak, gelen
+T-SQL'i aynı çevirici ile çalıştırır (BotanikDB.sorgu_calistir sözleşmesi:
+hata → boş liste + son_sorgu_hatasi).
+
+Çalıştır: python test_botanik_ayna.py
+"""
+from __future__ import annotations
+
+import sqlite3
+import sys
+import tempfile
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from botanik_ayna import (
+    AynaDesteklenmiyor, AynaSenkronHatasi, BotanikAyna, fonksiyonlari_kaydet,
+    sorgu_tablolari, tsql_sqlite_cevir, _sonuca,
+)
+
+BUGUN = date.today()
+
+
+class _SahteEOS:
+    """sorgu_calistir(sql, params) → list[dict] arayüzlü SQLite kaynak."""
+
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:")
+        fonksiyonlari_kaydet(self.conn)
+        self.son_sorgu_hatasi = None
+        self.sorgular = []
+        self.hata_ver = False
+        c = self.conn
+        c.execute("CREATE TABLE ReceteAna (RxId INTEGER PRIMARY KEY, RxKayitTarihi TEXT,"
+                  " RxReceteTarihi TEXT, RxMusteriId INTEGER, RxSilme INTEGER,"
+                  " RxSgkIslemNo TEXT)")
+        c.execute("CREATE TABLE ReceteIlaclari (RIId INTEGER PRIMARY KEY, RIRxId INTEGER,"
+                  " RIUrunId INTEGER, RIAdet INTEGER, RISilme INTEGER, RIIade INTEGER,"
+                  " RIRaporKodId INTEGER)")
+        c.execute("CREATE TABLE EldenAna (RxId INTEGER PRIMARY KEY, RxKayitTarihi TEXT,"
+                  " RxReceteTarihi TEXT, RxSilme INTEGER)")
+        c.execute("CREATE TABLE EldenIlaclari (RIId INTEGER PRIMARY KEY, RIRxId INTEGER,"
+                  " RIUrunId INTEGER, RIAdet INTEGER, RISilme INTEGER, RIIade INTEGER)")
+        c.execute("CREATE TABLE Urun (UrunId INTEGER PRIMARY KEY, UrunAdi TEXT,"
+                  " UrunUrunTipId INTEGER)")
+        c.execute("CREATE TABLE Musteri (MusteriId INTEGER PRIMARY KEY, MusteriEmeklilik INTEGER)")
+        c.executemany("INSERT INTO Urun VALUES (?, ?, 1)", [(u, f"ILAC {u}") for u in range(1, 6)])
+        c.executemany("INSERT INTO Musteri VALUES (?, ?)", [(m, m % 2) for m in range(1, 11)])
+        self.rx_id = 0
+        self.ri_id = 0
+
+    def recete_ekle(self, gun: date, kalem: int = 2, sgk: bool = True):
+        self.rx_id += 1
+        zaman = datetime.combine(gun, datetime.min.time()) + timedelta(hours=9, minutes=self.rx_id % 60)
+        self.conn.execute("INSERT INTO ReceteAna VALUES (?, ?, ?, ?, 0, ?)",
+                          (self.rx_id, zaman.isoformat(sep=" "), zaman.isoformat(sep=" "),
+                           self.rx_id % 10 + 1, "S1" if sgk else None))
+        self.conn.execute("INSERT INTO EldenAna VALUES (?, ?, ?, 0)",
+                          (self.rx_id, zaman.isoformat(sep=" "), zaman.isoformat(sep=" ")))
+        for k in range(kalem):
+            self.ri_id += 1
+            self.conn.execute("INSERT INTO ReceteIlaclari VALUES (?, ?, ?, ?, 0, 0, ?)",
+                              (self.ri_id, self.rx_id, k % 5 + 1, k + 1, k % 2))
+            self.conn.execute("INSERT INTO EldenIlaclari VALUES (?, ?, ?, 1, 0, 0)",
+                              (self.ri_id, self.rx_id, k % 5 + 1))
+
+    def sorgu_calistir(self, sql, params=None):
+        self.son_sorgu_hatasi = None
+        self.sorgular.append(sql)
+        if self.hata_ver:
+            self.son_sorgu_hatasi = "08S01 iletisim hatasi"
+            return []
+        cur = self.conn.execute(tsql_sqlite_cevir(sql), [
+            f"{p[:4]}-{p[4:6]}-{p[6:8]}" if isinstance(p, str) and len(p) == 8 and p.isdigit()
+            else p for p in (params or ())])
+        kolonlar = [k[0] for k in cur.description]
+        return [dict(zip(kolonlar, r)) for r in cur.fetchall()]
+
+
+def _kurulum(n_eski=40, n_yeni=20, parti=7):
+    eos = _SahteEOS()
+    for i in range(n_eski):
+        eos.recete_ekle(BUGUN - timedelta(days=400 - i))
+    for i in range(n_yeni):
+        eos.recete_ekle(BUGUN - timedelta(days=i))
+    yol = str(Path(tempfile.mkdtemp()) / "ayna.db")
+    return eos, BotanikAyna(yol, parti=parti, geri_gun=30)
+
+
+def _say(ayna, tablo):
+    conn = sqlite3.connect(ayna.yol)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {tablo}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def test_1_ilk_senkron_tum_tablolari_kopyalar_ve_indeks_kurar():
+    eos, ayna = _kurulum()
+    assert not ayna.kullanilabilir_mi()
+    sonuc = ayna.senkronize_et(eos)
+    assert _say(ayna, "ReceteAna") == 60 and _say(ayna, "ReceteIlaclari") == 120
+    assert _say(ayna, "Urun") == 5 and _say(ayna, "Musteri") == 10
+    assert sonuc["ReceteAna"] >= 60
+    durum = ayna.durum()
+    assert durum["ReceteAna"]["son_anahtar"] == 60
+    assert durum["ReceteIlaclari"]["son_anahtar"] == 120
+    assert ayna.kullanilabilir_mi()
+    conn = sqlite3.connect(ayna.yol)
+    ix = {r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='index'")}
+    assert "ix_ReceteAna_RxKayitTarihi" in ix and "ix_ReceteIlaclari_RIUrunId" in ix
+    # EOS'a giden her sorgu SELECT
+    assert all(s.lstrip().upper().startswith("SELECT") for s in eos.sorgular)
+
+
+def test_2_artimli_senkron_sadece_filigran_sonrasini_ceker():
+    eos, ayna = _kurulum(parti=1000)
+    ayna.senkronize_et(eos, ["ReceteAna"])
+    eos.recete_ekle(BUGUN)
+    eos.sorgular.clear()
+    ayna.senkronize_et(eos, ["ReceteAna"])
+    artimli = [s for s in eos.sorgular if "RxId > ?" in s and "RxKayitTarihi >=" not in s]
+    assert artimli and _say(ayna, "ReceteAna") == 61
+    assert ayna.durum()["ReceteAna"]["son_anahtar"] == 61
+
+
+def test_3_geri_tarama_duzeltme_ve_silmeleri_yakalar_eskiye_dokunmaz():
+    eos, ayna = _kurulum()
+    ayna.senkronize_et(eos)
+    # Yakın tarihli: silindi işareti + bir kalem fiziksel silindi
+    eos.conn.execute("UPDATE ReceteAna SET RxSilme = 1 WHERE RxId = 55")
+    eos.conn.execute("DELETE FROM ReceteIlaclari WHERE RIId = 110")
+    # Eski (pencere dışı) değişiklik aynaya yansımaz
+    eos.conn.execute("UPDATE ReceteAna SET RxSilme = 1 WHERE RxId = 3")
+    ayna.senkronize_et(eos)
+    conn = sqlite3.connect(ayna.yol)
+    assert conn.execute("SELECT RxSilme FROM ReceteAna WHERE RxId = 55").fetchone()[0] == 1
+    assert conn.execute("SELECT COUNT(*) FROM ReceteIlaclari WHERE RIId = 110").fetchone()[0] == 0
+    assert conn.execute("SELECT RxSilme FROM ReceteAna WHERE RxId = 3").fetchone()[0] == 0
+    assert _say(ayna, "ReceteIlaclari") == 119
+
+
+def test_4_kaynak_hatasinda_ayna_bozulmaz():
+    eos, ayna = _kurulum()
+    ayna.senkronize_et(eos)
+    eos.hata_ver = True
+    try:
+        ayna.senkronize_et(eos)
+    except AynaSenkronHatasi:
+        pass
+    else:
+        raise AssertionError("AynaSenkronHatasi bekleniyordu")
+    # Boş dönen hatalı sorgu geri taramada "hepsi silinmiş" sanılmadı
+    assert _say(ayna, "ReceteAna") == 60 and _say(ayna, "ReceteIlaclari") == 120
+
+
+def test_5_rapor_sorgusu_aynada_canli_ile_ayni_sonucu_verir():
+    eos, ayna = _kurulum()
+    ayna.senkronize_et(eos)
+    baslangic = (BUGUN - timedelta(days=90)).strftime("%Y-%m-%d")
+    sql = f"""
+        SELECT
+            SUM(ri.RIAdet) as ToplamAdet,
+            SUM(CASE WHEN ri.RIRaporKodId IS NOT NULL AND ri.RIRaporKodId > 0
+                THEN ri.RIAdet ELSE 0 END) as RaporluAdet,
+            SUM(CASE WHEN m.MusteriEmeklilik = 1 THEN ri.RIAdet ELSE 0 END) as EmekliAdet
+        FROM ReceteIlaclari ri
+        JOIN ReceteAna ra ON ri.RIRxId = ra.RxId
+        LEFT JOIN Musteri m ON ra.RxMusteriId = m.MusteriId
+        WHERE ri.RIUrunId IN (1,2,3)
+        AND ra.RxSilme = 0 AND ri.RISilme = 0
+        AND (ri.RIIade = 0 OR ri.RIIade IS NULL)
+        AND ra.RxKayitTarihi >= '{baslangic}'
+        AND ra.RxSgkIslemNo IS NOT NULL AND ra.RxSgkIslemNo != ''
+    """
+    assert ayna.sorgu_calistir(sql) == eos.sorgu_calistir(sql)
+    # 'YYYYMMDD' parametre (sql_tarih_araligi) ISO metne çevrilir
+    prm_sql = ("SELECT COUNT(*) AS Adet, MAX(RxKayitTarihi) AS Son FROM ReceteAna "
+               "WHERE RxKayitTarihi >= ? AND RxKayitTarihi < ?")
+    prm = ((BUGUN - timedelta(days=5)).strftime("%Y%m%d"),
+           (BUGUN + timedelta(days=1)).strftime("%Y%m%d"))
+    sonuc = ayna.sorgu_calistir(prm_sql, prm)
+    assert sonuc[0]["Adet"] == 6
+    assert isinstance(sonuc[0]["Son"], datetime)
+
+
+def test_6_tsql_ceviri():
+    sql = ("SELECT TOP 5 u.UrunAdi, ISNULL((SELECT TOP 1 ri.RIAdet FROM ReceteIlaclari ri "
+           "WHERE ri.RIUrunId = u.UrunId ORDER BY ri.RIId DESC), 0) AS Son, "
+           "CAST(GETDATE() as date) AS Bugun, N'TOP 3 + x' AS Metin "
+           "FROM Urun u WITH (NOLOCK) ORDER BY u.UrunId")
+    cevrilmis = tsql_sqlite_cevir(sql)
+    assert "TOP" not in cevrilmis.replace("'TOP 3 + x'", "")
+    assert "ORDER BY ri.RIId DESC LIMIT 1)" in cevrilmis
+    assert cevrilmis.rstrip().endswith("ORDER BY u.UrunId LIMIT 5")
+    assert "IFNULL(" in cevrilmis and "date(T_GETDATE())" in cevrilmis
+    assert "NOLOCK" not in cevrilmis and "'TOP 3 + x'" in cevrilmis
+    assert tsql_sqlite_cevir("SELECT DATEADD(MONTH, -3, '20260531') AS T") == \
+        "SELECT DATEADD('MONTH', -3, '2026-05-31') AS T"
+    conn = sqlite3.connect(":memory:")
+    fonksiyonlari_kaydet(conn)
+    assert conn.execute(tsql_sqlite_cevir(
+        "SELECT DATEADD(MONTH, -3, '20260531'), DATEDIFF(DAY, '2026-01-31 23:00:00', "
+        "'2026-02-01 01:00:00'), EOMONTH('2024-02-10'), LEFT('ABCDE', 2), LEN('ab  ')"
+    )).fetchone() == ("2026-02-28", 1, "2024-02-29", "AB", 2)
+    for desteksiz in ("SELECT * FROM ReceteAna ra OUTER APPLY (SELECT 1 AS x) y",
+                      "SELECT CONVERT(varchar, RxId) FROM ReceteAna",
+                      "SELECT 'Rx' + RxSgkIslemNo FROM ReceteAna",
+                      "SELECT TOP 1 RxId FROM ReceteAna UNION ALL SELECT RxId FROM EldenAna"):
+        try:
+            tsql_sqlite_cevir(desteksiz)
+        except AynaDesteklenmiyor:
+            continue
+        raise AssertionError(desteksiz)
+
+
+def test_7_aynada_olmayan_tablo_canliya_birakilir():
+    sql = ("WITH S AS (SELECT RIUrunId FROM ReceteIlaclari) "
+           "SELECT * FROM S JOIN dbo.Karekod k ON k.KKUrunId = S.RIUrunId")
+    assert sorgu_tablolari(sql) == ["ReceteIlaclari", "Karekod"]
+    eos, ayna = _kurulum()
+    ayna.senkronize_et(eos)
+    try:
+        ayna.sorgu_calistir(sql)
+    except AynaDesteklenmiyor as e:
+        assert "Karekod" in str(e)
+    else:
+        raise AssertionError("AynaDesteklenmiyor bekleniyordu")
+
+
+def test_8_turkce_harmanlama_integer_cast_ve_tarih():
+    eos, ayna = _kurulum()
+    eos.conn.execute("INSERT INTO Urun VALUES (6, 'İLAÇ ', 1)")
+    eos.conn.execute("INSERT INTO Urun VALUES (7, 'çay', 1)")
+    eos.conn.execute("INSERT INTO Urun VALUES (8, 'dere', 1)")
+    eos.conn.execute("INSERT INTO Urun VALUES (9, 'cam', 1)")
+    ayna.senkronize_et(eos)
+    # SQL Server (Turkish_CI_AS): büyük/küçük harf ve sondaki boşluk eşitlikte yok sayılır
+    sonuc = ayna.sorgu_calistir("SELECT UrunId FROM Urun WHERE UrunAdi = 'ilaç'")
+    assert [r["UrunId"] for r in sonuc] == [6]
+    sonuc = ayna.sorgu_calistir("SELECT UrunAdi FROM Urun WHERE UrunId IN (7, 8, 9) "
+                                "ORDER BY UrunAdi")
+    assert [r["UrunAdi"] for r in sonuc] == ["cam", "çay", "dere"]
+    # INTEGER cast ve yalnız tarih sonuçları
+    assert tsql_sqlite_cevir("SELECT CAST(RIAdet AS INTEGER) FROM ReceteIlaclari") == \
+        "SELECT CAST(RIAdet AS INTEGER) FROM ReceteIlaclari"
+    sonuc = ayna.sorgu_calistir("SELECT CAST(RxKayitTarihi as date) AS Gun FROM ReceteAna "
+                                "WHERE RxId = 1")
+    assert sonuc[0]["Gun"] == BUGUN - timedelta(days=400)
+    assert _sonuca("2025-01-02") == date(2025, 1, 2) and _sonuca("2025-01-0x") == "2025-01-0x"
+
+
+def main() -> int:
+    testler = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    basarisiz = 0
+    for t in testler:
+        try:
+            t()
+            print(f"✓ {t.__name__}")
+        except AssertionError as e:
+            basarisiz += 1
+            print(f"✗ {t.__name__}: {e}")
+    print(f"\n{len(testler) - basarisiz}/{len(testler)} geçti")
+    return 1 if basarisiz else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
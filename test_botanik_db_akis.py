@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""BotanikDB akışlı sorgu (sorgu_akis) satır/parti testleri.
+
+SQL Server yerine SQLite cursor'ı kullanılır (aynı DB-API arayüzü).
+
+Çalıştır: python test_botanik_db_akis.py
+"""
+from __future__ import annotations
+
+import sqlite3
+import sys
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from botanik_db_akis import AkisSatiri, cursor_akisi, satir_sinifi
+
+
+def _db(n=12345):
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE ReceteIlaclari (RIId INTEGER, RIRxId INTEGER, UrunAdi TEXT)")
+    conn.executemany("INSERT INTO ReceteIlaclari VALUES (?, ?, ?)",
+                     [(i, i // 3, f"ILAC {i}") for i in range(n)])
+    return conn
+
+
+class _SayanCursor:
+    """fetchmany çağrılarını kaydeden cursor sarmalayıcı."""
+
+    def __init__(self, cur):
+        self._cur = cur
+        self.istenen = []
+
+    @property
+    def description(self):
+        return self._cur.description
+
+    def fetchmany(self, n):
+        self.istenen.append(n)
+        return self._cur.fetchmany(n)
+
+
+def test_1_satir_dict_gibi_davranir():
+    Sinif = satir_sinifi(["RxId", "UrunAdi", "Adet"])
+    r = Sinif((7, "ATOR 20", 2))
+    assert isinstance(r, AkisSatiri) and isinstance(r, tuple)
+    assert r["RxId"] == 7 and r[1] == "ATOR 20"
+    assert r.get("Adet") == 2
+    assert r.get("Yok") is None and r.get("Yok", "-") == "-"
+    assert "UrunAdi" in r and "Yok" not in r
+    assert r.sozluk() == {"RxId": 7, "UrunAdi": "ATOR 20", "Adet": 2}
+    assert dict(r.items()) == r.sozluk()
+    assert list(r.keys()) == ["RxId", "UrunAdi", "Adet"]
+    try:
+        r["Yok"]
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("KeyError bekleniyordu")
+
+
+def test_2_kolon_indeksi_paylasilir_satir_basina_dict_yok():
+    Sinif = satir_sinifi(["a", "b"])
+    r1, r2 = Sinif((1, 2)), Sinif((3, 4))
+    assert r1._indeks is r2._indeks
+    assert not hasattr(r1, "__dict__")
+
+
+def test_3_partiler_fetchmany_ile_gelir_ve_eksiksiz():
+    conn = _db(12345)
+    cur = _SayanCursor(conn.execute(
+        "SELECT RIId, RIRxId, UrunAdi FROM ReceteIlaclari ORDER BY RIId"))
+    partiler = list(cursor_akisi(cur, parti=5000))
+    assert [len(p) for p in partiler] == [5000, 5000, 2345]
+    assert set(cur.istenen) == {5000}
+    tum = [r for p in partiler for r in p]
+    assert [r["RIId"] for r in tum] == list(range(12345))
+    assert tum[10].sozluk() == {"RIId": 10, "RIRxId": 3, "UrunAdi": "ILAC 10"}
+
+
+def test_4_ilk_parti_tum_sonuc_okunmadan_gelir():
+    conn = _db(10000)
+    cur = _SayanCursor(conn.execute("SELECT RIId FROM ReceteIlaclari"))
+    akis = cursor_akisi(cur, parti=1000)
+    ilk = next(akis)
+    assert len(ilk) == 1000
+    assert len(cur.istenen) == 1  # sadece bir fetchmany yapıldı
+    akis.close()
+
+
+def test_5_bos_sonuc_ve_sonucsuz_cursor():
+    conn = _db(0)
+    assert list(cursor_akisi(conn.execute("SELECT RIId FROM ReceteIlaclari"))) == []
+    cur = conn.cursor()
+    cur.execute("CREATE TEMP TABLE x (a)")  # description=None
+    assert list(cursor_akisi(cur)) == []
+
+
+def main() -> int:
+    testler = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    basarisiz = 0
+    for t in testler:
+        try:
+            t()
+            print(f"✓ {t.__name__}")
+        except AssertionError as e:
+            basarisiz += 1
+            print(f"✗ {t.__name__}: {e}")
+    print(f"\n{len(testler) - basarisiz}/{len(testler)} geçti")
+    return 1 if basarisiz else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""BotanikDB salt-okuma bağlantı havuzu — stres ve davranış testleri.
+
+Gerçek SQL Server yerine:
+  - Sahte (ODBC'siz) bağlantı: execute içinde bekler, aynı bağlantının iki
+    thread'den eşzamanlı kullanılmasını yakalar (2026-06-03 segfault'u).
+  - SQLite adaptörü: N thread paralel SELECT çalıştırır.
+odunc()'un yalnız iletişim hatasında (SQLSTATE 08xxx) bağlantıyı attığı,
+SQL/programlama hatasında havuza iade ettiği de doğrulanır.
+
+Çalıştır: python test_botanik_db_havuz.py
+"""
+from __future__ import annotations
+
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from botanik_db_havuz import BaglantiHavuzu, HavuzZamanAsimi, baglanti_hatasi_mi
+
+
+# ---------------------------------------------------------------------------
+# Yardımcılar
+# ---------------------------------------------------------------------------
+class _SahteSaat:
+    def __init__(self):
+        self.t = 1000.0
+
+    def __call__(self):
+        return self.t
+
+
+class _SahteCursor:
+    def __init__(self, conn):
+        self.conn = conn
+        self.description = [("deger",)]
+        self._satirlar = []
+
+    def execute(self, sql, params=None):
+        if self.conn.bozuk:
+            raise RuntimeError("08S01 iletişim hatası")
+        with self.conn.sayac_kilidi:
+            self.conn.aktif += 1
+            if self.conn.aktif > 1:
+                self.conn.paylasim_ihlali = True
+        try:
+            time.sleep(self.conn.gecikme)
+        finally:
+            with self.conn.sayac_kilidi:
+                self.conn.aktif -= 1
+        self._satirlar = [(1,)]
+
+    def fetchall(self):
+        return self._satirlar
+
+    def close(self):
+        pass
+
+
+class _SahteBaglanti:
+    def __init__(self, gecikme=0.0):
+        self.gecikme = gecikme
+        self.aktif = 0
+        self.paylasim_ihlali = False
+        self.bozuk = False
+        self.kapandi = False
+        self.sayac_kilidi = threading.Lock()
+
+    def cursor(self):
+        return _SahteCursor(self)
+
+    def close(self):
+        self.kapandi = True
+
+
+def _sorgu(havuz, sql="SELECT 1", params=None):
+    """BotanikDB.sorgu_calistir'in havuz kısmının birebir karşılığı."""
+    conn = havuz.al()
+    try:
+        cur = conn.cursor()
+        if params:
+            cur.execute(sql, params)
+        else:
+            cur.execute(sql)
+        kolonlar = [c[0] for c in cur.description]
+        sonuc = [dict(zip(kolonlar, r)) for r in cur.fetchall()]
+        cur.close()
+        return sonuc
+    finally:
+        havuz.birak(conn)
+
+
+def _paralel(n_thread, is_fn):
+    hatalar = []
+
+    def _calistir(i):
+        try:
+            is_fn(i)
+        except Exception as e:  # pragma: no cover - hata raporu
+            hatalar.append(e)
+
+    threadler = [threading.Thread(target=_calistir, args=(i,)) for i in range(n_thread)]
+    t0 = time.perf_counter()
+    for t in threadler:
+        t.start()
+    for t in threadler:
+        t.join()
+    return time.perf_counter() - t0, hatalar
+
+
+# ---------------------------------------------------------------------------
+# Testler
+# ---------------------------------------------------------------------------
+def test_1_paralel_sorgu_baglanti_paylasilmaz():
+    baglantilar = []
+
+    def fabrika():
+        c = _SahteBaglanti(gecikme=0.02)
+        baglantilar.append(c)
+        return c
+
+    havuz = BaglantiHavuzu(fabrika, maks_boyut=4)
+    n_thread, tekrar = 16, 5
+    sure, hatalar = _paralel(n_thread, lambda i: [_sorgu(havuz) for _ in range(tekrar)])
+
+    assert not hatalar, hatalar
+    assert not any(c.paylasim_ihlali for c in baglantilar), \
+        "Aynı bağlantı iki thread'de eşzamanlı kullanıldı"
+    durum = havuz.durum()
+    assert durum["olusturulan"] <= 4
+    assert durum["en_yuksek_eszamanli"] == 4
+    assert durum["odunc"] == 0
+    seri_sure = n_thread * tekrar * 0.02
+    # 4 bağlantı ile en az ~2 kat hızlanma (eski tek-kilit: seri_sure)
+    assert sure < seri_sure / 2, f"paralel={sure:.2f}s seri={seri_sure:.2f}s"
+
+
+def test_2_sqlite_adaptoru_stres():
+    with tempfile.TemporaryDirectory() as td:
+        yol = os.path.join(td, "standin.db")
+        c = sqlite3.connect(yol)
+        c.execute("CREATE TABLE ReceteAna (RxId INTEGER PRIMARY KEY, Tutar REAL)")
+        c.executemany("INSERT INTO ReceteAna VALUES (?, ?)",
+                      [(i, i * 1.5) for i in range(1, 2001)])
+        c.commit()
+        c.close()
+
+        havuz = BaglantiHavuzu(
+            lambda: sqlite3.connect(yol, check_same_thread=False), maks_boyut=3)
+        sonuclar = {}
+
+        def is_fn(i):
+            for k in range(20):
+                rx = (i * 20 + k) % 2000 + 1
+                satir = _sorgu(havuz, "SELECT RxId, Tutar FROM ReceteAna WHERE RxId = ?",
+                               (rx,))
+                assert satir == [{"RxId": rx, "Tutar": rx * 1.5}]
+            toplam = _sorgu(havuz, "SELECT COUNT(*) AS n FROM ReceteAna")
+            sonuclar[i] = toplam[0]["n"]
+
+        _, hatalar = _paralel(12, is_fn)
+        havuz.kapat()
+        assert not hatalar, hatalar
+        assert sonuclar == {i: 2000 for i in range(12)}
+        assert havuz.durum()["acik"] == 0
+
+
+def test_3_saglik_kontrolu_bozuk_baglantiyi_atar():
+    saat = _SahteSaat()
+    baglantilar = []
+
+    def fabrika():
+        c = _SahteBaglanti()
+        baglantilar.append(c)
+        return c
+
+    havuz = BaglantiHavuzu(fabrika, maks_boyut=2, saglik_kontrol_sn=30,
+                           bosta_kalma_sn=0, saat=saat)
+    ilk = havuz.al()
+    havuz.birak(ilk)
+    # Taze: sağlık kontrolü yapılmaz, aynı bağlantı döner
+    assert havuz.al() is ilk
+    havuz.birak(ilk)
+
+    ilk.bozuk = True
+    saat.t += 31
+    ikinci = havuz.al()
+    assert ikinci is not ilk
+    assert ilk.kapandi
+    havuz.birak(ikinci)
+    assert havuz.durum()["acik"] == 1
+
+
+def test_4_bosta_kalanlar_temizlenir():
+    saat = _SahteSaat()
+    havuz = BaglantiHavuzu(_SahteBaglanti, maks_boyut=3, bosta_kalma_sn=60, saat=saat)
+    conns = [havuz.al() for _ in range(3)]
+    for c in conns:
+        havuz.birak(c)
+    assert havuz.durum()["bosta"] == 3
+    saat.t += 30
+    assert havuz.bostalari_temizle() == 0
+    saat.t += 31
+    assert havuz.bostalari_temizle() == 3
+    assert all(c.kapandi for c in conns)
+    assert havuz.durum()["acik"] == 0
+
+
+def test_5_dolu_havuz_zaman_asimi():
+    havuz = BaglantiHavuzu(_SahteBaglanti, maks_boyut=1)
+    tutulan = havuz.al()
+    try:
+        havuz.al(bekleme_sn=0.05)
+    except HavuzZamanAsimi:
+        pass
+    else:
+        raise AssertionError("HavuzZamanAsimi bekleniyordu")
+    havuz.birak(tutulan)
+    assert havuz.al(bekleme_sn=0.05) is tutulan
+
+
+def test_6_fabrika_hatasi_kapasite_sizdirmaz():
+    deneme = {"n": 0}
+
+    def fabrika():
+        deneme["n"] += 1
+        if deneme["n"] <= 3:
+            raise RuntimeError("sunucu yok")
+        return _SahteBaglanti()
+
+    havuz = BaglantiHavuzu(fabrika, maks_boyut=1)
+    for _ in range(3):
+        try:
+            havuz.al(bekleme_sn=0)
+        except RuntimeError:
+            pass
+    assert havuz.durum()["acik"] == 0
+    conn = havuz.al(bekleme_sn=0)
+    assert isinstance(conn, _SahteBaglanti)
+
+
+def test_7_bozuk_iade_ve_kapat():
+    havuz = BaglantiHavuzu(_SahteBaglanti, maks_boyut=2)
+    a = havuz.al()
+    b = havuz.al()
+    havuz.birak(a, bozuk=True)
+    assert a.kapandi
+    havuz.kapat()
+    havuz.birak(b)  # kapalı havuza iade -> kapatılır
+    assert b.kapandi
+    assert havuz.durum()["acik"] == 0
+    havuz.yeniden_ac()
+    assert havuz.al() is not None
+
+
+def test_8_odunc_yalniz_iletisim_hatasinda_atar():
+    havuz = BaglantiHavuzu(_SahteBaglanti, maks_boyut=1)
+
+    def hatali(hata):
+        try:
+            with havuz.odunc() as conn:
+                raise hata
+        except BaseException:
+            pass
+        return conn
+
+    a = hatali(RuntimeError("42S22", "Invalid column name 'RxYok'"))
+    b = hatali(TypeError("programlama hatası"))
+    assert a is b and not a.kapandi          # SQL/programlama hatası: iade
+    assert havuz.durum()["atilan"] == 0
+    c = hatali(RuntimeError("08S01", "Communication link failure"))
+    assert c is a and c.kapandi              # iletişim hatası: atılır
+    assert hatali(KeyboardInterrupt()).kapandi
+    assert baglanti_hatasi_mi(RuntimeError("08001", "x"))
+    assert not baglanti_hatasi_mi(RuntimeError("42000", "x"))
+
+    # Çağıran kendi sınıflandırıcısını verebilir
+    havuz = BaglantiHavuzu(_SahteBaglanti, maks_boyut=1,
+                           hata_bozar_mi=lambda e: isinstance(e, TypeError))
+    assert not hatali(RuntimeError("08S01", "x")).kapandi
+    assert hatali(TypeError("x")).kapandi
+
+
+def main() -> int:
+    testler = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    basarisiz = 0
+    for t in testler:
+        try:
+            t()
+            print(f"✓ {t.__name__}")
+        except AssertionError as e:
+            basarisiz += 1
+            print(f"✗ {t.__name__}: {e}")
+    print(f"\n{len(testler) - basarisiz}/{len(testler)} geçti")
+    return 1 if basarisiz else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""degisiklik_akisi — paylaşılan değişiklik akışı testleri.
+
+Botanik EOS yerine bellek içi SQLite "kaynak" kullanılır (T-SQL botanik_ayna
+çeviricisiyle çalışır). Filigranın geçmişi yayınlamadığı, yeni satırların bir
+kez çekilip tüm abonelere sırayla teslim edildiği, parti taşmasının aynı
+turda okunduğu, DB hatasında filigranın ilerlemediği, yoklama sürerken
+abonelikten çıkılınca partinin yayınlanmadığı ve aralığın
+etkinlik/mesai/hataya göre uyarlandığı doğrulanır. Yoklama thread'i
+başlatılmaz; turlar tik() ile elle sürülür.
+
+Çalıştır: python test_degisiklik_akisi.py
+"""
+from __future__ import annotations
+
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import degisiklik_akisi as da
+from botanik_ayna import tsql_sqlite_cevir
+from degisiklik_akisi import (KONU_ELDEN, KONU_RECETE, DegisiklikAkisi,
+                              UyarlamaliAralik)
+
+
+class _SahteEOS:
+    """sorgu_calistir(sql, params) → list[dict] arayüzlü SQLite kaynak."""
+
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self.son_sorgu_hatasi = None
+        self.sorgular = []
+        self.hata_ver = False
+        c = self.conn
+        c.execute("CREATE TABLE ReceteAna (RxId INTEGER PRIMARY KEY, RxEReceteNo TEXT,"
+                  " RxMusteriId INTEGER, RxSilme INTEGER)")
+        c.execute("CREATE TABLE EldenAna (RxId INTEGER PRIMARY KEY, RxMusteriId INTEGER,"
+                  " RxSilme INTEGER)")
+        c.execute("CREATE TABLE Musteri (MusteriId INTEGER PRIMARY KEY, MusteriTCKN TEXT,"
+                  " MusteriAdiSoyadi TEXT, MusteriKapsamId INTEGER)")
+        c.execute("CREATE TABLE Kapsam (KapsamId INTEGER PRIMARY KEY, KapsamAdi TEXT)")
+        c.execute("INSERT INTO Kapsam VALUES (1, 'SGK')")
+        c.executemany("INSERT INTO Musteri VALUES (?, ?, ?, 1)",
+                      [(m, f"{m:011d}", f"HASTA {m}") for m in range(1, 6)])
+        self.rx_id = 0
+
+    def recete_ekle(self, n=1, silme=0):
+        for _ in range(n):
+            self.rx_id += 1
+            self.conn.execute("INSERT INTO ReceteAna VALUES (?, ?, ?, ?)",
+                              (self.rx_id, f"E{self.rx_id}", self.rx_id % 5 + 1, silme))
+            self.conn.execute("INSERT INTO EldenAna VALUES (?, ?, 0)",
+                              (self.rx_id, self.rx_id % 5 + 1))
+
+    def sorgu_calistir(self, sql, params=None):
+        self.son_sorgu_hatasi = None
+        self.sorgular.append(sql)
+        if self.hata_ver:
+            self.son_sorgu_hatasi = "08S01 iletisim hatasi"
+            return []
+        cur = self.conn.execute(tsql_sqlite_cevir(sql), params or ())
+        kolonlar = [k[0] for k in cur.description]
+        return [dict(zip(kolonlar, r)) for r in cur.fetchall()]
+
+
+def _akis(eos, **kw):
+    akis = DegisiklikAkisi(eos, **kw)
+    akis._baslat = lambda: None   # thread yok — turlar tik() ile
+    return akis
+
+
+def _topla():
+    olaylar = []
+    kosul = threading.Condition()
+
+    def geri(olay):
+        with kosul:
+            olaylar.append(olay)
+            kosul.notify_all()
+
+    def bekle(n, zaman_asimi=2.0):
+        with kosul:
+            kosul.wait_for(lambda: len(olaylar) >= n, zaman_asimi)
+        return olaylar
+
+    return geri, bekle
+
+
+def test_1_gecmis_yayinlanmaz_yeniler_bir_kez():
+    eos = _SahteEOS()
+    eos.recete_ekle(30)
+    akis = _akis(eos)
+    g1, bekle1 = _topla()
+    g2, bekle2 = _topla()
+    akis.abone_ol(KONU_RECETE, g1)
+    akis.abone_ol(KONU_RECETE, g2)
+    assert akis.filigran(KONU_RECETE) == 30
+    assert akis.tik() == {KONU_RECETE: 0}
+    eos.recete_ekle(3)
+    eos.recete_ekle(1, silme=1)          # silinmiş reçete yayınlanmaz
+    n = len(eos.sorgular)
+    assert akis.tik() == {KONU_RECETE: 3}
+    assert len(eos.sorgular) == n + 1    # tek sorgu, ayrı MAX yok
+    for bekle in (bekle1, bekle2):
+        (olay,) = bekle(1)
+        assert (olay.onceki_filigran, olay.filigran) == (30, 33)
+        assert [s["RxId"] for s in olay.satirlar] == [31, 32, 33]
+        assert olay.satirlar[0]["TC"] == "00000000002"
+        assert olay.satirlar[0]["Kapsam"] == "SGK"
+    assert akis.tik() == {KONU_RECETE: 0}
+
+
+def test_2_parti_tasmasi_ayni_turda_sirayla():
+    eos = _SahteEOS()
+    akis = _akis(eos, parti=5)
+    geri, bekle = _topla()
+    akis.abone_ol(KONU_RECETE, geri)
+    assert akis.filigran(KONU_RECETE) == 0   # boş tablo
+    eos.recete_ekle(12)
+    assert akis.tik() == {KONU_RECETE: 12}
+    olaylar = bekle(3)
+    assert [(o.onceki_filigran, o.filigran) for o in olaylar] == [(0, 5), (5, 10), (10, 12)]
+
+
+def test_3_sadece_abone_olunan_konu_yoklanir():
+    eos = _SahteEOS()
+    eos.recete_ekle(4)
+    akis = _akis(eos)
+    g_r, bekle_r = _topla()
+    g_e, bekle_e = _topla()
+    ab_r = akis.abone_ol(KONU_RECETE, g_r)
+    eos.sorgular.clear()
+    akis.tik()
+    assert all("EldenAna" not in q for q in eos.sorgular)
+    ab_e = akis.abone_ol(KONU_ELDEN, g_e)
+    eos.recete_ekle(2)
+    assert akis.tik() == {KONU_RECETE: 2, KONU_ELDEN: 2}
+    assert [o.filigran for o in bekle_e(1)] == [6]
+    ab_r.iptal()
+    eos.sorgular.clear()
+    akis.tik()
+    assert all("ReceteAna" not in q for q in eos.sorgular)
+    ab_e.iptal()
+    assert akis._dur.is_set()
+    try:
+        akis.abone_ol("stok", g_r)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("bilinmeyen konu kabul edildi")
+
+
+def test_4_db_hatasinda_filigran_ilerlemez():
+    eos = _SahteEOS()
+    eos.recete_ekle(5)
+    akis = _akis(eos)
+    geri, bekle = _topla()
+    akis.abone_ol(KONU_RECETE, geri)
+    eos.recete_ekle(2)
+    eos.hata_ver = True
+    try:
+        akis.tik()
+    except RuntimeError:
+        pass
+    else:
+        raise AssertionError("hata yutuldu")
+    assert akis.filigran(KONU_RECETE) == 5
+    eos.hata_ver = False
+    assert akis.tik() == {KONU_RECETE: 2}
+    assert bekle(1)[0].filigran == 7
+
+
+def test_5_yavas_abone_digerlerini_bekletmez():
+    eos = _SahteEOS()
+    akis = _akis(eos)
+    tutucu = threading.Event()
+    akis.abone_ol(KONU_RECETE, lambda olay: tutucu.wait(5))
+    akis.abone_ol(KONU_RECETE, lambda olay: 1 / 0)   # hata diğerlerine sızmaz
+    geri, bekle = _topla()
+    akis.abone_ol(KONU_RECETE, geri)
+    eos.recete_ekle(1)
+    t0 = time.perf_counter()
+    akis.tik()
+    eos.recete_ekle(1)
+    akis.tik()
+    assert [o.filigran for o in bekle(2)] == [1, 2]
+    assert time.perf_counter() - t0 < 1.0
+    tutucu.set()
+
+
+def test_6_uyarlamali_aralik():
+    ar = UyarlamaliAralik(min_sn=3, mesai_maks_sn=10, mesai_disi_maks_sn=120,
+                          hata_maks_sn=300, carpan=2)
+    mesai = datetime(2026, 10, 14, 11, 0)      # çarşamba
+    gece = datetime(2026, 10, 14, 23, 0)
+    pazar = datetime(2026, 10, 18, 11, 0)
+    assert da.mesai_mi(mesai) and not da.mesai_mi(gece) and not da.mesai_mi(pazar)
+    assert [ar.sonraki(False, False, mesai) for _ in range(4)] == [6, 10, 10, 10]
+    assert ar.sonraki(True, False, mesai) == 3
+    assert [ar.sonraki(False, False, gece) for _ in range(7)][-1] == 120
+    assert ar.sonraki(True, False, gece) == 3           # nöbette satış → kısa
+    assert [ar.sonraki(False, True, mesai) for _ in range(9)][-1] == 300
+    assert ar.sonraki(False, False, pazar) == 120
+
+
+def test_7_yoklama_sirasinda_abonelikten_cikis():
+    eos = _SahteEOS()
+    akis = _akis(eos)
+    geri, bekle = _topla()
+    ab = akis.abone_ol(KONU_RECETE, geri)
+    eos.recete_ekle(3)
+    asil = eos.sorgu_calistir
+
+    def cikarak_sorgula(yeniden_abone):
+        def sorgu(sql, params=None):
+            # Yeni satır sorgusu sürerken son abone başka thread'den çıkar
+            eos.sorgu_calistir = asil
+            t = threading.Thread(target=abonelik[0].iptal)
+            t.start()
+            t.join()
+            if yeniden_abone:
+                abonelik[0] = akis.abone_ol(KONU_RECETE, geri)
+            return asil(sql, params)
+        return sorgu
+
+    abonelik = [ab]
+    eos.sorgu_calistir = cikarak_sorgula(False)
+    assert akis.tik() == {KONU_RECETE: 0}         # KeyError yok, yayın yok
+    assert akis.filigran(KONU_RECETE) is None
+
+    # Çık + yeniden abone: yeni filigran (MAX) korunur, eski parti yayınlanmaz
+    abonelik[0] = akis.abone_ol(KONU_RECETE, geri)
+    eos.recete_ekle(2)
+    eos.sorgu_calistir = cikarak_sorgula(True)
+    assert akis.tik() == {KONU_RECETE: 0}
+    assert akis.filigran(KONU_RECETE) == 5
+    eos.recete_ekle(1)
+    assert akis.tik() == {KONU_RECETE: 1}
+    assert [o.filigran for o in bekle(1)] == [6]
+
+
+def main():
+    testler = [(ad, fn) for ad, fn in sorted(globals().items())
+               if ad.startswith("test_") and callable(fn)]
+    gecen = 0
+    for ad, fn in testler:
+        try:
+            fn()
+            print(f"✓ {ad}")
+            gecen += 1
+        except Exception as e:
+            print(f"✗ {ad}: {e!r}")
+    print(f"\n{gecen}/{len(testler)} geçti")
+    return 0 if gecen == len(testler) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
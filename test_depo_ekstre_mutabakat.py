@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Depo ekstre mutabakat motoru testleri.
+
+Vektörel ekstre hazırlama eski iterrows döngüsüyle, ters indeksli iade aday
+üretimi tam çift taramasıyla karşılaştırılır; belirsiz gruplarda optimal
+atamanın açgözlü seçimden kötü olmadığı ve kaba kuvvetle aynı toplamı
+verdiği doğrulanır.
+
+Çalıştır: python test_depo_ekstre_mutabakat.py
+"""
+from __future__ import annotations
+
+import itertools
+import random
+import sys
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import numpy as np
+import pandas as pd
+
+from depo_ekstre_mutabakat import (
+    BENZERLIK_ESIGI, _bonuslu_skor, atama_coz, ekstre_eslestir, ekstre_kayitlari_hazirla,
+    iade_adaylari, iade_satirlari_eslestir, ilac_ismi_benzerlik,
+)
+
+_KOLONLAR = {'fatura': 'Evrak No', 'borc': 'Borç', 'alacak': 'Alacak',
+             'tarih': 'Tarih', 'tip': 'Tip'}
+
+
+def _eski_hazirla(df, filtreler, harf):
+    """DepoEkstreModul'deki eski iterrows döngüsü (referans)."""
+    data, filtrelenen, sayac = {}, [], 0
+
+    def deger(row, col, sayi=False):
+        if sayi:
+            return float(row[col]) if pd.notna(row[col]) else 0
+        return str(row[col]).strip() if pd.notna(row[col]) else ""
+
+    for _, row in df.iterrows():
+        fatura, tarih, tip = deger(row, 'Evrak No'), deger(row, 'Tarih'), deger(row, 'Tip')
+        borc, alacak = deger(row, 'Borç', True), deger(row, 'Alacak', True)
+        kayit = {'borc': borc, 'alacak': alacak, 'tarih': tarih, 'tip': tip}
+        if any(col in row.index and deger(row, col) in d for col, d in filtreler.items()):
+            filtrelenen.append((fatura, kayit))
+            continue
+        if not fatura or fatura == 'nan':
+            if not tarih or not (abs(borc) > 0.01 or abs(alacak) > 0.01):
+                continue
+            sayac += 1
+            fatura = f"[Faturasız-{harf}{sayac}]"
+        if fatura in data:
+            n = 2
+            while f"{fatura} ({n})" in data:
+                n += 1
+            fatura = f"{fatura} ({n})"
+        data[fatura] = kayit
+    return data, filtrelenen
+
+
+def test_1_atama_kaba_kuvvetle_ayni():
+    rnd = random.Random(3)
+    for n, m in [(1, 1), (2, 3), (3, 2), (4, 4), (5, 3), (3, 6)]:
+        a = np.array([[rnd.randint(0, 20) for _ in range(m)] for _ in range(n)], dtype=float)
+        ciftler = atama_coz(a)
+        assert len(ciftler) == min(n, m)
+        assert len({i for i, _ in ciftler}) == len({j for _, j in ciftler}) == len(ciftler)
+        if n <= m:
+            en_iyi = min(sum(a[i, p[i]] for i in range(n)) for p in itertools.permutations(range(m), n))
+        else:
+            en_iyi = min(sum(a[p[j], j] for j in range(m)) for p in itertools.permutations(range(n), m))
+        assert abs(sum(a[i, j] for i, j in ciftler) - en_iyi) < 1e-9
+
+
+def test_2_hazirlama_eski_donguyle_ayni():
+    df = pd.DataFrame({
+        'Evrak No': ['F1', 'F2', None, 'F1', None, ' F3 ', 'F4', None],
+        'Borç': [100.0, None, 50.0, 20.0, None, 30.5, 10.0, 0.0],
+        'Alacak': [None, 40.0, None, None, None, None, None, 0.0],
+        'Tarih': ['01.02.2026', '03.02.2026', '05.02.2026', '06.02.2026', None,
+                  '2026-02-07', '2026-02-08', '09.02.2026'],
+        'Tip': ['Fatura', 'İade', 'Fatura', 'Fatura', 'Toplam', 'Fatura', 'Devir', None],
+    })
+    filtreler = {'Tip': ['Devir'], 'YokKolon': ['x']}
+    yeni = ekstre_kayitlari_hazirla(df, _KOLONLAR, filtreler, 'D')
+    eski = _eski_hazirla(df, filtreler, 'D')
+    assert yeni == eski, (yeni, eski)
+    assert list(yeni[0]) == ['F1', 'F2', '[Faturasız-D1]', 'F1 (2)', 'F3']
+
+
+def test_3_eslestirme_renkleri():
+    depo = {'F1': {'borc': 100.0, 'alacak': 0, 'tarih': '2026-01-10'},
+            'F2': {'borc': 50.0, 'alacak': 0, 'tarih': '2026-01-11'},
+            'X1': {'borc': 75.0, 'alacak': 0, 'tarih': '2026-01-12'},
+            'X2': {'borc': 0, 'alacak': 0, 'tarih': '2026-01-12'},
+            'X3': {'borc': 0, 'alacak': 33.0, 'tarih': '2026-01-13'}}
+    eczane = {'F1': {'borc': 100.0, 'alacak': 0, 'tarih': '2026-01-10'},
+              'F2': {'borc': 55.0, 'alacak': 0, 'tarih': '2026-01-11'},
+              'Y1': {'borc': 75.0, 'alacak': 0, 'tarih': '2026-01-20'},
+              'Y2': {'borc': 75.0, 'alacak': 0, 'tarih': '2026-01-13'},
+              'Y3': {'borc': 0, 'alacak': 0, 'tarih': ''}}
+    s = ekstre_eslestir(depo, eczane)
+    assert [x[0] for x in s['yesil']] == ['F1']
+    assert [x[0] for x in s['turuncu']] == ['F2']
+    assert [(a, b) for a, b, _, _ in s['sari']] == [('X1', 'Y2')]
+    assert [f for f, _ in s['kirmizi_depo']] == ['X2', 'X3']
+    assert [f for f, _ in s['kirmizi_eczane']] == ['Y1', 'Y3']
+
+
+def test_4_belirsiz_tutar_grubu_optimal():
+    # Açgözlü (depo sırasıyla): A1-B1 (1 gün) + A2-B2 (6 gün) = 7 gün.
+    # Optimal: A1-B2 (2 gün) + A2-B1 (3 gün) = 5 gün; B3 uzak, dışarıda kalır.
+    depo = {'A1': {'borc': 10.0, 'tarih': '2026-03-10'},
+            'A2': {'borc': 10.0, 'tarih': '2026-03-06'}}
+    eczane = {'B1': {'borc': 10.0, 'tarih': '2026-03-09'},
+              'B2': {'borc': 10.0, 'tarih': '2026-03-12'},
+              'B3': {'borc': 10.0, 'tarih': '2026-06-12'}}
+    sari = ekstre_eslestir(depo, eczane)['sari']
+    assert sorted((a, b) for a, b, _, _ in sari) == [('A1', 'B2'), ('A2', 'B1')]
+
+
+def _rastgele_iade(rnd, n):
+    kelimeler = ['PAROL', 'ARVELES', 'AUGMENTIN', 'BS', 'MG', '500', '1000', 'TABLET',
+                 'FILM', 'TB', 'DUO', 'FORT', 'KAPSUL', '20', 'CORASPIN', '100']
+    satirlar = []
+    for _ in range(n):
+        ad = ' '.join(rnd.sample(kelimeler, rnd.randint(0, 4)))
+        satirlar.append({'urun_adi': ad.replace(' ', rnd.choice([' ', '-', '.'])),
+                         'barkod': rnd.choice(['', '869111', '869222', '869333']),
+                         'miktar': rnd.randint(1, 3), 'tutar': rnd.choice([10, 20, 30]),
+                         'toplam_tutar': rnd.choice([10, 20, 30])})
+    return satirlar
+
+
+def test_5_ters_indeks_tam_taramayla_ayni():
+    rnd = random.Random(7)
+    depo, botanik = _rastgele_iade(rnd, 60), _rastgele_iade(rnd, 70)
+    tam = {}
+    for i, d in enumerate(depo):
+        for j, b in enumerate(botanik):
+            skor = 0.0
+            if d['barkod'] and b['barkod'] and d['barkod'] == b['barkod']:
+                skor = 1.0
+            if skor < 1.0:
+                skor = ilac_ismi_benzerlik(d['urun_adi'], b['urun_adi'])
+            if skor >= BENZERLIK_ESIGI:
+                tam[(i, j)] = skor
+    assert iade_adaylari(depo, botanik) == tam
+
+
+def test_6_iade_atamasi_acgozluden_kotu_degil():
+    rnd = random.Random(11)
+    for _ in range(20):
+        depo, botanik = _rastgele_iade(rnd, 12), _rastgele_iade(rnd, 12)
+        sonuc = iade_satirlari_eslestir(depo, botanik)
+        adaylar = iade_adaylari(depo, botanik)
+        e = sonuc['eslesmeler']
+        assert len({m['depo_idx'] for m in e}) == len({m['botanik_idx'] for m in e}) == len(e)
+        assert all((m['depo_idx'], m['botanik_idx']) in adaylar for m in e)
+        assert len(e) + len(sonuc['eslesmeyen_depo']) == len(depo)
+        # Açgözlü referans (eski yol) — bonuslu skor toplamı üzerinden
+        skor = {k: _bonuslu_skor(depo[k[0]], botanik[k[1]], s) for k, s in adaylar.items()}
+        acgozlu, kd, kb = 0.0, set(), set()
+        for (i, j), s in sorted(skor.items(), key=lambda x: -x[1]):
+            if i not in kd and j not in kb:
+                acgozlu += s
+                kd.add(i)
+                kb.add(j)
+        optimal = sum(skor[(m['depo_idx'], m['botanik_idx'])] for m in e)
+        assert optimal >= acgozlu - 1e-9, (optimal, acgozlu)
+
+
+def main() -> int:
+    testler = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    basarisiz = 0
+    for t in testler:
+        try:
+            t()
+            print(f"✓ {t.__name__}")
+        except AssertionError as e:
+            basarisiz += 1
+            print(f"✗ {t.__name__}: {e}")
+    print(f"\n{len(testler) - basarisiz}/{len(testler)} geçti")
+    return 1 if basarisiz else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
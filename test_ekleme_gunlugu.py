@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Ekleme günlüğü — KontrolMotoru hafızası + TimingSettings istatistikleri.
+
+İşaretleme/ölçüm dosyayı yeniden yazmadan tek satır eklemeli, yeniden
+açılışta durum aynen kurulmalı, yarım satır (çökme) okumayı bozmamalı,
+eski tam-JSON dosyaları bir kez taşınmalı.
+
+Çalıştır: python test_ekleme_gunlugu.py
+"""
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from ekleme_gunlugu import EklemeGunlugu
+from recete_kontrol.kontrol_motoru import KontrolMotoru, _donem_siniri
+from timing_settings import TimingSettings, istatistikleri_oku
+
+
+def _satirlar(yol: Path):
+    return [s for s in yol.read_text(encoding="utf-8").splitlines() if s.strip()]
+
+
+def test_1_gunluk_yarim_satiri_atlar_ve_devam_eder():
+    yol = Path(tempfile.mkdtemp()) / "g.jsonl"
+    g = EklemeGunlugu(yol)
+    g.ekle({"r": "A"})
+    g.kapat()
+    with open(yol, "a", encoding="utf-8") as f:
+        f.write('{"r": "YARI')           # çökme: satır yarım kaldı
+    g = EklemeGunlugu(yol)
+    assert [k["r"] for k in g.oku()] == ["A"] and g.bozuk_satir == 1
+    g.ekle({"r": "B"})
+    assert [k["r"] for k in EklemeGunlugu(yol).oku()] == ["A", "B"]
+
+
+def test_2_isaretleme_tek_satir_ekler_ve_yeniden_yuklenir():
+    dizin = Path(tempfile.mkdtemp())
+    motor = KontrolMotoru(str(dizin / "kontrol_edilenler.json"))
+    gunluk = dizin / "kontrol_edilenler.jsonl"
+    for i in range(50):
+        motor.kontrol_edildi_isaretle(f"R{i}")
+    motor.kontrol_edildi_isaretle("R3")        # aynı dönem tekrar: yazma yok
+    assert len(_satirlar(gunluk)) == 50
+    motor.kapat()
+    motor2 = KontrolMotoru(str(dizin / "kontrol_edilenler.json"))
+    assert motor2.daha_once_kontrol_edildi_mi("R49")
+    assert not motor2.daha_once_kontrol_edildi_mi("R50")
+    assert motor2.istatistik_al()["toplam_kontrol_edilen"] == 50
+    motor2.hafizayi_temizle()
+    assert _satirlar(gunluk) == []
+    assert not KontrolMotoru(str(dizin / "kontrol_edilenler.json")).kontrol_edilenler
+
+
+def test_3_eski_json_tasinir_ve_eski_donem_duser():
+    dizin = Path(tempfile.mkdtemp())
+    bu_ay = datetime.now().isoformat()
+    (dizin / "kontrol_edilenler.json").write_text(json.dumps(
+        {"son_guncelleme": bu_ay, "kontrol_edilenler": ["E1", "E2"]}), encoding="utf-8")
+    motor = KontrolMotoru(str(dizin / "kontrol_edilenler.json"), saklama_ay=2)
+    assert motor.kontrol_edilenler == {"E1", "E2"}
+    assert len(_satirlar(dizin / "kontrol_edilenler.jsonl")) == 2
+    motor.kontrol_edildi_isaretle("ESKI", donem="2001-01")
+    assert motor.eski_donemleri_temizle() == 1
+    assert not motor.daha_once_kontrol_edildi_mi("ESKI")
+    motor.kapat()
+    assert KontrolMotoru(str(dizin / "kontrol_edilenler.json")).kontrol_edilenler == {"E1", "E2"}
+
+
+def test_4_donem_siniri():
+    assert _donem_siniri(1, datetime(2026, 3, 5)) == "2026-03"
+    assert _donem_siniri(3, datetime(2026, 2, 5)) == "2025-12"
+
+
+def test_5_timing_istatistik_gunlugu():
+    dizin = Path(tempfile.mkdtemp())
+    ayar, stat = str(dizin / "ts.json"), str(dizin / "timing_stats.json")
+    ts = TimingSettings(ayar, stat)
+    for sure in (0.1, 0.2, 0.3):
+        ts.kayit_ekle("ilac_butonu", sure)
+    ts.kayit_ekle("y_butonu", 0.5)
+    assert len(_satirlar(dizin / "timing_stats.jsonl")) == 4
+    ts2 = TimingSettings(ayar, stat)
+    assert ts2.istatistik_al("ilac_butonu")["count"] == 3
+    assert abs(ts2.ortalama_al("ilac_butonu") - 0.2) < 1e-9
+    assert ts2.istatistik_kaydet()
+    assert len(_satirlar(dizin / "timing_stats.jsonl")) == 2
+    ts2.istatistik_sifirla()
+    assert TimingSettings(ayar, stat).istatistikler == {}
+
+
+def test_6_timing_eski_json_tasinir():
+    dizin = Path(tempfile.mkdtemp())
+    (dizin / "timing_stats.json").write_text(json.dumps(
+        {"sorgula_butonu": {"count": 4, "total_time": 2.0}}), encoding="utf-8")
+    ts = TimingSettings(str(dizin / "ts.json"), str(dizin / "timing_stats.json"))
+    ts.kayit_ekle("sorgula_butonu", 1.0)
+    ts = TimingSettings(str(dizin / "ts.json"), str(dizin / "timing_stats.json"))
+    assert ts.istatistik_al("sorgula_butonu") == {"count": 5, "total_time": 3.0}
+
+
+def test_7_analiz_araclari_gunlugu_salt_okur():
+    dizin = Path(tempfile.mkdtemp())
+    stat = dizin / "timing_stats.json"
+    stat.write_text(json.dumps({"y_butonu": {"count": 2, "total_time": 1.0}}), encoding="utf-8")
+    assert istatistikleri_oku(stat) == {"y_butonu": {"count": 2, "total_time": 1.0}}
+    ts = TimingSettings(str(dizin / "ts.json"), str(stat))
+    for sure in (0.5, 1.5):
+        ts.kayit_ekle("y_butonu", sure)
+    oncesi = _satirlar(dizin / "timing_stats.jsonl")
+    assert istatistikleri_oku(stat) == {"y_butonu": {"count": 4, "total_time": 3.0}}
+    assert _satirlar(dizin / "timing_stats.jsonl") == oncesi            # sıkıştırma yok
+
+
+def main() -> int:
+    testler = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    basarisiz = 0
+    for t in testler:
+        try:
+            t()
+            print(f"✓ {t.__name__}")
+        except AssertionError as e:
+            basarisiz += 1
+            print(f"✗ {t.__name__}: {e}")
+    print(f"\n{len(testler) - basarisiz}/{len(testler)} geçti")
+    return 1 if basarisiz else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
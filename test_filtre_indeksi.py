@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Filtre indeksi (filtre_indeksi) testleri — Tk gerektirmez.
+
+Rastgele reçete satırları ve rastgele filtre durumları üzerinde maske
+motorunun (filtre_maskesi) satır bazlı referansla (satir_gecer_mi) aynı
+görünür kümeyi verdiği; arama daraltma önbelleği, yüklem önbelleği, uçucu
+sütunların turda tazelenmesi ve eklenen/çıkan farkı doğrulanır.
+
+Çalıştır: python test_filtre_indeksi.py
+"""
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from filtre_indeksi import (FiltreDurumu, FiltreIndeksi, filtre_maskesi,
+                            satir_gecer_mi, teyit_sayimi, verdict_sayimi)
+
+VERDICTLER = ["UYGUN", "UYGUN DEĞİL", "ŞÜPHELİ", "ŞARTLI UYGUN", "", "ATLANDI", None]
+TEYITLER = ["UYGUN", "SUPHELI", "UYGUN_DEGIL", ""]
+RENKLER = ["beyaz", "yesil", "sari", "kirmizi"]
+ILACLAR = ["ATOR 20 MG", "CRESTOR 10", "XARELTO 20", "GLİFOR 1000",
+           "JANUVIA 100", "İBUPROFEN", "PLAVIX 75", "ELIQUIS 5"]
+ETKINLER = ["ATORVASTATIN", "ROSUVASTATIN", "RIVAROKSABAN", "METFORMIN",
+            "SITAGLIPTIN", "IBUPROFEN", "KLOPIDOGREL", "APIKSABAN", None]
+
+
+def _satirlar(n, tohum=1):
+    rnd = random.Random(tohum)
+    satirlar = []
+    for i in range(n):
+        satirlar.append({
+            "ri_id": 1000 + i,
+            "ilac": rnd.choice(ILACLAR),
+            "etkin": rnd.choice(ETKINLER),
+            "atc": rnd.choice(["C10AA05", "B01AF01", "A10BA02", None]),
+            "verdict": rnd.choice(VERDICTLER),
+            "msj": rnd.choice(["var", "yok", " VAR ", "", None]),
+            "rap_kod": rnd.choice(["", "04.05", " ", None, "20.01"]),
+            "rec_tip": rnd.choice(["Normal", "Kırmızı", "Yeşil", None]),
+            "doktor": rnd.choice(["Dr. Şükrü Işık", "Dr. Ayşe İnce", "Dr. Can"]),
+            "tutar": rnd.choice([10, 0, None, 12.5]),
+        })
+    return satirlar
+
+
+def _rastgele_durum(rnd, satirlar):
+    iidler = [str(s["ri_id"]) for s in satirlar]
+    eslesir = lambda ilac, atc, etkin, setler: (ilac or "") in setler[0]
+    durum = FiltreDurumu(
+        teyit_harita={i: rnd.choice(TEYITLER) for i in iidler if rnd.random() < 0.3},
+        renkler={i: rnd.choice(RENKLER) for i in iidler if rnd.random() < 0.5},
+        varsayilan_renk="beyaz")
+    if rnd.random() < 0.3:
+        durum.kontrol_disi.append((eslesir, ({rnd.choice(ILACLAR)}, set(), set())))
+    durum.msj_mod = rnd.choice(["hepsi", "var", "yok"])
+    durum.rapor_mod = rnd.choice(["hepsi", "raporlu", "raporsuz"])
+    if rnd.random() < 0.6:
+        durum.verdict_filtre = {v: rnd.random() < 0.7
+                                for v in ["UYGUN", "UYGUN DEĞİL", "ŞÜPHELİ", ""]}
+    if rnd.random() < 0.5:
+        durum.teyit_filtre = {t: rnd.random() < 0.7 for t in TEYITLER}
+    if rnd.random() < 0.4:
+        durum.arama["doktor"] = rnd.choice(["ış", "dr ay", "  ", "İNCE", "can dr"])
+    if rnd.random() < 0.4:
+        durum.deger["ilac"] = set(rnd.sample(ILACLAR, 3))
+    if rnd.random() < 0.4:
+        durum.metin["tutar"] = rnd.choice([
+            [{"baglac": None, "op": "bos", "deger": ""}],
+            [{"baglac": None, "op": "baslar", "deger": "1"},
+             {"baglac": "veya", "op": "esit", "deger": "12.5"}],
+            ("icerir", "0")])
+    if rnd.random() < 0.5:
+        durum.renk_acik = set(rnd.sample(RENKLER, 2))
+    if rnd.random() < 0.3:
+        durum.gizli_recete_turleri = {"Kırmızı"}
+    return durum
+
+
+def test_1_maske_satir_bazli_ile_ayni():
+    satirlar = _satirlar(600)
+    indeks = FiltreIndeksi(satirlar)
+    rnd = random.Random(7)
+    for _ in range(150):
+        durum = _rastgele_durum(rnd, satirlar)
+        beklenen = [str(s["ri_id"]) for s in satirlar
+                    if satir_gecer_mi(s, str(s["ri_id"]), durum)]
+        assert indeks.iidler(filtre_maskesi(indeks, durum)) == beklenen
+
+
+def test_2_fark_eklenen_cikan():
+    satirlar = _satirlar(200)
+    indeks = FiltreIndeksi(satirlar)
+    hepsi = filtre_maskesi(indeks, FiltreDurumu())
+    eklenen, cikan = indeks.fark(hepsi)
+    assert len(eklenen) == 200 and cikan == []
+    durum = FiltreDurumu(verdict_filtre={"UYGUN": False})
+    eklenen, cikan = indeks.fark(filtre_maskesi(indeks, durum))
+    beklenen = [str(s["ri_id"]) for s in satirlar
+                if (s["verdict"] or "").strip() == "UYGUN"]
+    assert eklenen == [] and cikan == beklenen
+    eklenen, cikan = indeks.fark(filtre_maskesi(indeks, FiltreDurumu()))
+    assert eklenen == beklenen and cikan == []
+
+
+def test_3_arama_daraltma_ayni_sonuc():
+    satirlar = _satirlar(300, tohum=3)
+    indeks = FiltreIndeksi(satirlar)
+    for metin in ["d", "dr", "dr ı", "dr ış", "dr ışı", "ay", "dr"]:
+        durum = FiltreDurumu(arama={"doktor": metin})
+        beklenen = [str(s["ri_id"]) for s in satirlar
+                    if satir_gecer_mi(s, str(s["ri_id"]), durum)]
+        assert indeks.iidler(filtre_maskesi(indeks, durum)) == beklenen, metin
+
+
+def test_4_yuklem_bir_kez_hesaplanir():
+    satirlar = _satirlar(100)
+    indeks = FiltreIndeksi(satirlar)
+    cagri = []
+
+    def statin(s):
+        cagri.append(1)
+        if s["etkin"] is None:
+            raise ValueError("etkin yok")
+        return "STATIN" in s["etkin"]
+
+    m1 = indeks.yuklem_maskesi(statin, statin)
+    m2 = indeks.yuklem_maskesi(statin, statin)
+    assert len(cagri) == 100
+    assert (m1 == m2).all()
+    assert indeks.iidler(m1) == [str(s["ri_id"]) for s in satirlar
+                                  if s["etkin"] and "STATIN" in s["etkin"]]
+
+
+def test_5_ucucu_kolon_turda_tazelenir():
+    satirlar = _satirlar(50)
+    indeks = FiltreIndeksi(satirlar)
+    durum = FiltreDurumu(verdict_filtre={"UYGUN": True, "": False})
+    filtre_maskesi(indeks, durum)
+    satirlar[0]["verdict"] = "UYGUN"
+    satirlar[1]["verdict"] = ""
+    simdi = indeks.iidler(filtre_maskesi(indeks, durum))
+    assert "1000" in simdi and "1001" not in simdi
+    # SQL sütunları indeks ömrü boyunca bir kez kodlanır
+    msj = indeks.kolon("msj")
+    filtre_maskesi(indeks, durum)
+    assert indeks.kolon("msj") is msj
+    # Uçucu sütun değişmediyse kodları yeniden kullanılır, değiştiyse tazelenir
+    verdict = indeks.kolon("verdict")
+    indeks.yeni_tur()
+    assert indeks.kolon("verdict") is verdict
+    satirlar[2]["verdict"] = "YENİ ETİKET"
+    indeks.yeni_tur()
+    assert "YENİ ETİKET" in indeks.kolon("verdict").degerler
+
+
+def test_6_etiket_sayimlari():
+    satirlar = _satirlar(400, tohum=5)
+    indeks = FiltreIndeksi(satirlar)
+    etiketler = ["UYGUN", "UYGUN DEĞİL", "ŞÜPHELİ", "ŞARTLI UYGUN", ""]
+    sayim = verdict_sayimi(indeks, etiketler)
+    assert sum(sayim.values()) == 400
+    assert sayim["UYGUN"] == sum(1 for s in satirlar if s["verdict"] == "UYGUN")
+    assert sayim[""] == sum(1 for s in satirlar
+                            if (s["verdict"] or "").strip() not in etiketler[:-1])
+    harita = {"1000": "UYGUN", "1001": "SUPHELI", "1002": "BILINMEYEN"}
+    sayim_t = teyit_sayimi(indeks, harita, TEYITLER)
+    assert sayim_t == {"UYGUN": 1, "SUPHELI": 1, "UYGUN_DEGIL": 0, "": 398}
+
+
+def main():
+    testler = [(ad, fn) for ad, fn in sorted(globals().items())
+               if ad.startswith("test_") and callable(fn)]
+    gecen = 0
+    for ad, fn in testler:
+        try:
+            fn()
+            print(f"✓ {ad}")
+            gecen += 1
+        except Exception as e:
+            print(f"✗ {ad}: {e!r}")
+    print(f"\n{gecen}/{len(testler)} geçti")
+    return 0 if gecen == len(testler) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Hasta takip kuyruğu — toplu rapor durumu sorgusu testleri.
+
+_urunler_raporlu_mu'nun çift başına sorgu yerine parti başına en fazla iki
+SELECT gönderdiği, ReceteIlaclari → MedulaHastaIlaclari önceliğini ve
+True/False/None anlamlarını koruduğu; SQL UPPER()'ın Türkçe 'İ'si ile
+Python adlarının eşleştiği; bekleyen_raporsuz_temizle'nin bu parti
+sonucuyla kuyruğu doğru temizlediği sahte bir BotanikDB ile doğrulanır.
+
+Çalıştır: python test_hasta_takip_rapor_toplu.py
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sys
+import tempfile
+import types
+from datetime import datetime
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from hasta_takip_kuyruk import MesajKuyrugu
+
+# (musteri_id, urun_adi, rk, tarih) — en geç tarihli satır belirleyici
+_RECETE = [
+    (1, "PAROL 500 MG", 0, "2026-01-01"),
+    (1, "PAROL 500 MG", 7, "2026-05-01"),      # son alım raporlu
+    (1, "CORASPIN 100", 3, "2026-02-01"),
+    (1, "CORASPIN 100", None, "2026-06-01"),   # son alım raporsuz
+    (2, "GLIFOR 1000", 12, "2026-04-01"),
+    (5, "Dikloron 75 mg", 4, "2026-03-01"),    # küçük harfli kayıt: UPPER() → DİKLORON
+]
+_MEDULA = [
+    (2, "LANTUS SOLOSTAR", "2.4.4(1)", "2026-03-01"),
+    (2, "BELOC ZOK", "  ", "2026-03-01"),
+    (3, "GLIFOR 1000", 0, "2026-03-01"),
+    (1, "PAROL 500 MG", None, "2026-09-01"),   # Recete önceliği: görülmemeli
+    (5, "Nexium 40 mg", "", "2026-03-01"),
+]
+
+
+def _sql_upper(metin):
+    """SQL Server UPPER() Türkçe collation'da: i → İ, ı → I."""
+    return metin.replace("i", "İ").replace("ı", "I").upper()
+
+
+class _SahteDB:
+    """sorgu_calistir'i IN listesi + ürün adı parametreleriyle yanıtlar
+    (Türkçe, büyük/küçük harf duyarsız collation gibi)."""
+
+    def __init__(self, hata: bool = False):
+        self.sorgular = []
+        self.hata = hata
+        self.kapandi = False
+
+    def sorgu_calistir(self, sql, params=None):
+        self.sorgular.append(sql)
+        if self.hata:
+            raise RuntimeError("bağlantı koptu")
+        assert sql.lstrip().upper().startswith(("SELECT", "WITH"))
+        ids = {int(x) for x in re.search(r"IN \(([\d,]+)\)", sql).group(1).split(",")}
+        adlar = {_sql_upper(a) for a in params}
+        kaynak = _RECETE if "ReceteIlaclari" in sql else _MEDULA
+        son = {}
+        for mid, urun, rk, tarih in kaynak:
+            key = (mid, _sql_upper(urun))
+            if mid in ids and key[1] in adlar and (key not in son or tarih > son[key][1]):
+                son[key] = (rk, tarih)
+        return [{"mid": m, "urun_adi": u, "rk": rk} for (m, u), (rk, _) in son.items()]
+
+    def baglan(self):
+        return True
+
+    def kapat(self):
+        self.kapandi = True
+
+
+def test_1_anlamlar_korunur():
+    db = _SahteDB()
+    ciftler = [(1, "PAROL 500 MG"), (1, "coraspin 100 "), (2, "GLIFOR 1000"),
+               (2, "LANTUS SOLOSTAR"), (2, "BELOC ZOK"), (3, "GLIFOR 1000"),
+               (4, "BILINMEYEN")]
+    d = MesajKuyrugu._urunler_raporlu_mu(db, ciftler)
+    assert d[(1, "PAROL 500 MG")] is True
+    assert d[(1, "CORASPIN 100")] is False
+    assert d[(2, "GLIFOR 1000")] is True
+    assert d[(2, "LANTUS SOLOSTAR")] is True
+    assert d[(2, "BELOC ZOK")] is False
+    assert d[(3, "GLIFOR 1000")] is False
+    assert d[(4, "BILINMEYEN")] is None
+
+
+def test_2_parti_basina_iki_sorgu():
+    db = _SahteDB()
+    ciftler = [(m, f"ILAC {i}") for m in range(1, 51) for i in range(10)]
+    MesajKuyrugu._urunler_raporlu_mu(db, ciftler, parti=200)
+    # 500 çift → 3 parti; her partide Recete + (bulunamayanlar için) Medula
+    assert len(db.sorgular) == 6, len(db.sorgular)
+
+
+def test_3_tekil_sarmalayici_ayni_sonuc():
+    for mid, urun in [(1, "PAROL 500 MG"), (1, "CORASPIN 100"),
+                      (2, "BELOC ZOK"), (9, "YOK")]:
+        toplu = MesajKuyrugu._urunler_raporlu_mu(_SahteDB(), [(mid, urun)])
+        assert MesajKuyrugu._urun_raporlu_mu(_SahteDB(), mid, urun) == \
+            toplu[(mid, urun.upper())]
+
+
+def test_4_sorgu_hatasi_bilinmiyor():
+    d = MesajKuyrugu._urunler_raporlu_mu(_SahteDB(hata=True), [(1, "PAROL 500 MG")])
+    assert d == {(1, "PAROL 500 MG"): None}
+
+
+def test_5_bekleyen_raporsuz_temizle():
+    db = _SahteDB()
+    sahte_modul = types.ModuleType("botanik_db")
+    sahte_modul.BotanikDB = lambda: db
+    eski = sys.modules.get("botanik_db")
+    sys.modules["botanik_db"] = sahte_modul
+    try:
+        yol = os.path.join(tempfile.mkdtemp(), "hasta_takip.db")
+        k = MesajKuyrugu(yol)
+        simdi = datetime.now().isoformat()
+        with k._conn() as c:
+            for mid, ilaclar in [
+                (1, ["PAROL 500 MG", "CORASPIN 100"]),
+                (2, ["BELOC ZOK"]),
+                (4, ["BILINMEYEN"]),
+            ]:
+                c.execute(
+                    "INSERT INTO mesaj_kuyrugu (musteri_id, hasta_adi, ilac_json, olusturma) "
+                    "VALUES (?, ?, ?, ?)",
+                    (mid, f"H{mid}", json.dumps([{"urun_adi": u} for u in ilaclar]), simdi),
+                )
+        assert k.bekleyen_raporsuz_temizle() == 2
+        assert len(db.sorgular) == 2 and db.kapandi
+        with k._conn() as c:
+            kalan = {r["musteri_id"]: [i["urun_adi"] for i in json.loads(r["ilac_json"])]
+                     for r in c.execute("SELECT musteri_id, ilac_json FROM mesaj_kuyrugu")}
+        assert kalan == {1: ["PAROL 500 MG"], 4: ["BILINMEYEN"]}, kalan
+    finally:
+        if eski is None:
+            sys.modules.pop("botanik_db", None)
+        else:
+            sys.modules["botanik_db"] = eski
+
+
+def test_6_turkce_buyuk_harf_eslesir():
+    ciftler = [(5, "Dikloron 75 mg"), (5, "DİKLORON 75 MG"), (5, "nexium 40 mg")]
+    d = MesajKuyrugu._urunler_raporlu_mu(_SahteDB(), ciftler)
+    assert d == {(5, "DIKLORON 75 MG"): True, (5, "NEXIUM 40 MG"): False}, d
+    assert MesajKuyrugu._urun_raporlu_mu(_SahteDB(), 5, "Dikloron 75 mg") is True
+    assert MesajKuyrugu._urun_raporlu_mu(_SahteDB(), 5, "Nexium 40 mg") is False
+
+
+def main() -> int:
+    testler = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    basarisiz = 0
+    for t in testler:
+        try:
+            t()
+            print(f"✓ {t.__name__}")
+        except AssertionError as e:
+            basarisiz += 1
+            print(f"✗ {t.__name__}: {e}")
+    print(f"\n{len(testler) - basarisiz}/{len(testler)} geçti")
+    return 1 if basarisiz else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""İnceleme durum deposu (inceleme_durum_deposu) ve recete_teyit_db noktasal
+okuma önbelleği testleri.
+
+Eski tek-dosya JSON'un bir kez taşındığı, dönem okumasının sadece o dönemi
+getirdiği, kaydetmenin sadece farkı yazdığı ve art arda kaydetmelerin tek
+toplu yazmaya indiği; teyit/AI haritalarının ri_id listesiyle parça parça
+okunup yazmalarla tutarlı kaldığı doğrulanır.
+
+Çalıştır: python test_inceleme_durum_deposu.py
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import recete_teyit_db
+from inceleme_durum_deposu import IncelemeDurumDeposu
+
+
+def _db_satirlari(yol):
+    with sqlite3.connect(str(yol)) as c:
+        return sorted(c.execute("SELECT donem, ri_id, renk FROM satir_renk"))
+
+
+def test_1_json_bir_kez_tasinir():
+    with tempfile.TemporaryDirectory() as d:
+        d = Path(d)
+        js = d / "state.json"
+        js.write_text(json.dumps({
+            "2026-08": {"1": "yesil", "2": "beyaz", "3": "kirmizi"},
+            "2026-09": {"4": "sari"},
+            "bozuk": ["liste"],
+        }), encoding="utf-8")
+        depo = IncelemeDurumDeposu(d / "state.db", json_yolu=js, gecikme_sn=0)
+        assert not js.exists() and (d / "state.json.tasindi").exists()
+        assert depo.donem_renkleri("2026-08") == {"1": "yesil", "3": "kirmizi"}
+        assert depo.donem_renkleri("2026-09") == {"4": "sari"}
+        assert depo.donem_renkleri("2026-10") == {}
+        depo.kapat()
+        # İkinci açılışta (JSON yeniden belirse bile) göç tekrarlanmaz
+        js.write_text(json.dumps({"2026-08": {"1": "gri"}}), encoding="utf-8")
+        depo = IncelemeDurumDeposu(d / "state.db", json_yolu=js, gecikme_sn=0)
+        assert depo.donem_renkleri("2026-08")["1"] == "yesil"
+        assert js.exists()
+        depo.kapat()
+
+
+def test_2_kaydet_sadece_farki_yazar():
+    with tempfile.TemporaryDirectory() as d:
+        yol = Path(d) / "state.db"
+        depo = IncelemeDurumDeposu(yol, gecikme_sn=0)
+        renkler = {str(i): "beyaz" for i in range(1000)}
+        renkler.update({"5": "yesil", "6": "sari"})
+        assert depo.donem_kaydet("2026-09", renkler) == 2
+        assert depo.donem_kaydet("2026-09", renkler) == 0
+        renkler["5"] = "beyaz"
+        renkler["7"] = "kirmizi"
+        assert depo.donem_kaydet("2026-09", renkler) == 2
+        depo.donem_kaydet("2026-08", {"5": "gri"})
+        assert _db_satirlari(yol) == [("2026-08", "5", "gri"),
+                                      ("2026-09", "6", "sari"),
+                                      ("2026-09", "7", "kirmizi")]
+        depo.kapat()
+
+
+def test_3_gecikmeli_toplu_yazma():
+    with tempfile.TemporaryDirectory() as d:
+        yol = Path(d) / "state.db"
+        depo = IncelemeDurumDeposu(yol, gecikme_sn=0.2)
+        renkler = {}
+        for i in range(20):
+            renkler[str(i)] = "yesil"
+            depo.donem_kaydet("2026-09", renkler)
+        # Henüz diske yazılmadı ama okuma önbellekten güncel
+        assert _db_satirlari(yol) == []
+        assert len(depo.donem_renkleri("2026-09")) == 20
+        time.sleep(0.6)
+        assert len(_db_satirlari(yol)) == 20
+        # Kapanışta bekleyenler hemen yazılır
+        depo.donem_kaydet("2026-09", {"x": "sari"})
+        depo.kapat()
+        assert _db_satirlari(yol) == [("2026-09", "x", "sari")]
+
+
+def test_4_teyit_ai_noktasal_onbellek():
+    eski_yol, eski_conn = recete_teyit_db._db_yolu, recete_teyit_db._conn
+    with tempfile.TemporaryDirectory() as d:
+        recete_teyit_db._db_yolu = lambda: Path(d) / "sut_kontrol.db"
+        recete_teyit_db._conn = None
+        recete_teyit_db.onbellegi_temizle()
+        try:
+            for i in range(0, 2000, 3):
+                assert recete_teyit_db.teyit_kaydet(str(i), "UYGUN")
+            recete_teyit_db.ai_sonuc_kaydet("4", ai_sonuc="SUPHELI", ai_guven=0.4)
+            recete_teyit_db.onbellegi_temizle()
+
+            idler = [str(i) for i in range(2000)]   # IN limitini aşar → parçalı
+            harita = recete_teyit_db.teyit_haritasi(idler)
+            assert harita == {str(i): "UYGUN" for i in range(0, 2000, 3)}
+            assert recete_teyit_db.teyit_haritasi(["0", "1", "yok"]) == {"0": "UYGUN"}
+            ai = recete_teyit_db.ai_sonuc_haritasi(idler)
+            assert list(ai) == ["4"] and ai["4"]["ai_guven"] == 0.4
+
+            # Yazmalar önbelleğe yansır (yeniden sorgu gerekmeden)
+            recete_teyit_db.teyit_kaydet("1", "SUPHELI")
+            recete_teyit_db.teyit_sil("0")
+            recete_teyit_db.ai_sonuc_kaydet("1", ai_sonuc="UYGUN")
+            assert recete_teyit_db.teyit_haritasi(["0", "1", "3"]) == {
+                "1": "SUPHELI", "3": "UYGUN"}
+            assert set(recete_teyit_db.ai_sonuc_haritasi(["1", "4"])) == {"1", "4"}
+            # Liste verilmezse eski davranış: tüm tablo
+            assert len(recete_teyit_db.teyit_haritasi()) == len(harita)
+        finally:
+            if recete_teyit_db._conn is not None:
+                recete_teyit_db._conn.close()
+            recete_teyit_db._db_yolu, recete_teyit_db._conn = eski_yol, eski_conn
+            recete_teyit_db.onbellegi_temizle()
+
+
+def main():
+    testler = [(ad, fn) for ad, fn in sorted(globals().items())
+               if ad.startswith("test_") and callable(fn)]
+    gecen = 0
+    for ad, fn in testler:
+        try:
+            fn()
+            print(f"✓ {ad}")
+            gecen += 1
+        except Exception as e:
+            print(f"✗ {ad}: {e!r}")
+    print(f"\n{gecen}/{len(testler)} geçti")
+    return 0 if gecen == len(testler) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Medula anlık DOM okuyucusu (medula_dom_anlik) testleri.
+
+Kayıtlı reçete sayfası (tools/_inceleme_html.html) üzerinde başlık alanları
+ve ilaç tablosunun doğru okunduğu; BotanikEOS'un enjekte ettiği skyblue
+satırlı sentetik sayfada anlık okuyucunun, aynı sayfayı eleman eleman
+okuyan COM yoluyla (AnlikBelge) birebir aynı satırları verdiği;
+rapor listesi sayfasından row_data listeleri ve hak sahibi adının eski
+gruplama kurallarıyla çıkarıldığı; IE'nin kapanışsız etiketlerinin
+ayrıştırılabildiği doğrulanır.
+
+Çalıştır: python test_medula_dom_anlik.py
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from medula_dom_anlik import (AnlikBelge, DomAnlik, hak_sahibi_adi, hasta_basligi,
+                              ilac_tablosu, ilac_tablosu_com_oku,
+                              rapor_listesi_satirlari, rapor_satirlarini_grupla)
+
+KAYITLI_SAYFA = Path(__file__).resolve().parent / "tools" / "_inceleme_html.html"
+
+
+# ── Sentetik sayfalar (IE outerHTML biçimi: büyük harf, tırnaksız) ──────────
+
+_EOS_RENKLERI = ("lightgreen", "LightCoral", "goldenrod", "red", "navy")
+
+
+def recete_sayfasi(ilac_sayisi=4, eos=True, dolgu_satir=0):
+    """f:tbl1 ilaç tablosu + isteğe bağlı skyblue EOS satırları + dolgu satırları."""
+    satirlar = []
+    for i in range(ilac_sayisi):
+        satirlar.append(
+            f'<TR class=rowClass1><TD><INPUT id=f:tbl1:{i}:t1 class=inputText size=15 '
+            f'value={8699500000000 + i} name=f:tbl1:{i}:t1></TD>'
+            f'<TD><SPAN id=f:tbl1:{i}:t6 class=outputText urunid="{i}">İLAÇ {i} 500 MG'
+            f'&nbsp;30 TB</SPAN></TD>'
+            f'<TD><SPAN id=f:tbl1:{i}:t9 class=outputText>{"04.05" if i % 2 else ""}</SPAN></TD>'
+            f'<TD><SPAN id=f:tbl1:{i}:t11 class=outputText style="CURSOR: pointer">'
+            f'{"var" if i % 3 == 0 else "yok"}</SPAN></TD></TR>')
+        if eos:
+            renk = _EOS_RENKLERI[i % len(_EOS_RENKLERI)]
+            satirlar.append(
+                f'<TR style="BACKGROUND-COLOR: skyblue"><TD></TD>'
+                f'<TD style="BACKGROUND-COLOR: {renk}">1 Günde {i + 1} x 1,00 - Adet</TD>'
+                f'<TD>SGKF{30 + i}-ETKEN {i} - TUZU</TD><TD>&nbsp;</TD></TR>')
+    dolgu = "".join(
+        f'<TR><TD><SPAN id=f:dolgu{k} class=outputText>Satır {k}</SPAN></TD>'
+        f'<TD><INPUT id=f:dolgu{k}:i value={k}></TD><TD>&nbsp;</TD></TR>'
+        for k in range(dolgu_satir))
+    return (
+        '<HTML><HEAD><TITLE>Reçete</TITLE><SCRIPT>var x = "<TR>";</SCRIPT></HEAD>'
+        '<BODY><FORM id=f name=f>'
+        f'<TABLE id=f:dolgu><TBODY>{dolgu}</TBODY></TABLE>'
+        f'<TABLE id=f:tbl1 class=dataTable><TBODY>{"".join(satirlar)}</TBODY></TABLE>'
+        '</FORM></BODY></HTML>')
+
+
+def rapor_sayfasi(tablo_kimligi=True):
+    satirlar = [
+        ("123456789", "2601234", "01/02/2026", "01/02/2027", "Elektronik",
+         "I10 - ESANSİYEL (PRİMER) HİPERTANSİYON"),
+        ("987654321", "2509876", "15/09/2025", "15/09/2026", "Elektronik",
+         "E11.9 - İNSÜLİNE BAĞIMLI OLMAYAN DİABETES MELLİTUS<BR>KOMPLİKASYONSUZ"),
+    ]
+    govde = "".join(
+        "<TR>" + "".join(f'<TD><SPAN id=form1:tableExRaporTeshisList:{i}:text{kod}>{h}</SPAN></TD>'
+                         for kod, h in zip((14, 99, 98, 97, 95, 96), satir)) + "</TR>"
+        for i, satir in enumerate(satirlar))
+    tablo_id = "form1:tableExRaporTeshisList" if tablo_kimligi else "form1:x"
+    return (
+        '<HTML><BODY><DIV class=baslik>Rapor Listesi</DIV>'
+        '<TABLE><TBODY><TR><TD>Hak Sahibi Bilgileri</TD></TR>'
+        '<TR><TD>T.C. Kimlik No</TD><TD>:</TD><TD>12345678901</TD></TR>'
+        '<TR><TD>Adı / Soyadı</TD><TD>:</TD><TD>AYŞE</TD><TD>YILMAZ</TD></TR>'
+        '</TBODY></TABLE>'
+        f'<TABLE id={tablo_id}><THEAD><TR><TH>Rapor Takip No<TH>Rapor No<TH>Başlangıç'
+        '<TH>Bitiş<TH>Kayıt Şekli<TH>Tanı</THEAD>'
+        f'<TBODY>{govde}</TBODY></TABLE></BODY></HTML>')
+
+
+# ── Testler ────────────────────────────────────────────────────────────────
+
+def test_1_kayitli_recete_sayfasi_baslik_ve_ilac_tablosu():
+    anlik = DomAnlik(KAYITLI_SAYFA.read_text(encoding="utf-8"))
+    baslik = hasta_basligi(anlik)
+    beklenen = {
+        "recete_no": "3N0GCQG", "karekod_durumu": "Reçete Sonlandırıldı",
+        "kapsam": "4A Sigortalı (S.S.K.)", "fatura_turu": "B Grubu",
+        "tc": "64714040028", "ad_soyad": "DURMUŞ YETGİN",
+        "recete_tarihi": "01/05/2026", "ilac_alim_tarihi": "02/05/2026",
+        "tesis_kodu": "11349940", "recete_turu": "Normal", "alt_tur": "Ayaktan",
+        "protokol_no": "13373712", "doktor": "MUSTAFA SOYTAŞ",
+        "brans": "Üroloji (Ana Branş)",
+    }
+    for anahtar, deger in beklenen.items():
+        assert baslik[anahtar] == deger, (anahtar, baslik[anahtar])
+
+    satirlar = ilac_tablosu(anlik)
+    assert [s["barkod"] for s in satirlar] == ["8699540091054", "8699717010093"]
+    assert satirlar[0] == {
+        'satir': 0, 'barkod': '8699540091054', 'ilac_adi': 'AKSEF 500 MG 14 FILM TABLET',
+        'msj': 'yok', 'rapor_kodu': None, 'eos_rapor_dozu': None, 'eos_arka_plan': None,
+        'eos_doz_uygun': None, 'eos_sgk_etkin_madde': None, 'eos_sgk_kodu': None,
+        'eos_etkin_madde': None,
+    }
+    assert ilac_tablosu(anlik, max_satir=1) == satirlar[:1]
+    # Aynı sayfa COM yoluyla okununca da aynı satırlar
+    assert ilac_tablosu_com_oku(AnlikBelge(KAYITLI_SAYFA.read_text(encoding="utf-8"))) == satirlar
+
+
+def test_2_eos_skyblue_satirlari_com_yolu_ile_ayni():
+    html = recete_sayfasi(ilac_sayisi=6, dolgu_satir=5)
+    anlik = DomAnlik.belgeden(AnlikBelge(html))
+    yeni = ilac_tablosu(anlik)
+    com = AnlikBelge(html)
+    eski = ilac_tablosu_com_oku(com)
+    assert yeni == eski and len(yeni) == 6
+    assert [(s["eos_arka_plan"], s["eos_doz_uygun"]) for s in yeni] == [
+        ("lightgreen", True), ("lightcoral", False), ("yellow", None),
+        ("lightcoral", False), (None, None), ("lightgreen", True)]
+    s = yeni[1]
+    assert s["ilac_adi"] == "İLAÇ 1 500 MG\xa030 TB"       # &nbsp; IE'deki gibi kalır
+    assert s["rapor_kodu"] == "04.05" and yeni[0]["rapor_kodu"] is None
+    assert s["msj"] == "yok" and yeni[0]["msj"] == "var"
+    assert s["eos_rapor_dozu"] == "1 Günde 2 x 1,00 - Adet"
+    assert (s["eos_sgk_etkin_madde"], s["eos_sgk_kodu"], s["eos_etkin_madde"]) == (
+        "SGKF31-ETKEN 1 - TUZU", "SGKF31", "ETKEN 1 - TUZU")
+    # Anlık okuma tek COM çağrısı; eski yol satır/eleman sayısıyla büyür
+    tek = AnlikBelge(html)
+    ilac_tablosu(DomAnlik.belgeden(tek))
+    assert tek.cagri == 1 and com.cagri > 60, com.cagri
+    # EOS enjeksiyonu yoksa eos_* alanları boş
+    assert all(s["eos_rapor_dozu"] is None
+               for s in ilac_tablosu(DomAnlik(recete_sayfasi(3, eos=False))))
+
+
+def test_3_rapor_listesi_satirlari_ve_hak_sahibi():
+    anlik = DomAnlik(rapor_sayfasi())
+    satirlar = rapor_listesi_satirlari(anlik)
+    assert satirlar == [
+        ["123456789", "2601234", "01/02/2026", "01/02/2027", "Elektronik",
+         "I10 - ESANSİYEL (PRİMER) HİPERTANSİYON"],
+        ["987654321", "2509876", "15/09/2025", "15/09/2026", "Elektronik",
+         "E11.9 - İNSÜLİNE BAĞIMLI OLMAYAN DİABETES MELLİTUS", "KOMPLİKASYONSUZ"],
+    ]
+    # Tablo id'si yoksa sayfa metinleri gruplanır — aynı sonuç
+    assert rapor_listesi_satirlari(DomAnlik(rapor_sayfasi(tablo_kimligi=False))) == satirlar
+    assert hak_sahibi_adi(anlik) == "AYŞE YILMAZ"
+    assert hak_sahibi_adi(DomAnlik(recete_sayfasi(1))) == "Bilinmeyen"
+    # Gruplama kuralları: < 4 değerli satır atılır, satır en fazla 8 değer
+    metinler = ["başlık", "111111111", "a", "b", "222222222", *"abcdefghij", "333333333", "x"]
+    assert rapor_satirlarini_grupla(metinler) == [["222222222", *"abcdefg"]]
+    assert rapor_listesi_satirlari(DomAnlik(recete_sayfasi(2))) == []
+
+
+def test_4_ie_html_ayristirma_kurallari():
+    html = ('<HTML><BODY><TABLE><TR><TD id=a>bir<TD id=b>iki &amp; üç<BR>dört'
+            '<TR><TD id=c>  çok   boşluklu\n metin </TD></TABLE>'
+            '<SELECT id=s><OPTION value=1>Bir<OPTION selected value=2>İki</SELECT>'
+            '<SELECT id=s2><OPTION value=1>İlk<OPTION value=2>Sonra</SELECT>'
+            '<SPAN id=a>ikinci a</SPAN><INPUT id=i value="  x y "><INPUT id=bos>'
+            '<SCRIPT>document.write("<TD id=z>")</SCRIPT></BR></BODY></HTML>')
+    anlik = DomAnlik(html)
+    assert len(anlik.etiketler("TR")) == 2 and len(anlik.etiketler("td")) == 3
+    tr0 = anlik.etiketler("tr")[0]
+    assert [d.nitelik("ID") for d in tr0.alt_etiketler("TD")] == ["a", "b"]
+    assert anlik.deger("a") == "bir"                    # ilk id kazanır
+    assert anlik.eleman("b").metin == "iki & üç\ndört"
+    assert anlik.deger("c") == "çok boşluklu metin"
+    assert anlik.deger("s") == "İki" and anlik.deger("s2") == "İlk"
+    assert anlik.deger("i") == "x y" and anlik.deger("bos") == ""
+    assert anlik.deger("yok") is None and anlik.eleman("z") is None
+    assert "document.write" not in anlik.metinler()
+
+    class _Bozuk:
+        @property
+        def documentElement(self):
+            raise OSError("RPC sunucusu kullanılamıyor")
+    assert DomAnlik.belgeden(_Bozuk()) is None and DomAnlik.belgeden(None) is None
+
+
+def main():
+    testler = [(ad, fn) for ad, fn in sorted(globals().items())
+               if ad.startswith("test_") and callable(fn)]
+    gecen = 0
+    for ad, fn in testler:
+        try:
+            fn()
+            print(f"✓ {ad}")
+            gecen += 1
+        except Exception as e:
+            print(f"✗ {ad}: {e!r}")
+    print(f"\n{gecen}/{len(testler)} geçti")
+    return 0 if gecen == len(testler) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Medula sürücüsü kayıt / tekrar oynatma (medula_surucu) testleri.
+
+Gerçek BotanikBot yerine adım adım yanıt veren sahte bir sürücü
+KayitSurucu ile sarılıp recete_akisi akışları çalıştırılır; oluşan
+fikstür TekrarSurucu ile oynatıldığında akışların aynı sonuçları
+verdiği, sayfa anlıklarının ve kontrol ağacı metinlerinin geri geldiği,
+yanıt gecikmelerinin ayarlanabildiği ve BotanikBot'un SURUCU_ADIMLARI'ndaki
+her adımı tanımladığı doğrulanır.
+
+Çalıştır: python test_medula_surucu.py
+"""
+from __future__ import annotations
+
+import ast
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from bekleme_motoru import BeklemeMotoru
+from medula_dom_anlik import AnlikBelge, ilac_tablosu
+from medula_surucu import (KAYIT_ORTAM_DEGISKENI, SURUCU_ADIMLARI, KayitSurucu,
+                           TekrarSurucu, kayit_surucusu_sar, verim_ozeti)
+from recete_akisi import (medula_yeniden_baslat_ve_giris_yap, tek_recete_isle,
+                          tek_recete_rapor_kontrol)
+from test_medula_dom_anlik import recete_sayfasi
+
+
+# ── Sahte gerçek sürücü ─────────────────────────────────────────────────────
+
+class _Dugme:
+    def __init__(self, metin):
+        self.metin = metin
+        self.tiklama = 0
+
+    def window_text(self):
+        return self.metin
+
+    def exists(self, timeout=0):
+        return True
+
+    def click_input(self):
+        self.tiklama += 1
+
+
+class _Pencere:
+    def __init__(self, metin="MEDULA"):
+        self.metin = metin
+
+    def descendants(self, control_type=None):
+        return [_Dugme("Seçim satır 1"), _Dugme("Seçim satır 2"), _Dugme("Barkod")]
+
+    def window_text(self):
+        return self.metin
+
+    def set_focus(self):
+        pass
+
+
+class _Zamanlama:
+    def __init__(self):
+        self.ayarlar = {"pencere_bulma": 0.05, "ana_sayfa": 1.0, "ilac_butonu": 0.2}
+        self.kayitlar = []
+        self.bekleme = BeklemeMotoru()
+
+    def get(self, anahtar, varsayilan=0.1):
+        return self.ayarlar.get(anahtar, varsayilan)
+
+    def kayit_ekle(self, anahtar, sure):
+        self.kayitlar.append((anahtar, sure))
+
+    def kosul_bekle(self, kosul, anahtar=None, **kwargs):
+        return self.bekleme.kosul_bekle(kosul, anahtar, **kwargs)
+
+
+class SahteBot:
+    """BotanikBot'un akışlarca kullanılan yüzü; her adım `gecikme` sn sürer.
+
+    Reçete sayfası `sayfa` sayacıyla değişir (SONRA butonu ilerletir);
+    `doz_hatasi` verilen reçete numarasında sadece_doz_kontrolu hata atar.
+    """
+
+    def __init__(self, gecikme=0.001, doz_hatasi=None):
+        self.gecikme = gecikme
+        self.doz_hatasi = doz_hatasi
+        self.sayfa = 0
+        self.timing = _Zamanlama()
+        self.main_window = _Pencere()
+        self.medula_hwnd = 1
+        self.medula_pid = 1
+        self.bekleme_toplami = 0.0
+        self.tuslar = []
+
+    def _adim(self, sonuc=True):
+        time.sleep(self.gecikme)
+        return sonuc
+
+    def __getattr__(self, ad):
+        if ad in SURUCU_ADIMLARI:
+            return lambda *a, **k: self._adim()
+        raise AttributeError(ad)
+
+    # sürücü yardımcıları
+    def bekle(self, saniye):
+        self.bekleme_toplami += saniye or 0
+
+    def tus_gonder(self, tuslar):
+        self.tuslar.append(tuslar)
+
+    def timed_sleep(self, key, default=0.1):
+        self.bekle(self.timing.get(key, default))
+
+    def retry_with_popup_check(self, operation_func, operation_name, max_retries=5, critical=True):
+        return any(operation_func() for _ in range(1))
+
+    def _get_html_document(self, timeout=1):
+        return AnlikBelge(recete_sayfasi(ilac_sayisi=2 + self.sayfa % 3))
+
+    # değer döndüren adımlar
+    def recete_no(self):
+        return f"3K{self.sayfa:05d}"
+
+    def recete_sayfasi_hizli_tarama(self, max_deneme=2, bekleme_suresi=0.15):
+        return self._adim({"recete_no": self.recete_no(), "kayit_var": True,
+                           "telefon_var": True, "ilac_butonu": _Dugme("İlaç")})
+
+    def rapor_listesini_topla(self):
+        return self._adim({"ad_soyad": f"HASTA {self.sayfa}", "telefon": "5550000000",
+                           "raporlar": [{"tani": "E11", "bitis": "01.01.2027"}] * (self.sayfa % 2 + 1),
+                           "sonraki_basildi": False})
+
+    def recete_turu_oku(self):
+        return self._adim("Normal" if self.sayfa % 2 else "Yeşil")
+
+    def sadece_doz_kontrolu(self, session_logger=None, stop_check=None):
+        time.sleep(self.gecikme)
+        if self.recete_no() == self.doz_hatasi:
+            raise RuntimeError("doz tablosu okunamadı")
+        return {"toplam_ilac": 2, "doz_asimi": self.sayfa % 2, "okunamayanlar": 0}
+
+    def sonra_butonuna_tikla(self):
+        self.sayfa += 1
+        return self._adim()
+
+    def bulunamadi_mesaji_kontrol(self):
+        return self._adim(False)
+
+    def uyari_penceresini_kapat(self, max_bekleme=0.5):
+        return self._adim(False)
+
+
+class _RaporTakip:
+    def __init__(self):
+        self.kayitlar = []
+
+    def toplu_rapor_ekle(self, ad_soyad, telefon, raporlar, grup):
+        self.kayitlar.append((ad_soyad, telefon, len(raporlar), grup))
+
+
+class _RenkliKontrol:
+    def kontrol_et(self, recete_no, recete_turu, grup):
+        return (recete_turu == "Yeşil", f"{recete_no}: {recete_turu}")
+
+
+def _recete_calistir(bot, adet):
+    takip = _RaporTakip()
+    sonuclar = [tek_recete_isle(bot, i + 1, takip, grup="A") for i in range(adet)]
+    return sonuclar, takip.kayitlar
+
+
+# ── Testler ────────────────────────────────────────────────────────────────
+
+def test_1_kayit_ve_tekrar_ayni_sonuc():
+    with tempfile.TemporaryDirectory() as d:
+        gercek = SahteBot()
+        kayit = KayitSurucu(gercek, d)
+        beklenen, beklenen_rapor = _recete_calistir(kayit, 3)
+        kayit.kapat()
+        assert isinstance(gercek.main_window, _Pencere)   # vekil geri yazılmadı
+        assert [s[0] for s in beklenen] == [True, True, True], beklenen
+        assert [s[2] for s in beklenen] == [2, 2, 2]
+        assert (Path(d) / "oturum.jsonl").exists() and (Path(d) / "zamanlama.json").exists()
+        assert len(list((Path(d) / "sayfalar").glob("*.html"))) == 3   # özetle tekilleşir
+
+        tekrar = TekrarSurucu(d, gecikme_carpani=0, bekleme_carpani=0)
+        sonuclar, rapor = _recete_calistir(tekrar, 3)
+        assert sonuclar == beklenen, (sonuclar, beklenen)
+        assert rapor == beklenen_rapor
+        assert tekrar.timing.ayarlar["pencere_bulma"] == 0.05
+        assert set(tekrar.timing.olcumler) >= {"recete_kontrol", "ilac_butonu", "sonra_butonu"}
+        assert len(tekrar.timing.olcumler["sonra_butonu"]) == 3
+        # Son adım (3. SONRA) sonrası sayfa: sayfa=3 → 2 ilaçlı reçete
+        assert ilac_tablosu(tekrar.dom_anlik_al()) == ilac_tablosu(
+            AnlikBelge(recete_sayfasi(ilac_sayisi=2)).anlik)
+
+
+def test_2_gecikme_ayari_ve_verim_ozeti():
+    with tempfile.TemporaryDirectory() as d:
+        kayit = KayitSurucu(SahteBot(gecikme=0.0), d)
+        _recete_calistir(kayit, 2)
+        kayit.kapat()
+
+        tekrar = TekrarSurucu(d, gecikme_carpani=0, bekleme_carpani=0,
+                              gecikmeler={"rapor_listesini_topla": 0.03})
+        sureler = []
+        for i in range(2):
+            t0 = time.perf_counter()
+            tek_recete_isle(tekrar, i + 1, _RaporTakip(), grup="A")
+            sureler.append(time.perf_counter() - t0)
+        assert min(sureler) >= 0.03, sureler
+        assert ("rapor_listesini_topla", 0.03) in tekrar.cagrilar
+
+        ozet = verim_ozeti(sureler, tekrar.timing.olcumler)
+        assert ozet["recete_sayisi"] == 2
+        assert 0 < ozet["recete_dakika"] <= 60 * 2 / 0.06
+        adim = ozet["adimlar"]["rapor_toplama"]
+        assert adim["adet"] == 2 and adim["ort_ms"] >= 30 and adim["p95_ms"] >= adim["ort_ms"] - 1e-6
+
+        # Sıra sonunda başa sarar; basa_sar ile oturum baştan oynatılır
+        tekrar.basa_sar()
+        assert tek_recete_isle(tekrar, 1, _RaporTakip(), grup="A")[1] == "3K00000"
+
+
+def test_3_rapor_kontrol_hata_ve_yeniden_baslatma():
+    with tempfile.TemporaryDirectory() as d:
+        gercek = SahteBot(doz_hatasi="3K00001")
+        kayit = KayitSurucu(gercek, d)
+        renkli = _RenkliKontrol()
+        beklenen = [tek_recete_rapor_kontrol(kayit, i + 1, grup="B", renkli_kontrol=renkli)
+                    for i in range(3)]
+        beklenen.append(medula_yeniden_baslat_ve_giris_yap(kayit, "B", son_recete="3K00002"))
+        kayit.kapat()
+        assert beklenen[0] == (True, "3K00000", True, "3K00000: Yeşil")
+        assert beklenen[1][0] is True and beklenen[3] is True
+        assert gercek.medula_hwnd is None             # akışın atamaları gerçek sürücüye gider
+
+        tekrar = TekrarSurucu(d, gecikme_carpani=0, bekleme_carpani=0)
+        sonuclar = [tek_recete_rapor_kontrol(tekrar, i + 1, grup="B", renkli_kontrol=renkli)
+                    for i in range(3)]
+        sonuclar.append(medula_yeniden_baslat_ve_giris_yap(tekrar, "B", son_recete="3K00002"))
+        assert sonuclar == beklenen, (sonuclar, beklenen)
+        # Kayıtta olmayan adım None döner (akış kendi hata yoluna girer)
+        assert tekrar.cikis_butonu_var_mi() is None
+
+
+def test_4_gercek_surucu_adimlari_tanimliyor():
+    kaynak = (Path(__file__).resolve().parent / "botanik_bot.py").read_text(encoding="utf-8")
+    sinif = next(n for n in ast.parse(kaynak).body
+                 if isinstance(n, ast.ClassDef) and n.name == "BotanikBot")
+    metotlar = {n.name for n in sinif.body if isinstance(n, ast.FunctionDef)}
+    # timed_sleep gibi __init__'te atanan adımlar
+    metotlar |= {h.attr for n in ast.walk(sinif) if isinstance(n, ast.Assign)
+                 for h in n.targets if isinstance(h, ast.Attribute)
+                 and isinstance(h.value, ast.Name) and h.value.id == "self"}
+    yardimcilar = {"bekle", "tus_gonder", "timed_sleep", "retry_with_popup_check",
+                   "_get_html_document", "dom_anlik_al"}
+    eksik = (set(SURUCU_ADIMLARI) | yardimcilar) - metotlar
+    assert not eksik, sorted(eksik)
+    eksik_tekrar = yardimcilar - set(dir(TekrarSurucu))
+    assert not eksik_tekrar, sorted(eksik_tekrar)
+
+
+def test_5_ortam_degiskeniyle_kayit():
+    bot = SahteBot()
+    eski = os.environ.pop(KAYIT_ORTAM_DEGISKENI, None)
+    try:
+        assert kayit_surucusu_sar(bot) is bot
+        with tempfile.TemporaryDirectory() as d:
+            os.environ[KAYIT_ORTAM_DEGISKENI] = d
+            sarili = kayit_surucusu_sar(bot)
+            assert isinstance(sarili, KayitSurucu) and kayit_surucusu_sar(bot) is sarili
+            sarili.recete_turu_oku()
+            sarili.kapat()
+            assert '"recete_turu_oku"' in (Path(d) / "oturum.jsonl").read_text(encoding="utf-8")
+    finally:
+        os.environ.pop(KAYIT_ORTAM_DEGISKENI, None)
+        if eski is not None:
+            os.environ[KAYIT_ORTAM_DEGISKENI] = eski
+
+
+def main():
+    testler = [(ad, fn) for ad, fn in sorted(globals().items())
+               if ad.startswith("test_") and callable(fn)]
+    gecen = 0
+    for ad, fn in testler:
+        try:
+            fn()
+            print(f"✓ {ad}")
+            gecen += 1
+        except Exception as e:
+            print(f"✗ {ad}: {e!r}")
+    print(f"\n{gecen}/{len(testler)} geçti")
+    return 0 if gecen == len(testler) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Toplu (küme bazlı) minimum stok analizi testleri.
+
+Sahte EOS (bellek içi SQLite, T-SQL → tsql_sqlite_cevir) üzerinde
+tum_ilaclari_analiz_et'in toplu yolunun (parça parça gün talebi + NumPy)
+frekans / ROP / finansal modlarda ürün başı eski yolla aynı satırları
+verdiği; parça sayısı kadar sorgu attığı; satış küpünden de aynı sonucu
+aldığı ve hata veren parçanın ürünlerini atladığı doğrulanır.
+
+Çalıştır: python test_min_stok_toplu.py
+"""
+from __future__ import annotations
+
+import math
+import random
+import sqlite3
+import sys
+import tempfile
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import min_stok_analiz
+from botanik_ayna import fonksiyonlari_kaydet, tsql_sqlite_cevir
+from min_stok_analiz import (finansal_periyot_analiz, talep_pattern_analiz,
+                             toplu_finansal_periyot_analiz, toplu_gunluk_talep,
+                             toplu_talep_analiz, tum_ilaclari_analiz_et)
+from satis_kupu import SatisKupu
+
+BUGUN = date.today()
+URUN_SAYISI = 60
+
+
+class _SahteEOS:
+    """sorgu_calistir(sql, params) → list[dict]; parça thread'lerinden çağrılabilir."""
+
+    def __init__(self, tohum: int = 7, urun_sayisi: int = URUN_SAYISI):
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        fonksiyonlari_kaydet(self.conn)
+        self._kilit = threading.Lock()
+        self._yerel = threading.local()
+        self.sorgular = []
+        self.hatali_urun = None
+        c = self.conn
+        for ana, ilac in (("ReceteAna", "ReceteIlaclari"), ("EldenAna", "EldenIlaclari")):
+            c.execute(f"CREATE TABLE {ana} (RxId INTEGER PRIMARY KEY, RxKayitTarihi TEXT,"
+                      f" RxReceteTarihi TEXT, RxIslemTarihi TEXT, RxSilme INTEGER)")
+            c.execute(f"CREATE TABLE {ilac} (RIId INTEGER PRIMARY KEY, RIRxId INTEGER,"
+                      f" RIUrunId INTEGER, RIAdet INTEGER, RIToplam REAL,"
+                      f" RISilme INTEGER, RIIade INTEGER)")
+        c.execute("CREATE TABLE Urun (UrunId INTEGER PRIMARY KEY, UrunAdi TEXT,"
+                  " UrunMinimum INTEGER, UrunUrunTipId INTEGER, UrunStokDepo INTEGER,"
+                  " UrunStokRaf INTEGER, UrunStokAcik INTEGER, UrunSilme INTEGER)")
+        c.execute("CREATE TABLE UrunTip (UrunTipId INTEGER PRIMARY KEY, UrunTipAdi TEXT)")
+        c.execute("CREATE TABLE Karekod (KKUrunId INTEGER, KKDurum INTEGER)")
+        c.execute("CREATE TABLE Barkod (BarkodUrunId INTEGER, BarkodAdi TEXT, BarkodSilme INTEGER)")
+        c.executemany("INSERT INTO UrunTip VALUES (?, ?)", [(1, "ILAC"), (16, "SERUM")])
+        rnd = random.Random(tohum)
+        rx = 0
+        for u in range(1, urun_sayisi + 1):
+            c.execute("INSERT INTO Urun VALUES (?, ?, ?, ?, 0, 0, 0, 0)",
+                      (u, f"ILAC {u:03d}", u % 4, 1 if u % 7 else 16))
+            c.execute("INSERT INTO Barkod VALUES (?, ?, 0)", (u, f"8699{u:09d}"))
+            c.executemany("INSERT INTO Karekod VALUES (?, 1)", [(u,)] * (u % 3))
+            # Ürün başına farklı yoğunluk: düzenli, seyrek, yığın, hiç
+            yogunluk = (0.9, 0.08, 0.02, 0.0)[u % 4]
+            for g in range(800):
+                if rnd.random() >= yogunluk:
+                    continue
+                for _ in range(rnd.choice((1, 1, 2))):
+                    rx += 1
+                    elden = rnd.random() < 0.3
+                    ana, ilac = (("EldenAna", "EldenIlaclari") if elden
+                                 else ("ReceteAna", "ReceteIlaclari"))
+                    zaman = (datetime.combine(BUGUN - timedelta(days=g), datetime.min.time())
+                             + timedelta(hours=9 + rx % 8)).isoformat(sep=" ")
+                    c.execute(f"INSERT INTO {ana} VALUES (?, ?, ?, ?, 0)",
+                              (rx, zaman, zaman, zaman))
+                    c.execute(f"INSERT INTO {ilac} VALUES (?, ?, ?, ?, 10, 0, ?)",
+                              (rx, rx, u, rnd.choice((1, 1, 2, 3, 6)),
+                               int(rnd.random() < 0.03)))
+
+    @property
+    def son_sorgu_hatasi(self):
+        return getattr(self._yerel, "hata", None)
+
+    def sorgu_calistir(self, sql, params=None):
+        self._yerel.hata = None
+        with self._kilit:
+            self.sorgular.append(sql)
+            if self.hatali_urun is not None and f"RIUrunId IN ({self.hatali_urun}," in sql:
+                self._yerel.hata = "08S01 iletisim hatasi"
+                return []
+            cur = self.conn.execute(tsql_sqlite_cevir(sql), [
+                f"{p[:4]}-{p[4:6]}-{p[6:8]}" if isinstance(p, str) and len(p) == 8
+                and p.isdigit() else p for p in (params or ())])
+            kolonlar = [k[0] for k in cur.description]
+            return [dict(zip(kolonlar, r)) for r in cur.fetchall()]
+
+
+class _KupluEOS(_SahteEOS):
+    def __init__(self, kup_yolu: str):
+        super().__init__()
+        self.kup = SatisKupu(kup_yolu, gecmis_gun=900)
+        self.kup.yenile(self, "kayit")
+
+    def satis_kupu(self, esas="kayit", bas=None):
+        return self.kup if self.kup.kullanilabilir_mi(esas, bas) else None
+
+
+def _yakin(a, b) -> bool:
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_yakin(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(_yakin(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+_EOS = _SahteEOS()
+
+
+def test_1_tum_modlar_urun_basi_ile_ayni():
+    for mod, ay in (("frekans", 12), ("frekans", 6), ("rop", 12), ("finansal", 12)):
+        eski = tum_ilaclari_analiz_et(_EOS, ay_sayisi=ay, hesaplama_modu=mod, toplu=False)
+        yeni = tum_ilaclari_analiz_et(_EOS, ay_sayisi=ay, hesaplama_modu=mod)
+        assert len(eski) == URUN_SAYISI, (mod, len(eski))
+        assert eski == yeni, (mod, ay, next(
+            (e, y) for e, y in zip(eski, yeni) if e != y))
+    # Fikstür düzenli / seyrek / talepsiz ürünleri birlikte içeriyor
+    siniflar = {r["Sinif"] for r in yeni}
+    assert {"NO_DEMAND", "ERRATIC", "LUMPY"} <= siniflar, siniflar
+
+
+def test_2_ara_sozlukler_urun_basi_ile_ayni():
+    ids = list(range(1, URUN_SAYISI + 1))
+    g12 = toplu_gunluk_talep(_EOS, ids, 12)
+    g24 = toplu_gunluk_talep(_EOS, ids, 24)
+    talep = toplu_talep_analiz(g12, 12)
+    finansal = toplu_finansal_periyot_analiz(g24, 0.22, 0.40)
+    for u in ids:
+        assert _yakin(talep[u], talep_pattern_analiz(_EOS, u, 12)), u
+        assert _yakin(finansal[u], finansal_periyot_analiz(_EOS, u, 0.22, 0.40)), u
+    assert all(v["aciklama"] == "Başabaş hesaplanamadı"
+               for v in toplu_finansal_periyot_analiz(g24, 0, 0.4).values())
+
+
+def test_3_parca_sayisi_kadar_sorgu_ve_ilerleme():
+    eski = min_stok_analiz.TOPLU_PARCA
+    min_stok_analiz.TOPLU_PARCA = 25
+    ilerleme = []
+    try:
+        _EOS.sorgular.clear()
+        tum_ilaclari_analiz_et(_EOS, hesaplama_modu="rop",
+                               progress_callback=lambda i, n: ilerleme.append((i, n)))
+    finally:
+        min_stok_analiz.TOPLU_PARCA = eski
+    # 1 ürün listesi + ceil(60 / 25) = 3 parça
+    assert len(_EOS.sorgular) == 4, len(_EOS.sorgular)
+    assert ilerleme[-1] == (URUN_SAYISI, URUN_SAYISI) and len(ilerleme) >= 3
+
+
+def test_4_kupten_ayni_sonuc_ve_hatali_parca_atlanir():
+    with tempfile.TemporaryDirectory() as d:
+        kuplu = _KupluEOS(str(Path(d) / "kup.db"))
+        kuplu.sorgular.clear()
+        for mod in ("frekans", "finansal"):
+            assert tum_ilaclari_analiz_et(kuplu, hesaplama_modu=mod) == \
+                tum_ilaclari_analiz_et(_EOS, hesaplama_modu=mod, toplu=False), mod
+        # Küp varken yalnız ürün listesi sorgulanır
+        assert len(kuplu.sorgular) == 2, len(kuplu.sorgular)
+
+    eski = min_stok_analiz.TOPLU_PARCA
+    min_stok_analiz.TOPLU_PARCA = 20
+    _EOS.hatali_urun = 1   # ilk parça (1..20) hata verir
+    try:
+        sonuc = tum_ilaclari_analiz_et(_EOS, hesaplama_modu="frekans")
+    finally:
+        _EOS.hatali_urun = None
+        min_stok_analiz.TOPLU_PARCA = eski
+    assert sorted(r["UrunId"] for r in sonuc) == list(range(21, URUN_SAYISI + 1))
+
+
+def main():
+    testler = [(ad, fn) for ad, fn in sorted(globals().items())
+               if ad.startswith("test_") and callable(fn)]
+    gecen = 0
+    for ad, fn in testler:
+        try:
+            fn()
+            print(f"✓ {ad}")
+            gecen += 1
+        except Exception as e:
+            print(f"✗ {ad}: {e!r}")
+    print(f"\n{gecen}/{len(testler)} geçti")
+    return 0 if gecen == len(testler) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""NormalizeMetin / IbareKumesi / DesenKumesi testleri.
+
+fonetik_normalize'ın eski (her çağrıda tablo kuran) _turkce_normalize ile
+aynı çıktıyı verdiği, konum haritasının özgün metne doğru döndüğü,
+ibare kümesinin (sut_kontrolleri'nin kayıtlı kümeleri dahil)
+any(_turkce_ara(...)) ile, desen kümesinin eski sıralı re.search döngüsüyle
+birebir aynı sonucu verdiği doğrulanır.
+
+Çalıştır: python test_normalize_metin.py
+"""
+from __future__ import annotations
+
+import random
+import re
+import sys
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from recete_kontrol.normalize_metin import (DesenKumesi, IbareKumesi,
+                                            _fonetik_konumlu, fonetik_normalize,
+                                            kayitli_kumeler, normalize_metin)
+from recete_kontrol.sut_kontrolleri import (_GLISEMIK_KUMELERI,
+                                            _GLISEMIK_OLCUM, _tr_lower,
+                                            _turkce_ara)
+from recete_kontrol.sut_motor.baglam import Baglam
+
+
+def _eski_turkce_normalize(metin: str) -> str:
+    """Önceki _turkce_normalize gövdesi (referans)."""
+    t = metin.translate(str.maketrans({
+        'İ': 'i', 'I': 'i', 'Ö': 'o', 'Ü': 'u', 'Ş': 's', 'Ç': 'c', 'Ğ': 'g'}))
+    t = t.lower()
+    t = t.translate(str.maketrans({
+        'ı': 'i', 'ö': 'o', 'ü': 'u', 'ş': 's', 'ç': 'c', 'ğ': 'g',
+        'â': 'a', 'à': 'a', 'á': 'a', 'ã': 'a', 'ä': 'a', 'å': 'a',
+        'è': 'e', 'é': 'e', 'ê': 'e', 'ë': 'e',
+        'ì': 'i', 'í': 'i', 'î': 'i', 'ï': 'i',
+        'ò': 'o', 'ó': 'o', 'ô': 'o', 'õ': 'o',
+        'ù': 'u', 'ú': 'u', 'û': 'u',
+        'ñ': 'n', 'ý': 'y', 'ÿ': 'y', 'w': 'v', 'q': 'k'}))
+    t = t.replace('ß', 'ss')
+    for d, r in [('ph', 'f'), ('th', 't'), ('sh', 's'), ('ch', 'c'), ('ck', 'k'),
+                 ('qu', 'k'), ('wh', 'v'), ('gh', 'g'), ('ae', 'e'), ('oe', 'o')]:
+        t = t.replace(d, r)
+    t = t.replace('x', 'ks')
+    return re.sub(r'([bcçdfgğhjklmnprsştvyz])\1+', r'\1', t)
+
+
+_ALFABE = "aAbcCçÇdeEfghHıIiİklLmnoOöÖpPqrsSşŞtTuUüÜvwWxXyzß éâñ.,-1"
+_ORNEKLER = [
+    "", "ALLERJİK RİNİT", "Tip 2 DM, METFORMİN maksimum tolere dozda",
+    "HbA1c: %8,2 — glisemik kontrol SAĞLANAMADI", "phthisis sHock CHECK quAE",
+    "Xanax x-ray ßtraße exxon", "İİİııı ŞşŞ ÇÇçç ĞğĞ", "Σίσυφος ΟΔΟΣ",
+]
+
+
+def _rastgele(n, rnd):
+    return ["".join(rnd.choice(_ALFABE) for _ in range(rnd.randint(0, 40)))
+            for _ in range(n)]
+
+
+def test_1_fonetik_eski_normalize_ile_ayni():
+    rnd = random.Random(7)
+    for s in _ORNEKLER + _rastgele(3000, rnd):
+        assert fonetik_normalize(s) == _eski_turkce_normalize(s), s
+        assert _fonetik_konumlu(s)[0] == fonetik_normalize(s), s
+
+
+def test_2_konum_haritasi_ozgun_metne_doner():
+    nm = normalize_metin("Hasta ALLERJİK RİNİT ve Thalassemia")
+    bas = nm.fonetik.index("alerjik")
+    assert nm.ham_parca(bas, bas + len("alerjik")) == "ALLERJİK"
+    bas = nm.fonetik.index("talasemia")
+    assert nm.ham_parca(bas, bas + len("talasemia")) == "Thalassemia"
+    rnd = random.Random(3)
+    for s in _rastgele(500, rnd):
+        f, konumlar = _fonetik_konumlu(s)
+        assert len(konumlar) == len(f)
+        assert konumlar == sorted(konumlar)
+        assert all(0 <= k < len(s) for k in konumlar)
+
+
+def test_3_ibare_kumesi_turkce_ara_ile_ayni():
+    rnd = random.Random(11)
+    kume = IbareKumesi("t", ["metformin", "Sülfonilüre", "allerji", "x-ray",
+                             "kan şekeri", "th", "glisemi"])
+    metinler = _ORNEKLER + [
+        "METFORMİN 1000", "SULFONILURE", "alerjik", "Kan Sekeri yüksek",
+        "ksray", "tıbbi", "GLİSEMİK"] + _rastgele(2000, rnd)
+    for m in metinler:
+        beklenen = [k for k in kume.ibareler if _turkce_ara(m, k)]
+        assert kume.var_mi(m) == bool(beklenen), m
+        assert kume.bulunanlar(m) == beklenen, m
+        ibare, parca = kume.ilk(m)
+        assert (ibare is not None) == bool(beklenen)
+        if ibare:
+            assert _turkce_ara(parca, ibare), (m, ibare, parca)
+    glis = _GLISEMIK_KUMELERI["olcum"]
+    for m in metinler:
+        assert glis.var_mi(m) == any(_turkce_ara(m, k) for k in _GLISEMIK_OLCUM)
+
+
+def test_4_desen_kumesi_sirali_ilk_eslesme():
+    desenler = [r'\bdm\b', r'diyabet', r'tip\s*[12]', r'(\d+)[.,](\d)']
+    kume = DesenKumesi(desenler)
+    metinler = ["tip 2 diyabet dm", "hba1c 7,5 diyabet", "dm", "yok", "",
+                "tip1", "dmx 7.2"]
+    for m in metinler:
+        beklenen = next(((d, re.search(d, m).group(0)) for d in desenler
+                         if re.search(d, m)), (None, None))
+        d, eslesme = kume.ilk(m)
+        assert (d, eslesme.group(0) if eslesme else None) == beklenen, m
+        assert kume.var_mi(m) == (beklenen[0] is not None)
+    # Geri referanslı liste birleştirilmez ama aynı sonucu verir
+    geri = DesenKumesi([r'(a)\1', r'b'])
+    assert geri._suzgec is None
+    assert geri.ilk("xbaa")[0] == r'(a)\1'
+
+
+def test_5_paylasilan_nesne_ve_baglam():
+    assert normalize_metin("Aynı metin") is normalize_metin("Aynı metin")
+    ilac = {"rapor_aciklamalari": ["İÇ HASTALIKLARI UZMANI", "Tip 2 DM"],
+            "recete_teshisleri": ["E11 DİYABET"]}
+    b = Baglam(ilac)
+    assert b.metin_lower == _tr_lower(b.birlesik_metin)
+    assert b.metin.ham == b.birlesik_metin
+    assert "ic hastaliklari" in b.metin_lower
+    assert Baglam({}).metin_lower == ""
+
+
+def test_6_genel_raporlu_kumeleri_kayitli_ve_ayni():
+    kumeler = {ad: k for ad, k in kayitli_kumeler().items()
+               if ad.startswith("genel_raporlu_")}
+    assert len(kumeler) == 29, sorted(kumeler)
+    rnd = random.Random(5)
+    tum = [i for k in kumeler.values() for i in k.ibareler]
+    etkenler = tum + [i.lower() for i in tum] + [f"{i} SODYUM" for i in tum] + [
+        "METOTREKSAT", "İNSÜLİN GLARJİN", "LEVOTİROKSİN", "ASETİLSALİSİLİK ASİT", "",
+        "ADALİMUMAB", "SOMATROPİN"] + _rastgele(300, rnd)
+    for k in kumeler.values():
+        for e in etkenler:
+            assert k.var_mi(e) == any(_turkce_ara(e, i) for i in k.ibareler), (k.ad, e)
+
+
+def main():
+    testler = [(ad, fn) for ad, fn in sorted(globals().items())
+               if ad.startswith("test_") and callable(fn)]
+    gecen = 0
+    for ad, fn in testler:
+        try:
+            fn()
+            print(f"✓ {ad}")
+            gecen += 1
+        except Exception as e:
+            print(f"✗ {ad}: {e!r}")
+    print(f"\n{gecen}/{len(testler)} geçti")
+    return 0 if gecen == len(testler) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Tembel recete_kontrol paketi + ana menü ön ısıtma (on_isitma) testleri.
+
+Paket alt modül import'unun sut_kontrolleri'ni peşinen yüklemediği ve dışa
+açılan adların ilk erişimde çözüldüğü; kullanım sayacının ısıtma sırasını
+belirlediği; ısıtıcının modülleri yükleyip ilk kullanımı bir kez bildirdiği,
+patlayan modülde kartı bıraktığı ve durdurulunca hiçbir şey yüklemediği;
+ısıtılan modüllerin hiçbirinin COM (pywinauto/pywin32) yüklemediği
+doğrulanır.
+
+Çalıştır: python test_on_isitma.py
+"""
+from __future__ import annotations
+
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+KOK = Path(__file__).resolve().parent
+sys.path.insert(0, str(KOK))
+
+import on_isitma
+from on_isitma import OnIsitici, en_sik_moduller, modul_kullanim_kaydet
+
+
+def _alt_surec(kod: str) -> str:
+    return subprocess.run([sys.executable, "-c", kod], cwd=KOK, check=True,
+                          capture_output=True, text=True).stdout.strip()
+
+
+def test_1_paket_tembel_yukler():
+    cikti = _alt_surec(
+        "import sys, recete_kontrol.anlik_kontrol, recete_kontrol as rk\n"
+        "print('recete_kontrol.sut_kontrolleri' in sys.modules)\n"
+        "f = rk.sut_kontrol_yap\n"
+        "print('recete_kontrol.sut_kontrolleri' in sys.modules, f.__module__,\n"
+        "      'sut_kontrol_yap' in vars(rk), 'KontrolRaporu' in dir(rk))\n"
+        "from recete_kontrol import *\n"
+        "print(KontrolSonucu.__name__, get_kontrol_motoru.__name__)")
+    assert cikti.splitlines() == [
+        "False", "True recete_kontrol.sut_kontrolleri True True",
+        "KontrolSonucu get_kontrol_motoru"], cikti
+    import recete_kontrol
+    try:
+        recete_kontrol.olmayan_ad
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("olmayan ad AttributeError vermeli")
+
+
+def test_2_kullanim_sayaci_siralama():
+    eski = on_isitma._KULLANIM_DOSYA
+    with tempfile.TemporaryDirectory() as d:
+        on_isitma._KULLANIM_DOSYA = os.path.join(d, "modul_kullanim.json")
+        try:
+            assert en_sik_moduller() == list(on_isitma.VARSAYILAN_SIRA)
+            for key in ["kasa_takip"] * 3 + ["mf_hizli"] * 2 + ["t_cetvel"] * 9:
+                modul_kullanim_kaydet(key)
+            # t_cetvel ısıtılacak modül tanımlamıyor → sayılır ama seçilmez
+            assert en_sik_moduller(4) == ["kasa_takip", "mf_hizli",
+                                          "aylik_recete_sorgu", "hasta_takip"]
+            # Dosyaya arka planda yazılır; bekleyen tek yazım son durumu taşır
+            beklenen = {"kasa_takip": 3, "mf_hizli": 2, "t_cetvel": 9}
+            for _ in range(100):
+                try:
+                    with open(on_isitma._KULLANIM_DOSYA, encoding="utf-8") as f:
+                        if json.load(f) == beklenen:
+                            break
+                except (OSError, ValueError):
+                    pass
+                time.sleep(0.02)
+            else:
+                raise AssertionError("kullanım sayacı diske yazılmadı")
+            on_isitma._KULLANIM_DOSYA = os.path.join(d, "bozuk.json")
+            with open(on_isitma._KULLANIM_DOSYA, "w", encoding="utf-8") as f:
+                f.write("{bozuk")
+            assert en_sik_moduller(1) == ["aylik_recete_sorgu"]
+        finally:
+            on_isitma._KULLANIM_DOSYA = eski
+
+
+def _sahte_moduller(d: str, onek: str):
+    for ad in ("a", "b"):
+        Path(d, f"{onek}_{ad}.py").write_text(f"DEGER = {ad!r}\n", encoding="utf-8")
+    Path(d, f"{onek}_patlak.py").write_text("raise RuntimeError('bozuk')\n",
+                                            encoding="utf-8")
+    return {"iyi": (f"{onek}_a", f"{onek}_b"),
+            "kotu": (f"{onek}_patlak", f"{onek}_hic")}
+
+
+def test_3_isitici_yukler_ve_ilk_kullanimi_bildirir():
+    eski = dict(on_isitma.ISITMA_MODULLERI)
+    with tempfile.TemporaryDirectory() as d:
+        sys.path.insert(0, d)
+        try:
+            on_isitma.ISITMA_MODULLERI.update(_sahte_moduller(d, "_isitma_t3"))
+            isitici = OnIsitici(["kotu", "iyi", "yok"], gecikme_sn=0, ara_sn=0)
+            assert isitici.modul_keyleri == ["kotu", "iyi"]
+            isitici.start()
+            isitici.join(10)
+            assert isitici.bitti.is_set()
+            assert sys.modules["_isitma_t3_b"].DEGER == "b"
+            assert set(isitici.sureler) == {"_isitma_t3_a", "_isitma_t3_b"}
+            # Patlayan modülden sonra kartın kalanı denenmez
+            assert list(isitici.hatalar) == ["_isitma_t3_patlak"]
+            assert "_isitma_t3_hic" not in sys.modules
+            assert isitici.ilk_kullanim("_isitma_t3_a")
+            assert not isitici.ilk_kullanim("_isitma_t3_a")
+            assert not isitici.ilk_kullanim("_isitma_t3_patlak")
+            assert "2 modül" in isitici.ozet()
+        finally:
+            sys.path.remove(d)
+            on_isitma.ISITMA_MODULLERI.clear()
+            on_isitma.ISITMA_MODULLERI.update(eski)
+
+
+def test_4_durdurulan_isitici_yuklemez():
+    eski = dict(on_isitma.ISITMA_MODULLERI)
+    with tempfile.TemporaryDirectory() as d:
+        sys.path.insert(0, d)
+        try:
+            on_isitma.ISITMA_MODULLERI.update(_sahte_moduller(d, "_isitma_t4"))
+            isitici = OnIsitici(["iyi"], gecikme_sn=5)
+            isitici.start()
+            isitici.durdur()
+            isitici.join(5)
+            assert not isitici.is_alive()
+            assert "_isitma_t4_a" not in sys.modules and not isitici.sureler
+        finally:
+            sys.path.remove(d)
+            on_isitma.ISITMA_MODULLERI.clear()
+            on_isitma.ISITMA_MODULLERI.update(eski)
+
+
+_COM_PAKETLERI = {"pywinauto", "comtypes", "pythoncom", "pywintypes", "win32api",
+                  "win32com", "win32con", "win32gui", "uiautomation"}
+
+
+def _ust_duzey_importlar(yol: Path):
+    """Modül yüklenirken çalışan import'lar (fonksiyon gövdeleri hariç)."""
+    def gez(dugumler):
+        for d in dugumler:
+            if isinstance(d, ast.Import):
+                yield from (a.name for a in d.names)
+            elif isinstance(d, ast.ImportFrom) and d.module and not d.level:
+                yield d.module
+            elif isinstance(d, (ast.If, ast.Try)):
+                yield from gez(d.body)
+                for h in getattr(d, "handlers", ()):
+                    yield from gez(h.body)
+                yield from gez(d.orelse)
+    yield from gez(ast.parse(yol.read_text(encoding="utf-8")).body)
+
+
+def _com_yolu(modul: str, gorulen: set):
+    if modul in gorulen:
+        return None
+    gorulen.add(modul)
+    parca = modul.replace(".", "/")
+    yol = next((y for y in (KOK / f"{parca}.py", KOK / parca / "__init__.py") if y.exists()), None)
+    if yol is None:
+        return None
+    for ad in _ust_duzey_importlar(yol):
+        if ad.split(".")[0] in _COM_PAKETLERI:
+            return [modul, ad]
+        alt = _com_yolu(ad, gorulen)
+        if alt:
+            return [modul] + alt
+    return None
+
+
+def test_5_isitilan_moduller_com_yuklemez():
+    for key, moduller in on_isitma.ISITMA_MODULLERI.items():
+        for modul in moduller:
+            yol = _com_yolu(modul, set())
+            assert yol is None, f"{key}: {' → '.join(yol)}"
+    assert set(on_isitma.VARSAYILAN_SIRA) <= set(on_isitma.ISITMA_MODULLERI)
+    # Tarama gerçekten yakalıyor: çıkarılan kartlar COM'a ulaşır
+    assert _com_yolu("botanik_gui", set())[-1].startswith("pywinauto")
+    assert _com_yolu("recete_rapor_kontrol_gui", set()) is not None
+
+
+def main():
+    testler = [(ad, fn) for ad, fn in sorted(globals().items())
+               if ad.startswith("test_") and callable(fn)]
+    gecen = 0
+    for ad, fn in testler:
+        try:
+            fn()
+            print(f"✓ {ad}")
+            gecen += 1
+        except Exception as e:
+            print(f"✗ {ad}: {e!r}")
+    print(f"\n{gecen}/{len(testler)} geçti")
+    return 0 if gecen == len(testler) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Reçete hattı (recete_hatti) ve ardışık düzenli rapor kontrolü testleri.
+
+Sahte edinim kaynağıyla (gecikmeli üreteç) ReceteHatti'nin sonuçları çok
+işçili aşamalarda da giriş sırasıyla yaydığı, sınırlı kuyrukların edinimi
+durdurduğu (geri basınç), edinim ile kontrollerin örtüştüğü, aşama
+hatalarının reçeteyi düşürmediği ve aşama metriklerinin tutarlı olduğu;
+rapor_kontrol_hatti'nin kayıtlı oturumda tek_recete_rapor_kontrol ile aynı
+sonuçları verdiği, EOS zenginleştirmesi ile SUT kurallarını arka plan
+aşamalarında çalıştırdığı ve hazirla None dönünce edinimi bıraktığı;
+sonuç geri çağrısının kilitsiz çalıştığı, bitir()'in takılan aşamada süre
+dolunca döndüğü ve RaporHattiSureleri'nin reçete sürelerini bir kez saydığı
+doğrulanır.
+
+Çalıştır: python test_recete_hatti.py
+"""
+from __future__ import annotations
+
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from medula_surucu import KayitSurucu, TekrarSurucu
+from recete_akisi import (RaporHattiSureleri, rapor_kontrol_degerlendir, rapor_kontrol_hatti,
+                          rapor_kontrol_kurallari, rapor_kontrol_oku,
+                          rapor_kontrol_zenginlestirici, tek_recete_rapor_kontrol)
+from recete_hatti import Asama, ReceteHatti
+from test_medula_surucu import SahteBot, _RenkliKontrol
+
+
+def _kaynak(adet, gecikme=0.0, sayac=None):
+    """Sahte edinim: her reçete `gecikme` sn'de 'okunur'."""
+    for i in range(adet):
+        time.sleep(gecikme)
+        if sayac is not None:
+            sayac.append(i)
+        yield {"no": f"3K{i:05d}"}
+
+
+def test_1_sirali_yayim_cok_isci():
+    rnd = random.Random(3)
+    gecikmeler = [rnd.uniform(0, 0.01) for _ in range(40)]
+
+    def zenginlestir(okuma):
+        time.sleep(gecikmeler[int(okuma["no"][2:])])
+        return dict(okuma, zengin=True)
+
+    yayilan = []
+    hat = ReceteHatti([Asama("zenginlestirme", zenginlestir, isci=4),
+                       Asama("degerlendirme", lambda o: (o["no"], o["zengin"]), isci=3)],
+                      kuyruk_boyu=3, sonuc_geri_cagrisi=lambda s: yayilan.append(s.sira))
+    sonuclar = hat.isle(_kaynak(40))
+    assert [s.sira for s in sonuclar] == list(range(40)) == yayilan
+    assert [s.deger for s in sonuclar] == [(f"3K{i:05d}", True) for i in range(40)]
+    assert all(s.hata is None for s in sonuclar)
+
+
+def test_2_geri_basinc_edinimi_durdurur():
+    okunan = []
+    serbest = threading.Event()
+
+    def yavas(okuma):
+        serbest.wait(5)
+        return okuma
+
+    hat = ReceteHatti([Asama("degerlendirme", yavas)], kuyruk_boyu=2)
+    t = threading.Thread(target=lambda: hat.isle(_kaynak(20, sayac=okunan)), daemon=True)
+    t.start()
+    time.sleep(0.1)
+    # 1 işçide + 2 kuyrukta + 1 put'ta bekleyen: edinim daha fazlasını okumaz
+    assert len(okunan) == 4, okunan
+    serbest.set()
+    t.join(5)
+    assert len(okunan) == 20
+    m = hat.metrikler()["asamalar"]
+    assert m["edinim"]["tikali_sn"] >= 0.05 and m["degerlendirme"]["max_kuyruk"] == 0
+    assert m["edinim"]["max_kuyruk"] <= 2
+
+
+def test_3_edinim_ve_kontroller_ortusur():
+    adet, gecikme = 12, 0.02
+
+    def degerlendir(okuma):
+        time.sleep(gecikme)
+        return okuma["no"]
+
+    t0 = time.perf_counter()
+    ardisik = [degerlendir(o) for o in _kaynak(adet, gecikme)]
+    ardisik_sure = time.perf_counter() - t0
+
+    hat = ReceteHatti([Asama("degerlendirme", degerlendir)], kuyruk_boyu=2)
+    t0 = time.perf_counter()
+    sonuclar = hat.isle(_kaynak(adet, gecikme))
+    hat_sure = time.perf_counter() - t0
+    assert [s.deger for s in sonuclar] == ardisik
+    assert hat_sure < ardisik_sure * 0.8, (hat_sure, ardisik_sure)
+
+    m = hat.metrikler()
+    assert m["asamalar"]["edinim"]["adet"] == adet == m["asamalar"]["degerlendirme"]["adet"]
+    for ad in ("edinim", "degerlendirme"):
+        assert 0.5 < m["asamalar"][ad]["kullanim"] <= 1.0, (ad, m)
+
+
+def test_4_asama_hatasi_receteyi_dusurmez():
+    cagrilar = []
+
+    def zenginlestir(okuma):
+        if okuma["no"] == "3K00002":
+            raise ValueError("EOS bağlantısı yok")
+        return okuma
+
+    def degerlendir(okuma):
+        cagrilar.append(okuma["no"])
+        return "OK"
+
+    hat = ReceteHatti([Asama("zenginlestirme", zenginlestir), Asama("degerlendirme", degerlendir)])
+    sonuclar = hat.isle(_kaynak(5))
+    assert [s.deger for s in sonuclar] == ["OK", "OK", None, "OK", "OK"]
+    hatali = sonuclar[2]
+    assert isinstance(hatali.hata, ValueError) and hatali.hata_asamasi == "zenginlestirme"
+    assert hatali.girdi == {"no": "3K00002"} and "3K00002" not in cagrilar
+    assert hat.metrikler()["asamalar"]["degerlendirme"]["adet"] == 5   # geçirildi, çağrılmadı
+
+    # Kaynak hatası: o ana kadar okunanlar bitirilir, hata çağırana gider
+    def bozuk():
+        yield {"no": "3K00000"}
+        raise RuntimeError("Medula düştü")
+
+    hat = ReceteHatti([Asama("degerlendirme", degerlendir)])
+    try:
+        hat.isle(bozuk())
+        assert False, "hata yutuldu"
+    except RuntimeError:
+        pass
+    assert [s.deger for s in hat._sonuclar] == ["OK"]
+
+
+def test_5_rapor_kontrol_hatti_ardisik_ile_ayni():
+    # Okuma + değerlendirme birleşimi eski fonksiyonla aynı
+    renkli = _RenkliKontrol()
+    beklenen = [tek_recete_rapor_kontrol(SahteBot(), 1, grup="B", renkli_kontrol=renkli)]
+    okuma = rapor_kontrol_oku(SahteBot(), 1)
+    assert okuma["durum"] is None and okuma["doz_rapor"] is not None
+    assert [rapor_kontrol_degerlendir(okuma, renkli, "B")] == beklenen
+    assert rapor_kontrol_degerlendir(rapor_kontrol_oku(SahteBot(), 1, stop_check=lambda: True)) \
+        == (False, None, False, "Kullanıcı tarafından durduruldu")
+
+    with tempfile.TemporaryDirectory() as d:
+        kayit = KayitSurucu(SahteBot(doz_hatasi="3K00001"), d)
+        beklenen = [tek_recete_rapor_kontrol(kayit, i + 1, grup="B", renkli_kontrol=renkli)
+                    for i in range(4)]
+        kayit.kapat()
+
+        tekrar = TekrarSurucu(d, gecikme_carpani=0, bekleme_carpani=0)
+        zenginlesen, yayilan = [], []
+
+        def zenginlestir(okuma):
+            zenginlesen.append(okuma["recete_no"])
+            return okuma
+
+        sonuclar, metrikler = rapor_kontrol_hatti(
+            tekrar, 4, grup="B", renkli_kontrol=renkli, zenginlestir=zenginlestir,
+            sonuc_geri_cagrisi=yayilan.append)
+        assert sonuclar == beklenen == yayilan, (sonuclar, beklenen)
+        assert zenginlesen == [s[1] for s in beklenen]
+        assert set(metrikler["asamalar"]) == {"edinim", "zenginlestirme", "degerlendirme"}
+
+        # Durdurma: rapor_kontrol_oku reçete başına 3 kez sorar; 2. reçetenin
+        # başında durulur, edinim biter, okunan reçete yine değerlendirilir
+        tekrar.basa_sar()
+        sorgular = []
+        sonuclar, _ = rapor_kontrol_hatti(tekrar, 4, grup="B", renkli_kontrol=renkli,
+                                          stop_check=lambda: sorgular.append(1) or len(sorgular) > 3)
+        assert sonuclar == [beklenen[0], (False, None, False, "Kullanıcı tarafından durduruldu")]
+
+
+class _RaporluBot(SahteBot):
+    """Her reçetede tek raporlu ilaç: çift sayfalar statin, tekler parasetamol."""
+
+    ILACLAR = [("ATOR 40 MG 30 FILM TABLET", "04.03", "ATORVASTATIN", ["LDL 120 mg/dl"]),
+               ("PAROL 500 MG 20 TABLET", "", "PARASETAMOL", [])]
+
+    def sadece_doz_kontrolu(self, session_logger=None, stop_check=None):
+        rapor = super().sadece_doz_kontrolu(session_logger, stop_check)
+        ad, kod, etken, aciklamalar = self.ILACLAR[self.sayfa % 2]
+        rapor["doz_asimi"] = 0
+        rapor["detaylar"] = [{
+            "satir": 0, "ilac_adi": ad, "rapor_kodu": kod, "recete_doz": "1x1",
+            "rapor_tedavi_semasi": [{"sgk_kodu": "SGKF1", "etkin_madde": etken,
+                                     "tedavi_semasi": "1x1"}],
+            "rapor_aciklamalari": aciklamalar, "eslesen_etkin_madde": None,
+            "doz_uygun": None, "doz_aciklama": None}]
+        return rapor
+
+
+class _EOS:
+    """BotanikDB.etkin_madde_getir_ilac_adiyla yüzü; sorgu ve thread kaydı tutar."""
+
+    def __init__(self):
+        self.sorgular, self.threadler = [], set()
+
+    def etkin_madde_getir_ilac_adiyla(self, urun_adi):
+        self.sorgular.append(urun_adi)
+        self.threadler.add(threading.current_thread().name)
+        return {"ATOR": ["ATORVASTATIN"], "PAROL": ["PARASETAMOL"]}.get(urun_adi.split()[0], [])
+
+
+def test_6_rapor_kontrol_hatti_eos_ve_sut_arka_planda():
+    eos, bot, hazirlanan = _EOS(), _RaporluBot(), []
+
+    def hazirla(sira):
+        hazirlanan.append(sira)
+        return bot.recete_no() if sira < 14 else None      # döngüye dön
+
+    sonuclar, metrikler = rapor_kontrol_hatti(
+        bot, None, grup="B", zenginlestir=rapor_kontrol_zenginlestirici(lambda: eos),
+        kural_kontrol=rapor_kontrol_kurallari, hazirla=hazirla,
+        baslangic_sira=10, ilk_recete_no="3K00000")
+    assert hazirlanan == [11, 12, 13, 14]
+    assert [s[:3] for s in sonuclar] == [(True, f"3K{i:05d}", i % 2 == 0) for i in range(4)]
+    assert sonuclar[0][3].startswith("SUT ATOR 40 MG 30 FILM TABLET: uygun_degil")
+    assert sonuclar[1][3] == "OK"
+    # EOS ilaç adı başına bir kez, edinim thread'i dışında sorgulanır
+    assert eos.sorgular == ["ATOR 40 MG 30 FILM TABLET", "PAROL 500 MG 20 TABLET"]
+    assert eos.threadler == {"ReceteHatti-zenginlestirme-0"}
+    assert set(metrikler["asamalar"]) == {"edinim", "zenginlestirme", "kural_kontrol",
+                                          "degerlendirme"}
+    assert metrikler["asamalar"]["kural_kontrol"]["adet"] == 4
+
+    # Zenginleştirme/kural hatası okunmuş reçeteyi başarısız saymaz
+    def bozuk(okuma):
+        raise RuntimeError("EOS bağlantısı yok")
+
+    sonuclar, _ = rapor_kontrol_hatti(_RaporluBot(), 2, zenginlestir=bozuk,
+                                      kural_kontrol=rapor_kontrol_kurallari)
+    assert sonuclar == [(True, "3K00000", False, "OK"), (True, "3K00001", False, "OK")]
+
+
+def test_7_geri_cagri_kilitsiz_bitir_sureli():
+    goruler = []
+    hat = ReceteHatti([Asama("degerlendirme", lambda o: o["no"], isci=2)],
+                      sonuc_geri_cagrisi=lambda s: goruler.append(hat.metrikler()))
+    t = threading.Thread(target=lambda: goruler.append(hat.isle(_kaynak(6))), daemon=True)
+    t.start()
+    t.join(5)
+    assert not t.is_alive(), "geri çağrıdan metrikler() hattı kilitledi"
+    assert len(goruler) == 7 and [s.deger for s in goruler[-1]] == [f"3K{i:05d}" for i in range(6)]
+
+    serbest = threading.Event()
+    hat = ReceteHatti([Asama("takilan", lambda o: serbest.wait(10) and o)])
+    hat.baslat()
+    hat.gonder({"no": "3K00000"})
+    t0 = time.perf_counter()
+    assert hat.bitir(zaman_asimi=0.2) == []
+    assert time.perf_counter() - t0 < 2
+    serbest.set()
+
+
+def test_8_hat_sureleri_bir_kez_sayilir():
+    def calistir(bot, durdur_sira):
+        """botanik_gui döngüsünün hat muhasebesi: sonuçlar hazirla'da işlenir."""
+        t0 = time.time()
+        sureler, oturum, basarili = RaporHattiSureleri(t0), [0.0], []
+
+        def isle():
+            for sonuc, sure in sureler.isle():
+                if sure is not None:
+                    oturum[0] += sure
+                    basarili.append(sonuc[1])
+
+        def hazirla(sira):
+            isle()
+            if sira > 4:
+                return None
+            sureler.basla()
+            return bot.recete_no()
+
+        rapor_kontrol_hatti(bot, None, hazirla=hazirla, sonuc_geri_cagrisi=sureler.sonuc_geldi,
+                            stop_check=lambda: bot.sayfa >= durdur_sira,
+                            zenginlestir=lambda o: time.sleep(0.005) or o)
+        isle()
+        oturum[0] += sureler.kapanis_suresi()       # döngü sonu (botanik_gui)
+        return sureler, oturum[0], time.time() - t0, basarili
+
+    # Başarılı bitiş: son reçetenin süresi döngüde tekrar eklenmez
+    sureler, oturum, gecen, basarili = calistir(SahteBot(gecikme=0.01), 99)
+    assert basarili == [f"3K{i:05d}" for i in range(4)] and sureler.son_sonuc[0]
+    assert sureler.kapanis_suresi() == 0.0
+    assert oturum == sureler.toplam_sure and 0 < oturum < 1.3 * gecen, (oturum, gecen)
+
+    # Başarısız bitiş: yalnız son (durdurulan) reçetenin süresi döngüde eklenir
+    sureler, oturum, gecen, basarili = calistir(SahteBot(gecikme=0.01), 2)
+    assert basarili == ["3K00000", "3K00001"] and not sureler.son_sonuc[0]
+    assert oturum > sureler.toplam_sure and oturum < 1.3 * gecen, (oturum, gecen)
+
+
+def main():
+    testler = [(ad, fn) for ad, fn in sorted(globals().items())
+               if ad.startswith("test_") and callable(fn)]
+    gecen = 0
+    for ad, fn in testler:
+        try:
+            fn()
+            print(f"✓ {ad}")
+            gecen += 1
+        except Exception as e:
+            print(f"✗ {ad}: {e!r}")
+    print(f"\n{gecen}/{len(testler)} geçti")
+    return 0 if gecen == len(testler) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
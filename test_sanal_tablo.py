@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Sanal tablo (SanalTablo) testleri — Tk gerektirmez.
+
+Treeview yerine insert/delete/yview çağrılarını kaydeden sahte bir nesne
+kullanılır: pencerede sadece görünür alan + tampon kadar satır olduğu,
+kaydırmada yalnız fark satırlarının eklenip silindiği, satırların tembel
+üretilip önbelleğe alındığı ve pencere dışına çıkan vurgunun geri geldiği
+doğrulanır. Satış raporlarındaki toplu zaman anomalisi tablosunun aynı
+ızgarayı kullandığı da sınanır.
+
+Çalıştır: python test_sanal_tablo.py
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from sanal_tablo import SanalTablo
+
+
+class _SahteTreeview:
+    """SanalTablo'nun kullandığı ttk.Treeview yüzeyi."""
+
+    def __init__(self):
+        self.satirlar = []          # iid sırası
+        self.veriler = {}
+        self.secim = []
+        self.yscroll = None
+        self.ekleme = 0
+        self.silme = 0
+        self.odak = None
+
+    def configure(self, **kw):
+        self.yscroll = kw.get("yscrollcommand", self.yscroll)
+
+    def bind(self, *a, **kw):
+        pass
+
+    def after_idle(self, fn):
+        fn()
+
+    def get_children(self):
+        return tuple(self.satirlar)
+
+    def insert(self, parent, idx, iid, values, tags):
+        assert iid not in self.veriler
+        self.satirlar.insert(idx, iid)
+        self.veriler[iid] = (values, tags)
+        self.ekleme += 1
+
+    def delete(self, *iidler):
+        for i in iidler:
+            self.satirlar.remove(i)
+            del self.veriler[i]
+            self.silme += 1
+        self.secim = [i for i in self.secim if i in self.veriler]
+
+    def item(self, iid, values, tags):
+        if iid not in self.veriler:
+            raise KeyError(iid)
+        self.veriler[iid] = (values, tags)
+
+    def yview_moveto(self, f):
+        pass
+
+    def see(self, iid):
+        pass
+
+    def selection(self):
+        return tuple(self.secim)
+
+    def selection_set(self, *iidler):
+        self.secim = list(iidler)
+
+    def selection_add(self, *iidler):
+        self.secim.extend(i for i in iidler if i not in self.secim)
+
+    def focus(self, iid):
+        self.odak = iid
+
+
+def _grid(n=50_000, tampon=50):
+    tv = _SahteTreeview()
+    uretilen = []
+
+    def uret(iid):
+        uretilen.append(iid)
+        return (iid, f"satır {iid}"), ("beyaz",)
+
+    g = SanalTablo(tv, uret, tampon=tampon)
+    g.veri_ayarla(str(i) for i in range(n))
+    return g, tv, uretilen
+
+
+def test_1_sadece_pencere_materialize():
+    g, tv, uretilen = _grid()
+    assert len(g) == 50_000
+    assert len(tv.satirlar) <= g._gorunur + 2 * g.tampon
+    assert tv.satirlar == [str(i) for i in range(len(tv.satirlar))]
+    assert len(uretilen) == len(tv.satirlar)
+
+
+def test_2_kaydirma_fark_satirlari():
+    g, tv, _ = _grid()
+    g.kaydir(30)       # pencere içinde ama kenara yakın → yeniden ortalanır
+    once = tv.ekleme
+    g.kaydir(31)
+    assert tv.ekleme - once <= 1   # bir satır kaydı → en fazla bir ekleme
+    g.yview("moveto", "0.5")
+    assert g._ust == 25_000
+    assert str(25_000) in tv.satirlar
+    assert tv.satirlar == sorted(tv.satirlar, key=int)
+    assert tv.satirlar == g.gorunen_iidler()[g._bas:g._bas + len(tv.satirlar)]
+    g.yview("scroll", "1", "pages")
+    assert g._ust == 25_000 + g._gorunur - 1
+
+
+def test_3_treeview_kendi_kaydirmasi_pencereyi_tasir():
+    g, tv, _ = _grid()
+    n = len(tv.satirlar)
+    # Treeview pencerenin sonuna kaydı (tekerlek / ok tuşu)
+    g._tv_yscroll((n - g._gorunur) / n, 1.0)
+    son = g._bas + len(tv.satirlar)
+    assert g._ust == n - g._gorunur
+    assert son - (g._ust + g._gorunur) >= g.tampon
+    g._tv_yscroll(0.0, g._gorunur / len(tv.satirlar))   # tekrar başa
+    assert g._ust == 0 and g._bas == 0
+
+
+def test_4_onbellek_ve_yenile():
+    g, tv, uretilen = _grid(n=1000, tampon=20)
+    g.kaydir(500)
+    assert "5" not in tv.satirlar
+    g.kaydir(0)
+    assert uretilen.count("5") == 1      # geri gelen satır önbellekten
+    g.yenile("5")
+    assert uretilen.count("5") == 2
+    g.yenile("99")       # pencere dışında olabilir — sadece önbellekten düşer
+    assert g.deger("7", 1) == "satır 7"
+
+
+def test_5_vurgu_pencere_disinda_korunur():
+    g, tv, _ = _grid()
+    g.sec("3")
+    assert tv.selection() == ("3",) and tv.odak == "3"
+    g.yview("moveto", "0.9")
+    assert "3" not in tv.satirlar
+    g._secim_degisti()
+    assert g.vurgulananlar() == ["3"]
+    g.yview("moveto", "0")
+    assert "3" in tv.selection()
+
+
+def test_6_akisli_ekleme_ve_filtre():
+    tv = _SahteTreeview()
+    g = SanalTablo(tv, lambda iid: ((iid,), ()), tampon=20)
+    g.ekle(["a", "b"])
+    assert tv.satirlar == ["a", "b"]
+    g.ekle([f"x{i}" for i in range(500)])
+    assert len(tv.satirlar) <= g._gorunur + 2 * g.tampon
+    assert g.konum("x10") == 12
+    g.veri_ayarla(["x5", "b"], konumu_koru=False)
+    assert tv.satirlar == ["x5", "b"] and len(g) == 2
+    g.temizle()
+    assert tv.satirlar == [] and len(g) == 0
+
+
+def test_7_filtre_farki_onbellegi_korur():
+    tv = _SahteTreeview()
+    uretilen = []
+    g = SanalTablo(tv, lambda iid: (uretilen.append(iid) or (iid,), ()), tampon=20)
+    tum = [f"r{i}" for i in range(1000)]
+    g.veri_ayarla(tum)
+    g.kaydir(300)
+    ilk = g.gorunen_iidler()[g._ust]
+    uretilen.clear()
+    eski_pencere = list(tv.satirlar)
+    ekleme, silme = tv.ekleme, tv.silme
+    # Tek sayılıları gizle: pencerede kalan çift satırlar silinmez/yeniden üretilmez
+    g.veri_ayarla([i for i in tum if int(i[1:]) % 2 == 0], onbellegi_koru=True)
+    assert tv.satirlar == g._sira[g._bas:g._bas + len(tv.satirlar)]
+    assert g.gorunen_iidler()[g._ust] == ilk
+    assert tv.silme - silme < g._gorunur + 2 * g.tampon
+    kalan = [i for i in eski_pencere if int(i[1:]) % 2 == 0 and i in tv.satirlar]
+    assert kalan and not set(kalan) & set(uretilen)
+    # Geri aç: yalnız fark eklenir, sıra korunur
+    g.veri_ayarla(tum, onbellegi_koru=True)
+    assert tv.satirlar == tum[g._bas:g._bas + len(tv.satirlar)]
+    assert tv.ekleme > ekleme
+
+
+class _Deger:
+    def __init__(self, v):
+        self.v = v
+
+    def get(self):
+        return self.v
+
+
+def test_8_satis_anomali_tablosu_sanal():
+    import satis_raporlari_gui as srg
+    from datetime import datetime, timedelta
+
+    p = srg.TopluZamanAnomaliPopup.__new__(srg.TopluZamanAnomaliPopup)
+    p.top, p.db = object(), object()
+    p.tree = _SahteTreeview()
+    p._grid = SanalTablo(p.tree, p._satir_render, tampon=30)
+    for ad in ("donusum", "antibiyotik", "is_bankasi", "bez", "cezaevi"):
+        setattr(p, f"{ad}_haric_var", _Deger(False))
+    t0 = datetime(2026, 1, 5, 9)
+    p.sonuclar = [{"Kaynak": "RECETE" if i % 3 else "ELDEN", "RxId": 1000 + i,
+                   "IslemTarihi": t0, "KayitTarihi": t0 + timedelta(seconds=700 + i),
+                   "FarkSn": None if i == 2 else 700 + i, "AntibiyotikMu": i % 2 == 1}
+                  for i in range(20_000)]
+    p._tabloyu_doldur_anomali()
+    assert len(p._grid) == 19_999 and len(p.tree.satirlar) < 200
+    degerler, etiket = p.tree.veriler[p.tree.satirlar[2]]
+    assert degerler[:3] == (4, "ELDEN", 1003) and etiket == ("normal",)   # sıra no korunur
+
+    # Pencere dışındaki seçim detaya gider (Treeview'de olmayan satır)
+    acilan = []
+    eski, srg.SatisDetayPopup = srg.SatisDetayPopup, lambda **kw: acilan.append(kw)
+    try:
+        p._grid.kaydir(15_000)
+        p.tree.selection_set(p.tree.satirlar[40])
+        p._grid._secim_degisti()
+        p._grid.kaydir(0)
+        p._secili_detayi_ac()
+    finally:
+        srg.SatisDetayPopup = eski
+    assert acilan and acilan[0]["rx_id"] == str(p._tablo_kayitlari[int(p._grid.vurgulananlar()[0])][1]["RxId"])
+
+    p.antibiyotik_haric_var = _Deger(True)
+    p._filtreleri_uygula()
+    assert len(p._grid) == 9_999
+
+
+def main() -> int:
+    testler = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    basarisiz = 0
+    for t in testler:
+        try:
+            t()
+            print(f"✓ {t.__name__}")
+        except AssertionError as e:
+            basarisiz += 1
+            print(f"✗ {t.__name__}: {e}")
+    print(f"\n{len(testler) - basarisiz}/{len(testler)} geçti")
+    return 1 if basarisiz else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Satış küpü (satis_kupu) testleri.
+
+Sahte EOS (bellek içi SQLite, T-SQL → tsql_sqlite_cevir) üzerinde küpün
+ham satırlardan doğrudan toplananla aynı aylık/günlük/grup sonuçlarını
+verdiği; artımlı yenilemenin yeni satırları, geç iade/silme düzeltmelerini
+ve geriye tarihli reçeteleri yakaladığı, pencere dışına dokunmadığı; kaynak
+hatasında küpün değişmediği ve EOS'a yalnız SELECT gittiği doğrulanır.
+
+Çalıştır: python test_satis_kupu.py
+"""
+from __future__ import annotations
+
+import sqlite3
+import sys
+import tempfile
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from botanik_ayna import fonksiyonlari_kaydet, tsql_sqlite_cevir
+from satis_kupu import KupSenkronHatasi, SatisKupu, ay_basi
+
+BUGUN = date.today()
+
+
+class _SahteEOS:
+    """sorgu_calistir(sql, params) → list[dict] arayüzlü SQLite kaynak."""
+
+    def __init__(self):
+        self.conn = sqlite3.connect(":memory:")
+        fonksiyonlari_kaydet(self.conn)
+        self.son_sorgu_hatasi = None
+        self.sorgular = []
+        self.hata_ver = False
+        for ana, ilac in (("ReceteAna", "ReceteIlaclari"), ("EldenAna", "EldenIlaclari")):
+            self.conn.execute(f"CREATE TABLE {ana} (RxId INTEGER PRIMARY KEY, RxKayitTarihi TEXT,"
+                              f" RxReceteTarihi TEXT, RxIslemTarihi TEXT, RxSilme INTEGER)")
+            self.conn.execute(f"CREATE TABLE {ilac} (RIId INTEGER PRIMARY KEY, RIRxId INTEGER,"
+                              f" RIUrunId INTEGER, RIAdet INTEGER, RIToplam REAL,"
+                              f" RISilme INTEGER, RIIade INTEGER)")
+        self.rx_id = 0
+        self.ri_id = 0
+
+    def satis(self, gun: date, urun: int, adet: int, elden: bool = False,
+              iade: bool = False, recete_gunu: date = None) -> int:
+        ana, ilac = ("EldenAna", "EldenIlaclari") if elden else ("ReceteAna", "ReceteIlaclari")
+        self.rx_id += 1
+        self.ri_id += 1
+        zaman = datetime.combine(gun, datetime.min.time()) + timedelta(hours=10)
+        rt = datetime.combine(recete_gunu or gun, datetime.min.time()) + timedelta(hours=9)
+        self.conn.execute(f"INSERT INTO {ana} VALUES (?, ?, ?, ?, 0)",
+                          (self.rx_id, zaman.isoformat(sep=" "), rt.isoformat(sep=" "),
+                           zaman.isoformat(sep=" ")))
+        self.conn.execute(f"INSERT INTO {ilac} VALUES (?, ?, ?, ?, ?, 0, ?)",
+                          (self.ri_id, self.rx_id, urun, adet, adet * 12.5, int(iade)))
+        return self.ri_id
+
+    def sorgu_calistir(self, sql, params=None):
+        self.son_sorgu_hatasi = None
+        self.sorgular.append(sql)
+        if self.hata_ver:
+            self.son_sorgu_hatasi = "08S01 iletisim hatasi"
+            return []
+        cur = self.conn.execute(tsql_sqlite_cevir(sql), [
+            f"{p[:4]}-{p[4:6]}-{p[6:8]}" if isinstance(p, str) and len(p) == 8 and p.isdigit()
+            else p for p in (params or ())])
+        kolonlar = [k[0] for k in cur.description]
+        return [dict(zip(kolonlar, r)) for r in cur.fetchall()]
+
+    def dogrudan_aylik(self, kolon="RxKayitTarihi", bas: date = None):
+        """Eski tüketici sorgusunun karşılığı: iade hariç ürün × ay adet."""
+        sonuc = defaultdict(lambda: defaultdict(int))
+        for ana, ilac in (("ReceteAna", "ReceteIlaclari"), ("EldenAna", "EldenIlaclari")):
+            for urun, tarih, adet in self.conn.execute(
+                    f"SELECT i.RIUrunId, a.{kolon}, i.RIAdet FROM {ilac} i JOIN {ana} a"
+                    f" ON i.RIRxId = a.RxId WHERE a.RxSilme = 0 AND i.RISilme = 0"
+                    f" AND i.RIIade = 0"):
+                if bas and tarih[:10] < bas.isoformat():
+                    continue
+                sonuc[urun][tarih[:7]] += adet
+        return {u: dict(a) for u, a in sonuc.items()}
+
+
+def _kurulum():
+    eos = _SahteEOS()
+    for i in range(120):
+        gun = BUGUN - timedelta(days=i * 4)
+        eos.satis(gun, urun=i % 4 + 1, adet=i % 3 + 1, elden=(i % 5 == 0))
+    eos.satis(BUGUN - timedelta(days=60), urun=1, adet=2, iade=True)
+    yol = str(Path(tempfile.mkdtemp()) / "kup.db")
+    return eos, SatisKupu(yol, gecmis_gun=500, geri_gun=10)
+
+
+def test_1_kup_dogrudan_toplamla_ayni():
+    eos, kup = _kurulum()
+    assert not kup.kullanilabilir_mi()
+    kup.yenile(eos, "kayit")
+    assert kup.kullanilabilir_mi("kayit", BUGUN - timedelta(days=400))
+    assert not kup.kullanilabilir_mi("kayit", BUGUN - timedelta(days=900))
+    assert not kup.kullanilabilir_mi("recete")
+    assert kup.donemsel() == eos.dogrudan_aylik()
+    bas = ay_basi(5)
+    assert kup.donemsel([1, 2], bas=bas) == {u: a for u, a in eos.dogrudan_aylik(bas=bas).items()
+                                           if u in (1, 2)}
+    # reçeteli + elden = toplam; tutar = adet × 12,5; iade ayrı ölçü
+    r, e, t = (kup.toplam(kaynak="recete"), kup.toplam(kaynak="elden"), kup.toplam())
+    assert all(r.get(u, 0) + e.get(u, 0) == t[u] for u in t)
+    assert kup.toplam(olcu="tutar")[3] == t[3] * 12.5
+    assert kup.toplam(olcu="iade_adet") == {1: 2}
+    assert all(s.lstrip().upper().startswith("SELECT") for s in eos.sorgular)
+
+
+def test_2_hafta_gun_grup_pencere():
+    eos, kup = _kurulum()
+    kup.yenile(eos)
+    gunluk = kup.gunluk(2, bas=BUGUN - timedelta(days=40))
+    assert gunluk and all(isinstance(g, date) for g in gunluk)
+    haftalik = kup.donemsel([2], bas=BUGUN - timedelta(days=40), donem="hafta")[2]
+    assert sum(haftalik.values()) == sum(gunluk.values())
+    assert all(date.fromisoformat(h).weekday() == 0 for h in haftalik)
+    grup = kup.grup_toplam({"A": [1, 2], "B": [3], "C": [99]})
+    t = kup.toplam()
+    assert grup == {"A": t[1] + t[2], "B": t[3], "C": 0}
+    aylik = kup.grup_toplam({"A": [1, 2]}, bas=ay_basi(2), donem="ay")["A"]
+    assert sum(aylik.values()) == sum(kup.pencere([1, 2], ay_sayisi=3).values())
+    assert kup.urunler(bas=BUGUN - timedelta(days=8)) == sorted(
+        kup.toplam(bas=BUGUN - timedelta(days=8)))
+
+
+def test_3_artimli_yenileme_duzeltmeleri_yakalar_eskiye_dokunmaz():
+    eos, kup = _kurulum()
+    kup.yenile(eos, "kayit")
+    kup.yenile(eos, "recete")
+    eski_ay = (BUGUN - timedelta(days=300)).isoformat()[:7]
+    eski = kup.donemsel()[1].get(eski_ay)
+    # Yeni satış, pencere içi iade düzeltmesi, geriye tarihli reçete
+    eos.satis(BUGUN, urun=4, adet=7)
+    ri = eos.satis(BUGUN - timedelta(days=2), urun=3, adet=5)
+    kup.yenile(eos, "kayit")
+    eos.conn.execute("UPDATE ReceteIlaclari SET RIIade = 1 WHERE RIId = ?", (ri,))
+    eos.satis(BUGUN, urun=2, adet=9, recete_gunu=BUGUN - timedelta(days=45))
+    # Pencere dışı değişiklik artımlı yenilemede görünmez (tam kurulumda görünür)
+    eos.conn.execute("UPDATE ReceteAna SET RxSilme = 1 WHERE RxKayitTarihi < ?",
+                     ((BUGUN - timedelta(days=300)).isoformat(),))
+    eos.sorgular.clear()
+    kup.yenile(eos, "kayit")
+    kup.yenile(eos, "recete")
+    assert all(s.lstrip().upper().startswith("SELECT") for s in eos.sorgular)
+    assert kup.donemsel()[1].get(eski_ay) == eski
+    assert kup.toplam(olcu="iade_adet", bas=BUGUN - timedelta(days=3)) == {3: 5}
+    assert kup.toplam([4], bas=BUGUN) == {4: 7}
+    recete_ayi = (BUGUN - timedelta(days=45)).isoformat()[:7]
+    yakin = ay_basi(3)
+    assert kup.donemsel([2], bas=yakin, esas="recete")[2] == \
+        eos.dogrudan_aylik("RxReceteTarihi", bas=yakin)[2]
+    assert recete_ayi in kup.donemsel([2], esas="recete")[2]
+    kup.yenile(eos, "kayit", tam=True)
+    assert kup.donemsel() == eos.dogrudan_aylik()
+
+
+def test_4_kaynak_hatasi_kupu_degistirmez():
+    eos, kup = _kurulum()
+    kup.yenile(eos)
+    once = kup.donemsel()
+    durum = kup.durum()["kayit"]
+    eos.satis(BUGUN, urun=1, adet=50)
+    eos.hata_ver = True
+    try:
+        kup.yenile(eos)
+    except KupSenkronHatasi:
+        pass
+    else:
+        raise AssertionError("kaynak hatası KupSenkronHatasi vermeli")
+    assert kup.donemsel() == once and kup.durum()["kayit"] == durum
+    # Yeni süreç dosyadan aynı küpü görür
+    assert SatisKupu(kup.yol).donemsel() == once
+
+
+def main():
+    testler = [(ad, fn) for ad, fn in sorted(globals().items())
+               if ad.startswith("test_") and callable(fn)]
+    gecen = 0
+    for ad, fn in testler:
+        try:
+            fn()
+            print(f"✓ {ad}")
+            gecen += 1
+        except Exception as e:
+            print(f"✗ {ad}: {e!r}")
+    print(f"\n{gecen}/{len(testler)} geçti")
+    return 0 if gecen == len(testler) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
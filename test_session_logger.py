@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Oturum logu (session_logger) arka plan yazıcı testleri.
+
+yaz() çağrılarının kuyruğa atılıp yazıcı thread'inde eski txt biçimiyle
+ve yanında yapılandırılmış .jsonl kayıtlarıyla yazıldığı; partilerin süre
+dolunca ve ERROR'da kendiliğinden diske indiği; dosyaların boyut aşınca
+döndürüldüğü; kapat sonrası yazımın senkron yola düştüğü; kapat'ın arkasına
+düşen kaydın kaybolmadığı; akışın okuduğu reçete no'sunun sonraki kayıtlara
+işlendiği; çıkışta ve çökmede kuyruğun boşaltıldığı; adım sürelerinin
+(tek_recete_isle dahil) Chrome trace zaman çizelgesine aktarıldığı
+doğrulanır.
+
+Çalıştır: python test_session_logger.py
+"""
+from __future__ import annotations
+
+import json
+import re
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from recete_akisi import rapor_kontrol_oku, tek_recete_isle
+from session_logger import SessionLogger, jsonl_parcalari, kayitlari_oku
+from test_medula_surucu import SahteBot, _RaporTakip
+
+
+def _logger(**kwargs):
+    return SessionLogger(7, "A", log_klasoru=tempfile.mkdtemp(), **kwargs)
+
+
+def test_1_kuyruk_ve_yapilandirilmis_kayit():
+    log = _logger(toplu_sure=60)
+    log.info("Grup A için yeni oturum başlatıldı")
+    log.aktif_recete = "3K00000"
+    log.warning("⚠️ Rapor bulunamadı")
+    log.yaz("İlaç butonu", "INFO", adim="ilac_butonu", sure=0.25)
+    assert log.bosalt()
+    satirlar = log.log_dosya.read_text(encoding="utf-8").splitlines()
+    assert satirlar[1] == "BOTANIK BOT - OTURUM LOGU"
+    assert re.fullmatch(r"\[\d\d:\d\d:\d\d\.\d{3}\] \[INFO\] Grup A için yeni oturum başlatıldı",
+                        satirlar[-3])
+    assert satirlar[-2].endswith("[WARNING] ⚠️ Rapor bulunamadı")
+
+    kayitlar = list(kayitlari_oku(log.jsonl_dosya))
+    assert [k["seviye"] for k in kayitlar] == ["INFO", "WARNING", "INFO"]
+    assert "recete" not in kayitlar[0] and kayitlar[1]["recete"] == "3K00000"
+    assert kayitlar[2]["adim"] == "ilac_butonu" and kayitlar[2]["sure"] == 0.25
+    assert all(isinstance(k["ts"], float) and k["tid"] for k in kayitlar)
+    log.kapat()
+
+
+def test_2_parti_sure_ve_hata_ile_iner():
+    log = _logger(toplu_boyut=1000, toplu_sure=0.2)
+    log.info("bir")
+    assert "bir" not in log.log_dosya.read_text(encoding="utf-8")     # henüz kuyrukta
+    time.sleep(0.6)
+    assert "bir" in log.log_dosya.read_text(encoding="utf-8")
+
+    log.toplu_sure = 60
+    log.info("iki")
+    log.hata("3 deneme başarısız! Sistem durdu.")                      # ERROR partiyi indirir
+    time.sleep(0.2)
+    metin = log.log_dosya.read_text(encoding="utf-8")
+    assert "[INFO] iki" in metin and "[ERROR] 3 deneme başarısız" in metin
+    log.kapat()
+
+
+def test_3_dosya_dondurme():
+    log = _logger(toplu_boyut=10, max_boyut=2000, yedek_sayisi=2)
+    for i in range(300):
+        log.info(f"satır {i:04d} " + "x" * 40)
+    log.kapat()
+    klasor = log.log_klasoru
+    txtler = sorted(p.name for p in klasor.glob("*.txt*"))
+    assert len(txtler) == 3 and any(n.endswith(".txt.2") for n in txtler), txtler
+    assert not list(klasor.glob("*.txt.3"))
+    # Parçalar eskiden yeniye okunur, en yeni kayıtlar korunur
+    assert jsonl_parcalari(log.jsonl_dosya)[-1] == log.jsonl_dosya
+    mesajlar = [k["mesaj"][:10] for k in kayitlari_oku(log.jsonl_dosya)]
+    assert mesajlar[-1] == "satır 0299" and mesajlar == sorted(mesajlar)
+
+
+def test_4_ozet_kapat_ve_sonrasi():
+    log = _logger(toplu_sure=60)
+    log.basari("✅ 2 rapor CSV'ye kaydedildi")
+    log.ozet_yaz(10, 4, 12.5, 1, 0)
+    log.kapat()
+    log.kapat()                                                        # ikinci kez: sessiz
+    log.info("kapattıktan sonra")                                      # senkron yol
+    metin = log.log_dosya.read_text(encoding="utf-8")
+    assert metin.index("[BAŞARI]") < metin.index("OTURUM ÖZETİ") < metin.index("kapatıldı.")
+    assert "Ortalama Reçete Süresi: 12.50 saniye" in metin
+    assert metin.rstrip().endswith("[INFO] kapattıktan sonra")
+    assert not log._yazici.is_alive()
+
+
+def test_5_cikis_ve_cokmede_bosaltir():
+    klasor = tempfile.mkdtemp()
+    kod = (
+        "import sys; sys.path.insert(0, %r)\n"
+        "from session_logger import SessionLogger\n"
+        "log = SessionLogger(1, 'B', log_klasoru=%r, toplu_sure=60)\n"
+        "log.info('çökmeden önce')\n"
+        "raise RuntimeError('beklenmeyen')\n"
+    ) % (str(Path(__file__).resolve().parent), klasor)
+    sonuc = subprocess.run([sys.executable, "-c", kod], capture_output=True, timeout=30)
+    assert sonuc.returncode != 0 and b"RuntimeError" in sonuc.stderr
+    txt = next(Path(klasor).glob("*.txt"))
+    assert "[INFO] çökmeden önce" in txt.read_text(encoding="utf-8")
+
+
+def test_6_chrome_trace_adim_zaman_cizelgesi():
+    log = _logger()
+    bot = SahteBot(gecikme=0.002)
+    for i in range(2):
+        assert tek_recete_isle(bot, i + 1, _RaporTakip(), grup="A", session_logger=log)[0]
+    hedef = log.trace_disa_aktar()
+    log.kapat()
+    trace = json.loads(hedef.read_text(encoding="utf-8"))
+    olaylar = trace["traceEvents"]
+    assert olaylar[0]["ph"] == "M" and "Oturum 7" in olaylar[0]["args"]["name"]
+    spanlar = [o for o in olaylar if o["ph"] == "X"]
+    receteler = [o for o in spanlar if o["name"] == "Reçete"]
+    assert [o["args"]["recete"] for o in receteler] == ["3K00000", "3K00001"]
+    adimlar = [o for o in spanlar if o["name"] != "Reçete"]
+    assert adimlar and all(o["dur"] >= 0 and o["ts"] >= 0 for o in adimlar)
+    assert {o["args"].get("recete") for o in adimlar} >= {"3K00000", "3K00001"}
+    assert any(o["args"].get("anahtar") == "ilac_butonu" for o in adimlar)
+    # Her adım kendi reçetesinin (sıra) içinde
+    for r in receteler:
+        icindekiler = [o for o in adimlar if o["args"]["sira"] == r["args"]["sira"]]
+        assert len(icindekiler) > 5
+        assert all(r["ts"] - 1 <= o["ts"] and o["ts"] + o["dur"] <= r["ts"] + r["dur"] + 1
+                   for o in icindekiler)
+
+
+def test_7_akis_aktif_receteyi_kayitlara_isler():
+    log = _logger(toplu_sure=60)
+    bot = SahteBot(gecikme=0.0)
+    assert tek_recete_isle(bot, 1, _RaporTakip(), grup="A", session_logger=log)[0]
+    log.info("birinci reçeteden sonra")
+    assert rapor_kontrol_oku(bot, 2, log)["recete_no"] == "3K00001"
+    log.warning("ikinci reçeteden sonra")
+    log.kapat()
+    assert log._kapali and not log._yazici.is_alive()
+    kayitlar = {k["mesaj"]: k for k in kayitlari_oku(log.jsonl_dosya) if "mesaj" in k}
+    assert kayitlar["birinci reçeteden sonra"]["recete"] == "3K00000"
+    assert kayitlar["ikinci reçeteden sonra"]["recete"] == "3K00001"
+
+
+def test_8_kapat_arkasina_dusen_kayit_kaybolmaz():
+    log = _logger(toplu_sure=60)
+    asil, tut = log._parti_yaz, threading.Event()
+
+    def yavas_parti_yaz(parti):
+        tut.wait(5)                                   # yazıcıyı bekletir
+        asil(parti)
+
+    log._parti_yaz = yavas_parti_yaz
+    log.info("önce")
+    threading.Thread(target=log.bosalt, daemon=True).start()
+    kapatici = threading.Thread(target=log.kapat)
+    kapatici.start()
+    son = time.monotonic() + 5
+    while log._kuyruk.qsize() < 2 and time.monotonic() < son:   # kapanış satırı + "kapat"
+        time.sleep(0.01)
+    assert log._kapali
+    # _kapali kontrolünü bayraktan önce geçmiş bir yaz(): kaydı "kapat"ın arkasında
+    log._kuyruk.put(("satir", time.time(), "INFO", "geç kalan", None, None, None,
+                     threading.get_ident()))
+    tut.set()
+    kapatici.join(5)
+    assert not log._yazici.is_alive()
+    metin = log.log_dosya.read_text(encoding="utf-8")
+    assert "[INFO] önce" in metin and metin.rstrip().endswith("[INFO] geç kalan")
+    assert [k["mesaj"] for k in kayitlari_oku(log.jsonl_dosya)] == ["önce", "geç kalan"]
+
+
+def main():
+    testler = [(ad, fn) for ad, fn in sorted(globals().items())
+               if ad.startswith("test_") and callable(fn)]
+    gecen = 0
+    for ad, fn in testler:
+        try:
+            fn()
+            print(f"✓ {ad}")
+            gecen += 1
+        except Exception as e:
+            print(f"✗ {ad}: {e!r}")
+    print(f"\n{gecen}/{len(testler)} geçti")
+    return 0 if gecen == len(testler) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
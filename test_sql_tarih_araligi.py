@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""sql_tarih_araligi — sargable dönem filtresi derleyici testleri.
+
+Eşdeğerlik: üretilen SQL parçası, eski YEAR()/MONTH()/DAY() IN süzgeci ile
+aynı günleri seçmeli. SQLite'ta tarihler 'YYYYMMDD' metni olarak tutulur
+(sözlük sırası = tarih sırası) ve YEAR/MONTH/DAY fonksiyonları tanımlanır.
+
+Çalıştır: python test_sql_tarih_araligi.py
+"""
+from __future__ import annotations
+
+import random
+import sqlite3
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from sql_tarih_araligi import (
+    aralik_kosulu, araliklari_birlestir, donem_araliklari, donem_kosulu,
+)
+
+
+def _gunluk_db():
+    conn = sqlite3.connect(":memory:")
+    conn.create_function("YEAR", 1, lambda t: int(t[:4]))
+    conn.create_function("MONTH", 1, lambda t: int(t[4:6]))
+    conn.create_function("DAY", 1, lambda t: int(t[6:8]))
+    conn.execute("CREATE TABLE ReceteAna (RxId INTEGER, RxKayitTarihi TEXT)")
+    gun = date(2022, 12, 1)
+    satirlar = []
+    i = 0
+    while gun < date(2027, 2, 1):
+        satirlar.append((i, gun.strftime("%Y%m%d")))
+        i += 1
+        gun += timedelta(days=1)
+    conn.executemany("INSERT INTO ReceteAna VALUES (?, ?)", satirlar)
+    return conn
+
+
+def _eski_kosul(yillar, aylar, gunler):
+    parcalar, prm = ["1=1"], []
+    for fonk, liste in (("YEAR", yillar), ("MONTH", aylar), ("DAY", gunler)):
+        if liste:
+            parcalar.append(f"{fonk}(RxKayitTarihi) IN ({','.join('?' * len(liste))})")
+            prm.extend(liste)
+    return " AND ".join(parcalar), prm
+
+
+def _idler(conn, kosul, prm):
+    sql = "SELECT RxId FROM ReceteAna WHERE " + (kosul or "1=1")
+    return {r[0] for r in conn.execute(sql, prm)}
+
+
+def test_1_tek_ay_tek_aralik():
+    kosul, prm = donem_kosulu("ra.RxKayitTarihi", [2026], [3])
+    assert kosul == "(ra.RxKayitTarihi >= ? AND ra.RxKayitTarihi < ?)"
+    assert prm == ["20260301", "20260401"]
+
+
+def test_2_bitisik_aylar_ve_yillar_birlesir():
+    assert donem_araliklari([2025, 2026], [11, 12, 1]) == [
+        (date(2025, 1, 1), date(2025, 2, 1)),
+        (date(2025, 11, 1), date(2026, 2, 1)),
+        (date(2026, 11, 1), date(2027, 1, 1)),
+    ]
+    assert donem_araliklari([2024, 2025, 2026]) == [(date(2024, 1, 1), date(2027, 1, 1))]
+    kosul, prm = donem_kosulu("k", [2026], [1, 2, 3], [30, 31, 1])
+    # 31 Şubat / 30 Şubat yok; 31 Oca + 1 Şub ve 31 Mar birleşmeleri
+    assert donem_araliklari([2026], [1, 2, 3], [30, 31, 1]) == [
+        (date(2026, 1, 1), date(2026, 1, 2)),
+        (date(2026, 1, 30), date(2026, 2, 2)),
+        (date(2026, 3, 1), date(2026, 3, 2)),
+        (date(2026, 3, 30), date(2026, 4, 1)),
+    ]
+    assert kosul.count(" OR ") == 3 and len(prm) == 8
+
+
+def test_3_tumu_ve_bos_secimler():
+    assert donem_kosulu("k", None, None, None) == ("", [])
+    assert donem_kosulu("k", [], [], []) == ("", [])
+    # Yıl 'Tümü' → aralığa çevrilemez, eski süzgeç
+    kosul, prm = donem_kosulu("k", None, [3, 4])
+    assert kosul == "MONTH(k) IN (?,?)" and prm == [3, 4]
+    # Hiçbir güne denk gelmeyen seçim
+    assert donem_kosulu("k", [2026], [2], [30, 31]) == ("1 = 0", [])
+
+
+def test_4_rastgele_secimlerde_eski_sorgu_ile_ayni_satirlar():
+    conn = _gunluk_db()
+    rnd = random.Random(20260317)
+    for _ in range(300):
+        yillar = rnd.sample(range(2023, 2027), rnd.randint(0, 3)) or None
+        aylar = rnd.sample(range(1, 13), rnd.randint(0, 5)) or None
+        gunler = rnd.sample(range(1, 32), rnd.randint(0, 4)) if rnd.random() < 0.4 else None
+        eski = _idler(conn, *_eski_kosul(yillar, aylar, gunler))
+        kosul, prm = donem_kosulu("RxKayitTarihi", yillar, aylar, gunler)
+        yeni = _idler(conn, kosul, prm)
+        assert eski == yeni, (yillar, aylar, gunler, kosul)
+
+
+def test_5_cok_aralikta_kapsayici_aralik_ve_suzgec():
+    conn = _gunluk_db()
+    yillar, aylar, gunler = [2023, 2024, 2025, 2026], list(range(1, 13)), [5, 15, 25]
+    kosul, prm = donem_kosulu("RxKayitTarihi", yillar, aylar, gunler)
+    assert " OR " not in kosul and "DAY(RxKayitTarihi) IN" in kosul
+    assert prm[:2] == ["20230105", "20261226"]
+    assert _idler(conn, kosul, prm) == _idler(conn, *_eski_kosul(yillar, aylar, gunler))
+
+
+def test_6_aralik_kosulu_bitis_dahil():
+    assert aralik_kosulu("t", "2026-03-01", "2026-03-31", bitis_dahil=True) == (
+        "t >= ? AND t < ?", ["20260301", "20260401"])
+    assert aralik_kosulu("t", date(2026, 3, 1), date(2026, 4, 1)) == (
+        "t >= ? AND t < ?", ["20260301", "20260401"])
+    assert aralik_kosulu("t", None, None) == ("", [])
+    assert aralik_kosulu("t", bitis="2026-03-31") == ("t < ?", ["20260331"])
+
+
+def test_7_birlestir_cakisanlari_da_toplar():
+    a = [(date(2026, 1, 10), date(2026, 1, 20)), (date(2026, 1, 1), date(2026, 1, 15)),
+         (date(2026, 1, 20), date(2026, 1, 21))]
+    assert araliklari_birlestir(a) == [(date(2026, 1, 1), date(2026, 1, 21))]
+
+
+def main() -> int:
+    testler = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    basarisiz = 0
+    for t in testler:
+        try:
+            t()
+            print(f"✓ {t.__name__}")
+        except AssertionError as e:
+            basarisiz += 1
+            print(f"✗ {t.__name__}: {e}")
+    print(f"\n{len(testler) - basarisiz}/{len(testler)} geçti")
+    return 1 if basarisiz else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
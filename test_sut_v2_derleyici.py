@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""SUT v2 kural derleyici — degerlendir_derlenmis ≡ degerlendir_v2 testleri.
+
+Pilot JSON'un yerleşik senaryoları + çoklu yolak / dispatcher / on_kontrol /
+regex_negatif içeren sentetik bir kural üzerinde iki yolun raporları
+(verdict, mesaj, şart listesi, detaylar) birebir karşılaştırılır.
+
+Çalıştır: python test_sut_v2_derleyici.py
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from recete_kontrol.sut_motor.derleyici import (
+    KuralDerleyici, degerlendir_derlenmis, _desenleri_derle,
+)
+from recete_kontrol.sut_motor.motor_v2 import degerlendir_v2, kural_yukle_v2
+
+_PILOT = str(Path(__file__).resolve().parent / "sut_kurallari" / "v2"
+             / "akut_hepatit_b_4_2_13_3.json")
+
+_YOLAKLI_KURAL = {
+    "schema_version": "v2",
+    "sut_kodu": "X.1",
+    "adi": "Sentetik yolaklı kural",
+    "dispatcher": {
+        "sinyaller": [
+            {"tip": "regex_metin", "oncelik": 2,
+             "kurallar": {"diyabet(ik)?\\s*nefropati": "D-2"}},
+            {"tip": "rapor_kodu_prefix", "oncelik": 1,
+             "kurallar": {"07.": "D-1"}},
+        ],
+        "belirsiz_default": "KE",
+    },
+    "yolaklar": {
+        "D-1": {
+            "ad": "Rapor kodlu yolak",
+            "atomlar": {
+                "A1": {"ad": "HbA1c ≥ 7", "tip": "lab_olcum",
+                       "params": {"ibare": "hba1c", "op": ">=", "deger": 7}},
+                "A2": {"ad": "Metformin kullanımı", "tip": "regex",
+                       "params": {"desenler": ["metformin", "glukofaj", "(\\w+)in \\1"]}},
+                "A3": {"ad": "Kontrendikasyon yok", "tip": "regex_negatif",
+                       "params": {"poz_desenler": ["gebelik", "(?i)laktasyon"],
+                                  "neg_desenler": ["gebelik\\s*yok", "kontrendikasyon\\s*yok"]},
+                       "sessizlik_default": "KE", "sartli_atom": True},
+            },
+            "formul": "A1 ∧ (A2 ∨ ¬A3)",
+            "ust_or_ciftleri": [["A2", "A3"]],
+        },
+        "D-2": {
+            "ad": "Nefropati yolağı",
+            "atomlar": {
+                "B1": {"ad": "ICD E11.2", "tip": "icd_in", "params": {"prefixler": ["E11.2"]}},
+                "B2": {"ad": "Yaş ≥ 18", "tip": "yas_op", "params": {"op": ">=", "deger": 18}},
+            },
+        },
+    },
+    "on_kontrol": [
+        {"ad": "bozuk", "kosul": "Z9 ∧ ("},
+        {"ad": "raporsuz", "kosul": "R1",
+         "atomlar_ek": {"R1": {"tip": "rapor_metni_var", "params": {}}},
+         "sonuc": "KE", "mesaj": "metin var",
+         "sartlar_ekle": [{"ad": "erken", "durum": "KE", "neden": "x"}]},
+    ],
+}
+
+
+def _satirlar():
+    return [
+        {"rapor_kodu": "07.01", "tum_metin": "HbA1c: 8,2 metformin kullanıyor, gebelik yok"},
+        {"rapor_kodu": "07.01", "tum_metin": "hba1c 6.1 glukofaj; Gebelik mevcut"},
+        {"rapor_kodu": "07.01", "tum_metin": "hba1c=9 insülin insülin tedavisi"},
+        {"rapor_kodu": "07.01", "tum_metin": ""},
+        {"rapor_kodu": "", "tum_metin": "Diyabetik nefropati", "recete_teshisleri": ["E11.21"],
+         "hasta_yasi": 64},
+        {"rapor_kodu": "", "tum_metin": "", "recete_teshisleri": ["I10"]},
+    ]
+
+
+def _ayni(r1, r2):
+    assert r1.sonuc == r2.sonuc, (r1.sonuc, r2.sonuc)
+    assert r1.mesaj == r2.mesaj, (r1.mesaj, r2.mesaj)
+    assert r1.sartlar == r2.sartlar
+    assert r1.detaylar == r2.detaylar
+    assert r1.uyari == r2.uyari
+
+
+def test_1_pilot_senaryolari_ayni_rapor():
+    kural = kural_yukle_v2(_PILOT)
+    dk = KuralDerleyici.derle(kural)
+    assert dk.hata is None and dk.tek_yolak.agac is not None
+    for sen in kural["senaryolar"]:
+        _ayni(degerlendir_v2(kural, sen["ilac_sonuc"]),
+              degerlendir_derlenmis(dk, sen["ilac_sonuc"]))
+
+
+def test_2_yolakli_kural_ayni_rapor():
+    dk = KuralDerleyici.derle(_YOLAKLI_KURAL)
+    assert dk.hata is None and set(dk.yolaklar) == {"D-1", "D-2"}
+    assert [s["tip"] for s in dk.sinyaller] == ["rapor_kodu_prefix", "regex_metin"]
+    # on_kontrol'ün metin-var girdisini kapat: yolaklara inilsin
+    kural_on_kontrolsuz = dict(_YOLAKLI_KURAL, on_kontrol=_YOLAKLI_KURAL["on_kontrol"][:1])
+    dk2 = KuralDerleyici.derle(kural_on_kontrolsuz)
+    for satir in _satirlar():
+        _ayni(degerlendir_v2(_YOLAKLI_KURAL, satir), degerlendir_derlenmis(dk, satir))
+        _ayni(degerlendir_v2(kural_on_kontrolsuz, satir), degerlendir_derlenmis(dk2, satir))
+
+
+def test_3_birlesik_regex_ilk_desen_mesajini_korur():
+    # Metinde ikinci desen daha solda — mesaj yine listedeki ilk eşleşen
+    kural = {"schema_version": "v2", "atomlar": {"A": {
+        "tip": "regex", "params": {"desenler": ["zeta", "alfa"], "etiket": "e"}}},
+        "formul": "A"}
+    dk = KuralDerleyici.derle(kural)
+    satir = {"tum_metin": "alfa ... zeta"}
+    r = degerlendir_derlenmis(dk, satir)
+    assert r.sartlar[0].neden == "e eşleşti: /zeta/"
+    _ayni(degerlendir_v2(kural, satir), r)
+
+
+def test_4_birlestirilemeyen_desenler_tekil_kalir():
+    birlesik, tekiller = _desenleri_derle(["(\\w+) \\1", "abc"])
+    assert birlesik is None and len(tekiller) == 2
+    birlesik, _ = _desenleri_derle(["abc", "(?i)def"])  # ortada global bayrak
+    assert birlesik is None
+    birlesik, _ = _desenleri_derle(["abc", "d(e|f)"])
+    assert birlesik is not None and birlesik.search("xDF")
+
+
+def test_5_sema_hatasi_ve_gecersiz_desen_ke_raporu():
+    dk = KuralDerleyici.derle({"schema_version": "v1"})
+    assert dk.hata
+    r = degerlendir_derlenmis(dk, {})
+    _ayni(degerlendir_v2({"schema_version": "v1"}, {}), r)
+    dk = KuralDerleyici.derle({"schema_version": "v2", "atomlar": {
+        "A": {"tip": "regex", "params": {"desenler": ["(acik"]}}}, "formul": "A"})
+    assert "Geçersiz regex" in dk.hata
+    assert degerlendir_derlenmis(dk, {"tum_metin": "x"}).sonuc.name == "KONTROL_EDILEMEDI"
+
+
+def test_6_derlenmis_kural_kaynak_degisikliginden_etkilenmez():
+    kural = json.loads(json.dumps(_YOLAKLI_KURAL))
+    dk = KuralDerleyici.derle(kural)
+    kural["yolaklar"]["D-1"]["formul"] = "A1 ∧ A2 ∧ A3"
+    kural["dispatcher"]["sinyaller"].clear()
+    assert dk.kural["yolaklar"]["D-1"]["formul"] == "A1 ∧ (A2 ∨ ¬A3)"
+    assert len(dk.sinyaller) == 2
+
+
+def test_7_dosya_onbellegi_mtime_duyarli():
+    derleyici = KuralDerleyici()
+    yol = os.path.join(tempfile.mkdtemp(), "kural.json")
+    with open(yol, "w", encoding="utf-8") as f:
+        json.dump(_YOLAKLI_KURAL, f, ensure_ascii=False)
+    dk1 = derleyici.yukle(yol)
+    assert derleyici.yukle(yol) is dk1
+    degisik = dict(_YOLAKLI_KURAL, adi="Değişti")
+    with open(yol, "w", encoding="utf-8") as f:
+        json.dump(degisik, f, ensure_ascii=False)
+    st = os.stat(yol)
+    os.utime(yol, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000_000))
+    dk2 = derleyici.yukle(yol)
+    assert dk2 is not dk1 and dk2.kural["adi"] == "Değişti"
+
+
+def main() -> int:
+    testler = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    basarisiz = 0
+    for t in testler:
+        try:
+            t()
+            print(f"✓ {t.__name__}")
+        except AssertionError as e:
+            basarisiz += 1
+            print(f"✗ {t.__name__}: {e}")
+    print(f"\n{len(testler) - basarisiz}/{len(testler)} geçti")
+    return 1 if basarisiz else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""SUT v2 tembel (kısa devreli) formül değerlendirme testleri.
+
+Tembel mod tam modla aynı verdict/mesaj tipini vermeli, pahalı atomları
+gereksizse atlamalı ve şartlı-KE (ŞARTLI UYGUN / ŞÜPHELİ) ayrımını
+bozmamalı.
+
+Çalıştır: python test_sut_v2_tembel.py
+"""
+from __future__ import annotations
+
+import itertools
+import sys
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from recete_kontrol.sut_motor.derleyici import KuralDerleyici, degerlendir_derlenmis
+from recete_kontrol.sut_motor.formul_parser import parse_formul
+from recete_kontrol.base_kontrol import SartDurumu
+from recete_kontrol.sut_motor.motor_v2 import (
+    KISA_DEVRE_NEDENI, _formul_calistir, _formul_tembel, _tembel_plan,
+    degerlendir_v2, kural_yukle_v2,
+)
+
+_PILOT = str(Path(__file__).resolve().parent / "sut_kurallari" / "v2"
+             / "akut_hepatit_b_4_2_13_3.json")
+
+_DURUMLAR = (SartDurumu.VAR, SartDurumu.YOK, SartDurumu.KONTROL_EDILEMEDI)
+
+
+def _sayan_kural(formul, atomlar):
+    """Tek yolaklı minimal v2 kural."""
+    return {"schema_version": "v2", "sut_kodu": "T.1", "atomlar": atomlar,
+            "formul": formul}
+
+
+def test_1_tembel_formul_tam_ile_ayni_tum_kombinasyonlar():
+    for formul in ("A ∧ (B ∨ ¬C)", "(A ∨ B) ∧ (C ∨ ¬A)", "¬(A ∧ B) ∨ C"):
+        agac = parse_formul(formul)
+        plan = _tembel_plan(agac, {"A": 8, "B": 1, "C": 5})
+        for a, b, c in itertools.product(_DURUMLAR, repeat=3):
+            sonuc = {"A": (a, ""), "B": (b, ""), "C": (c, "")}
+            tam = _formul_calistir(agac, sonuc)
+            assert _formul_tembel(plan, lambda ad: sonuc[ad][0]) == tam, (formul, a, b, c)
+
+
+def test_2_pilot_senaryolari_ayni_verdict():
+    kural = kural_yukle_v2(_PILOT)
+    dk = KuralDerleyici.derle(kural)
+    for sen in kural["senaryolar"]:
+        tam = degerlendir_v2(kural, sen["ilac_sonuc"])
+        for r in (degerlendir_v2(kural, sen["ilac_sonuc"], tembel=True),
+                  degerlendir_derlenmis(dk, sen["ilac_sonuc"], tembel=True)):
+            assert r.sonuc == tam.sonuc, (sen.get("ad"), r.sonuc, tam.sonuc)
+            assert [s.ad for s in r.sartlar] == [s.ad for s in tam.sartlar]
+
+
+def test_3_pahali_atom_kisa_devrede_atlanir():
+    kural = _sayan_kural("L ∧ R", {
+        "L": {"ad": "Lab", "tip": "lab_olcum",
+              "params": {"ibare": "alt", "op": ">=", "deger": 80}},
+        "R": {"ad": "Rapor kodu", "tip": "rapor_kodu_var", "params": {}},
+    })
+    satir = {"rapor_kodu": "", "tum_metin": "ALT: 120"}
+    tam = degerlendir_v2(kural, satir)
+    tembel = degerlendir_v2(kural, satir, tembel=True)
+    assert tam.sonuc == tembel.sonuc
+    lab = next(s for s in tembel.sartlar if s.ad == "Lab")
+    assert lab.durum == SartDurumu.NA and lab.neden == KISA_DEVRE_NEDENI
+    # Tam mod denetim izi için her atomu çalıştırır
+    assert next(s for s in tam.sartlar if s.ad == "Lab").durum == SartDurumu.VAR
+
+
+def test_4_sartli_ke_ile_sartsiz_ke_ayrimi_korunur():
+    # AND(OR(A=VAR, B=KE), S) — S şartlı KE; B'nin KE'si kısa devrede
+    # görülmese de verdict tam modla aynı olmalı (ŞARTLI UYGUN)
+    atomlar = {
+        "A": {"ad": "A", "tip": "rapor_kodu_var", "params": {}},
+        "B": {"ad": "B", "tip": "regex", "params": {"desenler": ["zzz"]},
+              "sessizlik_default": "KE"},
+        "S": {"ad": "S", "tip": "regex", "params": {"desenler": ["yyy"]},
+              "sessizlik_default": "KE", "sartli_atom": True},
+    }
+    for formul in ("(A ∨ B) ∧ S", "A ∧ S", "(A ∨ B) ∧ (S ∨ B)"):
+        kural = _sayan_kural(formul, atomlar)
+        for satir in ({"rapor_kodu": "01.1", "tum_metin": ""},
+                      {"rapor_kodu": "", "tum_metin": ""}):
+            tam = degerlendir_v2(kural, satir)
+            tembel = degerlendir_v2(kural, satir, tembel=True)
+            assert tam.sonuc == tembel.sonuc, (formul, satir, tam.sonuc, tembel.sonuc)
+
+
+def test_5_tanimsiz_atom_ke_raporu():
+    kural = _sayan_kural("A ∧ Z", {"A": {"tip": "her_zaman_var", "params": {}}})
+    r = degerlendir_v2(kural, {}, tembel=True)
+    assert r.sonuc.name == "KONTROL_EDILEMEDI"
+    assert r.sonuc == degerlendir_v2(kural, {}).sonuc
+
+
+def main() -> int:
+    testler = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    basarisiz = 0
+    for t in testler:
+        try:
+            t()
+            print(f"✓ {t.__name__}")
+        except AssertionError as e:
+            basarisiz += 1
+            print(f"✗ {t.__name__}: {e}")
+    print(f"\n{len(testler) - basarisiz}/{len(testler)} geçti")
+    return 1 if basarisiz else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
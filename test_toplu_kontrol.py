@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Toplu SUT kontrolü (recete_kontrol.toplu_kontrol) testleri.
+
+Süreç havuzundan akan sonuçların giriş sırasıyla geldiği ve tek süreçte
+kontrol_et_tekil'in verdiğiyle birebir aynı olduğu; pickle edilemeyen
+girdi/rapor ana süreçte hesaplanarak aynı sonuca vardığı; tüketici erken
+bıraktığında havuzun sonraki çağrıda sorunsuz kullanıldığı ve kategori
+süre istatistiğinin tuttuğu doğrulanır.
+
+Çalıştır: python test_toplu_kontrol.py
+"""
+from __future__ import annotations
+
+import importlib
+import itertools
+import sys
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from recete_kontrol import toplu_kontrol as tk_mod
+from recete_kontrol.anlik_kontrol import (_DISPATCH_TABLOSU, _duzlestir,
+                                          kontrol_et_tekil)
+from recete_kontrol.base_kontrol import KontrolRaporu, KontrolSonucu
+from recete_kontrol.toplu_kontrol import (_YEREL, TopluIstatistik,
+                                          havuzu_kapat, toplu_kontrol)
+
+_KAPSAM_DISI = [
+    {"ilac_adi": "PAROL 500 MG", "etkin_madde": "PARASETAMOL", "atc_kodu": "N02BE01"},
+    {"ilac_adi": "ATOR 20 MG", "etkin_madde": "ATORVASTATIN", "atc_kodu": "C10AA05"},
+    {"ilac_adi": "GLIFOR 1000 MG", "etkin_madde": "METFORMIN", "atc_kodu": "A10BA02"},
+    {"ilac_adi": "DELIX 5 MG", "etkin_madde": "RAMIPRIL", "atc_kodu": "C09AA05"},
+]
+
+
+def _kalemler(n=240):
+    havuz = list(_KAPSAM_DISI)
+    for _, modul_yolu, _, _, _ in _DISPATCH_TABLOSU:
+        bildirim = getattr(importlib.import_module(modul_yolu),
+                           "DISPATCH_ANAHTARLARI", {})
+        for k in _duzlestir(bildirim.get("metin"))[:1]:
+            havuz.append({"ilac_adi": f"{k} 10 MG", "etkin_madde": k,
+                          "rapor_kodu": "04.02", "tum_metin": "uzman raporu"})
+    return [dict(k, sira_no=i) for i, k in
+            enumerate(itertools.islice(itertools.cycle(havuz), n))]
+
+
+_REFERANS = {}
+
+
+def _referans(kalemler):
+    anahtar = len(kalemler)
+    if anahtar not in _REFERANS:
+        _REFERANS[anahtar] = [kontrol_et_tekil(k) for k in kalemler]
+    return _REFERANS[anahtar]
+
+
+def _ayni(sonuclar, referans):
+    assert [s[0] for s in sonuclar] == list(range(len(referans)))
+    for (sira, kat, rap), (r_kat, r_rap) in zip(sonuclar, referans):
+        assert kat == r_kat, (sira, kat, r_kat)
+        assert rap == r_rap, (sira, rap, r_rap)
+
+
+def test_1_havuz_sirali_ve_tek_surecle_ayni():
+    kalemler = _kalemler()
+    ist = TopluIstatistik()
+    sonuclar = list(toplu_kontrol(kalemler, workers=2, parti=16, istatistik=ist))
+    _ayni(sonuclar, _referans(kalemler))
+    assert ist.isci == 2 and ist.yerel == 0 and ist.hata == 0
+    assert ist.kalem == len(kalemler)
+    assert sum(k.adet for k in ist.kategoriler.values()) == len(kalemler)
+    assert len(ist.kategoriler) > 5
+    assert "KATEGORİ" in ist.rapor()
+
+
+def test_2_pickle_edilemeyen_girdi_yerelde_hesaplanir():
+    kalemler = _kalemler()
+    kalemler[40]["geri_cagri"] = lambda: None    # bu parti işçiye gidemez
+    ist = TopluIstatistik()
+    sonuclar = list(toplu_kontrol(kalemler, workers=2, parti=16, istatistik=ist))
+    _ayni(sonuclar, _referans(kalemler))
+    assert ist.yerel == 16 and ist.kalem == len(kalemler)
+
+
+def test_3_pickle_edilemeyen_rapor_isaretlenir():
+    eski = tk_mod._kalem_kontrol
+    rapor = KontrolRaporu(KontrolSonucu.UYGUN, "ok", detaylar={"f": lambda: 1})
+    tk_mod._kalem_kontrol = lambda k: ("X", rapor if k else None, 0.001, None)
+    try:
+        assert tk_mod._parti_calistir([{"a": 1}, {}]) == [
+            ("X", _YEREL, 0.001, None), ("X", None, 0.001, None)]
+    finally:
+        tk_mod._kalem_kontrol = eski
+
+
+def test_4_kucuk_is_havuzsuz():
+    kalemler = _kalemler(30)
+    ist = TopluIstatistik()
+    sonuclar = list(toplu_kontrol(kalemler, workers=8, istatistik=ist))
+    _ayni(sonuclar, [kontrol_et_tekil(k) for k in kalemler])
+    assert ist.isci == 0 and ist.kalem == 30
+    ist = TopluIstatistik()
+    list(toplu_kontrol([{"ilac_adi": 123, "etkin_madde": None}], workers=1,
+                       istatistik=ist))
+    assert ist.kalem == 1
+
+
+def test_5_erken_birakma_sonraki_cagriyi_bozmaz():
+    kalemler = _kalemler()
+    try:
+        akis = toplu_kontrol(kalemler, workers=2, parti=16)
+        ilk = list(itertools.islice(akis, 5))
+        akis.close()
+        assert [s[0] for s in ilk] == [0, 1, 2, 3, 4]
+        _ayni(list(toplu_kontrol(kalemler, workers=2, parti=16)),
+              _referans(kalemler))
+    finally:
+        havuzu_kapat()
+
+
+def main():
+    testler = [(ad, fn) for ad, fn in sorted(globals().items())
+               if ad.startswith("test_") and callable(fn)]
+    gecen = 0
+    for ad, fn in testler:
+        try:
+            fn()
+            print(f"✓ {ad}")
+            gecen += 1
+        except Exception as e:
+            print(f"✗ {ad}: {e!r}")
+    print(f"\n{gecen}/{len(testler)} geçti")
+    return 0 if gecen == len(testler) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Zam öncesi alım NPV/ROI motoru (zam_npv_motoru) testleri.
+
+Sipariş ve MF hızlı hesaplama ekranlarındaki gün gün while döngüleri
+referans olarak buraya kopyalanmıştır; rastgele parametrelerde (stok yok /
+az / zam sonrasına taşan, küsuratlı aylık ortalama, negatif stok) motorun
+üç ödeme şemasında aynı kazanç eğrisini bit düzeyinde verdiği; karar ve
+kritik noktaların eski eşitlik kurallarıyla seçildiği; toplu sipariş listesi
+değerlendirmesinin tek tek değerlendirmeyle aynı olduğu doğrulanır.
+
+Çalıştır: python test_zam_npv_motoru.py
+"""
+from __future__ import annotations
+
+import random
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+try:
+    sys.stdout.reconfigure(encoding="utf-8")
+except Exception:
+    pass
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import numpy as np
+
+import zam_npv_motoru
+from zam_npv_motoru import (aday_ust_sinir, karar_noktalari, kazanc_egrisi,
+                            kritik_noktalar, roi_egrileri, toplu_karar_noktalari,
+                            zam_kazanci)
+
+BUGUN = date(2026, 2, 14)
+
+
+# ── Referans: ekranlardaki eski döngüler ───────────────────────────────────
+
+def _odeme_gun_takvim(gun, depo_vade):
+    alim = BUGUN + timedelta(days=gun)
+    senet = date(alim.year + 1, 1, 1) if alim.month == 12 else date(alim.year, alim.month + 1, 1)
+    return (senet + timedelta(days=depo_vade) - BUGUN).days
+
+
+def _eski_kazanc(test_miktar, maliyet, aylik_ort, mevcut_stok, zam_gun, zam_orani,
+                 faiz_yillik, depo_vade, sema):
+    aylik_faiz = (faiz_yillik / 100) / 12
+    gunluk_faiz = (1 + aylik_faiz) ** (1/30) - 1
+    gunluk_sarf = aylik_ort / 30
+    if test_miktar == 0:
+        return 0
+    kalan_mevcut = mevcut_stok
+    kalan_yeni = test_miktar
+    npv_aylik = 0
+    gun = 0
+    while kalan_yeni > 0 and gun < 720:
+        harcanan = gunluk_sarf
+        mevcut_harcanan = min(kalan_mevcut, harcanan)
+        kalan_mevcut -= mevcut_harcanan
+        yeni_harcanan = min(harcanan - mevcut_harcanan, kalan_yeni)
+        if yeni_harcanan > 0:
+            fiyat = maliyet if gun < zam_gun else maliyet * (1 + zam_orani / 100)
+            if sema == "gunluk":
+                odeme_gun = gun + 30 + depo_vade
+            elif sema == "ay_sonu":
+                odeme_gun = ((gun // 30) + 1) * 30 + depo_vade
+            else:
+                odeme_gun = _odeme_gun_takvim(gun, depo_vade)
+            iskonto = (1 + gunluk_faiz) ** odeme_gun
+            npv_aylik += (yeni_harcanan * fiyat) / iskonto
+            kalan_yeni -= yeni_harcanan
+        gun += 1
+    toplu_gun = _odeme_gun_takvim(0, depo_vade) if sema == "takvim" else 30 + depo_vade
+    npv_toplu = (test_miktar * maliyet) / ((1 + gunluk_faiz) ** toplu_gun)
+    return npv_aylik - npv_toplu
+
+
+def _eski_karar(kazanclar, maliyet):
+    """SiparisVermeGUI._zam_oncesi_optimum_hesapla karar noktası bölümü."""
+    optimum_miktar = 0
+    en_iyi_kazanc = 0
+    for i, k in enumerate(kazanclar):
+        if k > en_iyi_kazanc:
+            en_iyi_kazanc = k
+            optimum_miktar = i
+    maksimum_miktar = 0
+    for i, k in enumerate(kazanclar):
+        if k > 0:
+            maksimum_miktar = i
+    hedef_80 = en_iyi_kazanc * 0.80
+    pareto_miktar = 0
+    pareto_kazanc = 0
+    for i, k in enumerate(kazanclar):
+        if k >= hedef_80:
+            pareto_miktar = i
+            pareto_kazanc = k
+            break
+    verimlilik_miktar = 0
+    verimlilik_roi = 0
+    verimlilik_kazanc = 0
+    for i, k in enumerate(kazanclar):
+        if i > 0 and k > 0:
+            yatirim = i * maliyet
+            roi = (k / yatirim) * 100
+            if roi > verimlilik_roi:
+                verimlilik_roi = roi
+                verimlilik_miktar = i
+                verimlilik_kazanc = k
+    return {
+        'verimlilik': verimlilik_miktar,
+        'verimlilik_roi': round(verimlilik_roi, 1),
+        'verimlilik_kazanc': round(verimlilik_kazanc, 2),
+        'pareto': pareto_miktar,
+        'pareto_kazanc': round(pareto_kazanc, 2),
+        'optimum': optimum_miktar,
+        'kazanc_optimum': round(en_iyi_kazanc, 2),
+        'maksimum': maksimum_miktar,
+        'kazanc_maksimum': round(kazanclar[maksimum_miktar] if maksimum_miktar > 0 else 0, 2)
+    }
+
+
+def _eski_kritik(kazanclar, roi_ler, optimum_sifir_dahil):
+    """_roi_verisi_hesapla (sıfır dahil) / MF _kritik_noktalar_hesapla (sıfır hariç)."""
+    max_roi_idx = 1
+    max_roi_val = roi_ler[1]
+    for i in range(2, len(roi_ler)):
+        if roi_ler[i] > max_roi_val:
+            max_roi_val = roi_ler[i]
+            max_roi_idx = i
+    yarim_roi_idx = max_roi_idx
+    for i in range(max_roi_idx, len(roi_ler)):
+        if roi_ler[i] <= max_roi_val / 2:
+            yarim_roi_idx = i
+            break
+    sifir_roi_idx = len(roi_ler) - 1
+    for i in range(max_roi_idx, len(roi_ler)):
+        if roi_ler[i] <= 0:
+            sifir_roi_idx = i
+            break
+    if optimum_sifir_dahil:
+        optimum_idx = int(np.argmax(np.array(kazanclar)))
+    else:
+        optimum_idx = 1
+        for i in range(2, len(kazanclar)):
+            if kazanclar[i] > kazanclar[optimum_idx]:
+                optimum_idx = i
+    pareto_hedef = kazanclar[optimum_idx] * 0.80
+    pareto_idx = next((i for i, k in enumerate(kazanclar) if k >= pareto_hedef), 0)
+    return {'max_roi': max_roi_idx, 'yarim_roi': yarim_roi_idx, 'sifir_roi': sifir_roi_idx,
+            'optimum': optimum_idx, 'pareto': pareto_idx}
+
+
+def _rastgele_parametre(rnd):
+    aylik_ort = rnd.choice((0.4, 2.5, 7, 13.3, 31, 58.7))
+    stok = rnd.choice((0, 0, 3, 17, 140, -2, 2.5))
+    return {
+        "maliyet": round(rnd.uniform(4, 900), 2),
+        "aylik_ort": aylik_ort,
+        "mevcut_stok": stok,
+        "zam_gun": rnd.choice((1, 9, 25, 47, 130)),
+        "zam_orani": rnd.choice((3, 12.5, 25, 48)),
+        "faiz_yillik": rnd.choice((0, 18, 42.5, 65)),
+        "depo_vade": rnd.choice((0, 45, 75, 90)),
+    }
+
+
+# ── Testler ────────────────────────────────────────────────────────────────
+
+def test_1_kazanc_egrisi_eski_dongu_ile_bit_esit():
+    rnd = random.Random(20)
+    for tur in range(24):
+        p = _rastgele_parametre(rnd)
+        sema = zam_npv_motoru.SEMALAR[tur % 3]
+        miktarlar = list(range(0, aday_ust_sinir(p["aylik_ort"], 50, 200) + 1))
+        yeni = kazanc_egrisi(miktarlar, sema=sema, bugun=BUGUN, **p)
+        eski = [_eski_kazanc(q, sema=sema, **p) for q in miktarlar]
+        assert len(yeni) == len(eski)
+        farkli = [q for q, e, y in zip(miktarlar, eski, yeni) if e != y]
+        assert not farkli, (tur, sema, p, farkli[:3])
+
+
+def test_2_karar_ve_kritik_noktalar_eski_kurallarla_ayni():
+    rnd = random.Random(21)
+    for tur in range(30):
+        p = _rastgele_parametre(rnd)
+        miktarlar = range(0, aday_ust_sinir(p["aylik_ort"], 10, 100) + 1)
+        k = kazanc_egrisi(miktarlar, sema="gunluk", **p)
+        assert karar_noktalari(k, p["maliyet"]) == _eski_karar(list(k), p["maliyet"]), (tur, p)
+        _, roi, _ = roi_egrileri(k, p["maliyet"])
+        for dahil in (True, False):
+            assert kritik_noktalar(k, roi, dahil) == _eski_kritik(list(k), list(roi), dahil)
+    # Düzlük ve eşitlik kuralları: ilk tepe, son pozitif, ilk maksimum ROI
+    k = [0, 5, 10, 10, 4, 0, -1]
+    assert karar_noktalari(k, 1) == _eski_karar(k, 1)
+    assert karar_noktalari(k, 1)["optimum"] == 2 and karar_noktalari(k, 1)["maksimum"] == 4
+    assert karar_noktalari([0, -1, -2], 5) == _eski_karar([0, -1, -2], 5)
+
+
+def test_3_roi_ve_marjinal_roi_ekran_tanimi():
+    k = kazanc_egrisi(range(0, 201), maliyet=50, aylik_ort=20, mevcut_stok=4,
+                      zam_gun=15, zam_orani=20, faiz_yillik=40, depo_vade=75, sema="ay_sonu")
+    yatirim, roi, marjinal = roi_egrileri(k, 50)
+    assert yatirim[0] == 0 and roi[0] == 0 and marjinal[0] == 0
+    assert marjinal[1] == roi[1] == k[1] / 50 * 100
+    for q in (2, 37, 200):
+        assert yatirim[q] == q * 50
+        assert roi[q] == k[q] / (q * 50) * 100
+        assert marjinal[q] == (k[q] - k[q - 1]) / 50 * 100
+
+
+def test_4_toplu_liste_tek_tek_ile_ayni_ve_zam_kazanci():
+    rnd = random.Random(22)
+    kalemler = [_rastgele_parametre(rnd) for _ in range(40)]
+    eski_parca = zam_npv_motoru.PARCA_HUCRE
+    zam_npv_motoru.PARCA_HUCRE = 500   # birden çok parça ve dolgulu satırlar
+    try:
+        toplu = toplu_karar_noktalari(kalemler)
+    finally:
+        zam_npv_motoru.PARCA_HUCRE = eski_parca
+    for kalem, sonuc in zip(kalemler, toplu):
+        k = kazanc_egrisi(range(0, aday_ust_sinir(kalem["aylik_ort"], 10, 100) + 1), **kalem)
+        assert sonuc == karar_noktalari(k, kalem["maliyet"]), kalem
+    assert toplu_karar_noktalari([]) == []
+    # Zam kazancı (MF ekranı): zam gününe kadar tükenen stok kazandırmaz
+    assert zam_kazanci(10, 100, 30, 40, zam_gun=20, zam_orani=10) == 0
+    assert zam_kazanci(50, 100, 30, 0, zam_gun=20, zam_orani=10) == 30 * 10
+    assert zam_kazanci(50, 100, 30, 40, zam_gun=0, zam_orani=10) == 0
+    try:
+        kazanc_egrisi([1], 1, 1, 0, 1, 1, 1, 1, sema="haftalik")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("bilinmeyen şema ValueError vermeli")
+
+
+def main():
+    testler = [(ad, fn) for ad, fn in sorted(globals().items())
+               if ad.startswith("test_") and callable(fn)]
+    gecen = 0
+    for ad, fn in testler:
+        try:
+            fn()
+            print(f"✓ {ad}")
+            gecen += 1
+        except Exception as e:
+            print(f"✗ {ad}: {e!r}")
+    print(f"\n{gecen}/{len(testler)} geçti")
+    return 0 if gecen == len(testler) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
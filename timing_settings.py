@@ -8,13 +8,17 @@ from pathlib import Path
 import logging
 import threading
 
+from bekleme_motoru import BeklemeMotoru, GecikmeHistogrami, kova_indeksi
+from ekleme_gunlugu import EklemeGunlugu, eski_json_oku
+
 logger = logging.getLogger(__name__)
 
 
 class TimingSettings:
     """Zamanlama ayarlarını yöneten sınıf"""
 
-    def __init__(self, dosya_yolu="timing_settings.json", istatistik_dosya="timing_stats.json", profile=None):
+    def __init__(self, dosya_yolu="timing_settings.json", istatistik_dosya="timing_stats.json", profile=None,
+                 bekleme_yuzdelik=0.95):
         # Dosyayı script'in bulunduğu dizine kaydet
         import os
         script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -24,12 +28,23 @@ class TimingSettings:
         # Profil desteği
         self.profile = profile  # None = active_profile kullan, "current", "optimum" vs.
 
+        # Yüzdelik bekleme motoru: anahtar başına gecikme histogramı,
+        # koşul yoklamalı beklemelerin zaman aşımı bunlardan türetilir
+        self.bekleme = BeklemeMotoru(yuzdelik=bekleme_yuzdelik)
+        self.bekleme.olcum_dinleyicisi = self._olcum_gunluge_ekle
+
         # İstatistikler: {anahtar: {"count": 0, "total_time": 0.0}}
+        # Diskte ekleme günlüğü (timing_stats.jsonl): her ölçüm bir satır
+        # {"a": anahtar, "c": adet, "t": toplam_sure, "k": kova}; yüklemede
+        # toplanır, sıkıştırmada anahtar başına tek satıra indirilir
+        # (histogram "h": {kova: adet} olarak).
+        self._istatistik_gunlugu = EklemeGunlugu(self.istatistik_dosya.with_suffix('.jsonl'))
         self.istatistikler = self.istatistik_yukle()
 
         # Optimize mode - otomatik süre ayarlama
         self.optimize_mode = False  # Optimize mode aktif mi?
         self.optimized_keys = set()  # Optimize edilmiş anahtarlar
+        self.yuzdelik_keys = set()  # Histogram dolunca yüzdelikle yeniden ayarlananlar
         self.optimize_multiplier = 1.3  # Reel süre × 1.3
 
         # Thread safety
@@ -454,22 +469,49 @@ class TimingSettings:
         }
 
     def istatistik_yukle(self):
-        """İstatistikleri JSON dosyasından yükle"""
-        if self.istatistik_dosya.exists():
-            try:
-                with open(self.istatistik_dosya, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.error(f"İstatistik yükleme hatası: {e}")
-                return {}
-        return {}
+        """İstatistikleri günlükten (yoksa eski timing_stats.json'dan) yükle"""
+        istatistikler = {}
+        gunluk = self._istatistik_gunlugu
+        try:
+            if gunluk.yol.exists():
+                for kayit in gunluk.oku():
+                    anahtar = kayit.get("a")
+                    if not anahtar:
+                        continue
+                    stats = istatistikler.setdefault(anahtar, {"count": 0, "total_time": 0.0})
+                    stats["count"] += int(kayit.get("c", 0))
+                    stats["total_time"] += float(kayit.get("t", 0.0))
+                    if "h" in kayit:
+                        self.bekleme.histogram(anahtar).birlestir(GecikmeHistogrami(kayit["h"]))
+                    elif "k" in kayit:
+                        self.bekleme.histogram(anahtar).kova_ekle(int(kayit["k"]), int(kayit.get("c", 1)))
+                if gunluk.sikistirma_gerekli_mi(len(istatistikler)):
+                    self._istatistik_sikistir(istatistikler)
+            else:
+                data = eski_json_oku(self.istatistik_dosya)
+                if isinstance(data, dict) and data:
+                    istatistikler = data
+                    self._istatistik_sikistir(istatistikler)
+        except Exception as e:
+            logger.error(f"İstatistik yükleme hatası: {e}")
+        return istatistikler
+
+    def _istatistik_sikistir(self, istatistikler):
+        histogramlar = self.bekleme.histogramlar
+
+        def satir(anahtar, s):
+            kayit = {"a": anahtar, "c": s.get("count", 0), "t": s.get("total_time", 0.0)}
+            if histogramlar.get(anahtar) is not None and histogramlar[anahtar].adet:
+                kayit["h"] = histogramlar[anahtar].sozluk()
+            return kayit
+
+        return self._istatistik_gunlugu.sikistir(
+            satir(anahtar, s) for anahtar, s in istatistikler.items())
 
     def istatistik_kaydet(self):
-        """İstatistikleri JSON dosyasına kaydet"""
+        """İstatistikleri diske yaz (günlüğü anahtar başına tek satıra sıkıştır)"""
         try:
-            with open(self.istatistik_dosya, 'w', encoding='utf-8') as f:
-                json.dump(self.istatistikler, f, indent=2, ensure_ascii=False)
-            return True
+            return self._istatistik_sikistir(self.istatistikler)
         except Exception as e:
             logger.error(f"İstatistik kaydetme hatası: {e}")
             return False
@@ -485,6 +527,7 @@ class TimingSettings:
 
             self.istatistikler[anahtar]["count"] += 1
             self.istatistikler[anahtar]["total_time"] += gercek_sure
+            self.bekleme.kaydet(anahtar, gercek_sure)
 
             # Optimize mode: Reel süre × 1.3 ile ayarı güncelle (sadece bir kere)
             if self.optimize_mode and anahtar not in self.optimized_keys:
@@ -493,10 +536,37 @@ class TimingSettings:
                 self.optimized_keys.add(anahtar)  # Artık thread-safe
                 logger.info(f"🔧 Optimize: {anahtar} = {yeni_deger:.3f}s (reel: {gercek_sure:.3f}s)")
                 self.kaydet()  # Hemen kaydet
+            # İlk ölçüm yerine kuyruğa göre: yeterli ölçüm birikince yüzdelik × marj
+            elif (self.optimize_mode and anahtar not in self.yuzdelik_keys
+                    and self.bekleme.histogram(anahtar).adet >= self.bekleme.min_ornek):
+                h = self.bekleme.histogram(anahtar)
+                yeni_deger = round(h.yuzdelik(self.bekleme.yuzdelik) * self.optimize_multiplier, 3)
+                self.set(anahtar, yeni_deger)
+                self.yuzdelik_keys.add(anahtar)
+                logger.info(f"🔧 Optimize (p{round(self.bekleme.yuzdelik * 100)}): {anahtar} = {yeni_deger:.3f}s "
+                            f"({h.adet} ölçüm)")
+                self.kaydet()
 
-            # Her 10 kayıtta bir otomatik kaydet
-            if self.istatistikler[anahtar]["count"] % 10 == 0:
+            self._gunluge_yaz(anahtar, gercek_sure)
+
+    def _gunluge_yaz(self, anahtar, gercek_sure):
+        """Ölçümü günlüğe ekle (tüm dosyayı yeniden yazmadan)"""
+        try:
+            self._istatistik_gunlugu.ekle(
+                {"a": anahtar, "c": 1, "t": gercek_sure, "k": kova_indeksi(gercek_sure)})
+            if self._istatistik_gunlugu.sikistirma_gerekli_mi(len(self.istatistikler)):
                 self.istatistik_kaydet()
+        except Exception as e:
+            logger.error(f"İstatistik kaydetme hatası: {e}")
+
+    def _olcum_gunluge_ekle(self, anahtar, gercek_sure):
+        """Koşul yoklamalı beklemenin ölçümü: istatistik + günlük (optimize yok,
+        histograma motor zaten ekledi)"""
+        with self._lock:
+            stats = self.istatistikler.setdefault(anahtar, {"count": 0, "total_time": 0.0})
+            stats["count"] += 1
+            stats["total_time"] += gercek_sure
+            self._gunluge_yaz(anahtar, gercek_sure)
 
     def ortalama_al(self, anahtar):
         """Bir işlem için ortalama süreyi hesapla"""
@@ -513,9 +583,27 @@ class TimingSettings:
     def istatistik_sifirla(self):
         """Tüm istatistikleri sıfırla"""
         self.istatistikler = {}
+        self.bekleme.histogramlar.clear()
         self.istatistik_kaydet()
         logger.info("✓ İstatistikler sıfırlandı")
 
+    def yuzdelik_al(self, anahtar, yuzdelik=None):
+        """Bir işlemin gecikme yüzdeliği (sn); ölçüm yoksa None"""
+        h = self.bekleme.histogramlar.get(anahtar)
+        if h is None or not h.adet:
+            return None
+        return h.yuzdelik(self.bekleme.yuzdelik if yuzdelik is None else yuzdelik)
+
+    def kosul_bekle(self, kosul, anahtar=None, varsayilan=1.0, zaman_asimi=None, uyku=None,
+                    statik_aralik=None):
+        """Sabit uyku yerine koşul yoklamalı bekleme (bkz. BeklemeMotoru.kosul_bekle)"""
+        return self.bekleme.kosul_bekle(kosul, anahtar, varsayilan=varsayilan, zaman_asimi=zaman_asimi,
+                                        uyku=uyku, statik_aralik=statik_aralik)
+
+    def tasarruf_raporu(self):
+        """Koşul yoklamalı beklemelerin sabit ayarlara göre kazandırdığı süre"""
+        return self.bekleme.tasarruf_raporu()
+
     def optimize_mode_ac(self, multiplier=1.3, baslangic_suresi=3.0):
         """Optimize mode'u aç ve tüm ayarları özel süreyle başlat
 
@@ -534,6 +622,7 @@ class TimingSettings:
         self.optimize_mode = True
         self.optimize_multiplier = multiplier
         self.optimized_keys.clear()
+        self.yuzdelik_keys.clear()
 
         # Tüm ayarları başlangıç süresine ayarla
         for anahtar in self.ayarlar.keys():
@@ -592,6 +681,31 @@ class TimingSettings:
         return True
 
 
+def istatistikleri_oku(istatistik_dosya="timing_stats.json"):
+    """Ölçüm istatistiklerini salt-okunur yükle: {anahtar: {count, total_time}}.
+
+    Analiz araçları içindir: günlük (timing_stats.jsonl) toplanır, yoksa eski
+    timing_stats.json okunur; istatistik_yukle'den farklı olarak günlük
+    sıkıştırılmaz, çalışan bot'un dosyasına yazılmaz.
+    """
+    yol = Path(istatistik_dosya)
+    if not yol.is_absolute():
+        yol = Path(__file__).resolve().parent / yol
+    gunluk = EklemeGunlugu(yol.with_suffix('.jsonl'))
+    if not gunluk.yol.exists():
+        data = eski_json_oku(yol)
+        return data if isinstance(data, dict) else {}
+    istatistikler = {}
+    for kayit in gunluk.oku():
+        anahtar = kayit.get("a")
+        if not anahtar:
+            continue
+        stats = istatistikler.setdefault(anahtar, {"count": 0, "total_time": 0.0})
+        stats["count"] += int(kayit.get("c", 0))
+        stats["total_time"] += float(kayit.get("t", 0.0))
+    return istatistikler
+
+
 # Global singleton
 _timing_settings = None
 
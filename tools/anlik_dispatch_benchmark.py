@@ -0,0 +1,93 @@
+"""
+Anlık Kontrol Dispatch Benchmark — sıralı tam tarama vs. anahtar indeksi
+
+kontrol_et_tekil'in özel + atomik modül aşamasını (genel dispatcher hariç)
+iki yoldan çalıştırıp kalem başına süreyi kıyaslar:
+  SIRALI  : tüm tablo (7 özel + kayıt defteri) sırayla, importlib + tespitçi
+  İNDEKSLİ: DISPATCH_ANAHTARLARI indeksinin seçtiği adaylar
+
+İki yol aynı (kategori, sonuç) vermeli — farklıysa HATA yazılır ve çıkış
+kodu 1 olur. Kalem havuzu: modül bildirimlerinden örnekler + kapsam dışı
+sık ilaçlar (gerçek reçetelerde kalemlerin çoğu hiçbir modüle düşmez).
+
+Kullanım:
+    python tools/anlik_dispatch_benchmark.py
+    python tools/anlik_dispatch_benchmark.py --kalem 50000
+"""
+
+import argparse
+import importlib
+import itertools
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from recete_kontrol.anlik_kontrol import (  # noqa: E402
+    _DISPATCH_TABLOSU, _duzlestir, _tablo_dispatch, _tablo_fonksiyonu,
+    dispatch_indeksi,
+)
+
+_KAPSAM_DISI = [
+    ("PAROL 500 MG", "PARASETAMOL", "N02BE01"),
+    ("ATOR 20 MG", "ATORVASTATIN", "C10AA05"),
+    ("GLIFOR 1000 MG", "METFORMIN", "A10BA02"),
+    ("BELOC ZOK 50 MG", "METOPROLOL", "C07AB02"),
+    ("AUGMENTIN BID 1000 MG", "AMOKSISILIN KLAVULANAT", "J01CR02"),
+    ("NEXIUM 40 MG", "ESOMEPRAZOL", "A02BC05"),
+    ("CORASPIN 100 MG", "ASETILSALISILIK ASIT", "B01AC06"),
+    ("DELIX 5 MG", "RAMIPRIL", "C09AA05"),
+]
+
+
+def _havuz():
+    ornekler = []
+    for _, modul_yolu, _, _, _ in _DISPATCH_TABLOSU:
+        bildirim = getattr(importlib.import_module(modul_yolu), "DISPATCH_ANAHTARLARI", {})
+        for k in _duzlestir(bildirim.get("metin"))[:2]:
+            ornekler.append({"ilac_adi": k, "etkin_madde": k})
+    disi = [{"ilac_adi": a, "etkin_madde": e, "atc_kodu": c} for a, e, c in _KAPSAM_DISI]
+    # ~%80 kapsam dışı, ~%20 modül ilacı
+    return disi * max(1, len(ornekler) // 2) + ornekler
+
+
+def _olc(kalemler, calistir):
+    t0 = time.perf_counter()
+    sonuclar = [calistir(k) for k in kalemler]
+    return (time.perf_counter() - t0) / len(kalemler) * 1e6, sonuclar
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--kalem", type=int, default=5000)
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    indeks = dispatch_indeksi()
+    print(f"İndeks kurulumu: {(time.perf_counter() - t0) * 1000:.1f} ms "
+          f"({len(_DISPATCH_TABLOSU)} modül, bildirimsiz: {len(indeks.her_zaman)})")
+
+    kalemler = list(itertools.islice(itertools.cycle(_havuz()), args.kalem))
+    tum = range(len(_DISPATCH_TABLOSU))
+    us_sirali, r_sirali = _olc(kalemler, lambda k: _tablo_dispatch(
+        k, tum, lambda i: _tablo_fonksiyonu(_DISPATCH_TABLOSU[i])))
+    us_indeks, r_indeks = _olc(kalemler, lambda k: _tablo_dispatch(
+        k, indeks.adaylar(k), indeks.fonksiyon))
+
+    farkli = sum(1 for a, b in zip(r_sirali, r_indeks)
+                 if a[:2] != b[:2] or (a[2] and b[2] and a[2].sonuc != b[2].sonuc))
+    ort_aday = sum(len(indeks.adaylar(k)) for k in kalemler) / len(kalemler)
+    print(f"{len(kalemler)} kalem — sıralı {us_sirali:8.1f} µs/kalem, "
+          f"indeksli {us_indeks:8.1f} µs/kalem (×{us_sirali / max(us_indeks, 1e-9):.1f}), "
+          f"ort. aday {ort_aday:.2f}")
+    if farkli:
+        print(f"HATA: {farkli} kalemde sonuç farklı")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Botanik EOS Yerel Ayna — elle senkron / durum
+
+Reçete ve elden tablolarını yerel SQLite aynasına (botanik_ayna.db)
+artımlı kopyalar. İlk senkron tüm geçmişi çeker (uzun sürebilir, mesai
+dışında çalıştırın); sonrakiler yalnızca yeni satırları ve son
+`--geri-gun` günün düzeltmelerini çeker. EOS'a sadece SELECT gider.
+
+Raporların aynayı kullanması için db_config.json'da:
+    "ayna_raporlari": true
+
+--kiyas ile seçili raporlar canlı ve aynadan çalıştırılıp süreler yazılır.
+
+Kullanım:
+    python tools/ayna_senkron.py                 # senkron + durum
+    python tools/ayna_senkron.py --durum         # sadece durum
+    python tools/ayna_senkron.py --tablo ReceteAna ReceteIlaclari
+    python tools/ayna_senkron.py --kiyas --urun 123 456
+"""
+
+import argparse
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from botanik_ayna import BotanikAyna, VARSAYILAN_GERI_GUN, VARSAYILAN_YOL  # noqa: E402
+
+
+def _durum_yaz(ayna):
+    print(f"{'Tablo':16} {'satır':>10} {'filigran':>12}  son senkron")
+    for ad, d in ayna.durum().items():
+        print(f"{ad:16} {d['satir'] or 0:>10} {str(d['son_anahtar'] or '-'):>12}  "
+              f"{d['son_senkron'] or '-'}")
+    print(f"Raporlarda kullanılabilir: {'EVET' if ayna.kullanilabilir_mi() else 'HAYIR'}")
+
+
+def _kiyas(db, ayna, urun_idler):
+    db.ayna_bagla(ayna)
+    for ad, cagri in (
+        ("mf_satis_analizi_getir", lambda: db.mf_satis_analizi_getir(urun_idler, 24)),
+    ):
+        for kaynak, acik in (("canlı", False), ("ayna", True)):
+            db.ayna_raporlari = acik
+            t0 = time.perf_counter()
+            sonuc = cagri()
+            sure = time.perf_counter() - t0
+            adet = len(sonuc) if isinstance(sonuc, list) else sonuc.get('sgk_toplam')
+            print(f"{ad:26} {kaynak:6} {sure:8.2f} sn  ({adet})")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--yol", default=VARSAYILAN_YOL)
+    ap.add_argument("--tablo", nargs="*")
+    ap.add_argument("--geri-gun", type=int, default=VARSAYILAN_GERI_GUN)
+    ap.add_argument("--durum", action="store_true", help="Senkron yapmadan durumu göster")
+    ap.add_argument("--kiyas", action="store_true", help="Canlı/ayna rapor süre kıyası")
+    ap.add_argument("--urun", type=int, nargs="*", default=[])
+    args = ap.parse_args()
+
+    ayna = BotanikAyna(args.yol, geri_gun=args.geri_gun)
+    if args.durum:
+        _durum_yaz(ayna)
+        return
+
+    from botanik_db import BotanikDB
+    db = BotanikDB()
+    if not db.baglan():
+        print("HATA: Veritabanına bağlanılamadı.")
+        sys.exit(2)
+    t0 = time.perf_counter()
+    for ad, adet in ayna.senkronize_et(db, args.tablo).items():
+        print(f"  {ad:16} {adet:>10} satır")
+    print(f"Senkron süresi: {time.perf_counter() - t0:.1f} sn\n")
+    _durum_yaz(ayna)
+    if args.kiyas:
+        print()
+        _kiyas(db, ayna, args.urun)
+    db.kapat()
+
+
+if __name__ == "__main__":
+    main()
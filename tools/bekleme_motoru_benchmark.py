@@ -0,0 +1,109 @@
+"""
+Bekleme Motoru Benchmark — sabit yoklama/uyku vs. yüzdelik + üstel yoklama
+
+Sahte saatle (gerçek bekleme yok) lognormal gecikmeli adımlar simüle edilir;
+her adımda koşul `gecikme` saniye sonra sağlanır, --popup oranında hiç
+sağlanmaz (popup penceresi engelliyor). Üç model karşılaştırılır:
+  SABİT UYKU  → adım başına sabit ayar kadar uyu (koşula bakmadan)
+  SABİT YOKLA → eski döngü: --aralik saniyede bir yokla, üst süre --ust
+  MOTOR       → BeklemeMotoru.kosul_bekle: üstel yoklama, üst süre ilk
+                ölçümlerden sonra p<yuzdelik> × marj
+
+Tablo toplam bekleme süresini, kaçırılan (süre dolduğu halde sonra gelen)
+adımları ve motorun tasarruf raporunu verir. Motor hem SABİT YOKLA'dan hem
+de yüzdeliğin öngördüğünden (adım × (1 - yüzdelik)) fazla adım kaçırıyorsa
+HATA yazılır ve çıkış kodu 1 olur.
+
+Kullanım:
+    python tools/bekleme_motoru_benchmark.py
+    python tools/bekleme_motoru_benchmark.py --adim 2000 --popup 0.1 --yuzdelik 0.99
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from bekleme_motoru import BeklemeMotoru  # noqa: E402
+
+
+class _Saat:
+    def __init__(self):
+        self.simdi = 0.0
+
+    def saat(self):
+        return self.simdi
+
+    def uyku(self, sure):
+        self.simdi += sure
+
+
+def _gecikmeler(adet, medyan, sigma, popup, tohum):
+    rnd = random.Random(tohum)
+    return [None if rnd.random() < popup else rnd.lognormvariate(math.log(medyan), sigma)
+            for _ in range(adet)]
+
+
+def _sabit_yokla(gecikmeler, aralik, ust):
+    toplam, kacan = 0.0, 0
+    for g in gecikmeler:
+        if g is not None and g <= ust:
+            toplam += min(ust, math.ceil(g / aralik) * aralik)
+        else:
+            toplam += ust
+            kacan += g is not None
+    return toplam, kacan
+
+
+def _motor(gecikmeler, ust, aralik, yuzdelik):
+    saat = _Saat()
+    motor = BeklemeMotoru(yuzdelik=yuzdelik, saat=saat.saat, uyku=saat.uyku)
+    kacan = 0
+    for g in gecikmeler:
+        hazir = saat.simdi + g if g is not None else math.inf
+        if not motor.kosul_bekle(lambda: saat.simdi >= hazir, "adim", varsayilan=ust,
+                                 statik_aralik=aralik) and g is not None:
+            kacan += 1
+    return saat.simdi, kacan, motor.tasarruf_raporu()["adim"]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--adim", type=int, default=1000)
+    ap.add_argument("--medyan", type=float, default=0.15, help="adım gecikmesi medyanı (sn)")
+    ap.add_argument("--sigma", type=float, default=0.5, help="lognormal yayılım")
+    ap.add_argument("--popup", type=float, default=0.03, help="hiç gelmeyen adım oranı")
+    ap.add_argument("--aralik", type=float, default=0.2, help="eski sabit yoklama aralığı")
+    ap.add_argument("--ust", type=float, default=1.0, help="eski sabit üst süre / uyku")
+    ap.add_argument("--yuzdelik", type=float, default=0.95)
+    args = ap.parse_args()
+
+    gecikmeler = _gecikmeler(args.adim, args.medyan, args.sigma, args.popup, 42)
+    uyku_toplam = args.ust * args.adim
+    uyku_kacan = sum(1 for g in gecikmeler if g is not None and g > args.ust)
+    yokla_toplam, yokla_kacan = _sabit_yokla(gecikmeler, args.aralik, args.ust)
+    motor_toplam, motor_kacan, rapor = _motor(gecikmeler, args.ust, args.aralik, args.yuzdelik)
+
+    print(f"{args.adim} adım, medyan {args.medyan * 1000:.0f} ms, σ={args.sigma}, "
+          f"popup %{args.popup * 100:.0f}, p{round(args.yuzdelik * 100)}")
+    print(f"\n{'MODEL':<14}{'TOPLAM sn':>11}{'ADIM ms':>10}{'KAÇAN':>8}")
+    for ad, toplam, kacan in (("SABİT UYKU", uyku_toplam, uyku_kacan),
+                              ("SABİT YOKLA", yokla_toplam, yokla_kacan),
+                              ("MOTOR", motor_toplam, motor_kacan)):
+        print(f"{ad:<14}{toplam:11.1f}{toplam / args.adim * 1000:10.1f}{kacan:8d}")
+    print(f"\nTasarruf raporu (SABİT YOKLA'ya göre): {rapor}")
+
+    if motor_kacan > max(yokla_kacan, int(args.adim * (1 - args.yuzdelik))):
+        print(f"HATA: motor {motor_kacan} adımı kaçırdı (sabit: {yokla_kacan})")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Depo Ekstre Mutabakat — sentetik ekstre benchmark
+
+Büyük depo (Selçuk, Alliance) yıllık ekstresi boyutunda sentetik depo ve
+eczane Excel'leri üretir; eski iterrows + çift döngü yolu ile
+depo_ekstre_mutabakat motorunu karşılaştırır. İade satırı eşleştirmesinde
+tam çift taraması ile ters indeksli aday üretimi de ölçülür.
+
+Kullanım:
+    python tools/depo_ekstre_benchmark.py
+    python tools/depo_ekstre_benchmark.py --satir 30000 --eslesmeyen 0.1
+    python tools/depo_ekstre_benchmark.py --eski-yok     # sadece yeni motor
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+import pandas as pd  # noqa: E402
+
+from depo_ekstre_mutabakat import (  # noqa: E402
+    BENZERLIK_ESIGI, ekstre_eslestir, ekstre_kayitlari_hazirla,
+    iade_satirlari_eslestir, ilac_ismi_benzerlik, net_tutar,
+)
+
+_KOLONLAR = {'fatura': 'Evrak No', 'borc': 'Borç', 'alacak': 'Alacak',
+             'tarih': 'Tarih', 'tip': 'Tip'}
+
+
+def _ekstreler(satir, eslesmeyen, tohum):
+    rnd = random.Random(tohum)
+    depo, eczane = [], []
+    for i in range(satir):
+        gun = pd.Timestamp('2025-01-01') + pd.Timedelta(days=rnd.randint(0, 364))
+        tutar = round(rnd.choice([rnd.uniform(50, 20000), rnd.choice([100.0, 250.0, 500.0])]), 2)
+        iade = rnd.random() < 0.1
+        satir_d = {'Evrak No': f"SLC{i:07d}", 'Tarih': gun.strftime('%d.%m.%Y'),
+                   'Borç': None if iade else tutar, 'Alacak': tutar if iade else None,
+                   'Tip': 'İade' if iade else 'Fatura'}
+        satir_e = dict(satir_d)
+        r = rnd.random()
+        if r < eslesmeyen / 2:
+            satir_e['Evrak No'] = f"ECZ{i:07d}"          # fatura no farklı, tutar aynı
+            satir_e['Tarih'] = (gun + pd.Timedelta(days=rnd.randint(0, 5))).strftime('%d.%m.%Y')
+        elif r < eslesmeyen:
+            satir_e['Borç'] = (satir_e['Borç'] or 0) + 1  # tutar farkı
+        depo.append(satir_d)
+        eczane.append(satir_e)
+    rnd.shuffle(eczane)
+    return pd.DataFrame(depo), pd.DataFrame(eczane)
+
+
+def _eski_yol(df_depo, df_eczane):
+    """DepoEkstreModul'deki eski döngülerin filtre/faturasız hariç özü."""
+    def hazirla(df):
+        data = {}
+        for _, row in df.iterrows():
+            fatura = str(row['Evrak No']).strip() if pd.notna(row['Evrak No']) else ""
+            borc = float(row['Borç']) if pd.notna(row['Borç']) else 0
+            alacak = float(row['Alacak']) if pd.notna(row['Alacak']) else 0
+            tarih = str(row['Tarih']).strip() if pd.notna(row['Tarih']) else ""
+            data[fatura] = {'borc': borc, 'alacak': alacak, 'tarih': tarih}
+        return data
+
+    def parse_tarih(s):
+        try:
+            return pd.to_datetime(s)
+        except Exception:
+            return pd.Timestamp('1900-01-01')
+
+    depo, eczane = hazirla(df_depo), hazirla(df_eczane)
+    eslesmeyen_d = {f: k for f, k in depo.items() if f not in eczane}
+    eslesmeyen_e = {f: k for f, k in eczane.items() if f not in depo}
+    kullanilan = set()
+    sari = 0
+    for _, dk in eslesmeyen_d.items():
+        dt, dtar = net_tutar(dk), parse_tarih(dk['tarih'])
+        adaylar = [(abs((dtar - parse_tarih(ek['tarih'])).days), ef)
+                   for ef, ek in eslesmeyen_e.items()
+                   if ef not in kullanilan and abs(dt - net_tutar(ek)) < 0.01 and dt > 0]
+        if adaylar:
+            kullanilan.add(min(adaylar)[1])
+            sari += 1
+    return sari
+
+
+def _iade_satirlari(n, tohum):
+    rnd = random.Random(tohum)
+    kelimeler = [f"ILAC{k}" for k in range(400)] + ['MG', 'TABLET', 'FILM', 'KAPSUL', '500', '100']
+    return [{'urun_adi': ' '.join(rnd.sample(kelimeler, 3)), 'barkod': '',
+             'miktar': rnd.randint(1, 5), 'tutar': 10, 'toplam_tutar': 10}
+            for _ in range(n)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--satir", type=int, default=15000, help="Ekstre satır sayısı")
+    ap.add_argument("--eslesmeyen", type=float, default=0.08, help="Fatura no tutmayan oran")
+    ap.add_argument("--iade", type=int, default=1500, help="İade satırı sayısı (her iki taraf)")
+    ap.add_argument("--eski-yok", action="store_true", help="Eski yolu ölçme")
+    ap.add_argument("--tohum", type=int, default=42)
+    args = ap.parse_args()
+
+    df_depo, df_eczane = _ekstreler(args.satir, args.eslesmeyen, args.tohum)
+    print(f"Ekstre: {len(df_depo)} depo / {len(df_eczane)} eczane satırı")
+
+    t0 = time.perf_counter()
+    depo, _ = ekstre_kayitlari_hazirla(df_depo, _KOLONLAR, {}, 'D')
+    eczane, _ = ekstre_kayitlari_hazirla(df_eczane, _KOLONLAR, {}, 'E')
+    t1 = time.perf_counter()
+    sonuc = ekstre_eslestir(depo, eczane)
+    t2 = time.perf_counter()
+    print(f"  yeni  hazırlama {t1 - t0:7.3f} sn  eşleştirme {t2 - t1:7.3f} sn  "
+          f"(yeşil {len(sonuc['yesil'])}, turuncu {len(sonuc['turuncu'])}, "
+          f"sarı {len(sonuc['sari'])}, kırmızı {len(sonuc['kirmizi_depo'])}/{len(sonuc['kirmizi_eczane'])})")
+    if not args.eski_yok:
+        t0 = time.perf_counter()
+        sari = _eski_yol(df_depo, df_eczane)
+        print(f"  eski  toplam    {time.perf_counter() - t0:7.3f} sn  (sarı {sari})")
+
+    d, b = _iade_satirlari(args.iade, args.tohum), _iade_satirlari(args.iade, args.tohum + 1)
+    print(f"\nİade: {len(d)} depo / {len(b)} Botanik satırı")
+    t0 = time.perf_counter()
+    s = iade_satirlari_eslestir(d, b)
+    print(f"  yeni  {time.perf_counter() - t0:7.3f} sn  ({len(s['eslesmeler'])} eşleşme)")
+    if not args.eski_yok:
+        t0 = time.perf_counter()
+        aday = sum(1 for x in d for y in b
+                   if ilac_ismi_benzerlik(x['urun_adi'], y['urun_adi']) >= BENZERLIK_ESIGI)
+        print(f"  eski  {time.perf_counter() - t0:7.3f} sn  (yalnız çift skorlama, {aday} aday)")
+
+
+if __name__ == "__main__":
+    main()
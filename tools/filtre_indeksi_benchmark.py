@@ -0,0 +1,189 @@
+"""
+Filtre İndeksi — aylık reçete tablosu filtre değişimi benchmark'ı (Tk'sız)
+
+Sentetik dönem satırları (varsayılan 50k) üretir ve AylikReceteSorguGUI'de
+tipik filtre tıklama dizisini (verdict/teyit etiketi kapat-aç, renk, msj,
+rapor, arama kutusuna harf harf yazma, Excel değer filtresi, kontrolü
+gereksiz ilaçlar, hızlı filtre) iki yoldan ölçer:
+
+  - satır bazlı: her tıklamada tüm satırlar satir_gecer_mi'den geçer
+    (eski _satir_filtreden_geciyor_mu döngüsünün eşdeğeri)
+  - indeks: filtre_maskesi + fark (eklenen/çıkan) — indeks bir kez kurulur
+
+Her adımda iki yolun görünür kümesinin aynı olduğu da doğrulanır.
+
+Kullanım:
+    python tools/filtre_indeksi_benchmark.py
+    python tools/filtre_indeksi_benchmark.py --satir 100000 --hedef-ms 50
+    python tools/filtre_indeksi_benchmark.py --eski-yok     # sadece indeks
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from filtre_indeksi import (  # noqa: E402
+    FiltreDurumu, FiltreIndeksi, filtre_maskesi, satir_gecer_mi,
+    teyit_sayimi, verdict_sayimi,
+)
+
+_VERDICT = ["UYGUN", "UYGUN DEĞİL", "ŞÜPHELİ", "ŞARTLI UYGUN", "MANUEL KONTROL",
+            "DİĞER RAPOR UYGUN", "TIBBEN UYGUN DEĞİL", ""]
+_TEYIT = ["UYGUN", "SUPHELI", "UYGUN_DEGIL", "DIGER_RAPOR_UYGUN", "SARTLI_UYGUN",
+          "MANUEL_KONTROL", "TIBBEN_UYGUN_DEGIL", ""]
+_RENK = ["beyaz", "yesil", "sari", "turuncu", "kirmizi", "gri"]
+_HEKIM = ["Dr. Şükrü Işık", "Dr. Ayşe İnce", "Dr. Mehmet Öztürk",
+          "Dr. Gülşen Çakır", "Dr. Can Yılmaz", "Dr. Zeynep Ağaoğlu"]
+
+
+def _satirlar(n, tohum):
+    rnd = random.Random(tohum)
+    ilaclar = [(f"ILAC{k:04d} {rnd.choice(['TABLET', 'FILM TB', 'SURUP'])}",
+                rnd.choice(["ATORVASTATIN", "METFORMIN", "RIVAROKSABAN",
+                            "KLOPIDOGREL", "PREGABALIN", "AMLODIPIN"]),
+                f"C{rnd.randint(1, 10):02d}A{rnd.randint(1, 9)}")
+               for k in range(3000)]
+    satirlar = []
+    for i in range(n):
+        ad, etkin, atc = rnd.choice(ilaclar)
+        satirlar.append({
+            "ri_id": 5_000_000 + i,
+            "ilac": ad, "etkin": etkin, "atc": atc,
+            "verdict": rnd.choice(_VERDICT),
+            "msj": rnd.choice(["var", "yok", "yok", ""]),
+            "rap_kod": rnd.choice(["", "", "04.05", "20.01", "07.02"]),
+            "rec_tip": rnd.choice(["Normal", "Normal", "Kırmızı", "Yeşil", "Mor"]),
+            "doktor": rnd.choice(_HEKIM),
+            "hasta": f"HASTA {rnd.randint(1, n // 3)}",
+        })
+    iidler = [str(s["ri_id"]) for s in satirlar]
+    teyit = {i: rnd.choice(_TEYIT[:-1]) for i in iidler if rnd.random() < 0.2}
+    renk = {i: rnd.choice(_RENK) for i in iidler}
+    return satirlar, teyit, renk
+
+
+def _senaryo(teyit, renk):
+    """Kullanıcının art arda yaptığı filtre tıklamaları (her biri bir durum)."""
+    temel = dict(teyit_harita=teyit, renkler=renk, renk_acik=set(_RENK),
+                 varsayilan_renk="beyaz",
+                 verdict_filtre={v: True for v in _VERDICT},
+                 teyit_filtre={t: True for t in _TEYIT})
+
+    def d(ad, **degisen):
+        kw = {k: (dict(v) if isinstance(v, dict) else v) for k, v in temel.items()}
+        for k, v in degisen.items():
+            if isinstance(v, dict) and isinstance(kw.get(k), dict):
+                kw[k].update(v)
+            else:
+                kw[k] = v
+        return ad, FiltreDurumu(**kw)
+
+    kdi_setler = ({f"ILAC{k:04d} TABLET" for k in range(0, 3000, 7)}, set(), {"AMLODIPIN"})
+
+    def kdi_eslesir(ilac, atc, etkin, setler):
+        return ilac in setler[0] or etkin in setler[2]
+
+    return [
+        d("filtresiz"),
+        d("verdict UYGUN kapat", verdict_filtre={"UYGUN": False}),
+        d("verdict UYGUN+boş kapat", verdict_filtre={"UYGUN": False, "": False}),
+        d("teyit edilmemişleri gizle", verdict_filtre={"UYGUN": False},
+          teyit_filtre={"": False}),
+        d("renk: sadece beyaz+sarı", renk_acik={"beyaz", "sari"}),
+        d("msj=var", msj_mod="var"),
+        d("msj=var + raporlu", msj_mod="var", rapor_mod="raporlu"),
+        d("arama 'ş'", arama={"doktor": "ş"}),
+        d("arama 'şü'", arama={"doktor": "şü"}),
+        d("arama 'şük'", arama={"doktor": "şük"}),
+        d("arama 'şük ı'", arama={"doktor": "şük ı"}),
+        d("değer filtresi (3 hekim)", deger={"doktor": set(_HEKIM[:3])}),
+        d("metin: hasta başlar '1'",
+          metin={"hasta": [{"baglac": None, "op": "baslar", "deger": "hasta 1"}]}),
+        d("kontrolü gereksiz gizle", kontrol_disi=[(kdi_eslesir, kdi_setler)]),
+        d("reçete türü: kırmızı gizli", gizli_recete_turleri={"Kırmızı"}),
+        d("hepsi birden", verdict_filtre={"UYGUN": False}, teyit_filtre={"": False},
+          renk_acik={"beyaz", "sari", "kirmizi"}, msj_mod="yok",
+          arama={"doktor": "dr"}, kontrol_disi=[(kdi_eslesir, kdi_setler)],
+          gizli_recete_turleri={"Mor"}),
+        d("filtreleri temizle"),
+    ]
+
+
+def _statin(s):
+    et = (s.get("etkin") or "").upper()
+    return "STATIN" in et
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--satir", type=int, default=50_000)
+    ap.add_argument("--tohum", type=int, default=42)
+    ap.add_argument("--hedef-ms", type=float, default=50.0)
+    ap.add_argument("--eski-yok", action="store_true",
+                    help="satır bazlı yolu ölçme (sadece indeks)")
+    args = ap.parse_args()
+
+    satirlar, teyit, renk = _satirlar(args.satir, args.tohum)
+    print(f"{len(satirlar):,} satır, {len(teyit):,} teyit kaydı")
+
+    t0 = time.perf_counter()
+    indeks = FiltreIndeksi(satirlar)
+    kurulum = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    indeks.hazirla()
+    hazirlik = (time.perf_counter() - t0) * 1000
+    print(f"İndeks kurulumu (iid dizisi): {kurulum:.1f} ms, "
+          f"SQL sütunlarını ön kodlama (boşta): {hazirlik:.1f} ms\n")
+
+    print(f"{'adım':32s} {'satır bazlı':>12s} {'indeks':>9s} {'görünür':>9s} "
+          f"{'+/-':>13s}")
+    en_kotu = 0.0
+    for ad, durum in _senaryo(teyit, renk):
+        eski_ms = None
+        beklenen = None
+        if not args.eski_yok:
+            t0 = time.perf_counter()
+            beklenen = [str(s["ri_id"]) for s in satirlar
+                        if satir_gecer_mi(s, str(s["ri_id"]), durum)]
+            eski_ms = (time.perf_counter() - t0) * 1000
+
+        t0 = time.perf_counter()
+        maske = filtre_maskesi(indeks, durum)
+        eklenen, cikan = indeks.fark(maske)
+        verdict_sayimi(indeks, _VERDICT)
+        teyit_sayimi(indeks, teyit, _TEYIT)
+        gorunen = indeks.iidler(maske)
+        yeni_ms = (time.perf_counter() - t0) * 1000
+        if ad != "filtresiz":
+            en_kotu = max(en_kotu, yeni_ms)
+
+        if beklenen is not None and beklenen != gorunen:
+            print(f"!! {ad}: görünür küme farklı ({len(beklenen)} ≠ {len(gorunen)})")
+            return 1
+        eski_txt = f"{eski_ms:9.1f} ms" if eski_ms is not None else f"{'-':>12s}"
+        print(f"{ad:32s} {eski_txt} {yeni_ms:6.1f} ms {len(gorunen):9,d} "
+              f"{'+' + str(len(eklenen)):>6s}/{'-' + str(len(cikan)):<6s}")
+
+    t0 = time.perf_counter()
+    indeks.yuklem_maskesi(_statin, _statin)
+    ilk = (time.perf_counter() - t0) * 1000
+    t0 = time.perf_counter()
+    indeks.yuklem_maskesi(_statin, _statin)
+    ikinci = (time.perf_counter() - t0) * 1000
+    print(f"\nHızlı filtre (statin) ilk: {ilk:.1f} ms, tekrar: {ikinci:.3f} ms")
+
+    durum = "✓" if en_kotu <= args.hedef_ms else "✗"
+    print(f"{durum} En yavaş filtre değişimi: {en_kotu:.1f} ms "
+          f"(hedef ≤ {args.hedef_ms:.0f} ms)")
+    return 0 if en_kotu <= args.hedef_ms else 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+Import Süresi Raporu — python -X importtime çıktısını modül grubuna göre özetler
+
+Her hedef modül temiz bir alt süreçte `python -X importtime -c "import X"`
+ile yüklenir; stderr'deki satırlar ayrıştırılıp kendi (self) süreleri şu
+gruplara toplanır:
+  recete_kontrol : SUT kural paketi (sut_motor dahil)
+  proje          : depo kökündeki diğer modüller
+  <paket adı>    : üçüncü parti (pandas, matplotlib, selenium...)
+  stdlib         : standart kütüphane
+
+Ayrıca her hedef için --tekrar kez duvar saati (süreç başlatma dahil)
+ölçülür ve medyanı basılır. Varsayılan hedefler: ana menü soğuk açılış
+(ana_menu) ve Aylık Reçete ekranının ilk açılışında yüklenenler
+(on_isitma.ISITMA_MODULLERI["aylik_recete_sorgu"]).
+
+Hedef import sırasında patlarsa (örn. pyodbc yok) o ana kadarki süreler
+raporlanır ve hata satırı yazılır.
+
+Kullanım:
+    python tools/import_suresi_raporu.py
+    python tools/import_suresi_raporu.py --ilk 25 recete_kontrol.anlik_kontrol
+    python tools/import_suresi_raporu.py --tekrar 1 botanik_gui
+"""
+
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from on_isitma import ISITMA_MODULLERI  # noqa: E402
+
+_SATIR = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( *)(\S+)\s*$")
+_PAKET_GRUPLARI = {"recete_kontrol"}
+
+
+def _grup(modul: str) -> str:
+    ust = modul.split(".")[0]
+    if ust in _PAKET_GRUPLARI:
+        return ust
+    if ust in sys.stdlib_module_names or ust.startswith("_"):
+        return "stdlib"
+    if os.path.exists(os.path.join(PARENT, ust + ".py")) or \
+            os.path.isdir(os.path.join(PARENT, ust)):
+        return "proje"
+    return ust
+
+
+def importtime_olc(hedef: str):
+    """Alt süreçte hedefi import et → ([(modül, self_us, kümülatif_us, derinlik)], hata)."""
+    kod = "import " + ", ".join(hedef.split("+"))
+    p = subprocess.run([sys.executable, "-X", "importtime", "-c", kod],
+                       cwd=PARENT, capture_output=True, text=True,
+                       encoding="utf-8", errors="replace")
+    kayitlar, hata = [], None
+    for satir in p.stderr.splitlines():
+        m = _SATIR.match(satir)
+        if m:
+            kayitlar.append((m.group(4), int(m.group(1)), int(m.group(2)),
+                             len(m.group(3)) // 2))
+        elif p.returncode and satir.strip():
+            hata = satir.strip()
+    return kayitlar, hata
+
+
+def duvar_saati(hedef: str, tekrar: int) -> float:
+    kod = "import " + ", ".join(hedef.split("+"))
+    sureler = []
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", kod], cwd=PARENT,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        sureler.append(time.perf_counter() - t0)
+    return statistics.median(sureler)
+
+
+def rapor(hedef: str, ilk: int, tekrar: int) -> str:
+    kayitlar, hata = importtime_olc(hedef)
+    gruplar = defaultdict(lambda: [0, 0])
+    for modul, self_us, _, _ in kayitlar:
+        g = gruplar[_grup(modul)]
+        g[0] += self_us
+        g[1] += 1
+    toplam = sum(g[0] for g in gruplar.values())
+    satirlar = [f"═══ {hedef} ═══"]
+    if tekrar:
+        satirlar.append(f"duvar saati (medyan {tekrar}): {duvar_saati(hedef, tekrar) * 1000:8.1f} ms")
+    satirlar.append(f"import toplamı            : {toplam / 1000:8.1f} ms, {len(kayitlar)} modül")
+    if hata:
+        satirlar.append(f"HATA (kısmi ölçüm): {hata}")
+    satirlar.append(f"{'GRUP':<20}{'ms':>9}{'%':>7}{'modül':>7}")
+    for ad, (us, adet) in sorted(gruplar.items(), key=lambda x: -x[1][0])[:15]:
+        satirlar.append(f"{ad:<20}{us / 1000:9.1f}{100 * us / max(toplam, 1):7.1f}{adet:7d}")
+    satirlar.append(f"En yavaş {ilk} modül (self):")
+    for modul, self_us, kum_us, _ in sorted(kayitlar, key=lambda k: -k[1])[:ilk]:
+        satirlar.append(f"  {self_us / 1000:8.1f} ms  (küm. {kum_us / 1000:7.1f})  {modul}")
+    return "\n".join(satirlar)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("hedefler", nargs="*",
+                    help="modül adı; birden çok modül 'a+b' ile tek süreçte")
+    ap.add_argument("--ilk", type=int, default=10)
+    ap.add_argument("--tekrar", type=int, default=3)
+    args = ap.parse_args()
+    hedefler = args.hedefler or ["ana_menu",
+                                 "+".join(ISITMA_MODULLERI["aylik_recete_sorgu"])]
+    for hedef in hedefler:
+        print(rapor(hedef, args.ilk, args.tekrar))
+        print()
+
+
+if __name__ == "__main__":
+    main()
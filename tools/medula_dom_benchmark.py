@@ -0,0 +1,71 @@
+"""
+Medula DOM Benchmark — eleman eleman COM okuma vs. tek outerHTML anlığı
+
+Sentetik reçete sayfası (--ilac satır + BotanikEOS skyblue satırları) sayfa
+başka tablolarla büyütülerek (dolgu satırı) ilaç tablosu iki yoldan okunur:
+  ESKİ → medula_dom_anlik.ilac_tablosu_com_oku: getElementsByTagName("TR")
+         + her satır/hücre için getAttribute / innerText + satır başı
+         getElementById (her çağrı --gecikme ms süreçler arası COM bedeli)
+  YENİ → DomAnlik.belgeden (tek outerHTML çağrısı) + süreç içi ayrıştırma
+         + medula_dom_anlik.ilac_tablosu
+
+Sahte COM belgesi medula_dom_anlik.AnlikBelge'dir. İki yol aynı
+satırları vermeli — farklıysa HATA yazılır ve çıkış kodu 1 olur.
+
+Kullanım:
+    python tools/medula_dom_benchmark.py
+    python tools/medula_dom_benchmark.py --ilac 20 --gecikme 0.3 --tekrar 1
+"""
+
+import argparse
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from medula_dom_anlik import (AnlikBelge, DomAnlik, ilac_tablosu,  # noqa: E402
+                              ilac_tablosu_com_oku)
+from test_medula_dom_anlik import recete_sayfasi  # noqa: E402
+
+
+def _olc(fn, tekrar: int) -> tuple:
+    en_iyi, sonuc = float("inf"), None
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        sonuc = fn()
+        en_iyi = min(en_iyi, time.perf_counter() - t0)
+    return en_iyi, sonuc
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--ilac", type=int, default=10)
+    ap.add_argument("--gecikme", type=float, default=0.1, help="COM çağrısı başına ms")
+    ap.add_argument("--tekrar", type=int, default=3)
+    args = ap.parse_args()
+
+    gecikme = args.gecikme / 1000
+    print(f"İlaç satırı: {args.ilac}, COM çağrısı: {args.gecikme} ms")
+    print(f"\n{'ELEMAN':>8}{'ESKİ çağrı':>12}{'ESKİ ms':>10}{'YENİ ms':>10}{'×':>8}")
+    hata = 0
+    for dolgu in (0, 50, 200, 800):
+        html = recete_sayfasi(args.ilac, dolgu_satir=dolgu)
+        eski_belge = AnlikBelge(html, gecikme)
+        yeni_belge = AnlikBelge(html, gecikme)
+        eski_sn, eski = _olc(lambda: ilac_tablosu_com_oku(eski_belge), args.tekrar)
+        yeni_sn, yeni = _olc(lambda: ilac_tablosu(DomAnlik.belgeden(yeni_belge)), args.tekrar)
+        if eski != yeni:
+            print(f"HATA: {dolgu} dolgu satırında sonuçlar farklı")
+            hata += 1
+        eleman = DomAnlik(html).eleman_sayisi
+        print(f"{eleman:8d}{eski_belge.cagri // args.tekrar:12d}{eski_sn * 1000:10.1f}"
+              f"{yeni_sn * 1000:10.1f}{eski_sn / max(yeni_sn, 1e-9):8.1f}")
+    return 1 if hata else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
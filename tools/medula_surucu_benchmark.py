@@ -0,0 +1,92 @@
+"""
+Medula Sürücü Benchmark — kayıtlı oturumu tekrar oynatarak reçete/dakika
+
+Fikstür dizini (ECZASIST_MEDULA_KAYIT ile eczanede kaydedilmiş oturum) ya da
+--fikstur verilmezse test_medula_surucu.SahteBot ile üretilen sentetik bir
+kayıt medula_surucu.TekrarSurucu ile oynatılır ve recete_akisi.tek_recete_isle
+--recete kez çalıştırılır. Gecikme çarpanları değiştirilerek Medula yanıt
+süresi ile akışın sabit beklemelerinin reçete başı bütçedeki payı görülür:
+  yanıt ×  → kayıttaki adım süreleri (sunucu / IE yanıtı) çarpanı
+  bekleme × → bot.bekle / timed_sleep sabit beklemeleri çarpanı
+
+Adım tablosu recete_akisi'nın timing anahtarlarıyla (kayit_ekle) ölçülür.
+Tekrar oynatılan reçeteler kayıttaki sonuçları vermeli — başarısız reçete
+varsa HATA yazılır ve çıkış kodu 1 olur.
+
+Kullanım:
+    python tools/medula_surucu_benchmark.py
+    python tools/medula_surucu_benchmark.py --fikstur kayit/ --recete 20
+    python tools/medula_surucu_benchmark.py --gecikme 0.02 --recete 5
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from medula_surucu import KayitSurucu, TekrarSurucu, verim_ozeti  # noqa: E402
+from recete_akisi import tek_recete_isle  # noqa: E402
+from test_medula_surucu import SahteBot, _RaporTakip  # noqa: E402
+
+
+def _sentetik_kayit(dizin, adet, gecikme):
+    kayit = KayitSurucu(SahteBot(gecikme=gecikme), dizin)
+    for i in range(adet):
+        tek_recete_isle(kayit, i + 1, _RaporTakip(), grup="A")
+    kayit.kapat()
+
+
+def _oynat(dizin, adet, yanit, bekleme):
+    surucu = TekrarSurucu(dizin, gecikme_carpani=yanit, bekleme_carpani=bekleme)
+    sureler, basarisiz = [], 0
+    for i in range(adet):
+        t0 = time.perf_counter()
+        basari = tek_recete_isle(surucu, i + 1, _RaporTakip(), grup="A")[0]
+        sureler.append(time.perf_counter() - t0)
+        basarisiz += not basari
+    return verim_ozeti(sureler, surucu.timing.olcumler), basarisiz
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--fikstur", help="kayıtlı oturum dizini (yoksa sentetik)")
+    ap.add_argument("--recete", type=int, default=10)
+    ap.add_argument("--gecikme", type=float, default=0.01,
+                    help="sentetik kayıtta adım başı yanıt süresi (sn)")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as gecici:
+        dizin = args.fikstur
+        if not dizin:
+            dizin = gecici
+            _sentetik_kayit(dizin, args.recete, args.gecikme)
+            print(f"Sentetik kayıt: {args.recete} reçete, adım başı {args.gecikme * 1000:.0f} ms")
+        else:
+            print(f"Fikstür: {dizin}")
+
+        print(f"\n{'YANIT ×':>8}{'BEKLEME ×':>11}{'REÇETE/DK':>11}{'ORT sn':>9}")
+        hata = 0
+        ozet = None
+        for yanit, bekleme in ((1.0, 1.0), (1.0, 0.0), (0.5, 0.0), (0.0, 0.0)):
+            sonuc, basarisiz = _oynat(dizin, args.recete, yanit, bekleme)
+            if basarisiz:
+                print(f"HATA: {basarisiz} reçete tekrar oynatmada başarısız")
+                hata += 1
+            print(f"{yanit:8.1f}{bekleme:11.1f}{sonuc['recete_dakika']:11.1f}{sonuc['ort_sn']:9.3f}")
+            ozet = ozet or sonuc
+
+        print(f"\n{'ADIM (1×/1×)':<24}{'ADET':>6}{'ORT ms':>9}{'P95 ms':>9}{'TOPLAM ms':>11}")
+        for anahtar, adim in sorted(ozet["adimlar"].items(), key=lambda x: -x[1]["toplam_ms"]):
+            print(f"{anahtar:<24}{adim['adet']:6d}{adim['ort_ms']:9.1f}"
+                  f"{adim['p95_ms']:9.1f}{adim['toplam_ms']:11.1f}")
+    return 1 if hata else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
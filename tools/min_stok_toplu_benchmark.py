@@ -0,0 +1,82 @@
+"""
+Min Stok Toplu Benchmark — ürün başı sorgu döngüsü vs. küme bazlı toplu analiz
+
+Sahte EOS (test_min_stok_toplu._SahteEOS — bellek içi SQLite, T-SQL
+çevirili; düzenli / seyrek / yığın / talepsiz ürün karışımı) üzerinde
+tum_ilaclari_analiz_et her hesaplama modunda iki yoldan çalıştırılır:
+  ESKİ : toplu=False — ürün başına talep (+ finansal) sorgusu, Python döngüsü
+  YENİ : toplu=True  — TOPLU_PARCA'lık IN listeleri (TOPLU_PARALEL thread),
+         istatistikler NumPy ile tüm ürünler için tek geçişte
+
+--gecikme-ms her sorguya eklenen ağ gidiş-dönüşünü taklit eder (gerçek
+EOS'ta ürün başı yolun asıl maliyeti budur; 0 = yalnız yerel SQLite).
+
+İki yol aynı satırları vermeli — farklıysa HATA yazılır ve çıkış kodu 1 olur.
+
+Kullanım:
+    python tools/min_stok_toplu_benchmark.py
+    python tools/min_stok_toplu_benchmark.py --urun 1000 --gecikme-ms 5
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from min_stok_analiz import tum_ilaclari_analiz_et  # noqa: E402
+from test_min_stok_toplu import _SahteEOS  # noqa: E402
+
+
+class _GecikmeliEOS(_SahteEOS):
+    """Her sorgu kilit dışında `gecikme_sn` bekler (ağ gidiş-dönüşü)."""
+
+    def __init__(self, urun_sayisi: int, gecikme_sn: float):
+        super().__init__(urun_sayisi=urun_sayisi)
+        self.gecikme_sn = gecikme_sn
+
+    def sorgu_calistir(self, sql, params=None):
+        if self.gecikme_sn:
+            time.sleep(self.gecikme_sn)
+        return super().sorgu_calistir(sql, params)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--urun", type=int, default=400)
+    ap.add_argument("--gecikme-ms", type=float, default=2.0)
+    ap.add_argument("--mod", nargs="*", default=["frekans", "rop", "finansal"])
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    t0 = time.perf_counter()
+    eos = _GecikmeliEOS(args.urun, args.gecikme_ms / 1000)
+    print(f"Kaynak: {args.urun} ürün, {eos.conn.execute('SELECT COUNT(*) FROM ReceteIlaclari').fetchone()[0]}"
+          f" reçeteli kalem, sorgu gecikmesi {args.gecikme_ms:g} ms "
+          f"({time.perf_counter() - t0:.1f} sn)")
+
+    hata = 0
+    print(f"\n{'MOD':<10}{'ESKİ sn':>10}{'sorgu':>8}{'YENİ sn':>10}{'sorgu':>8}{'×':>8}")
+    for mod in args.mod:
+        sonuclar = []
+        for toplu in (False, True):
+            eos.sorgular.clear()
+            t0 = time.perf_counter()
+            sonuclar.append(tum_ilaclari_analiz_et(eos, hesaplama_modu=mod, toplu=toplu))
+            sonuclar.append((time.perf_counter() - t0, len(eos.sorgular)))
+        eski, (eski_sn, eski_q), yeni, (yeni_sn, yeni_q) = sonuclar
+        if eski != yeni:
+            print(f"HATA: {mod} sonuçları farklı")
+            hata += 1
+        print(f"{mod:<10}{eski_sn:10.2f}{eski_q:8d}{yeni_sn:10.2f}{yeni_q:8d}"
+              f"{eski_sn / max(yeni_sn, 1e-9):8.1f}")
+    return 1 if hata else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,106 @@
+"""
+NormalizeMetin Benchmark — satır başı normalize + ibare kümesi vs. eski yol
+
+Gerçek rapor metinleri (test_diyabet_25_real_world.VAKALAR) sut_kontrolleri'nin
+rapor metni taranan glisemik ibare kümelerine (_GLISEMIK_KUMELERI) karşı iki
+yoldan taranır:
+  ESKİ : her (metin, ibare) çiftinde metni ve ibareyi baştan normalize et
+         (önbelleksiz fonetik_normalize; eski gövdenin her çağrıda kurduğu
+         maketrans tabloları hariç, yani kazanç alttan ölçülür) — küme için
+         any(_turkce_ara(metin, ibare) ...)
+  YENİ : normalize_metin (metin başına bir kez) + IbareKumesi tek tarama
+
+Her metin bir reçete satırını temsil eder; satırdaki kurallar aynı metni
+--sorgu kez tarar (dispatch + şart atomları + açıklama üretimi).
+
+İki yol aynı sonucu vermeli — farklıysa HATA yazılır ve çıkış kodu 1 olur.
+
+Kullanım:
+    python tools/normalize_metin_benchmark.py
+    python tools/normalize_metin_benchmark.py --tekrar 20 --sorgu 5
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from recete_kontrol import normalize_metin as nm_mod  # noqa: E402
+from recete_kontrol.sut_kontrolleri import _GLISEMIK_KUMELERI  # noqa: E402
+
+
+def _metinler():
+    """Gerçek dünya rapor metinleri + teşhis satırıyla birleşik varyantları."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        import test_diyabet_25_real_world as vakalar
+    metinler = [rapor for _, _, rapor, _ in vakalar.VAKALAR]
+    return metinler + [f"E11 TİP 2 DİYABETES MELLİTUS\n{m}" for m in metinler]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--tekrar", type=int, default=5)
+    ap.add_argument("--sorgu", type=int, default=3,
+                    help="satır başına aynı metnin kaç kez tarandığı")
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    metinler = _metinler() * args.sorgu
+    kumeler = list(_GLISEMIK_KUMELERI.values())
+    kume_cagrilari = [(m, k) for m in metinler for k in kumeler]
+    ciftler = [(m, i) for m, k in kume_cagrilari for i in k.ibareler]
+    print(f"{len(metinler) // args.sorgu} metin × {args.sorgu} sorgu, "
+          f"{len(kumeler)} küme: {len(ciftler)} _turkce_ara, "
+          f"{len(kume_cagrilari)} küme taraması")
+    ham = nm_mod.fonetik_normalize.__wrapped__
+
+    def eski_ara():
+        return [ham(a) in ham(m) for m, a in ciftler]
+
+    def yeni_ara():
+        return [nm_mod.normalize_metin(m).ara(a) for m, a in ciftler]
+
+    def eski_kume():
+        return [any(ham(k) in ham(m) for k in kume.ibareler) for m, kume in kume_cagrilari]
+
+    def yeni_kume():
+        return [kume.var_mi(m) for m, kume in kume_cagrilari]
+
+    hata = False
+    for etiket, eski, yeni, n in (("_turkce_ara", eski_ara, yeni_ara, len(ciftler)),
+                                  ("ibare kümesi", eski_kume, yeni_kume,
+                                   len(kume_cagrilari))):
+        if not n:
+            continue
+        sureler = []
+        for fn in (eski, yeni):
+            gecen = 0.0
+            for _ in range(args.tekrar):
+                # Her tekrar soğuk önbellekle — kazanç yalnız tekrar içi paylaşımdan
+                nm_mod._normalize_metin.cache_clear()
+                nm_mod.fonetik_normalize.cache_clear()
+                t0 = time.perf_counter()
+                sonuc = fn()
+                gecen += time.perf_counter() - t0
+            sureler.append((gecen / (args.tekrar * n) * 1e6, sonuc))
+        (us_eski, r_eski), (us_yeni, r_yeni) = sureler
+        print(f"{etiket:<14}: eski {us_eski:7.2f} µs/çağrı, yeni {us_yeni:7.2f} µs/çağrı "
+              f"(×{us_eski / max(us_yeni, 1e-9):.1f})")
+        if r_eski != r_yeni:
+            print(f"HATA: {etiket} sonuçları farklı "
+                  f"({sum(a != b for a, b in zip(r_eski, r_yeni))} çağrı)")
+            hata = True
+    if hata:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
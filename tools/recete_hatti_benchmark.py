@@ -0,0 +1,102 @@
+"""
+Reçete Hattı Benchmark — ardışık vs. ardışık düzenli (pipeline) reçete işleme
+
+Simüle edilmiş edinim kaynağıyla (gerçek Medula yok) reçete başına üç adım
+çalıştırılır: edinim (UI okuma, --edinim ms), zenginleştirme (EOS sorgusu /
+rapor geçmişi, --zengin ms) ve değerlendirme (kurallar, --degerlendirme ms).
+  ARDIŞIK → eski döngü: her reçete için üç adım sırayla
+  HAT     → recete_hatti.ReceteHatti: edinim bu thread'de, zenginleştirme
+            --zengin-isci işçiyle, değerlendirme tek işçiyle arka planda
+
+Tablo reçete/dakika, hızlanma ve aşama kullanım metriklerini verir. Hat
+ardışık ile aynı sonuçları aynı sırada vermiyorsa ya da ardışıktan yavaşsa
+HATA yazılır ve çıkış kodu 1 olur.
+
+Kullanım:
+    python tools/recete_hatti_benchmark.py
+    python tools/recete_hatti_benchmark.py --recete 100 --edinim 30 --zengin 40 --zengin-isci 2
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from recete_hatti import Asama, ReceteHatti  # noqa: E402
+
+
+def _adimlar(args):
+    rnd = random.Random(42)
+    # ±%50 oynayan adım süreleri (sn)
+    sureler = [tuple(ms / 1000 * rnd.uniform(0.5, 1.5)
+                     for ms in (args.edinim, args.zengin, args.degerlendirme))
+               for _ in range(args.recete)]
+
+    def edinim():
+        for i, (e, _, _) in enumerate(sureler):
+            time.sleep(e)
+            yield {"sira": i, "recete_no": f"3K{i:05d}"}
+
+    def zenginlestir(okuma):
+        time.sleep(sureler[okuma["sira"]][1])
+        return dict(okuma, rapor_gecmisi=okuma["sira"] % 3)
+
+    def degerlendir(okuma):
+        time.sleep(sureler[okuma["sira"]][2])
+        return (True, okuma["recete_no"], okuma["rapor_gecmisi"] == 0, "OK")
+
+    return edinim, zenginlestir, degerlendir
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--recete", type=int, default=40)
+    ap.add_argument("--edinim", type=float, default=20, help="reçete başı UI okuma (ms)")
+    ap.add_argument("--zengin", type=float, default=15, help="reçete başı EOS / rapor geçmişi (ms)")
+    ap.add_argument("--degerlendirme", type=float, default=10, help="reçete başı kural kontrolü (ms)")
+    ap.add_argument("--zengin-isci", type=int, default=1)
+    ap.add_argument("--kuyruk", type=int, default=2, help="aşamalar arası kuyruk boyu")
+    args = ap.parse_args()
+
+    edinim, zenginlestir, degerlendir = _adimlar(args)
+
+    t0 = time.perf_counter()
+    ardisik = [degerlendir(zenginlestir(o)) for o in edinim()]
+    ardisik_sure = time.perf_counter() - t0
+
+    hat = ReceteHatti([Asama("zenginlestirme", zenginlestir, isci=args.zengin_isci),
+                       Asama("degerlendirme", degerlendir)], kuyruk_boyu=args.kuyruk)
+    t0 = time.perf_counter()
+    sonuclar = hat.isle(edinim())
+    hat_sure = time.perf_counter() - t0
+    hatli = [s.deger if s.hata is None else s.hata for s in sonuclar]
+
+    print(f"{args.recete} reçete, adım ms: edinim {args.edinim:.0f} / zengin {args.zengin:.0f} "
+          f"(×{args.zengin_isci}) / değerlendirme {args.degerlendirme:.0f}, kuyruk {args.kuyruk}")
+    print(f"\n{'MODEL':<10}{'TOPLAM sn':>11}{'REÇETE/DK':>11}{'HIZLANMA':>10}")
+    for ad, sure in (("ARDIŞIK", ardisik_sure), ("HAT", hat_sure)):
+        print(f"{ad:<10}{sure:11.3f}{args.recete / sure * 60:11.1f}{ardisik_sure / sure:9.2f}×")
+
+    print(f"\n{'AŞAMA':<16}{'İŞÇİ':>5}{'ADET':>6}{'MEŞGUL sn':>11}{'BOŞ sn':>9}"
+          f"{'TIKALI sn':>11}{'KULLANIM':>10}{'MAX KUYRUK':>12}")
+    for ad, m in hat.metrikler()["asamalar"].items():
+        print(f"{ad:<16}{m['isci']:5d}{m['adet']:6d}{m['mesgul_sn']:11.3f}{m['bos_sn']:9.3f}"
+              f"{m['tikali_sn']:11.3f}{m['kullanim'] * 100:9.0f}%{m['max_kuyruk']:12d}")
+
+    if hatli != ardisik:
+        print("HATA: hat sonuçları ardışık işleme ile aynı değil")
+        return 1
+    if hat_sure > ardisik_sure:
+        print(f"HATA: hat ardışıktan yavaş ({hat_sure:.3f} > {ardisik_sure:.3f} sn)")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+"""
+Satış Küpü Benchmark — ürün başı SQL vs. satış küpü (talep analizi + aylık döküm)
+
+Sahte EOS (test_satis_kupu._SahteEOS — bellek içi SQLite, T-SQL çevirili)
+üzerine --urun ürün × --gun gün sentetik reçeteli/elden satış yazılır; iki
+iş yükü iki yoldan çalıştırılır:
+  talep : min_stok_analiz.talep_pattern_analiz her ürün için
+          ESKİ → ürün başı UNION ALL SQL, YENİ → SatisKupu.gunluk
+  aylık : tüm ürünlerin son 6 ay ürün × ay dökümü
+          ESKİ → tek GROUP BY sorgusu, YENİ → SatisKupu.donemsel
+
+Kaynak burada yerel SQLite'tır: gerçek EOS'taki ağ gidiş-dönüşü ve sunucu
+yükü ESKİ yola dahil DEĞİLDİR, yani kazanç alttan ölçülür. Küpün ilk kurulum
+ve artımlı yenileme süreleri ayrıca basılır.
+
+İki yol aynı sonucu vermeli — farklıysa HATA yazılır ve çıkış kodu 1 olur.
+
+Kullanım:
+    python tools/satis_kupu_benchmark.py
+    python tools/satis_kupu_benchmark.py --urun 500 --gun 730 --satir 300
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import math
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from min_stok_analiz import talep_pattern_analiz  # noqa: E402
+from satis_kupu import SatisKupu, ay_basi  # noqa: E402
+
+with contextlib.redirect_stdout(io.StringIO()):
+    from test_satis_kupu import _SahteEOS  # noqa: E402
+
+
+class _KupluDB:
+    """talep_pattern_analiz için küp bağlı BotanikDB yerine geçen ince sarmal."""
+
+    def __init__(self, kaynak, kup):
+        self.kaynak, self.kup = kaynak, kup
+
+    def satis_kupu(self, esas="kayit", bas=None):
+        return self.kup if self.kup.kullanilabilir_mi(esas, bas) else None
+
+    def sorgu_calistir(self, sql, params=None):
+        return self.kaynak.sorgu_calistir(sql, params)
+
+
+def _kaynak_kur(urun: int, gun: int, satir: int) -> _SahteEOS:
+    rnd = random.Random(42)
+    eos = _SahteEOS()
+    bugun = date.today()
+    for g in range(gun):
+        for _ in range(rnd.randint(satir // 2, satir)):
+            eos.satis(bugun - timedelta(days=g), urun=rnd.randint(1, urun),
+                      adet=rnd.choice((1, 1, 1, 2, 3)), elden=rnd.random() < 0.3,
+                      iade=rnd.random() < 0.01)
+    eos.conn.execute("CREATE INDEX ix_ri ON ReceteIlaclari (RIUrunId)")
+    eos.conn.execute("CREATE INDEX ix_ei ON EldenIlaclari (RIUrunId)")
+    return eos
+
+
+def _aylik_sql(eos: _SahteEOS, bas: date):
+    """Eski tüketicilerin yaptığı gibi: kaynakta gün gün topla, ayda birleştir."""
+    sonuc = {}
+    for ana, ilac in (("ReceteAna", "ReceteIlaclari"), ("EldenAna", "EldenIlaclari")):
+        for r in eos.sorgu_calistir(f"""
+            SELECT i.RIUrunId AS UrunId, CAST(a.RxKayitTarihi AS date) AS Tarih,
+                   SUM(i.RIAdet) AS Adet
+            FROM {ilac} i JOIN {ana} a ON i.RIRxId = a.RxId
+            WHERE a.RxSilme = 0 AND i.RISilme = 0 AND (i.RIIade = 0 OR i.RIIade IS NULL)
+            AND a.RxKayitTarihi >= ?
+            GROUP BY i.RIUrunId, CAST(a.RxKayitTarihi AS date)""", (bas.strftime("%Y%m%d"),)):
+            aylar = sonuc.setdefault(r["UrunId"], {})
+            ay = str(r["Tarih"])[:7]
+            aylar[ay] = aylar.get(ay, 0) + r["Adet"]
+    return sonuc
+
+
+def _esit(a, b) -> bool:
+    """Sonuç karşılaştırması; float'lar toplama sırası farkı kadar toleranslı."""
+    if isinstance(a, float) or isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_esit(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(_esit(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def _olc(fn, tekrar: int) -> tuple:
+    en_iyi, sonuc = float("inf"), None
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        sonuc = fn()
+        en_iyi = min(en_iyi, time.perf_counter() - t0)
+    return en_iyi, sonuc
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--urun", type=int, default=300)
+    ap.add_argument("--gun", type=int, default=400)
+    ap.add_argument("--satir", type=int, default=150, help="gün başına en çok kalem")
+    ap.add_argument("--tekrar", type=int, default=3)
+    args = ap.parse_args()
+    logging.disable(logging.WARNING)
+
+    t0 = time.perf_counter()
+    eos = _kaynak_kur(args.urun, args.gun, args.satir)
+    print(f"Kaynak: {eos.ri_id} kalem, {args.urun} ürün, {args.gun} gün "
+          f"({time.perf_counter() - t0:.1f} sn)")
+
+    with tempfile.TemporaryDirectory() as d:
+        kup = SatisKupu(os.path.join(d, "kup.db"), gecmis_gun=args.gun + 31)
+        t0 = time.perf_counter()
+        hucre = kup.yenile(eos)
+        print(f"Küp ilk kurulum      : {time.perf_counter() - t0:8.2f} sn, {hucre} hücre")
+        t0 = time.perf_counter()
+        kup.yenile(eos)
+        print(f"Küp artımlı yenileme : {time.perf_counter() - t0:8.2f} sn")
+        t0 = time.perf_counter()
+        kup.toplam([1])
+        print(f"Bellek görüntüsü     : {(time.perf_counter() - t0) * 1000:8.1f} ms")
+
+        kuplu = _KupluDB(eos, kup)
+        urunler = range(1, args.urun + 1)
+        hata = 0
+        isler = [
+            ("talep (ürün başı)",
+             lambda: [talep_pattern_analiz(eos, u, 12) for u in urunler],
+             lambda: [talep_pattern_analiz(kuplu, u, 12) for u in urunler]),
+            ("aylık döküm (6 ay)",
+             lambda: _aylik_sql(eos, ay_basi(5)),
+             lambda: kup.donemsel(bas=ay_basi(5))),
+        ]
+        print(f"\n{'İŞ':<22}{'ESKİ ms':>10}{'YENİ ms':>10}{'×':>8}")
+        for ad, eski_fn, yeni_fn in isler:
+            eski_sn, eski = _olc(eski_fn, args.tekrar)
+            yeni_sn, yeni = _olc(yeni_fn, args.tekrar)
+            if not _esit(eski, yeni):
+                print(f"HATA: {ad} sonuçları farklı")
+                hata += 1
+            print(f"{ad:<22}{eski_sn * 1000:10.1f}{yeni_sn * 1000:10.1f}"
+                  f"{eski_sn / max(yeni_sn, 1e-9):8.1f}")
+    return 1 if hata else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""
+Oturum Logu Benchmark — satır başı aç/yaz/kapat vs. arka plan yazıcı thread
+
+Bot döngüsündeki gibi art arda log çağrıları yapılır ve çağıran thread'in
+saniyede kaç çağrı yapabildiği ölçülür:
+  ESKİ  → her satırda dosyayı aç, ekle, kapat (önceki SessionLogger.yaz)
+  YENİ  → SessionLogger.yaz: kayıt kuyruğa, yazıcı thread partiler halinde yazar
+          (+ adim(): yalnız .jsonl'e giden adım süresi kaydı)
+YENİ için kuyruğun diske boşalma süresi de verilir. Her iki yöntemin dosyasında
+yazılan satır sayısı çağrı sayısına eşit değilse HATA yazılır ve çıkış kodu
+1 olur.
+
+Kullanım:
+    python tools/session_logger_benchmark.py
+    python tools/session_logger_benchmark.py --cagri 100000 --toplu 512
+"""
+
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from session_logger import SessionLogger  # noqa: E402
+
+
+def _eski_yaz(log_dosya, mesaj, seviye="INFO"):
+    now = datetime.now()
+    zaman = now.strftime("%H:%M:%S") + f".{now.microsecond // 1000:03d}"
+    with open(log_dosya, 'a', encoding='utf-8') as f:
+        f.write(f"[{zaman}] [{seviye}] {mesaj}\n")
+
+
+def _satir_sayisi(yol, seviye="[INFO]"):
+    """Döndürülmüş parçalar (.1, .2 ...) dahil seviye satırı sayısı."""
+    adet = 0
+    for parca in [yol] + sorted(glob.glob(f"{yol}.*")):
+        with open(parca, encoding="utf-8") as f:
+            adet += sum(1 for satir in f if seviye in satir)
+    return adet
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--cagri", type=int, default=20000)
+    ap.add_argument("--toplu", type=int, default=256, help="yazıcı parti boyu (kayıt)")
+    args = ap.parse_args()
+
+    mesajlar = [f"✅ Reçete 3K{i:05d}: 2 rapor CSV'ye kaydedildi" for i in range(args.cagri)]
+    hata = 0
+    with tempfile.TemporaryDirectory() as dizin:
+        eski_dosya = os.path.join(dizin, "eski.txt")
+        t0 = time.perf_counter()
+        for m in mesajlar:
+            _eski_yaz(eski_dosya, m)
+        eski_sure = time.perf_counter() - t0
+
+        log = SessionLogger(1, "A", log_klasoru=dizin, toplu_boyut=args.toplu)
+        t0 = time.perf_counter()
+        for m in mesajlar:
+            log.yaz(m)
+        yeni_sure = time.perf_counter() - t0
+        log.bosalt(60)
+        bosalma = time.perf_counter() - t0 - yeni_sure
+
+        t0 = time.perf_counter()
+        for i in range(args.cagri):
+            log.adim("İlaç butonu", 0.12, recete="3K00000", anahtar="ilac_butonu")
+        adim_sure = time.perf_counter() - t0
+        log.kapat()
+
+        print(f"{args.cagri} log çağrısı, parti {args.toplu}")
+        print(f"\n{'YÖNTEM':<14}{'ÇAĞRI/SN':>12}{'ÇAĞRI µs':>10}{'BOŞALMA sn':>12}")
+        for ad, sure, bos in (("ESKİ yaz", eski_sure, None), ("YENİ yaz", yeni_sure, bosalma),
+                              ("YENİ adim", adim_sure, None)):
+            bos_metin = f"{bos:12.3f}" if bos is not None else f"{'-':>12}"
+            print(f"{ad:<14}{args.cagri / sure:12.0f}{sure / args.cagri * 1e6:10.1f}{bos_metin}")
+        print(f"\nHızlanma (çağıran thread): {eski_sure / yeni_sure:.1f}×")
+
+        for ad, yol in (("ESKİ", eski_dosya), ("YENİ", log.log_dosya)):
+            adet = _satir_sayisi(yol)
+            if adet != args.cagri:
+                print(f"HATA: {ad} dosyasında {adet} satır var, {args.cagri} bekleniyordu")
+                hata += 1
+    return 1 if hata else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
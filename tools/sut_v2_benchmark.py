@@ -0,0 +1,90 @@
+"""
+SUT v2 Motor Benchmark — tam vs. derlenmiş vs. tembel (kısa devreli)
+
+sut_kurallari/v2/*.json içindeki yerleşik `senaryolar` üzerinde üç yolu
+kıyaslar:
+  TAM      : degerlendir_v2 (her çağrıda doğrulama + parse, tüm atomlar)
+  DERLENMİŞ: degerlendir_derlenmis, tembel=False (tüm atomlar — GUI izi)
+  TEMBEL   : degerlendir_derlenmis, tembel=True (ucuz atom önce, kısa devre)
+
+Her senaryo için verdict'lerin aynı olduğu doğrulanır — farklıysa HATA
+yazılır ve çıkış kodu 1 olur. Süreler N tekrarın medyanıdır (µs/çağrı);
+"atom" sütunu çalıştırılan atom sayısıdır (kısa devrede atlananlar hariç).
+
+Kullanım:
+    python tools/sut_v2_benchmark.py
+    python tools/sut_v2_benchmark.py --tekrar 2000
+    python tools/sut_v2_benchmark.py --kural sut_kurallari/v2/akut_hepatit_b_4_2_13_3.json
+"""
+
+import argparse
+import glob
+import os
+import statistics
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from recete_kontrol.sut_motor.derleyici import (  # noqa: E402
+    KuralDerleyici, degerlendir_derlenmis,
+)
+from recete_kontrol.sut_motor.motor_v2 import (  # noqa: E402
+    KISA_DEVRE_NEDENI, degerlendir_v2, kural_yukle_v2,
+)
+
+
+def _olc(fn, tekrar):
+    sureler = []
+    for _ in range(5):
+        t0 = time.perf_counter()
+        for _ in range(tekrar):
+            sonuc = fn()
+        sureler.append((time.perf_counter() - t0) / tekrar * 1e6)
+    return statistics.median(sureler), sonuc
+
+
+def _calisan_atom(rapor):
+    return sum(1 for s in rapor.sartlar if s.neden != KISA_DEVRE_NEDENI)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--kural", nargs="*",
+                    default=sorted(glob.glob(os.path.join(PARENT, "sut_kurallari", "v2", "*.json"))))
+    ap.add_argument("--tekrar", type=int, default=500)
+    args = ap.parse_args()
+
+    hata = 0
+    toplam = {"tam": 0.0, "derlenmis": 0.0, "tembel": 0.0}
+    print(f"{'Kural / senaryo':44} {'tam':>8} {'derl.':>8} {'tembel':>8}  atom  verdict")
+    for yol in args.kural:
+        kural = kural_yukle_v2(yol)
+        dk = KuralDerleyici.derle(kural)
+        print(f"{os.path.basename(yol)}")
+        for sen in kural.get("senaryolar", []) or []:
+            satir = sen.get("ilac_sonuc", {})
+            t_tam, r_tam = _olc(lambda: degerlendir_v2(kural, satir), args.tekrar)
+            t_der, r_der = _olc(lambda: degerlendir_derlenmis(dk, satir), args.tekrar)
+            t_tem, r_tem = _olc(lambda: degerlendir_derlenmis(dk, satir, tembel=True),
+                                args.tekrar)
+            ayni = r_tam.sonuc == r_der.sonuc == r_tem.sonuc
+            hata += not ayni
+            toplam["tam"] += t_tam
+            toplam["derlenmis"] += t_der
+            toplam["tembel"] += t_tem
+            ad = str(sen.get("ad") or sen.get("id") or "?")[:42]
+            print(f"  {ad:42} {t_tam:8.1f} {t_der:8.1f} {t_tem:8.1f}  "
+                  f"{_calisan_atom(r_tem):>2}/{len(r_tam.sartlar):<2} "
+                  f"{r_tam.sonuc.name if ayni else 'HATA: ' + r_tem.sonuc.name}")
+    if toplam["tembel"]:
+        print(f"\nToplam µs: tam {toplam['tam']:.0f}  derlenmiş {toplam['derlenmis']:.0f}  "
+              f"tembel {toplam['tembel']:.0f}  (tam/tembel ×{toplam['tam'] / toplam['tembel']:.1f})")
+    sys.exit(1 if hata else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Dönem Filtresi Benchmark — YEAR()/MONTH()/DAY() IN vs. sargable aralık
+
+Aylık reçete sorgusunun dönem filtresini iki şekilde çalıştırıp kıyaslar:
+  ESKİ : YEAR(ra.RxKayitTarihi) IN (...) AND MONTH(...) IN (...) [AND DAY(...) IN (...)]
+  YENİ : sql_tarih_araligi.donem_kosulu → (RxKayitTarihi >= ? AND RxKayitTarihi < ?) OR ...
+
+Her iki sorgu da aynı satır sayısını döndürmeli (anlam eşdeğerliği) —
+farklıysa çıktı HATA verir. Süreler N tekrarın medyanıdır.
+
+Plan kıyası: guard yalnızca SELECT'e izin verdiği için SET SHOWPLAN
+kullanılamaz; plan farkı için SSMS'te iki sorgunun "Display Estimated
+Execution Plan" çıktısına bakın (ESKİ: Index/Clustered Scan, YENİ: Seek).
+Aşağıda yazdırılan SQL'ler SSMS'e yapıştırılabilir.
+
+Kullanım (varsayılan: yerel test kopyası localhost/eczane_test):
+    python tools/tarih_araligi_benchmark.py --yil 2026 --ay 3 4
+    python tools/tarih_araligi_benchmark.py --yil 2025 2026 --ay 1 2 3 --gun 1 15
+    python tools/tarih_araligi_benchmark.py --yil 2026 --ay 3 --tekrar 10 --canli
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from sql_tarih_araligi import donem_kosulu  # noqa: E402
+
+
+def _eski_kosul(kolon, yillar, aylar, gunler):
+    parcalar, params = [], []
+    for fonk, liste in (("YEAR", yillar), ("MONTH", aylar), ("DAY", gunler)):
+        if liste:
+            parcalar.append(f"{fonk}({kolon}) IN ({','.join('?' * len(liste))})")
+            params.extend(int(x) for x in liste)
+    return " AND ".join(parcalar) or "1=1", params
+
+
+def _olc(db, sql, params, tekrar):
+    sureler, sonuc = [], None
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        rows = db.sorgu_calistir(sql, tuple(params))
+        sureler.append((time.perf_counter() - t0) * 1000)
+        if db.son_sorgu_hatasi:
+            raise RuntimeError(db.son_sorgu_hatasi)
+        sonuc = rows[0]["Adet"] if rows else None
+    return statistics.median(sureler), min(sureler), sonuc
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--yil", type=int, nargs="+", required=True)
+    ap.add_argument("--ay", type=int, nargs="*")
+    ap.add_argument("--gun", type=int, nargs="*")
+    ap.add_argument("--tekrar", type=int, default=5)
+    ap.add_argument("--canli", action="store_true",
+                    help="Yerel test kopyası yerine PRODUCTION (db_config.json)")
+    args = ap.parse_args()
+
+    from botanik_db import BotanikDB
+    db = BotanikDB(production=args.canli)
+    if not db.baglan():
+        print("HATA: Veritabanına bağlanılamadı.")
+        sys.exit(2)
+
+    kolon = "ra.RxKayitTarihi"
+    taban = ("SELECT COUNT(*) AS Adet FROM ReceteAna ra "
+             "INNER JOIN ReceteIlaclari ri ON ri.RIRxId = ra.RxId AND ri.RISilme = 0 "
+             "WHERE ra.RxSilme = 0 AND ")
+
+    eski_kos, eski_prm = _eski_kosul(kolon, args.yil, args.ay, args.gun)
+    yeni_kos, yeni_prm = donem_kosulu(kolon, args.yil, args.ay, args.gun)
+    yeni_kos = yeni_kos or "1=1"
+
+    print("=" * 78)
+    print(f"Dönem: yıl={args.yil} ay={args.ay or 'Tümü'} gün={args.gun or 'Tümü'}  "
+          f"({'CANLI' if args.canli else 'yerel test kopyası'}, {args.tekrar} tekrar)")
+    print("=" * 78)
+    print(f"ESKİ SQL: {taban}{eski_kos}\n  params={eski_prm}")
+    print(f"YENİ SQL: {taban}{yeni_kos}\n  params={yeni_prm}")
+
+    # Isınma (plan cache + buffer pool) — ilk çalıştırma ölçüme girmesin
+    _olc(db, taban + eski_kos, eski_prm, 1)
+    _olc(db, taban + yeni_kos, yeni_prm, 1)
+
+    e_med, e_min, e_adet = _olc(db, taban + eski_kos, eski_prm, args.tekrar)
+    y_med, y_min, y_adet = _olc(db, taban + yeni_kos, yeni_prm, args.tekrar)
+
+    print("-" * 78)
+    print(f"{'':6} {'satır':>10} {'medyan ms':>12} {'min ms':>10}")
+    print(f"{'ESKİ':6} {e_adet:>10} {e_med:>12.1f} {e_min:>10.1f}")
+    print(f"{'YENİ':6} {y_adet:>10} {y_med:>12.1f} {y_min:>10.1f}")
+    if e_adet != y_adet:
+        print("HATA: Satır sayıları farklı — anlam eşdeğerliği bozuk!")
+        sys.exit(1)
+    if y_med > 0:
+        print(f"Hızlanma: x{e_med / y_med:.1f}")
+    db.kapat()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Toplu SUT Kontrolü Benchmark — tek süreç vs. süreç havuzu
+
+Sentetik bir ay (kapsam dışı sık ilaçlar + modül bildirimlerinden örnek
+kalemler) üzerinde kontrol_et_tekil'i iki yoldan çalıştırır:
+  TEK SÜREÇ : kalem kalem, ana süreçte (bugünkü TÜMÜNÜ KONTROL yolu)
+  HAVUZ     : toplu_kontrol(workers=N) — soğuk (spawn + import dahil) ve
+              ısınmış (havuz yeniden kullanılırken) ayrı ölçülür
+
+İki yol aynı (kategori, rapor) vermeli — farklıysa HATA yazılır ve çıkış
+kodu 1 olur. Sonda havuzlu koşunun kategori süre tablosu basılır.
+
+Kullanım:
+    python tools/toplu_kontrol_benchmark.py
+    python tools/toplu_kontrol_benchmark.py --kalem 20000 --isci 7
+"""
+
+import argparse
+import importlib
+import itertools
+import logging
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from recete_kontrol.anlik_kontrol import (  # noqa: E402
+    _DISPATCH_TABLOSU, _duzlestir, kontrol_et_tekil,
+)
+from recete_kontrol.toplu_kontrol import (  # noqa: E402
+    TopluIstatistik, havuzu_kapat, toplu_kontrol, varsayilan_isci_sayisi,
+)
+
+_KAPSAM_DISI = [
+    ("PAROL 500 MG", "PARASETAMOL", "N02BE01"),
+    ("ATOR 20 MG", "ATORVASTATIN", "C10AA05"),
+    ("GLIFOR 1000 MG", "METFORMIN", "A10BA02"),
+    ("BELOC ZOK 50 MG", "METOPROLOL", "C07AB02"),
+    ("AUGMENTIN BID 1000 MG", "AMOKSISILIN KLAVULANAT", "J01CR02"),
+    ("NEXIUM 40 MG", "ESOMEPRAZOL", "A02BC05"),
+    ("CORASPIN 100 MG", "ASETILSALISILIK ASIT", "B01AC06"),
+    ("DELIX 5 MG", "RAMIPRIL", "C09AA05"),
+]
+
+
+def _havuz():
+    ornekler = []
+    for _, modul_yolu, _, _, _ in _DISPATCH_TABLOSU:
+        bildirim = getattr(importlib.import_module(modul_yolu), "DISPATCH_ANAHTARLARI", {})
+        for k in _duzlestir(bildirim.get("metin"))[:2]:
+            ornekler.append({"ilac_adi": k, "etkin_madde": k,
+                             "tum_metin": "uzman hekim raporu"})
+    disi = [{"ilac_adi": a, "etkin_madde": e, "atc_kodu": c} for a, e, c in _KAPSAM_DISI]
+    # ~%80 kapsam dışı, ~%20 modül ilacı
+    return disi * max(1, len(ornekler) // 2) + ornekler
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--kalem", type=int, default=5000)
+    ap.add_argument("--isci", type=int, default=varsayilan_isci_sayisi())
+    args = ap.parse_args()
+    # Kural modüllerinin satır satır log'u ölçümü boğmasın
+    logging.disable(logging.WARNING)
+
+    kalemler = list(itertools.islice(itertools.cycle(_havuz()), args.kalem))
+    print(f"{len(kalemler)} kalem, {args.isci} işçi (cpu_count={os.cpu_count()})")
+
+    t0 = time.perf_counter()
+    referans = [kontrol_et_tekil(k) for k in kalemler]
+    sn_tek = time.perf_counter() - t0
+    print(f"TEK SÜREÇ      : {sn_tek:8.2f} sn  ({len(kalemler) / sn_tek:8.0f} kalem/sn)")
+
+    sonuclar = []
+    ist = None
+    for etiket in ("HAVUZ (soğuk)", "HAVUZ (ısınmış)"):
+        ist = TopluIstatistik()
+        sonuclar = list(toplu_kontrol(kalemler, workers=args.isci, istatistik=ist))
+        print(f"{etiket:<15}: {ist.duvar_sn:8.2f} sn  "
+              f"({len(kalemler) / ist.duvar_sn:8.0f} kalem/sn, ×{sn_tek / ist.duvar_sn:.1f})")
+    havuzu_kapat()
+
+    farkli = sum(1 for (_, kat, rap), (r_kat, r_rap) in zip(sonuclar, referans)
+                 if kat != r_kat or rap != r_rap)
+    print()
+    print(ist.rapor())
+    if farkli or [s[0] for s in sonuclar] != list(range(len(kalemler))):
+        print(f"HATA: {farkli} kalemde sonuç/sıra farklı")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Zam NPV Benchmark — gün gün döngü vs. zam_npv_motoru (sipariş listesi zam önerisi)
+
+--urun rastgele ürün (aylık ortalama, stok, maliyet, zam günü/oranı) için
+sipariş ekranının zam önerisi iki yoldan hesaplanır:
+  ESKİ → her ürün × her aday miktar (0..12 aylık talep) için 720 güne kadar
+         gün gün while döngüsü + karar noktası döngüleri
+         (test_zam_npv_motoru._eski_kazanc / _eski_karar)
+  YENİ → zam_npv_motoru.toplu_karar_noktalari (tüm liste tek gün taraması)
+
+Ayrıca tek ürünün ROI grafiği eğrisi (ay sonu şeması) ölçülür.
+
+İki yol aynı karar noktalarını vermeli — farklıysa HATA yazılır ve çıkış
+kodu 1 olur.
+
+Kullanım:
+    python tools/zam_npv_benchmark.py
+    python tools/zam_npv_benchmark.py --urun 300 --tekrar 1
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PARENT = os.path.dirname(SCRIPT_DIR)
+if PARENT not in sys.path:
+    sys.path.insert(0, PARENT)
+
+from test_zam_npv_motoru import _eski_kazanc, _eski_karar  # noqa: E402
+from zam_npv_motoru import (aday_ust_sinir, kazanc_egrisi,  # noqa: E402
+                            toplu_karar_noktalari)
+
+
+def _liste_kur(urun: int) -> list:
+    rnd = random.Random(42)
+    kalemler = []
+    for _ in range(urun):
+        aylik_ort = round(rnd.lognormvariate(1.8, 0.9), 1)
+        kalemler.append({
+            "maliyet": round(rnd.uniform(5, 600), 2),
+            "aylik_ort": aylik_ort,
+            "mevcut_stok": rnd.choice((0, 0, 1, 3, int(aylik_ort), int(aylik_ort * 3))),
+            "zam_gun": rnd.randint(5, 60),
+            "zam_orani": rnd.choice((10, 20, 30)),
+            "faiz_yillik": 45,
+            "depo_vade": 75,
+        })
+    return kalemler
+
+
+def _eski_liste(kalemler: list) -> list:
+    sonuc = []
+    for kalem in kalemler:
+        ust = aday_ust_sinir(kalem["aylik_ort"], 10, 100)
+        kazanclar = [_eski_kazanc(q, sema="gunluk", **kalem) for q in range(0, ust + 1)]
+        sonuc.append(_eski_karar(kazanclar, kalem["maliyet"]))
+    return sonuc
+
+
+def _olc(fn, tekrar: int) -> tuple:
+    en_iyi, sonuc = float("inf"), None
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        sonuc = fn()
+        en_iyi = min(en_iyi, time.perf_counter() - t0)
+    return en_iyi, sonuc
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    ap.add_argument("--urun", type=int, default=120)
+    ap.add_argument("--tekrar", type=int, default=2)
+    args = ap.parse_args()
+
+    kalemler = _liste_kur(args.urun)
+    aday = sum(aday_ust_sinir(k["aylik_ort"], 10, 100) + 1 for k in kalemler)
+    print(f"Liste: {args.urun} ürün, {aday} aday miktar")
+
+    tek = dict(kalemler[0], aylik_ort=40, mevcut_stok=12)
+    miktarlar = range(0, aday_ust_sinir(40, 50, 200) + 1)
+    hata = 0
+    isler = [
+        ("sipariş listesi",
+         lambda: _eski_liste(kalemler),
+         lambda: toplu_karar_noktalari(kalemler)),
+        ("ROI eğrisi (1 ürün)",
+         lambda: [_eski_kazanc(q, sema="ay_sonu", **tek) for q in miktarlar],
+         lambda: kazanc_egrisi(miktarlar, sema="ay_sonu", **tek).tolist()),
+    ]
+    print(f"\n{'İŞ':<22}{'ESKİ ms':>10}{'YENİ ms':>10}{'×':>8}")
+    for ad, eski_fn, yeni_fn in isler:
+        eski_sn, eski = _olc(eski_fn, args.tekrar)
+        yeni_sn, yeni = _olc(yeni_fn, args.tekrar)
+        if eski != yeni:
+            print(f"HATA: {ad} sonuçları farklı")
+            hata += 1
+        print(f"{ad:<22}{eski_sn * 1000:10.1f}{yeni_sn * 1000:10.1f}"
+              f"{eski_sn / max(yeni_sn, 1e-9):8.1f}")
+    return 1 if hata else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
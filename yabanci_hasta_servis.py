@@ -2,8 +2,9 @@
 """Yabancı Uyruklu Hasta Uyarı Servisi — bağımsız arka plan uygulaması.
 
 EczAsist (etiket) programından TAMAMEN bağımsız çalışır. Bilgisayar açıkken
-sistem tepsisinde (tray) küçük bir ikon olarak arka planda durur; Botanik EOS'a
-60 sn'de bir SELECT yoklaması yapar. Yeni kaydedilen bir reçetenin hasta TC'si
+sistem tepsisinde (tray) küçük bir ikon olarak arka planda durur; Botanik EOS'u
+değişiklik akışıyla (degisiklik_akisi — RxId filigranı, mesaide birkaç sn'de
+bir SELECT) izler. Yeni kaydedilen bir reçetenin hasta TC'si
 '98'/'99' ile başlıyor (yabancı uyruklu) AMA geçici koruma kapsamında DEĞİLSE
 (yani A/B/C gibi normal SGK gruplarına düşüyorsa), ekranı kaplayan kırmızı bir
 "Topkapı SGK'dan kağıt getirildi mi?" uyarısı verir + sesli alarm.
@@ -29,17 +30,16 @@ import shutil
 import subprocess
 import sys
 import threading
-import time
 import tkinter as tk
 from tkinter import messagebox
 
 import yabanci_hasta_tespit as yht
+from degisiklik_akisi import KONU_RECETE, paylasilan_akis
 
 # ── Sabitler ────────────────────────────────────────────────────────────
 UYGULAMA_ADI = "BotanikYabanciUyari"
 YEREL_KLASOR = r"C:\BotanikTakip"
 EXE_ADI = "YabanciHastaUyari.exe"
-POLL_SANIYE = 60
 
 logger = logging.getLogger("yabanci_servis")
 
@@ -213,7 +213,7 @@ def _db_olustur():
 class YabanciHastaServis:
     def __init__(self):
         self.db = None
-        self.son_rxid = None
+        self.akis = None
         self.stop = threading.Event()
         self.root = None
         self.tray = None
@@ -229,39 +229,12 @@ class YabanciHastaServis:
             logger.error("DB bağlantı hatası: %s", e)
         return False
 
-    def _max_rxid(self):
-        try:
-            rows = self.db.sorgu_calistir(
-                "SELECT MAX(RxId) AS m FROM ReceteAna WHERE RxSilme = 0")
-            if rows and rows[0].get("m") is not None:
-                return int(rows[0]["m"])
-        except Exception as e:
-            logger.warning("MAX(RxId) alınamadı: %s", e)
-        return None
-
-    def _yeni_yabancilar(self, son_rxid: int) -> list:
-        """RxId > son_rxid olan, TC 98/99 + geçici koruma DEĞİL reçeteler."""
-        sql = """
-            SELECT ra.RxId               AS RxId,
-                   ra.RxEReceteNo        AS ReceteNo,
-                   m.MusteriTCKN         AS TC,
-                   m.MusteriAdiSoyadi    AS Hasta,
-                   k.KapsamAdi           AS Kapsam
-            FROM ReceteAna ra
-            LEFT JOIN Musteri m ON ra.RxMusteriId = m.MusteriId
-            LEFT JOIN Kapsam  k ON m.MusteriKapsamId = k.KapsamId
-            WHERE ra.RxSilme = 0
-              AND ra.RxId > ?
-              AND (m.MusteriTCKN LIKE '98%' OR m.MusteriTCKN LIKE '99%')
-            ORDER BY ra.RxId
-        """
-        try:
-            rows = self.db.sorgu_calistir(sql, (int(son_rxid),))
-        except Exception as e:
-            logger.warning("Yeni reçete sorgusu hatası: %s", e)
-            return []
+    @staticmethod
+    def _yabancilar(satirlar: list) -> list:
+        """Akış satırlarından TC 98/99 + geçici koruma DEĞİL reçeteler
+        (TC/Kapsam akışın başlık sorgusunda gelir — ek sorgu yok)."""
         sonuc = []
-        for r in rows or []:
+        for r in satirlar or []:
             tc = (r.get("TC") or "").strip()
             kapsam = (r.get("Kapsam") or "").strip()
             if yht.topkapi_kagit_uyarisi_gerekir_mi(tc, kapsam):
@@ -273,34 +246,24 @@ class YabanciHastaServis:
                 })
         return sonuc
 
-    # — Yoklama döngüsü —
-    def _poll_dongu(self):
+    def _yeni_kayitlar(self, olay):
+        yabancilar = self._yabancilar(olay.satirlar)
+        if yabancilar and uyari_aktif_mi():
+            self.root.after(0, self._uyari_goster, yabancilar)
+
+    # — İzleme (değişiklik akışı) —
+    def _izlemeyi_baslat(self):
         # Bağlanana kadar dene (DB/ağ hazır olmayabilir)
         while not self.stop.is_set() and not self._baglan():
             self.stop.wait(30)
         if self.stop.is_set():
             return
-        self.son_rxid = self._max_rxid()  # geçmişi alarmlamadan başla
-        logger.info("Servis başladı, baz RxId=%s", self.son_rxid)
-        while not self.stop.is_set():
-            if self.stop.wait(POLL_SANIYE):
-                break
-            try:
-                yeni_max = self._max_rxid()
-                if yeni_max is None:
-                    # Bağlantı koptu olabilir → yeniden bağlan
-                    self._baglan()
-                    continue
-                if self.son_rxid is None:
-                    self.son_rxid = yeni_max
-                    continue
-                if yeni_max > self.son_rxid:
-                    yabancilar = self._yeni_yabancilar(self.son_rxid)
-                    self.son_rxid = yeni_max
-                    if yabancilar and uyari_aktif_mi():
-                        self.root.after(0, self._uyari_goster, yabancilar)
-            except Exception as e:
-                logger.warning("Poll döngü hatası: %s", e)
+        self.akis = paylasilan_akis(self.db, baglanti_yenile=self._baglan)
+        # Filigran kurulamazsa (bağlantı) akış ilk başarılı yoklamada kurar;
+        # geçmiş reçeteler alarmlanmaz
+        self.akis.abone_ol(KONU_RECETE, self._yeni_kayitlar)
+        logger.info("Servis başladı, baz RxId=%s",
+                    self.akis.filigran(KONU_RECETE))
 
     # — Tam ekran uyarı —
     def _uyari_goster(self, yabancilar: list):
@@ -397,8 +360,8 @@ class YabanciHastaServis:
                 "Yabancı Uyruklu Hasta Uyarı Servisi",
                 f"Durum: ÇALIŞIYOR\n"
                 f"Uyarı: {'AÇIK' if uyari_aktif_mi() else 'KAPALI'}\n"
-                f"Son RxId: {self.son_rxid}\n"
-                f"Yoklama: {POLL_SANIYE} sn\n"
+                f"Son RxId: {self.akis.filigran(KONU_RECETE) if self.akis else '-'}\n"
+                f"Yoklama: {f'{self.akis.aralik.simdiki:.0f}' if self.akis else '-'} sn\n"
                 f"Kurulu: {'EVET' if kurulu_mu() else 'HAYIR'}")
 
         def _uyari_toggle(_i, _it):
@@ -415,6 +378,8 @@ class YabanciHastaServis:
 
         def _cik(_i, _it):
             self.stop.set()
+            if self.akis:
+                self.akis.durdur()
             try:
                 self.tray.stop()
             except Exception:
@@ -439,7 +404,7 @@ class YabanciHastaServis:
         self.root = tk.Tk()
         self.root.withdraw()  # gizli ana pencere (tray uygulaması)
         self._tray_baslat()
-        threading.Thread(target=self._poll_dongu, daemon=True).start()
+        threading.Thread(target=self._izlemeyi_baslat, daemon=True).start()
         self.root.mainloop()
 
 
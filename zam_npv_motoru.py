@@ -0,0 +1,363 @@
+"""
+Zam Öncesi Alım NPV/ROI Motoru — tüm aday miktarlar tek geçişte
+
+Sipariş ekranı (SiparisVermeGUI._zam_oncesi_optimum_hesapla,
+_roi_verisi_hesapla, _karlilik_verisi_hesapla) ve MF hızlı hesaplama
+(_zam_karar_noktalari_hesapla, _kritik_noktalar_hesapla) aynı soruyu soruyor:
+"bugün q adet toplu alırsam, ay be ay almaya göre bugünkü değerde ne
+kazanırım?" Her q için 720 güne kadar gün gün while döngüsü dönüyordu;
+12 aylık talep kadar aday × yüzlerce gün × sipariş listesindeki her ürün.
+
+Bu modül aynı hesabı aday miktarlar vektörü üzerinde yapar:
+
+  - Miktardan bağımsız olan her şey ürün başına bir kez hazırlanır:
+    mevcut stok düştükten sonra yeni alıma kalan günlük açık, günün fiyatı
+    (zam gününden sonra zamlı) ve günün iskonto böleni (ödeme günü şeması).
+  - Günler üzerinde tek tarama: o gün her aday miktardan tüketilen
+    min(açık, kalan) ve NPV katkısı NumPy ile tüm adaylar (ve toplu
+    değerlendirmede tüm ürünler) için aynı anda eklenir. Bütün adaylar
+    bitince tarama durur.
+
+İşlem sırası eski döngülerle birebir aynıdır (aynı çıkarma/çarpma/bölme
+sırası, aynı Python pow ile iskonto) — sonuçlar bit düzeyinde eşittir, karar
+noktaları eski eşitlik kurallarıyla (ilk tepe, son pozitif, ilk %80, ilk
+maksimum ROI) seçilir.
+
+Ödeme günü şemaları:
+  'gunluk'  : gün + 30 + depo_vade                (zam optimum önerisi)
+  'ay_sonu' : ((gün // 30) + 1) * 30 + depo_vade  (ROI / karlılık grafikleri)
+  'takvim'  : alım tarihinin ertesi ayın 1'i (senet) + depo_vade, bugünden
+              gün sayısı (MF hızlı hesaplama)
+Toplu alımın ödemesi 'gunluk'/'ay_sonu' için 30 + depo_vade, 'takvim' için
+bugünkü alımın takvimsel ödeme günüdür.
+
+Kullanım:
+    k = kazanc_egrisi(range(0, 361), maliyet=100, aylik_ort=30, mevcut_stok=5,
+                      zam_gun=20, zam_orani=10, faiz_yillik=45, depo_vade=75)
+    karar_noktalari(k, 100)      # {'optimum': ..., 'pareto': ..., ...}
+    toplu_karar_noktalari([{...}, {...}])   # sipariş listesi
+"""
+
+from datetime import date, timedelta
+
+import numpy as np
+
+UFUK_GUN = 720
+SEMALAR = ("gunluk", "ay_sonu", "takvim")
+
+# Toplu taramada bir parçadaki (ürün × aday) hücre üst sınırı ve dolgu
+# hesabında en dar satır için alt sınır (çok küçük parçalar gün döngüsü
+# yükünü artırır)
+PARCA_HUCRE = 400_000
+PARCA_MIN_GENISLIK = 64
+
+
+def gunluk_faiz_orani(faiz_yillik: float) -> float:
+    """Yıllık faiz (%) → bileşik günlük oran (ay = 30 gün)."""
+    aylik_faiz = (faiz_yillik / 100) / 12
+    return (1 + aylik_faiz) ** (1/30) - 1
+
+
+def _takvim_odeme_gun(bugun: date, gun: int, depo_vade: int) -> int:
+    alim = bugun + timedelta(days=gun)
+    senet = date(alim.year + 1, 1, 1) if alim.month == 12 else date(alim.year, alim.month + 1, 1)
+    return (senet + timedelta(days=depo_vade) - bugun).days
+
+
+def odeme_gunleri(sema: str, depo_vade: int, bugun: date = None) -> tuple:
+    """
+    Ödeme günü şeması.
+
+    Returns:
+        (gunler, toplu_gun): gunler[g] = g. gün tüketilen malın ödeme günü,
+        toplu_gun = bugünkü toplu alımın ödeme günü
+    """
+    if sema == "gunluk":
+        return [g + 30 + depo_vade for g in range(UFUK_GUN)], 30 + depo_vade
+    if sema == "ay_sonu":
+        return [((g // 30) + 1) * 30 + depo_vade for g in range(UFUK_GUN)], 30 + depo_vade
+    if sema == "takvim":
+        bugun = bugun or date.today()
+        gunler = [_takvim_odeme_gun(bugun, g, depo_vade) for g in range(UFUK_GUN)]
+        return gunler, gunler[0]
+    raise ValueError(f"Bilinmeyen ödeme şeması: {sema!r} (beklenen: {SEMALAR})")
+
+
+class _IskontoOnbellek:
+    """(faiz, vade) → gün iskonto bölenleri; sipariş listesinde hepsi aynıdır."""
+
+    def __init__(self, sema: str, bugun: date = None):
+        self.sema = sema
+        self.bugun = bugun
+        self._tablo = {}
+
+    def getir(self, faiz_yillik: float, depo_vade: int) -> tuple:
+        anahtar = (faiz_yillik, depo_vade)
+        if anahtar not in self._tablo:
+            g = gunluk_faiz_orani(faiz_yillik)
+            gunler, toplu_gun = odeme_gunleri(self.sema, depo_vade, self.bugun)
+            self._tablo[anahtar] = (np.array([(1 + g) ** o for o in gunler]),
+                                    (1 + g) ** toplu_gun)
+        return self._tablo[anahtar]
+
+
+def _gunluk_acik(mevcut_stok, gunluk_sarf: float) -> np.ndarray:
+    """Mevcut stok önce tüketildikten sonra her gün yeni alımdan karşılanacak miktar."""
+    acik = np.empty(UFUK_GUN)
+    kalan_mevcut = mevcut_stok
+    for gun in range(UFUK_GUN):
+        if kalan_mevcut == 0:
+            acik[gun:] = gunluk_sarf
+            break
+        mevcut_harcanan = min(kalan_mevcut, gunluk_sarf)
+        kalan_mevcut -= mevcut_harcanan
+        acik[gun] = gunluk_sarf - mevcut_harcanan
+    return acik
+
+
+def _gunluk_fiyat(maliyet: float, zam_gun: int, zam_orani: float) -> np.ndarray:
+    fiyat = np.full(UFUK_GUN, float(maliyet))
+    if zam_orani > 0:
+        fiyat[max(0, zam_gun):] = maliyet * (1 + zam_orani / 100)
+    return fiyat
+
+
+def _parca_tara(kalan: np.ndarray, acik: np.ndarray, fiyat: np.ndarray,
+                iskonto: np.ndarray) -> np.ndarray:
+    """(ürün × aday) kalan miktarlar üzerinde gün taraması → ay be ay NPV."""
+    npv = np.zeros_like(kalan)
+    # Kalan miktar adayla birlikte artar: biten adaylar soldan bir önek oluşturur
+    bas = 0
+    for gun in range(UFUK_GUN):
+        while bas < kalan.shape[1] and not (kalan[:, bas] > 0).any():
+            bas += 1
+        if bas == kalan.shape[1]:
+            break
+        k = kalan[:, bas:]
+        yeni = np.maximum(np.minimum(acik[:, gun:gun + 1], k), 0.0)
+        npv[:, bas:] += (yeni * fiyat[:, gun:gun + 1]) / iskonto[:, gun:gun + 1]
+        k -= yeni
+    return npv
+
+
+def aylik_npv_egrileri(kalemler: list, sema: str = "gunluk", bugun: date = None) -> list:
+    """
+    Senaryo A (ay be ay alım) NPV'si — her kalemin her aday miktarı için.
+
+    Args:
+        kalemler: [{'miktarlar', 'maliyet', 'aylik_ort', 'mevcut_stok',
+                    'zam_gun', 'zam_orani', 'faiz_yillik', 'depo_vade'}, ...]
+        sema: ödeme günü şeması ('gunluk', 'ay_sonu', 'takvim')
+        bugun: 'takvim' şeması için bugün (varsayılan date.today())
+
+    Returns:
+        list[np.ndarray]: kalemlerle aynı sırada, miktarlarla aynı uzunlukta
+    """
+    iskontolar = _IskontoOnbellek(sema, bugun)
+    hazir = []
+    for kalem in kalemler:
+        miktarlar = np.asarray(kalem["miktarlar"], dtype=float)
+        iskonto, _ = iskontolar.getir(kalem["faiz_yillik"], kalem["depo_vade"])
+        hazir.append((miktarlar,
+                      _gunluk_acik(kalem.get("mevcut_stok", 0) or 0, kalem["aylik_ort"] / 30),
+                      _gunluk_fiyat(kalem["maliyet"], kalem.get("zam_gun", 0),
+                                    kalem.get("zam_orani", 0)),
+                      iskonto))
+
+    sonuc = [None] * len(kalemler)
+    # Aday sayısına göre sıralı parçalar: parça içindeki en geniş satır en
+    # darın iki katını geçmez (dolgu az), hücre sayısı sınırlı
+    sira = sorted(range(len(hazir)), key=lambda i: len(hazir[i][0]))
+    bas = 0
+    while bas < len(sira):
+        son = bas + 1
+        ilk_genislik = max(len(hazir[sira[bas]][0]), PARCA_MIN_GENISLIK)
+        while son < len(sira):
+            genislik = len(hazir[sira[son]][0])
+            if genislik > 2 * ilk_genislik or (son - bas + 1) * genislik > PARCA_HUCRE:
+                break
+            son += 1
+        parca = sira[bas:son]
+        genislik = max(1, len(hazir[parca[-1]][0]))
+        kalan = np.zeros((len(parca), genislik))
+        for satir, i in enumerate(parca):
+            kalan[satir, :len(hazir[i][0])] = hazir[i][0]
+        npv = _parca_tara(kalan,
+                          np.stack([hazir[i][1] for i in parca]),
+                          np.stack([hazir[i][2] for i in parca]),
+                          np.stack([hazir[i][3] for i in parca]))
+        for satir, i in enumerate(parca):
+            sonuc[i] = npv[satir, :len(hazir[i][0])]
+        bas = son
+    return sonuc
+
+
+def toplu_iskonto(faiz_yillik: float, depo_vade: int, sema: str = "gunluk",
+                  bugun: date = None) -> float:
+    """Senaryo B (bugün toplu alım) için iskonto böleni."""
+    return _IskontoOnbellek(sema, bugun).getir(faiz_yillik, depo_vade)[1]
+
+
+def kazanc_egrileri(kalemler: list, sema: str = "gunluk", bugun: date = None) -> list:
+    """Her kalem için kazanç = NPV(ay be ay) − NPV(toplu alım) dizisi."""
+    iskontolar = _IskontoOnbellek(sema, bugun)
+    sonuc = []
+    for kalem, npv_aylik in zip(kalemler, aylik_npv_egrileri(kalemler, sema, bugun)):
+        bolen = iskontolar.getir(kalem["faiz_yillik"], kalem["depo_vade"])[1]
+        miktarlar = np.asarray(kalem["miktarlar"], dtype=float)
+        sonuc.append(npv_aylik - (miktarlar * kalem["maliyet"]) / bolen)
+    return sonuc
+
+
+def kazanc_egrisi(miktarlar, maliyet: float, aylik_ort: float, mevcut_stok,
+                  zam_gun: int, zam_orani: float, faiz_yillik: float, depo_vade: int,
+                  sema: str = "gunluk", bugun: date = None) -> np.ndarray:
+    """Tek ürün için kazanc_egrileri."""
+    return kazanc_egrileri([{
+        "miktarlar": miktarlar, "maliyet": maliyet, "aylik_ort": aylik_ort,
+        "mevcut_stok": mevcut_stok, "zam_gun": zam_gun, "zam_orani": zam_orani,
+        "faiz_yillik": faiz_yillik, "depo_vade": depo_vade}], sema, bugun)[0]
+
+
+def zam_kazanci(toplam_stok, maliyet: float, aylik_ort: float, faiz_yillik: float,
+                zam_gun: int, zam_orani: float) -> float:
+    """Zam sonrasına kalan stoğun zam farkı (ortalama satış gününe indirgenmiş)."""
+    if not (zam_orani > 0 and zam_gun > 0):
+        return 0
+    gunluk_sarf = aylik_ort / 30
+    zam_oncesi_tuketim = min(toplam_stok, zam_gun * gunluk_sarf)
+    zam_sonrasi_miktar = max(0, toplam_stok - zam_oncesi_tuketim)
+    if zam_sonrasi_miktar <= 0:
+        return 0
+    zam_fark = maliyet * (zam_orani / 100)
+    ort_satis_gun = zam_gun + (zam_sonrasi_miktar / gunluk_sarf / 2) if gunluk_sarf > 0 else zam_gun
+    iskonto = (1 + gunluk_faiz_orani(faiz_yillik)) ** ort_satis_gun
+    return (zam_sonrasi_miktar * zam_fark) / iskonto
+
+
+def roi_egrileri(kazanclar, maliyet: float) -> tuple:
+    """
+    Kazanç eğrisinden (indeks = miktar, 0'dan ardışık) yatırım, ROI ve
+    marjinal ROI dizileri. Marjinal ROI: 1 adette ROI'nin kendisi, sonra
+    bir ek adedin kazancı / maliyet.
+    """
+    kazanclar = np.asarray(kazanclar, dtype=float)
+    yatirimlar = np.arange(len(kazanclar)) * maliyet
+    roi = np.zeros(len(kazanclar))
+    pozitif = yatirimlar > 0
+    roi[pozitif] = kazanclar[pozitif] / yatirimlar[pozitif] * 100
+    marjinal = np.zeros(len(kazanclar))
+    if len(kazanclar) > 1:
+        marjinal[1] = roi[1]
+        if maliyet > 0:
+            marjinal[2:] = np.diff(kazanclar[1:]) / maliyet * 100
+        else:
+            marjinal[2:] = 0
+    return yatirimlar, roi, marjinal
+
+
+def karar_noktalari(kazanclar, maliyet: float) -> dict:
+    """
+    Sipariş önerisinin zam karar noktaları (indeks = miktar, 0'dan ardışık).
+
+    verimlilik: ilk maksimum ROI (yalnız kazancı pozitif miktarlar)
+    pareto    : tepe kazancın %80'ine ulaşan ilk miktar
+    optimum   : ilk tepe (pozitif değilse 0)
+    maksimum  : kazancın pozitif olduğu son miktar
+    """
+    k = np.asarray(kazanclar, dtype=float)
+    if len(k) == 0:
+        k = np.zeros(1)
+
+    optimum = int(np.argmax(k))
+    en_iyi = float(k[optimum])
+    if en_iyi <= 0:
+        optimum, en_iyi = 0, 0
+
+    pozitif = np.flatnonzero(k > 0)
+    maksimum = int(pozitif[-1]) if len(pozitif) else 0
+
+    ulasan = np.flatnonzero(k >= en_iyi * 0.80)
+    pareto = int(ulasan[0]) if len(ulasan) else 0
+    pareto_kazanc = float(k[pareto]) if len(ulasan) else 0
+
+    verimlilik, verimlilik_roi, verimlilik_kazanc = 0, 0, 0
+    adaylar = pozitif[pozitif > 0]
+    if len(adaylar):
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roi = (k[adaylar] / (adaylar * maliyet)) * 100
+        j = int(np.argmax(roi))
+        if roi[j] > 0:
+            verimlilik = int(adaylar[j])
+            verimlilik_roi = float(roi[j])
+            verimlilik_kazanc = float(k[verimlilik])
+
+    return {
+        'verimlilik': verimlilik,
+        'verimlilik_roi': round(verimlilik_roi, 1),
+        'verimlilik_kazanc': round(verimlilik_kazanc, 2),
+        'pareto': pareto,
+        'pareto_kazanc': round(pareto_kazanc, 2),
+        'optimum': optimum,
+        'kazanc_optimum': round(en_iyi, 2),
+        'maksimum': maksimum,
+        'kazanc_maksimum': round(float(k[maksimum]) if maksimum > 0 else 0, 2)
+    }
+
+
+def kritik_noktalar(kazanclar, roi_ler, optimum_sifir_dahil: bool = True) -> dict:
+    """
+    ROI grafiklerinin 5 kritik noktasının indeksleri.
+
+    max_roi  : 0 hariç ilk maksimum ROI
+    yarim_roi: max_roi'den sonra ROI'nin yarıya düştüğü ilk nokta
+    sifir_roi: max_roi'den sonra ROI'nin ≤ 0 olduğu ilk nokta (yoksa son)
+    optimum  : ilk tepe kazanç (optimum_sifir_dahil=False → 0 hariç)
+    pareto   : tepe kazancın %80'ine ulaşan ilk nokta
+    """
+    k = np.asarray(kazanclar, dtype=float)
+    r = np.asarray(roi_ler, dtype=float)
+    n = len(r)
+
+    max_roi = 1 + int(np.argmax(r[1:])) if n > 1 else 0
+    max_roi_val = r[max_roi]
+    kuyruk = r[max_roi:]
+    yarim = np.flatnonzero(kuyruk <= max_roi_val / 2)
+    yarim_roi = max_roi + int(yarim[0]) if len(yarim) else max_roi
+    sifir = np.flatnonzero(kuyruk <= 0)
+    sifir_roi = max_roi + int(sifir[0]) if len(sifir) else n - 1
+
+    if optimum_sifir_dahil or len(k) < 2:
+        optimum = int(np.argmax(k))
+    else:
+        optimum = 1 + int(np.argmax(k[1:]))
+    ulasan = np.flatnonzero(k >= k[optimum] * 0.80)
+    pareto = int(ulasan[0]) if len(ulasan) else 0
+
+    return {'max_roi': max_roi, 'yarim_roi': yarim_roi, 'sifir_roi': sifir_roi,
+            'optimum': optimum, 'pareto': pareto}
+
+
+def aday_ust_sinir(aylik_ort: float, alt_sinir: int, yedek: int) -> int:
+    """12 aylık talep kadar aday; az satan ürünlerde sabit yedek üst sınır."""
+    ust = int(aylik_ort * 12)
+    return yedek if ust < alt_sinir else ust
+
+
+def toplu_karar_noktalari(kalemler: list, sema: str = "gunluk", bugun: date = None) -> list:
+    """
+    Sipariş listesi için karar noktaları — tüm ürünler tek taramada.
+
+    Args:
+        kalemler: [{'maliyet', 'aylik_ort', 'mevcut_stok', 'zam_gun',
+                    'zam_orani', 'faiz_yillik', 'depo_vade'}, ...]
+                  ('miktarlar' verilmezse 0..12 aylık talep, en az 100 aday)
+
+    Returns:
+        list[dict]: karar_noktalari sonuçları, kalemlerle aynı sırada
+    """
+    hazir = [kalem if kalem.get("miktarlar") is not None else
+             dict(kalem, miktarlar=range(0, aday_ust_sinir(kalem["aylik_ort"], 10, 100) + 1))
+             for kalem in kalemler]
+    return [karar_noktalari(k, kalem["maliyet"])
+            for kalem, k in zip(hazir, kazanc_egrileri(hazir, sema, bugun))]